@@ -4,15 +4,23 @@
 import ssl
 import base64
 import os
+import tempfile
 
 
 def getBase64CertWriteToFile(host, port):
-    os.system("rm -rf cert.txt")
+    """
+    Returns the base64 encoded certificate of host:port, also left in cert.txt.
+    Callers use the returned value, as cert.txt is shared by every configuration
+    running side by side; it is replaced atomically so it's never read half written.
+    """
     cert = ssl.get_server_certificate((host, port))
     base64_bytes = base64.b64encode(cert.encode("utf-8"))
     encodedStr = str(base64_bytes, "utf-8")
-    with open('cert.txt', 'w') as f:
+    fd, tmp = tempfile.mkstemp(prefix="cert.txt.", dir=".")
+    with os.fdopen(fd, 'w') as f:
         f.write(encodedStr)
+    os.replace(tmp, "cert.txt")
+    return encodedStr
 
 
 def repoAdd(repo, port):
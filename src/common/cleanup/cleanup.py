@@ -1,7 +1,6 @@
 import logging
 import requests
 import time
-import base64
 import os
 import json
 from pyVmomi import vim
@@ -10,14 +9,17 @@ from requests.packages.urllib3.exceptions import InsecureRequestWarning
 
 from common.common_utilities import envCheck, isEnvTkgs_ns, isEnvTkgs_wcp, getClusterID, isWcpEnabled, \
     getClusterStatusOnTanzu, isAviHaEnabled, checkTmcEnabled, obtain_second_csrf, obtain_avi_version, grabNsxtHeaders, \
-    getPolicy, getList, checkObjectIsPresentAndReturnPath
+    getList, checkObjectIsPresentAndReturnPath
 from common.operation.constants import Env, ResourcePoolAndFolderName, ControllerLocation, RegexPattern, KubernetesOva, \
     GroupNameCgw, VCF, ServiceName, FirewallRuleMgw, FirewallRuleCgw, ServiceName, GroupNameMgw, SegmentsName, \
     Policy_Name
 from common.lib.govc_client import GovcClient
 from common.lib.kubectl_client import KubectlClient
-from common.lib.nsxt_client import NsxtClient
 from common.util.local_cmd_helper import LocalCmdHelper
+from common.util.nsxt_pager import NsxtPager
+from common.util.task_graph import TaskGraph
+from common.util.wait_helper import WaitHelper
+from common.util.request_spec import RequestSpec
 from common.operation.ShellHelper import runShellCommandAndReturnOutputAsList, runShellCommandAndReturnOutput, \
     grabPipeOutput, verifyPodsAreRunning, runProcess
 from common.operation.vcenter_operations import checkVmPresent, destroy_vm, getSi, wait_for_task, get_obj, get_dc
@@ -55,20 +57,17 @@ def cleanup_environment():
                 "STATUS_CODE": 500
             }
             return jsonify(d), 500
-        vCenter = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterAddress']
-        vCenter_user = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterSsoUser']
-        str_enc = str(request.get_json(force=True)['envSpec']['vcenterDetails']["vcenterSsoPasswordBase64"])
-        base64_bytes = str_enc.encode('ascii')
-        enc_bytes = base64.b64decode(base64_bytes)
-        VC_PASSWORD = enc_bytes.decode('ascii').rstrip("\n")
-        vCenter_datacenter = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterDatacenter']
-        vCenter_cluster = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterCluster']
+        vCenter = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterAddress']
+        vCenter_user = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterSsoUser']
+        VC_PASSWORD = RequestSpec.secret("envSpec", "vcenterDetails", "vcenterSsoPasswordBase64")
+        vCenter_datacenter = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterDatacenter']
+        vCenter_cluster = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterCluster']
         if isEnvTkgs_ns(env) or isEnvTkgs_wcp(env):
             parent_rp = None
         else:
-            parent_rp = request.get_json(force=True)['envSpec']['vcenterDetails']["resourcePoolName"]
+            parent_rp = RequestSpec.json()['envSpec']['vcenterDetails']["resourcePoolName"]
     elif env == Env.VMC:
-        status = fetch_vmc_env(request.get_json(force=True))
+        status = fetch_vmc_env(RequestSpec.json())
         if status[1] != 200:
             d = {
                 "responseType": "ERROR",
@@ -87,9 +86,9 @@ def cleanup_environment():
                 "STATUS_CODE": 500
             }
             return jsonify(d), 500
-        vCenter_datacenter = request.get_json(force=True)['envSpec']['sddcDatacenter']
-        vCenter_cluster = request.get_json(force=True)['envSpec']['sddcCluster']
-        parent_rp = request.get_json(force=True)['envSpec']['resourcePoolName']
+        vCenter_datacenter = RequestSpec.json()['envSpec']['sddcDatacenter']
+        vCenter_cluster = RequestSpec.json()['envSpec']['sddcCluster']
+        parent_rp = RequestSpec.json()['envSpec']['resourcePoolName']
 
     govc_client = GovcClient(current_app.config, LocalCmdHelper())
     GovcClient.set_env_vars(govc_client)
@@ -213,13 +212,13 @@ def tkgs_cleanup(vCenter, vCenter_user, VC_PASSWORD, vc_cluster):
 
         if checkTmcEnabled(Env.VSPHERE):
             current_app.logger.info("Performing TMC Cleanup")
-            os.putenv("TMC_API_TOKEN", request.get_json(force=True)['envSpec']["saasEndpoints"]['tmcDetails'][
-                'tmcRefreshToken'])
+            os.environ["TMC_API_TOKEN"] = RequestSpec.json()['envSpec']["saasEndpoints"]['tmcDetails'][
+                'tmcRefreshToken']
             if isEnvTkgs_wcp(Env.VSPHERE):
                 if not delete_tmc_cluster(workload_clusters, False):
                     current_app.logger.warn("Failed to delete workload clusters from TMC")
                     current_app.logger.warn("Try deleting it using :'tmc cluster delete <clusterName>' command")
-                if not delete_tmc_cluster([request.get_json(force=True)['envSpec']["saasEndpoints"]['tmcDetails']
+                if not delete_tmc_cluster([RequestSpec.json()['envSpec']["saasEndpoints"]['tmcDetails']
                                            ['tmcSupervisorClusterName']], True):
                     current_app.logger.warn("Failed to delete Management clusters from TMC")
                 current_app.logger.warn("Try deleting it using :'tmc managmentcluster delete <clusterName>' command")
@@ -247,12 +246,9 @@ def getWCPStatus(cluster_id):
      False: If WCP is not enabled
     True: if WCP is enabled and any state, not necessarily running status
     """
-    vcenter_ip = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterAddress']
-    vcenter_username = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterSsoUser']
-    str_enc = str(request.get_json(force=True)['envSpec']['vcenterDetails']["vcenterSsoPasswordBase64"])
-    base64_bytes = str_enc.encode('ascii')
-    enc_bytes = base64.b64decode(base64_bytes)
-    password = enc_bytes.decode('ascii').rstrip("\n")
+    vcenter_ip = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterAddress']
+    vcenter_username = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterSsoUser']
+    password = RequestSpec.secret("envSpec", "vcenterDetails", "vcenterSsoPasswordBase64")
     if not (vcenter_ip or vcenter_username or password):
         return False, "Failed to fetch VC details"
 
@@ -283,76 +279,59 @@ def getWCPStatus(cluster_id):
 
 def tkgm_cleanup(env):
     if env == Env.VMC:
-        management_cluster = request.get_json(force=True)['componentSpec']['tkgMgmtSpec']['tkgMgmtClusterName']
-        shared_cluster = request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec']['tkgSharedClusterName']
-        workload_cluster = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec']['tkgWorkloadClusterName']
+        management_cluster = RequestSpec.json()['componentSpec']['tkgMgmtSpec']['tkgMgmtClusterName']
+        shared_cluster = RequestSpec.json()['componentSpec']['tkgSharedServiceSpec']['tkgSharedClusterName']
+        workload_cluster = RequestSpec.json()['componentSpec']['tkgWorkloadSpec']['tkgWorkloadClusterName']
     elif env == Env.VSPHERE:
-        management_cluster = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents']['tkgMgmtClusterName']
-        shared_cluster = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents']['tkgSharedserviceClusterName']
-        workload_cluster = request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadClusterName']
+        management_cluster = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents']['tkgMgmtClusterName']
+        shared_cluster = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents']['tkgSharedserviceClusterName']
+        workload_cluster = RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadClusterName']
     elif env == Env.VCF:
-        management_cluster = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents']['tkgMgmtClusterName']
-        shared_cluster = request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec']['tkgSharedserviceClusterName']
-        workload_cluster = request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadClusterName']
+        management_cluster = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents']['tkgMgmtClusterName']
+        shared_cluster = RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec']['tkgSharedserviceClusterName']
+        workload_cluster = RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadClusterName']
 
+    # Workload clusters are deleted in parallel and the management cluster once all of them are gone;
+    # kubectl contexts and TMC registrations are cleaned up as soon as their clusters are deleted.
+    graph = TaskGraph()
     worload_clusters = [shared_cluster, workload_cluster]
     if management_exists(management_cluster):
-        for cluster in worload_clusters:
-            current_app.logger.info("Deleting " + cluster + " cluster")
-            if getCluster(cluster):
-                if delete_cluster(cluster):
-                    current_app.logger.info("Cluster " + cluster + " deleted successfully")
-                else:
-                    current_app.logger.error("Failed to delete cluster - " + cluster)
-                    d = {
-                        "responseType": "ERROR",
-                        "msg": "Failed to delete cluster - " + cluster,
-                        "STATUS_CODE": 500
-                    }
-                    return jsonify(d), 500
-            else:
-                current_app.logger.info("Workload cluster " + cluster + " is not available in environment")
-
-        current_app.logger.info("Deleting management cluster...")
-        if delete_mgmt_cluster(management_cluster):
-            current_app.logger.info("Management cluster " + management_cluster + " - deleted successfully")
-        else:
-            current_app.logger.error("Failed to delete management cluster - " + management_cluster)
-            d = {
-                "responseType": "ERROR",
-                "msg": "Failed to delete management cluster - " + management_cluster,
-                "STATUS_CODE": 500
-            }
-            return jsonify(d), 500
+        cluster_steps = [graph.add("delete cluster " + cluster, delete_workload_cluster_step(cluster))
+                         for cluster in worload_clusters]
+        mgmt_steps = [graph.add("delete management cluster " + management_cluster,
+                                delete_mgmt_cluster_step(management_cluster), depends_on=cluster_steps)]
     else:
         current_app.logger.info("Management cluster " + management_cluster + " is not present in environment")
+        cluster_steps = []
+        mgmt_steps = []
 
-    kubectl_configs_status = kubectl_configs_cleanup(env, [management_cluster, workload_cluster, shared_cluster])
-    if not kubectl_configs_status[0]:
-        current_app.logger.error(kubectl_configs_status[1])
+    graph.add("delete kubectl contexts",
+              lambda: kubectl_configs_cleanup(env, [management_cluster, workload_cluster, shared_cluster]),
+              depends_on=mgmt_steps)
+    if checkTmcEnabled(env):
+        current_app.logger.info("Performing TMC cleanup")
+        if env == Env.VMC:
+            os.environ["TMC_API_TOKEN"] = RequestSpec.json()["saasEndpoints"]['tmcDetails']['tmcRefreshToken']
+        else:
+            os.environ["TMC_API_TOKEN"] = RequestSpec.json()['envSpec']["saasEndpoints"]['tmcDetails'][
+                'tmcRefreshToken']
+        graph.add("unregister workload clusters from TMC", lambda: tmc_cleanup_step(
+            [workload_cluster, shared_cluster], False,
+            "Failed to delete workload clusters from TMC",
+            "Try deleting it using :'tmc cluster delete <clusterName>' command"), depends_on=cluster_steps)
+        graph.add("unregister management cluster from TMC", lambda: tmc_cleanup_step(
+            [management_cluster], True,
+            "Failed to delete management cluster " + management_cluster + " from TMC",
+            "Try deleting it using :'tmc managementcluster delete <clusterName>' command"), depends_on=mgmt_steps)
+    graph.run()
+    if not graph.ok:
         d = {
             "responseType": "ERROR",
-            "msg": kubectl_configs_status[1],
+            "msg": "; ".join(result.message for result in graph.failures),
             "STATUS_CODE": 500
         }
         return jsonify(d), 500
 
-    current_app.logger.info(kubectl_configs_status[1])
-
-    if checkTmcEnabled(env):
-        current_app.logger.info("Performing TMC cleanup")
-        if env == Env.VMC:
-            os.putenv("TMC_API_TOKEN", request.get_json(force=True)["saasEndpoints"]['tmcDetails']['tmcRefreshToken'])
-        else:
-            os.putenv("TMC_API_TOKEN", request.get_json(force=True)['envSpec']["saasEndpoints"]['tmcDetails'][
-                'tmcRefreshToken'])
-        if not delete_tmc_cluster([workload_cluster, shared_cluster], False):
-            current_app.logger.warn("Failed to delete workload clusters from TMC")
-            current_app.logger.warn("Try deleting it using :'tmc cluster delete <clusterName>' command")
-        if not delete_tmc_cluster([management_cluster], True):
-            current_app.logger.warn("Failed to delete management cluster " + management_cluster + " from TMC")
-            current_app.logger.warn("Try deleting it using :'tmc managementcluster delete <clusterName>' command")
-
     current_app.logger.info("TKG Clusters and Nodes deleted successfully ")
     d = {
         "responseType": "SUCCESS",
@@ -362,6 +341,39 @@ def tkgm_cleanup(env):
     return jsonify(d), 200
 
 
+def delete_workload_cluster_step(cluster):
+    def step():
+        current_app.logger.info("Deleting " + cluster + " cluster")
+        if not getCluster(cluster):
+            current_app.logger.info("Workload cluster " + cluster + " is not available in environment")
+            return True, None
+        if delete_cluster(cluster):
+            current_app.logger.info("Cluster " + cluster + " deleted successfully")
+            return True, None
+        current_app.logger.error("Failed to delete cluster - " + cluster)
+        return False, "Failed to delete cluster - " + cluster
+    return step
+
+
+def delete_mgmt_cluster_step(management_cluster):
+    def step():
+        current_app.logger.info("Deleting management cluster...")
+        if delete_mgmt_cluster(management_cluster):
+            current_app.logger.info("Management cluster " + management_cluster + " - deleted successfully")
+            return True, None
+        current_app.logger.error("Failed to delete management cluster - " + management_cluster)
+        return False, "Failed to delete management cluster - " + management_cluster
+    return step
+
+
+def tmc_cleanup_step(clusters, is_mgmt, failure, hint):
+    # Failing to un-register from TMC does not fail the cleanup, as before.
+    if not delete_tmc_cluster(clusters, is_mgmt):
+        current_app.logger.warn(failure)
+        current_app.logger.warn(hint)
+    return True, None
+
+
 def delete_tmc_cluster(clusters, is_mgmt):
     try:
         for cls in clusters:
@@ -417,34 +429,21 @@ def delete_cluster(cluster):
         if delete_status[1] != 0:
             current_app.logger.error("Command to delete - " + cluster + " Failed")
             current_app.logger.debug(delete_status[0])
-            d = {
-                "responseType": "ERROR",
-                "msg": "Failed delete cluster - " + cluster,
-                "STATUS_CODE": 500
-            }
-            return jsonify(d), 500
+            return False
         cluster_running = ["tanzu", "cluster", "list"]
         command_status = runShellCommandAndReturnOutputAsList(cluster_running)
         if command_status[1] != 0:
             current_app.logger.error("Failed to run command to check status of workload cluster - " + cluster)
             return False
-        deleting = True
-        count = 0
-        while count < 360 and deleting:
-            if verifyPodsAreRunning(cluster, command_status[0], RegexPattern.deleting) or \
-                    verifyPodsAreRunning(cluster, command_status[0], RegexPattern.running):
-                current_app.logger.info("Waiting for " + cluster + " deletion to complete...")
-                current_app.logger.info("Retrying in 10s...")
-                time.sleep(10)
-                count = count + 1
-                command_status = runShellCommandAndReturnOutputAsList(cluster_running)
-            else:
-                deleting = False
-        if not deleting:
-            return True
 
-        current_app.logger.error("waited for " + str(count*5) + "s")
-        return False
+        def deleted():
+            command_status = runShellCommandAndReturnOutputAsList(cluster_running)
+            return not (verifyPodsAreRunning(cluster, command_status[0], RegexPattern.deleting) or
+                        verifyPodsAreRunning(cluster, command_status[0], RegexPattern.running))
+
+        result = WaitHelper.wait_for(deleted, timeout=3600, max_delay=10, description=cluster + " deletion",
+                                     log=current_app.logger)
+        return result.ready
     except Exception as e:
         current_app.logger.error("Exception occurred while deleting cluster " + str(e))
         return False
@@ -456,26 +455,10 @@ def delete_mgmt_cluster(mgmt_cluster):
         delete_command = ["tanzu", "management-cluster", "delete", "--force", "-y"]
         runProcess(delete_command)
 
-        deleted = False
-        count = 0
-        while count < 360 and not deleted:
-            if management_exists(mgmt_cluster):
-                current_app.logger.debug("Management cluster is still not deleted... retrying in 10s")
-                time.sleep(10)
-                count = count + 1
-            else:
-                deleted = True
-                break
-
-        if not deleted:
-            current_app.logger.error("Management cluster " + mgmt_cluster + " is not deleted even after " + str(count*5)
-                                     + "s")
-            return False
-        else:
-            return True
-
-        return False
-
+        result = WaitHelper.wait_for(lambda: not management_exists(mgmt_cluster), timeout=3600, max_delay=10,
+                                     description="Management cluster " + mgmt_cluster + " deletion",
+                                     log=current_app.logger)
+        return result.ready
     except Exception as e:
         current_app.logger.error(str(e))
         return False
@@ -561,146 +544,53 @@ def get_context_name(env, cluster):
 
 
 def delete_common_comp(govc_client: GovcClient, env, vCenter, vCenter_user, VC_PASSWORD, datacenter, cluster, parent_resourcepool):
-
+    """
+    Delete the components SIVT created around the clusters. Independent steps run in parallel;
+    VMs go before the resource pools and folders holding them, and NSX-T objects are deleted
+    in reference order once the VMs using the segments are gone.
+    """
     uuid = get_avi_uuid(vCenter, vCenter_user, VC_PASSWORD)
 
-    avi_cleanup_status = cleanup_avi_vms(govc_client, env, datacenter)
-    if not avi_cleanup_status[0]:
-        current_app.logger.error(avi_cleanup_status[1])
-        d = {
-            "responseType": "ERROR",
-            "msg": avi_cleanup_status[1],
-            "STATUS_CODE": 500
-        }
-        return jsonify(d), 500
-    current_app.logger.info(avi_cleanup_status[1])
-
-    response = cleanup_resource_pools(govc_client, env, datacenter, cluster, parent_resourcepool)
-    if not response[0]:
-        d = {
-            "responseType": "ERROR",
-            "msg": response[1],
-            "STATUS_CODE": 500
-        }
-        return jsonify(d), 500
-
-    current_app.logger.info(response[1])
-
-    library_response = cleanup_content_libraries(env)
-    if not library_response[0]:
-        d = {
-            "responseType": "ERROR",
-            "msg": library_response[1],
-            "STATUS_CODE": 500
-        }
-        return jsonify(d), 500
-
-    current_app.logger.info(library_response[1])
-
-    cleanup_sivt = cleanup_downloaded_ovas(env)
-    if not cleanup_sivt[0]:
-        current_app.logger.info(cleanup_sivt[1])
-        d = {
-            "responseType": "ERROR",
-            "msg": cleanup_sivt[1],
-            "STATUS_CODE": 500
-        }
-        return jsonify(d), 500
-
-    current_app.logger.info(cleanup_sivt[1])
-
-    if not delete_folders(env, vCenter, vCenter_user, VC_PASSWORD):
-        current_app.logger.error("Failed to delete folders which were created by SIVT")
-        d = {
-            "responseType": "ERROR",
-            "msg": "Failed to delete folders which were created by SIVT",
-            "STATUS_CODE": 500
-        }
-        return jsonify(d), 500
-
+    graph = TaskGraph()
+    avi_vms = graph.add("delete NSX ALB VMs", lambda: cleanup_avi_vms(govc_client, env, datacenter))
+    vm_steps = [avi_vms]
     if env == Env.VMC or env == Env.VCF or env == Env.VSPHERE:
-        if not delete_kubernetes_templates(govc_client, vCenter, vCenter_user, VC_PASSWORD, datacenter, uuid):
-            current_app.logger.error("Failed to delete Kubernetes templates")
-            d = {
-                "responseType": "ERROR",
-                "msg": "Failed to delete Kubernetes templates",
-                "STATUS_CODE": 500
-            }
-            return jsonify(d), 500
-        if not delete_config_yaml():
-            current_app.logger.error("Failed to delete config.yaml files /root/.config/tanzu/config.yaml "
-                                     "and /root/.config/tanzu/tkg/config.yaml")
-            d = {
-                "responseType": "ERROR",
-                "msg": "Failed to delete config.yaml files",
-                "STATUS_CODE": 500
-            }
-            return jsonify(d), 500
+        vm_steps.append(graph.add("delete Kubernetes templates", boolean_step(
+            lambda: delete_kubernetes_templates(govc_client, vCenter, vCenter_user, VC_PASSWORD, datacenter, uuid),
+            "Failed to delete Kubernetes templates")))
+        graph.add("delete config.yaml files", boolean_step(delete_config_yaml, "Failed to delete config.yaml files"))
+    graph.add("delete resource pools",
+              lambda: cleanup_resource_pools(govc_client, env, datacenter, cluster, parent_resourcepool),
+              depends_on=vm_steps)
+    graph.add("delete folders", boolean_step(lambda: delete_folders(env, vCenter, vCenter_user, VC_PASSWORD),
+                                             "Failed to delete folders which were created by SIVT"),
+              depends_on=vm_steps)
+    graph.add("delete content libraries", lambda: cleanup_content_libraries(env))
+    graph.add("delete downloaded OVAs", lambda: cleanup_downloaded_ovas(env))
 
-    current_app.logger.info("Performing NSX-T components cleanup")
     if env == Env.VCF:
-        headers_ = grabNsxtHeaders()
-        if headers_[0] is None:
-            d = {
-                "responseType": "ERROR",
-                "msg": str(headers_[1]),
-                "STATUS_CODE": 500
-            }
-            return jsonify(d), 500
-        headers_[1].update({"Content-Type": "application/json", "Accept": "application/json"})
-
-        current_app.logger.info("Deleting NSX-T gateway policies...")
-        url = "https://" + headers_[2] + "/policy/api/v1/infra/domains/default/gateway-policies/"
-        delete_policy = delete_nsxt_components(url, headers_[1], [Policy_Name.POLICY_NAME])
-        if not delete_policy[0]:
-            current_app.logger.error(delete_policy[1])
-            d = {
-                "responseType": "ERROR",
-                "msg": delete_policy[1],
-                "STATUS_CODE": 500
-            }
-            return jsonify(d), 500
-        current_app.logger.info("Gateway policies deleted successfully")
-
-        current_app.logger.info("Deleting Inventory groups and firewall rules...")
-        url = "https://" + headers_[2] + "/policy/api/v1/infra/domains/default/groups/"
-        delete_groups = delete_nsxt_components(url, headers_[1], nsxt_list_groups())
-        if not delete_groups[0]:
-            current_app.logger.error(delete_groups[1])
-            d = {
-                "responseType": "ERROR",
-                "msg": delete_groups[1],
-                "STATUS_CODE": 500
-            }
-            return jsonify(d), 500
-        current_app.logger.info("Inventory groups and firewall rules deleted successfully")
-
-        current_app.logger.info("Deleting Services...")
-        url = "https://" + headers_[2] + "/policy/api/v1/infra/services/"
-        delete_services = delete_nsxt_components(url, headers_[1], nsxt_list_services())
-        if not delete_services[0]:
-            current_app.logger.error(delete_services[1])
-            d = {
-                "responseType": "ERROR",
-                "msg": delete_services[1],
-                "STATUS_CODE": 500
-            }
-            return jsonify(d), 500
-        current_app.logger.info("Services deleted successfully")
-
-        current_app.logger.info("Deleting network Segments...")
-        time.sleep(30)
-        url = "https://" + headers_[2] + "/policy/api/v1/infra/segments/"
-        delete_segments = delete_nsxt_components(url, headers_[1], list_network_segments(env))
-        if not delete_segments[0]:
-            current_app.logger.error(delete_segments[1])
-            d = {
-                "responseType": "ERROR",
-                "msg": delete_segments[1],
-                "STATUS_CODE": 500
-            }
-            return jsonify(d), 500
-        current_app.logger.info("Segments deleted successfully")
+        # Filled in by the login step, so a failed login fails the NSX-T steps but not the others.
+        nsxt = {}
+
+        def nsxt_login():
+            headers_ = grabNsxtHeaders()
+            if headers_[0] is None:
+                return False, str(headers_[1])
+            headers_[1].update({"Content-Type": "application/json", "Accept": "application/json"})
+            nsxt["headers"] = headers_[1]
+            nsxt["url"] = "https://" + headers_[2] + "/policy/api/v1/infra/"
+            return True, None
+
+        login = graph.add("log in to NSX-T", nsxt_login)
+        policies = graph.add("delete NSX-T gateway policies", lambda: delete_nsxt_components(
+            nsxt["url"] + "domains/default/gateway-policies/", nsxt["headers"], [Policy_Name.POLICY_NAME]),
+            depends_on=vm_steps + [login])
+        groups = graph.add("delete NSX-T inventory groups", lambda: delete_nsxt_components(
+            nsxt["url"] + "domains/default/groups/", nsxt["headers"], nsxt_list_groups()), depends_on=[policies])
+        services = graph.add("delete NSX-T services", lambda: delete_nsxt_components(
+            nsxt["url"] + "services/", nsxt["headers"], nsxt_list_services()), depends_on=[policies])
+        graph.add("delete NSX-T segments", lambda: delete_nsxt_segments(
+            nsxt["url"] + "segments/", nsxt["headers"], list_network_segments(env)), depends_on=[groups, services])
 
     elif env == Env.VMC:
         headers = {
@@ -709,86 +599,31 @@ def delete_common_comp(govc_client: GovcClient, env, vCenter, vCenter_user, VC_P
         }
 
         url = current_app.config['NSX_REVERSE_PROXY_URL'] + "orgs/" + current_app.config['ORG_ID'] + "/sddcs/" \
-              + current_app.config['SDDC_ID']
-
-        current_app.logger.info("Deleting firewall rules for compute Gateway...")
-        del_cgw_rules = delete_nsxt_components(url + "/policy/api/v1/infra/domains/cgw/gateway-policies/default/rules/",
-                                               headers, vmc_list_cgw_firewall_rules())
-        if not del_cgw_rules[0]:
-            current_app.logger.error(del_cgw_rules[1])
-            d = {
-                "responseType": "ERROR",
-                "msg": del_cgw_rules[1],
-                "STATUS_CODE": 500
-            }
-            return jsonify(d), 500
-        current_app.logger.info("Firewall rules for Compute Gateway deleted successfully...")
-
-        current_app.logger.info("Deleting firewall rules for Management Gateway...")
-        del_mgw_rules = delete_nsxt_components(url + "/policy/api/v1/infra/domains/mgw/gateway-policies/default/rules/",
-                                               headers, vmc_list_mgw_firewall_rules())
-        if not del_cgw_rules[0]:
-            current_app.logger.error(del_mgw_rules[1])
-            d = {
-                "responseType": "ERROR",
-                "msg": del_mgw_rules[1],
-                "STATUS_CODE": 500
-            }
-            return jsonify(d), 500
-        current_app.logger.info("Firewall rules for Management Gateway deleted successfully...")
-
-        current_app.logger.info("Deleting services... ")
-        del_services = delete_nsxt_components(url + "/policy/api/v1/infra/services/", headers,
-                                              [ServiceName.KUBE_VIP_SERVICE])
-        if not del_services[0]:
-            current_app.logger.error(del_services[1])
-            d = {
-                "responseType": "ERROR",
-                "msg": del_services[1],
-                "STATUS_CODE": 500
-            }
-            return jsonify(d), 500
-        current_app.logger.info("Services deleted successfully... ")
-
-        current_app.logger.info("Deleting inventory groups for Management Gateway...")
-        del_mgw_inventory_grps = delete_nsxt_components(url + "/policy/api/v1/infra/domains/mgw/groups/", headers,
-                                                        vmc_list_mgw_inventory_groups())
-        if not del_mgw_inventory_grps[0]:
-            current_app.logger.error(del_mgw_inventory_grps[1])
-            d = {
-                "responseType": "ERROR",
-                "msg": del_mgw_inventory_grps[1],
-                "STATUS_CODE": 500
-            }
-            return jsonify(d), 500
-        current_app.logger.info("Inventory groups for Management Gateway deleted successfully")
-
-        current_app.logger.info("Deleting inventory groups for Compute Gateway...")
-        del_cgw_inventory_grps = delete_nsxt_components(url + "/policy/api/v1/infra/domains/cgw/groups/", headers,
-                                                        vmc_list_cgw_inventory_groups())
-        if not del_cgw_inventory_grps[0]:
-            current_app.logger.error(del_cgw_inventory_grps[1])
-            d = {
-                "responseType": "ERROR",
-                "msg": del_cgw_inventory_grps[1],
-                "STATUS_CODE": 500
-            }
-            return jsonify(d), 500
-        current_app.logger.info("Inventory groups for Compute Gateway deleted successfully")
-
-        current_app.logger.info("Deleting network segments...")
-        time.sleep(30)
-        del_segments = delete_nsxt_components(url + "/policy/api/v1/infra/tier-1s/cgw/segments/", headers,
-                                              list_network_segments(env))
-        if not del_segments[0]:
-            current_app.logger.error(del_segments[1])
-            d = {
-                "responseType": "ERROR",
-                "msg": del_segments[1],
-                "STATUS_CODE": 500
-            }
-            return jsonify(d), 500
-        current_app.logger.info("Network segments deleted successfully")
+              + current_app.config['SDDC_ID'] + "/policy/api/v1/infra/"
+
+        cgw_rules = graph.add("delete Compute Gateway firewall rules", lambda: delete_nsxt_components(
+            url + "domains/cgw/gateway-policies/default/rules/", headers, vmc_list_cgw_firewall_rules()),
+            depends_on=vm_steps)
+        mgw_rules = graph.add("delete Management Gateway firewall rules", lambda: delete_nsxt_components(
+            url + "domains/mgw/gateway-policies/default/rules/", headers, vmc_list_mgw_firewall_rules()),
+            depends_on=vm_steps)
+        graph.add("delete NSX-T services", lambda: delete_nsxt_components(
+            url + "services/", headers, [ServiceName.KUBE_VIP_SERVICE]), depends_on=[cgw_rules, mgw_rules])
+        graph.add("delete Management Gateway inventory groups", lambda: delete_nsxt_components(
+            url + "domains/mgw/groups/", headers, vmc_list_mgw_inventory_groups()), depends_on=[mgw_rules])
+        cgw_groups = graph.add("delete Compute Gateway inventory groups", lambda: delete_nsxt_components(
+            url + "domains/cgw/groups/", headers, vmc_list_cgw_inventory_groups()), depends_on=[cgw_rules])
+        graph.add("delete NSX-T segments", lambda: delete_nsxt_segments(
+            url + "tier-1s/cgw/segments/", headers, list_network_segments(env)), depends_on=[cgw_groups])
+
+    graph.run()
+    if not graph.ok:
+        d = {
+            "responseType": "ERROR",
+            "msg": "; ".join(result.message for result in graph.failures),
+            "STATUS_CODE": 500
+        }
+        return jsonify(d), 500
 
     d = {
         "responseType": "SUCCESS",
@@ -798,6 +633,20 @@ def delete_common_comp(govc_client: GovcClient, env, vCenter, vCenter_user, VC_P
     return jsonify(d), 200
 
 
+def boolean_step(action, failure):
+    def step():
+        if action():
+            return True, None
+        return False, failure
+    return step
+
+
+def delete_nsxt_segments(url, header, list_components):
+    # Give NSX-T time to release the ports of the VMs deleted before segments can be removed.
+    time.sleep(30)
+    return delete_nsxt_components(url, header, list_components)
+
+
 def disableWCP(vCenter, cluster_id, session_id):
     header = {
         "Accept": "application/json",
@@ -856,9 +705,9 @@ def fetch_avi_vms(govc_client, env, data_center):
                        ControllerLocation.CONTROLLER_SE_WORKLOAD_NAME2]
 
     if isEnvTkgs_wcp(env):
-        avi_fqdn = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviController01Fqdn']
+        avi_fqdn = RequestSpec.json()['tkgsComponentSpec']['aviComponents']['aviController01Fqdn']
     elif env == Env.VSPHERE or env == Env.VCF:
-        avi_fqdn = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController01Fqdn']
+        avi_fqdn = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviController01Fqdn']
     else:
         avi_fqdn = ControllerLocation.CONTROLLER_NAME
 
@@ -874,11 +723,11 @@ def fetch_avi_vms(govc_client, env, data_center):
 
     elif isAviHaEnabled(env):
         if isEnvTkgs_wcp(env):
-            avi_fqdn2 = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviController02Fqdn']
-            avi_fqdn3 = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviController03Fqdn']
+            avi_fqdn2 = RequestSpec.json()['tkgsComponentSpec']['aviComponents']['aviController02Fqdn']
+            avi_fqdn3 = RequestSpec.json()['tkgsComponentSpec']['aviComponents']['aviController03Fqdn']
         else:
-            avi_fqdn2 = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController02Fqdn']
-            avi_fqdn3 = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController03Fqdn']
+            avi_fqdn2 = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviController02Fqdn']
+            avi_fqdn3 = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviController03Fqdn']
 
         if govc_client.find_vms_by_name(vm_name=avi_fqdn2, options="-dc "+data_center):
             vm_list.append(avi_fqdn2)
@@ -920,17 +769,12 @@ def fetch_avi_vms(govc_client, env, data_center):
         }
 
         if env == Env.VMC:
-            str_enc_avi = str(request.get_json(force=True)['componentSpec']['aviComponentSpec']['aviPasswordBase64'])
+            password_avi = RequestSpec.secret('componentSpec', 'aviComponentSpec', 'aviPasswordBase64')
         else:
             if isEnvTkgs_wcp(env):
-                str_enc_avi = str(
-                    request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviPasswordBase64'])
+                password_avi = RequestSpec.secret('tkgsComponentSpec', 'aviComponents', 'aviPasswordBase64')
             else:
-                str_enc_avi = str(
-                    request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviPasswordBase64'])
-        base64_bytes_avi = str_enc_avi.encode('ascii')
-        enc_bytes_avi = base64.b64decode(base64_bytes_avi)
-        password_avi = enc_bytes_avi.decode('ascii').rstrip("\n")
+                password_avi = RequestSpec.secret('tkgComponentSpec', 'aviComponents', 'aviPasswordBase64')
         payload = {}
         try:
             response_csrf = requests.request("GET", url, headers=headers, data=payload, verify=False)
@@ -1259,7 +1103,7 @@ def getAllClusters_tkgs(vc_ip, vc_user, password, namspaces, vc_cluster):
     else:
         return None, "Failed to obtain cluster endpoint IP on given cluster - " + vc_cluster
     current_app.logger.info("logging into cluster - " + endpoint_ip)
-    os.putenv("KUBECTL_VSPHERE_PASSWORD", password)
+    os.environ["KUBECTL_VSPHERE_PASSWORD"] = password
     for ns in namspaces:
         connect_command = ["kubectl", "vsphere", "login", "--vsphere-username", vc_ip, "--server",
                            endpoint_ip, "--tanzu-kubernetes-cluster-namespace",
@@ -1292,6 +1136,7 @@ def getAllClusters_tkgs(vc_ip, vc_user, password, namspaces, vc_cluster):
 def delete_nsxt_components(url, header, list_components):
     for element in list_components:
         response = requests.request("DELETE", url + element, headers=header, verify=False)
+        NsxtPager.invalidate(url.rstrip("/"))
         if response.status_code != 200:
             return False, str(response.text)
         else:
@@ -1364,42 +1209,44 @@ def vmc_list_mgw_inventory_groups():
 
 def list_network_segments(env):
     if env == Env.VMC:
-        list_of_segments = [SegmentsName.DISPLAY_NAME_AVI_MANAGEMENT,SegmentsName.DISPLAY_NAME_CLUSTER_VIP,
+        list_of_segments = [SegmentsName.DISPLAY_NAME_AVI_MANAGEMENT, SegmentsName.DISPLAY_NAME_CLUSTER_VIP,
                             SegmentsName.DISPLAY_NAME_TKG_WORKLOAD,
                             SegmentsName.DISPLAY_NAME_TKG_WORKLOAD_DATA_SEGMENT,
                             SegmentsName.DISPLAY_NAME_TKG_SharedService_Segment,
                             SegmentsName.DISPLAY_NAME_AVI_DATA_SEGMENT]
-
-        listOfSegment = NsxtClient(current_app.config).list_segments(gateway_id='cgw')
-        for segment in list_of_segments:
-            if not NsxtClient.find_object(listOfSegment, segment):
-                current_app.logger.info(segment + " network segment not found in environment.")
-                list_of_segments.remove(segment)
+        headers = {
+            "Content-Type": "application/json",
+            "csp-auth-token": current_app.config['access_token']
+        }
+        uri = current_app.config['NSX_REVERSE_PROXY_URL'] + "orgs/" + current_app.config['ORG_ID'] + "/sddcs/" \
+              + current_app.config['SDDC_ID'] + "/policy/api/v1/infra/tier-1s/cgw/segments"
+        output = NsxtPager.list(uri, headers)
 
     elif env == Env.VCF:
-        list_of_segments = [request.get_json(force=True)['tkgComponentSpec']['aviMgmtNetwork']['aviMgmtNetworkName'],
-                            request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadNetworkName'],
-                            request.get_json(force=True)['tkgComponentSpec']['tkgClusterVipNetwork']['tkgClusterVipNetworkName'],
-                            request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec']['tkgSharedserviceNetworkName']]
+        list_of_segments = [RequestSpec.json()['tkgComponentSpec']['aviMgmtNetwork']['aviMgmtNetworkName'],
+                            RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadNetworkName'],
+                            RequestSpec.json()['tkgComponentSpec']['tkgClusterVipNetwork']['tkgClusterVipNetworkName'],
+                            RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec']['tkgSharedserviceNetworkName']]
         headers_ = grabNsxtHeaders()
         if headers_[0] is None:
             current_app.logger.error("Failed to nsxt info " + str(headers_[1]))
             return list_of_segments
         uri = "https://" + headers_[2] + "/policy/api/v1/infra/segments"
         output = getList(headers_[1], uri)
-        if output[1] != 200:
-            current_app.logger.error("Failed to get list of segments " + str(output[0]))
-            return list_of_segments
-
-        for segmentName in list_of_segments:
-            if not checkObjectIsPresentAndReturnPath(output[0], segmentName)[0]:
-                current_app.logger.info(segmentName + " network segment not found in environment.")
-                list_of_segments.remove(segmentName)
 
     else:
-        list_of_segments = []
-
-    return list_of_segments
+        return []
+
+    if output[1] != 200:
+        current_app.logger.error("Failed to get list of segments " + str(output[0]))
+        return list_of_segments
+    found = []
+    for segmentName in list_of_segments:
+        if checkObjectIsPresentAndReturnPath(output[0], segmentName)[0]:
+            found.append(segmentName)
+        else:
+            current_app.logger.info(segmentName + " network segment not found in environment.")
+    return found
 
 
 @cleanup_env.route("/api/tanzu/cleanup-prompt", methods=['POST'])
@@ -1415,30 +1262,27 @@ def cleanup_resources_list():
         return jsonify(d), 500
     env = env[0]
     login()
-    os.putenv("HOME", "/root")
+    os.environ["HOME"] = "/root"
     if env == Env.VSPHERE or env == Env.VCF:
-        vCenter = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterAddress']
-        vCenter_user = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterSsoUser']
-        str_enc = str(request.get_json(force=True)['envSpec']['vcenterDetails']["vcenterSsoPasswordBase64"])
-        base64_bytes = str_enc.encode('ascii')
-        enc_bytes = base64.b64decode(base64_bytes)
-        VC_PASSWORD = enc_bytes.decode('ascii').rstrip("\n")
-        vCenter_datacenter = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterDatacenter']
-        vCenter_cluster = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterCluster']
+        vCenter = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterAddress']
+        vCenter_user = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterSsoUser']
+        VC_PASSWORD = RequestSpec.secret("envSpec", "vcenterDetails", "vcenterSsoPasswordBase64")
+        vCenter_datacenter = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterDatacenter']
+        vCenter_cluster = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterCluster']
 
         if isEnvTkgs_ns(env) or isEnvTkgs_wcp(env):
             parent_rp = None
         else:
-            parent_rp = request.get_json(force=True)['envSpec']['vcenterDetails']["resourcePoolName"]
-            management_cluster = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents']['tkgMgmtClusterName']
+            parent_rp = RequestSpec.json()['envSpec']['vcenterDetails']["resourcePoolName"]
+            management_cluster = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents']['tkgMgmtClusterName']
             if env == Env.VCF:
-                shared_cluster = request.get_json(force=True)['tkgComponentSpec']["tkgSharedserviceSpec"]['tkgSharedserviceClusterName']
+                shared_cluster = RequestSpec.json()['tkgComponentSpec']["tkgSharedserviceSpec"]['tkgSharedserviceClusterName']
             else:
-                shared_cluster = request.get_json(force=True)['tkgComponentSpec']["tkgMgmtComponents"]['tkgSharedserviceClusterName']
-            workload_cluster = request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadClusterName']
+                shared_cluster = RequestSpec.json()['tkgComponentSpec']["tkgMgmtComponents"]['tkgSharedserviceClusterName']
+            workload_cluster = RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadClusterName']
 
     elif env == Env.VMC:
-        status = fetch_vmc_env(request.get_json(force=True))
+        status = fetch_vmc_env(RequestSpec.json())
         if status[1] != 200:
             d = {
                 "responseType": "ERROR",
@@ -1457,12 +1301,12 @@ def cleanup_resources_list():
                 "STATUS_CODE": 500
             }
             return jsonify(d), 500
-        vCenter_datacenter = request.get_json(force=True)['envSpec']['sddcDatacenter']
-        vCenter_cluster = request.get_json(force=True)['envSpec']['sddcCluster']
-        parent_rp = request.get_json(force=True)['envSpec']['resourcePoolName']
-        management_cluster = request.get_json(force=True)['componentSpec']['tkgMgmtSpec']['tkgMgmtClusterName']
-        shared_cluster = request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec']['tkgSharedClusterName']
-        workload_cluster = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec']['tkgWorkloadClusterName']
+        vCenter_datacenter = RequestSpec.json()['envSpec']['sddcDatacenter']
+        vCenter_cluster = RequestSpec.json()['envSpec']['sddcCluster']
+        parent_rp = RequestSpec.json()['envSpec']['resourcePoolName']
+        management_cluster = RequestSpec.json()['componentSpec']['tkgMgmtSpec']['tkgMgmtClusterName']
+        shared_cluster = RequestSpec.json()['componentSpec']['tkgSharedServiceSpec']['tkgSharedClusterName']
+        workload_cluster = RequestSpec.json()['componentSpec']['tkgWorkloadSpec']['tkgWorkloadClusterName']
 
     govc_client = GovcClient(current_app.config, LocalCmdHelper())
     GovcClient.set_env_vars(govc_client)
@@ -9,6 +9,7 @@ import json
 import ntplib
 import hashlib
 import subprocess
+import tempfile
 from time import ctime
 from common.operation.constants import AviSize, Extentions, MarketPlaceUrl, ResourcePoolAndFolderName, Cloud, Versions, AkoType, \
     CIDR, PLAN, \
@@ -20,13 +21,13 @@ import os
 import re
 import socket
 import struct
+import threading
 import time
 from pathlib import Path
 import OpenSSL
 import requests
 import ruamel
 import yaml
-from pyVim import connect
 
 from common.certificate_base64 import getBase64CertWriteToFile, repoAdd
 from common.operation.ShellHelper import runShellCommandAndReturnOutput, runShellCommandWithPolling, \
@@ -39,25 +40,36 @@ from common.operation.constants import Versions, CIDR, TmcUser, \
     VrfType, Repo, AppName, Type, VCF, ControllerLocation, KubernetesOva, EnvType, Tkg_Extention_names, VeleroAPI, \
     Tkgs_Extension_Details
 from common.operation.vcenter_operations import createResourcePool, create_folder
+from common.operation.vcenter_session import VcenterSessionPool
 from common.replace_value import generateVsphereConfiguredSubnets, generateVsphereConfiguredSubnetsForSe
 from common.replace_value import replaceValue
 from flask import current_app, jsonify, request
 from requests.packages.urllib3.exceptions import InsecureRequestWarning
+from common.util.avi_client import AviClient
+from common.util.wait_helper import WaitHelper
+from common.util.kube_watch import ReconcileWatcher, watch_scope
+from common.util.download_helper import DownloadHelper, marketplace_file_info
 from ruamel import yaml as ryaml
 from common.util.file_helper import FileHelper
-from jinja2 import Template
+from common.util.template_registry import TemplateRegistry
+from common.util.ping_sweep import PingSweep
+from common.util.package_catalog import PackageCatalog
+from common.util.nsxt_desired_state import NsxtDesiredState
+from common.util.nsxt_pager import NsxtPager
 from common.operation.constants import Paths
 from tqdm import tqdm
-from yaml import SafeLoader
 from .constants.alb_api_constants import AlbPayload, AlbEndpoint
 from .lib.govc_client import GovcClient
 from .replace_value import replaceValueSysConfig, replaceCertConfig
 from common.util.local_cmd_helper import LocalCmdHelper
+from common.util.request_spec import RequestSpec
 from datetime import datetime
 
 requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
 
 TKGS_PROXY_CREDENTIAL_NAME = "sivt_credential"
+# Longest wait for a cluster registered or attached to TMC to report a ready, healthy agent.
+TMC_REGISTRATION_TIMEOUT = 1200
 
 
 def envCheck():
@@ -203,10 +215,10 @@ def createResourceFolderAndWait(vcenter_ip, vcenter_username, password,
 
 
 def validateFolderAndResourcesAvailable(folder, resources, vcenter_ip, vcenter_username, password, parent_resourcepool):
-    os.putenv("GOVC_URL", "https://" + vcenter_ip + "/sdk")
-    os.putenv("GOVC_USERNAME", vcenter_username)
-    os.putenv("GOVC_PASSWORD", password)
-    os.putenv("GOVC_INSECURE", "true")
+    os.environ["GOVC_URL"] = "https://" + vcenter_ip + "/sdk"
+    os.environ["GOVC_USERNAME"] = vcenter_username
+    os.environ["GOVC_PASSWORD"] = password
+    os.environ["GOVC_INSECURE"] = "true"
     find_command = ["govc", "find", "-name", folder]
     count = 0
     while count < 120:
@@ -226,10 +238,10 @@ def validateFolderAndResourcesAvailable(folder, resources, vcenter_ip, vcenter_u
 
 
 def validateNetworkAvailable(netWorkName, vcenter_ip, vcenter_username, password):
-    os.putenv("GOVC_URL", "https://" + vcenter_ip + "/sdk")
-    os.putenv("GOVC_USERNAME", vcenter_username)
-    os.putenv("GOVC_PASSWORD", password)
-    os.putenv("GOVC_INSECURE", "true")
+    os.environ["GOVC_URL"] = "https://" + vcenter_ip + "/sdk"
+    os.environ["GOVC_USERNAME"] = vcenter_username
+    os.environ["GOVC_PASSWORD"] = password
+    os.environ["GOVC_INSECURE"] = "true"
     find_command = ["govc", "find", "-name", netWorkName]
     count = 0
     while count < 120:
@@ -251,11 +263,11 @@ def deployAndConfigureAvi(govc_client: GovcClient, vm_name, controller_ova_locat
             current_app.logger.info("Deploying avi controller..")
             govc_client.deploy_library_ova(location=controller_ova_location, name=vm_name, options=deploy_options)
             if env == Env.VMC:
-                avi_size = request.get_json(force=True)['componentSpec']['aviComponentSpec']['aviSize']
+                avi_size = RequestSpec.json()['componentSpec']['aviComponentSpec']['aviSize']
             elif isEnvTkgs_wcp(env):
-                avi_size = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviSize']
+                avi_size = RequestSpec.json()['tkgsComponentSpec']['aviComponents']['aviSize']
             else:
-                avi_size = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviSize']
+                avi_size = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviSize']
             size = str(avi_size).lower()
             if size not in ["essentials", "small", "medium", "large"]:
                 current_app.logger.error("Wrong avi size provided supported  essentials/small/medium/large " + avi_size)
@@ -448,7 +460,7 @@ def changeSeGroupAndSetInterfaces(ip, csrf2, urlFromServiceEngine, aviVersion):
     with open('./detailsOfServiceEngine1.json', 'r') as openfile:
         json_object = json.load(openfile)
     json_object_m = json.dumps(json_object, indent=4)
-    response_csrf = requests.request("PUT", url, headers=headers, data=json_object_m, verify=False, timeout=600)
+    response_csrf = AviClient.for_controller(ip).request("PUT", url, headers=headers, data=json_object_m, verify=False, timeout=600)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -466,7 +478,7 @@ def get_avi_cluster_info(ip, csrf2, aviVersion):
     }
     url = AlbEndpoint.AVI_HA.format(ip=ip)
     try:
-        response_csrf = requests.request("GET", url, headers=headers, verify=False)
+        response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, verify=False)
         if response_csrf.status_code != 200:
             return None, response_csrf.text
         return response_csrf.json(), "SUCCESS"
@@ -493,10 +505,10 @@ def form_avi_ha_cluster(ip, env, govc_client, aviVersion):
         if info is None:
             return None, "Failed to get cluster info " + str(status)
         if isEnvTkgs_wcp(env):
-            avi_ip = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviController01Ip']
-            avi_ip2 = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviController02Ip']
-            avi_ip3 = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviController03Ip']
-            clusterIp = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviClusterIp']
+            avi_ip = RequestSpec.json()['tkgsComponentSpec']['aviComponents']['aviController01Ip']
+            avi_ip2 = RequestSpec.json()['tkgsComponentSpec']['aviComponents']['aviController02Ip']
+            avi_ip3 = RequestSpec.json()['tkgsComponentSpec']['aviComponents']['aviController03Ip']
+            clusterIp = RequestSpec.json()['tkgsComponentSpec']['aviComponents']['aviClusterIp']
         elif env == Env.VMC:
             avi_ip = ip
             avi_ip2 = govc_client.get_vm_ip(ControllerLocation.CONTROLLER_NAME2, datacenter_name=data_center)[0]
@@ -505,12 +517,12 @@ def form_avi_ha_cluster(ip, env, govc_client, aviVersion):
             avi_ip3 = govc_client.get_vm_ip(ControllerLocation.CONTROLLER_NAME3, datacenter_name=data_center)[0]
             if avi_ip3 is None:
                 return None, "Failed to get 3rd controller ip"
-            clusterIp = request.get_json(force=True)['componentSpec']['aviComponentSpec']['aviClusterIp']
+            clusterIp = RequestSpec.json()['componentSpec']['aviComponentSpec']['aviClusterIp']
         else:
-            avi_ip = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController01Ip']
-            avi_ip2 = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController02Ip']
-            avi_ip3 = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController03Ip']
-            clusterIp = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviClusterIp']
+            avi_ip = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviController01Ip']
+            avi_ip2 = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviController02Ip']
+            avi_ip3 = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviController03Ip']
+            clusterIp = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviClusterIp']
         nodes = info["nodes"]
         _list = []
         _cluster = {}
@@ -534,14 +546,14 @@ def form_avi_ha_cluster(ip, env, govc_client, aviVersion):
                                                    cluster_ip3=avi_ip3, tennat_uuid_get=info["tenant_uuid"],
                                                    virtual_ip_get=clusterIp)
         url = AlbEndpoint.AVI_HA.format(ip=ip)
-        response_csrf = requests.request("PUT", url, headers=headers, data=payload, verify=False)
+        response_csrf = AviClient.for_controller(ip).request("PUT", url, headers=headers, data=payload, verify=False)
         if response_csrf.status_code != 200:
             return None, response_csrf.text
         count = 0
         list_of_nodes = []
         while count < 180:
             try:
-                response_csrf = requests.request("GET", url, headers=headers, verify=False)
+                response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, verify=False)
                 if len(response_csrf.json()["nodes"]) == 3:
                     for node in response_csrf.json()["nodes"]:
                         list_of_nodes.append(node["ip"]["addr"])
@@ -560,7 +572,7 @@ def form_avi_ha_cluster(ip, env, govc_client, aviVersion):
         all_up = False
         while runtime < 180:
             try:
-                response_csrf = requests.request("GET", run_time_url, headers=headers, verify=False)
+                response_csrf = AviClient.for_controller(ip).request("GET", run_time_url, headers=headers, verify=False)
                 if response_csrf.status_code != 200:
                     return None, "Failed to get cluster runtime status " + (str(response_csrf.text))
                 node_statuses = response_csrf.json()["node_states"]
@@ -600,7 +612,7 @@ def get_ssl_certificate_status(ip, csrf2, name, aviVersion):
     }
     url = "https://" + ip + "/api/sslkeyandcertificate"
     json_object = json.dumps(body, indent=4)
-    response_csrf = requests.request("GET", url, headers=headers, data=json_object, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=json_object, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -625,7 +637,7 @@ def import_ssl_certificate(ip, csrf2, certificate, certificate_key, env, avi_ver
     else:
         certName = CertName.VSPHERE_CERT_NAME
     url = AlbEndpoint.IMPORT_SSL_CERTIFICATE.format(ip=ip)
-    response_csrf = requests.request("POST", url, headers=headers, data=body, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("POST", url, headers=headers, data=body, verify=False)
     if response_csrf.status_code != 201:
         return None, response_csrf.text
     else:
@@ -665,7 +677,7 @@ def create_imported_ssl_certificate(ip, csrf2, dic, cer, key, env, avi_version):
         "x-csrftoken": csrf2[0]
     }
     url = AlbEndpoint.CRUD_SSL_CERT.format(ip=ip)
-    response_csrf = requests.request("POST", url, headers=headers, data=body, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("POST", url, headers=headers, data=body, verify=False)
     if response_csrf.status_code != 201:
         return None, response_csrf.text
     else:
@@ -683,7 +695,7 @@ def generate_ssl_certificate(ip, csrf2, avi_version):
         avi_ip3 = govc_client.get_vm_ip(ControllerLocation.CONTROLLER_NAME3, datacenter_name=data_center)
         if avi_ip3 is None:
             return None, "Failed to get 3rd controller ip"
-        clusterIp = request.get_json(force=True)['componentSpec']['aviComponentSpec']['aviClusterIp']
+        clusterIp = RequestSpec.json()['componentSpec']['aviComponentSpec']['aviClusterIp']
         ips.append(avi_ip2)
         ips.append(avi_ip3)
         ips.append(clusterIp)
@@ -698,7 +710,7 @@ def generate_ssl_certificate(ip, csrf2, avi_version):
         "x-csrftoken": csrf2[0]
     }
     url = AlbEndpoint.CRUD_SSL_CERT.format(ip=ip)
-    response_csrf = requests.request("POST", url, headers=headers, data=body, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("POST", url, headers=headers, data=body, verify=False)
     if response_csrf.status_code != 201:
         return None, response_csrf.text
     else:
@@ -710,19 +722,19 @@ def generate_ssl_certificate_vsphere(ip, csrf2, avi_fqdn, avi_version):
     ips = [str(ip), common_name]
     if isAviHaEnabled(Env.VSPHERE) or isAviHaEnabled(Env.VCF):
         if isEnvTkgs_wcp(Env.VSPHERE):
-            avi_fqdn2 = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviController02Fqdn']
-            avi_ip2 = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviController02Ip']
-            avi_fqdn3 = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviController03Fqdn']
-            avi_ip3 = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviController03Ip']
-            clusterIp = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviClusterIp']
-            cluster_fqdn = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']["aviClusterFqdn"]
-        else:
-            avi_fqdn2 = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController02Fqdn']
-            avi_ip2 = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController02Ip']
-            avi_fqdn3 = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController03Fqdn']
-            avi_ip3 = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController03Ip']
-            clusterIp = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviClusterIp']
-            cluster_fqdn = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviClusterFqdn']
+            avi_fqdn2 = RequestSpec.json()['tkgsComponentSpec']['aviComponents']['aviController02Fqdn']
+            avi_ip2 = RequestSpec.json()['tkgsComponentSpec']['aviComponents']['aviController02Ip']
+            avi_fqdn3 = RequestSpec.json()['tkgsComponentSpec']['aviComponents']['aviController03Fqdn']
+            avi_ip3 = RequestSpec.json()['tkgsComponentSpec']['aviComponents']['aviController03Ip']
+            clusterIp = RequestSpec.json()['tkgsComponentSpec']['aviComponents']['aviClusterIp']
+            cluster_fqdn = RequestSpec.json()['tkgsComponentSpec']['aviComponents']["aviClusterFqdn"]
+        else:
+            avi_fqdn2 = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviController02Fqdn']
+            avi_ip2 = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviController02Ip']
+            avi_fqdn3 = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviController03Fqdn']
+            avi_ip3 = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviController03Ip']
+            clusterIp = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviClusterIp']
+            cluster_fqdn = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviClusterFqdn']
         ips.append(avi_ip2)
         ips.append(avi_fqdn2)
         ips.append(avi_ip3)
@@ -741,7 +753,7 @@ def generate_ssl_certificate_vsphere(ip, csrf2, avi_fqdn, avi_version):
         "x-csrftoken": csrf2[0]
     }
     url = AlbEndpoint.CRUD_SSL_CERT.format(ip=ip)
-    response_csrf = requests.request("POST", url, headers=headers, data=body, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("POST", url, headers=headers, data=body, verify=False)
     if response_csrf.status_code != 201:
         return None, response_csrf.text
     else:
@@ -759,7 +771,7 @@ def get_current_cert_config(ip, csrf2, generated_ssl_url, avi_version):
     }
     body = {}
     url = AlbEndpoint.CRUD_SYSTEM_CONFIG.format(ip=ip)
-    response_csrf = requests.request("GET", url, headers=headers, data=body, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=body, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -786,7 +798,7 @@ def replaceWithNewCert(ip, csrf2, aviVersion):
         "x-csrftoken": csrf2[0]
     }
     url = "https://" + ip + "/api/systemconfiguration/?include_name="
-    response_csrf = requests.request("PUT", url, headers=headers, data=json_object_mo, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("PUT", url, headers=headers, data=json_object_mo, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -804,23 +816,17 @@ def setBackupPhrase(ip, seconcsrf, url_backup, aviVersion, env):
         "x-csrftoken": seconcsrf[0]
     }
     if env == Env.VMC:
-        str_enc_avi_backup = str(
-            request.get_json(force=True)['componentSpec']['aviComponentSpec']['aviBackupPassPhraseBase64'])
+        password_avi_backup = RequestSpec.secret("componentSpec", "aviComponentSpec", "aviBackupPassPhraseBase64")
     else:
         if isEnvTkgs_wcp(env):
-            str_enc_avi_backup = str(
-                request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviBackupPassphraseBase64'])
+            password_avi_backup = RequestSpec.secret("tkgsComponentSpec", "aviComponents", "aviBackupPassphraseBase64")
         else:
-            str_enc_avi_backup = str(
-                request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviBackupPassphraseBase64'])
-    base64_bytes_avi_backup = str_enc_avi_backup.encode('ascii')
-    enc_bytes_avi_backup = base64.b64decode(base64_bytes_avi_backup)
-    password_avi_backup = enc_bytes_avi_backup.decode('ascii').rstrip("\n")
+            password_avi_backup = RequestSpec.secret("tkgComponentSpec", "aviComponents", "aviBackupPassphraseBase64")
     body = {
         "add": {"backup_passphrase": password_avi_backup}
     }
     json_object = json.dumps(body, indent=4)
-    response_csrf = requests.request("PATCH", url, headers=headers, data=json_object, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("PATCH", url, headers=headers, data=json_object, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -839,7 +845,7 @@ def get_backup_configuration(ip, second_csrf, avi_version):
     }
     body = {}
     json_object = json.dumps(body, indent=4)
-    response_csrf = requests.request("GET", url, headers=headers, data=json_object, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=json_object, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -857,7 +863,7 @@ def disable_welcome_screen(ip, second_csrf, avi_version, env):
         "x-csrftoken": second_csrf[0]
     }
     body = AlbPayload.WELCOME_SCREEN_UPDATE.format(tenant_vrf=json.dumps(env == Env.VMC))
-    response_csrf = requests.request("PATCH", url, headers=headers, data=body, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("PATCH", url, headers=headers, data=body, verify=False)
     if response_csrf.status_code != 200:
         return None
     else:
@@ -877,7 +883,7 @@ def set_dns_ntp_smtp_settings(ip, second_csrf, avi_version):
         "x-csrftoken": second_csrf[0]
     }
     json_object_m = json.dumps(json_object, indent=4)
-    response_csrf = requests.request("PUT", url, headers=headers, data=json_object_m, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("PUT", url, headers=headers, data=json_object_m, verify=False)
     if response_csrf.status_code != 200:
         return None
     else:
@@ -895,19 +901,19 @@ def get_system_configuration_and_set_values(ip, second_csrf, avi_version, env):
         "x-csrftoken": second_csrf[0]
     }
     payload = {}
-    response_csrf = requests.request("GET", url, headers=headers, data=payload, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload, verify=False)
     if response_csrf.status_code != 200:
         return None
     os.system("rm -rf ./systemConfig1.json")
     json_object = json.dumps(response_csrf.json(), indent=4)
     if env == Env.VMC:
-        ntp = request.get_json(force=True)['envVariablesSpec']['ntpServersIp']
-        dns = request.get_json(force=True)['envVariablesSpec']['dnsServersIp']
-        search_domain = request.get_json(force=True)['envVariablesSpec']['searchDomains']
+        ntp = RequestSpec.json()['envVariablesSpec']['ntpServersIp']
+        dns = RequestSpec.json()['envVariablesSpec']['dnsServersIp']
+        search_domain = RequestSpec.json()['envVariablesSpec']['searchDomains']
     else:
-        ntp = request.get_json(force=True)['envSpec']['infraComponents']['ntpServers']
-        dns = request.get_json(force=True)['envSpec']['infraComponents']['dnsServersIp']
-        search_domain = request.get_json(force=True)['envSpec']['infraComponents']['searchDomains']
+        ntp = RequestSpec.json()['envSpec']['infraComponents']['ntpServers']
+        dns = RequestSpec.json()['envSpec']['infraComponents']['dnsServersIp']
+        search_domain = RequestSpec.json()['envSpec']['infraComponents']['searchDomains']
     with open("./systemConfig1.json", "w") as outfile:
         outfile.write(json_object)
     replaceValueSysConfig("./systemConfig1.json", "default_license_tier", "name", "ENTERPRISE")
@@ -934,24 +940,19 @@ def set_avi_admin_password(ip, first_csrf, avi_version, env):
         "x-csrftoken": first_csrf[0]
     }
     if env == Env.VMC:
-        str_enc_avi = str(request.get_json(force=True)['componentSpec']['aviComponentSpec']['aviPasswordBase64'])
+        password_avi = RequestSpec.secret("componentSpec", "aviComponentSpec", "aviPasswordBase64")
     else:
         if isEnvTkgs_wcp(env):
-            str_enc_avi = str(
-                request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviPasswordBase64'])
+            password_avi = RequestSpec.secret("tkgsComponentSpec", "aviComponents", "aviPasswordBase64")
         else:
-            str_enc_avi = str(
-                request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviPasswordBase64'])
-    base64_bytes_avi = str_enc_avi.encode('ascii')
-    enc_bytes_avi = base64.b64decode(base64_bytes_avi)
-    password_avi = enc_bytes_avi.decode('ascii').rstrip("\n")
+            password_avi = RequestSpec.secret("tkgComponentSpec", "aviComponents", "aviPasswordBase64")
     payload = {"old_password": "58NFaGDJm(PJH0G",
                "password": password_avi,
                "username": "admin"
                }
     modified_payload = json.dumps(payload, indent=4)
     url = "https://" + ip + "/api/useraccount"
-    response_csrf = requests.request("PUT", url, headers=headers, data=modified_payload, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("PUT", url, headers=headers, data=modified_payload, verify=False)
     if response_csrf.status_code != 200:
         return None
     else:
@@ -959,37 +960,18 @@ def set_avi_admin_password(ip, first_csrf, avi_version, env):
 
 
 def obtain_second_csrf(ip, env):
-    url = "https://" + str(ip) + "/login"
-    headers = {
-        "Accept": "application/json",
-        "Content-Type": "application/json"
-    }
     if env == Env.VMC:
-        str_enc_avi = str(request.get_json(force=True)['componentSpec']['aviComponentSpec']['aviPasswordBase64'])
+        password_avi = RequestSpec.secret("componentSpec", "aviComponentSpec", "aviPasswordBase64")
     else:
         if isEnvTkgs_wcp(env):
-            str_enc_avi = str(
-                request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviPasswordBase64'])
+            password_avi = RequestSpec.secret("tkgsComponentSpec", "aviComponents", "aviPasswordBase64")
         else:
-            str_enc_avi = str(
-                request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviPasswordBase64'])
-    base64_bytes_avi = str_enc_avi.encode('ascii')
-    enc_bytes_avi = base64.b64decode(base64_bytes_avi)
-    password_avi = enc_bytes_avi.decode('ascii').rstrip("\n")
-    payload = {
-        "username": "admin",
-        "password": password_avi
-    }
-    modified_payload = json.dumps(payload, indent=4)
-    response_csrf = requests.request("POST", url, headers=headers, data=modified_payload, verify=False)
-    if response_csrf.status_code != 200:
+            password_avi = RequestSpec.secret("tkgComponentSpec", "aviComponents", "aviPasswordBase64")
+    token = AviClient.for_controller(ip).login("admin", password_avi)
+    if token is None:
         return None
-    cookies_string = ""
-    cookiesString = requests.utils.dict_from_cookiejar(response_csrf.cookies)
-    for key, value in cookiesString.items():
-        cookies_string += key + "=" + value + "; "
-    current_app.config['csrftoken'] = cookiesString['csrftoken']
-    return cookiesString['csrftoken'], cookies_string
+    current_app.config['csrftoken'] = token.csrf_token
+    return token.csrf2
 
 
 def obtain_avi_version(ip, env):
@@ -999,30 +981,28 @@ def obtain_avi_version(ip, env):
         "Content-Type": "application/json"
     }
     if env == Env.VMC:
-        str_enc_avi = str(request.get_json(force=True)['componentSpec']['aviComponentSpec']['aviPasswordBase64'])
+        password_avi = RequestSpec.secret("componentSpec", "aviComponentSpec", "aviPasswordBase64")
     else:
         if isEnvTkgs_wcp(env):
-            str_enc_avi = str(
-                request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviPasswordBase64'])
+            password_avi = RequestSpec.secret("tkgsComponentSpec", "aviComponents", "aviPasswordBase64")
         else:
-            str_enc_avi = str(
-                request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviPasswordBase64'])
-    base64_bytes_avi = str_enc_avi.encode('ascii')
-    enc_bytes_avi = base64.b64decode(base64_bytes_avi)
-    password_avi = enc_bytes_avi.decode('ascii').rstrip("\n")
+            password_avi = RequestSpec.secret("tkgComponentSpec", "aviComponents", "aviPasswordBase64")
+    token = AviClient.for_controller(ip).login("admin", password_avi)
+    if token is not None and token.version is not None:
+        return token.version, 200
     payload = {
         "username": "admin",
         "password": password_avi
     }
     modified_payload = json.dumps(payload, indent=4)
-    response_avi = requests.request("POST", url, headers=headers, data=modified_payload, verify=False)
+    response_avi = AviClient.for_controller(ip).request("POST", url, headers=headers, data=modified_payload, verify=False, with_session=False)
     if response_avi.status_code != 200:
         default = {
             "username": "admin",
             "password": "58NFaGDJm(PJH0G"
         }
         modified_payload = json.dumps(default, indent=4)
-        response_avi = requests.request("POST", url, headers=headers, data=modified_payload, verify=False)
+        response_avi = AviClient.for_controller(ip).request("POST", url, headers=headers, data=modified_payload, verify=False, with_session=False)
         if response_avi.status_code != 200:
             return None, response_avi.text
     return response_avi.json()["version"]["Version"], 200
@@ -1039,7 +1019,7 @@ def obtain_first_csrf(ip):
         "password": "58NFaGDJm(PJH0G"
     }
     modified_payload = json.dumps(payload, indent=4)
-    response_csrf = requests.request("POST", url, headers=headers, data=modified_payload, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("POST", url, headers=headers, data=modified_payload, verify=False, with_session=False)
     if response_csrf.status_code != 200:
         if str(response_csrf.text).__contains__("Invalid credentials"):
             return "SUCCESS"
@@ -1058,32 +1038,19 @@ def check_controller_is_up(ip):
         "Content-Type": "application/json"
     }
     payload = {}
-    response_login = None
-    count = 0
-    status = None
-    try:
-        response_login = requests.request("GET", url, headers=headers, data=payload, verify=False)
-        status = response_login.status_code
-    except:
-        pass
-    while (status != 200 or status is None) and count < 150:
-        count = count + 1
-        try:
-            response_login = requests.request("GET", url, headers=headers, data=payload, verify=False)
-            if response_login.status_code == 200:
-                break
-        except:
-            pass
-        current_app.logger.info("Waited for  " + str(count * 10) + "s, retrying.")
-        time.sleep(10)
-    if response_login is not None:
-        if response_login.status_code != 200:
+    wait = WaitHelper.wait_for(
+        lambda: AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload, verify=False,
+                                                     with_session=False),
+        lambda response: response.status_code == 200, timeout=1500, ignore_errors=True,
+        description="AVI controller " + str(ip), log=current_app.logger)
+    if wait.value is not None:
+        if wait.value.status_code != 200:
             return None
         else:
-            current_app.logger.info("Controller is up and running in   " + str(count * 10) + "s.")
+            current_app.logger.info("Controller is up and running in   " + str(int(wait.elapsed)) + "s.")
             return "UP"
     else:
-        current_app.logger.error("Controller is not reachable even after " + str(count * 10) + "s wait")
+        current_app.logger.error("Controller is not reachable even after " + str(int(wait.elapsed)) + "s wait")
         return None
 
 
@@ -1100,7 +1067,7 @@ def check_arcas_proxy_enabled(env):
         enableArcasProxy = "false"
     elif env == Env.VSPHERE or env == Env.VCF:
         try:
-            enableArcasProxy = str(request.get_json(force=True)['envSpec']['proxySpec']['arcasVm']['enableProxy'])
+            enableArcasProxy = str(RequestSpec.json()['envSpec']['proxySpec']['arcasVm']['enableProxy'])
         except Exception as e:
             enableArcasProxy = "false"
     else:
@@ -1117,23 +1084,23 @@ def enableProxy(env):
             enable_arcas_proxy = "false"
         elif isEnvTkgs_wcp(env) or isEnvTkgs_ns(env):
             enable_arcas_proxy = str(
-                request.get_json(force=True)['tkgsComponentSpec']['tkgServiceConfig']['proxySpec']['enableProxy'])
+                RequestSpec.json()['tkgsComponentSpec']['tkgServiceConfig']['proxySpec']['enableProxy'])
         elif env == Env.VSPHERE or env == Env.VCF:
             enable_arcas_proxy = str(
-                request.get_json(force=True)['envSpec']['proxySpec']['arcasVm']['enableProxy'])
+                RequestSpec.json()['envSpec']['proxySpec']['arcasVm']['enableProxy'])
         else:
             current_app.logger.info("Wrong env type " + env)
             return 500
         if enable_arcas_proxy.lower() == "true":
             if isEnvTkgs_wcp(env) or isEnvTkgs_ns(env):
-                httpProxy = str(request.get_json(force=True)['tkgsComponentSpec']['tkgServiceConfig']['proxySpec']['httpProxy'])
-                httpsProxy = str(request.get_json(force=True)['tkgsComponentSpec']['tkgServiceConfig']['proxySpec']['httpsProxy'])
-                noProxy = str(request.get_json(force=True)['tkgsComponentSpec']['tkgServiceConfig']['proxySpec']['noProxy'])
+                httpProxy = str(RequestSpec.json()['tkgsComponentSpec']['tkgServiceConfig']['proxySpec']['httpProxy'])
+                httpsProxy = str(RequestSpec.json()['tkgsComponentSpec']['tkgServiceConfig']['proxySpec']['httpsProxy'])
+                noProxy = str(RequestSpec.json()['tkgsComponentSpec']['tkgServiceConfig']['proxySpec']['noProxy'])
                 noProxy = noProxy.strip("\n").strip(" ").strip("\r")
             else:
-                httpProxy = str(request.get_json(force=True)['envSpec']['proxySpec']['arcasVm']['httpProxy'])
-                httpsProxy = str(request.get_json(force=True)['envSpec']['proxySpec']['arcasVm']['httpsProxy'])
-                noProxy = str(request.get_json(force=True)['envSpec']['proxySpec']['arcasVm']['noProxy'])
+                httpProxy = str(RequestSpec.json()['envSpec']['proxySpec']['arcasVm']['httpProxy'])
+                httpsProxy = str(RequestSpec.json()['envSpec']['proxySpec']['arcasVm']['httpsProxy'])
+                noProxy = str(RequestSpec.json()['envSpec']['proxySpec']['arcasVm']['noProxy'])
                 noProxy = noProxy.strip("\n").strip(" ").strip("\r")
             if noProxy:
                 noProxy = ", " + noProxy
@@ -1186,36 +1153,45 @@ Environment="NO_PROXY=localhost,127.0.0.1{noProxy}"
 
 def validate_proxy_starts_wit_http(env, isShared, isWorkload):
     if checkMgmtProxyEnabled(env):
-        httpMgmtProxy = str(request.get_json(force=True)['envSpec']['proxySpec']['tkgMgmt']['httpProxy'])
-        httpsMgmtProxy = str(request.get_json(force=True)['envSpec']['proxySpec']['tkgMgmt']['httpsProxy'])
+        httpMgmtProxy = str(RequestSpec.json()['envSpec']['proxySpec']['tkgMgmt']['httpProxy'])
+        httpsMgmtProxy = str(RequestSpec.json()['envSpec']['proxySpec']['tkgMgmt']['httpsProxy'])
         if not httpMgmtProxy.startswith("http://") or not httpsMgmtProxy.startswith("http://"):
             return "management"
     if checkSharedServiceProxyEnabled(env) and isShared:
-        httpProxy = str(request.get_json(force=True)['envSpec']['proxySpec']['tkgSharedservice']['httpProxy'])
-        httpsProxy = str(request.get_json(force=True)['envSpec']['proxySpec']['tkgSharedservice']['httpsProxy'])
+        httpProxy = str(RequestSpec.json()['envSpec']['proxySpec']['tkgSharedservice']['httpProxy'])
+        httpsProxy = str(RequestSpec.json()['envSpec']['proxySpec']['tkgSharedservice']['httpsProxy'])
         if not httpProxy.startswith("http://") or not httpsProxy.startswith("http://"):
             return "shared"
     if checkWorkloadProxyEnabled(env) and isWorkload:
-        httpProxy = str(request.get_json(force=True)['envSpec']['proxySpec']['tkgWorkload']['httpProxy'])
-        httpsProxy = str(request.get_json(force=True)['envSpec']['proxySpec']['tkgWorkload']['httpsProxy'])
+        httpProxy = str(RequestSpec.json()['envSpec']['proxySpec']['tkgWorkload']['httpProxy'])
+        httpsProxy = str(RequestSpec.json()['envSpec']['proxySpec']['tkgWorkload']['httpsProxy'])
         if not httpProxy.startswith("http://") or not httpsProxy.startswith("http://"):
             return "workload"
     try:
-        enableArcasProxy = str(request.get_json(force=True)['envSpec']['proxySpec']['arcasVm']['enableProxy'])
+        enableArcasProxy = str(RequestSpec.json()['envSpec']['proxySpec']['arcasVm']['enableProxy'])
     except:
         return "Success"
     if enableArcasProxy.lower() == "true":
-        httpProxy = str(request.get_json(force=True)['envSpec']['proxySpec']['arcasVm']['httpProxy'])
-        httpsProxy = str(request.get_json(force=True)['envSpec']['proxySpec']['arcasVm']['httpsProxy'])
+        httpProxy = str(RequestSpec.json()['envSpec']['proxySpec']['arcasVm']['httpProxy'])
+        httpsProxy = str(RequestSpec.json()['envSpec']['proxySpec']['arcasVm']['httpsProxy'])
         if not httpProxy.startswith("http://") or not httpsProxy.startswith("http://"):
             return "arcas"
     return "Success"
 
 
+# Shared services and workload cluster configurations running side by side both disable the proxy.
+proxy_lock = threading.Lock()
+
+
 def disable_proxy():
-    os.unsetenv("http_proxy")
-    os.unsetenv("https_proxy")
-    os.unsetenv("no_proxy")
+    with proxy_lock:
+        _disable_proxy()
+
+
+def _disable_proxy():
+    os.environ.pop("http_proxy", None)
+    os.environ.pop("https_proxy", None)
+    os.environ.pop("no_proxy", None)
     os.system("cat > /etc/sysconfig/proxy << EOF\n"
               "PROXY_ENABLED=\"no\"\n"
               "HTTP_PROXY=\"\"\n"
@@ -1241,7 +1217,7 @@ def disableProxyWrapper(env):
                 disableArcasProxy = "false"
             else:
                 disableArcasProxy = str(
-                    request.get_json(force=True)['envSpec']['proxySpec']['arcasVm']['disable-proxy'])
+                    RequestSpec.json()['envSpec']['proxySpec']['arcasVm']['disable-proxy'])
         else:
             current_app.logger.info("Wrong env type " + env)
             return 500
@@ -1277,7 +1253,7 @@ def checkMgmtProxyEnabled(env):
         mgmt_proxy = "false"
     else:
         try:
-            mgmt_proxy = request.get_json(force=True)['envSpec']['proxySpec']['tkgMgmt']['enableProxy']
+            mgmt_proxy = RequestSpec.json()['envSpec']['proxySpec']['tkgMgmt']['enableProxy']
         except:
             return False
     if mgmt_proxy.lower() == "true":
@@ -1291,7 +1267,7 @@ def checkSharedServiceProxyEnabled(env):
         shared_proxy = "false"
     else:
         try:
-            shared_proxy = request.get_json(force=True)['envSpec']['proxySpec']['tkgSharedservice']['enableProxy']
+            shared_proxy = RequestSpec.json()['envSpec']['proxySpec']['tkgSharedservice']['enableProxy']
         except:
             return False
     if shared_proxy.lower() == "true":
@@ -1305,7 +1281,7 @@ def checkWorkloadProxyEnabled(env):
         workload_proxy = "false"
     else:
         try:
-            workload_proxy = request.get_json(force=True)['envSpec']['proxySpec']['tkgWorkload']['enableProxy']
+            workload_proxy = RequestSpec.json()['envSpec']['proxySpec']['tkgWorkload']['enableProxy']
         except:
             return False
     if workload_proxy.lower() == "true":
@@ -1317,13 +1293,13 @@ def checkWorkloadProxyEnabled(env):
 def checkTmcEnabled(env):
     if env == Env.VMC:
         try:
-            tmc_required = str(request.get_json(force=True)["saasEndpoints"]['tmcDetails']['tmcAvailability'])
+            tmc_required = str(RequestSpec.json()["saasEndpoints"]['tmcDetails']['tmcAvailability'])
         except:
             return False
     else:
         try:
             tmc_required = str(
-                request.get_json(force=True)['envSpec']["saasEndpoints"]['tmcDetails']['tmcAvailability'])
+                RequestSpec.json()['envSpec']["saasEndpoints"]['tmcDetails']['tmcAvailability'])
         except:
             return False
     if tmc_required.lower() == "true":
@@ -1344,16 +1320,16 @@ def manage_avi_certificates(ip, avi_version, env, avi_fqdn, cert_name):
         return jsonify(d), 500, False
     try:
         if env == Env.VMC:
-            avi_cert = request.get_json(force=True)['componentSpec']['aviComponentSpec']['aviCertPath']
-            avi_key = request.get_json(force=True)['componentSpec']['aviComponentSpec']['aviCertKeyPath']
+            avi_cert = RequestSpec.json()['componentSpec']['aviComponentSpec']['aviCertPath']
+            avi_key = RequestSpec.json()['componentSpec']['aviComponentSpec']['aviCertKeyPath']
             license_key = ""
         elif isEnvTkgs_wcp(env):
-            avi_cert = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviCertPath']
-            avi_key = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviCertKeyPath']
+            avi_cert = RequestSpec.json()['tkgsComponentSpec']['aviComponents']['aviCertPath']
+            avi_key = RequestSpec.json()['tkgsComponentSpec']['aviComponents']['aviCertKeyPath']
             license_key = ""
         else:
-            avi_cert = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviCertPath']
-            avi_key = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviCertKeyPath']
+            avi_cert = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviCertPath']
+            avi_key = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviCertKeyPath']
             license_key = ""
     except:
         avi_cert = ""
@@ -1492,17 +1468,17 @@ def configure_alb_licence(ip, csrf2, license_key, avi_version):
     }
     body = AlbPayload.LICENSE.format(serial_number=license_key)
     url = AlbEndpoint.LICENSE_URL.format(ip=ip)
-    response_csrf = requests.request("GET", url, headers=headers, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     licenses = response_csrf.json()["licenses"]
     for license in licenses:
         if license["license_string"] == license_key:
             return "SUCESS", "Already license is applied"
-    response_csrf = requests.request("PUT", url, headers=headers, data=body, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("PUT", url, headers=headers, data=body, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
-    response_csrf = requests.request("GET", url, headers=headers, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     licenses = response_csrf.json()["licenses"]
@@ -1547,10 +1523,8 @@ def registerWithTmc(management_cluster, env, isProxy, type, clusterGroup):
             runProcess(listOfCommandRegister)
 
         current_app.logger.info("Registered to tmc")
-        current_app.logger.info("Waiting for 5 min for health status = ready…")
-        for i in tqdm(range(300), desc="Waiting for health status…", ascii=False, ncols=75):
-            time.sleep(1)
-        state = checkClusterStateOnTmc(management_cluster, True)
+        current_app.logger.info("Waiting for health status = ready…")
+        state = waitForClusterOnTmc(management_cluster, True)
         if state[0] == "SUCCESS":
             current_app.logger.info("Registered to tmc successfully")
             return "SUCCESS", 200
@@ -1593,45 +1567,60 @@ def returnListOfTmcCluster(cluster):
     return li_
 
 
+def getClusterStatusOnTmc(cluster, ifManagement):
+    """
+    Agent READY condition and health of a cluster on TMC, parsed from one `tmc ... get`.
+    Returns (ready, health, message) and raises if the cluster cannot be read.
+    """
+    if ifManagement:
+        command = ["tmc", "managementcluster", "get", cluster]
+    else:
+        li_ = returnListOfTmcCluster(cluster)
+        command = ["tmc", "cluster", "get", li_[0], "-m", li_[1], "-p", li_[2]]
+    o = runShellCommandAndReturnOutput(command)
+    if o[1] != 0:
+        raise Exception(o[0])
+    status = yaml.safe_load(o[0])["status"]
+    conditions = status.get("conditions") or {}
+    condition = conditions.get("Agent-READY") or conditions.get("READY") or {}
+    ready = str(condition.get("status")).upper() == "TRUE" and str(condition.get("type")) == "READY"
+    return ready, str(status.get("health")), str(condition.get("message", ""))
+
+
 def checkClusterStateOnTmc(cluster, ifManagement):
     try:
-        if ifManagement:
-            list = ["tmc", "managementcluster", "get", cluster]
-        else:
-            li_ = returnListOfTmcCluster(cluster)
-            list = ["tmc", "cluster", "get", li_[0], "-m", li_[1], "-p", li_[2]]
-        o = runShellCommandAndReturnOutput(list)
-        if o[1] == 0:
-            l = yaml.safe_load(o[0])
-            try:
-                status = str(l["status"]["conditions"]["Agent-READY"]["status"])
-            except:
-                status = str(l["status"]["conditions"]["READY"]["status"])
-            try:
-                type = str(l["status"]["conditions"]["Agent-READY"]["type"])
-            except:
-                type = str(l["status"]["conditions"]["READY"]["type"])
-            health = str(l["status"]["health"])
-            if status == "TRUE":
-                current_app.logger.info("Management cluster status " + status)
-            else:
-                current_app.logger.error("Management cluster status " + status)
-                return "Failed", 500
-            if type == "READY":
-                current_app.logger.info("Management cluster type " + type)
-            else:
-                current_app.logger.error("Management cluster type " + type)
-                return "Failed", 500
-            if health == "HEALTHY":
-                current_app.logger.info("Management cluster health " + health)
-            else:
-                current_app.logger.error("Management cluster health " + health)
-                return "Failed", 500
-            return "SUCCESS", 200
-        else:
-            return None, o[0]
+        ready, health, message = getClusterStatusOnTmc(cluster, ifManagement)
     except Exception as e:
         return None, str(e)
+    if not ready:
+        current_app.logger.error("Management cluster is not ready " + message)
+        return "Failed", 500
+    current_app.logger.info("Management cluster status TRUE, type READY")
+    if health == "HEALTHY":
+        current_app.logger.info("Management cluster health " + health)
+    else:
+        current_app.logger.error("Management cluster health " + health)
+        return "Failed", 500
+    return "SUCCESS", 200
+
+
+def waitForClusterOnTmc(cluster, ifManagement, timeout=TMC_REGISTRATION_TIMEOUT):
+    """
+    Wait for the TMC agent of a just registered or attached cluster to report READY and
+    HEALTHY: checked right away, then at growing intervals of up to 30s until timeout.
+    Failures to read the cluster count as not ready yet, as TMC may not list it at first.
+    """
+    wait = WaitHelper.wait_for(lambda: getClusterStatusOnTmc(cluster, ifManagement),
+                               lambda state: state[0] and state[1] == "HEALTHY", timeout=timeout,
+                               initial_delay=5, ignore_errors=True, description="TMC agent of " + cluster,
+                               log=current_app.logger)
+    if wait.ready:
+        return "SUCCESS", 200
+    if wait.value is None:
+        return None, "Failed to obtain TMC status of " + cluster + " in " + str(int(wait.elapsed)) + "s"
+    ready, health, message = wait.value
+    return None, cluster + " is not ready on TMC after " + str(int(wait.elapsed)) + "s, health " + health + \
+        (", " + message if message else "")
 
 
 def getCloudStatus(ip, csrf2, aviVersion, cloudName):
@@ -1645,7 +1634,7 @@ def getCloudStatus(ip, csrf2, aviVersion, cloudName):
     }
     body = {}
     url = "https://" + ip + "/api/cloud"
-    response_csrf = requests.request("GET", url, headers=headers, data=body, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=body, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -1674,7 +1663,7 @@ def getSECloudStatus(ip, csrf2, aviVersion, seGroupName):
     body = {}
     json_object = json.dumps(body, indent=4)
     url = "https://" + ip + "/api/serviceenginegroup"
-    response_csrf = requests.request("GET", url, headers=headers, data=json_object, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=json_object, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -1727,7 +1716,7 @@ def getVipNetworkIpNetMask(ip, csrf2, name, aviVersion):
     body = {}
     url = "https://" + ip + "/api/network"
     try:
-        response_csrf = requests.request("GET", url, headers=headers, data=body, verify=False)
+        response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=body, verify=False)
         if response_csrf.status_code != 200:
             return None, response_csrf.text
         else:
@@ -1738,7 +1727,7 @@ def getVipNetworkIpNetMask(ip, csrf2, name, aviVersion):
             else:
                 next_url = None if not response_csrf.json()["next"] else response_csrf.json()["next"]
                 while len(next_url) > 0:
-                    response_csrf = requests.request("GET", next_url, headers=headers, data=body, verify=False)
+                    response_csrf = AviClient.for_controller(ip).request("GET", next_url, headers=headers, data=body, verify=False)
                     for re in response_csrf.json()["results"]:
                         if re['name'] == name:
                             for sub in re["configured_subnets"]:
@@ -1762,7 +1751,7 @@ def getVrfAndNextRoutId(ip, csrf2, cloudUuid, type, routIp, aviVersion):
     body = {}
     routId = 0
     url = "https://" + ip + "/api/vrfcontext/?name.in=" + type + "&cloud_ref.uuid=" + cloudUuid
-    response_csrf = requests.request("GET", url, headers=headers, data=body, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=body, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -1821,7 +1810,7 @@ def addStaticRoute(ip, csrf2, vrfUrl, routeIp, routId, aviVersion):
     }
     url = vrfUrl
     json_object = json.dumps(body, indent=4)
-    response_csrf = requests.request("PATCH", url, headers=headers, data=json_object, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("PATCH", url, headers=headers, data=json_object, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -1833,7 +1822,7 @@ def checkAirGappedIsEnabled(env):
         air_gapped = ""
     else:
         try:
-            air_gapped = request.get_json(force=True)['envSpec']['customRepositorySpec'][
+            air_gapped = RequestSpec.json()['envSpec']['customRepositorySpec'][
                 'tkgCustomImageRepository']
         except:
             return False
@@ -1847,9 +1836,9 @@ def checkEnableIdentityManagement(env):
     try:
         if not isEnvTkgs_ns(env) and not isEnvTkgs_wcp(env):
             if env == Env.VMC:
-                idm = request.get_json(force=True)["componentSpec"]["identityManagementSpec"]["identityManagementType"]
+                idm = RequestSpec.json()["componentSpec"]["identityManagementSpec"]["identityManagementType"]
             elif env == Env.VSPHERE or env == Env.VCF:
-                idm = request.get_json(force=True)["tkgComponentSpec"]["identityManagementSpec"][
+                idm = RequestSpec.json()["tkgComponentSpec"]["identityManagementSpec"][
                     "identityManagementType"]
             if (idm.lower() == "oidc") or (idm.lower() == "ldap"):
                 return True
@@ -1899,7 +1888,7 @@ def dockerLoginAndConnectivityCheck(env):
         return jsonify(d), 500
     if checkAirGappedIsEnabled(env):
         air_gapped_repo = str(
-            request.get_json(force=True)['envSpec']['customRepositorySpec']['tkgCustomImageRepository'])
+            RequestSpec.json()['envSpec']['customRepositorySpec']['tkgCustomImageRepository'])
         air_gapped_repo = air_gapped_repo.replace("https://", "").replace("http://", "")
         if not air_gapped_repo:
             current_app.logger.error("No repository provided")
@@ -1909,13 +1898,13 @@ def dockerLoginAndConnectivityCheck(env):
                 "STATUS_CODE": 500
             }
             return jsonify(d), 500
-        os.putenv("TKG_BOM_IMAGE_TAG", Tkg_version.TAG)
-        os.putenv("TKG_CUSTOM_IMAGE_REPOSITORY", air_gapped_repo)
+        os.environ["TKG_BOM_IMAGE_TAG"] = Tkg_version.TAG
+        os.environ["TKG_CUSTOM_IMAGE_REPOSITORY"] = air_gapped_repo
         headers = {
             'Accept': 'application/json',
             'Content-Type': 'application/json'
         }
-        repository = request.get_json(force=True)['envSpec']['customRepositorySpec']['tkgCustomImageRepository']
+        repository = RequestSpec.json()['envSpec']['customRepositorySpec']['tkgCustomImageRepository']
         if str(repository).startswith("http://"):
             pass
         elif str(repository).startswith("https://"):
@@ -1947,7 +1936,7 @@ def dockerLoginAndConnectivityCheck(env):
                 "STATUS_CODE": 500
             }
             return jsonify(d), 500
-        isSelfsinged = str(request.get_json(force=True)['envSpec']['customRepositorySpec'][
+        isSelfsinged = str(RequestSpec.json()['envSpec']['customRepositorySpec'][
                                'tkgCustomImageRepositoryPublicCaCert'])
         s = air_gapped_repo[:air_gapped_repo.find("/")]
         if isSelfsinged.lower() == "false":
@@ -1963,12 +1952,10 @@ def dockerLoginAndConnectivityCheck(env):
                 pass
             if not isAlreadyAdded:
                 repoAdd(grabHostFromUrl(air_gapped_repo), grabPortFromUrl(air_gapped_repo))
-                getBase64CertWriteToFile(grabHostFromUrl(air_gapped_repo), grabPortFromUrl(air_gapped_repo))
-                with open('cert.txt', 'r') as file2:
-                    repo_cert = file2.readline()
+                repo_cert = getBase64CertWriteToFile(grabHostFromUrl(air_gapped_repo), grabPortFromUrl(air_gapped_repo))
                 repo_certificate = repo_cert
-                os.putenv("TKG_CUSTOM_IMAGE_REPOSITORY_SKIP_TLS_VERIFY", "False")
-                os.putenv("TKG_CUSTOM_IMAGE_REPOSITORY_CA_CERTIFICATE", repo_certificate)
+                os.environ["TKG_CUSTOM_IMAGE_REPOSITORY_SKIP_TLS_VERIFY"] = "False"
+                os.environ["TKG_CUSTOM_IMAGE_REPOSITORY_CA_CERTIFICATE"] = repo_certificate
                 try:
                     cmd_doc = ["systemctl", "restart", "docker"]
                     runShellCommandWithPolling(cmd_doc)
@@ -1985,15 +1972,12 @@ def dockerLoginAndConnectivityCheck(env):
                     e.write("true")
                 time.sleep(120)
         else:
-            os.putenv("TKG_CUSTOM_IMAGE_REPOSITORY_SKIP_TLS_VERIFY", "False")
+            os.environ["TKG_CUSTOM_IMAGE_REPOSITORY_SKIP_TLS_VERIFY"] = "False"
         try:
-            repo_usename = request.get_json(force=True)['envSpec']['customRepositorySpec'][
+            repo_usename = RequestSpec.json()['envSpec']['customRepositorySpec'][
                 'tkgCustomImageRepositoryUsername']
-            repo_password = request.get_json(force=True)['envSpec']['customRepositorySpec'][
-                'tkgCustomImageRepositoryPasswordBase64']
-            base64_bytes = repo_password.encode('ascii')
-            enc_bytes = base64.b64decode(base64_bytes)
-            repo_password = enc_bytes.decode('ascii').rstrip("\n")
+            repo_password = RequestSpec.secret("envSpec", "customRepositorySpec",
+                                               "tkgCustomImageRepositoryPasswordBase64")
         except Exception as e:
             repo_password = ""
             repo_usename = ""
@@ -2064,7 +2048,7 @@ def grabHostFromUrl(url):
 def checkTanzuExtentionEnabled():
     try:
         tanzu_ext = str(
-            request.get_json(force=True)['tanzuExtensions']['enableExtensions'])
+            RequestSpec.json()['tanzuExtensions']['enableExtensions'])
         if tanzu_ext.lower() == "true":
             return True
         else:
@@ -2076,7 +2060,7 @@ def checkTanzuExtentionEnabled():
 def checkPromethusEnabled():
     try:
         tanzu_ext = str(
-            request.get_json(force=True)['tanzuExtensions']['monitoring']['enableLoggingExtension'])
+            RequestSpec.json()['tanzuExtensions']['monitoring']['enableLoggingExtension'])
         if tanzu_ext.lower() == "true":
             return True
         else:
@@ -2088,7 +2072,7 @@ def checkPromethusEnabled():
 def check_fluent_bit_syslog_endpoint_enabled():
     try:
         tanzu_ext = str(
-            request.get_json(force=True)['tanzuExtensions']['logging']['syslogEndpoint']['enableSyslogEndpoint'])
+            RequestSpec.json()['tanzuExtensions']['logging']['syslogEndpoint']['enableSyslogEndpoint'])
         if tanzu_ext.lower() == "true":
             return True
         else:
@@ -2100,7 +2084,7 @@ def check_fluent_bit_syslog_endpoint_enabled():
 def check_fluent_bit_http_endpoint_enabled():
     try:
         tanzu_ext = str(
-            request.get_json(force=True)['tanzuExtensions']['logging']['httpEndpoint']['enableHttpEndpoint'])
+            RequestSpec.json()['tanzuExtensions']['logging']['httpEndpoint']['enableHttpEndpoint'])
         if tanzu_ext.lower() == "true":
             return True
         else:
@@ -2112,7 +2096,7 @@ def check_fluent_bit_http_endpoint_enabled():
 def check_fluent_bit_elastic_search_endpoint_enabled():
     try:
         tanzu_ext = str(
-            request.get_json(force=True)['tanzuExtensions']['logging']['elasticSearchEndpoint'][
+            RequestSpec.json()['tanzuExtensions']['logging']['elasticSearchEndpoint'][
                 'enableElasticSearchEndpoint'])
         if tanzu_ext.lower() == "true":
             return True
@@ -2125,7 +2109,7 @@ def check_fluent_bit_elastic_search_endpoint_enabled():
 def check_fluent_bit_kafka_endpoint_endpoint_enabled():
     try:
         tanzu_ext = str(
-            request.get_json(force=True)['tanzuExtensions']['logging']['kafkaEndpoint']['enableKafkaEndpoint'])
+            RequestSpec.json()['tanzuExtensions']['logging']['kafkaEndpoint']['enableKafkaEndpoint'])
         if tanzu_ext.lower() == "true":
             return True
         else:
@@ -2137,7 +2121,7 @@ def check_fluent_bit_kafka_endpoint_endpoint_enabled():
 def check_fluent_bit_splunk_endpoint_endpoint_enabled():
     try:
         tanzu_ext = str(
-            request.get_json(force=True)['tanzuExtensions']['logging']['splunkEndpoint']['enableSplunkEndpoint'])
+            RequestSpec.json()['tanzuExtensions']['logging']['splunkEndpoint']['enableSplunkEndpoint'])
         if tanzu_ext.lower() == "true":
             return True
         else:
@@ -2148,7 +2132,7 @@ def check_fluent_bit_splunk_endpoint_endpoint_enabled():
 
 def switchToContext(clusterName, env):
     if isEnvTkgs_ns(env):
-        name_space = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+        name_space = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
             'tkgsVsphereWorkloadClusterSpec']['tkgsVsphereNamespaceName']
         commands_shared = ["tanzu", "cluster", "kubeconfig", "get", clusterName, "--admin", "-n", name_space]
     else:
@@ -2214,59 +2198,32 @@ def switchToManagementContext(clusterName):
 
 
 def waitForProcess(list1, podName):
-    count_cert = 0
-    running = False
-    while count_cert < 60:
-        cert_state = runShellCommandAndReturnOutputAsList(list1)
-        time.sleep(30)
-        if verifyPodsAreRunning(podName, cert_state[0], RegexPattern.RECONCILE_SUCCEEDED):
-            running = True
-            break
-        count_cert = count_cert + 1
-        current_app.logger.info("Waited for  " + str(count_cert * 30) + "s, retrying.")
-    if not running:
-        current_app.logger.error(podName + " is not running on waiting " + str(count_cert * 30) + "s")
-        d = {
-            "responseType": "ERROR",
-            "msg": podName + " is not running on waiting " + str(count_cert * 30) + "s",
-            "STATUS_CODE": 500
-        }
-        return jsonify(d), 500, count_cert
-    current_app.logger.info("Successfully running " + podName)
-    d = {
-        "responseType": "SUCCESS",
-        "msg": "Successfully running" + podName,
-        "STATUS_CODE": 200
-    }
-    return jsonify(d), 200, count_cert
+    return waitForProcessWithStatus(list1, podName, RegexPattern.RECONCILE_SUCCEEDED)
 
 
 def waitForProcessWithStatus(list1, podName, status):
-    count_cert = 0
-    running = False
-    while count_cert < 60:
-        cert_state = runShellCommandAndReturnOutputAsList(list1)
-        time.sleep(30)
-        if verifyPodsAreRunning(podName, cert_state[0], status):
-            running = True
-            break
-        count_cert = count_cert + 1
-        current_app.logger.info("Waited for  " + str(count_cert * 30) + "s, retrying.")
-    if not running:
-        current_app.logger.error(podName + " is not running on waiting " + str(count_cert * 30) + "s")
+    if status == RegexPattern.RECONCILE_SUCCEEDED:
+        watched = _waitForReconcileWatch(list1, podName)
+        if watched is not None:
+            return watched
+    wait = WaitHelper.wait_for(lambda: runShellCommandAndReturnOutputAsList(list1),
+                               lambda cert_state: verifyPodsAreRunning(podName, cert_state[0], status),
+                               description=podName, log=current_app.logger)
+    if not wait.ready:
+        current_app.logger.error(podName + " is not running on waiting " + str(int(wait.elapsed)) + "s")
         d = {
             "responseType": "ERROR",
-            "msg": podName + " is not running on waiting " + str(count_cert * 30) + "s",
+            "msg": podName + " is not running on waiting " + str(int(wait.elapsed)) + "s",
             "STATUS_CODE": 500
         }
-        return jsonify(d), 500, count_cert
+        return jsonify(d), 500, wait.attempts
     current_app.logger.info("Successfully running " + podName)
     d = {
         "responseType": "SUCCESS",
         "msg": "Successfully running" + podName,
         "STATUS_CODE": 200
     }
-    return jsonify(d), 200, count_cert
+    return jsonify(d), 200, wait.attempts
 
 
 def verifyCluster(cluster_name):
@@ -2290,7 +2247,7 @@ def installCertManagerAndContour(env, cluster_name, repo_address, service_name):
         }
         return jsonify(d), 500
     if isEnvTkgs_ns(env) or isEnvTkgs_wcp(env):
-        mgmt = request.get_json(force=True)['envSpec']["saasEndpoints"]['tmcDetails']['tmcSupervisorClusterName']
+        mgmt = RequestSpec.json()['envSpec']["saasEndpoints"]['tmcDetails']['tmcSupervisorClusterName']
     else:
         mgmt = getManagementCluster()
         if mgmt is None:
@@ -2313,7 +2270,7 @@ def installCertManagerAndContour(env, cluster_name, repo_address, service_name):
             return jsonify(d), 500
     else:
         if isEnvTkgs_ns(env):
-            name_space = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+            name_space = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
                 'tkgsVsphereWorkloadClusterSpec']['tkgsVsphereNamespaceName']
             commands_shared = ["tanzu", "cluster", "kubeconfig", "get", cluster_name, "--admin", "-n", name_space]
         else:
@@ -2364,77 +2321,78 @@ def installCertManagerAndContour(env, cluster_name, repo_address, service_name):
 
 
 def waitForGrepProcess(list1, list2, podName, dir):
-    time.sleep(30)
-    count_cert = 0
-    running = False
-    try:
-        while count_cert < 60:
-            cert_state = grabPipeOutputChagedDir(list1, list2, dir)
-            if verifyPodsAreRunning(podName, cert_state[0], RegexPattern.RUNNING):
-                running = True
-                break
-            time.sleep(30)
-            count_cert = count_cert + 1
-            current_app.logger.info("Waited for  " + str(count_cert * 30) + "s, retrying.")
-    except Exception as e:
-        current_app.logger.error(" Failed to verify pod running ")
-        d = {
-            "responseType": "ERROR",
-            "msg": "Failed to verify pod running",
-            "STATUS_CODE": 500
-        }
-        return jsonify(d), 500, count_cert
-    if not running:
-        current_app.logger.error(podName + " is not running on waiting " + str(count_cert * 30) + "s")
+    return _waitForGrepOutput(list1, lambda: grabPipeOutputChagedDir(list1, list2, dir), podName,
+                              RegexPattern.RUNNING)
+
+
+def _waitForReconcileWatch(list1, podName):
+    """
+    Wait for the App/PackageInstall through a watch instead of re-running list1, a
+    `kubectl get app` or `tanzu package installed list` command: the watch covers the
+    same kubeconfig, context, namespace and App. Returns None when list1 lists anything
+    else or the context cannot be watched, so the caller polls list1 instead.
+    """
+    scope = watch_scope(list1)
+    if scope is None:
+        return None
+    watcher = ReconcileWatcher.for_context(scope["kubeconfig"], scope["context"])
+    if watcher is None:
+        return None
+    start = time.monotonic()
+    reconciled = watcher.wait_reconciled(podName, namespace=scope["namespace"], app=scope["name"])
+    if reconciled is None:
+        return None
+    elapsed = str(int(time.monotonic() - start))
+    if not reconciled:
+        current_app.logger.error(podName + " is not running on waiting " + elapsed + "s")
         d = {
             "responseType": "ERROR",
-            "msg": podName + " is not running on waiting " + str(count_cert * 30) + "s",
+            "msg": podName + " is not running on waiting " + elapsed + "s",
             "STATUS_CODE": 500
         }
-        return jsonify(d), 500, count_cert
+        return jsonify(d), 500, 1
+    current_app.logger.info("Successfully running " + podName + " after " + elapsed + "s")
     d = {
-        "responseType": "ERROR",
-        "msg": "Successfully running " + podName + " ",
+        "responseType": "SUCCESS",
+        "msg": "Successfully running " + podName,
         "STATUS_CODE": 200
     }
-    return jsonify(d), 200, count_cert
+    return jsonify(d), 200, 1
 
 
-def waitForGrepProcessWithoutChangeDir(list1, list2, podName, status):
-    time.sleep(30)
-    count_cert = 0
-    running = False
-    try:
-        while count_cert < 60:
-            cert_state = grabPipeOutput(list1, list2)
-            if verifyPodsAreRunning(podName, cert_state[0], status):
-                running = True
-                break
-            time.sleep(30)
-            count_cert = count_cert + 1
-            current_app.logger.info("Waited for  " + str(count_cert * 30) + "s, retrying.")
-    except Exception as e:
+def _waitForGrepOutput(list1, probe, podName, status):
+    if status == RegexPattern.RECONCILE_SUCCEEDED:
+        watched = _waitForReconcileWatch(list1, podName)
+        if watched is not None:
+            return watched
+    wait = WaitHelper.wait_for(probe, lambda cert_state: verifyPodsAreRunning(podName, cert_state[0], status),
+                               description=podName, log=current_app.logger)
+    if wait.error is not None:
         current_app.logger.error(" Failed to verify pod running ")
         d = {
             "responseType": "ERROR",
             "msg": "Failed to verify pod running",
             "STATUS_CODE": 500
         }
-        return jsonify(d), 500, count_cert
-    if not running:
-        current_app.logger.error(podName + " is not running on waiting " + str(count_cert * 30) + "s")
+        return jsonify(d), 500, wait.attempts
+    if not wait.ready:
+        current_app.logger.error(podName + " is not running on waiting " + str(int(wait.elapsed)) + "s")
         d = {
             "responseType": "ERROR",
-            "msg": podName + " is not running on waiting " + str(count_cert * 30) + "s",
+            "msg": podName + " is not running on waiting " + str(int(wait.elapsed)) + "s",
             "STATUS_CODE": 500
         }
-        return jsonify(d), 500, count_cert
+        return jsonify(d), 500, wait.attempts
     d = {
         "responseType": "ERROR",
         "msg": "Successfully running " + podName + " ",
         "STATUS_CODE": 200
     }
-    return jsonify(d), 200, count_cert
+    return jsonify(d), 200, wait.attempts
+
+
+def waitForGrepProcessWithoutChangeDir(list1, list2, podName, status):
+    return _waitForGrepOutput(list1, lambda: grabPipeOutput(list1, list2), podName, status)
 
 
 def checkCertManagerRunning():
@@ -2526,49 +2484,48 @@ def getManagementCluster():
 def createProxyCredentialsTMC(env, clusterName, isProxy, type, register=True):
     try:
         if register and type != "management":
-            file = "kubeconfig_cluster.yaml"
+            # Named after the cluster, as shared services and workload clusters can register side by side.
+            file = "kubeconfig_" + clusterName + ".yaml"
             os.system("rm -rf " + file)
         pod_cidr = ""
         service_cidr = ""
         if env == Env.VMC:
-            os.putenv("TMC_API_TOKEN",
-                      request.get_json(force=True)["saasEndpoints"]['tmcDetails']['tmcRefreshToken'])
+            os.environ["TMC_API_TOKEN"] = RequestSpec.json()["saasEndpoints"]['tmcDetails']['tmcRefreshToken']
             user = TmcUser.USER
             if type == "management":
-                pod_cidr = request.get_json(force=True)['componentSpec']['tkgMgmtSpec']['tkgMgmtClusterCidr']
-                service_cidr = request.get_json(force=True)['componentSpec']['tkgMgmtSpec']['tkgMgmtServiceCidr']
+                pod_cidr = RequestSpec.json()['componentSpec']['tkgMgmtSpec']['tkgMgmtClusterCidr']
+                service_cidr = RequestSpec.json()['componentSpec']['tkgMgmtSpec']['tkgMgmtServiceCidr']
             elif type == "shared":
-                pod_cidr = request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec'][
+                pod_cidr = RequestSpec.json()['componentSpec']['tkgSharedServiceSpec'][
                     'tkgSharedserviceClusterCidr']
-                service_cidr = request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec'][
+                service_cidr = RequestSpec.json()['componentSpec']['tkgSharedServiceSpec'][
                     'tkgSharedserviceServiceCidr']
             elif type == "workload":
-                pod_cidr = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec']['tkgWorkloadClusterCidr']
-                service_cidr = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec'][
+                pod_cidr = RequestSpec.json()['componentSpec']['tkgWorkloadSpec']['tkgWorkloadClusterCidr']
+                service_cidr = RequestSpec.json()['componentSpec']['tkgWorkloadSpec'][
                     'tkgWorkloadServiceCidr']
         else:
-            os.putenv("TMC_API_TOKEN",
-                      request.get_json(force=True)['envSpec']["saasEndpoints"]['tmcDetails'][
-                          'tmcRefreshToken'])
+            os.environ["TMC_API_TOKEN"] = RequestSpec.json()['envSpec']["saasEndpoints"]['tmcDetails'][
+                'tmcRefreshToken']
             user = TmcUser.USER_VSPHERE
             if type == "management":
-                pod_cidr = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents']['tkgMgmtClusterCidr']
-                service_cidr = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+                pod_cidr = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents']['tkgMgmtClusterCidr']
+                service_cidr = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
                     'tkgMgmtServiceCidr']
             elif type == "shared":
                 if env == Env.VSPHERE:
-                    pod_cidr = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+                    pod_cidr = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
                         'tkgSharedserviceClusterCidr']
-                    service_cidr = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+                    service_cidr = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
                         'tkgSharedserviceServiceCidr']
                 elif env == Env.VCF:
-                    pod_cidr = request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
+                    pod_cidr = RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
                         'tkgSharedserviceClusterCidr']
-                    service_cidr = request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
+                    service_cidr = RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
                         'tkgSharedserviceServiceCidr']
             elif type == "workload":
-                pod_cidr = request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadClusterCidr']
-                service_cidr = request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadServiceCidr']
+                pod_cidr = RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadClusterCidr']
+                service_cidr = RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadServiceCidr']
 
         listOfCmdTmcLogin = ["tmc", "login", "--no-configure", "-name", user]
         runProcess(listOfCmdTmcLogin)
@@ -2585,26 +2542,26 @@ def createProxyCredentialsTMC(env, clusterName, isProxy, type, register=True):
 
             if type == "workload":
                 httpProxy = str(
-                    request.get_json(force=True)['envSpec']['proxySpec']['tkgWorkload']['httpProxy'])
+                    RequestSpec.json()['envSpec']['proxySpec']['tkgWorkload']['httpProxy'])
                 httpsProxy = str(
-                    request.get_json(force=True)['envSpec']['proxySpec']['tkgWorkload']['httpsProxy'])
-                noProxy = str(request.get_json(force=True)['envSpec']['proxySpec']['tkgWorkload']['noProxy'])
+                    RequestSpec.json()['envSpec']['proxySpec']['tkgWorkload']['httpsProxy'])
+                noProxy = str(RequestSpec.json()['envSpec']['proxySpec']['tkgWorkload']['noProxy'])
                 noProxy = noProxy.strip("\n").strip(" ").strip("\r")
             elif type == "shared":
                 httpProxy = str(
-                    request.get_json(force=True)['envSpec']['proxySpec']['tkgSharedservice']['httpProxy'])
+                    RequestSpec.json()['envSpec']['proxySpec']['tkgSharedservice']['httpProxy'])
                 httpsProxy = str(
-                    request.get_json(force=True)['envSpec']['proxySpec']['tkgSharedservice']['httpsProxy'])
+                    RequestSpec.json()['envSpec']['proxySpec']['tkgSharedservice']['httpsProxy'])
                 noProxy = str(
-                    request.get_json(force=True)['envSpec']['proxySpec']['tkgSharedservice']['noProxy'])
+                    RequestSpec.json()['envSpec']['proxySpec']['tkgSharedservice']['noProxy'])
                 noProxy = noProxy.strip("\n").strip(" ").strip("\r")
             elif type == "management":
                 httpProxy = str(
-                    request.get_json(force=True)['envSpec']['proxySpec']['tkgMgmt']['httpProxy'])
+                    RequestSpec.json()['envSpec']['proxySpec']['tkgMgmt']['httpProxy'])
                 httpsProxy = str(
-                    request.get_json(force=True)['envSpec']['proxySpec']['tkgMgmt']['httpsProxy'])
+                    RequestSpec.json()['envSpec']['proxySpec']['tkgMgmt']['httpsProxy'])
                 noProxy = str(
-                    request.get_json(force=True)['envSpec']['proxySpec']['tkgMgmt']['noProxy'])
+                    RequestSpec.json()['envSpec']['proxySpec']['tkgMgmt']['noProxy'])
                 noProxy = noProxy.strip("\n").strip(" ").strip("\r")
 
             # if noProxy:
@@ -2656,9 +2613,9 @@ def createProxyCredentialsTMC(env, clusterName, isProxy, type, register=True):
                     "STATUS_CODE": 500
                 }
                 return jsonify(d), 500
-            generateTmcProxyYaml(name, httpProxy, httpsProxy, noProxy, http_user, http_password, https_user,
-                                 https_password)
-            credential = ["tmc", "account", "credential", "create", "-f", "tmc_proxy.yaml"]
+            proxy_file = generateTmcProxyYaml(name, httpProxy, httpsProxy, noProxy, http_user, http_password,
+                                              https_user, https_password)
+            credential = ["tmc", "account", "credential", "create", "-f", proxy_file]
             state_cred = runShellCommandAndReturnOutput(credential)
             if state_cred[1] != 0:
                 if str(state_cred[0]).__contains__("AlreadyExists"):
@@ -2716,6 +2673,15 @@ def registerWithTmcOnSharedAndWorkload(env, clusterName, isProxy, type):
                     "STATUS_CODE": 500
                 }
                 return jsonify(d), 500
+            state = waitForClusterOnTmc(clusterName, False)
+            if state[0] != "SUCCESS":
+                current_app.logger.error(state[1])
+                d = {
+                    "responseType": "ERROR",
+                    "msg": "Attached " + clusterName + " to TMC but " + state[1],
+                    "STATUS_CODE": 500
+                }
+                return jsonify(d), 500
             d = {
                 "responseType": "SUCCESS",
                 "msg": clusterName + " cluster attached to TMC successfully",
@@ -2752,13 +2718,14 @@ def checkRepositoryAdded(env):
                     "STATUS_CODE": 500
                 }
                 return jsonify(d), 500
-            REPOSITORY_URL = request.get_json(force=True)['envSpec']['customRepositorySpec'][
+            REPOSITORY_URL = RequestSpec.json()['envSpec']['customRepositorySpec'][
                 'tkgCustomImageRepository']
             REPOSITORY_URL = str(REPOSITORY_URL).replace("https://", "").replace("http://", "")
             if not str(status[0]).__contains__(REPOSITORY_URL):
                 list_command = ["tanzu", "package", "repository", "add", Repo.NAME, "--url", REPOSITORY_URL, "-n",
                                 "tkg-custom-image-repository", "--create-namespace"]
                 status = runShellCommandAndReturnOutputAsList(list_command)
+                PackageCatalog.current().invalidate()
                 if status[1] != 0:
                     current_app.logger.error("Failed to run command to add repository " + str(status[0]))
                     d = {
@@ -2809,6 +2776,7 @@ def checkRepositoryAdded(env):
                                 TKG_Package_Details.REPOSITORY_URL, "-n",
                                 TKG_Package_Details.NAMESPACE]
                 status = runShellCommandAndReturnOutputAsList(list_command)
+                PackageCatalog.current().invalidate()
                 if status[1] != 0:
                     current_app.logger.error("Failed to run command to add repository " + str(status[0]))
                     d = {
@@ -2847,8 +2815,7 @@ def checkRepositoryAdded(env):
 def checkPinnipedInstalled():
     main_command = ["tanzu", "package", "installed", "list", "-A"]
     sub_command = ["grep", AppName.PINNIPED]
-    command_pinniped = grabPipeOutput(main_command, sub_command)
-    if not verifyPodsAreRunning(AppName.PINNIPED, command_pinniped[0], RegexPattern.RECONCILE_SUCCEEDED):
+    if not PackageCatalog.current().is_reconciled(AppName.PINNIPED, RegexPattern.RECONCILE_SUCCEEDED):
         count_pinniped = 0
         found = False
         command_status_pinniped = grabPipeOutput(main_command, sub_command)
@@ -3028,11 +2995,11 @@ def createRbacUsers(clusterName, isMgmt, env, cluster_admin_users, admin_users,
 
 def installExtentionFor14(service_name, cluster, env):
     main_command = ["tanzu", "package", "installed", "list", "-A"]
+    catalog = PackageCatalog.current()
     service = service_name
     if service == "certmanager" or service == "all":
         sub_command = ["grep", AppName.CERT_MANAGER]
-        command_cert = grabPipeOutput(main_command, sub_command)
-        if not verifyPodsAreRunning(AppName.CERT_MANAGER, command_cert[0], RegexPattern.RECONCILE_SUCCEEDED):
+        if not catalog.is_reconciled(AppName.CERT_MANAGER, RegexPattern.RECONCILE_SUCCEEDED):
             state = getVersionOfPackage("cert-manager.tanzu.vmware.com")
             if state is None:
                 d = {
@@ -3047,6 +3014,7 @@ def installExtentionFor14(service_name, cluster, env):
                                "--version", state,
                                "--create-namespace"]
             states = runShellCommandAndReturnOutputAsList(install_command)
+            catalog.invalidate()
             if states[1] != 0:
                 current_app.logger.error(
                     AppName.CERT_MANAGER + " installation command failed. Checking for reconciliation status..")
@@ -3089,8 +3057,7 @@ def installExtentionFor14(service_name, cluster, env):
                 }
                 return jsonify(d), 500
         sub_command = ["grep", AppName.CONTOUR]
-        command_cert = grabPipeOutput(main_command, sub_command)
-        if not verifyPodsAreRunning(AppName.CONTOUR, command_cert[0], RegexPattern.RECONCILE_SUCCEEDED):
+        if not catalog.is_reconciled(AppName.CONTOUR, RegexPattern.RECONCILE_SUCCEEDED):
             createContourDataValues(cluster)
             state = getVersionOfPackage("contour.tanzu.vmware.com")
             if state is None:
@@ -3107,6 +3074,7 @@ def installExtentionFor14(service_name, cluster, env):
                                "package-tanzu-system-contour",
                                "--create-namespace"]
             states = runShellCommandAndReturnOutputAsList(install_command)
+            catalog.invalidate()
             if states[1] != 0:
                 for r in states[0]:
                     current_app.logger.error(r)
@@ -3146,6 +3114,9 @@ def installExtentionFor14(service_name, cluster, env):
 
 
 def getVersionOfPackage(packageName):
+    version = PackageCatalog.current().latest_version(packageName)
+    if version:
+        return version
     list_h = []
     cert_package_cmd = ["tanzu", "package", "available", "list", packageName, "-A"]
     ss = runShellCommandAndReturnOutputAsList(cert_package_cmd)
@@ -3457,7 +3428,7 @@ def deployCluster(sharedClusterName, clusterPlan, datacenter, dataStorePath,
                                               vsphereServer,
                                               sshKey, vsphereUseName, machineCount, size, env, type, vsSpec)
             current_app.logger.info("Deploying " + sharedClusterName + "cluster")
-            os.putenv("DEPLOY_TKG_ON_VSPHERE7", "true")
+            os.environ["DEPLOY_TKG_ON_VSPHERE7"] = "true"
             if Tkg_version.TKG_VERSION == "1.6":
                 # if checkAirGappedIsEnabled(env):
                 # full_name = getKubeVersionFullNameNoCompatibilityCheck(kubeVersion)
@@ -3539,70 +3510,70 @@ def cluster14Yaml(sharedClusterName, clusterPlan, datacenter, dataStorePath,
     with open(sharedClusterName + ".yaml", 'w') as outfile:
         if env == Env.VSPHERE:
             if type == Type.SHARED:
-                clustercidr = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+                clustercidr = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
                     'tkgSharedserviceClusterCidr']
-                servicecidr = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+                servicecidr = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
                     'tkgSharedserviceServiceCidr']
                 try:
-                    osName = str(request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+                    osName = str(RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
                                      'tkgSharedserviceBaseOs'])
-                    kubeVersion = str(request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+                    kubeVersion = str(RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
                                           'tkgSharedserviceKubeVersion'])
                 except Exception as e:
                     raise Exception("Keyword " + str(e) + "  not found in input file")
             elif type == Type.WORKLOAD:
-                clustercidr = request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadClusterCidr']
-                servicecidr = request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadServiceCidr']
+                clustercidr = RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadClusterCidr']
+                servicecidr = RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadServiceCidr']
                 try:
-                    osName = str(request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadBaseOs'])
+                    osName = str(RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadBaseOs'])
                     kubeVersion = str(
-                        request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadKubeVersion'])
+                        RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadKubeVersion'])
                 except Exception as e:
                     raise Exception("Keyword " + str(e) + "  not found in input file")
         elif env == Env.VCF:
             if type == Type.SHARED:
-                clustercidr = request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
+                clustercidr = RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
                     'tkgSharedserviceClusterCidr']
-                servicecidr = request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
+                servicecidr = RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
                     'tkgSharedserviceServiceCidr']
                 try:
-                    osName = str(request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
+                    osName = str(RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
                                      'tkgSharedserviceBaseOs'])
-                    kubeVersion = str(request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
+                    kubeVersion = str(RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
                                           'tkgSharedserviceKubeVersion'])
                 except Exception as e:
                     raise Exception("Keyword " + str(e) + "  not found in input file")
             elif type == Type.WORKLOAD:
-                clustercidr = request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadClusterCidr']
-                servicecidr = request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadServiceCidr']
+                clustercidr = RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadClusterCidr']
+                servicecidr = RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadServiceCidr']
                 try:
-                    osName = str(request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadBaseOs'])
+                    osName = str(RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadBaseOs'])
                     kubeVersion = str(
-                        request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadKubeVersion'])
+                        RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadKubeVersion'])
                 except Exception as e:
                     raise Exception("Keyword " + str(e) + "  not found in input file")
         elif env == Env.VMC:
             if type == Type.SHARED:
-                clustercidr = request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec'][
+                clustercidr = RequestSpec.json()['componentSpec']['tkgSharedServiceSpec'][
                     'tkgSharedserviceClusterCidr']
-                servicecidr = request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec'][
+                servicecidr = RequestSpec.json()['componentSpec']['tkgSharedServiceSpec'][
                     'tkgSharedserviceServiceCidr']
                 try:
-                    osName = str(request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec'][
+                    osName = str(RequestSpec.json()['componentSpec']['tkgSharedServiceSpec'][
                                      'tkgSharedserviceBaseOs'])
-                    kubeVersion = str(request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec'][
+                    kubeVersion = str(RequestSpec.json()['componentSpec']['tkgSharedServiceSpec'][
                                           'tkgSharedserviceKubeVersion'])
                 except Exception as e:
                     raise Exception("Keyword " + str(e) + "  not found in input file")
             elif type == Type.WORKLOAD:
-                clustercidr = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec'][
+                clustercidr = RequestSpec.json()['componentSpec']['tkgWorkloadSpec'][
                     'tkgWorkloadClusterCidr']
-                servicecidr = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec'][
+                servicecidr = RequestSpec.json()['componentSpec']['tkgWorkloadSpec'][
                     'tkgWorkloadServiceCidr']
                 try:
                     osName = str(
-                        request.get_json(force=True)['componentSpec']['tkgWorkloadSpec']['tkgWorkloadBaseOs'])
-                    kubeVersion = str(request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec'][
+                        RequestSpec.json()['componentSpec']['tkgWorkloadSpec']['tkgWorkloadBaseOs'])
+                    kubeVersion = str(RequestSpec.json()['componentSpec']['tkgSharedServiceSpec'][
                                           'tkgWorkloadKubeVersion'])
                 except Exception as e:
                     raise Exception("Keyword " + str(e) + "  not found in input file")
@@ -3619,9 +3590,9 @@ def cluster14Yaml(sharedClusterName, clusterPlan, datacenter, dataStorePath,
     TKG_NO_PROXY: %s
             """
             proxy_str = yaml_data + yaml_str_proxy
-            httpProxy = str(request.get_json(force=True)['envSpec']['proxySpec']['tkgSharedservice']['httpProxy'])
-            httpsProxy = str(request.get_json(force=True)['envSpec']['proxySpec']['tkgSharedservice']['httpsProxy'])
-            noProxy = str(request.get_json(force=True)['envSpec']['proxySpec']['tkgSharedservice']['noProxy'])
+            httpProxy = str(RequestSpec.json()['envSpec']['proxySpec']['tkgSharedservice']['httpProxy'])
+            httpsProxy = str(RequestSpec.json()['envSpec']['proxySpec']['tkgSharedservice']['httpsProxy'])
+            noProxy = str(RequestSpec.json()['envSpec']['proxySpec']['tkgSharedservice']['noProxy'])
             noProxy = noProxy.strip("\n").strip(" ").strip("\r")
             formatted = proxy_str % (
                 clustercidr, sharedClusterName, clusterPlan, servicecidr, "true"
@@ -3637,9 +3608,9 @@ def cluster14Yaml(sharedClusterName, clusterPlan, datacenter, dataStorePath,
     TKG_NO_PROXY: %s
             """
             proxy_str = yaml_data + yaml_str_proxy
-            httpProxy = str(request.get_json(force=True)['envSpec']['proxySpec']['tkgWorkload']['httpProxy'])
-            httpsProxy = str(request.get_json(force=True)['envSpec']['proxySpec']['tkgWorkload']['httpsProxy'])
-            noProxy = str(request.get_json(force=True)['envSpec']['proxySpec']['tkgWorkload']['noProxy'])
+            httpProxy = str(RequestSpec.json()['envSpec']['proxySpec']['tkgWorkload']['httpProxy'])
+            httpsProxy = str(RequestSpec.json()['envSpec']['proxySpec']['tkgWorkload']['httpsProxy'])
+            noProxy = str(RequestSpec.json()['envSpec']['proxySpec']['tkgWorkload']['noProxy'])
             noProxy = noProxy.strip("\n").strip(" ").strip("\r")
             formatted = proxy_str % (
                 clustercidr, sharedClusterName, clusterPlan, servicecidr, "true"
@@ -3654,12 +3625,12 @@ def cluster14Yaml(sharedClusterName, clusterPlan, datacenter, dataStorePath,
             """
             airgapped_str = yaml_data + yaml_str_airgapped
             air_gapped_repo = str(
-                request.get_json(force=True)['envSpec']['customRepositorySpec']['tkgCustomImageRepository'])
+                RequestSpec.json()['envSpec']['customRepositorySpec']['tkgCustomImageRepository'])
             air_gapped_repo = air_gapped_repo.replace("https://", "").replace("http://", "")
-            os.putenv("TKG_BOM_IMAGE_TAG", Tkg_version.TAG)
-            os.putenv("TKG_CUSTOM_IMAGE_REPOSITORY", air_gapped_repo)
-            os.putenv("TKG_CUSTOM_IMAGE_REPOSITORY_SKIP_TLS_VERIFY", "False")
-            isSelfsinged = str(request.get_json(force=True)['envSpec']['customRepositorySpec'][
+            os.environ["TKG_BOM_IMAGE_TAG"] = Tkg_version.TAG
+            os.environ["TKG_CUSTOM_IMAGE_REPOSITORY"] = air_gapped_repo
+            os.environ["TKG_CUSTOM_IMAGE_REPOSITORY_SKIP_TLS_VERIFY"] = "False"
+            isSelfsinged = str(RequestSpec.json()['envSpec']['customRepositorySpec'][
                                    'tkgCustomImageRepositoryPublicCaCert'])
             if isSelfsinged.lower() == "false":
                 s = """
@@ -3668,12 +3639,10 @@ def cluster14Yaml(sharedClusterName, clusterPlan, datacenter, dataStorePath,
                 """
                 airgapped_str = airgapped_str + s
                 url = air_gapped_repo[:air_gapped_repo.find("/")]
-                getBase64CertWriteToFile(grabHostFromUrl(air_gapped_repo), grabPortFromUrl(air_gapped_repo))
-                with open('cert.txt', 'r') as file2:
-                    repo_cert = file2.readline()
+                repo_cert = getBase64CertWriteToFile(grabHostFromUrl(air_gapped_repo), grabPortFromUrl(air_gapped_repo))
                 repo_certificate = repo_cert
-                os.putenv("TKG_CUSTOM_IMAGE_REPOSITORY_SKIP_TLS_VERIFY", "False")
-                os.putenv("TKG_CUSTOM_IMAGE_REPOSITORY_CA_CERTIFICATE", repo_certificate)
+                os.environ["TKG_CUSTOM_IMAGE_REPOSITORY_SKIP_TLS_VERIFY"] = "False"
+                os.environ["TKG_CUSTOM_IMAGE_REPOSITORY_CA_CERTIFICATE"] = repo_certificate
                 formatted = airgapped_str % (
                     clustercidr, sharedClusterName, clusterPlan, servicecidr, "false"
                     ,
@@ -3685,7 +3654,7 @@ def cluster14Yaml(sharedClusterName, clusterPlan, datacenter, dataStorePath,
                 s = """
     TKG_CUSTOM_IMAGE_REPOSITORY_SKIP_TLS_VERIFY: "False"
                 """
-                os.putenv("TKG_CUSTOM_IMAGE_REPOSITORY_SKIP_TLS_VERIFY", "False")
+                os.environ["TKG_CUSTOM_IMAGE_REPOSITORY_SKIP_TLS_VERIFY"] = "False"
                 airgapped_str = airgapped_str + s
                 formatted = airgapped_str % (
                     clustercidr, sharedClusterName, clusterPlan, servicecidr, "false"
@@ -3712,12 +3681,11 @@ def template14deployYaml(sharedClusterName, clusterPlan, datacenter, dataStorePa
                          folderPath, mgmt_network, vspherePassword, sharedClusterResourcePool, vsphereServer,
                          sshKey, vsphereUseName, machineCount, size, env, type, vsSpec):
     if env == Env.VMC:
-        deploy_yaml = FileHelper.read_resource(Paths.TKG_VMC_CLUSTER_14_SPEC_J2)
-        ciep = str(request.get_json(force=True)["ceipParticipation"])
+        t = TemplateRegistry.get(Paths.TKG_VMC_CLUSTER_14_SPEC_J2)
+        ciep = str(RequestSpec.json()["ceipParticipation"])
     else:
-        deploy_yaml = FileHelper.read_resource(Paths.TKG_CLUSTER_14_SPEC_J2)
-        ciep = str(request.get_json(force=True)['envSpec']["ceipParticipation"])
-    t = Template(deploy_yaml)
+        t = TemplateRegistry.get(Paths.TKG_CLUSTER_14_SPEC_J2)
+        ciep = str(RequestSpec.json()['envSpec']["ceipParticipation"])
     datacenter = "/" + datacenter
     control_plane_vcpu = ""
     control_plane_disk_gb = ""
@@ -3728,7 +3696,7 @@ def template14deployYaml(sharedClusterName, clusterPlan, datacenter, dataStorePa
     if env == Env.VSPHERE or Env.VCF:
         if type == Type.SHARED:
             try:
-                proxyCert_raw = request.get_json(force=True)['envSpec']['proxySpec']['tkgSharedservice']['proxyCert']
+                proxyCert_raw = RequestSpec.json()['envSpec']['proxySpec']['tkgSharedservice']['proxyCert']
                 base64_bytes = base64.b64encode(proxyCert_raw.encode("utf-8"))
                 proxyCert = str(base64_bytes, "utf-8")
                 isProxyCert = "true"
@@ -3737,7 +3705,7 @@ def template14deployYaml(sharedClusterName, clusterPlan, datacenter, dataStorePa
                 current_app.logger.info("Proxy certificare for  shared is not provided")
         elif type == Type.WORKLOAD:
             try:
-                proxyCert_raw = request.get_json(force=True)['envSpec']['proxySpec']['tkgWorkload']['proxyCert']
+                proxyCert_raw = RequestSpec.json()['envSpec']['proxySpec']['tkgWorkload']['proxyCert']
                 base64_bytes = base64.b64encode(proxyCert_raw.encode("utf-8"))
                 proxyCert = str(base64_bytes, "utf-8")
                 isProxyCert = "true"
@@ -3750,17 +3718,17 @@ def template14deployYaml(sharedClusterName, clusterPlan, datacenter, dataStorePa
             servicecidr = vsSpec.tkgComponentSpec.tkgMgmtComponents.tkgSharedserviceServiceCidr
             size_selection = vsSpec.tkgComponentSpec.tkgMgmtComponents.tkgSharedserviceSize
             if str(size_selection).lower() == "custom":
-                control_plane_vcpu = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+                control_plane_vcpu = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
                     'tkgSharedserviceCpuSize']
-                control_plane_disk_gb = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+                control_plane_disk_gb = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
                     'tkgSharedserviceStorageSize']
-                control_plane_mem_gb = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+                control_plane_mem_gb = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
                     'tkgSharedserviceMemorySize']
                 control_plane_mem_mb = str(int(control_plane_mem_gb) * 1024)
             try:
-                osName = str(request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+                osName = str(RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
                                  'tkgSharedserviceBaseOs'])
-                kubeVersion = str(request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+                kubeVersion = str(RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
                                       'tkgSharedserviceKubeVersion'])
             except Exception as e:
                 raise Exception("Keyword " + str(e) + "  not found in input file")
@@ -3769,17 +3737,17 @@ def template14deployYaml(sharedClusterName, clusterPlan, datacenter, dataStorePa
             servicecidr = vsSpec.tkgWorkloadComponents.tkgWorkloadServiceCidr
             size_selection = vsSpec.tkgWorkloadComponents.tkgWorkloadSize
             if str(size_selection).lower() == "custom":
-                control_plane_vcpu = request.get_json(force=True)['tkgWorkloadComponents'][
+                control_plane_vcpu = RequestSpec.json()['tkgWorkloadComponents'][
                     'tkgWorkloadCpuSize']
-                control_plane_disk_gb = request.get_json(force=True)['tkgWorkloadComponents'][
+                control_plane_disk_gb = RequestSpec.json()['tkgWorkloadComponents'][
                     'tkgWorkloadStorageSize']
-                control_plane_mem_gb = request.get_json(force=True)['tkgWorkloadComponents'][
+                control_plane_mem_gb = RequestSpec.json()['tkgWorkloadComponents'][
                     'tkgWorkloadMemorySize']
                 control_plane_mem_mb = str(int(control_plane_mem_gb) * 1024)
             try:
-                osName = str(request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadBaseOs'])
+                osName = str(RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadBaseOs'])
                 kubeVersion = str(
-                    request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadKubeVersion'])
+                    RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadKubeVersion'])
             except Exception as e:
                 raise Exception("Keyword " + str(e) + "  not found in input file")
     elif env == Env.VCF:
@@ -3788,17 +3756,17 @@ def template14deployYaml(sharedClusterName, clusterPlan, datacenter, dataStorePa
             servicecidr = vsSpec.tkgComponentSpec.tkgSharedserviceSpec.tkgSharedserviceServiceCidr
             size_selection = vsSpec.tkgComponentSpec.tkgSharedserviceSpec.tkgSharedserviceSize
             if str(size_selection).lower() == "custom":
-                control_plane_vcpu = request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
+                control_plane_vcpu = RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
                     'tkgSharedserviceCpuSize']
-                control_plane_disk_gb = request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
+                control_plane_disk_gb = RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
                     'tkgSharedserviceStorageSize']
-                control_plane_mem_gb = request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
+                control_plane_mem_gb = RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
                     'tkgSharedserviceMemorySize']
                 control_plane_mem_mb = str(int(control_plane_mem_gb) * 1024)
             try:
-                osName = str(request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
+                osName = str(RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
                                  'tkgSharedserviceBaseOs'])
-                kubeVersion = str(request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
+                kubeVersion = str(RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
                                       'tkgSharedserviceKubeVersion'])
             except Exception as e:
                 raise Exception("Keyword " + str(e) + "  not found in input file")
@@ -3807,61 +3775,61 @@ def template14deployYaml(sharedClusterName, clusterPlan, datacenter, dataStorePa
             servicecidr = vsSpec.tkgWorkloadComponents.tkgWorkloadServiceCidr
             size_selection = vsSpec.tkgWorkloadComponents.tkgWorkloadSize
             if str(size_selection).lower() == "custom":
-                control_plane_vcpu = request.get_json(force=True)['tkgWorkloadComponents'][
+                control_plane_vcpu = RequestSpec.json()['tkgWorkloadComponents'][
                     'tkgWorkloadCpuSize']
-                control_plane_disk_gb = request.get_json(force=True)['tkgWorkloadComponents'][
+                control_plane_disk_gb = RequestSpec.json()['tkgWorkloadComponents'][
                     'tkgWorkloadStorageSize']
-                control_plane_mem_gb = request.get_json(force=True)['tkgWorkloadComponents'][
+                control_plane_mem_gb = RequestSpec.json()['tkgWorkloadComponents'][
                     'tkgWorkloadMemorySize']
                 control_plane_mem_mb = str(int(control_plane_mem_gb) * 1024)
             try:
-                osName = str(request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadBaseOs'])
+                osName = str(RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadBaseOs'])
                 kubeVersion = str(
-                    request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadKubeVersion'])
+                    RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadKubeVersion'])
             except Exception as e:
                 raise Exception("Keyword " + str(e) + "  not found in input file")
     elif env == Env.VMC:
         if type == Type.SHARED:
-            clustercidr = request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec'][
+            clustercidr = RequestSpec.json()['componentSpec']['tkgSharedServiceSpec'][
                 'tkgSharedserviceClusterCidr']
-            servicecidr = request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec'][
+            servicecidr = RequestSpec.json()['componentSpec']['tkgSharedServiceSpec'][
                 'tkgSharedserviceServiceCidr']
-            size_selection = request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec'][
+            size_selection = RequestSpec.json()['componentSpec']['tkgSharedServiceSpec'][
                 'tkgSharedserviceSize']
             if str(size_selection).lower() == "custom":
-                control_plane_vcpu = request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec'][
+                control_plane_vcpu = RequestSpec.json()['componentSpec']['tkgSharedServiceSpec'][
                     'tkgSharedserviceCpuSize']
-                control_plane_disk_gb = request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec'][
+                control_plane_disk_gb = RequestSpec.json()['componentSpec']['tkgSharedServiceSpec'][
                     'tkgSharedserviceStorageSize']
-                control_plane_mem_gb = request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec'][
+                control_plane_mem_gb = RequestSpec.json()['componentSpec']['tkgSharedServiceSpec'][
                     'tkgSharedserviceMemorySize']
                 control_plane_mem_mb = str(int(control_plane_mem_gb) * 1024)
             try:
-                osName = str(request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec'][
+                osName = str(RequestSpec.json()['componentSpec']['tkgSharedServiceSpec'][
                                  'tkgSharedserviceBaseOs'])
-                kubeVersion = str(request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec'][
+                kubeVersion = str(RequestSpec.json()['componentSpec']['tkgSharedServiceSpec'][
                                       'tkgSharedserviceKubeVersion'])
             except Exception as e:
                 raise Exception("Keyword " + str(e) + "  not found in input file")
         elif type == Type.WORKLOAD:
-            clustercidr = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec'][
+            clustercidr = RequestSpec.json()['componentSpec']['tkgWorkloadSpec'][
                 'tkgWorkloadClusterCidr']
-            servicecidr = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec'][
+            servicecidr = RequestSpec.json()['componentSpec']['tkgWorkloadSpec'][
                 'tkgWorkloadServiceCidr']
-            size_selection = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec'][
+            size_selection = RequestSpec.json()['componentSpec']['tkgWorkloadSpec'][
                 'tkgWorkloadSize']
             if str(size_selection).lower() == "custom":
-                control_plane_vcpu = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec'][
+                control_plane_vcpu = RequestSpec.json()['componentSpec']['tkgWorkloadSpec'][
                     'tkgWorkloadCpuSize']
-                control_plane_disk_gb = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec'][
+                control_plane_disk_gb = RequestSpec.json()['componentSpec']['tkgWorkloadSpec'][
                     'tkgWorkloadStorageSize']
-                control_plane_mem_gb = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec'][
+                control_plane_mem_gb = RequestSpec.json()['componentSpec']['tkgWorkloadSpec'][
                     'tkgWorkloadMemorySize']
                 control_plane_mem_mb = str(int(control_plane_mem_gb) * 1024)
             try:
                 osName = str(
-                    request.get_json(force=True)['componentSpec']['tkgWorkloadSpec']['tkgWorkloadBaseOs'])
-                kubeVersion = str(request.get_json(force=True)['componentSpec']['tkgWorkloadSpec'][
+                    RequestSpec.json()['componentSpec']['tkgWorkloadSpec']['tkgWorkloadBaseOs'])
+                kubeVersion = str(RequestSpec.json()['componentSpec']['tkgWorkloadSpec'][
                                       'tkgWorkloadKubeVersion'])
             except Exception as e:
                 raise Exception("Keyword " + str(e) + "  not found in input file")
@@ -3877,26 +3845,24 @@ def template14deployYaml(sharedClusterName, clusterPlan, datacenter, dataStorePa
     if checkEnableIdentityManagement(env):
         if env == Env.VSPHERE or env == Env.VCF:
             identity_mgmt_type = str(
-                request.get_json(force=True)["tkgComponentSpec"]["identityManagementSpec"][
+                RequestSpec.json()["tkgComponentSpec"]["identityManagementSpec"][
                     "identityManagementType"])
         elif env == Env.VMC:
             identity_mgmt_type = str(
-                request.get_json(force=True)["componentSpec"]["identityManagementSpec"][
+                RequestSpec.json()["componentSpec"]["identityManagementSpec"][
                     "identityManagementType"])
     else:
         identity_mgmt_type = ""
     if checkAirGappedIsEnabled(env):
         air_gapped_repo = vsSpec.envSpec.customRepositorySpec.tkgCustomImageRepository
         air_gapped_repo = air_gapped_repo.replace("https://", "").replace("http://", "")
-        os.putenv("TKG_BOM_IMAGE_TAG", Tkg_version.TAG)
-        os.putenv("TKG_CUSTOM_IMAGE_REPOSITORY", air_gapped_repo)
-        os.putenv("TKG_CUSTOM_IMAGE_REPOSITORY_SKIP_TLS_VERIFY", "False")
+        os.environ["TKG_BOM_IMAGE_TAG"] = Tkg_version.TAG
+        os.environ["TKG_CUSTOM_IMAGE_REPOSITORY"] = air_gapped_repo
+        os.environ["TKG_CUSTOM_IMAGE_REPOSITORY_SKIP_TLS_VERIFY"] = "False"
         url = air_gapped_repo[:air_gapped_repo.find("/")]
-        getBase64CertWriteToFile(grabHostFromUrl(air_gapped_repo), grabPortFromUrl(air_gapped_repo))
-        with open('cert.txt', 'r') as file2:
-            repo_cert = file2.readline()
+        repo_cert = getBase64CertWriteToFile(grabHostFromUrl(air_gapped_repo), grabPortFromUrl(air_gapped_repo))
         repo_certificate = repo_cert
-        os.putenv("TKG_CUSTOM_IMAGE_REPOSITORY_CA_CERTIFICATE", repo_certificate)
+        os.environ["TKG_CUSTOM_IMAGE_REPOSITORY_CA_CERTIFICATE"] = repo_certificate
     FileHelper.write_to_file(
         t.render(config=vsSpec, clustercidr=clustercidr, sharedClusterName=sharedClusterName, clusterPlan=clusterPlan,
                  servicecidr=servicecidr, datacenter=datacenter, dataStorePath=dataStorePath,
@@ -3943,7 +3909,7 @@ def cluster13Yaml(sharedClusterName, clusterPlan, datacenter, dataStorePath,
     WORKER_SIZE: %s
     VSPHERE_INSECURE: true
     """
-    sharedClusterEndPoint = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+    sharedClusterEndPoint = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
         'tkgSharedservice-controlplane-ip']
     with open(sharedClusterName + ".yaml", 'w') as outfile:
         if type == Type.SHARED and checkSharedServiceProxyEnabled(env):
@@ -3953,9 +3919,9 @@ def cluster13Yaml(sharedClusterName, clusterPlan, datacenter, dataStorePath,
     TKG_NO_PROXY: %s
             """
             proxy_str = yaml_data + yaml_str_proxy
-            httpProxy = str(request.get_json(force=True)['envSpec']['proxySpec']['tkgSharedservice']['httpProxy'])
-            httpsProxy = str(request.get_json(force=True)['envSpec']['proxySpec']['tkgSharedservice']['httpsProxy'])
-            noProxy = str(request.get_json(force=True)['envSpec']['proxySpec']['tkgSharedservice']['noProxy'])
+            httpProxy = str(RequestSpec.json()['envSpec']['proxySpec']['tkgSharedservice']['httpProxy'])
+            httpsProxy = str(RequestSpec.json()['envSpec']['proxySpec']['tkgSharedservice']['httpsProxy'])
+            noProxy = str(RequestSpec.json()['envSpec']['proxySpec']['tkgSharedservice']['noProxy'])
             noProxy = noProxy.strip("\n").strip(" ").strip("\r")
             formatted = proxy_str % (
                 CIDR.SHARED_CLUSTER_CIDR, sharedClusterName, clusterPlan, CIDR.SHARED_SERVICE_CIDR, "true",
@@ -3971,9 +3937,9 @@ def cluster13Yaml(sharedClusterName, clusterPlan, datacenter, dataStorePath,
     TKG_NO_PROXY: %s
             """
             proxy_str = yaml_data + yaml_str_proxy
-            httpProxy = str(request.get_json(force=True)['envSpec']['proxySpec']['tkgWorkload']['httpProxy'])
-            httpsProxy = str(request.get_json(force=True)['envSpec']['proxySpec']['tkgWorkload']['httpsProxy'])
-            noProxy = str(request.get_json(force=True)['envSpec']['proxySpec']['tkgWorkload']['noProxy'])
+            httpProxy = str(RequestSpec.json()['envSpec']['proxySpec']['tkgWorkload']['httpProxy'])
+            httpsProxy = str(RequestSpec.json()['envSpec']['proxySpec']['tkgWorkload']['httpsProxy'])
+            noProxy = str(RequestSpec.json()['envSpec']['proxySpec']['tkgWorkload']['noProxy'])
             noProxy = noProxy.strip("\n").strip(" ").strip("\r")
             formatted = proxy_str % (
                 CIDR.SHARED_CLUSTER_CIDR, sharedClusterName, clusterPlan, CIDR.SHARED_SERVICE_CIDR, "true",
@@ -3988,12 +3954,12 @@ def cluster13Yaml(sharedClusterName, clusterPlan, datacenter, dataStorePath,
             """
             airgapped_str = yaml_data + yaml_str_airgapped
             air_gapped_repo = str(
-                request.get_json(force=True)['envSpec']['customRepositorySpec']['tkgCustomImageRepository'])
+                RequestSpec.json()['envSpec']['customRepositorySpec']['tkgCustomImageRepository'])
             air_gapped_repo = air_gapped_repo.replace("https://", "").replace("http://", "")
-            os.putenv("TKG_BOM_IMAGE_TAG", Tkg_version.TAG)
-            os.putenv("TKG_CUSTOM_IMAGE_REPOSITORY", air_gapped_repo)
-            os.putenv("TKG_CUSTOM_IMAGE_REPOSITORY_SKIP_TLS_VERIFY", "False")
-            isSelfsinged = str(request.get_json(force=True)['envSpec']['customRepositorySpec'][
+            os.environ["TKG_BOM_IMAGE_TAG"] = Tkg_version.TAG
+            os.environ["TKG_CUSTOM_IMAGE_REPOSITORY"] = air_gapped_repo
+            os.environ["TKG_CUSTOM_IMAGE_REPOSITORY_SKIP_TLS_VERIFY"] = "False"
+            isSelfsinged = str(RequestSpec.json()['envSpec']['customRepositorySpec'][
                                    'tkgCustomImageRepositoryPublicCaCert'])
             if isSelfsinged.lower() == "false":
                 s = """
@@ -4002,12 +3968,10 @@ def cluster13Yaml(sharedClusterName, clusterPlan, datacenter, dataStorePath,
                 """
                 airgapped_str = airgapped_str + s
                 url = air_gapped_repo[:air_gapped_repo.find("/")]
-                getBase64CertWriteToFile(grabHostFromUrl(air_gapped_repo), grabPortFromUrl(air_gapped_repo))
-                with open('cert.txt', 'r') as file2:
-                    repo_cert = file2.readline()
+                repo_cert = getBase64CertWriteToFile(grabHostFromUrl(air_gapped_repo), grabPortFromUrl(air_gapped_repo))
                 repo_certificate = repo_cert
-                os.putenv("TKG_CUSTOM_IMAGE_REPOSITORY_SKIP_TLS_VERIFY", "False")
-                os.putenv("TKG_CUSTOM_IMAGE_REPOSITORY_CA_CERTIFICATE", repo_certificate)
+                os.environ["TKG_CUSTOM_IMAGE_REPOSITORY_SKIP_TLS_VERIFY"] = "False"
+                os.environ["TKG_CUSTOM_IMAGE_REPOSITORY_CA_CERTIFICATE"] = repo_certificate
                 formatted = airgapped_str % (
                     CIDR.SHARED_CLUSTER_CIDR, sharedClusterName, clusterPlan, CIDR.SHARED_SERVICE_CIDR, "false",
                     sharedClusterEndPoint,
@@ -4019,7 +3983,7 @@ def cluster13Yaml(sharedClusterName, clusterPlan, datacenter, dataStorePath,
                 s = """
     TKG_CUSTOM_IMAGE_REPOSITORY_SKIP_TLS_VERIFY: "False"
                 """
-                os.putenv("TKG_CUSTOM_IMAGE_REPOSITORY_SKIP_TLS_VERIFY", "False")
+                os.environ["TKG_CUSTOM_IMAGE_REPOSITORY_SKIP_TLS_VERIFY"] = "False"
                 airgapped_str = airgapped_str + s
                 formatted = airgapped_str % (
                     CIDR.SHARED_CLUSTER_CIDR, sharedClusterName, clusterPlan, CIDR.SHARED_SERVICE_CIDR, "false",
@@ -4045,25 +4009,22 @@ def cluster13Yaml(sharedClusterName, clusterPlan, datacenter, dataStorePath,
 def template13deployYaml(sharedClusterName, clusterPlan, datacenter, dataStorePath,
                          folderPath, mgmt_network, vspherePassword, sharedClusterResourcePool, vsphereServer,
                          sshKey, vsphereUseName, machineCount, size, env, type, vsSpec):
-    sharedClusterEndPoint = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+    sharedClusterEndPoint = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
         'tkgSharedservice-controlplane-ip']
-    deploy_yaml = FileHelper.read_resource(Paths.TKG_CLUSTER_13_SPEC_J2)
+    t = TemplateRegistry.get(Paths.TKG_CLUSTER_13_SPEC_J2)
     datacenter = "/" + datacenter
-    t = Template(deploy_yaml)
     air_gapped_repo = ""
     repo_certificate = ""
     if checkAirGappedIsEnabled(env):
         air_gapped_repo = vsSpec.envSpec.customRepositorySpec.tkgCustomImageRepository
         air_gapped_repo = air_gapped_repo.replace("https://", "").replace("http://", "")
-        os.putenv("TKG_BOM_IMAGE_TAG", Tkg_version.TAG)
-        os.putenv("TKG_CUSTOM_IMAGE_REPOSITORY", air_gapped_repo)
-        os.putenv("TKG_CUSTOM_IMAGE_REPOSITORY_SKIP_TLS_VERIFY", "False")
+        os.environ["TKG_BOM_IMAGE_TAG"] = Tkg_version.TAG
+        os.environ["TKG_CUSTOM_IMAGE_REPOSITORY"] = air_gapped_repo
+        os.environ["TKG_CUSTOM_IMAGE_REPOSITORY_SKIP_TLS_VERIFY"] = "False"
         url = air_gapped_repo[:air_gapped_repo.find("/")]
-        getBase64CertWriteToFile(grabHostFromUrl(air_gapped_repo), grabPortFromUrl(air_gapped_repo))
-        with open('cert.txt', 'r') as file2:
-            repo_cert = file2.readline()
+        repo_cert = getBase64CertWriteToFile(grabHostFromUrl(air_gapped_repo), grabPortFromUrl(air_gapped_repo))
         repo_certificate = repo_cert
-        os.putenv("TKG_CUSTOM_IMAGE_REPOSITORY_CA_CERTIFICATE", repo_certificate)
+        os.environ["TKG_CUSTOM_IMAGE_REPOSITORY_CA_CERTIFICATE"] = repo_certificate
     FileHelper.write_to_file(
         t.render(config=vsSpec, sharedClusterName=sharedClusterName, clusterPlan=clusterPlan,
                  sharedClusterEndPoint=sharedClusterEndPoint,
@@ -4077,10 +4038,10 @@ def template13deployYaml(sharedClusterName, clusterPlan, datacenter, dataStorePa
 
 
 def getNetworkFolder(netWorkName, vcenter_ip, vcenter_username, password):
-    os.putenv("GOVC_URL", "https://" + vcenter_ip + "/sdk")
-    os.putenv("GOVC_USERNAME", vcenter_username)
-    os.putenv("GOVC_PASSWORD", password)
-    os.putenv("GOVC_INSECURE", "true")
+    os.environ["GOVC_URL"] = "https://" + vcenter_ip + "/sdk"
+    os.environ["GOVC_USERNAME"] = vcenter_username
+    os.environ["GOVC_PASSWORD"] = password
+    os.environ["GOVC_INSECURE"] = "true"
     find_command = ["govc", "find", "-name", netWorkName]
     count = 0
     net = ""
@@ -4179,13 +4140,10 @@ def registerTSM(cluster_name, env, size):
 
 def inegrateSas(cluster_name, env, sasType):
     if isEnvTkgs_ns(env):
-        vcenter_ip = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterAddress']
-        vcenter_username = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterSsoUser']
-        str_enc = str(request.get_json(force=True)['envSpec']['vcenterDetails']["vcenterSsoPasswordBase64"])
-        base64_bytes = str_enc.encode('ascii')
-        enc_bytes = base64.b64decode(base64_bytes)
-        password = enc_bytes.decode('ascii').rstrip("\n")
-        cluster = request.get_json(force=True)["envSpec"]["vcenterDetails"]["vcenterCluster"]
+        vcenter_ip = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterAddress']
+        vcenter_username = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterSsoUser']
+        password = RequestSpec.secret("envSpec", "vcenterDetails", "vcenterSsoPasswordBase64")
+        cluster = RequestSpec.json()["envSpec"]["vcenterDetails"]["vcenterCluster"]
         cluster_status = isClusterRunning(vcenter_ip, vcenter_username, password, cluster, cluster_name)
         if cluster_status[1] != 200:
             return cluster_status[0], cluster_status[1]
@@ -4250,35 +4208,33 @@ def inegrateSas(cluster_name, env, sasType):
             }
             return jsonify(d), 500
         if sasType == SAS.TO:
-            fileName = "to_json.json"
             if env == Env.VMC:
-                toUrl = request.get_json(force=True)["saasEndpoints"]["tanzuObservabilityDetails"][
+                toUrl = RequestSpec.json()["saasEndpoints"]["tanzuObservabilityDetails"][
                     "tanzuObservabilityUrl"]
-                toToken = request.get_json(force=True)["saasEndpoints"]["tanzuObservabilityDetails"][
+                toToken = RequestSpec.json()["saasEndpoints"]["tanzuObservabilityDetails"][
                     "tanzuObservabilityRefreshToken"]
             elif env == Env.VSPHERE or env == Env.VCF:
-                toUrl = request.get_json(force=True)["envSpec"]["saasEndpoints"]["tanzuObservabilityDetails"][
+                toUrl = RequestSpec.json()["envSpec"]["saasEndpoints"]["tanzuObservabilityDetails"][
                     "tanzuObservabilityUrl"]
-                toToken = request.get_json(force=True)["envSpec"]["saasEndpoints"]["tanzuObservabilityDetails"][
+                toToken = RequestSpec.json()["envSpec"]["saasEndpoints"]["tanzuObservabilityDetails"][
                     "tanzuObservabilityRefreshToken"]
-            generateToJsonFile(li_[1], li_[2], cluster_name, toUrl, toToken)
+            fileName = generateToJsonFile(li_[1], li_[2], cluster_name, toUrl, toToken)
         elif sasType == SAS.TSM:
-            fileName = "tsm_json.json"
             if env == Env.VMC:
-                exact = request.get_json(force=True)["componentSpec"]["tkgWorkloadSpec"]["namespaceExclusions"][
+                exact = RequestSpec.json()["componentSpec"]["tkgWorkloadSpec"]["namespaceExclusions"][
                     "exactName"]
-                partial = request.get_json(force=True)["componentSpec"]["tkgWorkloadSpec"]["namespaceExclusions"][
+                partial = RequestSpec.json()["componentSpec"]["tkgWorkloadSpec"]["namespaceExclusions"][
                     "startsWith"]
             elif env == Env.VSPHERE or env == Env.VCF:
                 if isEnvTkgs_ns(env):
-                    exact = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+                    exact = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
                         "tkgsVsphereWorkloadClusterSpec"]["namespaceExclusions"]["exactName"]
-                    partial = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+                    partial = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
                         "tkgsVsphereWorkloadClusterSpec"]["namespaceExclusions"]["startsWith"]
                 else:
-                    exact = request.get_json(force=True)['tkgWorkloadComponents']["namespaceExclusions"]["exactName"]
-                    partial = request.get_json(force=True)['tkgWorkloadComponents']["namespaceExclusions"]["startsWith"]
-            generateTSMJsonFile(li_[1], li_[2], cluster_name, exact, partial)
+                    exact = RequestSpec.json()['tkgWorkloadComponents']["namespaceExclusions"]["exactName"]
+                    partial = RequestSpec.json()['tkgWorkloadComponents']["namespaceExclusions"]["startsWith"]
+            fileName = generateTSMJsonFile(li_[1], li_[2], cluster_name, exact, partial)
         command_create = ["tmc", "cluster", "integration", "create", "-f", fileName]
         state = runShellCommandAndReturnOutput(command_create)
         if sasType == SAS.TO:
@@ -4323,7 +4279,7 @@ def inegrateSas(cluster_name, env, sasType):
 
 
 def generateToJsonFile(management_cluster, provisioner_name, cluster_name, toUrl, toSecrets):
-    fileName = "to_json.json"
+    fileName = cluster_name + "_to_json.json"
     toJson = {
         "full_name": {
             "provisionerName": provisioner_name,
@@ -4343,10 +4299,11 @@ def generateToJsonFile(management_cluster, provisioner_name, cluster_name, toUrl
     os.system("rm -rf " + fileName)
     with open(fileName, 'w') as f:
         json.dump(toJson, f)
+    return fileName
 
 
 def generateTSMJsonFile(management_cluster, provisioner_name, cluster_name, exact, partial):
-    fileName = "tsm_json.json"
+    fileName = cluster_name + "_tsm_json.json"
     tsmJson = {
         "full_name": {
             "provisionerName": provisioner_name,
@@ -4371,6 +4328,7 @@ def generateTSMJsonFile(management_cluster, provisioner_name, cluster_name, exac
     os.system("rm -rf " + fileName)
     with open(fileName, 'w') as f:
         json.dump(tsmJson, f)
+    return fileName
 
 
 def isSasRegistred(clusterName, management, provisoner, pr, sasType):
@@ -4418,10 +4376,10 @@ def checkToEnabled(env):
     try:
         to = False
         if env == Env.VMC:
-            to = request.get_json(force=True)["saasEndpoints"]["tanzuObservabilityDetails"][
+            to = RequestSpec.json()["saasEndpoints"]["tanzuObservabilityDetails"][
                 "tanzuObservabilityAvailability"]
         elif env == Env.VSPHERE or env == Env.VCF:
-            to = request.get_json(force=True)["envSpec"]["saasEndpoints"]["tanzuObservabilityDetails"][
+            to = RequestSpec.json()["envSpec"]["saasEndpoints"]["tanzuObservabilityDetails"][
                 "tanzuObservabilityAvailability"]
         if str(to).lower() == "true":
             return True
@@ -4445,12 +4403,12 @@ def checkClusterSizeForTo(env):
             }
             return jsonify(d), 500
         if env == Env.VMC:
-            size = str(request.get_json(force=True)['componentSpec']['tkgWorkloadSpec']['tkgWorkloadSize'])
+            size = str(RequestSpec.json()['componentSpec']['tkgWorkloadSpec']['tkgWorkloadSize'])
         elif env == Env.VSPHERE or env == Env.VCF:
             # if isEnvTkgs_ns(env):
-            # size = str(request.get_json(force=True)['tkgsComponentSpec']['controlPlaneSize'])
+            # size = str(RequestSpec.json()['tkgsComponentSpec']['controlPlaneSize'])
             # else:
-            size = str(request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadSize'])
+            size = str(RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadSize'])
         if size.lower() == "medium" or size.lower() == "small":
             if isTo:
                 msg_text = "Recommend to use Tanzu Observability integration with cluster size large or extra-large"
@@ -4486,14 +4444,14 @@ def checkClusterSizeForTo(env):
 def checTSMEnabled(env):
     try:
         if env == Env.VMC:
-            isTsm = str(request.get_json(force=True)["componentSpec"]["tkgWorkloadSpec"][
+            isTsm = str(RequestSpec.json()["componentSpec"]["tkgWorkloadSpec"][
                             "tkgWorkloadTsmIntegration"])
         elif env == Env.VSPHERE or env == Env.VCF:
             if isEnvTkgs_ns(env):
-                isTsm = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+                isTsm = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
                     "tkgsVsphereWorkloadClusterSpec"]["tkgWorkloadTsmIntegration"]
             else:
-                isTsm = str(request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadTsmIntegration'])
+                isTsm = str(RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadTsmIntegration'])
         if isTsm.lower() == "true":
             return True
         else:
@@ -4506,10 +4464,10 @@ def checkMachineCountForTsm(env):
     if checTSMEnabled(env):
         try:
             if env == Env.VMC:
-                machineCount_workload = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec'][
+                machineCount_workload = RequestSpec.json()['componentSpec']['tkgWorkloadSpec'][
                     'tkgWorkloadWorkerMachineCount']
             elif env == Env.VSPHERE or env == Env.VCF:
-                machineCount_workload = request.get_json(force=True)['tkgWorkloadComponents'][
+                machineCount_workload = RequestSpec.json()['tkgWorkloadComponents'][
                     'tkgWorkloadWorkerMachineCount']
             if int(machineCount_workload) < 3:
                 d = {
@@ -4544,36 +4502,36 @@ def checkMachineCountForProdType(env, isShared, isWorkload):
     try:
         if env == Env.VMC:
             if isShared:
-                shared_deployment_type = request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec'][
+                shared_deployment_type = RequestSpec.json()['componentSpec']['tkgSharedServiceSpec'][
                     'tkgSharedserviceDeploymentType']
-                shared_worker_count = request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec'][
+                shared_worker_count = RequestSpec.json()['componentSpec']['tkgSharedServiceSpec'][
                     'tkgSharedserviceWorkerMachineCount']
             if isWorkload:
-                workload_deployment_type = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec'][
+                workload_deployment_type = RequestSpec.json()['componentSpec']['tkgWorkloadSpec'][
                     'tkgWorkloadDeploymentType']
-                workload_worker_count = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec'][
+                workload_worker_count = RequestSpec.json()['componentSpec']['tkgWorkloadSpec'][
                     'tkgWorkloadWorkerMachineCount']
         elif env == Env.VSPHERE:
             if isShared:
-                shared_deployment_type = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+                shared_deployment_type = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
                     'tkgSharedserviceDeploymentType']
-                shared_worker_count = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+                shared_worker_count = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
                     'tkgSharedserviceWorkerMachineCount']
             if isWorkload:
-                workload_deployment_type = request.get_json(force=True)['tkgWorkloadComponents'][
+                workload_deployment_type = RequestSpec.json()['tkgWorkloadComponents'][
                     'tkgWorkloadDeploymentType']
-                workload_worker_count = request.get_json(force=True)['tkgWorkloadComponents'][
+                workload_worker_count = RequestSpec.json()['tkgWorkloadComponents'][
                     'tkgWorkloadWorkerMachineCount']
         elif env == Env.VCF:
             if isShared:
-                shared_deployment_type = request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
+                shared_deployment_type = RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
                     'tkgSharedserviceDeploymentType']
-                shared_worker_count = request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
+                shared_worker_count = RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
                     'tkgSharedserviceWorkerMachineCount']
             if isWorkload:
-                workload_deployment_type = request.get_json(force=True)['tkgWorkloadComponents'][
+                workload_deployment_type = RequestSpec.json()['tkgWorkloadComponents'][
                     'tkgWorkloadDeploymentType']
-                workload_worker_count = request.get_json(force=True)['tkgWorkloadComponents'][
+                workload_worker_count = RequestSpec.json()['tkgWorkloadComponents'][
                     'tkgWorkloadWorkerMachineCount']
         if isShared:
             if shared_deployment_type.lower() == PLAN.PROD_PLAN:
@@ -4620,8 +4578,9 @@ def checkMachineCountForProdType(env, isShared, isWorkload):
 def generateTmcProxyYaml(name_of_proxy, httpProxy_, httpsProxy_, noProxyList_, httpUserName_, httpPassword_,
                          httpsUserName_,
                          httpsPassword_):
+    fileName = name_of_proxy + ".yaml"
     if httpUserName_ and httpPassword_ and httpsUserName_ and httpsPassword_:
-        os.system("rm -rf tmc_proxy.yaml")
+        os.system("rm -rf " + fileName)
         data = dict(
             fullName=dict(
                 name=name_of_proxy,
@@ -4635,7 +4594,7 @@ def generateTmcProxyYaml(name_of_proxy, httpProxy_, httpsProxy_, noProxyList_, h
             type=dict(kind="Credential", package="vmware.tanzu.manage.v1alpha1.account.credential", version="v1alpha1")
         )
     else:
-        os.system("rm -rf tmc_proxy.yaml")
+        os.system("rm -rf " + fileName)
         data = dict(
             fullName=dict(
                 name=name_of_proxy,
@@ -4648,10 +4607,11 @@ def generateTmcProxyYaml(name_of_proxy, httpProxy_, httpsProxy_, noProxyList_, h
             type=dict(kind="Credential", package="vmware.tanzu.manage.v1alpha1.account.credential", version="v1alpha1")
         )
 
-    with open('tmc_proxy.yaml', 'w') as outfile:
+    with open(fileName, 'w') as outfile:
         yaml1 = ryaml.YAML()
         yaml1.indent(mapping=2, sequence=4, offset=2)
         yaml1.dump(data, outfile)
+    return fileName
 
 
 def createVcfDhcpServer():
@@ -4666,7 +4626,10 @@ def createVcfDhcpServer():
             }
             return jsonify(d), 500
         uri = "https://" + headers_[2] + "/policy/api/v1/infra/dhcp-server-configs"
-        output = getList(headers_[1], uri)
+        # Read both lists at once, getTier1Details then finds the tier-1s already fetched.
+        lists = NsxtPager.list_all({"dhcp": uri, "tier1": "https://" + headers_[2] + "/policy/api/v1/infra/tier-1s"},
+                                   headers_[1])
+        output = lists["dhcp"]
         if output[1] != 200:
             current_app.logger.error("Failed to get DHCP info on NSXT " + str(output[0]))
             d = {
@@ -4725,6 +4688,7 @@ def createVcfDhcpServer():
                     }
                     current_app.logger.error(dhcp_create.text)
                     return jsonify(d), dhcp_create.status_code
+                NsxtPager.invalidate(uri)
                 msg_text = "Created DHCP server " + VCF.DHCP_SERVER_NAME
                 current_app.logger.info(msg_text)
             else:
@@ -4748,148 +4712,83 @@ def createVcfDhcpServer():
         return jsonify(d), 500
 
 
-def createNsxtSegment(segementName, gatewayAddress, dhcpStart, dhcpEnd, dnsServers, network, isDhcp):
-    try:
-        headers_ = grabNsxtHeaders()
-        if headers_[0] is None:
-            current_app.logger.error("Failed to get NSXT info " + str(headers_[1]))
-            d = {
-                "responseType": "ERROR",
-                "msg": "Failed to get NSXT info " + str(headers_[1]),
-                "STATUS_CODE": 500
-            }
-            return jsonify(d), 500
-        uri = "https://" + headers_[2] + "/policy/api/v1/infra/segments"
-        output = getList(headers_[1], uri)
-        if output[1] != 200:
-            d = {
-                "responseType": "ERROR",
-                "msg": "Failed to get list of segments " + str(output[0]),
-                "STATUS_CODE": 500
-            }
-            return jsonify(d), 500
-        overlay = str(request.get_json(force=True)['envSpec']['vcenterDetails']["nsxtOverlay"])
-        ntp_servers = str(request.get_json(force=True)['envSpec']['infraComponents']["ntpServers"])
-        trz = getTransportZone(headers_[2], overlay, headers_[1])
-        if trz[0] is None:
-            d = {
-                "responseType": "ERROR",
-                "msg": "Failed to get transport zone ID " + str(trz[1]),
-                "STATUS_CODE": 500
-            }
-            return jsonify(d), 500
-        tier_path = getTier1Details(headers_)
-        if tier_path[0] is None:
-            d = {
-                "responseType": "ERROR",
-                "msg": "Failed to get Tier1 details " + str(tier_path[1]),
-                "STATUS_CODE": 500
-            }
-            return jsonify(d), 500
-        if not checkObjectIsPresentAndReturnPath(output[0], segementName)[0]:
-            current_app.logger.info("Creating segment " + segementName)
-            url = "https://" + headers_[2] + "/policy/api/v1/infra/segments/" + segementName
-            if isDhcp:
-                payload = {
-                    "display_name": segementName,
-                    "subnets": [
-                        {
-                            "gateway_address": gatewayAddress,
-                            "dhcp_ranges": [
-                                dhcpStart + "-" + dhcpEnd
-                            ],
-                            "dhcp_config": {
-                                "resource_type": "SegmentDhcpV4Config",
-                                "lease_time": 86400,
-                                "dns_servers": convertStringToCommaSeperated(dnsServers),
-                                "options": {
-                                    "others": [
-                                        {
-                                            "code": 42,
-                                            "values": convertStringToCommaSeperated(ntp_servers)
-                                        }
-                                    ]
-                                }
-                            },
-                            "network": network
-                        }
+def nsxtSegmentPayload(segementName, gatewayAddress, dhcpStart, dhcpEnd, dnsServers, network, isDhcp, tier_path,
+                       transport_zone):
+    ntp_servers = str(RequestSpec.json()['envSpec']['infraComponents']["ntpServers"])
+    if isDhcp:
+        return {
+            "display_name": segementName,
+            "subnets": [
+                {
+                    "gateway_address": gatewayAddress,
+                    "dhcp_ranges": [
+                        dhcpStart + "-" + dhcpEnd
                     ],
-                    "connectivity_path": tier_path[0],
-                    "transport_zone_path": "/infra/sites/default/enforcement-points/default/transport-zones/" + str(
-                        trz[0]),
-                    "id": segementName
-                }
-            else:
-                payload = {
-                    "display_name": segementName,
-                    "subnets": [
-                        {
-                            "gateway_address": gatewayAddress
+                    "dhcp_config": {
+                        "resource_type": "SegmentDhcpV4Config",
+                        "lease_time": 86400,
+                        "dns_servers": convertStringToCommaSeperated(dnsServers),
+                        "options": {
+                            "others": [
+                                {
+                                    "code": 42,
+                                    "values": convertStringToCommaSeperated(ntp_servers)
+                                }
+                            ]
                         }
-                    ],
-                    "replication_mode": "MTEP",
-                    "transport_zone_path": "/infra/sites/default/enforcement-points/default/transport-zones/" + str(
-                        trz[0]),
-                    "admin_state": "UP",
-                    "advanced_config": {
-                        "address_pool_paths": [
-                        ],
-                        "multicast": True,
-                        "urpf_mode": "STRICT",
-                        "connectivity": "ON"
                     },
-                    "connectivity_path": tier_path[0],
-                    "id": segementName
+                    "network": network
                 }
-            headers_[1].update({"Content-Type": "application/json", "Accept": "application/json"})
-            payload_modified = json.dumps(payload, indent=4)
-            dhcp_create = requests.request("PUT", url,
-                                           headers=headers_[1],
-                                           data=payload_modified,
-                                           verify=False)
-            if dhcp_create.status_code != 200:
-                d = {
-                    "responseType": "ERROR",
-                    "msg": dhcp_create.text,
-                    "STATUS_CODE": dhcp_create.status_code
-                }
-                current_app.logger.error(dhcp_create.text)
-                return jsonify(d), dhcp_create.status_code
-            msg_text = "Created " + segementName
-            current_app.logger.info(msg_text)
-            current_app.logger.info("Waiting for 1 min for status == ready")
-            time.sleep(60)
-        else:
-            msg_text = segementName + " is already created"
-            current_app.logger.info(msg_text)
-        d = {
-            "responseType": "SUCCESS",
-            "msg": msg_text,
-            "STATUS_CODE": 200
+            ],
+            "connectivity_path": tier_path,
+            "transport_zone_path": "/infra/sites/default/enforcement-points/default/transport-zones/" + str(
+                transport_zone)
         }
-        return jsonify(d), 200
+    return {
+        "display_name": segementName,
+        "subnets": [
+            {
+                "gateway_address": gatewayAddress
+            }
+        ],
+        "replication_mode": "MTEP",
+        "transport_zone_path": "/infra/sites/default/enforcement-points/default/transport-zones/" + str(
+            transport_zone),
+        "admin_state": "UP",
+        "advanced_config": {
+            "address_pool_paths": [
+            ],
+            "multicast": True,
+            "urpf_mode": "STRICT",
+            "connectivity": "ON"
+        },
+        "connectivity_path": tier_path
+    }
 
-    except Exception as e:
-        current_app.logger.error("Failed to create Nsxt segment " + str(e))
-        d = {
-            "responseType": "ERROR",
-            "msg": "Failed to create NSXT segment " + str(e),
-            "STATUS_CODE": 500
-        }
-        return jsonify(d), 500
+
+def readNsxtDesiredState():
+    """
+    NsxtDesiredState of the NSX-T manager in the spec with the existing objects read,
+    or (None, error).
+    """
+    headers_ = grabNsxtHeaders()
+    if headers_[0] is None:
+        return None, "Failed to get NSXT info " + str(headers_[1])
+    nsxt = NsxtDesiredState(headers_[2], headers_[1])
+    read = nsxt.read()
+    if read[0] is None:
+        return None, "Failed to read NSX-T objects " + str(read[1])
+    return nsxt, "SUCCESS"
 
 
 def grabNsxtHeaders():
     try:
-        str_enc = str(request.get_json(force=True)['envSpec']['vcenterDetails']["nsxtUserPasswordBase64"])
-        base64_bytes = str_enc.encode('ascii')
-        enc_bytes = base64.b64decode(base64_bytes)
-        password = enc_bytes.decode('ascii').rstrip("\n")
+        password = RequestSpec.secret("envSpec", "vcenterDetails", "nsxtUserPasswordBase64")
 
-        ecod_bytes = (request.get_json(force=True)['envSpec']['vcenterDetails']["nsxtUser"] + ":" + password).encode(
+        ecod_bytes = (RequestSpec.json()['envSpec']['vcenterDetails']["nsxtUser"] + ":" + password).encode(
             "ascii")
         ecod_bytes = base64.b64encode(ecod_bytes)
-        address = str(request.get_json(force=True)['envSpec']['vcenterDetails']["nsxtAddress"])
+        address = str(RequestSpec.json()['envSpec']['vcenterDetails']["nsxtAddress"])
         ecod_string = ecod_bytes.decode("ascii")
         headers = {'Authorization': (
                 'Basic ' + ecod_string)}
@@ -4899,15 +4798,7 @@ def grabNsxtHeaders():
 
 
 def getList(headers, url):
-    payload = {}
-    list_all_segments_url = url
-    list_all_segments_response = requests.request("GET", list_all_segments_url, headers=headers,
-                                                  data=payload,
-                                                  verify=False)
-    if list_all_segments_response.status_code != 200:
-        return list_all_segments_response.text, list_all_segments_response.status_code
-
-    return list_all_segments_response.json()["results"], 200
+    return NsxtPager.list(url, headers)
 
 
 def checkObjectIsPresentAndReturnPath(listOfSegments, name):
@@ -4931,13 +4822,10 @@ def convertStringToCommaSeperated(strA):
 def getTransportZone(address, transport_zone_name, headers_):
     try:
         url = "https://" + address + "/api/v1/transport-zones/"
-        payload = {}
-        tzone_response = requests.request("GET", url, headers=headers_,
-                                          data=payload,
-                                          verify=False)
-        if tzone_response.status_code != 200:
-            return None, tzone_response.text
-        for tzone in tzone_response.json()["results"]:
+        tzones = NsxtPager.list(url, headers_)
+        if tzones[1] != 200:
+            return None, tzones[0]
+        for tzone in tzones[0]:
             if str(tzone["transport_type"]) == "OVERLAY" and str(tzone["display_name"]) == transport_zone_name:
                 return tzone["id"], "FOUND"
         return None, "NOT_FOUND"
@@ -4948,14 +4836,11 @@ def getTransportZone(address, transport_zone_name, headers_):
 def getListOfTransportZone(address, headers_):
     try:
         url = "https://" + address + "/api/v1/transport-zones/"
-        payload = {}
-        tzone_response = requests.request("GET", url, headers=headers_,
-                                          data=payload,
-                                          verify=False)
-        if tzone_response.status_code != 200:
-            return None, tzone_response.text
+        tzones = NsxtPager.list(url, headers_)
+        if tzones[1] != 200:
+            return None, tzones[0]
         tz_zone = []
-        for tzone in tzone_response.json()["results"]:
+        for tzone in tzones[0]:
             if str(tzone["transport_type"]) == "OVERLAY":
                 tz_zone.append(str(tzone["display_name"]))
         if len(tz_zone) < 1:
@@ -4966,516 +4851,138 @@ def getListOfTransportZone(address, headers_):
         return None, str(e)
 
 
-def createGroup(groupName, segmentName, isIp, ipaddresses):
-    try:
-        headers_ = grabNsxtHeaders()
-        if headers_[0] is None:
-            d = {
-                "responseType": "ERROR",
-                "msg": "Failed to get NSXT info " + str(headers_[1]),
-                "STATUS_CODE": 500
+def nsxtGroupExpression(segmentPath, isIp, ipaddresses):
+    if isIp == "true":
+        return [
+            {
+                "resource_type": "IPAddressExpression",
+                "ip_addresses": convertStringToCommaSeperated(ipaddresses)
             }
-            return jsonify(d), 500
-        domainName = getDomainName(headers_, "default")
-        if domainName[0] is None:
-            d = {
-                "responseType": "ERROR",
-                "msg": "Failed to get domain name " + str(domainName[1]),
-                "STATUS_CODE": 500
+        ]
+    elif isIp == "vc":
+        return [
+            {
+                "value": ipaddresses,
+                "member_type": "VirtualMachine",
+                "key": "OSName",
+                "operator": "EQUALS",
+                "resource_type": "Condition"
             }
-            return jsonify(d), 500
-        uri = "https://" + headers_[2] + "/policy/api/v1/infra/domains/" + domainName[0] + "/groups"
-        output = getList(headers_[1], uri)
-        if output[1] != 200:
-            d = {
-                "responseType": "ERROR",
-                "msg": "Failed to get list of domain " + str(output[0]),
-                "STATUS_CODE": 500
-            }
-            return jsonify(d), 500
-        if segmentName is not None:
-            uri_ = "https://" + headers_[2] + "/policy/api/v1/infra/segments"
-            seg_output = getList(headers_[1], uri_)
-            if seg_output[1] != 200:
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Failed to get list of segments " + str(seg_output[0]),
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-            seg_obj = checkObjectIsPresentAndReturnPath(seg_output[0], segmentName)
-            if not seg_obj[0]:
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Failed to find the segment " + segmentName,
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-        url = "https://" + headers_[2] + "/policy/api/v1/infra/domains/" + domainName[0] + "/groups/" + groupName
-        headers_[1].update({"Content-Type": "application/json", "Accept": "application/json"})
-        isPresent = False
-        lis_ip = []
-        try:
-            get_group = requests.request("GET", url,
-                                         headers=headers_[1],
-                                         verify=False)
-            results = get_group.json()
-            revision_id = results["_revision"]
-            for expression in results["expression"]:
-                if isIp == "true":
-                    for _ip in expression["ip_addresses"]:
-                        lis_ip.append(_ip)
-                        if str(_ip) == str(ipaddresses):
-                            isPresent = True
-                            break
-                else:
-                    for path in expression["paths"]:
-                        lis_ip.append(path)
-                        if str(seg_obj[1]) == str(path):
-                            isPresent = True
-                            break
-                if isPresent:
-                    break
-        except:
-            isPresent = False
-        if ipaddresses is not None:
-            for ip_ in convertStringToCommaSeperated(ipaddresses):
-                lis_ip.append(ip_)
-        else:
-            lis_ip.append(seg_obj[1])
-        obj = checkObjectIsPresentAndReturnPath(output[0], groupName)
-        if not obj[0] or not isPresent:
-            current_app.logger.info("Creating group " + groupName)
-            url = "https://" + headers_[2] + "/policy/api/v1/infra/domains/" + domainName[0] + "/groups/" + groupName
-            if isIp == "true":
-                if not isPresent and obj[0]:
-                    payload = {
-                        "display_name": groupName,
-                        "expression": [{
-                            "resource_type": "IPAddressExpression",
-                            "ip_addresses": lis_ip
-                        }],
-                        "resource_type": "Group",
-                        "_revision": int(revision_id)
-                    }
-                else:
-                    payload = {
-                        "display_name": groupName,
-                        "expression": [
-                            {
-                                "resource_type": "IPAddressExpression",
-                                "ip_addresses": convertStringToCommaSeperated(ipaddresses)
-                            }
-                        ],
-                        "id": groupName
-                    }
-            elif isIp == "vc":
-                payload = {
-                    "display_name": groupName,
-                    "expression": [
-                        {
-                            "value": ipaddresses,
-                            "member_type": "VirtualMachine",
-                            "key": "OSName",
-                            "operator": "EQUALS",
-                            "resource_type": "Condition"
-                        }
-                    ],
-                    "id": groupName
-                }
-            else:
-                if not isPresent and obj[0]:
-                    payload = {
-                        "display_name": groupName,
-                        "expression": [{
-                            "resource_type": "PathExpression",
-                            "paths": lis_ip
-                        }],
-                        "resource_type": "Group",
-                        "_revision": int(revision_id)
-                    }
-                else:
-                    payload = {
-                        "display_name": groupName,
-                        "expression": [
-                            {
-                                "resource_type": "PathExpression",
-                                "paths": [
-                                    seg_obj[1]
-                                ]
-                            }
-                        ],
-                        "id": groupName
-                    }
-            headers_[1].update({"Content-Type": "application/json", "Accept": "application/json"})
-            payload_modified = json.dumps(payload, indent=4)
-            dhcp_create = requests.request("PUT", url,
-                                           headers=headers_[1],
-                                           data=payload_modified,
-                                           verify=False)
-            if dhcp_create.status_code != 200:
-                d = {
-                    "responseType": "ERROR",
-                    "msg": dhcp_create.text,
-                    "STATUS_CODE": dhcp_create.status_code
-                }
-                current_app.logger.error(dhcp_create.text)
-                return jsonify(d), dhcp_create.status_code
-            msg_text = "Created group " + groupName
-            path = dhcp_create.json()["path"]
-        else:
-            path = obj[1]
-            msg_text = groupName + " group is already created."
-        current_app.logger.info(msg_text)
-        d = {
-            "responseType": "SUCCESS",
-            "msg": msg_text,
-            "path": path,
-            "STATUS_CODE": 200
-        }
-        return jsonify(d), 200
-    except Exception as e:
-        d = {
-            "responseType": "ERROR",
-            "msg": "Failed to create group " + groupName + " " + str(e),
-            "STATUS_CODE": 500
+        ]
+    return [
+        {
+            "resource_type": "PathExpression",
+            "paths": [
+                segmentPath
+            ]
         }
-        return jsonify(d), 500
+    ]
 
 
 def getDomainName(headers, domainName):
     url = "https://" + headers[2] + "/policy/api/v1/infra/domains/"
-    response = requests.request(
-        "GET", url, headers=headers[1], verify=False)
-    if response.status_code != 200:
-        return None, response.text
-    for domain in response.json()["results"]:
+    domains = NsxtPager.list(url, headers[1])
+    if domains[1] != 200:
+        return None, domains[0]
+    for domain in domains[0]:
         if str(domain["display_name"]) == domainName:
             return domain["display_name"], "FOUND"
     return None, "NOT_FOUND"
 
 
-def createVipService(serviceName, port):
-    headers_ = grabNsxtHeaders()
-    if headers_[0] is None:
-        d = {
-            "responseType": "ERROR",
-            "msg": "Failed to get NSXT info " + str(headers_[1]),
-            "STATUS_CODE": 500
-        }
-        return jsonify(d), 500
-    service = isServiceCreated(headers_, serviceName)
-    if service[0] is None:
-        if service[1] != "NOT_FOUND":
-            d = {
-                "responseType": "ERROR",
-                "msg": "Failed to get service info " + str(service[1]),
-                "STATUS_CODE": 500
-            }
-            return jsonify(d), 500
-        else:
-            url = "https://" + headers_[2] + "/policy/api/v1/infra/services/" + serviceName
-            headers_[1].update({"Content-Type": "application/json", "Accept": "application/json"})
-            payload = {
-                "service_entries": [
-                    {
-                        "display_name": serviceName,
-                        "resource_type": "L4PortSetServiceEntry",
-                        "l4_protocol": "TCP",
-                        "destination_ports": convertStringToCommaSeperated(port)
-                    }
-                ],
+def nsxtServicePayload(serviceName, port):
+    return {
+        "service_entries": [
+            {
                 "display_name": serviceName,
-                "id": serviceName
+                "resource_type": "L4PortSetServiceEntry",
+                "l4_protocol": "TCP",
+                "destination_ports": convertStringToCommaSeperated(port)
             }
-            payload_modified = json.dumps(payload, indent=4)
-            response = requests.request(
-                "PUT", url, headers=headers_[1], data=payload_modified, verify=False)
-            if response.status_code != 200:
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Failed to create service " + str(response.text),
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-        message = "Service created successfully"
-    else:
-        message = "Service is already created " + service[0]
-    current_app.logger.info(message)
-    d = {
-        "responseType": "ERROR",
-        "msg": message,
-        "STATUS_CODE": 200
+        ],
+        "display_name": serviceName
     }
-    return jsonify(d), 200
 
 
-def isServiceCreated(header, serviceName):
-    url = "https://" + header[2] + "/policy/api/v1/infra/services"
-    response = requests.request(
-        "GET", url, headers=header[1], verify=False)
-    if response.status_code != 200:
-        return None, response.text
-    for service in response.json()["results"]:
-        if service["display_name"] == serviceName:
-            return service["display_name"], "FOUND"
-    return None, "NOT_FOUND"
-
-
-def createFirewallRule(policyName, ruleName, rulePayLoad):
-    headers_ = grabNsxtHeaders()
-    if headers_[0] is None:
-        d = {
-            "responseType": "ERROR",
-            "msg": "Failed to get NSXT info " + str(headers_[1]),
-            "STATUS_CODE": 500
-        }
-        return jsonify(d), 500
-    policy = getPolicy(headers_, policyName)
-    if policy[0] is None:
-        if policy[1] != "NOT_FOUND":
-            d = {
-                "responseType": "ERROR",
-                "msg": "Failed to get policy " + str(policy[1]),
-                "STATUS_CODE": 500
-            }
-            return jsonify(d), 500
-        else:
-            current_app.logger.info("Creating policy " + policyName)
-            tier_path = getTier1Details(headers_)
-            if tier_path[0] is None:
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Failed to get Tier1 details " + str(tier_path[1]),
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-            url = "https://" + headers_[2] + "/policy/api/v1/infra"
-            payload = {
-                "resource_type": "Infra",
-                "children": [
-                    {
-                        "resource_type": "ChildResourceReference",
-                        "id": "default",
-                        "target_type": "Domain",
-                        "children": [
-                            {
-                                "resource_type": "ChildGatewayPolicy",
-                                "marked_for_delete": False,
-                                "GatewayPolicy": {
-                                    "resource_type": "GatewayPolicy",
-                                    "display_name": policyName,
-                                    "id": policyName,
-                                    "marked_for_delete": False,
-                                    "tcp_strict": True,
-                                    "stateful": True,
-                                    "locked": False,
-                                    "category": "LocalGatewayRules",
-                                    "sequence_number": 10,
-                                    "children": [
-                                        {
-                                            "resource_type": "ChildRule",
-                                            "marked_for_delete": False,
-                                            "Rule": {
-                                                "display_name": "default_rule",
-                                                "id": "default_rule",
-                                                "resource_type": "Rule",
-                                                "marked_for_delete": False,
-                                                "source_groups": [
-                                                    "ANY"
-                                                ],
-                                                "sequence_number": 10,
-                                                "destination_groups": [
-                                                    "ANY"
-                                                ],
-                                                "services": [
-                                                    "ANY"
-                                                ],
-                                                "profiles": [
-                                                    "ANY"
-                                                ],
-                                                "scope": [
-                                                    tier_path[0]
-                                                ],
-                                                "action": "ALLOW",
-                                                "direction": "IN_OUT",
-                                                "logged": False,
-                                                "disabled": False,
-                                                "notes": "",
-                                                "tag": "",
-                                                "ip_protocol": "IPV4_IPV6"
-                                            }
-                                        }
-                                    ]
-                                }
-                            }
-                        ]
-                    }
-                ]
-            }
-            payload_modified = json.dumps(payload, indent=4)
-            headers_[1].update({"Content-Type": "application/json", "Accept": "application/json"})
-            response = requests.request(
-                "PATCH", url, headers=headers_[1], data=payload_modified, verify=False)
-            if response.status_code != 200:
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Failed to create policy " + str(response.text),
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-    else:
-        current_app.logger.info(policyName + " policy is already created")
-    list_fw = getListOfFirewallRule(headers_, policyName)
-    if list_fw[0] is None:
-        d = {
-            "responseType": "ERROR",
-            "msg": "Failed to get list of firewalls " + str(list_fw[1]),
-            "STATUS_CODE": 500
-        }
-        return jsonify(d), 500
-    if not checkObjectIsPresentAndReturnPath(list_fw[0], ruleName)[0]:
-        current_app.logger.info("Creating firewall rule " + ruleName)
-        rule_payload_modified = json.dumps(rulePayLoad, indent=4)
-        url = "https://" + headers_[
-            2] + "/policy/api/v1/infra/domains/default/gateway-policies/" + policyName + "/rules/" + ruleName
-        headers_[1].update({"Content-Type": "application/json", "Accept": "application/json"})
-        response = requests.request(
-            "PUT", url, headers=headers_[1], data=rule_payload_modified, verify=False)
-        if response.status_code != 200:
-            d = {
-                "responseType": "ERROR",
-                "msg": "Failed to create rule " + str(response.text),
-                "STATUS_CODE": 500
+def nsxtGatewayPolicyPayload(policyName, tier_path):
+    return {
+        "display_name": policyName,
+        "tcp_strict": True,
+        "stateful": True,
+        "locked": False,
+        "category": "LocalGatewayRules",
+        "sequence_number": 10,
+        "rules": [
+            {
+                "display_name": "default_rule",
+                "id": "default_rule",
+                "source_groups": [
+                    "ANY"
+                ],
+                "sequence_number": 10,
+                "destination_groups": [
+                    "ANY"
+                ],
+                "services": [
+                    "ANY"
+                ],
+                "profiles": [
+                    "ANY"
+                ],
+                "scope": [
+                    tier_path
+                ],
+                "action": "ALLOW",
+                "direction": "IN_OUT",
+                "logged": False,
+                "disabled": False,
+                "notes": "",
+                "tag": "",
+                "ip_protocol": "IPV4_IPV6"
             }
-            return jsonify(d), 500
-        msg_text = ruleName + " rule created successfully"
-    else:
-        msg_text = ruleName + " rule is already created"
-    current_app.logger.info(msg_text)
-    d = {
-        "responseType": "SUCCESS",
-        "msg": msg_text,
-        "STATUS_CODE": 200
+        ]
     }
-    return jsonify(d), 200
 
 
-def getListOfFirewallRule(headers, policyName):
-    url = "https://" + headers[2] + "/policy/api/v1/infra/domains/default/gateway-policies/" + policyName + "/rules"
-    response = requests.request(
-        "GET", url, headers=headers[1], verify=False)
-    if response.status_code != 200:
-        return None, response.text
-    return response.json()["results"], "FOUND"
-
-
-def updateDefaultRule(policyName):
-    try:
-        headers_ = grabNsxtHeaders()
-        if headers_[0] is None:
-            d = {
-                "responseType": "ERROR",
-                "msg": "Failed to get NSXT info " + str(headers_[1]),
-                "STATUS_CODE": 500
-            }
-            return jsonify(d), 500
-        list_fw = getListOfFirewallRule(headers_, policyName)
-        if list_fw[0] is None:
-            d = {
-                "responseType": "ERROR",
-                "msg": "Failed to get list of firewalls " + str(list_fw[1]),
-                "STATUS_CODE": 500
-            }
-            return jsonify(d), 500
-        sequence = None
-        for rule in list_fw[0]:
-            if rule["display_name"] == "default_rule":
-                sequence = rule["sequence_number"]
-                break
-        if sequence is None:
-            d = {
-                "responseType": "ERROR",
-                "msg": "Failed to get sequence number of default rule ",
-                "STATUS_CODE": 500
-            }
-            return jsonify(d), 500
-        tier_path = getTier1Details(headers_)
-        if tier_path[0] is None:
-            d = {
-                "responseType": "ERROR",
-                "msg": "Failed to get Tier1 details " + str(tier_path[1]),
-                "STATUS_CODE": 500
-            }
-            return jsonify(d), 500
-        url = "https://" + headers_[
-            2] + "/policy/api/v1/infra/domains/default/gateway-policies/" + policyName + "/rules/default_rule"
-        payload = {
-            "sequence_number": sequence,
-            "source_groups": [
-                "ANY"
-            ],
-            "services": [
-                "ANY"
-            ],
-            "logged": False,
-            "destination_groups": [
-                "ANY"
-            ],
-            "scope": [
-                tier_path[0]
-            ],
-            "action": "DROP"
-        }
-        payload_modified = json.dumps(payload, indent=4)
-        headers_[1].update({"Content-Type": "application/json", "Accept": "application/json"})
-        response = requests.request(
-            "PATCH", url, headers=headers_[1], data=payload_modified, verify=False)
-        if response.status_code != 200:
-            d = {
-                "responseType": "ERROR",
-                "msg": "Failed to create policy " + str(response.text),
-                "STATUS_CODE": 500
-            }
-            return jsonify(d), 500
-        d = {
-            "responseType": "SUCCESS",
-            "msg": "Successfully updated default rule",
-            "STATUS_CODE": 200
-        }
-        return jsonify(d), 200
-    except Exception as e:
-        d = {
-            "responseType": "ERROR",
-            "msg": "Failed to update default rule " + str(e),
-            "STATUS_CODE": 500
-        }
-        return jsonify(d), 500
-
-
-def getPolicy(headers, policyName):
-    url = "https://" + headers[2] + "/policy/api/v1/infra/domains/default/gateway-policies"
-    response = requests.request(
-        "GET", url, headers=headers[1], verify=False)
-    if response.status_code != 200:
-        return None, response.text
-    try:
-        for pol in response.json()["results"]:
-            if pol["display_name"] == policyName:
-                return pol["display_name"], "FOUND"
-        return None, "NOT_FOUND"
-    except Exception:
-        return None, "NOT_FOUND"
+def updateDefaultRule(nsxt, policyName, tier_path):
+    """
+    Make the default rule of the gateway policy drop what no other rule allows.
+    """
+    rule = nsxt.existing_rule(policyName, "default_rule")
+    if rule is not None:
+        sequence = rule["sequence_number"]
+    elif nsxt.existing("GatewayPolicy", policyName) is None:
+        # The policy is created together with its default rule.
+        sequence = nsxtGatewayPolicyPayload(policyName, tier_path)["rules"][0]["sequence_number"]
+    else:
+        return None, "Failed to get sequence number of default rule "
+    payload = {
+        "sequence_number": sequence,
+        "source_groups": [
+            "ANY"
+        ],
+        "services": [
+            "ANY"
+        ],
+        "logged": False,
+        "destination_groups": [
+            "ANY"
+        ],
+        "scope": [
+            tier_path
+        ],
+        "action": "DROP"
+    }
+    return nsxt.rule(policyName, "default_rule", payload, update=True), "SUCCESS"
 
 
 def getTier1Details(headers_):
     uri = "https://" + headers_[2] + "/policy/api/v1/infra/tier-1s"
-    response = requests.request(
-        "GET", uri, headers=headers_[1], verify=False)
-    if response.status_code != 200:
-        return None, response.status_code
-    teir1name = str(request.get_json(force=True)['envSpec']['vcenterDetails']["nsxtTier1RouterDisplayName"])
-    for tr in response.json()["results"]:
+    tier1s = NsxtPager.list(uri, headers_[1])
+    if tier1s[1] != 200:
+        return None, tier1s[1]
+    teir1name = str(RequestSpec.json()['envSpec']['vcenterDetails']["nsxtTier1RouterDisplayName"])
+    for tr in tier1s[0]:
         if str(tr["display_name"]).lower() == teir1name.lower():
             return tr["path"], "FOUND"
     return None, "NOT_FOUND"
@@ -5513,16 +5020,13 @@ def getIpFromHost(vcenter):
 
 def getESXIips():
     try:
-        str_enc = str(request.get_json(force=True)['envSpec']['vcenterDetails']["vcenterSsoPasswordBase64"])
-        base64_bytes = str_enc.encode('ascii')
-        enc_bytes = base64.b64decode(base64_bytes)
-        password = enc_bytes.decode('ascii').rstrip("\n")
+        password = RequestSpec.secret("envSpec", "vcenterDetails", "vcenterSsoPasswordBase64")
 
-        ecod_bytes = (request.get_json(force=True)['envSpec']['vcenterDetails'][
+        ecod_bytes = (RequestSpec.json()['envSpec']['vcenterDetails'][
                           "vcenterSsoUser"] + ":" + password).encode(
             "ascii")
         ecod_bytes = base64.b64encode(ecod_bytes)
-        address = str(request.get_json(force=True)['envSpec']['vcenterDetails']["vcenterAddress"])
+        address = str(RequestSpec.json()['envSpec']['vcenterDetails']["vcenterAddress"])
         ecod_string = ecod_bytes.decode("ascii")
         uri = "https://" + address + "/api/session"
         headers = {'Authorization': (
@@ -5580,10 +5084,10 @@ def verifyVCVersion(vcVersion):
 
 def downloadAviControllerAndPushToContentLibrary(vcenter_ip, vcenter_username, password, env):
     try:
-        os.putenv("GOVC_URL", "https://" + vcenter_ip + "/sdk")
-        os.putenv("GOVC_USERNAME", vcenter_username)
-        os.putenv("GOVC_PASSWORD", password)
-        os.putenv("GOVC_INSECURE", "true")
+        os.environ["GOVC_URL"] = "https://" + vcenter_ip + "/sdk"
+        os.environ["GOVC_USERNAME"] = vcenter_username
+        os.environ["GOVC_PASSWORD"] = password
+        os.environ["GOVC_INSECURE"] = "true"
         if env == Env.VMC:
             res = pushAviToContenLibraryMarketPlace(env)
             if res[0] is None:
@@ -5596,9 +5100,9 @@ def downloadAviControllerAndPushToContentLibrary(vcenter_ip, vcenter_username, p
             else:
                 find_command = ["govc", "library.ls"]
                 output = runShellCommandAndReturnOutputAsList(find_command)
-                VC_Content_Library_name = request.get_json(force=True)['envSpec']['vcenterDetails'][
+                VC_Content_Library_name = RequestSpec.json()['envSpec']['vcenterDetails'][
                     "contentLibraryName"]
-                VC_AVI_OVA_NAME = request.get_json(force=True)['envSpec']['vcenterDetails']["aviOvaName"]
+                VC_AVI_OVA_NAME = RequestSpec.json()['envSpec']['vcenterDetails']["aviOvaName"]
                 if str(output[0]).__contains__(VC_Content_Library_name):
                     current_app.logger.info(VC_Content_Library_name + " is already present")
                 else:
@@ -5633,15 +5137,15 @@ def pushAviToContenLibrary(env):
         pass
     my_file = Path("/tmp/" + ControllerLocation.CONTROLLER_NAME + ".ova")
     if env == Env.VMC:
-        avi_jwt_token = str(request.get_json(force=True)['resourceSpec']['aviPulseJwtToken'])
-        data_store = str(request.get_json(force=True)['envSpec']['sddcDatastore'])
-        data_center = str(request.get_json(force=True)['envSpec']['sddcDatacenter'])
+        avi_jwt_token = str(RequestSpec.json()['resourceSpec']['aviPulseJwtToken'])
+        data_store = str(RequestSpec.json()['envSpec']['sddcDatastore'])
+        data_center = str(RequestSpec.json()['envSpec']['sddcDatacenter'])
         avi_version = Avi_Version.VMC_AVI_VERSION
     else:
-        data_store = str(request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterDatastore'])
-        data_center = str(request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterDatacenter'])
+        data_store = str(RequestSpec.json()['envSpec']['vcenterDetails']['vcenterDatastore'])
+        data_center = str(RequestSpec.json()['envSpec']['vcenterDetails']['vcenterDatacenter'])
         avi_jwt_token = str(
-            request.get_json(force=True)['envSpec']['resourceSpec']["aviPulseJwtToken"])
+            RequestSpec.json()['envSpec']['resourceSpec']["aviPulseJwtToken"])
         avi_version = Avi_Version.VSPHERE_AVI_VERSION
     if my_file.exists():
         current_app.logger.info("Avi ova is already downloaded")
@@ -5732,7 +5236,7 @@ def verifyVcenterVersion(version):
     vCenter = current_app.config['VC_IP']
     vCenter_user = current_app.config['VC_USER']
     VC_PASSWORD = current_app.config['VC_PASSWORD']
-    si = connect.SmartConnectNoSSL(host=vCenter, user=vCenter_user, pwd=VC_PASSWORD)
+    si = VcenterSessionPool.get(host=vCenter, user=vCenter_user, pwd=VC_PASSWORD)
     content = si.RetrieveContent()
     vcVersion = content.about.version
     if vcVersion.startswith(version):
@@ -5752,14 +5256,14 @@ def pushAviToContenLibraryMarketPlace(env):
         pass
     my_file = Path("/tmp/" + ControllerLocation.CONTROLLER_NAME + ".ova")
     if env == Env.VMC:
-        data_store = str(request.get_json(force=True)['envSpec']['sddcDatastore'])
-        data_center = str(request.get_json(force=True)['envSpec']['sddcDatacenter'])
+        data_store = str(RequestSpec.json()['envSpec']['sddcDatastore'])
+        data_center = str(RequestSpec.json()['envSpec']['sddcDatacenter'])
         avi_version = Avi_Version.VMC_AVI_VERSION
-        refToken = request.get_json(force=True)['marketplaceSpec']['refreshToken']
+        refToken = RequestSpec.json()['marketplaceSpec']['refreshToken']
     else:
-        data_center = str(request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterDatacenter'])
-        data_store = str(request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterDatastore'])
-        refToken = request.get_json(force=True)['envSpec']['marketplaceSpec']['refreshToken']
+        data_center = str(RequestSpec.json()['envSpec']['vcenterDetails']['vcenterDatacenter'])
+        data_store = str(RequestSpec.json()['envSpec']['vcenterDetails']['vcenterDatastore'])
+        refToken = RequestSpec.json()['envSpec']['marketplaceSpec']['refreshToken']
         if isEnvTkgs_wcp(env) and verifyVcenterVersion(Versions.VCENTER_UPDATE_THREE):
             avi_version = Avi_Version.AVI_VERSION_UPDATE_THREE
         elif isEnvTkgs_wcp(env) and not verifyVcenterVersion(Versions.VCENTER_UPDATE_THREE):
@@ -5811,6 +5315,7 @@ def pushAviToContenLibraryMarketPlace(env):
                 if metalist["appversion"] == avi_version:
                     objectid = metalist['fileid']
                     filename = metalist['name']
+                    file_info = marketplace_file_info(metalist)
                     ls.append(filename)
                     break
         payload = {
@@ -5830,16 +5335,11 @@ def pushAviToContenLibraryMarketPlace(env):
         current_app.logger.info("Retrieved download URL from MarketPlace...")
         current_app.logger.info("Download will take about 5 minutes to complete...")
         current_app.logger.info("Downloaded avi controller will be saved to /tmp on SIVT VM")
-        response_csfr = requests.request("GET", download_url, headers=headers, verify=False, timeout=600)
-        if response_csfr.status_code != 200:
-            return None, response_csfr.text
-        else:
-            command = ["rm", "-rf", ls[0]]
-            runShellCommandAndReturnOutputAsList(command)
-            with open(ls[0], 'wb') as f:
-                f.write(response_csfr.content)
-        command = ["mv", ls[0], "/tmp/" + ControllerLocation.CONTROLLER_NAME + ".ova"]
-        runShellCommandAndReturnOutputAsList(command)
+        try:
+            DownloadHelper(headers=headers, log=current_app.logger).download(
+                download_url, "/tmp/" + ControllerLocation.CONTROLLER_NAME + ".ova", key=objectid, **file_info)
+        except Exception as e:
+            return None, str(e)
         current_app.logger.info(
             "Avi ova downloaded  at location " + "/tmp/" + ControllerLocation.CONTROLLER_NAME + ".ova")
     find_command = ["govc", "library.ls"]
@@ -5871,47 +5371,40 @@ def pushAviToContenLibraryMarketPlace(env):
 '''def downloadAndPushKubernetesOva(env):
     try:
         if checkAirGappedIsEnabled(env):
-            vCenter_datacenter = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterDatacenter']
+            vCenter_datacenter = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterDatacenter']
             template = KubernetesOva.PHOTON_KUBERNETES_TEMPLATE_FILE_NAME
         elif checkAnyProxyIsEnabled(env):
-            vCenter_datacenter = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterDatacenter']
+            vCenter_datacenter = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterDatacenter']
             template = KubernetesOva.PHOTON_KUBERNETES_TEMPLATE_FILE_NAME
         else:
             if env == Env.VMC:
                 networkName = str(
-                    request.get_json(force=True)['componentSpec']['tkgMgmtSpec']['tkgMgmtNetworkName'])
-                data_store = str(request.get_json(force=True)['envSpec']['sddcDatastore'])
-                kube_ova = str(request.get_json(force=True)['resourceSpec']['kubernetesOva'])
-                vCenter_datacenter = request.get_json(force=True)['envSpec']['sddcDatacenter']
-                customer_connect_user = request.get_json(force=True)['resourceSpec']['customerConnectUser']
-                customer_connect_pass = request.get_json(force=True)['resourceSpec'][
-                    'customerConnectPasswordBase64']
-                base64_bytes = customer_connect_pass.encode('ascii')
-                enc_bytes = base64.b64decode(base64_bytes)
-                customer_connect_pass = enc_bytes.decode('ascii').rstrip("\n")
+                    RequestSpec.json()['componentSpec']['tkgMgmtSpec']['tkgMgmtNetworkName'])
+                data_store = str(RequestSpec.json()['envSpec']['sddcDatastore'])
+                kube_ova = str(RequestSpec.json()['resourceSpec']['kubernetesOva'])
+                vCenter_datacenter = RequestSpec.json()['envSpec']['sddcDatacenter']
+                customer_connect_user = RequestSpec.json()['resourceSpec']['customerConnectUser']
+                customer_connect_pass = RequestSpec.secret("resourceSpec", "customerConnectPasswordBase64")
             else:
                 if isEnvTkgs_wcp(env):
                     networkName = str(
-                        request.get_json(force=True)["tkgsComponentSpec"]["tkgsMgmtNetworkSpec"][
+                        RequestSpec.json()["tkgsComponentSpec"]["tkgsMgmtNetworkSpec"][
                             "tkgsMgmtNetworkName"])
                 else:
                     networkName = str(
-                        request.get_json(force=True)["tkgComponentSpec"]["tkgMgmtComponents"][
+                        RequestSpec.json()["tkgComponentSpec"]["tkgMgmtComponents"][
                             "tkgMgmtNetworkName"])
-                data_store = str(request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterDatastore'])
+                data_store = str(RequestSpec.json()['envSpec']['vcenterDetails']['vcenterDatastore'])
                 if isEnvTkgs_wcp(env):
                     kube_ova = "photon"
                 else:
-                    kube_ova = str(request.get_json(force=True)['envSpec']['marketplaceSpec']['kubernetes-ova'])
-                vCenter_datacenter = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterDatacenter']
-                vCenter_cluster = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterCluster']
-                customer_connect_user = request.get_json(force=True)['envSpec']['resource-spec'][
+                    kube_ova = str(RequestSpec.json()['envSpec']['marketplaceSpec']['kubernetes-ova'])
+                vCenter_datacenter = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterDatacenter']
+                vCenter_cluster = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterCluster']
+                customer_connect_user = RequestSpec.json()['envSpec']['resource-spec'][
                     'customer-connect-user']
-                customer_connect_pass = request.get_json(force=True)['envSpec']['resource-spec'][
-                    'customer-connect-password-base64']
-                base64_bytes = customer_connect_pass.encode('ascii')
-                enc_bytes = base64.b64decode(base64_bytes)
-                customer_connect_pass = enc_bytes.decode('ascii').rstrip("\n")
+                customer_connect_pass = RequestSpec.secret("envSpec", "resource-spec",
+                                                           "customer-connect-password-base64")
             if kube_ova == "photon":
                 file = KubernetesOva.PHOTON_KUBERNETES_FILE_NAME
                 template = KubernetesOva.PHOTON_KUBERNETES_TEMPLATE_FILE_NAME
@@ -5948,45 +5441,54 @@ def pushAviToContenLibraryMarketPlace(env):
         return None, str(e)'''
 
 
+# Shared services and workload clusters can be configured side by side and may need the same template.
+kubernetes_ova_lock = threading.Lock()
+
+
 def downloadAndPushKubernetesOvaMarketPlace(env, version, baseOS):
+    with kubernetes_ova_lock:
+        return _downloadAndPushKubernetesOvaMarketPlace(env, version, baseOS)
+
+
+def _downloadAndPushKubernetesOvaMarketPlace(env, version, baseOS):
     try:
         # if checkAirGappedIsEnabled(env):
-        #     vCenter_datacenter = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterDatacenter']
-        #     vCenter_cluster = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterCluster']
+        #     vCenter_datacenter = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterDatacenter']
+        #     vCenter_cluster = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterCluster']
         #     # template = KubernetesOva.PHOTON_KUBERNETES_TEMPLATE_FILE_NAME
-        #     refToken = request.get_json(force=True)['envSpec']['marketplaceSpec']['refreshToken']
+        #     refToken = RequestSpec.json()['envSpec']['marketplaceSpec']['refreshToken']
         # elif checkAnyProxyIsEnabled(env):
-        #     vCenter_datacenter = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterDatacenter']
-        #     vCenter_cluster = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterCluster']
+        #     vCenter_datacenter = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterDatacenter']
+        #     vCenter_cluster = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterCluster']
         #     # template = KubernetesOva.PHOTON_KUBERNETES_TEMPLATE_FILE_NAME
-        #     refToken = request.get_json(force=True)['envSpec']['marketplaceSpec']['refreshToken']
+        #     refToken = RequestSpec.json()['envSpec']['marketplaceSpec']['refreshToken']
         # else:
         if env == Env.VMC:
             networkName = str(
-                request.get_json(force=True)['componentSpec']['tkgMgmtSpec']['tkgMgmtNetworkName'])
-            data_store = str(request.get_json(force=True)['envSpec']['sddcDatastore'])
-            # kube_ova = str(request.get_json(force=True)['resource-spec']['kubernetes-ova'])
-            vCenter_datacenter = request.get_json(force=True)['envSpec']['sddcDatacenter']
-            vCenter_cluster = request.get_json(force=True)['envSpec']['sddcCluster']
-            refToken = request.get_json(force=True)['marketplaceSpec']['refreshToken']
+                RequestSpec.json()['componentSpec']['tkgMgmtSpec']['tkgMgmtNetworkName'])
+            data_store = str(RequestSpec.json()['envSpec']['sddcDatastore'])
+            # kube_ova = str(RequestSpec.json()['resource-spec']['kubernetes-ova'])
+            vCenter_datacenter = RequestSpec.json()['envSpec']['sddcDatacenter']
+            vCenter_cluster = RequestSpec.json()['envSpec']['sddcCluster']
+            refToken = RequestSpec.json()['marketplaceSpec']['refreshToken']
         elif env == Env.VSPHERE or env == Env.VCF:
             if isEnvTkgs_wcp(env):
                 networkName = str(
-                    request.get_json(force=True)["tkgsComponentSpec"]["tkgsMgmtNetworkSpec"][
+                    RequestSpec.json()["tkgsComponentSpec"]["tkgsMgmtNetworkSpec"][
                         "tkgMgmtNetworkName"])
             else:
                 networkName = str(
-                    request.get_json(force=True)["tkgComponentSpec"]["tkgMgmtComponents"][
+                    RequestSpec.json()["tkgComponentSpec"]["tkgMgmtComponents"][
                         "tkgMgmtNetworkName"])
-            data_store = str(request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterDatastore'])
+            data_store = str(RequestSpec.json()['envSpec']['vcenterDetails']['vcenterDatastore'])
             if isEnvTkgs_wcp(env):
                 baseOS = "photon"
                 version = KubernetesOva.KUBERNETES_OVA_LATEST_VERSION
             # else:
-            # kube_ova = str(request.get_json(force=True)['envSpec']['marketplaceSpec']['kubernetes-ova'])
-            vCenter_datacenter = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterDatacenter']
-            vCenter_cluster = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterCluster']
-            refToken = request.get_json(force=True)['envSpec']['marketplaceSpec']['refreshToken']
+            # kube_ova = str(RequestSpec.json()['envSpec']['marketplaceSpec']['kubernetes-ova'])
+            vCenter_datacenter = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterDatacenter']
+            vCenter_cluster = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterCluster']
+            refToken = RequestSpec.json()['envSpec']['marketplaceSpec']['refreshToken']
         else:
             return None, "Invalid Env provided " + env
 
@@ -6140,6 +5642,7 @@ def getOvaMarketPlace(filename, refreshToken, version, baseOS):
             if metalist["version"] == version[1:] and str(metalist["groupname"]).strip("\t") == ova_groupname:
                 objectid = metalist["metafileobjectsList"][0]['fileid']
                 ovaName = metalist["metafileobjectsList"][0]['filename']
+                file_info = marketplace_file_info(metalist["metafileobjectsList"][0])
                 app_version = metalist['appversion']
                 metafileid = metalist['metafileid']
 
@@ -6164,13 +5667,11 @@ def getOvaMarketPlace(filename, refreshToken, version, baseOS):
     else:
         download_url = presigned_url.json()["response"]["presignedurl"]
 
-    response_csfr = requests.request("GET", download_url, headers=headers, verify=False, timeout=600)
-    if response_csfr.status_code != 200:
-        return None, response_csfr.text
-    else:
-        os.system("rm -rf " + "/tmp/" + filename)
-        with open(r'/tmp/' + filename, 'wb') as f:
-            f.write(response_csfr.content)
+    try:
+        DownloadHelper(headers=headers, log=current_app.logger).download(download_url, "/tmp/" + filename,
+                                                                         key=objectid, **file_info)
+    except Exception as e:
+        return None, str(e)
 
     return filename, "Kubernetes OVA download successful"
 
@@ -6178,7 +5679,7 @@ def getOvaMarketPlace(filename, refreshToken, version, baseOS):
 '''def isEnvTkgs(env):
     try:
         if env == Env.VSPHERE:
-            tkgs = str(request.get_json(force=True)['envSpec']['envType'])
+            tkgs = str(RequestSpec.json()['envSpec']['envType'])
             if tkgs.lower().__contains__(EnvType.TKGS):
                 return True
             else:
@@ -6192,7 +5693,7 @@ def getOvaMarketPlace(filename, refreshToken, version, baseOS):
 def isEnvTkgs_wcp(env):
     try:
         if env == Env.VSPHERE:
-            tkgs = str(request.get_json(force=True)['envSpec']['envType'])
+            tkgs = str(RequestSpec.json()['envSpec']['envType'])
             if tkgs.lower() == EnvType.TKGS_WCP:
                 return True
             else:
@@ -6206,7 +5707,7 @@ def isEnvTkgs_wcp(env):
 def isEnvTkgs_ns(env):
     try:
         if env == Env.VSPHERE:
-            tkgs = str(request.get_json(force=True)['envSpec']['envType'])
+            tkgs = str(RequestSpec.json()['envSpec']['envType'])
             if tkgs.lower() == EnvType.TKGS_NS:
                 return True
             else:
@@ -6220,7 +5721,7 @@ def isEnvTkgs_ns(env):
 def isEnvTkgm(env):
     try:
         if env == Env.VSPHERE:
-            tkgs = str(request.get_json(force=True)['envSpec']['envType'])
+            tkgs = str(RequestSpec.json()['envSpec']['envType'])
             if tkgs.lower() == EnvType.TKGM:
                 return True
             else:
@@ -6233,17 +5734,17 @@ def isEnvTkgm(env):
 
 def createSubscribedLibrary(vcenter_ip, vcenter_username, password, env):
     try:
-        os.putenv("GOVC_URL", "https://" + vcenter_ip + "/sdk")
-        os.putenv("GOVC_USERNAME", vcenter_username)
-        os.putenv("GOVC_PASSWORD", password)
-        os.putenv("GOVC_INSECURE", "true")
+        os.environ["GOVC_URL"] = "https://" + vcenter_ip + "/sdk"
+        os.environ["GOVC_USERNAME"] = vcenter_username
+        os.environ["GOVC_PASSWORD"] = password
+        os.environ["GOVC_INSECURE"] = "true"
         url = "https://wp-content.vmware.com/v2/latest/lib.json"
         if env == Env.VMC:
-            data_store = str(request.get_json(force=True)['envSpec']['sddcDatastore'])
-            data_center = str(request.get_json(force=True)['envSpec']['sddcDatacenter'])
+            data_store = str(RequestSpec.json()['envSpec']['sddcDatastore'])
+            data_center = str(RequestSpec.json()['envSpec']['sddcDatacenter'])
         else:
-            data_center = str(request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterDatacenter'])
-            data_store = str(request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterDatastore'])
+            data_center = str(RequestSpec.json()['envSpec']['vcenterDetails']['vcenterDatacenter'])
+            data_store = str(RequestSpec.json()['envSpec']['vcenterDetails']['vcenterDatastore'])
         find_command = ["govc", "library.ls"]
         output = runShellCommandAndReturnOutputAsList(find_command)
 
@@ -6275,7 +5776,7 @@ def createSubscribedLibrary(vcenter_ip, vcenter_username, password, env):
 def check_tkgs_proxy_enabled():
     proxyEnabled = False
     try:
-        isProxyEnabled = request.get_json(force=True)['tkgsComponentSpec']['tkgServiceConfig']['proxySpec'][
+        isProxyEnabled = RequestSpec.json()['tkgsComponentSpec']['tkgServiceConfig']['proxySpec'][
             'enableProxy']
         if str(isProxyEnabled).lower() == "true":
             proxyEnabled = True
@@ -6361,7 +5862,7 @@ def getNetworkUrl(ip, csrf2, name, cloudName, aviVersion):
     response_csrf = None
     try:
         while count < 60:
-            response_csrf = requests.request("GET", url, headers=headers, data=payload, verify=False)
+            response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload, verify=False)
             if response_csrf.status_code == 200:
                 if response_csrf.json()["count"] > 1:
                     break
@@ -6382,7 +5883,7 @@ def getNetworkUrl(ip, csrf2, name, cloudName, aviVersion):
             else:
                 next_url = None if not response_csrf.json()["next"] else response_csrf.json()["next"]
                 while len(next_url) > 0:
-                    response_csrf = requests.request("GET", next_url, headers=headers, data=payload, verify=False)
+                    response_csrf = AviClient.for_controller(ip).request("GET", next_url, headers=headers, data=payload, verify=False)
                     for se in response_csrf.json()["results"]:
                         if se["config"]["name"] == name:
                             return se["config"]["url"], se["config"]["uuid"], "FOUND", "SUCCESS"
@@ -6403,7 +5904,7 @@ def getNetworkDetails(ip, csrf2, managementNetworkUrl, startIp, endIp, prefixIp,
         "x-csrftoken": csrf2[0]
     }
     payload = {}
-    response_csrf = requests.request("GET", url, headers=headers, data=payload, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload, verify=False)
     details = {}
     if response_csrf.status_code != 200:
         details["error"] = response_csrf.text
@@ -6440,7 +5941,7 @@ def getDetailsOfNewCloud(ip, csrf2, newCloudUrl, vim_ref, captured_ip, captured_
     }
     payload = {}
     url = newCloudUrl
-    response_csrf = requests.request("GET", url, headers=headers, data=payload, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -6468,14 +5969,14 @@ def updateNetworkWithIpPools(ip, csrf2, managementNetworkUrl, fileName, aviVersi
         "x-csrftoken": csrf2[0]
     }
     details = {}
-    response_csrf = requests.request("PUT", url, headers=headers, data=json_object_m, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("PUT", url, headers=headers, data=json_object_m, verify=False)
     if response_csrf.status_code != 200:
         count = 0
         if response_csrf.text.__contains__(
                 "Cannot edit network properties till network sync from Service Engines is complete"):
             while count < 10:
                 time.sleep(60)
-                response_csrf = requests.request("PUT", url, headers=headers, data=json_object_m, verify=False)
+                response_csrf = AviClient.for_controller(ip).request("PUT", url, headers=headers, data=json_object_m, verify=False)
                 if response_csrf.status_code == 200:
                     break
                 current_app.logger.info("waited for " + str(count * 60) + "s sync to complete")
@@ -6500,7 +6001,7 @@ def updateNewCloud(ip, csrf2, newCloudUrl, aviVersion):
         "x-avi-version": aviVersion,
         "x-csrftoken": csrf2[0]
     }
-    response_csrf = requests.request("PUT", newCloudUrl, headers=headers, data=json_object, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("PUT", newCloudUrl, headers=headers, data=json_object, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -6518,7 +6019,7 @@ def getDetailsOfNewCloudAddIpam(ip, csrf2, newCloudUrl, ipamUrl, aviVersion):
     }
     payload = {}
     url = newCloudUrl
-    response_csrf = requests.request("GET", url, headers=headers, data=payload, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -6546,7 +6047,7 @@ def updateNewCloud(ip, csrf2, newCloudUrl, aviVersion):
         "x-avi-version": aviVersion,
         "x-csrftoken": csrf2[0]
     }
-    response_csrf = requests.request("PUT", newCloudUrl, headers=headers, data=json_object, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("PUT", newCloudUrl, headers=headers, data=json_object, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -6564,7 +6065,7 @@ def getClusterUrl(ip, csrf2, cluster_name, aviVersion):
     }
     url = "https://" + ip + "/api/vimgrclusterruntime"
     payload = {}
-    response_csrf = requests.request("GET", url, headers=headers, data=payload, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -6586,7 +6087,7 @@ def getIpam(ip, csrf2, name, aviVersion):
     }
     body = {}
     url = "https://" + ip + "/api/ipamdnsproviderprofile"
-    response_csrf = requests.request("GET", url, headers=headers, data=body, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=body, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -6672,10 +6173,10 @@ def getCountOfIpAdress(gatewayCidr, start, end):
 
 
 def getLibraryId(vcenter, vcenterUser, vcenterPassword, libName):
-    os.putenv("GOVC_URL", "https://" + vcenter + "/sdk")
-    os.putenv("GOVC_USERNAME", vcenterUser)
-    os.putenv("GOVC_PASSWORD", vcenterPassword)
-    os.putenv("GOVC_INSECURE", "true")
+    os.environ["GOVC_URL"] = "https://" + vcenter + "/sdk"
+    os.environ["GOVC_USERNAME"] = vcenterUser
+    os.environ["GOVC_PASSWORD"] = vcenterPassword
+    os.environ["GOVC_INSECURE"] = "true"
     list1 = ["govc", "library.info", "/" + libName]
     list2 = ["grep", "-w", "ID"]
     libId = grabPipeOutput(list1, list2)
@@ -6697,7 +6198,7 @@ def updateIpam(ip, csrf2, newCloudUrl, aviVersion):
         "x-avi-version": aviVersion,
         "x-csrftoken": csrf2[0]
     }
-    response_csrf = requests.request("PUT", newCloudUrl, headers=headers, data=json_object, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("PUT", newCloudUrl, headers=headers, data=json_object, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -6715,7 +6216,7 @@ def getAviCertificate(ip, csrf2, certName, aviVersion):
     }
     body = {}
     url = "https://" + ip + "/api/sslkeyandcertificate"
-    response_csrf = requests.request("GET", url, headers=headers, data=body, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=body, verify=False)
     if response_csrf.status_code != 200:
         current_app.logger.error("Failed to get certificate " + response_csrf.text)
         return None, response_csrf.text
@@ -6752,39 +6253,30 @@ def checkAndWaitForAllTheServiceEngineIsUp(ip, clodName, env, aviVersion):
         "x-csrftoken": csrf2[0]
     }
     payload = {}
-    count = 0
-    seCount = 0
-    response_csrf = None
     current_app.logger.info("Checking all service are up or not.")
-    while count < 60:
-        try:
-            current_app.logger.info("Waited for " + str(count * 10) + "s retrying")
-            response_csrf = requests.request("GET", url, headers=headers, data=payload, verify=False)
-            length = len(response_csrf.json()["results"])
-            if response_csrf.status_code == 200:
-                for se in response_csrf.json()["results"]:
-                    if str(se["runtime"]["se_connected"]).strip().lower() == "true":
-                        seCount = seCount + 1
-                        if seCount == length:
-                            break
-            if seCount == length:
-                break
-        except:
-            pass
-        count = count + 1
-        time.sleep(10)
+    wait = WaitHelper.wait_for(
+        lambda: AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload, verify=False),
+        _allServiceEnginesConnected, timeout=600, ignore_errors=True, description="service engines",
+        log=current_app.logger)
+    response_csrf = wait.value
     if response_csrf is None:
-        current_app.logger.info("Waited for " + str(count * 10) + "s but service engine is not up")
+        current_app.logger.info("Waited for " + str(int(wait.elapsed)) + "s but service engine is not up")
         return None, "Failed", "ERROR"
     if response_csrf.status_code != 200:
         return None, response_csrf.text
-    elif count >= 59:
+    elif not wait.ready:
         return None, "NOT_FOUND", "TIME_OUT"
     else:
         current_app.logger.info("All service are up and running")
         return "SUCCESS", "CHECKED", "UP"
 
 
+def _allServiceEnginesConnected(response):
+    if response.status_code != 200:
+        return False
+    return all(str(se["runtime"]["se_connected"]).strip().lower() == "true" for se in response.json()["results"])
+
+
 def validatePem(pemcert):
     try:
         root_cert = OpenSSL.crypto.load_certificate(OpenSSL.crypto.FILETYPE_PEM, pemcert)
@@ -6847,7 +6339,7 @@ def supervisorTMC(vcenter_user, VC_PASSWORD, cluster_ip):
             current_app.logger.info("Server config delete failed")
             return "Server config delete failed", 500
     current_app.logger.info("Logging in to cluster " + cluster_ip)
-    os.putenv("KUBECTL_VSPHERE_PASSWORD", VC_PASSWORD)
+    os.environ["KUBECTL_VSPHERE_PASSWORD"] = VC_PASSWORD
     connect_command = ["kubectl", "vsphere", "login", "--server=" + cluster_ip, "--vsphere-username=" + vcenter_user,
                        "--insecure-skip-tls-verify"]
     output = runShellCommandAndReturnOutputAsList(connect_command)
@@ -6869,7 +6361,7 @@ def supervisorTMC(vcenter_user, VC_PASSWORD, cluster_ip):
 def registerTMCTKGs(vCenter, vCenter_user, VC_PASSWORD):
     url = "https://" + vCenter + "/"
     try:
-        isProxyEnabled = request.get_json(force=True)['tkgsComponentSpec']['tkgServiceConfig']['proxySpec'][
+        isProxyEnabled = RequestSpec.json()['tkgsComponentSpec']['tkgServiceConfig']['proxySpec'][
             'enableProxy']
         if str(isProxyEnabled).lower() == "true":
             proxyEnabled = True
@@ -6881,8 +6373,8 @@ def registerTMCTKGs(vCenter, vCenter_user, VC_PASSWORD):
         status, message = create_tkgs_proxy_credential()
         if status is None:
             return None, message
-        tmc_url = request.get_json(force=True)['envSpec']['saasEndpoints']['tmcDetails']['tmcInstanceURL']
-        mgmt = request.get_json(force=True)['envSpec']["saasEndpoints"]['tmcDetails']['tmcSupervisorClusterName']
+        tmc_url = RequestSpec.json()['envSpec']['saasEndpoints']['tmcDetails']['tmcInstanceURL']
+        mgmt = RequestSpec.json()['envSpec']["saasEndpoints"]['tmcDetails']['tmcSupervisorClusterName']
         status, message = register_management_cluster_tmc(tmc_url, mgmt, vCenter, vCenter_user, VC_PASSWORD)
         if status is None:
             return None, message
@@ -6906,7 +6398,7 @@ def registerTMCTKGs(vCenter, vCenter_user, VC_PASSWORD):
                 "Content-Type": "application/json",
                 "vmware-api-session-id": session_id
             }
-            cluster_name = request.get_json(force=True)["envSpec"]["vcenterDetails"]["vcenterCluster"]
+            cluster_name = RequestSpec.json()["envSpec"]["vcenterDetails"]["vcenterCluster"]
             id = getClusterID(vCenter, vCenter_user, VC_PASSWORD, cluster_name)
             if id[1] != 200:
                 return None, id[0]
@@ -6929,17 +6421,17 @@ def registerTMCTKGs(vCenter, vCenter_user, VC_PASSWORD):
             supervisor_tmc = supervisorTMC(vCenter_user, VC_PASSWORD, cluster_endpoint)
             if supervisor_tmc[1] != 200:
                 return supervisor_tmc[0], 500
-            supervisor_cluster = request.get_json(force=True)['envSpec']["saasEndpoints"]['tmcDetails'][
+            supervisor_cluster = RequestSpec.json()['envSpec']["saasEndpoints"]['tmcDetails'][
                 'tmcSupervisorClusterName']
             if checkTmcRegister(supervisor_cluster, True):
                 current_app.logger.info(supervisor_cluster + " is already registered")
             else:
-                clusterGroup = request.get_json(force=True)['envSpec']["saasEndpoints"]['tmcDetails'][
+                clusterGroup = RequestSpec.json()['envSpec']["saasEndpoints"]['tmcDetails'][
                     'tmcSupervisorClusterGroupName']
                 if not clusterGroup:
                     clusterGroup = "default"
-                os.putenv("TMC_API_TOKEN",
-                          request.get_json(force=True)['envSpec']["saasEndpoints"]['tmcDetails']['tmcRefreshToken'])
+                os.environ["TMC_API_TOKEN"] = RequestSpec.json()['envSpec']["saasEndpoints"]['tmcDetails'][
+                    'tmcRefreshToken']
                 listOfCmdTmcLogin = ["tmc", "login", "--no-configure", "-name", "tkgvsphere-automation"]
                 runProcess(listOfCmdTmcLogin)
                 listOfCommandRegister = ["tmc", "managementcluster", "register", supervisor_cluster, "-c", clusterGroup,
@@ -6962,7 +6454,6 @@ def registerTMCTKGs(vCenter, vCenter_user, VC_PASSWORD):
                     return "Failed to apply k8s-register-manifest.yaml file", 500
 
                 current_app.logger.info("Waiting for TMC registration to complete... ")
-                time.sleep(300)
                 wait_status = waitForTMCRegistration(supervisor_cluster)
                 if wait_status[1] != 200:
                     current_app.logger.error(wait_status[0])
@@ -6980,38 +6471,12 @@ def registerTMCTKGs(vCenter, vCenter_user, VC_PASSWORD):
 
 
 def waitForTMCRegistration(super_cls):
-    registered = False
-    count = 0
-    register_status_command = ["tmc", "managementcluster", "get", super_cls]
-    register_status = runShellCommandAndReturnOutput(register_status_command)
-    if register_status[1] != 0:
-        return "Failed to obtain register status for TMC", 500
-    else:
-        yaml_ouptput = yaml.load(register_status[0], Loader=SafeLoader)
-        if yaml_ouptput["status"]["health"] == "HEALTHY" and \
-                yaml_ouptput["status"]["conditions"]["READY"]["status"].lower() == "true":
-            registered = True
-
-    while not registered and count < 30:
-        register_status_command = ["tmc", "managementcluster", "get", super_cls]
-        register_status = runShellCommandAndReturnOutput(register_status_command)
-        if register_status[1] != 0:
-            return "Failed to obtain register status for TMC", 500
-        else:
-            yaml_ouptput = yaml.load(register_status[0], Loader=SafeLoader)
-            if yaml_ouptput["status"]["health"] == "HEALTHY" and \
-                    yaml_ouptput["status"]["conditions"]["READY"]["status"].lower() == "true":
-                registered = True
-                break
-            else:
-                current_app.logger.info("Waited for  " + str(count * 30) + "s, retrying.")
-                count = count + 1
-                time.sleep(30)
-    if not registered:
-        current_app.logger.error("TMC registration still did not complete " + str(count * 30))
+    state = waitForClusterOnTmc(super_cls, True)
+    if state[0] != "SUCCESS":
+        current_app.logger.error("TMC registration still did not complete: " + state[1])
         d = {
             "responseType": "ERROR",
-            "msg": "TMC registration still did not complete " + str(count * 30),
+            "msg": "TMC registration still did not complete: " + state[1],
             "STATUS_CODE": 500
         }
         return jsonify(d), 500
@@ -7066,7 +6531,7 @@ def getClusterID(vCenter, vCenter_user, VC_PASSWORD, cluster):
         else:
             session_id = sess.json()['value']
 
-        vcenter_datacenter = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterDatacenter']
+        vcenter_datacenter = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterDatacenter']
         if str(vcenter_datacenter).__contains__("/"):
             vcenter_datacenter = vcenter_datacenter[vcenter_datacenter.rindex("/") + 1:]
         if str(cluster).__contains__("/"):
@@ -7108,22 +6573,19 @@ def getClusterID(vCenter, vCenter_user, VC_PASSWORD, cluster):
 
 def downloadAviController(env):
     if env == Env.VSPHERE or env == Env.VCF:
-        vCenter = request.get_json(force=True)['envSpec']['vcenterDetails']["vcenterAddress"]
-        vCenter_user = request.get_json(force=True)['envSpec']['vcenterDetails']["vcenterSsoUser"]
-        str_enc = str(request.get_json(force=True)['envSpec']['vcenterDetails']["vcenterSsoPasswordBase64"])
-        base64_bytes = str_enc.encode('ascii')
-        enc_bytes = base64.b64decode(base64_bytes)
-        VC_PASSWORD = enc_bytes.decode('ascii').rstrip("\n")
-        refreshToken = request.get_json(force=True)['envSpec']['marketplaceSpec']['refreshToken']
+        vCenter = RequestSpec.json()['envSpec']['vcenterDetails']["vcenterAddress"]
+        vCenter_user = RequestSpec.json()['envSpec']['vcenterDetails']["vcenterSsoUser"]
+        VC_PASSWORD = RequestSpec.secret("envSpec", "vcenterDetails", "vcenterSsoPasswordBase64")
+        refreshToken = RequestSpec.json()['envSpec']['marketplaceSpec']['refreshToken']
     elif env == Env.VMC:
         vCenter = current_app.config['VC_IP']
         vCenter_user = current_app.config['VC_USER']
         VC_PASSWORD = current_app.config['VC_PASSWORD']
-        refreshToken = request.get_json(force=True)['marketplaceSpec']['refreshToken']
-    os.putenv("GOVC_URL", "https://" + vCenter + "/sdk")
-    os.putenv("GOVC_USERNAME", vCenter_user)
-    os.putenv("GOVC_PASSWORD", VC_PASSWORD)
-    os.putenv("GOVC_INSECURE", "true")
+        refreshToken = RequestSpec.json()['marketplaceSpec']['refreshToken']
+    os.environ["GOVC_URL"] = "https://" + vCenter + "/sdk"
+    os.environ["GOVC_USERNAME"] = vCenter_user
+    os.environ["GOVC_PASSWORD"] = VC_PASSWORD
+    os.environ["GOVC_INSECURE"] = "true"
 
     if not refreshToken:
         current_app.logger.info("refreshToken not provided")
@@ -7173,11 +6635,11 @@ def getProductSlugId(productName, headers):
 def isAviHaEnabled(env):
     try:
         if env == Env.VMC:
-            enable_avi_ha = request.get_json(force=True)['componentSpec']['aviComponentSpec']['enableAviHa']
+            enable_avi_ha = RequestSpec.json()['componentSpec']['aviComponentSpec']['enableAviHa']
         elif isEnvTkgs_wcp(env):
-            enable_avi_ha = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['enableAviHa']
+            enable_avi_ha = RequestSpec.json()['tkgsComponentSpec']['aviComponents']['enableAviHa']
         else:
-            enable_avi_ha = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['enableAviHa']
+            enable_avi_ha = RequestSpec.json()['tkgComponentSpec']['aviComponents']['enableAviHa']
         if str(enable_avi_ha).lower() == "true":
             return True
         else:
@@ -7188,24 +6650,24 @@ def isAviHaEnabled(env):
 
 def checkOSFlavorForTMC(env, isShared, isWorkload):
     if env == Env.VMC:
-        mgmt_os = request.get_json(force=True)['componentSpec']['tkgMgmtSpec']['tkgMgmtBaseOs']
+        mgmt_os = RequestSpec.json()['componentSpec']['tkgMgmtSpec']['tkgMgmtBaseOs']
         if isShared:
-            shared_os = request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec']['tkgSharedserviceBaseOs']
+            shared_os = RequestSpec.json()['componentSpec']['tkgSharedServiceSpec']['tkgSharedserviceBaseOs']
         if isWorkload:
-            wrkl_os = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec']['tkgWorkloadBaseOs']
+            wrkl_os = RequestSpec.json()['componentSpec']['tkgWorkloadSpec']['tkgWorkloadBaseOs']
     elif env == Env.VSPHERE:
-        mgmt_os = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents']['tkgMgmtBaseOs']
+        mgmt_os = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents']['tkgMgmtBaseOs']
         if isShared:
-            shared_os = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents']['tkgSharedserviceBaseOs']
+            shared_os = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents']['tkgSharedserviceBaseOs']
         if isWorkload:
-            wrkl_os = request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadBaseOs']
+            wrkl_os = RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadBaseOs']
     elif env == Env.VCF:
-        mgmt_os = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents']['tkgMgmtBaseOs']
+        mgmt_os = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents']['tkgMgmtBaseOs']
         if isShared:
-            shared_os = request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
+            shared_os = RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
                 'tkgSharedserviceBaseOs']
         if isWorkload:
-            wrkl_os = request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadBaseOs']
+            wrkl_os = RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadBaseOs']
     else:
         d = {
             "responseType": "ERROR",
@@ -7232,10 +6694,10 @@ def checkOSFlavorForTMC(env, isShared, isWorkload):
 
 
 def getNetworkPathTMC(networkName, vcenter_ip, vcenter_username, password):
-    os.putenv("GOVC_URL", "https://" + vcenter_ip + "/sdk")
-    os.putenv("GOVC_USERNAME", vcenter_username)
-    os.putenv("GOVC_PASSWORD", password)
-    os.putenv("GOVC_INSECURE", "true")
+    os.environ["GOVC_URL"] = "https://" + vcenter_ip + "/sdk"
+    os.environ["GOVC_USERNAME"] = vcenter_username
+    os.environ["GOVC_PASSWORD"] = password
+    os.environ["GOVC_INSECURE"] = "true"
     find_command = ["govc", "find", "-name", networkName]
     count = 0
     net = ""
@@ -7298,7 +6760,7 @@ def connect_to_workload(vCenter, vcenter_username, password, cluster, workload_n
             current_app.logger.error(cluster_id[0])
             return None, cluster_id[0].json['msg']
 
-        cluster_namespace = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+        cluster_namespace = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
             'tkgsVsphereWorkloadClusterSpec']['tkgsVsphereNamespaceName']
         cluster_id = cluster_id[0]
         wcp_status = isWcpEnabled(cluster_id)
@@ -7307,7 +6769,7 @@ def connect_to_workload(vCenter, vcenter_username, password, cluster, workload_n
         else:
             return None, "Failed to obtain cluster endpoint IP on given cluster - " + workload_name
         current_app.logger.info("logging into cluster - " + endpoint_ip)
-        os.putenv("KUBECTL_VSPHERE_PASSWORD", password)
+        os.environ["KUBECTL_VSPHERE_PASSWORD"] = password
         connect_command = ["kubectl", "vsphere", "login", "--vsphere-username", vcenter_username, "--server",
                            endpoint_ip,
                            "--tanzu-kubernetes-cluster-name", workload_name, "--tanzu-kubernetes-cluster-namespace",
@@ -7328,12 +6790,9 @@ def connect_to_workload(vCenter, vcenter_username, password, cluster, workload_n
 
 
 def isWcpEnabled(cluster_id):
-    vcenter_ip = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterAddress']
-    vcenter_username = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterSsoUser']
-    str_enc = str(request.get_json(force=True)['envSpec']['vcenterDetails']["vcenterSsoPasswordBase64"])
-    base64_bytes = str_enc.encode('ascii')
-    enc_bytes = base64.b64decode(base64_bytes)
-    password = enc_bytes.decode('ascii').rstrip("\n")
+    vcenter_ip = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterAddress']
+    vcenter_username = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterSsoUser']
+    password = RequestSpec.secret("envSpec", "vcenterDetails", "vcenterSsoPasswordBase64")
     if not (vcenter_ip or vcenter_username or password):
         return False, "Failed to fetch VC details"
 
@@ -7394,7 +6853,7 @@ def isClusterRunning(vcenter_ip, vcenter_username, password, cluster, workload_n
             return jsonify(d), 500
 
         current_app.logger.info("logging into cluster - " + endpoint_ip)
-        os.putenv("KUBECTL_VSPHERE_PASSWORD", password)
+        os.environ["KUBECTL_VSPHERE_PASSWORD"] = password
         connect_command = ["kubectl", "vsphere", "login", "--server=" + endpoint_ip,
                            "--vsphere-username=" + vcenter_username,
                            "--insecure-skip-tls-verify"]
@@ -7418,7 +6877,7 @@ def isClusterRunning(vcenter_ip, vcenter_username, password, cluster, workload_n
             }
             return jsonify(d), 500
 
-        name_space = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+        name_space = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
             'tkgsVsphereWorkloadClusterSpec']['tkgsVsphereNamespaceName']
         get_cluster_command = ["kubectl", "get", "tkc", "-n", name_space]
         clusters_output = runShellCommandAndReturnOutputAsList(get_cluster_command)
@@ -7512,13 +6971,10 @@ def checkNtpServerValidity(ntp_server):
 def fetchNamespaceInfo(env):
     try:
         if env == Env.VSPHERE:
-            vCenter = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterAddress']
-            vCenter_user = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterSsoUser']
-            str_enc = str(request.get_json(force=True)['envSpec']['vcenterDetails']["vcenterSsoPasswordBase64"])
-            base64_bytes = str_enc.encode('ascii')
-            enc_bytes = base64.b64decode(base64_bytes)
-            VC_PASSWORD = enc_bytes.decode('ascii').rstrip("\n")
-            name_space = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+            vCenter = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterAddress']
+            vCenter_user = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterSsoUser']
+            VC_PASSWORD = RequestSpec.secret("envSpec", "vcenterDetails", "vcenterSsoPasswordBase64")
+            name_space = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
                 'tkgsVsphereNamespaceName']
 
             if not (vCenter or vCenter_user or VC_PASSWORD):
@@ -7685,6 +7141,7 @@ def deploy_fluent_bit(end_point, cluster):
                                      "--version", version, "--values-file", yamlFile, "--namespace", namespace,
                                      "--create-namespace"]
         state_extention_apply = runShellCommandAndReturnOutputAsList(deploy_fluent_bit_command)
+        PackageCatalog.current().invalidate()
         if state_extention_apply[1] != 0:
             current_app.logger.error(Tkg_Extention_names.FLUENT_BIT.lower() + " install command failed. "
                                                                               "Checking for reconciliation status...")
@@ -7735,14 +7192,10 @@ def deploy_fluent_bit(end_point, cluster):
 
 def checkFluentBitInstalled():
     extension = Tkg_Extention_names.FLUENT_BIT.lower()
-    main_command = ["tanzu", "package", "installed", "list", "-A"]
-    sub_command = ["grep", extension]
-    output = grabPipeOutput(main_command, sub_command)
+    status = PackageCatalog.current().status(extension)
 
-    if verifyPodsAreRunning(extension, output[0], RegexPattern.RECONCILE_SUCCEEDED):
-        return True, output[0].split()[3] + " " + output[0].split()[4]
-    elif verifyPodsAreRunning(extension, output[0], RegexPattern.RECONCILE_FAILED):
-        return True, output[0].split()[3] + " " + output[0].split()[4]
+    if status is not None and (RegexPattern.RECONCILE_SUCCEEDED in status or RegexPattern.RECONCILE_FAILED in status):
+        return True, status
     else:
         return False, None
 
@@ -7751,10 +7204,10 @@ def updateDataFile(fluent_endpoint, dataFile):
     try:
         output_str = None
         if fluent_endpoint == Tkg_Extention_names.FLUENT_BIT_HTTP:
-            host = request.get_json(force=True)['tanzuExtensions']['logging']['httpEndpoint']['httpEndpointAddress']
-            port = request.get_json(force=True)['tanzuExtensions']['logging']['httpEndpoint']['httpEndpointPort']
-            uri = request.get_json(force=True)['tanzuExtensions']['logging']['httpEndpoint']['httpEndpointUri']
-            header = request.get_json(force=True)['tanzuExtensions']['logging']['httpEndpoint'][
+            host = RequestSpec.json()['tanzuExtensions']['logging']['httpEndpoint']['httpEndpointAddress']
+            port = RequestSpec.json()['tanzuExtensions']['logging']['httpEndpoint']['httpEndpointPort']
+            uri = RequestSpec.json()['tanzuExtensions']['logging']['httpEndpoint']['httpEndpointUri']
+            header = RequestSpec.json()['tanzuExtensions']['logging']['httpEndpoint'][
                 'httpEndpointHeaderKeyValue']
             output_str = """
     [OUTPUT]
@@ -7769,10 +7222,10 @@ def updateDataFile(fluent_endpoint, dataFile):
     tls.verify      off
             """ % (host, port, uri, header)
         elif fluent_endpoint == Tkg_Extention_names.FLUENT_BIT_SYSLOG:
-            host = request.get_json(force=True)['tanzuExtensions']['logging']['syslogEndpoint']['syslogEndpointAddress']
-            port = request.get_json(force=True)['tanzuExtensions']['logging']['syslogEndpoint']['syslogEndpointPort']
-            mode = request.get_json(force=True)['tanzuExtensions']['logging']['syslogEndpoint']['syslogEndpointMode']
-            format = request.get_json(force=True)['tanzuExtensions']['logging']['syslogEndpoint'][
+            host = RequestSpec.json()['tanzuExtensions']['logging']['syslogEndpoint']['syslogEndpointAddress']
+            port = RequestSpec.json()['tanzuExtensions']['logging']['syslogEndpoint']['syslogEndpointPort']
+            mode = RequestSpec.json()['tanzuExtensions']['logging']['syslogEndpoint']['syslogEndpointMode']
+            format = RequestSpec.json()['tanzuExtensions']['logging']['syslogEndpoint'][
                 'syslogEndpointFormat']
             output_str = """
     [OUTPUT]
@@ -7792,9 +7245,9 @@ def updateDataFile(fluent_endpoint, dataFile):
     Syslog_SD_key        tkg
             """ % (host, port, mode, format)
         elif fluent_endpoint == Tkg_Extention_names.FLUENT_BIT_KAFKA:
-            broker = request.get_json(force=True)['tanzuExtensions']['logging']['kafkaEndpoint'][
+            broker = RequestSpec.json()['tanzuExtensions']['logging']['kafkaEndpoint'][
                 'kafkaBrokerServiceName']
-            topic = request.get_json(force=True)['tanzuExtensions']['logging']['kafkaEndpoint']['kafkaTopicName']
+            topic = RequestSpec.json()['tanzuExtensions']['logging']['kafkaEndpoint']['kafkaTopicName']
             output_str = """
     [OUTPUT]
     Name           kafka
@@ -7844,14 +7297,14 @@ def validate_backup_location(env, clusterType):
             return False, "Invalid inputs provided for validation of data backup location"
         if env == Env.VMC:
             if clusterType.lower() == "shared":
-                backup_location = request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec'][
+                backup_location = RequestSpec.json()['componentSpec']['tkgSharedServiceSpec'][
                     'tkgSharedClusterBackupLocation']
-                cluster_group = request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec'][
+                cluster_group = RequestSpec.json()['componentSpec']['tkgSharedServiceSpec'][
                     'tkgSharedserviceClusterGroupName']
             elif clusterType.lower() == "workload":
-                backup_location = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec'][
+                backup_location = RequestSpec.json()['componentSpec']['tkgWorkloadSpec'][
                     'tkgWorkloadClusterBackupLocation']
-                cluster_group = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec'][
+                cluster_group = RequestSpec.json()['componentSpec']['tkgWorkloadSpec'][
                     'tkgWorkloadClusterGroupName']
             else:
                 return False, "Invalid cluster type provided"
@@ -7859,25 +7312,25 @@ def validate_backup_location(env, clusterType):
             if clusterType.lower() == "shared":
                 if not isEnvTkgs_ns(env) and not isEnvTkgs_wcp(env):
                     if env == Env.VCF:
-                        backup_location = request.get_json(force=True)['tkgComponentSpec']["tkgSharedserviceSpec"][
+                        backup_location = RequestSpec.json()['tkgComponentSpec']["tkgSharedserviceSpec"][
                             'tkgSharedClusterBackupLocation']
-                        cluster_group = request.get_json(force=True)['tkgComponentSpec']["tkgSharedserviceSpec"][
+                        cluster_group = RequestSpec.json()['tkgComponentSpec']["tkgSharedserviceSpec"][
                             'tkgSharedserviceClusterGroupName']
                     else:
-                        backup_location = request.get_json(force=True)['tkgComponentSpec']["tkgMgmtComponents"][
+                        backup_location = RequestSpec.json()['tkgComponentSpec']["tkgMgmtComponents"][
                             "tkgSharedClusterBackupLocation"]
-                        cluster_group = request.get_json(force=True)['tkgComponentSpec']["tkgMgmtComponents"][
+                        cluster_group = RequestSpec.json()['tkgComponentSpec']["tkgMgmtComponents"][
                             'tkgSharedserviceClusterGroupName']
             elif clusterType.lower() == "workload":
                 if isEnvTkgs_ns(env):
-                    backup_location = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+                    backup_location = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
                         'tkgsVsphereWorkloadClusterSpec']['tkgWorkloadClusterBackupLocation']
-                    cluster_group = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+                    cluster_group = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
                         "tkgsVsphereWorkloadClusterSpec"]["tkgsWorkloadClusterGroupName"]
                 else:
-                    backup_location = request.get_json(force=True)['tkgWorkloadComponents'][
+                    backup_location = RequestSpec.json()['tkgWorkloadComponents'][
                         'tkgWorkloadClusterBackupLocation']
-                    cluster_group = request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadClusterGroupName']
+                    cluster_group = RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadClusterGroupName']
             else:
                 return False, "Invalid cluster type provided"
 
@@ -7935,14 +7388,14 @@ def validate_cluster_credential(env, clusterType):
             return False, "Invalid environment type provided for validation of data protection credentials"
         if env == Env.VMC:
             if clusterType.lower() == "shared":
-                credential_name = request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec'][
+                credential_name = RequestSpec.json()['componentSpec']['tkgSharedServiceSpec'][
                     'tkgSharedClusterCredential']
-                backup_location = request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec'][
+                backup_location = RequestSpec.json()['componentSpec']['tkgSharedServiceSpec'][
                     'tkgSharedClusterBackupLocation']
             elif clusterType.lower() == "workload":
-                credential_name = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec'][
+                credential_name = RequestSpec.json()['componentSpec']['tkgWorkloadSpec'][
                     'tkgWorkloadClusterCredential']
-                backup_location = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec'][
+                backup_location = RequestSpec.json()['componentSpec']['tkgWorkloadSpec'][
                     'tkgWorkloadClusterBackupLocation']
             else:
                 return False, "Invalid cluster type provided"
@@ -7950,26 +7403,26 @@ def validate_cluster_credential(env, clusterType):
             if clusterType.lower() == "shared":
                 if not isEnvTkgs_ns(env) and not isEnvTkgs_wcp(env):
                     if env == Env.VCF:
-                        credential_name = request.get_json(force=True)['tkgComponentSpec']["tkgSharedserviceSpec"][
+                        credential_name = RequestSpec.json()['tkgComponentSpec']["tkgSharedserviceSpec"][
                             'tkgSharedClusterCredential']
-                        backup_location = request.get_json(force=True)['tkgComponentSpec']["tkgSharedserviceSpec"][
+                        backup_location = RequestSpec.json()['tkgComponentSpec']["tkgSharedserviceSpec"][
                             'tkgSharedClusterBackupLocation']
                     else:
-                        credential_name = request.get_json(force=True)['tkgComponentSpec']["tkgMgmtComponents"][
+                        credential_name = RequestSpec.json()['tkgComponentSpec']["tkgMgmtComponents"][
                             "tkgSharedClusterCredential"]
-                        backup_location = request.get_json(force=True)['tkgComponentSpec']["tkgMgmtComponents"][
+                        backup_location = RequestSpec.json()['tkgComponentSpec']["tkgMgmtComponents"][
                             "tkgSharedClusterBackupLocation"]
             elif clusterType.lower() == "workload":
                 if isEnvTkgs_ns(env):
-                    credential_name = request.get_json(force=True)['tkgsComponentSpec'][
+                    credential_name = RequestSpec.json()['tkgsComponentSpec'][
                         "tkgsVsphereNamespaceSpec"][
                         'tkgsVsphereWorkloadClusterSpec']['tkgWorkloadClusterCredential']
-                    backup_location = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+                    backup_location = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
                         'tkgsVsphereWorkloadClusterSpec']['tkgWorkloadClusterBackupLocation']
                 else:
-                    credential_name = request.get_json(force=True)['tkgWorkloadComponents'][
+                    credential_name = RequestSpec.json()['tkgWorkloadComponents'][
                         'tkgWorkloadClusterCredential']
-                    backup_location = request.get_json(force=True)['tkgWorkloadComponents'][
+                    backup_location = RequestSpec.json()['tkgWorkloadComponents'][
                         'tkgWorkloadClusterBackupLocation']
             else:
                 return False, "Invalid cluster type provided"
@@ -8045,22 +7498,22 @@ def list_cluster_groups(env):
 def checkDataProtectionEnabled(env, type):
     if type == "shared":
         if env == Env.VMC:
-            is_enabled = request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec'][
+            is_enabled = RequestSpec.json()['componentSpec']['tkgSharedServiceSpec'][
                 'tkgSharedserviceEnableDataProtection']
         elif env == Env.VCF:
-            is_enabled = request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
+            is_enabled = RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
                 'tkgSharedserviceEnableDataProtection']
         elif env == Env.VSPHERE:
-            is_enabled = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+            is_enabled = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
                 'tkgSharedserviceEnableDataProtection']
     elif type == "workload":
         if isEnvTkgs_ns(env):
-            is_enabled = request.get_json(force=True)["tkgsComponentSpec"]["tkgsVsphereNamespaceSpec"][
+            is_enabled = RequestSpec.json()["tkgsComponentSpec"]["tkgsVsphereNamespaceSpec"][
                 "tkgsVsphereWorkloadClusterSpec"]["tkgsWorkloadEnableDataProtection"]
         elif env == Env.VCF or env == Env.VSPHERE:
-            is_enabled = request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadEnableDataProtection']
+            is_enabled = RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadEnableDataProtection']
         elif env == Env.VMC:
-            is_enabled = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec'][
+            is_enabled = RequestSpec.json()['componentSpec']['tkgWorkloadSpec'][
                 'tkgWorkloadEnableDataProtection']
     if is_enabled.lower() == "true":
         return True
@@ -8072,25 +7525,25 @@ def checkDataProtectionEnabledVelero(env, type):
     try:
         if type == "shared":
             if env == Env.VMC:
-                is_enabled = request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec'][
+                is_enabled = RequestSpec.json()['componentSpec']['tkgSharedServiceSpec'][
                     'tkgSharedClusterVeleroDataProtection']['enableVelero']
             elif env == Env.VCF:
-                is_enabled = request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
+                is_enabled = RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
                     'tkgSharedClusterVeleroDataProtection']['enableVelero']
             elif env == Env.VSPHERE:
-                is_enabled = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+                is_enabled = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
                     'tkgSharedClusterVeleroDataProtection']['enableVelero']
             else:
                 is_enabled = "false"
         elif type == "workload":
             if isEnvTkgs_ns(env):
-                is_enabled = request.get_json(force=True)["tkgsComponentSpec"]["tkgsVsphereNamespaceSpec"][
+                is_enabled = RequestSpec.json()["tkgsComponentSpec"]["tkgsVsphereNamespaceSpec"][
                     "tkgsVsphereWorkloadClusterSpec"]["tkgWorkloadClusterVeleroDataProtection"]["enableVelero"]
             elif env == Env.VCF or env == Env.VSPHERE:
-                is_enabled = request.get_json(force=True)['tkgWorkloadComponents'][
+                is_enabled = RequestSpec.json()['tkgWorkloadComponents'][
                     'tkgWorkloadClusterVeleroDataProtection']['enableVelero']
             elif env == Env.VMC:
-                is_enabled = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec'][
+                is_enabled = RequestSpec.json()['componentSpec']['tkgWorkloadSpec'][
                     'tkgWorkloadClusterVeleroDataProtection']['enableVelero']
         if is_enabled.lower() == "true":
             return True
@@ -8130,7 +7583,7 @@ def enable_data_protection(env, cluster, mgmt_cluster):
         url = VeleroAPI.GET_CLUSTER_INFO.format(tmc_url=tmc_url, cluster=cluster)
 
         if isEnvTkgs_ns(env):
-            provisionerName = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+            provisionerName = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
                 'tkgsVsphereWorkloadClusterSpec']['tkgsVsphereNamespaceName']
         else:
             provisionerName = "default"
@@ -8215,88 +7668,86 @@ def read_velero_param_dict(type, env):
     try:
         if type == "shared":
             if env == Env.VMC:
-                username = request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec'][
+                username = RequestSpec.json()['componentSpec']['tkgSharedServiceSpec'][
                     'tkgSharedClusterVeleroDataProtection']['username']
-                passwordBase64 = request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec'][
-                    'tkgSharedClusterVeleroDataProtection']['passwordBase64']
-                bucketName = request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec'][
+                velero_pass = RequestSpec.secret("componentSpec", "tkgSharedServiceSpec",
+                                                 "tkgSharedClusterVeleroDataProtection", "passwordBase64")
+                bucketName = RequestSpec.json()['componentSpec']['tkgSharedServiceSpec'][
                     'tkgSharedClusterVeleroDataProtection']['bucketName']
-                backupRegion = request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec'][
+                backupRegion = RequestSpec.json()['componentSpec']['tkgSharedServiceSpec'][
                     'tkgSharedClusterVeleroDataProtection']['backupRegion']
-                backupS3Url = request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec'][
+                backupS3Url = RequestSpec.json()['componentSpec']['tkgSharedServiceSpec'][
                     'tkgSharedClusterVeleroDataProtection']['backupS3Url']
-                backupPublicUrl = request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec'][
+                backupPublicUrl = RequestSpec.json()['componentSpec']['tkgSharedServiceSpec'][
                     'tkgSharedClusterVeleroDataProtection']['backupPublicUrl']
             elif env == Env.VCF:
-                username = request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
+                username = RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
                     'tkgSharedClusterVeleroDataProtection']['username']
-                passwordBase64 = request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
-                    'tkgSharedClusterVeleroDataProtection']['passwordBase64']
-                bucketName = request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
+                velero_pass = RequestSpec.secret("tkgComponentSpec", "tkgSharedserviceSpec",
+                                                 "tkgSharedClusterVeleroDataProtection", "passwordBase64")
+                bucketName = RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
                     'tkgSharedClusterVeleroDataProtection']['bucketName']
-                backupRegion = request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
+                backupRegion = RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
                     'tkgSharedClusterVeleroDataProtection']['backupRegion']
-                backupS3Url = request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
+                backupS3Url = RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
                     'tkgSharedClusterVeleroDataProtection']['backupS3Url']
-                backupPublicUrl = request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
+                backupPublicUrl = RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
                     'tkgSharedClusterVeleroDataProtection']['backupPublicUrl']
             elif env == Env.VSPHERE:
-                username = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+                username = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
                     'tkgSharedClusterVeleroDataProtection']['username']
-                passwordBase64 = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
-                    'tkgSharedClusterVeleroDataProtection']['passwordBase64']
-                bucketName = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+                velero_pass = RequestSpec.secret("tkgComponentSpec", "tkgMgmtComponents",
+                                                 "tkgSharedClusterVeleroDataProtection", "passwordBase64")
+                bucketName = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
                     'tkgSharedClusterVeleroDataProtection']['bucketName']
-                backupRegion = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+                backupRegion = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
                     'tkgSharedClusterVeleroDataProtection']['backupRegion']
-                backupS3Url = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+                backupS3Url = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
                     'tkgSharedClusterVeleroDataProtection']['backupS3Url']
-                backupPublicUrl = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+                backupPublicUrl = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
                     'tkgSharedClusterVeleroDataProtection']['backupPublicUrl']
         else:
             if isEnvTkgs_ns(env):
-                username = request.get_json(force=True)["tkgsComponentSpec"]["tkgsVsphereNamespaceSpec"][
+                username = RequestSpec.json()["tkgsComponentSpec"]["tkgsVsphereNamespaceSpec"][
                     "tkgsVsphereWorkloadClusterSpec"]["tkgWorkloadClusterVeleroDataProtection"]["username"]
-                passwordBase64 = request.get_json(force=True)["tkgsComponentSpec"]["tkgsVsphereNamespaceSpec"][
-                    "tkgsVsphereWorkloadClusterSpec"]["tkgWorkloadClusterVeleroDataProtection"]["passwordBase64"]
-                bucketName = request.get_json(force=True)["tkgsComponentSpec"]["tkgsVsphereNamespaceSpec"][
+                velero_pass = RequestSpec.secret("tkgsComponentSpec", "tkgsVsphereNamespaceSpec",
+                                                 "tkgsVsphereWorkloadClusterSpec",
+                                                 "tkgWorkloadClusterVeleroDataProtection", "passwordBase64")
+                bucketName = RequestSpec.json()["tkgsComponentSpec"]["tkgsVsphereNamespaceSpec"][
                     "tkgsVsphereWorkloadClusterSpec"]["tkgWorkloadClusterVeleroDataProtection"]["bucketName"]
-                backupRegion = request.get_json(force=True)["tkgsComponentSpec"]["tkgsVsphereNamespaceSpec"][
+                backupRegion = RequestSpec.json()["tkgsComponentSpec"]["tkgsVsphereNamespaceSpec"][
                     "tkgsVsphereWorkloadClusterSpec"]["tkgWorkloadClusterVeleroDataProtection"]["backupRegion"]
-                backupS3Url = request.get_json(force=True)["tkgsComponentSpec"]["tkgsVsphereNamespaceSpec"][
+                backupS3Url = RequestSpec.json()["tkgsComponentSpec"]["tkgsVsphereNamespaceSpec"][
                     "tkgsVsphereWorkloadClusterSpec"]["tkgWorkloadClusterVeleroDataProtection"]["backupS3Url"]
-                backupPublicUrl = request.get_json(force=True)["tkgsComponentSpec"]["tkgsVsphereNamespaceSpec"][
+                backupPublicUrl = RequestSpec.json()["tkgsComponentSpec"]["tkgsVsphereNamespaceSpec"][
                     "tkgsVsphereWorkloadClusterSpec"]["tkgWorkloadClusterVeleroDataProtection"]["backupPublicUrl"]
             elif env == Env.VCF or env == Env.VSPHERE:
-                username = request.get_json(force=True)['tkgWorkloadComponents'][
+                username = RequestSpec.json()['tkgWorkloadComponents'][
                     'tkgWorkloadClusterVeleroDataProtection']['username']
-                passwordBase64 = request.get_json(force=True)['tkgWorkloadComponents'][
-                    'tkgWorkloadClusterVeleroDataProtection']['passwordBase64']
-                bucketName = request.get_json(force=True)['tkgWorkloadComponents'][
+                velero_pass = RequestSpec.secret("tkgWorkloadComponents", "tkgWorkloadClusterVeleroDataProtection",
+                                                 "passwordBase64")
+                bucketName = RequestSpec.json()['tkgWorkloadComponents'][
                     'tkgWorkloadClusterVeleroDataProtection']['bucketName']
-                backupRegion = request.get_json(force=True)['tkgWorkloadComponents'][
+                backupRegion = RequestSpec.json()['tkgWorkloadComponents'][
                     'tkgWorkloadClusterVeleroDataProtection']['backupRegion']
-                backupS3Url = request.get_json(force=True)['tkgWorkloadComponents'][
+                backupS3Url = RequestSpec.json()['tkgWorkloadComponents'][
                     'tkgWorkloadClusterVeleroDataProtection']['backupS3Url']
-                backupPublicUrl = request.get_json(force=True)['tkgWorkloadComponents'][
+                backupPublicUrl = RequestSpec.json()['tkgWorkloadComponents'][
                     'tkgWorkloadClusterVeleroDataProtection']['backupPublicUrl']
             elif env == Env.VMC:
-                username = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec'][
+                username = RequestSpec.json()['componentSpec']['tkgWorkloadSpec'][
                     'tkgWorkloadClusterVeleroDataProtection']['username']
-                passwordBase64 = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec'][
-                    'tkgWorkloadClusterVeleroDataProtection']['passwordBase64']
-                bucketName = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec'][
+                velero_pass = RequestSpec.secret("componentSpec", "tkgWorkloadSpec",
+                                                 "tkgWorkloadClusterVeleroDataProtection", "passwordBase64")
+                bucketName = RequestSpec.json()['componentSpec']['tkgWorkloadSpec'][
                     'tkgWorkloadClusterVeleroDataProtection']['bucketName']
-                backupRegion = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec'][
+                backupRegion = RequestSpec.json()['componentSpec']['tkgWorkloadSpec'][
                     'tkgWorkloadClusterVeleroDataProtection']['backupRegion']
-                backupS3Url = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec'][
+                backupS3Url = RequestSpec.json()['componentSpec']['tkgWorkloadSpec'][
                     'tkgWorkloadClusterVeleroDataProtection']['backupS3Url']
-                backupPublicUrl = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec'][
+                backupPublicUrl = RequestSpec.json()['componentSpec']['tkgWorkloadSpec'][
                     'tkgWorkloadClusterVeleroDataProtection']['backupPublicUrl']
 
-        base64_bytes_velero = passwordBase64.encode('ascii')
-        enc_bytes_velero = base64.b64decode(base64_bytes_velero)
-        velero_pass = enc_bytes_velero.decode('ascii').rstrip("\n")
         velero_params = dict(
             username=username,
             password=velero_pass,
@@ -8317,9 +7768,9 @@ def create_velero_secret_file(username, password):
         aws_access_key_id="{username}"
         aws_secret_access_key="{password}"
             '''
-        fileName = "credentials-velero"
-        os.system("rm -rf " + fileName)
-        with open(fileName, 'w') as f:
+        # A private file per call, as clusters configured side by side each install Velero.
+        fd, fileName = tempfile.mkstemp(prefix="credentials-velero-", dir=".")
+        with os.fdopen(fd, 'w') as f:
             f.write(data)
 
         return True, fileName
@@ -8352,7 +7803,7 @@ def enable_data_protection_velero(type, env):
         velero_params = velero_params[1]
         if checkAirGappedIsEnabled(env):
             current_app.logger.info("The environment is airgapped")
-            repo = str(request.get_json(force=True)['envSpec']['customRepositorySpec']['tkgCustomImageRepository'])
+            repo = str(RequestSpec.json()['envSpec']['customRepositorySpec']['tkgCustomImageRepository'])
             repo = repo.replace("https://", "").replace("http://", "")
             if repo[-1] != '/':
                 repo = repo + '/'
@@ -8413,11 +7864,11 @@ def enable_data_protection_velero(type, env):
 
 def fetchTMCHeaders(env):
     if env == Env.VMC:
-        refreshToken = request.get_json(force=True)['saasEndpoints']['tmcDetails']['tmcRefreshToken']
-        tmc_url = request.get_json(force=True)['saasEndpoints']['tmcDetails']['tmcInstanceURL']
+        refreshToken = RequestSpec.json()['saasEndpoints']['tmcDetails']['tmcRefreshToken']
+        tmc_url = RequestSpec.json()['saasEndpoints']['tmcDetails']['tmcInstanceURL']
     else:
-        refreshToken = request.get_json(force=True)['envSpec']['saasEndpoints']['tmcDetails']['tmcRefreshToken']
-        tmc_url = request.get_json(force=True)['envSpec']['saasEndpoints']['tmcDetails']['tmcInstanceURL']
+        refreshToken = RequestSpec.json()['envSpec']['saasEndpoints']['tmcDetails']['tmcRefreshToken']
+        tmc_url = RequestSpec.json()['envSpec']['saasEndpoints']['tmcDetails']['tmcInstanceURL']
 
     if not tmc_url or not refreshToken:
         return None, "TMC details missing"
@@ -8447,25 +7898,14 @@ def checkAVIPassword(env):
     try:
         if env == Env.VSPHERE or env == Env.VCF:
             if isEnvTkgs_wcp(env):
-                avi_pass = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviPasswordBase64']
-                avi_backup_pass = request.get_json(force=True)['tkgsComponentSpec']['aviComponents'][
-                    'aviBackupPassphraseBase64']
+                avi_pass = RequestSpec.secret("tkgsComponentSpec", "aviComponents", "aviPasswordBase64")
+                avi_backup_pass = RequestSpec.secret("tkgsComponentSpec", "aviComponents", "aviBackupPassphraseBase64")
             else:
-                avi_pass = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviPasswordBase64']
-                avi_backup_pass = request.get_json(force=True)['tkgComponentSpec']['aviComponents'][
-                    'aviBackupPassphraseBase64']
+                avi_pass = RequestSpec.secret("tkgComponentSpec", "aviComponents", "aviPasswordBase64")
+                avi_backup_pass = RequestSpec.secret("tkgComponentSpec", "aviComponents", "aviBackupPassphraseBase64")
         elif env == Env.VMC:
-            avi_pass = request.get_json(force=True)['componentSpec']['aviComponentSpec']['aviPasswordBase64']
-            avi_backup_pass = request.get_json(force=True)['componentSpec']['aviComponentSpec'][
-                'aviBackupPassPhraseBase64']
-        # avi_pass conversion from b64
-        base64_bytes_avi = avi_pass.encode('ascii')
-        enc_bytes_avi = base64.b64decode(base64_bytes_avi)
-        avi_pass = enc_bytes_avi.decode('ascii').rstrip("\n")
-        # avi_backup_pass conversion from b64
-        base64_bytes_avi = avi_backup_pass.encode('ascii')
-        enc_bytes_avi = base64.b64decode(base64_bytes_avi)
-        avi_backup_pass = enc_bytes_avi.decode('ascii').rstrip("\n")
+            avi_pass = RequestSpec.secret("componentSpec", "aviComponentSpec", "aviPasswordBase64")
+            avi_backup_pass = RequestSpec.secret("componentSpec", "aviComponentSpec", "aviBackupPassPhraseBase64")
 
         # Check min length is 8
         if len(avi_pass) < 8 or len(avi_backup_pass) < 8:
@@ -8647,11 +8087,11 @@ def verify_expired(expiration_date):
 #     try:
 #         if not (env == Env.VMC):
 #             try:
-#                 ldap_endpoint_ip = request.get_json(force=True)['tkgComponentSpec']['identityManagementSpec'][
+#                 ldap_endpoint_ip = RequestSpec.json()['tkgComponentSpec']['identityManagementSpec'][
 #                     'ldapSpec']['ldapEndpointIp']
-#                 ldap_port = int(request.get_json(force=True)['tkgComponentSpec']['identityManagementSpec'][
+#                 ldap_port = int(RequestSpec.json()['tkgComponentSpec']['identityManagementSpec'][
 #                     'ldapSpec']['ldapEndpointPort'])
-#                 root_ca = request.get_json(force=True)['tkgComponentSpec']['identityManagementSpec'][
+#                 root_ca = RequestSpec.json()['tkgComponentSpec']['identityManagementSpec'][
 #                     'ldapSpec']['ldapRootCAData']
 #             except Exception as e:
 #                 if not root_ca:
@@ -8660,11 +8100,11 @@ def verify_expired(expiration_date):
 #                     return False, str(e)
 #         if env == Env.VMC:
 #             try:
-#                 ldap_endpoint_ip = request.get_json(force=True)['componentSpec']['identityManagementSpec'][
+#                 ldap_endpoint_ip = RequestSpec.json()['componentSpec']['identityManagementSpec'][
 #                     'ldapSpec']['ldapEndpointIp']
-#                 ldap_port = int(request.get_json(force=True)['componentSpec']['identityManagementSpec'][
+#                 ldap_port = int(RequestSpec.json()['componentSpec']['identityManagementSpec'][
 #                     'ldapSpec']['ldapEndpointPort'])
-#                 root_ca = request.get_json(force=True)['tkgComponentSpec']['identityManagementSpec'][
+#                 root_ca = RequestSpec.json()['tkgComponentSpec']['identityManagementSpec'][
 #                     'ldapSpec']['ldapRootCAData']
 #             except Exception as e:
 #                 if not root_ca:
@@ -8685,9 +8125,9 @@ def verify_expired(expiration_date):
 #     try:
 #         if not (env == Env.VMC):
 #             try:
-#                 ldap_bind_pw = request.get_json(force=True)['tkgComponentSpec']['identityManagementSpec'][
+#                 ldap_bind_pw = RequestSpec.json()['tkgComponentSpec']['identityManagementSpec'][
 #                     'ldapSpec']['ldapBindPW']
-#                 ldap_bind_dn = request.get_json(force=True)['tkgComponentSpec']['identityManagementSpec'][
+#                 ldap_bind_dn = RequestSpec.json()['tkgComponentSpec']['identityManagementSpec'][
 #                     'ldapSpec']['ldapBindDN']
 #             except Exception as e:
 #                 current_app.logger.error("Please provide ldapBindPW and "
@@ -8695,9 +8135,9 @@ def verify_expired(expiration_date):
 #                 return False, str(e)
 #         if env == Env.VMC:
 #             try:
-#                 ldap_bind_pw = request.get_json(force=True)['componentSpec']['identityManagementSpec'][
+#                 ldap_bind_pw = RequestSpec.json()['componentSpec']['identityManagementSpec'][
 #                     'ldapSpec']['ldapBindPW']
-#                 ldap_bind_dn = request.get_json(force=True)['componentSpec']['identityManagementSpec'][
+#                 ldap_bind_dn = RequestSpec.json()['componentSpec']['identityManagementSpec'][
 #                     'ldapSpec']['ldapBindDN']
 #             except Exception as e:
 
@@ -8724,13 +8164,13 @@ def verify_expired(expiration_date):
 #     try:
 #         if not (env == Env.VMC):
 #             try:
-#                 ldap_user_search_base_dn = request.get_json(force=True)['tkgComponentSpec']['identityManagementSpec'][
+#                 ldap_user_search_base_dn = RequestSpec.json()['tkgComponentSpec']['identityManagementSpec'][
 #                     'ldapSpec']['ldapUserSearchBaseDN']
-#                 ldap_user_search_filter = request.get_json(force=True)['tkgComponentSpec']['identityManagementSpec'][
+#                 ldap_user_search_filter = RequestSpec.json()['tkgComponentSpec']['identityManagementSpec'][
 #                     'ldapSpec']['ldapUserSearchFilter']
-#                 ldap_user_search_uname = request.get_json(force=True)['tkgComponentSpec']['identityManagementSpec'][
+#                 ldap_user_search_uname = RequestSpec.json()['tkgComponentSpec']['identityManagementSpec'][
 #                     'ldapSpec']['ldapUserSearchUsername']
-#                 test_user = request.get_json(force=True)['tkgComponentSpec']['identityManagementSpec'][
+#                 test_user = RequestSpec.json()['tkgComponentSpec']['identityManagementSpec'][
 #                     'ldapSpec']['ldapTestUserName']
 #             except Exception as e:
 #                 if not ldap_user_search_filter:
@@ -8743,13 +8183,13 @@ def verify_expired(expiration_date):
 #                     test_user = ""
 #         if env == Env.VMC:
 #             try:
-#                 ldap_user_search_base_dn = request.get_json(force=True)['componentSpec']['identityManagementSpec'][
+#                 ldap_user_search_base_dn = RequestSpec.json()['componentSpec']['identityManagementSpec'][
 #                     'ldapSpec']['ldapUserSearchBaseDN']
-#                 ldap_user_search_filter = request.get_json(force=True)['componentSpec']['identityManagementSpec'][
+#                 ldap_user_search_filter = RequestSpec.json()['componentSpec']['identityManagementSpec'][
 #                     'ldapSpec']['ldapUserSearchFilter']
-#                 ldap_user_search_uname = request.get_json(force=True)['componentSpec']['identityManagementSpec'][
+#                 ldap_user_search_uname = RequestSpec.json()['componentSpec']['identityManagementSpec'][
 #                     'ldapSpec']['ldapUserSearchUsername']
-#                 test_user = request.get_json(force=True)['componentSpec']['identityManagementSpec'][
+#                 test_user = RequestSpec.json()['componentSpec']['identityManagementSpec'][
 #                     'ldapSpec']['ldapTestUserName']
 #             except Exception as e:
 #                 if not ldap_user_search_filter:
@@ -8802,17 +8242,17 @@ def verify_expired(expiration_date):
 #     try:
 #         if not (env == Env.VMC):
 #             try:
-#                 ldap_grp_search_base_dn = request.get_json(force=True)['tkgComponentSpec']['identityManagementSpec'][
+#                 ldap_grp_search_base_dn = RequestSpec.json()['tkgComponentSpec']['identityManagementSpec'][
 #                     'ldapSpec']['ldapGroupSearchBaseDN']
-#                 ldap_grp_search_filter = request.get_json(force=True)['tkgComponentSpec']['identityManagementSpec'][
+#                 ldap_grp_search_filter = RequestSpec.json()['tkgComponentSpec']['identityManagementSpec'][
 #                     'ldapSpec']['ldapGroupSearchFilter']
-#                 ldap_grp_search_user_attr = request.get_json(force=True)['tkgComponentSpec']['identityManagementSpec'][
+#                 ldap_grp_search_user_attr = RequestSpec.json()['tkgComponentSpec']['identityManagementSpec'][
 #                     'ldapSpec']['ldapGroupSearchUserAttr']
-#                 ldap_grp_search_grp_attr = request.get_json(force=True)['tkgComponentSpec']['identityManagementSpec'][
+#                 ldap_grp_search_grp_attr = RequestSpec.json()['tkgComponentSpec']['identityManagementSpec'][
 #                     'ldapSpec']['ldapGroupSearchGroupAttr']
-#                 ldap_grp_search_name_attr = request.get_json(force=True)['tkgComponentSpec']['identityManagementSpec'][
+#                 ldap_grp_search_name_attr = RequestSpec.json()['tkgComponentSpec']['identityManagementSpec'][
 #                     'ldapSpec']['ldapGroupSearchNameAttr']
-#                 test_group = request.get_json(force=True)['tkgComponentSpec']['identityManagementSpec'][
+#                 test_group = RequestSpec.json()['tkgComponentSpec']['identityManagementSpec'][
 #                     'ldapSpec']['ldapTestGroupName']
 #             except Exception as e:
 #                 if not ldap_grp_search_base_dn:
@@ -8829,17 +8269,17 @@ def verify_expired(expiration_date):
 #                     test_group = ""
 #         if env == Env.VMC:
 #             try:
-#                 ldap_grp_search_base_dn = request.get_json(force=True)['componentSpec']['identityManagementSpec'][
+#                 ldap_grp_search_base_dn = RequestSpec.json()['componentSpec']['identityManagementSpec'][
 #                     'ldapSpec']['ldapGroupSearchBaseDN']
-#                 ldap_grp_search_filter = request.get_json(force=True)['componentSpec']['identityManagementSpec'][
+#                 ldap_grp_search_filter = RequestSpec.json()['componentSpec']['identityManagementSpec'][
 #                     'ldapSpec']['ldapGroupSearchFilter']
-#                 ldap_grp_search_user_attr = request.get_json(force=True)['componentSpec']['identityManagementSpec'][
+#                 ldap_grp_search_user_attr = RequestSpec.json()['componentSpec']['identityManagementSpec'][
 #                     'ldapSpec']['ldapGroupSearchUserAttr']
-#                 ldap_grp_search_grp_attr = request.get_json(force=True)['componentSpec']['identityManagementSpec'][
+#                 ldap_grp_search_grp_attr = RequestSpec.json()['componentSpec']['identityManagementSpec'][
 #                     'ldapSpec']['ldapGroupSearchGroupAttr']
-#                 ldap_grp_search_name_attr = request.get_json(force=True)['componentSpec']['identityManagementSpec'][
+#                 ldap_grp_search_name_attr = RequestSpec.json()['componentSpec']['identityManagementSpec'][
 #                     'ldapSpec']['ldapGroupSearchNameAttr']
-#                 test_group = request.get_json(force=True)['componentSpec']['identityManagementSpec'][
+#                 test_group = RequestSpec.json()['componentSpec']['identityManagementSpec'][
 #                     'ldapSpec']['ldapTestGroupName']
 #             except Exception as e:
 #                 if not ldap_grp_search_base_dn:
@@ -8903,7 +8343,7 @@ def getNetworkDetailsVip(ip, csrf2, vipNetworkUrl, startIp, endIp, prefixIp, net
     env = envCheck()
     env = env[0]
     payload = {}
-    response_csrf = requests.request("GET", url, headers=headers, data=payload, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload, verify=False)
     details = {}
     if response_csrf.status_code != 200:
         details["error"] = response_csrf.text
@@ -8940,7 +8380,7 @@ def create_virtual_service(ip, csrf2, avi_cloud_uuid, se_name, vip_network_url,
     env = env[0]
     body = {}
     url = AlbEndpoint.AVI_SERVICE_ENGINE.format(ip=ip, se_name=se_name, avi_cloud_uuid=avi_cloud_uuid)
-    response_csrf = requests.request("GET", url, headers=headers, data=body, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=body, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -8952,7 +8392,7 @@ def create_virtual_service(ip, csrf2, avi_cloud_uuid, se_name, vip_network_url,
         type = VrfType.GLOBAL
         cloud_ref_ = cloud_ref[cloud_ref.rindex("/") + 1:]
         se_group_url = AlbEndpoint.AVI_SE_GROUP.format(ip=ip, cloud_ref=cloud_ref_, service_engine_uuid=se_uuid)
-        response = requests.request("GET", se_group_url, headers=headers, data=body, verify=False)
+        response = AviClient.for_controller(ip).request("GET", se_group_url, headers=headers, data=body, verify=False)
         if response.status_code != 200:
             return None, response.text
         createVs = False
@@ -8967,7 +8407,7 @@ def create_virtual_service(ip, csrf2, avi_cloud_uuid, se_name, vip_network_url,
         if createVs:
             current_app.logger.info("Creating  virtual service")
             vrf_get_url = "https://" + ip + "/api/vrfcontext/?name.in=" + type + "&cloud_ref.uuid=" + avi_cloud_uuid
-            response_csrf = requests.request("GET", vrf_get_url, headers=headers, data=body, verify=False)
+            response_csrf = AviClient.for_controller(ip).request("GET", vrf_get_url, headers=headers, data=body, verify=False)
             if response_csrf.status_code != 200:
                 return None, response_csrf.text
             vrf_url = ""
@@ -8977,12 +8417,12 @@ def create_virtual_service(ip, csrf2, avi_cloud_uuid, se_name, vip_network_url,
                     break
             if not vrf_url:
                 return None, "VRF_URL_NOT_FOUND"
-            startIp = request.get_json(force=True)["tkgComponentSpec"]['tkgClusterVipNetwork'][
+            startIp = RequestSpec.json()["tkgComponentSpec"]['tkgClusterVipNetwork'][
                 "tkgClusterVipIpStartRange"]
-            endIp = request.get_json(force=True)["tkgComponentSpec"]['tkgClusterVipNetwork'][
+            endIp = RequestSpec.json()["tkgComponentSpec"]['tkgClusterVipNetwork'][
                 "tkgClusterVipIpEndRange"]
             prefixIpNetmask = seperateNetmaskAndIp(
-                request.get_json(force=True)["tkgComponentSpec"]['tkgClusterVipNetwork'][
+                RequestSpec.json()["tkgComponentSpec"]['tkgClusterVipNetwork'][
                     "tkgClusterVipNetworkGatewayCidr"])
             getVIPNetworkDetails = getNetworkDetailsVip(ip, csrf2, vip_network_url, startIp, endIp, prefixIpNetmask[0],
                                                         prefixIpNetmask[1], avi_version)
@@ -8995,7 +8435,7 @@ def create_virtual_service(ip, csrf2, avi_cloud_uuid, se_name, vip_network_url,
             else:
                 return None, "Vip Ip pools are not configured."
             virtual_service_vip_url = AlbEndpoint.AVI_VIRTUAL_SERVICE_VIP.format(ip=ip)
-            response = requests.request("GET", virtual_service_vip_url, headers=headers, data=body, verify=False)
+            response = AviClient.for_controller(ip).request("GET", virtual_service_vip_url, headers=headers, data=body, verify=False)
             if response.status_code != 200:
                 return None, response.text
             isVipCreated = False
@@ -9020,14 +8460,14 @@ def create_virtual_service(ip, csrf2, avi_cloud_uuid, se_name, vip_network_url,
                                                                  virtual_service_name_vip=ServiceName.SIVT_SERVICE_VIP,
                                                                  vrf_context_ref=vrf_url
                                                                  , network_ref=vip_network_url, addr=ip_pre, mask=mask)
-                response = requests.request("POST", virtual_service_vip_url, headers=headers, data=body, verify=False)
+                response = AviClient.for_controller(ip).request("POST", virtual_service_vip_url, headers=headers, data=body, verify=False)
                 if response.status_code != 201:
                     return None, response.text
                 vip_url = response.json()["url"]
             if not vip_url:
                 return None, "virtual service vip url not found"
             virtual_service_url = AlbEndpoint.AVI_VIRTUAL_SERVICE.format(ip=ip)
-            response = requests.request("GET", virtual_service_url, headers=headers, data=body, verify=False)
+            response = AviClient.for_controller(ip).request("GET", virtual_service_url, headers=headers, data=body, verify=False)
             if response.status_code != 200:
                 return None, response.text
             isVsCreated = False
@@ -9048,7 +8488,7 @@ def create_virtual_service(ip, csrf2, avi_cloud_uuid, se_name, vip_network_url,
                     body = AlbPayload.VIRTUAL_SERVICE.format(cloud_ref=cloud_ref,
                                                              se_group_ref=service_engine_group_url
                                                              , vsvip_ref=vip_url)
-                response = requests.request("POST", virtual_service_url, headers=headers, data=body, verify=False)
+                response = AviClient.for_controller(ip).request("POST", virtual_service_url, headers=headers, data=body, verify=False)
                 if response.status_code != 201:
                     return None, response.text
             body = {}
@@ -9059,7 +8499,7 @@ def create_virtual_service(ip, csrf2, avi_cloud_uuid, se_name, vip_network_url,
                 if se_count == 2:
                     for i in range(1):
                         while counter_se < 60:
-                            response = requests.request("GET", se_group_url, headers=headers, data=body, verify=False)
+                            response = AviClient.for_controller(ip).request("GET", se_group_url, headers=headers, data=body, verify=False)
                             if response.status_code != 200:
                                 return None, response.text
                             config = response.json()["results"][0]
@@ -9076,14 +8516,14 @@ def create_virtual_service(ip, csrf2, avi_cloud_uuid, se_name, vip_network_url,
                         if not initialized:
                             return None, "Service engines not initialized  in 30m"
                         current_app.logger.info("Checking status of service engine " + str(seurl))
-                        response = requests.request("GET", seurl, headers=headers, data=body, verify=False)
+                        response = AviClient.for_controller(ip).request("GET", seurl, headers=headers, data=body, verify=False)
                         if response.status_code != 200:
                             return None, response.text
                         isConnected = False
                         try:
                             status = response.json()["se_connected"]
                             while not status and counter < 60:
-                                response = requests.request("GET", seurl, headers=headers, data=body, verify=False)
+                                response = AviClient.for_controller(ip).request("GET", seurl, headers=headers, data=body, verify=False)
                                 if response.status_code != 200:
                                     return None, response.text
                                 status = response.json()["se_connected"]
@@ -9107,7 +8547,7 @@ def create_virtual_service(ip, csrf2, avi_cloud_uuid, se_name, vip_network_url,
                     for i in range(2, 3):
                         seurl = config["serviceengines"][i]
                         current_app.logger.info("Checking status of service engine " + str(seurl))
-                        response = requests.request("GET", seurl, headers=headers, data=body, verify=False)
+                        response = AviClient.for_controller(ip).request("GET", seurl, headers=headers, data=body, verify=False)
                         if response.status_code != 200:
                             return None, response.text
                         current_app.logger.info(response.json())
@@ -9115,7 +8555,7 @@ def create_virtual_service(ip, csrf2, avi_cloud_uuid, se_name, vip_network_url,
                         try:
                             status = response.json()["se_connected"]
                             while not status and counter < 60:
-                                response = requests.request("GET", seurl, headers=headers, data=body, verify=False)
+                                response = AviClient.for_controller(ip).request("GET", seurl, headers=headers, data=body, verify=False)
                                 if response.status_code != 200:
                                     return None, response.text
                                 if status:
@@ -9134,7 +8574,7 @@ def create_virtual_service(ip, csrf2, avi_cloud_uuid, se_name, vip_network_url,
                 return None, str(e)
             try:
                 current_app.logger.info("Deleting Virtual service")
-                response = requests.request("GET", virtual_service_vip_url, headers=headers, data=body, verify=False)
+                response = AviClient.for_controller(ip).request("GET", virtual_service_vip_url, headers=headers, data=body, verify=False)
                 if response.status_code != 200:
                     return None, response.text
                 vip_url = ""
@@ -9147,7 +8587,7 @@ def create_virtual_service(ip, csrf2, avi_cloud_uuid, se_name, vip_network_url,
                     current_app.logger.info("No virtual service vip created")
                 vs_url = ""
                 virtual_service_url = AlbEndpoint.AVI_VIRTUAL_SERVICE.format(ip=ip)
-                response = requests.request("GET", virtual_service_url, headers=headers, data=body, verify=False)
+                response = AviClient.for_controller(ip).request("GET", virtual_service_url, headers=headers, data=body, verify=False)
                 try:
                     for r in response.json()["results"]:
                         if r["name"] == ServiceName.SIVT_SERVICE:
@@ -9155,8 +8595,8 @@ def create_virtual_service(ip, csrf2, avi_cloud_uuid, se_name, vip_network_url,
                             break
                 except:
                     current_app.logger.info("No virtual service created")
-                requests.request("DELETE", vs_url, headers=headers, data=body, verify=False)
-                requests.request("DELETE", vip_url, headers=headers, data=body, verify=False)
+                AviClient.for_controller(ip).request("DELETE", vs_url, headers=headers, data=body, verify=False)
+                AviClient.for_controller(ip).request("DELETE", vip_url, headers=headers, data=body, verify=False)
             except Exception as e:
                 pass
             return "SUCCESS", "Required Service engines sucessfully  created"
@@ -9167,7 +8607,7 @@ def create_virtual_service(ip, csrf2, avi_cloud_uuid, se_name, vip_network_url,
 def create_tkgs_proxy_credential():
     isCredCreated = False
     try:
-        refreshToken = request.get_json(force=True)['envSpec']['saasEndpoints']['tmcDetails']['tmcRefreshToken']
+        refreshToken = RequestSpec.json()['envSpec']['saasEndpoints']['tmcDetails']['tmcRefreshToken']
 
         url = "https://console.cloud.vmware.com/csp/gateway/am/api/auth/api-tokens/authorize?refresh_token=" + refreshToken
         headers = {}
@@ -9183,12 +8623,12 @@ def create_tkgs_proxy_credential():
             'Accept': 'application/json',
             'Authorization': access_token
         }
-        tmc_url = request.get_json(force=True)['envSpec']['saasEndpoints']['tmcDetails']['tmcInstanceURL']
-        httpProxy = request.get_json(force=True)['tkgsComponentSpec']['tkgServiceConfig']['proxySpec'][
+        tmc_url = RequestSpec.json()['envSpec']['saasEndpoints']['tmcDetails']['tmcInstanceURL']
+        httpProxy = RequestSpec.json()['tkgsComponentSpec']['tkgServiceConfig']['proxySpec'][
             'httpProxy']
-        httpsProxy = request.get_json(force=True)['tkgsComponentSpec']['tkgServiceConfig']['proxySpec'][
+        httpsProxy = RequestSpec.json()['tkgsComponentSpec']['tkgServiceConfig']['proxySpec'][
             'httpsProxy']
-        noProxy = request.get_json(force=True)['tkgsComponentSpec']['tkgServiceConfig']['proxySpec']['noProxy']
+        noProxy = RequestSpec.json()['tkgsComponentSpec']['tkgServiceConfig']['proxySpec']['noProxy']
         current_app.logger.info("Getting current proxy credentials")
         try:
             url = tmc_url + "/v1alpha1/account/credentials/" + Tkgs_Extension_Details.TKGS_PROXY_CREDENTIAL_NAME
@@ -9317,7 +8757,7 @@ def create_tkgs_proxy_credential():
 def register_management_cluster_tmc(tmc_url, management_cluster, vCenter, vCenter_user, VC_PASSWORD):
     try:
         isManagement_registered = False
-        refreshToken = request.get_json(force=True)['envSpec']['saasEndpoints']['tmcDetails']['tmcRefreshToken']
+        refreshToken = RequestSpec.json()['envSpec']['saasEndpoints']['tmcDetails']['tmcRefreshToken']
 
         url = "https://console.cloud.vmware.com/csp/gateway/am/api/auth/api-tokens/authorize?refresh_token=" + refreshToken
         headers = {}
@@ -9351,7 +8791,7 @@ def register_management_cluster_tmc(tmc_url, management_cluster, vCenter, vCente
             isManagement_registered = False
         if not isManagement_registered:
             proxy_name = Tkgs_Extension_Details.TKGS_PROXY_CREDENTIAL_NAME
-            clusterGroup = request.get_json(force=True)['envSpec']["saasEndpoints"]['tmcDetails'][
+            clusterGroup = RequestSpec.json()['envSpec']["saasEndpoints"]['tmcDetails'][
                 'tmcSupervisorClusterGroupName']
             if not clusterGroup:
                 clusterGroup = "default"
@@ -9421,7 +8861,7 @@ def register_management_cluster_tmc(tmc_url, management_cluster, vCenter, vCente
                 yaml.indent(mapping=2, sequence=4, offset=3)
                 yaml.dump(data, outfile)
             current_app.logger.info("Switching context to supervisor cluster")
-            supervisor_cluster = request.get_json(force=True)['envSpec']["saasEndpoints"]['tmcDetails'][
+            supervisor_cluster = RequestSpec.json()['envSpec']["saasEndpoints"]['tmcDetails'][
                 'tmcSupervisorClusterName']
 
             ## get context and switch
@@ -9437,7 +8877,7 @@ def register_management_cluster_tmc(tmc_url, management_cluster, vCenter, vCente
                 "Content-Type": "application/json",
                 "vmware-api-session-id": session_id
             }
-            cluster_name = request.get_json(force=True)["envSpec"]["vcenterDetails"]["vcenterCluster"]
+            cluster_name = RequestSpec.json()["envSpec"]["vcenterDetails"]["vcenterCluster"]
             id = getClusterID(vCenter, vCenter_user, VC_PASSWORD, cluster_name)
             if id[1] != 200:
                 return None, id[0]
@@ -9461,29 +8901,32 @@ def register_management_cluster_tmc(tmc_url, management_cluster, vCenter, vCente
             create_output = runShellCommandAndReturnOutputAsList(command)
             if create_output[1] != 0:
                 return None, str(create_output[0])
-            count = 0
-            while count < 60:
+            management_cluster_url = tmc_url + "/v1alpha1/managementclusters/" + management_cluster
+
+            def registered(response_m):
+                if response_m.status_code != 200:
+                    return True
                 try:
-                    management_cluster_url = tmc_url + "/v1alpha1/managementclusters/" + management_cluster
-                    response_m = requests.request("GET", management_cluster_url, headers=headers, data=body,
-                                                  verify=False)
-                    if response_m.status_code != 200:
-                        return None, response_m.text
-                    json = response_m.json()
-                    phase = json["managementCluster"]["status"]["phase"]
-                    health = json["managementCluster"]["status"]["health"]
-                    message = json["managementCluster"]["status"]["conditions"]["READY"]["message"]
-                    if phase == "READY" and health == "HEALTHY" and message == "management cluster is connected to TMC and healthy":
-                        return "SUCCESS", "Management cluster registered to tmc Successfully"
-                    else:
-                        current_app.logger.info("Management cluster state : " + phase + " " + health + " " + message)
-                except Exception as e:
-                    pass
-                time.sleep(30)
-                count = count + 1
-                current_app.logger.info(
-                    "Waited for " + str(count * 30) + "s, retrying to check  management cluster status on tmc")
-            return None, "Management cluster not registered on waiting " + str(count * 30) + "s"
+                    status = response_m.json()["managementCluster"]["status"]
+                    phase = status["phase"]
+                    health = status["health"]
+                    message = status["conditions"]["READY"]["message"]
+                except Exception:
+                    return False
+                current_app.logger.info("Management cluster state : " + phase + " " + health + " " + message)
+                return phase == "READY" and health == "HEALTHY" and \
+                    message == "management cluster is connected to TMC and healthy"
+
+            wait = WaitHelper.wait_for(
+                lambda: requests.request("GET", management_cluster_url, headers=headers, data=body, verify=False),
+                registered, timeout=TMC_REGISTRATION_TIMEOUT,
+                initial_delay=5, ignore_errors=True, description="Management cluster registration on tmc",
+                log=current_app.logger)
+            if wait.value is not None and wait.value.status_code != 200:
+                return None, wait.value.text
+            if wait.ready:
+                return "SUCCESS", "Management cluster registered to tmc Successfully"
+            return None, "Management cluster not registered on waiting " + str(int(wait.elapsed)) + "s"
     except Exception as e:
         return None, str(e)
 
@@ -9493,45 +8936,45 @@ def ping_check_gateways(env):
         ip_addr = []
         if env == Env.VSPHERE or env == Env.VCF:
             if isEnvTkgs_wcp(env):
-                ip_addr.append(request.get_json(force=True)['tkgsComponentSpec']['aviMgmtNetwork']
+                ip_addr.append(RequestSpec.json()['tkgsComponentSpec']['aviMgmtNetwork']
                                ['aviMgmtNetworkGatewayCidr'])
-                ip_addr.append(request.get_json(force=True)['tkgsComponentSpec']['tkgsVipNetwork']
+                ip_addr.append(RequestSpec.json()['tkgsComponentSpec']['tkgsVipNetwork']
                                ['tkgsVipNetworkGatewayCidr'])
-                ip_addr.append(request.get_json(force=True)['tkgsComponentSpec']['tkgsMgmtNetworkSpec'][
+                ip_addr.append(RequestSpec.json()['tkgsComponentSpec']['tkgsMgmtNetworkSpec'][
                                    'tkgsMgmtNetworkGatewayCidr'])
-                ip_addr.append(request.get_json(force=True)['tkgsComponentSpec']['tkgsPrimaryWorkloadNetwork'][
+                ip_addr.append(RequestSpec.json()['tkgsComponentSpec']['tkgsPrimaryWorkloadNetwork'][
                                    'tkgsPrimaryWorkloadNetworkGatewayCidr'])
             elif isEnvTkgs_ns(env):
-                workload_nw_cidr = request.get_json(force=True)['tkgsComponentSpec']['tkgsWorkloadNetwork'][
+                workload_nw_cidr = RequestSpec.json()['tkgsComponentSpec']['tkgsWorkloadNetwork'][
                     'tkgsWorkloadNetworkGatewayCidr']
                 if workload_nw_cidr:
                     ip_addr.append(workload_nw_cidr)
             else:
-                ip_addr.append(request.get_json(force=True)['tkgComponentSpec']['aviMgmtNetwork'][
+                ip_addr.append(RequestSpec.json()['tkgComponentSpec']['aviMgmtNetwork'][
                                    'aviMgmtNetworkGatewayCidr'])
-                ip_addr.append(request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+                ip_addr.append(RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
                                    'tkgMgmtGatewayCidr'])
                 if not env == Env.VCF:
-                    ip_addr.append(request.get_json(force=True)['tkgMgmtDataNetwork']['tkgMgmtDataNetworkGatewayCidr'])
-                    ip_addr.append(request.get_json(force=True)['tkgWorkloadDataNetwork'][
+                    ip_addr.append(RequestSpec.json()['tkgMgmtDataNetwork']['tkgMgmtDataNetworkGatewayCidr'])
+                    ip_addr.append(RequestSpec.json()['tkgWorkloadDataNetwork'][
                                        'tkgWorkloadDataNetworkGatewayCidr'])
-                ip_addr.append(request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadGatewayCidr'])
-                ip_addr.append(request.get_json(force=True)["tkgComponentSpec"]['tkgClusterVipNetwork'][
+                ip_addr.append(RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadGatewayCidr'])
+                ip_addr.append(RequestSpec.json()["tkgComponentSpec"]['tkgClusterVipNetwork'][
                                    "tkgClusterVipNetworkGatewayCidr"])
         elif env == Env.VMC:
-            ip_addr.append(request.get_json(force=True)['componentSpec']['aviMgmtNetworkSpec'][
+            ip_addr.append(RequestSpec.json()['componentSpec']['aviMgmtNetworkSpec'][
                                'aviMgmtGatewayCidr'])
-            ip_addr.append(request.get_json(force=True)['componentSpec']['tkgClusterVipNetwork'][
+            ip_addr.append(RequestSpec.json()['componentSpec']['tkgClusterVipNetwork'][
                                'tkgClusterVipNetworkGatewayCidr'])
-            ip_addr.append(request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec'][
+            ip_addr.append(RequestSpec.json()['componentSpec']['tkgSharedServiceSpec'][
                                'tkgSharedGatewayCidr'])
-            ip_addr.append(request.get_json(force=True)['componentSpec']['aviMgmtNetworkSpec'][
+            ip_addr.append(RequestSpec.json()['componentSpec']['aviMgmtNetworkSpec'][
                                'aviMgmtGatewayCidr'])
-            ip_addr.append(request.get_json(force=True)['componentSpec']['tkgMgmtDataNetworkSpec'][
+            ip_addr.append(RequestSpec.json()['componentSpec']['tkgMgmtDataNetworkSpec'][
                                'tkgMgmtDataGatewayCidr'])
-            ip_addr.append(request.get_json(force=True)['componentSpec']['tkgWorkloadDataNetworkSpec'][
+            ip_addr.append(RequestSpec.json()['componentSpec']['tkgWorkloadDataNetworkSpec'][
                                'tkgWorkloadDataGatewayCidr'])
-            ip_addr.append(request.get_json(force=True)['componentSpec']['tkgWorkloadSpec'][
+            ip_addr.append(RequestSpec.json()['componentSpec']['tkgWorkloadSpec'][
                                'tkgWorkloadGatewayCidr'])
 
         #remove duplicate CIDRs
@@ -9540,12 +8983,16 @@ def ping_check_gateways(env):
 
         ip_addr = [*set(ip_addr)]
 
+        reachable = PingSweep.probe(ip_addr)
+        failed = False
         for ip in ip_addr:
-            if ping_test("ping -c 1 " + ip.split("/")[0]) != 0:
+            if not reachable[ip.split("/")[0]]:
                 current_app.logger.warn("Ping test failed for " + ip + " gateway. It is Recommended to fix this before proceeding with deployment")
-                time.sleep(30)
+                failed = True
             else:
                 current_app.logger.info("Ping test passed for gateway - " + ip)
+        if failed:
+            time.sleep(30)
 
         return True
     except Exception as e:
@@ -9555,18 +9002,10 @@ def ping_check_gateways(env):
 
 
 def ping_test(string_command):
-    try:
-        command = string_command.split(" ")
-        l, o = runShellCommandAndReturnOutputAsList(command)
-        s = l[4].replace(" ", "")
-        if s.__contains__(",100.0%packetloss,"):
-            return 1
-        elif s.__contains__(",0%packetloss,"):
-            return 0
-        else:
-            return 1
-    except:
-        return 1
+    """
+    0 if the address at the end of the ping command answers, 1 otherwise.
+    """
+    return 0 if PingSweep.reachable(string_command.split(" ")[-1]) else 1
 
 
 def check_files_type(files):
@@ -9619,7 +9058,7 @@ def copy_pem_files_to_vsphere_ytt(cert_files):
 
 def create_certs_in_ytt_config():
     try:
-        cert_file_location = request.get_json(force=True)['tkgComponentSpec']["tkgMgmtComponents"]['tkgCustomCertsPath']
+        cert_file_location = RequestSpec.json()['tkgComponentSpec']["tkgMgmtComponents"]['tkgCustomCertsPath']
         if len(cert_file_location) == 0:
             # if file exist delete it.
             ytt_path = os.path.join(Env.UPDATED_YTT_FILE_LOCATION, "photon-ubuntu-universal-overlay.yaml")
@@ -9,13 +9,13 @@ import json
 logger = logging.getLogger(__name__)
 from flask import current_app
 import sys
-import base64
 import time
 
 sys.path.append(".../")
 from common.operation.ShellHelper import runShellCommandAndReturnOutput, grabKubectlCommand, grabIpAddress, \
     verifyPodsAreRunning, grabPipeOutput, runShellCommandAndReturnOutputAsList, \
     runShellCommandAndReturnOutputAsListWithChangedDir, grabPipeOutputChagedDir, grabIpAddress, runProcess
+from common.util.request_spec import RequestSpec
 from common.operation.constants import SegmentsName, RegexPattern, Versions, AkoType, AppName, Env
 from common.lib.nsxt_client import NsxtClient
 from requests.packages.urllib3.exceptions import InsecureRequestWarning
@@ -110,7 +110,7 @@ def deployApp():
         }
         current_app.logger.error("Un-Authorized")
         return jsonify(d), 401
-    shared_cluster_name = request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec'][
+    shared_cluster_name = RequestSpec.json()['componentSpec']['tkgSharedServiceSpec'][
         'tkgSharedClusterName']
     current_app.logger.info("Connect to shared cluster")
     commands_shared = ["tanzu", "cluster", "kubeconfig", "get", shared_cluster_name, "--admin"]
@@ -327,12 +327,9 @@ def createExt(body, url, type):
 
 
 def pushImageToHarbor():
-    str_enc = str(request.get_json(force=True)['componentSpec']['harborSpec']['harborPasswordBase64'])
-    base64_bytes = str_enc.encode('ascii')
-    enc_bytes = base64.b64decode(base64_bytes)
-    password = enc_bytes.decode('ascii').rstrip("\n")
+    password = RequestSpec.secret("componentSpec", "harborSpec", "harborPasswordBase64")
     harborPassword = password
-    host = request.get_json(force=True)['componentSpec']['harborSpec']['harborFqdn']
+    host = RequestSpec.json()['componentSpec']['harborSpec']['harborFqdn']
     docker_login = ["docker", "login", host, "-u", "admin", "-p", harborPassword]
     helm_command = ["helm", "repo", "add", "bitnami", "https://charts.bitnami.com/bitnami"]
     docker_pull = ["docker", "pull", "bitnami/nginx"]
@@ -351,10 +348,10 @@ def pushImageToHarbor():
 
 def connectToWorkLoadCluster(env):
     if env == Env.VMC:
-        workload_cluster_name = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec'][
+        workload_cluster_name = RequestSpec.json()['componentSpec']['tkgWorkloadSpec'][
             'tkgWorkloadClusterName']
     else:
-        workload_cluster_name = request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadClusterName']
+        workload_cluster_name = RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadClusterName']
     current_app.logger.info("Connect to workload cluster")
     commands_shared = ["tanzu", "cluster", "kubeconfig", "get", workload_cluster_name, "--admin"]
     kubeContextCommand_shared = grabKubectlCommand(commands_shared, RegexPattern.SWITCH_CONTEXT_KUBECTL)
@@ -0,0 +1,315 @@
+# Copyright 2021 VMware, Inc.
+# SPDX-License-Identifier: BSD-2-Clause
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import has_request_context, request
+
+logger = logging.getLogger(__name__)
+
+
+class JobState:
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+    INTERRUPTED = "INTERRUPTED"
+    TERMINAL = (SUCCEEDED, FAILED, INTERRUPTED)
+
+
+class Job:
+    # Only the most recent events are kept; sequence numbers keep counting.
+    MAX_EVENTS = 5000
+
+    def __init__(self, job_id, method, path, headers, created=None):
+        self.id = job_id
+        self.method = method
+        self.path = path
+        self.headers = headers
+        self.state = JobState.PENDING
+        self.created = created or time.time()
+        self.started = None
+        self.finished = None
+        self.status_code = None
+        self.result = None
+        self.events = []
+        self.seq = 0
+
+    @property
+    def done(self):
+        return self.state in JobState.TERMINAL
+
+    def add_event(self, level, message):
+        self.seq += 1
+        self.events.append(dict(seq=self.seq, time=time.time(), level=level, message=message))
+        if len(self.events) > self.MAX_EVENTS:
+            del self.events[:len(self.events) - self.MAX_EVENTS]
+
+    def events_since(self, since):
+        return [event for event in self.events if event["seq"] > since]
+
+    def to_dict(self, since=None):
+        d = dict(jobId=self.id, method=self.method, path=self.path, state=self.state, created=self.created,
+                 started=self.started, finished=self.finished, statusCode=self.status_code, result=self.result,
+                 lastEvent=self.seq)
+        if since is not None:
+            d["events"] = self.events_since(since)
+        return d
+
+    @staticmethod
+    def from_dict(d, headers):
+        job = Job(d["jobId"], d["method"], d["path"], headers, d["created"])
+        job.state = d["state"]
+        job.started = d["started"]
+        job.finished = d["finished"]
+        job.status_code = d["statusCode"]
+        job.result = d["result"]
+        job.events = d.get("events", [])
+        job.seq = d["lastEvent"]
+        return job
+
+
+class JobManager:
+    """
+    Runs long deployment calls in the background: a submitted request is replayed
+    against the app in one of MAX_WORKERS job threads, so the calling HTTP worker is
+    free again right away. Everything the job logs through the app logger is recorded
+    as progress events that callers can long-poll or stream.
+
+    Job state is written to JOBS_DIR, so status and results survive a server restart.
+    Jobs that had not started yet are queued again after a restart; jobs that were
+    running are marked INTERRUPTED, as deployments cannot be resumed half-way. The
+    request headers and body carry credentials: they are kept in separate files readable
+    by the owner only, and deleted as soon as the job has finished.
+
+    The job is also put in the environ of the replayed request, so log records from
+    threads that run with a copy of the request context (TaskGraph steps) are recorded.
+    """
+    MAX_WORKERS = 2
+    MAX_JOBS = 100
+    JOBS_DIR = "/opt/vmware/arcas/jobs"
+    # Running jobs are persisted at most this often while they only produce events.
+    SAVE_INTERVAL = 5
+    _ENVIRON_KEY = "arcas.job"
+
+    def __init__(self, app, jobs_dir=JOBS_DIR, max_workers=MAX_WORKERS):
+        self.app = app
+        self.jobs_dir = jobs_dir
+        self.jobs = {}
+        self.condition = threading.Condition()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._local = threading.local()
+        self._saved_at = {}
+        self._save_lock = threading.Lock()
+
+    @staticmethod
+    def init_app(app, jobs_dir=JOBS_DIR, max_workers=MAX_WORKERS):
+        manager = JobManager(app, jobs_dir, max_workers)
+        os.makedirs(jobs_dir, exist_ok=True)
+        handler = _JobLogHandler(manager)
+        handler.setLevel(logging.INFO)
+        app.logger.addHandler(handler)
+        app.extensions["jobs"] = manager
+        manager._load()
+        return manager
+
+    @staticmethod
+    def of(app):
+        return app.extensions["jobs"]
+
+    def submit(self, method, path, headers, body):
+        job = Job(uuid.uuid4().hex, method, path, headers)
+        with self.condition:
+            self.jobs[job.id] = job
+            self._prune()
+        self._save(job, body, headers)
+        self.executor.submit(self._run, job, body)
+        logger.info("Queued job %s for %s %s" % (job.id, method, path))
+        return job
+
+    def get(self, job_id):
+        with self.condition:
+            return self.jobs.get(job_id)
+
+    def list(self):
+        with self.condition:
+            return sorted(self.jobs.values(), key=lambda job: job.created, reverse=True)
+
+    def wait(self, job, since, timeout):
+        """
+        Block until the job has events after `since` or has finished, at most timeout seconds.
+        """
+        deadline = time.monotonic() + timeout
+        with self.condition:
+            while job.seq <= since and not job.done:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.condition.wait(remaining)
+            return job.to_dict(since)
+
+    def current(self):
+        job = getattr(self._local, "job", None)
+        if job is None and has_request_context():
+            job = request.environ.get(self._ENVIRON_KEY)
+        return job
+
+    def record(self, level, message):
+        job = self.current()
+        if job is None:
+            return
+        with self.condition:
+            job.add_event(level, message)
+            self.condition.notify_all()
+        if time.monotonic() - self._saved_at.get(job.id, 0) >= self.SAVE_INTERVAL:
+            self._save(job)
+
+    def _run(self, job, body):
+        self._local.job = job
+        with self.condition:
+            job.state = JobState.RUNNING
+            job.started = time.time()
+            job.add_event("INFO", "Started " + job.method + " " + job.path)
+            self.condition.notify_all()
+        self._save(job)
+        try:
+            with self.app.test_request_context(job.path, method=job.method, headers=job.headers, data=body,
+                                               environ_base={self._ENVIRON_KEY: job}):
+                response = self.app.full_dispatch_request()
+            status_code = response.status_code
+            result = response.get_json(silent=True)
+            if result is None:
+                result = dict(msg=response.get_data(as_text=True))
+        except Exception as e:
+            logger.exception("Job %s failed" % job.id)
+            status_code = 500
+            result = dict(responseType="ERROR", msg=str(e), STATUS_CODE=500)
+        finally:
+            self._local.job = None
+        with self.condition:
+            job.status_code = status_code
+            job.result = result
+            job.state = JobState.SUCCEEDED if status_code < 400 else JobState.FAILED
+            job.finished = time.time()
+            job.headers = {}
+            job.add_event("INFO", "Finished with status %d in %.0fs" % (status_code, job.finished - job.started))
+            self.condition.notify_all()
+        self._save(job)
+        self._remove_request(job.id)
+
+    def _job_file(self, job_id):
+        return os.path.join(self.jobs_dir, job_id + ".json")
+
+    def _body_file(self, job_id):
+        return os.path.join(self.jobs_dir, job_id + ".body")
+
+    def _headers_file(self, job_id):
+        return os.path.join(self.jobs_dir, job_id + ".headers")
+
+    def _save(self, job, body=None, headers=None):
+        with self.condition:
+            data = job.to_dict(since=0)
+        try:
+            with self._save_lock:
+                _write_private(self._job_file(job.id), json.dumps(data).encode())
+                if body is not None:
+                    # Only needed to queue the job again after a restart; both carry credentials.
+                    _write_private(self._body_file(job.id), body)
+                    _write_private(self._headers_file(job.id), json.dumps(headers).encode())
+                self._saved_at[job.id] = time.monotonic()
+        except OSError as e:
+            logger.warning("Failed to persist job %s: %s" % (job.id, e))
+
+    def _remove_request(self, job_id):
+        for path in (self._body_file(job_id), self._headers_file(job_id)):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _read_headers(self, job_id):
+        try:
+            with open(self._headers_file(job_id)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _load(self):
+        for name in os.listdir(self.jobs_dir):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.jobs_dir, name)) as f:
+                    data = json.load(f)
+                job = Job.from_dict(data, data.get("headers") or self._read_headers(data["jobId"]))
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning("Skipping unreadable job file %s: %s" % (name, e))
+                continue
+            self.jobs[job.id] = job
+            if job.state == JobState.PENDING and os.path.isfile(self._body_file(job.id)):
+                with open(self._body_file(job.id), "rb") as f:
+                    body = f.read()
+                if "headers" in data:
+                    # Written before headers were kept apart, move them out of the job file.
+                    self._save(job, body, job.headers)
+                logger.info("Re-queueing job %s for %s %s" % (job.id, job.method, job.path))
+                self.executor.submit(self._run, job, body)
+                continue
+            if not job.done:
+                job.state = JobState.INTERRUPTED
+                job.finished = time.time()
+                job.add_event("ERROR", "Server restarted while the job was running")
+            if not job.done or "headers" in data:
+                job.headers = {}
+                self._save(job)
+            self._remove_request(job.id)
+        self._prune()
+
+    def _prune(self):
+        finished = sorted((job for job in self.jobs.values() if job.done), key=lambda job: job.created)
+        for job in finished[:max(0, len(self.jobs) - self.MAX_JOBS)]:
+            del self.jobs[job.id]
+            self._saved_at.pop(job.id, None)
+            for path in (self._job_file(job.id), self._job_file(job.id) + ".tmp", self._body_file(job.id),
+                         self._headers_file(job.id)):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+def _write_private(path, data):
+    """
+    Replace path with data, readable and writable by the owner only.
+    """
+    tmp = path + ".tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        # A leftover temporary file keeps its mode when reopened.
+        os.fchmod(f.fileno(), 0o600)
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class _JobLogHandler(logging.Handler):
+    """
+    Turns app log records emitted from a job thread into events of that job.
+    """
+
+    def __init__(self, manager):
+        super().__init__()
+        self.manager = manager
+
+    def emit(self, record):
+        if self.manager.current() is None:
+            return
+        try:
+            self.manager.record(record.levelname, record.getMessage())
+        except Exception:
+            self.handleError(record)
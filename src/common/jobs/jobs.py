@@ -0,0 +1,110 @@
+# Copyright 2021 VMware, Inc.
+# SPDX-License-Identifier: BSD-2-Clause
+
+import json
+
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+
+from common.jobs.job_manager import JobManager, JobState
+
+jobs = Blueprint("jobs", __name__, static_folder="jobs")
+
+JOBS_URL = "/api/tanzu/jobs"
+# Longest a status request may be held open waiting for new events.
+MAX_WAIT = 30
+# Headers not replayed into the background request.
+SKIPPED_HEADERS = ("Prefer", "Content-Length", "Host")
+
+
+@jobs.before_app_request
+def submit_async():
+    """
+    Any POST sent with "Prefer: respond-async" is run as a background job: the caller
+    gets 202 with the job id right away and follows the job through JOBS_URL.
+    """
+    if request.method != "POST" or "respond-async" not in request.headers.get("Prefer", ""):
+        return None
+    if request.path.startswith(JOBS_URL):
+        return None
+    headers = {key: value for key, value in request.headers.items() if key not in SKIPPED_HEADERS}
+    job = JobManager.of(current_app).submit(request.method, request.path, headers, request.get_data())
+    d = {
+        "responseType": "SUCCESS",
+        "msg": "Job " + job.id + " submitted for " + request.path,
+        "STATUS_CODE": 202,
+        "jobId": job.id
+    }
+    response = jsonify(d)
+    response.headers["Location"] = JOBS_URL + "/" + job.id
+    return response, 202
+
+
+@jobs.route(JOBS_URL, methods=['GET'])
+def list_jobs():
+    d = {
+        "responseType": "SUCCESS",
+        "msg": "Jobs listed",
+        "STATUS_CODE": 200,
+        "jobs": [job.to_dict() for job in JobManager.of(current_app).list()]
+    }
+    return jsonify(d), 200
+
+
+@jobs.route(JOBS_URL + "/<job_id>", methods=['GET'])
+def get_job(job_id):
+    """
+    Job state with the events after ?since=<event number>. With ?wait=<seconds> the
+    request is held until there are newer events or the job finished (long-poll).
+    """
+    manager = JobManager.of(current_app)
+    job = manager.get(job_id)
+    if job is None:
+        return job_not_found(job_id)
+    since = request.args.get("since", default=0, type=int)
+    wait = min(request.args.get("wait", default=0, type=float), MAX_WAIT)
+    d = {
+        "responseType": "SUCCESS",
+        "msg": "Job " + job.state,
+        "STATUS_CODE": 200,
+        "job": manager.wait(job, since, wait)
+    }
+    return jsonify(d), 200
+
+
+@jobs.route(JOBS_URL + "/<job_id>/events", methods=['GET'])
+def stream_job_events(job_id):
+    """
+    Server-sent events: one "log" event per progress event and a final "end" event
+    carrying the job result. Reconnecting clients resume after Last-Event-ID.
+    """
+    manager = JobManager.of(current_app)
+    job = manager.get(job_id)
+    if job is None:
+        return job_not_found(job_id)
+    since = int(request.headers.get("Last-Event-ID", request.args.get("since", 0)))
+
+    def events():
+        last = since
+        while True:
+            state = manager.wait(job, last, MAX_WAIT)
+            for event in state["events"]:
+                last = event["seq"]
+                yield "id: %d\nevent: log\ndata: %s\n\n" % (last, json.dumps(event))
+            if state["state"] in JobState.TERMINAL and last >= state["lastEvent"]:
+                del state["events"]
+                yield "event: end\ndata: %s\n\n" % json.dumps(state)
+                return
+            if not state["events"]:
+                yield ": keep-alive\n\n"
+
+    return Response(stream_with_context(events()), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache"})
+
+
+def job_not_found(job_id):
+    d = {
+        "responseType": "ERROR",
+        "msg": "No job with id " + job_id,
+        "STATUS_CODE": 404
+    }
+    return jsonify(d), 404
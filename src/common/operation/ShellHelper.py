@@ -6,13 +6,16 @@ import re
 from flask import current_app
 from subprocess import Popen, PIPE, STDOUT
 
+from common.util.kube_context import KubeContext
+
 
 def runShellCommandAndReturnOutput(fin):
     try:
         proc = subprocess.Popen(
             fin,
             stderr=subprocess.STDOUT,
-            stdout=subprocess.PIPE
+            stdout=subprocess.PIPE,
+            env=KubeContext.env()
         )
         output = proc.communicate()[0]
         if output.decode("utf-8").lower().__contains__("error"):
@@ -27,7 +30,7 @@ def runShellCommandAndReturnOutput(fin):
 
 def runProcess(fin):
     p = Popen(fin, stdout=PIPE,
-              stderr=STDOUT)
+              stderr=STDOUT, env=KubeContext.env())
     stream = ""
     stream2 = ""
     for line in p.stdout:
@@ -44,7 +47,7 @@ def runProcess(fin):
 
 def runProcessTmcMgmt(fin):
     p = Popen(fin, stdout=PIPE,
-              stderr=STDOUT)
+              stderr=STDOUT, env=KubeContext.env())
     stream = ""
     stream2 = ""
     for line in p.stdout:
@@ -63,7 +66,7 @@ def runProcessTmcMgmt(fin):
 def runShellCommandWithPolling(fin):
     try:
         proc = subprocess.Popen(
-            fin
+            fin, env=KubeContext.env()
         )
         proc.wait()
         output = proc.poll()
@@ -82,7 +85,8 @@ def runShellCommandAndReturnOutputAsList(fin):
         proc = subprocess.Popen(
             fin,
             stderr=subprocess.STDOUT,
-            stdout=subprocess.PIPE
+            stdout=subprocess.PIPE,
+            env=KubeContext.env()
         )
 
         output = proc.communicate()[0]
@@ -101,7 +105,8 @@ def runShellCommandAndReturnOutputAsListWithChangedDir(fin, dir):
         proc = subprocess.Popen(
             fin, cwd=dir,
             stderr=subprocess.STDOUT,
-            stdout=subprocess.PIPE
+            stdout=subprocess.PIPE,
+            env=KubeContext.env()
         )
         output = proc.communicate()[0]
         if output.decode("utf-8").lower().__contains__("error"):
@@ -116,8 +121,8 @@ def runShellCommandAndReturnOutputAsListWithChangedDir(fin, dir):
 
 def grabPipeOutputChagedDir(listMainCommand, listOfPipeCommand, dir):
     try:
-        ps = subprocess.Popen(listMainCommand, cwd=dir, stdout=subprocess.PIPE)
-        output = subprocess.check_output(listOfPipeCommand, cwd=dir, stdin=ps.stdout)
+        ps = subprocess.Popen(listMainCommand, cwd=dir, stdout=subprocess.PIPE, env=KubeContext.env())
+        output = subprocess.check_output(listOfPipeCommand, cwd=dir, stdin=ps.stdout, env=KubeContext.env())
         ps.wait()
         if output.decode("utf-8").lower().__contains__("error"):
             returnCode = 1
@@ -170,8 +175,8 @@ def grabIpAddress(listMainCommand, lisofPipeCommand, regex):
 
 def grabPipeOutput(listMainCommand, listOfPipeCommand):
     try:
-        ps = subprocess.Popen(listMainCommand, stdout=subprocess.PIPE)
-        output = subprocess.check_output(listOfPipeCommand, stdin=ps.stdout)
+        ps = subprocess.Popen(listMainCommand, stdout=subprocess.PIPE, env=KubeContext.env())
+        output = subprocess.check_output(listOfPipeCommand, stdin=ps.stdout, env=KubeContext.env())
         ps.wait()
         if output.decode("utf-8").lower().__contains__("error"):
             returnCode = 1
@@ -0,0 +1,265 @@
+# Copyright 2021 VMware, Inc.
+# SPDX-License-Identifier: BSD-2-Clause
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from pyVmomi import vim, vmodl
+
+logger = logging.getLogger(__name__)
+
+
+class InventoryCache:
+    """
+    Name, parent and inventory path of every managed entity of one vCenter connection,
+    fetched with a single PropertyCollector RetrieveContents call instead of walking
+    ContainerView results and their parents object by object.
+
+    Hits are served from the snapshot for up to TTL seconds. A lookup that misses, or a
+    lookup on an older snapshot, first asks a dedicated PropertyCollector (without
+    blocking) whether anything changed and rebuilds only if it did, so objects created
+    behind our back by govc or the UI are still found. Callers that change the
+    inventory themselves call invalidate().
+    """
+    TTL = 30
+    MAX_CONNECTIONS = 16
+    _caches = OrderedDict()
+    _lock = threading.Lock()
+
+    def __init__(self, content, ttl=TTL):
+        self.content = content
+        self.ttl = ttl
+        self.entries = []
+        self.paths = {}
+        self.by_path = {}
+        self.by_name = {}
+        self.built_at = None
+        self._view = None
+        self._collector = None
+        self._filter = None
+        self._version = ""
+        self._refresh_lock = threading.Lock()
+
+    @classmethod
+    def of(cls, si_or_obj):
+        """
+        Shared cache for the connection behind a ServiceInstance, its content or any
+        managed object (e.g. a Datacenter) obtained from it.
+        """
+        if isinstance(si_or_obj, vim.ServiceInstance):
+            content = si_or_obj.RetrieveContent()
+        elif isinstance(si_or_obj, vim.ServiceInstanceContent):
+            content = si_or_obj
+        else:
+            content = None
+        stub = content.rootFolder._stub if content is not None else si_or_obj._stub
+        with cls._lock:
+            cache = cls._caches.get(stub)
+            if cache is None:
+                if content is None:
+                    content = vim.ServiceInstance("ServiceInstance", stub).RetrieveContent()
+                cache = cls(content)
+                cls._caches[stub] = cache
+                if len(cls._caches) > cls.MAX_CONNECTIONS:
+                    cls._caches.popitem(last=False)[1].close()
+            else:
+                cls._caches.move_to_end(stub)
+            return cache
+
+    @classmethod
+    def invalidate_all(cls):
+        with cls._lock:
+            for cache in cls._caches.values():
+                cache.invalidate()
+
+    def invalidate(self):
+        with self._refresh_lock:
+            self.built_at = None
+
+    def close(self):
+        """
+        Destroy the change collector, its filter and view on the server.
+        """
+        with self._refresh_lock:
+            self._destroy_collector()
+
+    def find(self, vimtype, name=None, under=None):
+        """
+        First object of the given types whose inventory path ends with name, or any
+        object of the types when name is None, optionally below entity `under`.
+        """
+        for revalidate in (False, True):
+            for path, obj in self.objects(vimtype, under, revalidate):
+                if not name or path.endswith(name):
+                    return obj
+        return None
+
+    def find_by_name(self, vimtype, name, under=None):
+        """
+        First object of the given types named exactly name, optionally below entity `under`.
+        """
+        types = tuple(vimtype)
+        for revalidate in (False, True):
+            self._snapshot(revalidate)
+            prefix = self._prefix(under)
+            for path, obj in self.by_name.get(name, []):
+                if isinstance(obj, types) and (prefix is None or path.startswith(prefix)):
+                    return obj
+        return None
+
+    def find_by_path(self, path):
+        """
+        Object at the given inventory path, e.g. "/dc/host/cluster/Resources/pool".
+        """
+        for revalidate in (False, True):
+            self._snapshot(revalidate)
+            obj = self.by_path.get(path)
+            if obj is not None:
+                return obj
+        return None
+
+    def objects(self, vimtype, under=None, revalidate=False):
+        """
+        (inventory path, object) pairs of the given types, optionally below entity `under`.
+        """
+        types = tuple(vimtype)
+        self._snapshot(revalidate)
+        prefix = self._prefix(under)
+        return [(path, obj) for path, obj in self.entries
+                if isinstance(obj, types) and (prefix is None or path.startswith(prefix))]
+
+    def path_of(self, entity):
+        self._snapshot()
+        return self.paths.get(entity._moId)
+
+    def _prefix(self, under):
+        if under is None:
+            return None
+        path = self.paths.get(under._moId)
+        return path + "/" if path is not None else "\0"
+
+    def _snapshot(self, revalidate=False):
+        with self._refresh_lock:
+            if self.built_at is None:
+                self._build()
+            elif revalidate or time.monotonic() - self.built_at > self.ttl:
+                if self._changed():
+                    self._build()
+                else:
+                    self.built_at = time.monotonic()
+
+    def _filter_spec(self, view):
+        traversal = vmodl.query.PropertyCollector.TraversalSpec(name="traverseEntities", path="view",
+                                                                skip=False, type=vim.view.ContainerView)
+        obj_spec = vmodl.query.PropertyCollector.ObjectSpec(obj=view, skip=True, selectSet=[traversal])
+        prop_spec = vmodl.query.PropertyCollector.PropertySpec(type=vim.ManagedEntity, all=False,
+                                                               pathSet=["name", "parent"])
+        return vmodl.query.PropertyCollector.FilterSpec(objectSet=[obj_spec], propSet=[prop_spec])
+
+    def _create_view(self):
+        return self.content.viewManager.CreateContainerView(self.content.rootFolder, [vim.ManagedEntity], True)
+
+    def _retrieve(self):
+        view = self._create_view()
+        try:
+            result = self.content.propertyCollector.RetrieveContents([self._filter_spec(view)])
+        finally:
+            view.Destroy()
+        return {obj_content.obj._moId: (obj_content.obj, {prop.name: prop.val for prop in obj_content.propSet})
+                for obj_content in result}
+
+    def _build(self):
+        start = time.monotonic()
+        # The first update of a new change collector holds every object, use it rather than reading
+        # the inventory a second time. Otherwise catch the collector up first, so anything changing
+        # from here on shows up in the next check.
+        contents = {} if self._collector is None else None
+        self._changed(contents)
+        if not contents:
+            contents = self._retrieve()
+        names = {}
+        parents = {}
+        objects = OrderedDict()
+        for mo_id, (obj, props) in contents.items():
+            objects[mo_id] = obj
+            if "name" in props:
+                names[mo_id] = props["name"]
+            parent = props.get("parent")
+            parents[mo_id] = parent._moId if parent is not None else None
+        paths = {}
+        for mo_id in objects:
+            # Inventory paths start below the root folder, as with searchIndex.FindByInventoryPath.
+            chain = []
+            current = mo_id
+            while current in names and current not in paths:
+                chain.append(current)
+                current = parents.get(current)
+            prefix = paths.get(current, "")
+            for link in reversed(chain):
+                prefix = prefix + "/" + names[link]
+                paths[link] = prefix
+        entries = []
+        by_name = {}
+        for mo_id, obj in objects.items():
+            if mo_id not in paths:
+                continue
+            entries.append((paths[mo_id], obj))
+            by_name.setdefault(names[mo_id], []).append((paths[mo_id], obj))
+        self.entries = entries
+        self.paths = paths
+        self.by_path = dict(entries)
+        self.by_name = by_name
+        self.built_at = time.monotonic()
+        logger.debug("Indexed %d vCenter inventory objects in %.2fs", len(entries), self.built_at - start)
+
+    def _changed(self, contents=None):
+        """
+        Whether any name or parent changed since the last check, asked of a dedicated
+        PropertyCollector without blocking. Objects reported as new are added to
+        contents when given.
+        """
+        try:
+            if self._collector is None:
+                self._view = self._create_view()
+                self._collector = self.content.propertyCollector.CreatePropertyCollector()
+                self._filter = self._collector.CreateFilter(self._filter_spec(self._view), partialUpdates=True)
+            options = vmodl.query.PropertyCollector.WaitOptions(maxWaitSeconds=0)
+            changed = False
+            update = self._collector.WaitForUpdatesEx(self._version, options)
+            while update is not None:
+                changed = True
+                self._version = update.version
+                if contents is not None:
+                    for filter_update in update.filterSet:
+                        for obj_update in filter_update.objectSet:
+                            if obj_update.kind == "enter":
+                                contents[obj_update.obj._moId] = (obj_update.obj, {change.name: change.val
+                                                                                   for change in obj_update.changeSet})
+                if not update.truncated:
+                    break
+                update = self._collector.WaitForUpdatesEx(self._version, options)
+            return changed
+        except Exception as e:
+            logger.debug("vCenter inventory change check failed: " + str(e))
+            if contents is not None:
+                contents.clear()
+            self._destroy_collector()
+            return True
+
+    def _destroy_collector(self):
+        for obj in (self._filter, self._collector, self._view):
+            if obj is None:
+                continue
+            try:
+                if obj is self._collector:
+                    obj.DestroyPropertyCollector()
+                else:
+                    obj.Destroy()
+            except Exception as e:
+                logger.debug("Failed to destroy vCenter inventory collector object: " + str(e))
+        self._filter = None
+        self._collector = None
+        self._view = None
+        self._version = ""
@@ -2,6 +2,7 @@
 # Copyright 2021 VMware, Inc.
 # SPDX-License-Identifier: BSD-2-Clause
 
+import logging
 import os
 import os.path
 import ssl
@@ -11,48 +12,30 @@ import time
 import argparse
 from flask import current_app
 
-from threading import Timer
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from http.client import HTTPSConnection
+from threading import Lock, Timer
+from urllib.parse import urlparse
 from six.moves.urllib.request import Request, urlopen
 
 from pyVmomi import vim, vmodl
-from pyVim import connect
-from pyVim.connect import Disconnect
-import atexit
 
 sys.path.append("../")
 from .constants import SegmentsName
+from .inventory_cache import InventoryCache
+from .vcenter_session import VcenterSessionPool
 
 __author__ = 'rupesh'
 
+logger = logging.getLogger(__name__)
+
 
 def get_obj(content, vimtype, name):
     """
     Return an object by name, if name is None the
     first found object is returned
     """
-    obj = None
-    container = content.viewManager.CreateContainerView(
-        content.rootFolder, vimtype, True)
-    if container is not None:
-        for host in container.view:
-            rp = host.name
-            if rp:
-                folder_name = rp
-                fp = host.parent
-                while fp is not None and fp.name is not None and fp != content.rootFolder:
-                    folder_name = fp.name + '/' + folder_name
-                    try:
-                        fp = fp.parent
-                    except BaseException:
-                        break
-                folder_name = '/' + folder_name
-                if name:
-                    if str(folder_name).endswith(name):
-                        return content.searchIndex.FindByInventoryPath(folder_name)
-                else:
-                   return content.searchIndex.FindByInventoryPath(folder_name)
-
-    return obj
+    return InventoryCache.of(content).find(vimtype, name)
 
 
 def get_obj_particular_folder(content, vimtype, folder, datacenter, si, name):
@@ -89,9 +72,8 @@ def deploySeOva(vcenterhost, username, password, vm_name, folder, datacenter_nam
     si = None
     try:
         print(f"Trying to connect to VCENTER SERVER . . .{vcenterhost}")
-        si = connect.SmartConnectNoSSL(host=vcenterhost, user=username, pwd=password)
+        si = VcenterSessionPool.get(host=vcenterhost, user=username, pwd=password)
     except IOError as e:
-        atexit.register(Disconnect, si)
         raise AssertionError("Failed to connect to vcenter.")
 
     print(f"Connected to VCENTER SERVER ! {vcenterhost}")
@@ -178,9 +160,8 @@ def deploySeOva(vcenterhost, username, password, vm_name, folder, datacenter_nam
 def getSi(vcenterhost, username, password):
     si = None
     try:
-        si = connect.SmartConnectNoSSL(host=vcenterhost, user=username, pwd=password)
+        si = VcenterSessionPool.get(host=vcenterhost, user=username, pwd=password)
     except IOError as e:
-        atexit.register(Disconnect, si)
         raise AssertionError("Failed to connect to vcenter.")
     return si
 
@@ -309,96 +290,49 @@ def get_dc_objs(si, name):
 
 
 def get_dc(si, name):
-    content = si.RetrieveContent()
-    container = content.viewManager.CreateContainerView(
-        content.rootFolder, [vim.Datacenter], True)
+    cache = InventoryCache.of(si)
     if name is not None:
-        try:
-            return content.searchIndex.FindByInventoryPath("/" + name)
-        finally:
-            container.Destroy()
+        return cache.find_by_path("/" + name)
     else:
-        dc_name = []
-        try:
-            for dc in container.view:
-                rp = dc.name
-                if rp:
-                    folder_name = rp
-                    fp = dc.parent
-                    while fp is not None and fp.name is not None and fp != si.content.rootFolder:
-                        folder_name = fp.name + '/' + folder_name
-                        try:
-                            fp = fp.parent
-                        except BaseException:
-                            break
-                    folder_name = '/' + folder_name
-                    first_dc = folder_name.strip("/")
-                    if first_dc:
-                        dc_name.append(first_dc)
-            if dc_name:
-                return dc_name
-            else:
-                current_app.logger.info("No datacenter found")
-                return None
-        finally:
-            container.Destroy()
+        dc_name = [path.strip("/") for path, dc in cache.objects([vim.Datacenter]) if path.strip("/")]
+        if dc_name:
+            return dc_name
+        else:
+            current_app.logger.info("No datacenter found")
+            return None
 
 
 def get_rp(si, datacenter, name):
     """
     Get a resource pool in the datacenter by its names.
     """
-    view_manager = si.content.viewManager
-    container_view = view_manager.CreateContainerView(datacenter, [vim.ResourcePool], True)
+    cache = InventoryCache.of(si)
     if name is not None:
-        try:
-            for resource_pool in container_view.view:
-                if resource_pool.name == name:
-                    return resource_pool
-        finally:
-            container_view.Destroy()
+        resource_pool = cache.find_by_name([vim.ResourcePool], name, under=datacenter)
+        if resource_pool is not None:
+            return resource_pool
         raise Exception("Failed to find resource pool %s in datacenter %s" %
                         (name, datacenter.name))
     else:
-        try:
-            rp_name = []
-            resource_pools = container_view.view
-            for resource_pool in container_view.view:
-                rp = resource_pool.name
-                if rp:
-                    folder_name = rp
-                    fp = resource_pool.parent
-                    while fp is not None and fp.name is not None and fp != si.content.rootFolder:
-                        folder_name = fp.name + '/' + folder_name
-                        try:
-                            fp = fp.parent
-                        except BaseException:
-                            break
-                    folder_name = '/' + folder_name
-                    first_rp = folder_name[folder_name.find("/Resources") + 11:]
-                    if first_rp:
-                        rp_name.append(first_rp)
-            if rp_name:
-                return rp_name
-            else:
-                current_app.logger.info("No resource pool found in datacenter " + datacenter.name)
-                return None
-        finally:
-            container_view.Destroy()
+        rp_name = []
+        for path, resource_pool in cache.objects([vim.ResourcePool], under=datacenter):
+            first_rp = path[path.find("/Resources") + 11:]
+            if first_rp:
+                rp_name.append(first_rp)
+        if rp_name:
+            return rp_name
+        else:
+            current_app.logger.info("No resource pool found in datacenter " + datacenter.name)
+            return None
 
 
 def get_folder(si, datacenter, name):
     """
     Get a resource pool in the datacenter by its names.
     """
-    view_manager = si.content.viewManager
-    container_view = view_manager.CreateContainerView(datacenter, [vim.Folder], True)
-    try:
-        for resource_pool in container_view.view:
-            if resource_pool.name == name:
-                return resource_pool
-    finally:
-        container_view.Destroy()
+    folder = InventoryCache.of(si).find_by_name([vim.Folder], name, under=datacenter)
+    if folder is not None:
+        return folder
     raise Exception("Failed to find resource pool %s in datacenter %s" %
                     (name, datacenter.name))
 
@@ -427,34 +361,18 @@ def get_ds(si, datacenter, name):
     """
     Pick a cluster by its name.
     """
-    view_manager = si.content.viewManager
-    container = view_manager.CreateContainerView(datacenter, [vim.Datastore], True)
-    try:
-        h_name = []
-        if container is not None:
-            for host in container.view:
-                rp = host.name
-                if rp:
-                    folder_name = rp
-                    fp = host.parent
-                    while fp is not None and fp.name is not None and fp != si.content.rootFolder:
-                        folder_name = fp.name + '/' + folder_name
-                        try:
-                            fp = fp.parent
-                        except BaseException:
-                            break
-                    folder_name = '/' + folder_name
-                    if name:
-                        if str(folder_name).endswith(name):
-                            content = si.RetrieveContent()
-                            return content.searchIndex.FindByInventoryPath(folder_name)
-                    first_rp = folder_name[folder_name.find("/datastore") + 11:]
-                    if first_rp:
-                        h_name.append(first_rp.strip("/"))
-        if h_name:
-            return h_name
-    finally:
-        container.Destroy()
+    cache = InventoryCache.of(si)
+    if name:
+        datastore = cache.find([vim.Datastore], name, under=datacenter)
+        if datastore is not None:
+            return datastore
+    h_name = []
+    for path, datastore in cache.objects([vim.Datastore], under=datacenter):
+        first_rp = path[path.find("/datastore") + 11:]
+        if first_rp:
+            h_name.append(first_rp.strip("/"))
+    if h_name:
+        return h_name
 
 
 def get_largest_free_ds(datacenter):
@@ -495,6 +413,8 @@ class OvfHandler(object):
     It processes the tarfile, matches disk keys to files and
     uploads the disks, while keeping the progress up to date for the lease.
     """
+    UPLOAD_WORKERS = 4
+    CHUNK_SIZE = 1024 * 1024
 
     def __init__(self, ovafile):
         """
@@ -502,6 +422,9 @@ class OvfHandler(object):
         processing the files and reading the embedded ovf file.
         """
         self.handle = self._create_file_handle(ovafile)
+        self.progress_lock = Lock()
+        self.uploaded = 0
+        self.total = 0
         self.tarfile = tarfile.open(fileobj=self.handle)
         ovffilename = list(filter(lambda x: x.endswith(".ovf"),
                                   self.tarfile.getnames()))[0]
@@ -543,14 +466,29 @@ class OvfHandler(object):
 
     def upload_disks(self, lease, host):
         """
-        Uploads all the disks, with a progress keep-alive.
+        Uploads all the disks, up to UPLOAD_WORKERS at a time, with a progress keep-alive.
         """
         self.lease = lease
+        self.uploaded = 0
+        self.total = sum(self.get_disk_size(fileItem) for fileItem in self.spec.fileItem)
         try:
             self.start_timer()
-            for fileItem in self.spec.fileItem:
-                self.upload_disk(fileItem, lease, host)
+            workers = max(1, min(self.UPLOAD_WORKERS, len(self.spec.fileItem)))
+            if not isinstance(self.handle, FileHandle):
+                # A remote OVA can only be read front to back.
+                workers = 1
+            executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ova-upload")
+            uploads = [executor.submit(self.upload_disk, fileItem, lease, host) for fileItem in self.spec.fileItem]
+            try:
+                for upload in as_completed(uploads):
+                    upload.result()
+            finally:
+                # On failure, do not wait for the other disks: aborting the lease below ends their uploads.
+                for upload in uploads:
+                    upload.cancel()
+                executor.shutdown(wait=False)
             lease.Complete()
+            logger.info("Finished uploading %d disks (%d bytes)." % (len(self.spec.fileItem), self.uploaded))
             print("Finished deploy successfully.")
             return 0
         except vmodl.MethodFault as ex:
@@ -564,21 +502,55 @@ class OvfHandler(object):
 
     def upload_disk(self, file_item, lease, host):
         """
-        Upload an individual disk. Passes the file handle of the
-        disk directly to the urlopen request.
+        Upload an individual disk, streaming it in CHUNK_SIZE reads straight
+        from its offset in the OVA to the lease device url.
         """
-        ovffile = self.get_disk(file_item)
+        ovffile = self.get_disk_reader(file_item)
         if ovffile is None:
             return
         device_url = self.get_device_url(file_item, lease)
-        url = device_url.url.replace('*', host)
-        headers = {'Content-length': get_tarfile_size(ovffile)}
+        url = urlparse(device_url.url.replace('*', host))
         if hasattr(ssl, '_create_unverified_context'):
             ssl_context = ssl._create_unverified_context()
         else:
             ssl_context = None
-        req = Request(url, ovffile, headers)
-        urlopen(req, context=ssl_context)
+        connection = HTTPSConnection(url.netloc, context=ssl_context, blocksize=self.CHUNK_SIZE)
+        try:
+            headers = {'Content-Length': str(ovffile.size), 'Content-Type': 'application/x-vnd.vmware-streamVmdk'}
+            connection.request("POST", url.path + ("?" + url.query if url.query else ""), ovffile, headers)
+            response = connection.getresponse()
+            response.read()
+            if response.status >= 300:
+                raise Exception("Upload of %s failed: %s %s" % (file_item.path, response.status, response.reason))
+        finally:
+            connection.close()
+
+    def get_disk_size(self, file_item):
+        if file_item.path not in self.tarfile.getnames():
+            return 0
+        return self.tarfile.getmember(file_item.path).size
+
+    def get_disk_reader(self, file_item):
+        """
+        Reader for one disk that reports every chunk read to the aggregate progress.
+        Local OVAs are read at the member's offset, so several disks can be read at once.
+        """
+        if file_item.path not in self.tarfile.getnames():
+            return None
+        member = self.tarfile.getmember(file_item.path)
+        if isinstance(self.handle, FileHandle):
+            return TarMemberReader(self.handle.fh.fileno(), member.offset_data, member.size, self.add_progress)
+        return TarMemberReader(None, 0, member.size, self.add_progress, self.tarfile.extractfile(member))
+
+    def add_progress(self, amount):
+        with self.progress_lock:
+            self.uploaded += amount
+
+    def progress(self):
+        with self.progress_lock:
+            if not self.total:
+                return 0
+            return int(100.0 * self.uploaded / self.total)
 
     def start_timer(self):
         """
@@ -591,16 +563,49 @@ class OvfHandler(object):
         Update the progress and reschedule the timer if not complete.
         """
         try:
-            prog = self.handle.progress()
+            prog = self.progress()
             self.lease.Progress(prog)
             if self.lease.state not in [vim.HttpNfcLease.State.done,
                                         vim.HttpNfcLease.State.error]:
                 self.start_timer()
-            sys.stderr.write("Progress: %d%%\r" % prog)
+            logger.info("Upload progress: %d%% (%d of %d bytes)" % (prog, self.uploaded, self.total))
         except Exception:  # Any exception means we should stop updating progress.
             pass
 
 
+class TarMemberReader(object):
+    """
+    Read-only view of one member of the OVA tar. With a file descriptor it reads
+    with os.pread at the member's offset, so readers for different disks never
+    share a file position and can be read from concurrently.
+    """
+
+    def __init__(self, fd, offset, size, on_read, fileobj=None):
+        self.fd = fd
+        self.offset = offset
+        self.size = size
+        self.position = 0
+        self.on_read = on_read
+        self.fileobj = fileobj
+
+    def __len__(self):
+        return self.size
+
+    def read(self, amount=-1):
+        remaining = self.size - self.position
+        if amount is None or amount < 0 or amount > remaining:
+            amount = remaining
+        if amount == 0:
+            return b""
+        if self.fileobj is not None:
+            data = self.fileobj.read(amount)
+        else:
+            data = os.pread(self.fd, amount, self.offset + self.position)
+        self.position += len(data)
+        self.on_read(len(data))
+        return data
+
+
 class FileHandle(object):
     def __init__(self, filename):
         self.filename = filename
@@ -698,7 +703,7 @@ def createResourcePool(vcenterHostName, vceneterUser, vcenterPassword, clusterNa
     si = None
     create = False
     try:
-        si = connect.SmartConnectNoSSL(host=vcenterHostName, user=vceneterUser, pwd=vcenterPassword)
+        si = VcenterSessionPool.get(host=vcenterHostName, user=vceneterUser, pwd=vcenterPassword)
         content = si.RetrieveContent()
         cluster = get_obj(content, [vim.ClusterComputeResource], clusterName)
 
@@ -712,7 +717,7 @@ def createResourcePool(vcenterHostName, vceneterUser, vcenterPassword, clusterNa
                 path = "/" + data_center + "/host/" + clusterName + "/Resources/" + parentResourcePool + "/" + name
             else:
                 path = "/" + data_center + "/host/" + clusterName + "/Resources/" + name
-            obj = content.searchIndex.FindByInventoryPath(path)
+            obj = InventoryCache.of(content).find_by_path(path)
             if obj is None:
                 create = True
         if create:
@@ -735,71 +740,68 @@ def createResourcePool(vcenterHostName, vceneterUser, vcenterPassword, clusterNa
             configSpec.memoryAllocation = memAllocationInfo
             if parentResourcePool:
                 path = "/" + data_center + "/host/" + clusterName + "/Resources/" + parentResourcePool
-                resource_pool_obj = content.searchIndex.FindByInventoryPath(path)
+                resource_pool_obj = InventoryCache.of(content).find_by_path(path)
                 configSpec.entity = resource_pool_obj
                 resource_pool_obj.CreateResourcePool(name, configSpec)
             else:
                 configSpec.entity = cluster
                 cluster.resourcePool.CreateResourcePool(name, configSpec)
+            InventoryCache.of(content).invalidate()
             return "SUCCESS"
         else:
             return None
     except Exception as e:
-        atexit.register(Disconnect, si)
         raise AssertionError("Operation failed " + str(e))
-    finally:
-        atexit.register(Disconnect, si)
 
 
 def create_folder(vcenterHostName, vceneterUser, vcenterPassword, datacenter_name, folder_name):
     si = None
     try:
-        si = connect.SmartConnectNoSSL(host=vcenterHostName, user=vceneterUser, pwd=vcenterPassword)
+        si = VcenterSessionPool.get(host=vcenterHostName, user=vceneterUser, pwd=vcenterPassword)
         content = si.RetrieveContent()
         datacenter = get_dc(si, datacenter_name)
         destfolder = get_obj(content, [vim.Folder], folder_name)
         if destfolder is None:
             datacenter.vmFolder.CreateFolder(folder_name)
+            InventoryCache.of(content).invalidate()
             return "SUCCESS"
         else:
             return None
     except Exception as e:
-        atexit.register(Disconnect, si)
         raise AssertionError("Operation failed " + str(e))
-    finally:
-        atexit.register(Disconnect, si)
 
 
 def getNetwork(datacenter, name):
+    """
+    Networks directly in the datacenter network folder or one folder below it.
+    """
+    cache = InventoryCache.of(datacenter)
+    datacenter_path = cache.path_of(datacenter)
+    network_folder = cache.find_by_path(datacenter_path + "/network") if datacenter_path else None
+    if network_folder is None:
+        network_folder = datacenter.networkFolder
     if name is not None:
-        networks = datacenter.networkFolder.childEntity
-        for network in networks:
-            if network.name == name:
-                return network
-            elif hasattr(network, 'childEntity'):
-                ports = network.childEntity
-                for item in ports:
-                    if item.name == name:
-                        return item
+        for revalidate in (False, True):
+            for path, network in _folder_networks(cache, network_folder, revalidate):
+                if path.rsplit("/", 1)[1] == name:
+                    return network
         raise Exception('Failed to find port named %s' % name)
     else:
-        network_list = []
         try:
-            for port in datacenter.networkFolder.childEntity:
-                if hasattr(port, 'childEntity'):
-                    ports = port.childEntity
-                    for item in ports:
-                        network_list.append(item.name)
-                else:
-                    network_list.append(port.name)
-            return network_list
+            return [path.rsplit("/", 1)[1] for path, network in _folder_networks(cache, network_folder)]
         except:
             raise Exception('Encountered errors while fetching networks %s' % datacenter.name)
 
 
+def _folder_networks(cache, network_folder, revalidate=False):
+    networks = cache.objects([vim.Network], under=network_folder, revalidate=revalidate)
+    depth = cache.path_of(network_folder).count("/") + 2
+    return [(path, network) for path, network in networks if path.count("/") <= depth]
+
+
 def getDvPortGroupId(vcenterIp, vcenterUser, vcenterPassword, networkName, vc_data_center):
     try:
-        si = connect.SmartConnectNoSSL(host=vcenterIp, user=vcenterUser, pwd=vcenterPassword)
+        si = VcenterSessionPool.get(host=vcenterIp, user=vcenterUser, pwd=vcenterPassword)
         try:
             datacenter = get_dc(si, vc_data_center)
         except Exception as e:
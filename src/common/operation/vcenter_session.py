@@ -0,0 +1,177 @@
+# Copyright 2021 VMware, Inc.
+# SPDX-License-Identifier: BSD-2-Clause
+
+import atexit
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from pyVim import connect
+from pyVim.connect import Disconnect
+
+logger = logging.getLogger(__name__)
+
+
+class _PooledSession:
+    def __init__(self, si):
+        self.si = si
+        self.content = None
+        self.checked_at = time.monotonic()
+        self.used_at = time.monotonic()
+        self.leases = 0
+        # Set once the entry has left the pool; the last lease to exit logs it out.
+        self.retired = False
+        self.lock = threading.Lock()
+
+
+class VcenterSessionPool:
+    """
+    One authenticated ServiceInstance per (host, user, port, password), shared by every
+    caller instead of a SmartConnect per helper call. Before a pooled session is handed
+    out again it is checked with a single cheap call and transparently replaced when
+    vCenter has expired it. All sessions are logged out at exit.
+
+    A new password gets a session of its own, so a session is never logged out under
+    a caller that is still using it; the one for the old password is dropped like any
+    other idle session.
+
+    MAX_SESSIONS is a soft cap. To make room, the least recently used session that is
+    idle is logged out: no lease() is open on it and get() has not handed it out for
+    IDLE_TIMEOUT seconds. While no session is idle the pool grows past the limit, with
+    a warning, and shrinks back on a later call.
+    """
+    MAX_SESSIONS = 8
+    # Sessions handed out by get() within this many seconds may still be in use by their caller.
+    IDLE_TIMEOUT = 300
+    # Sessions handed out within this many seconds of their last check are not re-checked.
+    HEALTH_CHECK_INTERVAL = 10
+    _sessions = OrderedDict()
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, host, user, pwd, port=443):
+        return cls._acquire(host, user, pwd, port, lease=False)[1]
+
+    @classmethod
+    @contextmanager
+    def lease(cls, host, user, pwd, port=443):
+        """
+        Pooled session that is not logged out to make room until the block exits.
+        """
+        entry, si = cls._acquire(host, user, pwd, port, lease=True)
+        try:
+            yield si
+        finally:
+            with cls._lock:
+                entry.leases -= 1
+                entry.used_at = time.monotonic()
+                retired = entry.retired and entry.leases == 0
+            if retired and entry.si is not None:
+                cls._logout(entry.si)
+
+    @classmethod
+    def _acquire(cls, host, user, pwd, port, lease):
+        key = (str(host), user, int(port), hashlib.sha256(str(pwd).encode()).hexdigest())
+        with cls._lock:
+            entry = cls._sessions.get(key)
+            if entry is None:
+                entry = _PooledSession(None)
+                cls._sessions[key] = entry
+            cls._sessions.move_to_end(key)
+            entry.used_at = time.monotonic()
+            if lease:
+                entry.leases += 1
+            evicted = cls._evict()
+        for session in evicted:
+            cls._logout(session)
+        try:
+            return entry, cls._connect(entry, host, user, pwd, port)
+        except Exception:
+            if lease:
+                with cls._lock:
+                    entry.leases -= 1
+            raise
+
+    @classmethod
+    def _connect(cls, entry, host, user, pwd, port):
+        with entry.lock:
+            if entry.si is not None and not cls._alive(entry):
+                # vCenter has already ended this session, so no caller can still be using it.
+                cls._logout(entry.si)
+                entry.si = None
+            if entry.si is None:
+                start = time.monotonic()
+                entry.si = connect.SmartConnectNoSSL(host=str(host), user=user, pwd=pwd, port=int(port))
+                entry.content = entry.si.RetrieveContent()
+                entry.checked_at = time.monotonic()
+                logger.debug("Logged in to %s as %s in %.2fs", host, user, entry.checked_at - start)
+            return entry.si
+
+    @classmethod
+    def release(cls, host, user, port=443):
+        """
+        Drop the pooled sessions for (host, user). Sessions with no open lease() are
+        logged out now, the others when their last lease() exits.
+        """
+        idle = []
+        with cls._lock:
+            for key in [key for key in cls._sessions if key[:3] == (str(host), user, int(port))]:
+                entry = cls._sessions.pop(key)
+                entry.retired = True
+                if entry.leases == 0 and entry.si is not None:
+                    idle.append(entry.si)
+        for si in idle:
+            cls._logout(si)
+
+    @classmethod
+    def close_all(cls):
+        with cls._lock:
+            entries = list(cls._sessions.values())
+            cls._sessions.clear()
+        for entry in entries:
+            if entry.si is not None:
+                cls._logout(entry.si)
+
+    @classmethod
+    def _evict(cls):
+        evicted = []
+        now = time.monotonic()
+        idle = [key for key, entry in cls._sessions.items()
+                if entry.leases == 0 and now - entry.used_at >= cls.IDLE_TIMEOUT]
+        excess = len(cls._sessions) - cls.MAX_SESSIONS
+        for key in idle[:max(0, excess)]:
+            entry = cls._sessions.pop(key)
+            entry.retired = True
+            if entry.si is not None:
+                evicted.append(entry.si)
+        if excess > len(idle):
+            logger.warning("%d vCenter sessions in use, over the limit of %d",
+                           len(cls._sessions), cls.MAX_SESSIONS)
+        return evicted
+
+    @classmethod
+    def _alive(cls, entry):
+        if time.monotonic() - entry.checked_at < cls.HEALTH_CHECK_INTERVAL:
+            return True
+        try:
+            # CurrentTime() also answers anonymous callers, so ask for the session itself.
+            if entry.content.sessionManager.currentSession is None:
+                return False
+            entry.checked_at = time.monotonic()
+            return True
+        except Exception as e:
+            logger.debug("Pooled vCenter session is no longer valid: " + str(e))
+            return False
+
+    @staticmethod
+    def _logout(si):
+        try:
+            Disconnect(si)
+        except Exception as e:
+            logger.debug("Failed to log out vCenter session: " + str(e))
+
+
+atexit.register(VcenterSessionPool.close_all)
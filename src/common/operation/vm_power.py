@@ -0,0 +1,122 @@
+# Copyright 2021 VMware, Inc.
+# SPDX-License-Identifier: BSD-2-Clause
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pyVmomi import vim, vmodl
+
+logger = logging.getLogger(__name__)
+
+
+class VmPowerResult:
+    def __init__(self, name, state=None, elapsed=None, error=None):
+        self.name = name
+        self.state = state
+        self.elapsed = elapsed
+        self.error = error
+
+    def __bool__(self):
+        return self.error is None
+
+
+class VmPowerOrchestrator:
+    """
+    Powers VMs off (guest shutdown) or on in waves of at most `concurrency` VMs: all VMs
+    of a wave get their request at once, then the wave waits for every VM to reach the
+    target power state through a PropertyCollector filter on runtime.powerState instead
+    of sleeping a fixed delay per VM. VMs may come from different connections (e.g.
+    one ESXi host each); every connection gets its own collector.
+    """
+    CONCURRENCY = 4
+    TIMEOUT = 600
+
+    def __init__(self, concurrency=CONCURRENCY, timeout=TIMEOUT, log=None):
+        self.concurrency = max(1, int(concurrency))
+        self.timeout = timeout
+        self.log = log or logger
+
+    def shutdown(self, vms):
+        return self._run(vms, vim.VirtualMachinePowerState.poweredOff, lambda vm: vm.ShutdownGuest())
+
+    def power_on(self, vms):
+        return self._run(vms, vim.VirtualMachinePowerState.poweredOn, lambda vm: vm.PowerOnVM_Task())
+
+    def _run(self, vms, target, request_power_change):
+        results = []
+        for start in range(0, len(vms), self.concurrency):
+            wave = vms[start:start + self.concurrency]
+            issued = {}
+            for vm in wave:
+                name = vm.summary.config.name
+                try:
+                    if vm.runtime.powerState == target:
+                        self.log.info("VM %s is already %s" % (name, target))
+                        results.append(VmPowerResult(name, target, 0.0))
+                        continue
+                    self.log.info("Requesting %s for VM %s" % (target, name))
+                    request_power_change(vm)
+                    issued[vm._moId] = (vm, name, time.monotonic())
+                except vmodl.MethodFault as error:
+                    self.log.error("Failed to request %s for VM %s: %s" % (target, name, error.msg))
+                    results.append(VmPowerResult(name, error=error.msg))
+            results.extend(self._wait_wave(list(issued.values()), target))
+        for result in results:
+            if result:
+                self.log.info("VM %s reached %s after %.1fs" % (result.name, result.state, result.elapsed))
+        return results
+
+    def _wait_wave(self, issued, target):
+        if not issued:
+            return []
+        by_connection = {}
+        for entry in issued:
+            by_connection.setdefault(entry[0]._stub, []).append(entry)
+        with ThreadPoolExecutor(max_workers=len(by_connection), thread_name_prefix="vm-power") as executor:
+            waits = [executor.submit(self._wait_for_state, entries, target) for entries in by_connection.values()]
+            return [result for wait in waits for result in wait.result()]
+
+    def _wait_for_state(self, entries, target):
+        """
+        Block on one connection's PropertyCollector until every VM in entries reports
+        the target power state or the timeout passes.
+        """
+        vms = {vm._moId: (vm, name, issued_at) for vm, name, issued_at in entries}
+        reached = {}
+        deadline = time.monotonic() + self.timeout
+        content = vim.ServiceInstance("ServiceInstance", entries[0][0]._stub).RetrieveContent()
+        collector = content.propertyCollector.CreatePropertyCollector()
+        try:
+            object_specs = [vmodl.query.PropertyCollector.ObjectSpec(obj=vm, skip=False) for vm, _, _ in entries]
+            property_spec = vmodl.query.PropertyCollector.PropertySpec(type=vim.VirtualMachine, all=False,
+                                                                       pathSet=["runtime.powerState"])
+            collector.CreateFilter(vmodl.query.PropertyCollector.FilterSpec(objectSet=object_specs,
+                                                                            propSet=[property_spec]), True)
+            version = ""
+            while len(reached) < len(vms):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                options = vmodl.query.PropertyCollector.WaitOptions(maxWaitSeconds=int(min(remaining, 60)) or 1)
+                update = collector.WaitForUpdatesEx(version, options)
+                if update is None:
+                    continue
+                version = update.version
+                for filter_set in update.filterSet:
+                    for object_set in filter_set.objectSet:
+                        for change in object_set.changeSet:
+                            mo_id = object_set.obj._moId
+                            if change.name == "runtime.powerState" and change.val == target and mo_id not in reached:
+                                reached[mo_id] = time.monotonic() - vms[mo_id][2]
+        finally:
+            collector.DestroyPropertyCollector()
+        results = []
+        for mo_id, (vm, name, issued_at) in vms.items():
+            if mo_id in reached:
+                results.append(VmPowerResult(name, target, reached[mo_id]))
+            else:
+                self.log.error("VM %s did not reach %s within %ss" % (name, target, self.timeout))
+                results.append(VmPowerResult(name, elapsed=time.monotonic() - issued_at,
+                                             error="Timed out waiting for " + target))
+        return results
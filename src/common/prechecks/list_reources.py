@@ -13,7 +13,9 @@ import logging
 import socket
 import hashlib
 import uuid
-from flask import jsonify, request
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import jsonify, request, copy_current_request_context
 from flask import Flask
 import requests
 from flask import current_app
@@ -25,17 +27,18 @@ vcenter_resources = Blueprint("vcenter_listResources", __name__, static_folder="
 
 logger = logging.getLogger(__name__)
 
-from pyVim import connect
-from pyVim.connect import Disconnect
-import atexit
 import base64
 # import env_variables
 import requests
 from pyVmomi import vim
-from flask import Flask, request
+from flask import Flask
 
 # sys.path.append("../")
 from common.operation.vcenter_operations import get_dc, get_ds, get_rp
+from common.util.nsxt_pager import NsxtPager
+from common.util.request_spec import RequestSpec
+from common.operation.vcenter_session import VcenterSessionPool
+from common.operation.inventory_cache import InventoryCache
 from common.prechecks.precheck import get_cluster, getNetwork, checkClusterNamespace, \
     getClusterVersionsFullList
 from requests.packages.urllib3.exceptions import InsecureRequestWarning
@@ -53,6 +56,13 @@ from common.operation.ShellHelper import runShellCommandAndReturnOutputAsList, r
 requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
 __author__ = 'Tasmiya'
 
+# Content library REST calls sent at the same time.
+LIBRARY_WORKERS = 8
+# listResources responses are reused for this many seconds, unless called with ?refresh=true.
+RESOURCES_TTL = 60
+_resources_cache = {}
+_resources_lock = threading.Lock()
+
 
 @vcenter_resources.route("/api/tanzu/tier1_details", methods=['POST'])
 def getTer1Details():
@@ -67,31 +77,30 @@ def getTer1Details():
             }
             return jsonify(d), 500
         env = env[0]
-        str_enc = str(request.get_json(force=True)['envSpec']['vcenterDetails']["nsxtUserPasswordBase64"])
-        base64_bytes = str_enc.encode('ascii')
-        enc_bytes = base64.b64decode(base64_bytes)
-        password = enc_bytes.decode('ascii').rstrip("\n")
+        password = RequestSpec.secret("envSpec", "vcenterDetails", "nsxtUserPasswordBase64")
 
-        ecod_bytes = (request.get_json(force=True)['envSpec']['vcenterDetails']["nsxtUser"] + ":" + password).encode(
+        ecod_bytes = (RequestSpec.json()['envSpec']['vcenterDetails']["nsxtUser"] + ":" + password).encode(
             "ascii")
         ecod_bytes = base64.b64encode(ecod_bytes)
-        address = str(request.get_json(force=True)['envSpec']['vcenterDetails']["nsxtAddress"])
+        address = str(RequestSpec.json()['envSpec']['vcenterDetails']["nsxtAddress"])
         ecod_string = ecod_bytes.decode("ascii")
         uri = "https://" + address + "/policy/api/v1/infra/tier-1s"
         headers = {'Authorization': (
                 'Basic ' + ecod_string)}
-        response = requests.request(
-            "GET", uri, headers=headers, verify=False)
-        if response.status_code != 200:
-            current_app.logger.error("Failed to get tier1 details, failed to fetch from api " + response.text)
+        # The transport zones are read along with the tier-1s, getListOfTransportZone finds them cached.
+        lists = NsxtPager.list_all({"tier1": uri, "transport_zones": "https://" + address + "/api/v1/transport-zones/"},
+                                   headers)
+        tier1s = lists["tier1"]
+        if tier1s[1] != 200:
+            current_app.logger.error("Failed to get tier1 details, failed to fetch from api " + str(tier1s[0]))
             d = {
                 "responseType": "ERROR",
-                "msg": "Failed to get tier1 details, failed to fetch from api " + response.text,
+                "msg": "Failed to get tier1 details, failed to fetch from api " + str(tier1s[0]),
                 "STATUS_CODE": 500
             }
-            return jsonify(d), response.status_code
+            return jsonify(d), tier1s[1]
         list_of_display_name = []
-        for result in response.json()["results"]:
+        for result in tier1s[0]:
             list_of_display_name.append(result["display_name"])
         if len(list_of_display_name) < 1:
             current_app.logger.error("Failed to get tier1 details, list is empty ")
@@ -145,15 +154,12 @@ def listResources():
     current_app.config['DEPLOYMENT_PLATFORM'] = env
     current_app.logger.info("Fetching the list of resources on environment")
     if env == Env.VSPHERE or env == Env.VCF:
-        vCenter = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterAddress']
-        vCenter_user = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterSsoUser']
-        str_enc = str(request.get_json(force=True)['envSpec']['vcenterDetails']["vcenterSsoPasswordBase64"])
-        base64_bytes = str_enc.encode('ascii')
-        enc_bytes = base64.b64decode(base64_bytes)
-        VC_PASSWORD = enc_bytes.decode('ascii').rstrip("\n")
+        vCenter = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterAddress']
+        vCenter_user = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterSsoUser']
+        VC_PASSWORD = RequestSpec.secret("envSpec", "vcenterDetails", "vcenterSsoPasswordBase64")
 
     elif env == Env.VMC:
-        status = fetch_vmc_env(request.get_json(force=True))
+        status = fetch_vmc_env(RequestSpec.json())
         if status[1] != 200:
             d = {
                 "responseType": "ERROR",
@@ -174,9 +180,24 @@ def listResources():
             }
             return jsonify(d), 500
 
+    cache_key = (vCenter, vCenter_user, hashlib.sha256(str(VC_PASSWORD).encode()).hexdigest())
+    if not request.args.get("refresh"):
+        with _resources_lock:
+            cached = _resources_cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] < RESOURCES_TTL:
+            current_app.logger.info("Returning the list of resources on vCenter " + vCenter + " fetched "
+                                    + str(int(time.monotonic() - cached[0])) + "s ago")
+            return jsonify(cached[1]), 200
+
+    # Content library details come from the REST API, fetched while the inventory is read.
+    executor = ThreadPoolExecutor(max_workers=1)
+    library = executor.submit(copy_current_request_context(getLibraryFile), vCenter, vCenter_user, VC_PASSWORD)
+    executor.shutdown(wait=False)
     try:
-        si = connect.SmartConnectNoSSL(host=vCenter, user=vCenter_user, pwd=VC_PASSWORD)
-        content = si.RetrieveContent()
+        si = VcenterSessionPool.get(host=vCenter, user=vCenter_user, pwd=VC_PASSWORD)
+        # All names come from one snapshot of the inventory, read with a single RetrieveContents call.
+        cache = InventoryCache.of(si)
+        cache.objects([vim.Datacenter], revalidate=True)
         # if datacenter itself is not found, fail
         try:
             datacenterss = get_dc(si, None)
@@ -196,12 +217,9 @@ def listResources():
         resource_pools = []
         library_files = []
         library_names = []
-        for dc in datacenterss:
-            try:
-                datacenter_names.append(dc)
-            except Exception as e:
-                errors.append(e)
-            dc = content.searchIndex.FindByInventoryPath("/" + dc)
+        for dc in datacenterss or []:
+            datacenter_names.append(dc)
+            dc = cache.find_by_path("/" + dc)
             try:
                 c = get_cluster(si, dc, None)
                 if c is not None:
@@ -228,7 +246,7 @@ def listResources():
             except Exception as e:
                 errors.append(e)
         try:
-            files, names = getLibraryFile(vCenter, vCenter_user, VC_PASSWORD)
+            files, names = library.result()
             library_files.extend(files)
             library_names.extend(names)
         except Exception as e:
@@ -262,7 +280,6 @@ def listResources():
         current_app.logger.info(library_files)
 
     except IOError as e:
-        atexit.register(Disconnect, si)
         d = {
             "responseType": "ERROR",
             "msg": "Failed to connect to vcenter. " + str(e),
@@ -283,6 +300,8 @@ def listResources():
         "CONTENTLIBRARY_FILES": library_files,
         "CONTENTLIBRARY_NAMES": library_names
     }
+    with _resources_lock:
+        _resources_cache[cache_key] = (time.monotonic(), d)
     current_app.logger.info("Obtained the list of resources Successfully")
     return jsonify(d), 200
 
@@ -290,7 +309,7 @@ def listResources():
 def getVCthumbprint():
     current_app.logger.info("Fetching VC thumbprint")
     try:
-        vCenter = request.get_json(force=True)['envSpec']['vcenterDetails']["vcenterAddress"]
+        vCenter = RequestSpec.json()['envSpec']['vcenterDetails']["vcenterAddress"]
     except:
         current_app.logger.error('Failed to fetch VC details')
         return 500
@@ -351,9 +370,6 @@ def getLibraryFile(vcIp, vcUser, vcPassword):
     url = "https://" + vcIp + "/"
     vCenter_user = vcUser
     VC_PASSWORD = vcPassword
-    file_list = []
-    item_list = []
-    library_Names = []
 
     if not (vCenter_user or VC_PASSWORD):
         raise Exception('VCenter credentials are empty')
@@ -365,44 +381,35 @@ def getLibraryFile(vcIp, vcUser, vcPassword):
         else:
             session_id = sess.json()['value']
 
-        resp = requests.get(url + "rest/com/vmware/content/library", verify=False, headers={
-            "vmware-api-session-id": session_id
-        })
-        if resp.status_code != 200:
-            raise Exception('API to obtain Content Library ids for vCenter failed')
-
-        library_ids = []
-        library_ids.extend(resp.json()['value'])
-
-        for library in library_ids:
-            library_item = requests.get(url + "rest/com/vmware/content/library/item?library_id=" + library,
-                                        verify=False, headers={
-                    "vmware-api-session-id": session_id
-                })
-
-            if library_item.status_code != 200:
-                raise Exception('API to obtain item ids for content Library Failed')
-            else:
-                item_list.extend(library_item.json()['value'])
-
-            lib_name = requests.get(url + "rest/com/vmware/content/library/id:" + library, verify=False, headers={
-                "vmware-api-session-id": session_id
-            })
-
-            if lib_name.status_code != 200:
-                raise Exception('API to obtain content Library name Failed')
-            else:
-                library_Names.append(lib_name.json()['value']['name'])
-
-        for item in item_list:
-            resp_new_item = requests.get(url + "rest/com/vmware/content/library/item/id:" + item, verify=False,
-                                         headers={
-                                             "vmware-api-session-id": session_id})
-
-            if resp_new_item.status_code != 200:
-                raise Exception('API to Obtain item details failed')
-
-            file_list.append(resp_new_item.json()['value']['name'])
+        session = requests.Session()
+        session.verify = False
+        session.headers["vmware-api-session-id"] = session_id
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=LIBRARY_WORKERS)
+        session.mount("https://", adapter)
+
+        def get_value(path, error):
+            response = session.get(url + path)
+            if response.status_code != 200:
+                raise Exception(error)
+            return response.json()['value']
+
+        library_ids = get_value("rest/com/vmware/content/library",
+                                'API to obtain Content Library ids for vCenter failed')
+
+        # Each library and item is a separate REST call; they are sent side by side.
+        with ThreadPoolExecutor(max_workers=LIBRARY_WORKERS, thread_name_prefix="content-library") as executor:
+            item_lists = executor.map(lambda library: get_value(
+                "rest/com/vmware/content/library/item?library_id=" + library,
+                'API to obtain item ids for content Library Failed'), library_ids)
+            names = executor.map(lambda library: get_value(
+                "rest/com/vmware/content/library/id:" + library,
+                'API to obtain content Library name Failed')['name'], library_ids)
+            item_list = [item for items in item_lists for item in items]
+            library_Names = list(names)
+            file_list = list(executor.map(lambda item: get_value(
+                "rest/com/vmware/content/library/item/id:" + item,
+                'API to Obtain item details failed')['name'], item_list))
+        session.close()
         return file_list, library_Names
 
     except Exception as e:
@@ -424,15 +431,12 @@ def getFilesInContentLibrary():
     env = env[0]
     current_app.logger.info("Fetching the list of resources on environment")
     if env == Env.VSPHERE or env == Env.VCF:
-        vCenter = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterAddress']
-        vCenter_user = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterSsoUser']
-        str_enc = str(request.get_json(force=True)['envSpec']['vcenterDetails']["vcenterSsoPasswordBase64"])
-        base64_bytes = str_enc.encode('ascii')
-        enc_bytes = base64.b64decode(base64_bytes)
-        VC_PASSWORD = enc_bytes.decode('ascii').rstrip("\n")
-        library_name = request.get_json(force=True)['envSpec']['vcenterDetails']['contentLibraryName']
+        vCenter = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterAddress']
+        vCenter_user = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterSsoUser']
+        VC_PASSWORD = RequestSpec.secret("envSpec", "vcenterDetails", "vcenterSsoPasswordBase64")
+        library_name = RequestSpec.json()['envSpec']['vcenterDetails']['contentLibraryName']
     elif env == Env.VMC:
-        status = fetch_vmc_env(request.get_json(force=True))
+        status = fetch_vmc_env(RequestSpec.json())
         if status[1] != 200:
             d = {
                 "responseType": "ERROR",
@@ -443,7 +447,7 @@ def getFilesInContentLibrary():
         vCenter = current_app.config['VC_IP']
         vCenter_user = current_app.config['VC_USER']
         VC_PASSWORD = current_app.config['VC_PASSWORD']
-        library_name = request.get_json(force=True)['envSpec']['contentLibraryName']
+        library_name = RequestSpec.json()['envSpec']['contentLibraryName']
 
     if not (vCenter_user or VC_PASSWORD):
         d = {
@@ -575,10 +579,10 @@ def getFilesInContentLibrary():
 
 
 def getfiles_content(vCenter, vCenter_user, VC_PASSWORD, library_name):
-    os.putenv("GOVC_URL", "https://" + vCenter + "/sdk")
-    os.putenv("GOVC_USERNAME", vCenter_user)
-    os.putenv("GOVC_PASSWORD", VC_PASSWORD)
-    os.putenv("GOVC_INSECURE", "true")
+    os.environ["GOVC_URL"] = "https://" + vCenter + "/sdk"
+    os.environ["GOVC_USERNAME"] = vCenter_user
+    os.environ["GOVC_PASSWORD"] = VC_PASSWORD
+    os.environ["GOVC_INSECURE"] = "true"
     get_library_command = ["govc", "library.ls"]
     file_list = []
 
@@ -607,12 +611,9 @@ def getfiles_content(vCenter, vCenter_user, VC_PASSWORD, library_name):
 @vcenter_resources.route("/api/tanzu/storagePolicies", methods=['POST'])
 def storagePolicies():
     try:
-        vCenter = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterAddress']
-        vCenter_user = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterSsoUser']
-        str_enc = str(request.get_json(force=True)['envSpec']['vcenterDetails']["vcenterSsoPasswordBase64"])
-        base64_bytes = str_enc.encode('ascii')
-        enc_bytes = base64.b64decode(base64_bytes)
-        VC_PASSWORD = enc_bytes.decode('ascii').rstrip("\n")
+        vCenter = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterAddress']
+        vCenter_user = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterSsoUser']
+        VC_PASSWORD = RequestSpec.secret("envSpec", "vcenterDetails", "vcenterSsoPasswordBase64")
         policies = getStoragePolicies(vCenter, vCenter_user, VC_PASSWORD)
         policies_list = []
         for policy in policies[0]:
@@ -651,12 +652,9 @@ def storagePolicies():
 @vcenter_resources.route("/api/tanzu/listvmclasses", methods=['POST'])
 def listvmclasses():
     try:
-        vCenter = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterAddress']
-        vCenter_user = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterSsoUser']
-        str_enc = str(request.get_json(force=True)['envSpec']['vcenterDetails']["vcenterSsoPasswordBase64"])
-        base64_bytes = str_enc.encode('ascii')
-        enc_bytes = base64.b64decode(base64_bytes)
-        VC_PASSWORD = enc_bytes.decode('ascii').rstrip("\n")
+        vCenter = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterAddress']
+        vCenter_user = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterSsoUser']
+        VC_PASSWORD = RequestSpec.secret("envSpec", "vcenterDetails", "vcenterSsoPasswordBase64")
         url = "https://" + vCenter + "/"
         sess = requests.post(url + "rest/com/vmware/cis/session", auth=(vCenter_user, VC_PASSWORD), verify=False)
         if sess.status_code != 200:
@@ -733,9 +731,9 @@ def getKubernetesOvaVersions():
         return jsonify(d), 500
     env = env[0]
     if env == Env.VMC:
-        refToken = request.get_json(force=True)['marketplaceSpec']['refreshToken']
+        refToken = RequestSpec.json()['marketplaceSpec']['refreshToken']
     elif env == Env.VSPHERE or env == Env.VCF:
-        refToken = request.get_json(force=True)['envSpec']['marketplaceSpec']['refreshToken']
+        refToken = RequestSpec.json()['envSpec']['marketplaceSpec']['refreshToken']
     headers = {
         "Accept": "application/json",
         "Content-Type": "application/json"
@@ -810,13 +808,10 @@ def getKubernetesOvaVersions():
 def getWCPEnabledClusters():
     try:
         wcp_cluster = []
-        vcenter_ip = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterAddress']
-        vCenter_user = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterSsoUser']
-        str_enc = str(request.get_json(force=True)['envSpec']['vcenterDetails']["vcenterSsoPasswordBase64"])
-        base64_bytes = str_enc.encode('ascii')
-        enc_bytes = base64.b64decode(base64_bytes)
-        VC_PASSWORD = enc_bytes.decode('ascii').rstrip("\n")
-        datacenter_name = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterDatacenter']
+        vcenter_ip = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterAddress']
+        vCenter_user = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterSsoUser']
+        VC_PASSWORD = RequestSpec.secret("envSpec", "vcenterDetails", "vcenterSsoPasswordBase64")
+        datacenter_name = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterDatacenter']
 
         if not (vcenter_ip or vCenter_user or VC_PASSWORD):
             current_app.logger.error('Failed to fetch VC details')
@@ -827,7 +822,7 @@ def getWCPEnabledClusters():
             }
             return jsonify(d), 500
 
-        si = connect.SmartConnectNoSSL(host=vcenter_ip, user=vCenter_user, pwd=VC_PASSWORD)
+        si = VcenterSessionPool.get(host=vcenter_ip, user=vCenter_user, pwd=VC_PASSWORD)
 
         datacenter = get_dc(si, datacenter_name)
         cluster_list = get_cluster(si, datacenter, None)
@@ -881,14 +876,11 @@ def get_VCSession():
         env = envCheck()
         env = env[0]
         if env == Env.VSPHERE or env == Env.VCF:
-            vcenter_ip = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterAddress']
-            vcenter_username = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterSsoUser']
-            str_enc = str(request.get_json(force=True)['envSpec']['vcenterDetails']["vcenterSsoPasswordBase64"])
-            base64_bytes = str_enc.encode('ascii')
-            enc_bytes = base64.b64decode(base64_bytes)
-            password = enc_bytes.decode('ascii').rstrip("\n")
+            vcenter_ip = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterAddress']
+            vcenter_username = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterSsoUser']
+            password = RequestSpec.secret("envSpec", "vcenterDetails", "vcenterSsoPasswordBase64")
         elif env == Env.VMC:
-            status = fetch_vmc_env(request.get_json(force=True))
+            status = fetch_vmc_env(RequestSpec.json())
             if status[1] != 200:
                 d = {
                     "responseType": "ERROR",
@@ -917,13 +909,10 @@ def get_VCSession():
 @vcenter_resources.route("/api/tanzu/getWorkloadNetworks", methods=['POST'])
 def getWorkloadNetworks():
     try:
-        vCenter = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterAddress']
-        cluster = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterCluster']
-        vcenter_username = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterSsoUser']
-        str_enc = str(request.get_json(force=True)['envSpec']['vcenterDetails']["vcenterSsoPasswordBase64"])
-        base64_bytes = str_enc.encode('ascii')
-        enc_bytes = base64.b64decode(base64_bytes)
-        password = enc_bytes.decode('ascii').rstrip("\n")
+        vCenter = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterAddress']
+        cluster = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterCluster']
+        vcenter_username = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterSsoUser']
+        password = RequestSpec.secret("envSpec", "vcenterDetails", "vcenterSsoPasswordBase64")
         workload_networks = []
         cluster_id = getClusterID(vCenter, vcenter_username, password, cluster)
         if cluster_id[1] != 200:
@@ -998,13 +987,10 @@ def getWorkloadNetworks():
 @vcenter_resources.route("/api/tanzu/getClusterVersions", methods=['POST'])
 def getClusterVersions():
     try:
-        vCenter = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterAddress']
-        cluster = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterCluster']
-        vcenter_username = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterSsoUser']
-        str_enc = str(request.get_json(force=True)['envSpec']['vcenterDetails']["vcenterSsoPasswordBase64"])
-        base64_bytes = str_enc.encode('ascii')
-        enc_bytes = base64.b64decode(base64_bytes)
-        password = enc_bytes.decode('ascii').rstrip("\n")
+        vCenter = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterAddress']
+        cluster = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterCluster']
+        vcenter_username = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterSsoUser']
+        password = RequestSpec.secret("envSpec", "vcenterDetails", "vcenterSsoPasswordBase64")
         cluster_versions = []
 
         versions_output = getClusterVersionsFullList(vCenter, vcenter_username, password, cluster)
@@ -1053,13 +1039,10 @@ def getClusterVersions():
 @vcenter_resources.route("/api/tanzu/getAllNamespaces", methods=['POST'])
 def getAllNamespaces():
     try:
-        vCenter = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterAddress']
-        cluster = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterCluster']
-        vcenter_username = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterSsoUser']
-        str_enc = str(request.get_json(force=True)['envSpec']['vcenterDetails']["vcenterSsoPasswordBase64"])
-        base64_bytes = str_enc.encode('ascii')
-        enc_bytes = base64.b64decode(base64_bytes)
-        password = enc_bytes.decode('ascii').rstrip("\n")
+        vCenter = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterAddress']
+        cluster = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterCluster']
+        vcenter_username = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterSsoUser']
+        password = RequestSpec.secret("envSpec", "vcenterDetails", "vcenterSsoPasswordBase64")
         namespaces_list = []
         vc_session = get_VCSession()
         if vc_session[0] is None:
@@ -1130,8 +1113,7 @@ def getAllNamespaces():
 @vcenter_resources.route("/api/tanzu/getSupervisorClusters", methods=['POST'])
 def getSupervisorClusters():
     try:
-        os.putenv("TMC_API_TOKEN",
-                  request.get_json(force=True)["saasEndpoints"]['tmcDetails']['tmcRefreshToken'])
+        os.environ["TMC_API_TOKEN"] = RequestSpec.json()["saasEndpoints"]['tmcDetails']['tmcRefreshToken']
         user = TmcUser.USER
         listOfCmdTmcLogin = ["tmc", "login", "--no-configure", "-name", user]
         runProcess(listOfCmdTmcLogin)
@@ -1187,7 +1169,7 @@ def getSupervisorClusters():
 @vcenter_resources.route("/api/tanzu/getSupervisorClusterHealth", methods=['POST'])
 def getSupervisorClusterHealth():
     try:
-        super_cluster = request.get_json(force=True)['envSpec']["saasEndpoints"]['tmcDetails'][
+        super_cluster = RequestSpec.json()['envSpec']["saasEndpoints"]['tmcDetails'][
             'tmcSupervisorClusterName']
         state = checkClusterStateOnTmc(super_cluster, True)
         if state[0] == "SUCCESS":
@@ -1231,16 +1213,13 @@ def getClusters():
             return jsonify(d), 500
         env = env[0]
         if env == Env.VSPHERE or env == Env.VCF:
-            vCenter = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterAddress']
-            vCenter_user = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterSsoUser']
-            str_enc = str(request.get_json(force=True)['envSpec']['vcenterDetails']["vcenterSsoPasswordBase64"])
-            base64_bytes = str_enc.encode('ascii')
-            enc_bytes = base64.b64decode(base64_bytes)
-            VC_PASSWORD = enc_bytes.decode('ascii').rstrip("\n")
-            datacenter_name = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterDatacenter']
+            vCenter = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterAddress']
+            vCenter_user = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterSsoUser']
+            VC_PASSWORD = RequestSpec.secret("envSpec", "vcenterDetails", "vcenterSsoPasswordBase64")
+            datacenter_name = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterDatacenter']
 
         elif env == Env.VMC:
-            status = fetch_vmc_env(request.get_json(force=True))
+            status = fetch_vmc_env(RequestSpec.json())
             if status[1] != 200:
                 d = {
                     "responseType": "ERROR",
@@ -1251,7 +1230,7 @@ def getClusters():
             vCenter = current_app.config['VC_IP']
             vCenter_user = current_app.config['VC_USER']
             VC_PASSWORD = current_app.config['VC_PASSWORD']
-            datacenter_name = request.get_json(force=True)['envSpec']['sddcDatacenter']
+            datacenter_name = RequestSpec.json()['envSpec']['sddcDatacenter']
 
             if not (vCenter or vCenter_user or VC_PASSWORD):
                 current_app.logger.error('Failed to fetch VC details')
@@ -1262,7 +1241,7 @@ def getClusters():
                 }
                 return jsonify(d), 500
 
-        si = connect.SmartConnectNoSSL(host=vCenter, user=vCenter_user, pwd=VC_PASSWORD)
+        si = VcenterSessionPool.get(host=vCenter, user=vCenter_user, pwd=VC_PASSWORD)
 
         datacenter = get_dc(si, datacenter_name)
         clusters = get_cluster(si, datacenter, None)
@@ -1338,16 +1317,13 @@ def getDatastores():
             return jsonify(d), 500
         env = env[0]
         if env == Env.VSPHERE or env == Env.VCF:
-            vCenter = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterAddress']
-            vCenter_user = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterSsoUser']
-            str_enc = str(request.get_json(force=True)['envSpec']['vcenterDetails']["vcenterSsoPasswordBase64"])
-            base64_bytes = str_enc.encode('ascii')
-            enc_bytes = base64.b64decode(base64_bytes)
-            VC_PASSWORD = enc_bytes.decode('ascii').rstrip("\n")
-            datacenter_name = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterDatacenter']
+            vCenter = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterAddress']
+            vCenter_user = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterSsoUser']
+            VC_PASSWORD = RequestSpec.secret("envSpec", "vcenterDetails", "vcenterSsoPasswordBase64")
+            datacenter_name = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterDatacenter']
 
         elif env == Env.VMC:
-            status = fetch_vmc_env(request.get_json(force=True))
+            status = fetch_vmc_env(RequestSpec.json())
             if status[1] != 200:
                 d = {
                     "responseType": "ERROR",
@@ -1358,7 +1334,7 @@ def getDatastores():
             vCenter = current_app.config['VC_IP']
             vCenter_user = current_app.config['VC_USER']
             VC_PASSWORD = current_app.config['VC_PASSWORD']
-            datacenter_name = request.get_json(force=True)['envSpec']['sddcDatacenter']
+            datacenter_name = RequestSpec.json()['envSpec']['sddcDatacenter']
 
             if not (vCenter or vCenter_user or VC_PASSWORD):
                 current_app.logger.error('Failed to fetch VC details')
@@ -1369,7 +1345,7 @@ def getDatastores():
                 }
                 return jsonify(d), 500
 
-        si = connect.SmartConnectNoSSL(host=vCenter, user=vCenter_user, pwd=VC_PASSWORD)
+        si = VcenterSessionPool.get(host=vCenter, user=vCenter_user, pwd=VC_PASSWORD)
 
         datacenter = get_dc(si, datacenter_name)
         datastores = get_ds(si, datacenter, None)
@@ -1655,7 +1631,7 @@ def validateCredentials():
             return jsonify(d), 500
         env = env[0]
 
-        cluster_type = request.get_json(force=True)["clusterType"]
+        cluster_type = RequestSpec.json()["clusterType"]
 
         response = validate_cluster_credential(env, cluster_type)
         if not response[0]:
@@ -1699,7 +1675,7 @@ def validateTargetLocations():
             return jsonify(d), 500
         env = env[0]
 
-        cluster_type = request.get_json(force=True)["clusterType"]
+        cluster_type = RequestSpec.json()["clusterType"]
 
         response = validate_backup_location(env, cluster_type)
         if not response[0]:
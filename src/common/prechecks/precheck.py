@@ -10,7 +10,7 @@ import sys
 import tarfile
 import time
 import logging
-from flask import jsonify, request
+from flask import jsonify
 from flask import Flask
 import requests
 from flask import current_app
@@ -27,26 +27,26 @@ vcenter_precheck = Blueprint("vcenter_precheck", __name__, static_folder="preche
 
 logger = logging.getLogger(__name__)
 
-from pyVim import connect
-from pyVim.connect import Disconnect
 from pyVmomi import vim
 from pyVmomi import pbm, VmomiSupport, SoapStubAdapter
-import atexit
-import base64
 # import env_variables
 import requests
-from flask import Flask, request
-from pyVim.connect import Disconnect, SmartConnect
+from flask import Flask
 import ipaddress
 import uuid
 
 # sys.path.append("../")
-from common.operation.vcenter_operations import get_dc, get_ds, get_obj
+from common.operation.vcenter_operations import get_dc, get_ds, get_obj, getNetwork
+from common.operation.inventory_cache import InventoryCache
+from common.operation.vcenter_session import VcenterSessionPool
 from requests.packages.urllib3.exceptions import InsecureRequestWarning
 from common.operation.ShellHelper import runShellCommandWithPolling,grabPipeOutput, runProcess, runShellCommandAndReturnOutputAsList
 from common.operation.constants import Env, MarketPlaceUrl, Tkgs_Extension_Details, Versions
 from common.session.session_acquire import login
 from common.util.ssl_helper import decode_from_b64
+from common.util.request_spec import RequestSpec
+from common.util.task_graph import TaskGraph, api_step
+from common.util.ping_sweep import PingSweep
 
 from common.common_utilities import checkMachineCountForTsm, checkClusterSizeForTo, envCheck, \
     enableProxy, dockerLoginAndConnectivityCheck, getIpFromHost, is_ipv4, \
@@ -57,72 +57,36 @@ from common.common_utilities import checkMachineCountForTsm, checkClusterSizeFor
     fetchNamespaceInfo, isAviHaEnabled, getAviIpFqdnDnsMapping, checkNtpServerValidity, verifyVcenterVersion, \
     configureKubectl, checkDataProtectionEnabled, validate_backup_location, validate_cluster_credential, \
     list_cluster_groups, checkEnableIdentityManagement, checkMachineCountForProdType, checkAVIPassword, \
-    checkClusterNameDNSCompliant, ping_test, check_tanzu_license, check_nsxt_license, check_vsphere_license
+    checkClusterNameDNSCompliant, check_tanzu_license, check_nsxt_license, check_vsphere_license
 
 # check_tanzu_license, check_nsxt_license, check_vsphere_license
 
 requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
 __author__ = 'Tasmiya'
 
+# Checks of precheck_env running at the same time.
+PRECHECK_WORKERS = 8
+# Longest a single check of precheck_env may take, in seconds.
+PRECHECK_TIMEOUT = 900
+PING_CHECK_TIMEOUT = 300
+
 
 def get_cluster(si, datacenter, name):
     """
     Pick a cluster by its name.
     """
-    view_manager = si.content.viewManager
-    container = view_manager.CreateContainerView(datacenter, [vim.ClusterComputeResource], True)
-    try:
-        h_name = []
-        for host in container.view:
-            rp = host.name
-            if rp:
-                folder_name = rp
-                fp = host.parent
-                while fp is not None and fp.name is not None and fp != si.content.rootFolder:
-                    folder_name = fp.name + '/' + folder_name
-                    try:
-                        fp = fp.parent
-                    except BaseException:
-                        break
-                folder_name = '/' + folder_name
-                if name:
-                    if str(folder_name).endswith(name):
-                        content = si.RetrieveContent()
-                        return content.searchIndex.FindByInventoryPath(folder_name)
-                first_rp = folder_name[folder_name.find("/host") + 6:]
-                if first_rp:
-                    h_name.append(first_rp.strip("/"))
-        if h_name:
-            return h_name
-    finally:
-        container.Destroy()
-
-
-def getNetwork(datacenter, name):
-    if name is not None:
-        networks = datacenter.networkFolder.childEntity
-        for network in networks:
-            if network.name == name:
-                return network
-            elif hasattr(network, 'childEntity'):
-                ports = network.childEntity
-                for item in ports:
-                    if item.name == name:
-                        return item
-        raise Exception('Failed to find port group named: %s' % name)
-    else:
-        network_list = []
-        try:
-            for port in datacenter.networkFolder.childEntity:
-                if hasattr(port, 'childEntity'):
-                    ports = port.childEntity
-                    for item in ports:
-                        network_list.append(item.name)
-                else:
-                    network_list.append(port.name)
-            return network_list
-        except:
-            raise Exception('Encountered errors while fetching networks: %s' % datacenter.name)
+    cache = InventoryCache.of(si)
+    if name:
+        cluster = cache.find([vim.ClusterComputeResource], name, under=datacenter)
+        if cluster is not None:
+            return cluster
+    h_name = []
+    for path, cluster in cache.objects([vim.ClusterComputeResource], under=datacenter):
+        first_rp = path[path.find("/host") + 6:]
+        if first_rp:
+            h_name.append(first_rp.strip("/"))
+    if h_name:
+        return h_name
 
 
 @vcenter_precheck.route("/api/tanzu/enableproxy", methods=['POST'])
@@ -240,13 +204,13 @@ def precheck_env():
 
         try:
             if env == Env.VSPHERE:
-                shared_cluster_name = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+                shared_cluster_name = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
                     'tkgSharedserviceClusterName']
             elif env == Env.VCF:
-                shared_cluster_name = request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
+                shared_cluster_name = RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
                     'tkgSharedserviceClusterName']
             elif env == Env.VMC:
-                shared_cluster_name = request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec'][
+                shared_cluster_name = RequestSpec.json()['componentSpec']['tkgSharedServiceSpec'][
                     'tkgSharedClusterName']
 
             if shared_cluster_name:
@@ -258,11 +222,11 @@ def precheck_env():
 
         try:
             if env == Env.VSPHERE:
-                workload_cluster_name = request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadClusterName']
+                workload_cluster_name = RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadClusterName']
             elif env == Env.VCF:
-                workload_cluster_name = request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadClusterName']
+                workload_cluster_name = RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadClusterName']
             elif env == Env.VMC:
-                workload_cluster_name = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec'][
+                workload_cluster_name = RequestSpec.json()['componentSpec']['tkgWorkloadSpec'][
                     'tkgWorkloadClusterName']
 
             if workload_cluster_name:
@@ -282,15 +246,6 @@ def precheck_env():
                 "STATUS_CODE": 500
             }
             return jsonify(d), 500
-        doc = dockerLoginAndConnectivityCheck(env)
-        if doc[1] != 200:
-            current_app.logger.error(str(doc[0].json['msg']))
-            d = {
-                "responseType": "ERROR",
-                "msg": str(doc[0].json['msg']),
-                "STATUS_CODE": 500
-            }
-            return jsonify(d), 500
         if not checkAirGappedIsEnabled(env):
             if not (isEnvTkgs_wcp(env) or isEnvTkgs_ns(env)):
                 if checkTmcEnabled(env):
@@ -335,11 +290,9 @@ def precheck_env():
                     }
                     return jsonify(d), 500
         os.system("cp common/vsphere-overlay.yaml " + Env.YTT_FILE_LOCATION)
-        os.putenv("HOME", "/root")
+        os.environ["HOME"] = "/root"
         cmd = ["sudo", "sysctl", "net/netfilter/nf_conntrack_max=131072"]
         runShellCommandWithPolling(cmd)
-        si = None
-        errors = []
         # license_check_status = licensePrechecks(env)
         # if license_check_status[1] != 200:
         #     d = {
@@ -350,7 +303,7 @@ def precheck_env():
         #     return jsonify(d), 500
 
         if env == Env.VSPHERE or env == Env.VCF:
-            vCenter = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterAddress']
+            vCenter = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterAddress']
             if not is_ipv4(vCenter):
                 ip = getIpFromHost(vCenter)
                 if ip is None:
@@ -361,40 +314,39 @@ def precheck_env():
                         "STATUS_CODE": 500
                     }
                     return jsonify(d), 500
-            vCenter_user = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterSsoUser']
-            str_enc = str(request.get_json(force=True)['envSpec']['vcenterDetails']["vcenterSsoPasswordBase64"])
-            base64_bytes = str_enc.encode('ascii')
-            enc_bytes = base64.b64decode(base64_bytes)
-            VC_PASSWORD = enc_bytes.decode('ascii').rstrip("\n")
-            vCenter_datacenter = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterDatacenter']
-            vCenter_cluster = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterCluster']
+            vCenter_user = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterSsoUser']
+            VC_PASSWORD = RequestSpec.secret("envSpec", "vcenterDetails", "vcenterSsoPasswordBase64")
+            vCenter_datacenter = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterDatacenter']
+            vCenter_cluster = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterCluster']
+            vCenter_datastore = None
+            portGroups = []
             if not isEnvTkgs_ns(env):
-                vCenter_datastore = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterDatastore']
-                ntp_server = request.get_json(force=True)['envSpec']['infraComponents']['ntpServers']
+                vCenter_datastore = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterDatastore']
+                ntp_server = RequestSpec.json()['envSpec']['infraComponents']['ntpServers']
             if env == Env.VSPHERE:
                 if isEnvTkgs_wcp(env):
                     portGroups = [
-                        request.get_json(force=True)['tkgsComponentSpec']['aviMgmtNetwork']['aviMgmtNetworkName'],
-                        request.get_json(force=True)['tkgsComponentSpec']['tkgsVipNetwork']['tkgsVipNetworkName'],
-                        request.get_json(force=True)['tkgsComponentSpec']['tkgsMgmtNetworkSpec'][
+                        RequestSpec.json()['tkgsComponentSpec']['aviMgmtNetwork']['aviMgmtNetworkName'],
+                        RequestSpec.json()['tkgsComponentSpec']['tkgsVipNetwork']['tkgsVipNetworkName'],
+                        RequestSpec.json()['tkgsComponentSpec']['tkgsMgmtNetworkSpec'][
                             'tkgsMgmtNetworkName'],
-                        request.get_json(force=True)['tkgsComponentSpec']['tkgsPrimaryWorkloadNetwork'][
+                        RequestSpec.json()['tkgsComponentSpec']['tkgsPrimaryWorkloadNetwork'][
                             'tkgsPrimaryWorkloadPortgroupName']]
                 elif not isEnvTkgs_ns(env):
                     portGroups = [
-                        request.get_json(force=True)['tkgComponentSpec']['aviMgmtNetwork']['aviMgmtNetworkName'],
-                        request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents']['tkgMgmtNetworkName'],
-                        request.get_json(force=True)['tkgMgmtDataNetwork']['tkgMgmtDataNetworkName']]
+                        RequestSpec.json()['tkgComponentSpec']['aviMgmtNetwork']['aviMgmtNetworkName'],
+                        RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents']['tkgMgmtNetworkName'],
+                        RequestSpec.json()['tkgMgmtDataNetwork']['tkgMgmtDataNetworkName']]
                     if isWorkload:
                         portGroups.append(
-                            request.get_json(force=True)['tkgWorkloadDataNetwork']['tkgWorkloadDataNetworkName'])
-                        portGroups.append(request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadNetworkName'])
+                            RequestSpec.json()['tkgWorkloadDataNetwork']['tkgWorkloadDataNetworkName'])
+                        portGroups.append(RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadNetworkName'])
 
         elif env == Env.VMC:
             vCenter = current_app.config['VC_IP']
             vCenter_user = current_app.config['VC_USER']
             VC_PASSWORD = current_app.config['VC_PASSWORD']
-            ntp_server = request.get_json(force=True)['envVariablesSpec']['ntpServersIp']
+            ntp_server = RequestSpec.json()['envVariablesSpec']['ntpServersIp']
             if not (vCenter or vCenter_user or VC_PASSWORD):
                 current_app.logger.error('Failed to fetch VC details')
                 d = {
@@ -404,352 +356,77 @@ def precheck_env():
                 }
                 return jsonify(d), 500
 
-            vCenter_datacenter = request.get_json(force=True)['envSpec']['sddcDatacenter']
-            vCenter_cluster = request.get_json(force=True)['envSpec']['sddcCluster']
-            vCenter_datastore = request.get_json(force=True)['envSpec']['sddcDatastore']
-
-        try:
-            si = connect.SmartConnectNoSSL(host=vCenter, user=vCenter_user, pwd=VC_PASSWORD)
-            content = si.RetrieveContent()
-            vcVersion = content.about.version
-            try:
-                if isEnvTkgs_wcp(env) or isEnvTkgs_ns(env):
-                    version_check = verifyVCVersion(vcVersion)
-                    if version_check[0] is None:
-                        current_app.logger.error(version_check[1])
-                        d = {
-                            "responseType": "ERROR",
-                            "msg": version_check[1],
-                            "STATUS_CODE": 500
-                        }
-                        return jsonify(d), 500
-                    current_app.logger.info("Successfully verified vCenter Version " + vcVersion)
-            except Exception as e:
-                current_app.logger.error(e)
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Pre-check failed " + str(e),
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-            # if datacenter itself is not found, pre-check fail
-            try:
-                datacenter = get_dc(si, vCenter_datacenter)
-            except Exception as e:
-                current_app.logger.error(e)
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Pre-check failed " + str(e),
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-
-            try:
-                cluster_obj = get_cluster(si, datacenter, vCenter_cluster)
-                if isEnvTkgs_wcp(env) or isEnvTkgs_ns(env):
-                    hostCount = verify_host_count(cluster_obj)
-                    if hostCount[0] is None:
-                        current_app.logger.error(hostCount[1])
-                        d = {
-                            "responseType": "ERROR",
-                            "msg": hostCount[1],
-                            "STATUS_CODE": 500
-                        }
-                        return jsonify(d), 500
-                    current_app.logger.info("Successfully verified number of hosts on cluster: " + vCenter_cluster)
-            except Exception as e:
-                errors.append(e)
-
-            if not isEnvTkgs_ns(env):
-                try:
-                    get_ds(si, datacenter, vCenter_datastore)
-                except Exception as e:
-                    errors.append(e)
-
-                if env == Env.VSPHERE:
-                    try:
-                        for portgroup in portGroups:
-                            getNetwork(datacenter, portgroup)
-                    except Exception as e:
-                        errors.append(e)
-
-            if errors:
-                current_app.logger.error("Pre-check failed with following errors")
-                for error in errors:
-                    current_app.logger.error(error)
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Pre-check failed " + str(errors),
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-
-        except IOError as e:
-            atexit.register(Disconnect, si)
-            d = {
-                "responseType": "ERROR",
-                "msg": "Failed to connect to vCenter. " + str(e),
-                "STATUS_CODE": 500
-            }
-            current_app.logger.error("Failed to connect to vCenter. " + str(e))
-            return jsonify(d), 500
-
-        if isEnvTkgs_ns(env):
-            refreshToken = ""
-        elif env == Env.VSPHERE or env == Env.VCF:
-            refreshToken = request.get_json(force=True)['envSpec']['marketplaceSpec']['refreshToken']
-        elif env == Env.VMC:
-            refreshToken = request.get_json(force=True)['marketplaceSpec']['refreshToken']
-        if not refreshToken:
-            current_app.logger.info("MarketPlace refreshToken is not provided")
-        else:
-            token_valdity = validateMarketplaceRefreshToken()
-            if token_valdity[1] != 200:
-                # if not ('msg' in token_valdity[0]):
-                current_app.logger.error(
-                    "Marketplace token validation failed. Please ensure connectivity to external networks.")
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Marketplace token validation failed. Please ensure connectivity to external networks.",
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-        os.putenv("GOVC_URL", "https://" + vCenter + "/sdk")
-        os.putenv("GOVC_USERNAME", vCenter_user)
-        os.putenv("GOVC_PASSWORD", VC_PASSWORD)
-        os.putenv("GOVC_INSECURE", "true")
-        # else:
-        # down = downloadAviControllerAndPushToContentLibrary(vCenter, vCenter_user, VC_PASSWORD, env)
-        # if down[0] is None:
-        # current_app.logger.error(down[1])
-        # d = {
-        # "responseType": "ERROR",
-        # "msg": down[1],
-        # "STATUS_CODE": 500
-        # }
-        # return jsonify(d), 500
-        # customer = request.get_json(force=True)['envSpec']['resource-spec']['avi-pulse-jwt-token']
-        # password = request.get_json(force=True)['envSpec']['resource-spec']['avi-pulse-jwt-token']
-        # if not customer or not password:
-        # current_app.logger.info("Customer connect user/password not provided")
-        # else:
-        # Kubernetes download
-        # if isEnvTkgs(env):
-        # current_app.logger.info("Photon checks not required")
-        # else:
-        # push = downloadAndPushKubernetesOvaMarketPlace(env)
-        # if push[0] is None:
-        # current_app.logger.error(push[1])
-        # d = {
-        # "responseType": "ERROR",
-        # "msg": push[1],
-        # "STATUS_CODE": 500
-        # }
-        # return jsonify(d), 500
+            vCenter_datacenter = RequestSpec.json()['envSpec']['sddcDatacenter']
+            vCenter_cluster = RequestSpec.json()['envSpec']['sddcCluster']
+            vCenter_datastore = RequestSpec.json()['envSpec']['sddcDatastore']
+            portGroups = []
+
+        os.environ["GOVC_URL"] = "https://" + vCenter + "/sdk"
+        os.environ["GOVC_USERNAME"] = vCenter_user
+        os.environ["GOVC_PASSWORD"] = VC_PASSWORD
+        os.environ["GOVC_INSECURE"] = "true"
+
+        # The checks below only read the spec and query the environment, so they run side
+        # by side; the report lists how each of them went.
+        checks = TaskGraph(max_workers=PRECHECK_WORKERS, log=current_app.logger, timeout=PRECHECK_TIMEOUT)
+        vcenter = {}
+        checks.add("Docker login and connectivity",
+                   api_step(lambda: dockerLoginAndConnectivityCheck(env)))
+        vcenter_check = checks.add("vCenter inventory", lambda: precheck_vcenter_inventory(
+            env, vcenter, vCenter, vCenter_user, VC_PASSWORD, vCenter_datacenter, vCenter_cluster,
+            vCenter_datastore, portGroups))
+        checks.add("Marketplace refresh token", lambda: precheck_marketplace_token(env))
         if isEnvTkgs_wcp(env):
-            hadrs_status = verifyHADRS(content, vCenter_cluster)
-            if hadrs_status[1] != 200:
-                current_app.logger.error(hadrs_status[0])
-                d = {
-                    "responseType": "ERROR",
-                    "msg": hadrs_status[0],
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-            namespace_status = checkClusterNamespace(vCenter, vCenter_user, VC_PASSWORD, vCenter_cluster)
-            if namespace_status[1] != 200:
-                current_app.logger.error(namespace_status[0])
-                d = {
-                    "responseType": "ERROR",
-                    "msg": namespace_status[0],
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-            current_app.logger.info("Ping check on Supervisor control plane VMs' management network interfaces Ips")
-            mgmt_ping_status = pingCheckTkgsMgmtStartIp()
-            if not mgmt_ping_status[0]:
-                current_app.logger.error(mgmt_ping_status[1])
-                d = {
-                    "responseType": "ERROR",
-                    "msg": mgmt_ping_status[1],
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
+            checks.add("vSphere HA and DRS",
+                       api_step(lambda: verifyHADRS(vcenter["content"], vCenter_cluster)),
+                       depends_on=[vcenter_check])
+            checks.add("Cluster namespace", api_step(lambda: checkClusterNamespace(
+                vCenter, vCenter_user, VC_PASSWORD, vCenter_cluster)))
+            checks.add("Supervisor management IPs not in use", pingCheckTkgsMgmtStartIp,
+                       timeout=PING_CHECK_TIMEOUT)
             if checkTmcEnabled(env):
-                current_app.logger.info("Checking whether Supervisor cluster name is DNS Compliant")
-                supervisor_cluster_name = request.get_json(force=True)['envSpec']["saasEndpoints"]['tmcDetails'][
+                supervisor_cluster_name = RequestSpec.json()['envSpec']["saasEndpoints"]['tmcDetails'][
                     'tmcSupervisorClusterName']
-                dns_compliant = checkClusterNameDNSCompliant(supervisor_cluster_name, env)
-                if not dns_compliant[0]:
-                    current_app.logger.error("Failed while checking if Supervisor cluster name is DNS Compliant")
-                    d = {
-                        "responseType": "ERROR",
-                        "msg": dns_compliant[1],
-                        "STATUS_CODE": 500
-                    }
-                    return jsonify(d), 500
-
+                checks.add("Supervisor cluster name DNS compliance",
+                           lambda: checkClusterNameDNSCompliant(supervisor_cluster_name, env))
         elif isEnvTkgs_ns(env):
-            current_app.logger.info("Checking if WCP is enabled on selected cluster...")
-            cluster_id = getClusterID(vCenter, vCenter_user, VC_PASSWORD, vCenter_cluster)
-            if cluster_id[1] != 200:
-                current_app.logger.error(cluster_id[0])
-                d = {
-                    "responseType": "ERROR",
-                    "msg": cluster_id[0],
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-
-            cluster_id = cluster_id[0]
-            wcp_status = isWcpEnabled(cluster_id)
-            if wcp_status[0]:
-                current_app.logger.info("WCP check passed.")
-            else:
-                current_app.logger.error("WCP is not enabled on the given cluster - " + vCenter_cluster)
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "WCP is not enabled on the given cluster - " + vCenter_cluster,
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-            if checTSMEnabled(env) or checkToEnabled(env):
-                worker_size = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
-                    'tkgsVsphereWorkloadClusterSpec']['workerNodeCount']
-                if int(worker_size) < 3:
-                    current_app.logger.error("Minimum required number of worker nodes for SaaS integrations is 3, "
-                                             "and recommended size is medium and above")
-                    d = {
-                        "responseType": "ERROR",
-                        "msg": "Minimum required number of worker nodes for SaaS integrations is 3,"
-                               " and recommended size is medium and above",
-                        "STATUS_CODE": 500
-                    }
-                    return jsonify(d), 500
-                else:
-                    current_app.logger.info("Worker nodes requirement check passed for TSM and TO.")
-            else:
-                current_app.logger.info("TSM and TO not is enabled.")
-
-            current_app.logger.info("Checking User-Managed Packages' compatibility with provided workload cluster version")
-            if verifyVcenterVersion(Versions.VCENTER_UPDATE_TWO):
-                supported_versions = Tkgs_Extension_Details.SUPPORTED_VERSIONS_U2
-            else:
-                supported_versions = Tkgs_Extension_Details.SUPPORTED_VERSIONS_U3
-
-            cluster_version = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
-                'tkgsVsphereWorkloadClusterSpec']['tkgsVsphereWorkloadClusterVersion']
-            if not cluster_version.startswith('v'):
-                cluster_version = 'v' + cluster_version
-            if cluster_version not in supported_versions:
-                current_app.logger.warn("Provided Tanzu K8s version is not validated for User-Managed"
-                                        " Packages such as Harbor, Prometheus and Grafana - " + cluster_version)
-            else:
-                current_app.logger.info("Provided Tanzu K8s version is validated for User-Managed "
-                                        "Packages such as Harbor, Prometheus and Grafana - " + cluster_version)
-
-            policy_validation = checkWorkloadStoragePolicies(env)
-            if policy_validation[0] is None:
-                current_app.logger.error(policy_validation[1])
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Storage Policy validation failed for workload cluster",
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-            else:
-                current_app.logger.info(policy_validation[1])
-            current_app.logger.info("Checking whether Workload cluster name is DNS Compliant")
-            supervisor_cluster_name = \
-                request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
-                    'tkgsVsphereWorkloadClusterSpec'][
-                    'tkgsVsphereWorkloadClusterName']
-            dns_compliant = checkClusterNameDNSCompliant(supervisor_cluster_name, env)
-            if not dns_compliant[0]:
-                current_app.logger.error("Failed while checking if Supervisor cluster name is DNS Compliant")
-                d = {
-                    "responseType": "ERROR",
-                    "msg": dns_compliant[1],
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-        if not isEnvTkgs_ns(env):
-            current_app.logger.info("Checking if NTP server is valid")
-            valid_ntp_server = validityOfNtpServer(ntp_server=ntp_server)
-            # Checking Validity of NTP Server
-            if not valid_ntp_server[0]:
-                current_app.logger.error(valid_ntp_server[1])
-                d = {
-                    "responseType": "ERROR",
-                    "msg": valid_ntp_server[1],
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-
+            checks.add("WCP enabled", lambda: precheck_wcp_enabled(vCenter, vCenter_user, VC_PASSWORD,
+                                                                   vCenter_cluster))
+            checks.add("Worker count for SaaS integrations", lambda: precheck_saas_worker_count(env))
+            checks.add("User-managed packages compatibility", precheck_package_compatibility)
+            checks.add("Workload storage policies", lambda: precheck_workload_storage_policies(env))
+            workload_cluster_name = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+                'tkgsVsphereWorkloadClusterSpec']['tkgsVsphereWorkloadClusterName']
+            checks.add("Workload cluster name DNS compliance",
+                       lambda: checkClusterNameDNSCompliant(workload_cluster_name, env))
         if not isEnvTkgs_ns(env):
-            current_app.logger.info("NSX ALB Password complexity check..")
-            password_check = checkAVIPassword(env)
-            if not password_check[0]:
-                current_app.logger.error("NSX ALB Password and Backup passphrase must contain a combination of 3: "
-                                         "Uppercase character, Lowercase character, Numeric or Special Character.")
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Password complexity check failed for NSX ALB",
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-
+            checks.add("NTP server", lambda: validityOfNtpServer(ntp_server=ntp_server))
+            checks.add("NSX ALB password complexity", lambda: precheck_avi_password(env))
         if not (isEnvTkgs_ns(env) or env == Env.VMC):
-            # Ping test on AVI Controller IP
-            current_app.logger.info("Checking ping response for AVI Controller IPs")
-            ping_test_avi_ip = pingCheckAviControllerIp()
-            if not ping_test_avi_ip[0]:
-                current_app.logger.error(ping_test_avi_ip[1])
-                d = {
-                    "responseType": "ERROR",
-                    "msg": ping_test_avi_ip[1],
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-
-            # Checking DNS Resolution of AVI FQDN
-            current_app.logger.info("Checking that the AVI Load balancer FQDN and "
-                                    "IP addresses are valid and can be resolved successfully.")
-            avi_ip_fqdn_check = checkAVIFqdnDNSResolution()
-            if not avi_ip_fqdn_check[0]:
-                current_app.logger.error(avi_ip_fqdn_check[1])
-
-        veleroResponse = veleroPrechecks(env, isShared, isWorkload)
-        if veleroResponse[1] != 200:
+            checks.add("NSX ALB controller IPs not in use", pingCheckAviControllerIp, timeout=PING_CHECK_TIMEOUT)
+            checks.add("NSX ALB FQDN DNS resolution", precheck_avi_dns, timeout=PING_CHECK_TIMEOUT)
+            checks.add("NSX ALB static IP pools", lambda: checkAviStaticIpPools(env), timeout=PING_CHECK_TIMEOUT)
+        checks.add("Data protection", api_step(lambda: veleroPrechecks(env, isShared, isWorkload)))
+        if isEnvTkgs_wcp(env) or isEnvTkgs_ns(env):
+            checks.add("Storage policy encryption", lambda: precheck_policy_encryption(vcenter["si"], env),
+                       depends_on=[vcenter_check])
+        checks.run()
+        if not checks.ok:
+            failure = checks.failures[0]
             d = {
                 "responseType": "ERROR",
-                "msg": veleroResponse[0].json["msg"],
-                "STATUS_CODE": 500
+                "msg": str(failure.message),
+                "STATUS_CODE": 500,
+                "checks": checks.report()
             }
             return jsonify(d), 500
-        else:
-            current_app.logger.info("Data protection pre-requisites validated successfully")
-
-        current_app.logger.info("Validating given VM Storage Policies for encryption...")
-        if isEnvTkgs_wcp(env) or isEnvTkgs_ns(env):
-            encryption_validation = validatePolicies(si, env)
-            if not encryption_validation[0]:
-                current_app.logger.error(encryption_validation[1])
-                current_app.logger.error("Deployment with encrypted storage policies is not supported. "
-                                         "Please disable encryption on given policies")
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Storage Policy validation failed.",
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-            current_app.logger.info(encryption_validation[1])
 
         current_app.logger.info("Pre-check Successful")
         d = {
             "responseType": "SUCCESS",
             "msg": "Pre-check performed Successfully",
-            "STATUS_CODE": 200
+            "STATUS_CODE": 200,
+            "checks": checks.report()
         }
         return jsonify(d), 200
     else:
@@ -763,6 +440,182 @@ def precheck_env():
         return jsonify(d), 200
 
 
+def precheck_vcenter_inventory(env, vcenter, vCenter, vCenter_user, VC_PASSWORD, vCenter_datacenter,
+                               vCenter_cluster, vCenter_datastore, portGroups):
+    """
+    Connects to vCenter, stores the session in vcenter["si"] and vcenter["content"] for
+    the checks depending on it, and verifies the datacenter, cluster, datastore and
+    port groups of the spec exist.
+    """
+    try:
+        si = VcenterSessionPool.get(host=vCenter, user=vCenter_user, pwd=VC_PASSWORD)
+        content = si.RetrieveContent()
+        vcVersion = content.about.version
+    except IOError as e:
+        current_app.logger.error("Failed to connect to vCenter. " + str(e))
+        return False, "Failed to connect to vCenter. " + str(e)
+    vcenter["si"] = si
+    vcenter["content"] = content
+    try:
+        if isEnvTkgs_wcp(env) or isEnvTkgs_ns(env):
+            version_check = verifyVCVersion(vcVersion)
+            if version_check[0] is None:
+                current_app.logger.error(version_check[1])
+                return False, version_check[1]
+            current_app.logger.info("Successfully verified vCenter Version " + vcVersion)
+        # if datacenter itself is not found, pre-check fail
+        datacenter = get_dc(si, vCenter_datacenter)
+    except Exception as e:
+        current_app.logger.error(e)
+        return False, "Pre-check failed " + str(e)
+
+    errors = []
+    try:
+        cluster_obj = get_cluster(si, datacenter, vCenter_cluster)
+        if isEnvTkgs_wcp(env) or isEnvTkgs_ns(env):
+            hostCount = verify_host_count(cluster_obj)
+            if hostCount[0] is None:
+                current_app.logger.error(hostCount[1])
+                return False, hostCount[1]
+            current_app.logger.info("Successfully verified number of hosts on cluster: " + vCenter_cluster)
+    except Exception as e:
+        errors.append(e)
+
+    if not isEnvTkgs_ns(env):
+        try:
+            get_ds(si, datacenter, vCenter_datastore)
+        except Exception as e:
+            errors.append(e)
+
+        if env == Env.VSPHERE:
+            try:
+                for portgroup in portGroups:
+                    getNetwork(datacenter, portgroup)
+            except Exception as e:
+                errors.append(e)
+
+    if errors:
+        current_app.logger.error("Pre-check failed with following errors")
+        for error in errors:
+            current_app.logger.error(error)
+        return False, "Pre-check failed " + str(errors)
+    return True, "vCenter inventory verified"
+
+
+def precheck_marketplace_token(env):
+    if isEnvTkgs_ns(env):
+        refreshToken = ""
+    elif env == Env.VSPHERE or env == Env.VCF:
+        refreshToken = RequestSpec.json()['envSpec']['marketplaceSpec']['refreshToken']
+    elif env == Env.VMC:
+        refreshToken = RequestSpec.json()['marketplaceSpec']['refreshToken']
+    if not refreshToken:
+        current_app.logger.info("MarketPlace refreshToken is not provided")
+        return True, "MarketPlace refreshToken is not provided"
+    token_valdity = validateMarketplaceRefreshToken()
+    if token_valdity[1] != 200:
+        current_app.logger.error(
+            "Marketplace token validation failed. Please ensure connectivity to external networks.")
+        return False, "Marketplace token validation failed. Please ensure connectivity to external networks."
+    return True, "Marketplace refresh token validated"
+
+
+def precheck_wcp_enabled(vCenter, vCenter_user, VC_PASSWORD, vCenter_cluster):
+    current_app.logger.info("Checking if WCP is enabled on selected cluster...")
+    cluster_id = getClusterID(vCenter, vCenter_user, VC_PASSWORD, vCenter_cluster)
+    if cluster_id[1] != 200:
+        return api_step(lambda: cluster_id)()
+    wcp_status = isWcpEnabled(cluster_id[0])
+    if not wcp_status[0]:
+        current_app.logger.error("WCP is not enabled on the given cluster - " + vCenter_cluster)
+        return False, "WCP is not enabled on the given cluster - " + vCenter_cluster
+    current_app.logger.info("WCP check passed.")
+    return True, "WCP check passed."
+
+
+def precheck_saas_worker_count(env):
+    if not (checTSMEnabled(env) or checkToEnabled(env)):
+        current_app.logger.info("TSM and TO not is enabled.")
+        return True, "TSM and TO not is enabled."
+    worker_size = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+        'tkgsVsphereWorkloadClusterSpec']['workerNodeCount']
+    if int(worker_size) < 3:
+        current_app.logger.error("Minimum required number of worker nodes for SaaS integrations is 3, "
+                                 "and recommended size is medium and above")
+        return False, "Minimum required number of worker nodes for SaaS integrations is 3," \
+                      " and recommended size is medium and above"
+    current_app.logger.info("Worker nodes requirement check passed for TSM and TO.")
+    return True, "Worker nodes requirement check passed for TSM and TO."
+
+
+def precheck_package_compatibility():
+    """
+    Only warns: packages may still work on versions they were not validated with.
+    """
+    current_app.logger.info("Checking User-Managed Packages' compatibility with provided workload cluster version")
+    if verifyVcenterVersion(Versions.VCENTER_UPDATE_TWO):
+        supported_versions = Tkgs_Extension_Details.SUPPORTED_VERSIONS_U2
+    else:
+        supported_versions = Tkgs_Extension_Details.SUPPORTED_VERSIONS_U3
+
+    cluster_version = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+        'tkgsVsphereWorkloadClusterSpec']['tkgsVsphereWorkloadClusterVersion']
+    if not cluster_version.startswith('v'):
+        cluster_version = 'v' + cluster_version
+    if cluster_version not in supported_versions:
+        msg = "Provided Tanzu K8s version is not validated for User-Managed" \
+              " Packages such as Harbor, Prometheus and Grafana - " + cluster_version
+        current_app.logger.warn(msg)
+    else:
+        msg = "Provided Tanzu K8s version is validated for User-Managed " \
+              "Packages such as Harbor, Prometheus and Grafana - " + cluster_version
+        current_app.logger.info(msg)
+    return True, msg
+
+
+def precheck_workload_storage_policies(env):
+    policy_validation = checkWorkloadStoragePolicies(env)
+    if policy_validation[0] is None:
+        current_app.logger.error(policy_validation[1])
+        return False, "Storage Policy validation failed for workload cluster"
+    current_app.logger.info(policy_validation[1])
+    return True, policy_validation[1]
+
+
+def precheck_avi_password(env):
+    current_app.logger.info("NSX ALB Password complexity check..")
+    password_check = checkAVIPassword(env)
+    if not password_check[0]:
+        current_app.logger.error("NSX ALB Password and Backup passphrase must contain a combination of 3: "
+                                 "Uppercase character, Lowercase character, Numeric or Special Character.")
+        return False, "Password complexity check failed for NSX ALB"
+    return True, "Password complexity check passed for NSX ALB"
+
+
+def precheck_avi_dns():
+    """
+    Only reports: a FQDN that does not resolve yet does not fail the pre-check.
+    """
+    current_app.logger.info("Checking that the AVI Load balancer FQDN and "
+                            "IP addresses are valid and can be resolved successfully.")
+    avi_ip_fqdn_check = checkAVIFqdnDNSResolution()
+    if not avi_ip_fqdn_check[0]:
+        current_app.logger.error(avi_ip_fqdn_check[1])
+    return True, avi_ip_fqdn_check[1]
+
+
+def precheck_policy_encryption(si, env):
+    current_app.logger.info("Validating given VM Storage Policies for encryption...")
+    encryption_validation = validatePolicies(si, env)
+    if not encryption_validation[0]:
+        current_app.logger.error(encryption_validation[1])
+        current_app.logger.error("Deployment with encrypted storage policies is not supported. "
+                                 "Please disable encryption on given policies")
+        return False, "Storage Policy validation failed."
+    current_app.logger.info(encryption_validation[1])
+    return True, encryption_validation[1]
+
+
 @vcenter_precheck.route("/api/tanzu/validateIP", methods=['POST'])
 def validateip():
     env = envCheck()
@@ -778,39 +631,39 @@ def validateip():
     errors = []
     current_app.logger.info("Performing IP Validation")
     if env == Env.VSPHERE or env == Env.VCF:
-        avi_mgmt_cidr = request.get_json(force=True)['tkgComponentSpec']['aviMgmtNetwork'][
+        avi_mgmt_cidr = RequestSpec.json()['tkgComponentSpec']['aviMgmtNetwork'][
             'aviMgmtNetworkGatewayCidr']
-        tkg_mgmt_cidr = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+        tkg_mgmt_cidr = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
             'tkgMgmtGatewayCidr']
-        tkg_mgmt_data_cidr = request.get_json(force=True)['tkgMgmtDataNetwork']['tkgMgmtDataNetworkGatewayCidr']
-        tkg_work_data_cidr = request.get_json(force=True)['tkgWorkloadDataNetwork'][
+        tkg_mgmt_data_cidr = RequestSpec.json()['tkgMgmtDataNetwork']['tkgMgmtDataNetworkGatewayCidr']
+        tkg_work_data_cidr = RequestSpec.json()['tkgWorkloadDataNetwork'][
             'tkgWorkloadDataNetworkGatewayCidr']
-        tkg_work_comp_cidr = request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadGatewayCidr']
+        tkg_work_comp_cidr = RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadGatewayCidr']
 
-        if ipaddress.IPv4Address(request.get_json(force=True)['tkgComponentSpec']['aviMgmtNetwork'][
+        if ipaddress.IPv4Address(RequestSpec.json()['tkgComponentSpec']['aviMgmtNetwork'][
                                      'aviMgmtServiceIpStartRange']) in ipaddress.IPv4Network(avi_mgmt_cidr,
                                                                                              False) and \
-                ipaddress.IPv4Address(request.get_json(force=True)['tkgComponentSpec']['aviMgmtNetwork'][
+                ipaddress.IPv4Address(RequestSpec.json()['tkgComponentSpec']['aviMgmtNetwork'][
                                           'aviMgmtServiceIpEndRange']) in ipaddress.IPv4Network(avi_mgmt_cidr,
                                                                                                 False):
             current_app.logger.info('aviMgmtNetwork IP validation passed')
         else:
             errors.append("aviMgmtNetwork IP Validation failed")
 
-        if ipaddress.IPv4Address(request.get_json(force=True)['tkgMgmtDataNetwork'][
+        if ipaddress.IPv4Address(RequestSpec.json()['tkgMgmtDataNetwork'][
                                      'tkgMgmtAviServiceIpStartRange']) in ipaddress.IPv4Network(tkg_mgmt_data_cidr,
                                                                                                 False) and \
-                ipaddress.IPv4Address(request.get_json(force=True)['tkgMgmtDataNetwork'][
+                ipaddress.IPv4Address(RequestSpec.json()['tkgMgmtDataNetwork'][
                                           'tkgMgmtAviServiceIpEndRange']) in ipaddress.IPv4Network(
             tkg_mgmt_data_cidr, False):
             current_app.logger.info('tkgMgmtDataNetwork IP validation passed')
         else:
             errors.append("tkgMgmtDataNetwork IP Validation failed")
 
-        if ipaddress.IPv4Address(request.get_json(force=True)['tkgWorkloadDataNetwork'][
+        if ipaddress.IPv4Address(RequestSpec.json()['tkgWorkloadDataNetwork'][
                                      'tkgWorkloadAviServiceIpStartRange']) in ipaddress.IPv4Network(
             tkg_work_data_cidr, False) and \
-                ipaddress.IPv4Address(request.get_json(force=True)['tkgWorkloadDataNetwork'][
+                ipaddress.IPv4Address(RequestSpec.json()['tkgWorkloadDataNetwork'][
                                           'tkgWorkloadAviServiceIpEndRange']) in ipaddress.IPv4Network(
             tkg_work_data_cidr, False):
             current_app.logger.info('tkgWorkloadDataNetwork IP validation passed')
@@ -818,37 +671,37 @@ def validateip():
             errors.append("tkgWorkloadDataNetwork IP Validation failed")
 
     elif env == Env.VMC:
-        tkg_shared_cidr = request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec'][
+        tkg_shared_cidr = RequestSpec.json()['componentSpec']['tkgSharedServiceSpec'][
             'tkgSharedGatewayCidr']
-        avi_mgmt_nw_cidr = request.get_json(force=True)['componentSpec']['aviMgmtNetworkSpec'][
+        avi_mgmt_nw_cidr = RequestSpec.json()['componentSpec']['aviMgmtNetworkSpec'][
             'aviMgmtGatewayCidr']
-        tkg_mgmt_data_cidr = request.get_json(force=True)['componentSpec']['tkgMgmtDataNetworkSpec'][
+        tkg_mgmt_data_cidr = RequestSpec.json()['componentSpec']['tkgMgmtDataNetworkSpec'][
             'tkgMgmtDataGatewayCidr']
-        tkg_work_data_cidr = request.get_json(force=True)['componentSpec']['tkgWorkloadDataNetworkSpec'][
+        tkg_work_data_cidr = RequestSpec.json()['componentSpec']['tkgWorkloadDataNetworkSpec'][
             'tkgWorkloadDataGatewayCidr']
-        tkg_workload_cidr = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec'][
+        tkg_workload_cidr = RequestSpec.json()['componentSpec']['tkgWorkloadSpec'][
             'tkgWorkloadGatewayCidr']
 
-        if ipaddress.IPv4Address(request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec'][
+        if ipaddress.IPv4Address(RequestSpec.json()['componentSpec']['tkgSharedServiceSpec'][
                                      'tkgSharedDhcpStartRange']) in ipaddress.IPv4Network(tkg_shared_cidr, False) and \
-                ipaddress.IPv4Address(request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec'][
+                ipaddress.IPv4Address(RequestSpec.json()['componentSpec']['tkgSharedServiceSpec'][
                                           'tkgSharedDhcpEndRange']) in ipaddress.IPv4Network(tkg_shared_cidr, False):
             current_app.logger.info('tkgSharedServiceSpec IP validation passed')
         else:
             errors.append("tkgSharedServiceSpec IP Validation failed")
 
-        if ipaddress.IPv4Address(request.get_json(force=True)['componentSpec']['aviMgmtNetworkSpec'][
+        if ipaddress.IPv4Address(RequestSpec.json()['componentSpec']['aviMgmtNetworkSpec'][
                                      'aviMgmtDhcpStartRange']) in ipaddress.IPv4Network(avi_mgmt_nw_cidr, False) and \
-                ipaddress.IPv4Address(request.get_json(force=True)['componentSpec']['aviMgmtNetworkSpec'][
+                ipaddress.IPv4Address(RequestSpec.json()['componentSpec']['aviMgmtNetworkSpec'][
                                           'aviMgmtDhcpEndRange']) in ipaddress.IPv4Network(avi_mgmt_nw_cidr, False):
             current_app.logger.info('aviMgmtNetworkSpec IP validation passed')
         else:
             errors.append("aviMgmtNetworkSpec IP Validation failed")
 
-        if ipaddress.IPv4Address(request.get_json(force=True)['componentSpec']['tkgMgmtDataNetworkSpec'][
+        if ipaddress.IPv4Address(RequestSpec.json()['componentSpec']['tkgMgmtDataNetworkSpec'][
                                      'tkgMgmtDataDhcpStartRange']) in ipaddress.IPv4Network(tkg_mgmt_data_cidr,
                                                                                             False) and \
-                ipaddress.IPv4Address(request.get_json(force=True)['componentSpec']['tkgMgmtDataNetworkSpec'][
+                ipaddress.IPv4Address(RequestSpec.json()['componentSpec']['tkgMgmtDataNetworkSpec'][
                                           'tkgMgmtDataDhcpEndRange']) in ipaddress.IPv4Network(tkg_mgmt_data_cidr,
                                                                                                False):
 
@@ -856,20 +709,20 @@ def validateip():
         else:
             errors.append("tkgMgmtDataNetworkSpec IP Validation failed")
 
-        if ipaddress.IPv4Address(request.get_json(force=True)['componentSpec']['tkgWorkloadDataNetworkSpec'][
+        if ipaddress.IPv4Address(RequestSpec.json()['componentSpec']['tkgWorkloadDataNetworkSpec'][
                                      'tkgWorkloadDataDhcpStartRange']) in ipaddress.IPv4Network(tkg_work_data_cidr,
                                                                                                 False) and \
-                ipaddress.IPv4Address(request.get_json(force=True)['componentSpec']['tkgWorkloadDataNetworkSpec'][
+                ipaddress.IPv4Address(RequestSpec.json()['componentSpec']['tkgWorkloadDataNetworkSpec'][
                                           'tkgWorkloadDataDhcpEndRange']) in ipaddress.IPv4Network(
             tkg_work_data_cidr, False):
             current_app.logger.info('tkgWorkloadDataNetworkSpec IP validation passed')
         else:
             errors.append("tkgWorkloadDataNetworkSpec IP Validation failed")
 
-        if ipaddress.IPv4Address(request.get_json(force=True)['componentSpec']['tkgWorkloadSpec'][
+        if ipaddress.IPv4Address(RequestSpec.json()['componentSpec']['tkgWorkloadSpec'][
                                      'tkgWorkloadDhcpStartRange']) in ipaddress.IPv4Network(tkg_workload_cidr,
                                                                                             False) and \
-                ipaddress.IPv4Address(request.get_json(force=True)['componentSpec']['tkgWorkloadSpec'][
+                ipaddress.IPv4Address(RequestSpec.json()['componentSpec']['tkgWorkloadSpec'][
                                           'tkgWorkloadDhcpEndRange']) in ipaddress.IPv4Network(tkg_workload_cidr,
                                                                                                False):
             current_app.logger.info('tkgWorkloadSpec IP validation passed')
@@ -910,7 +763,7 @@ def validateTMCRefreshToken():
     env = env[0]
     try:
         if env == Env.VSPHERE or env == Env.VCF:
-            tmc_availability = request.get_json(force=True)['envSpec']["saasEndpoints"]['tmcDetails'][
+            tmc_availability = RequestSpec.json()['envSpec']["saasEndpoints"]['tmcDetails'][
                 'tmcAvailability']
             if tmc_availability.lower() == 'false':
                 current_app.logger.info("Skipping TMC refresh token validation as tmcAvailability is set to false")
@@ -921,10 +774,10 @@ def validateTMCRefreshToken():
                 }
                 return jsonify(d), 200
             else:
-                TMC_TOKEN = request.get_json(force=True)['envSpec']["saasEndpoints"]['tmcDetails'][
+                TMC_TOKEN = RequestSpec.json()['envSpec']["saasEndpoints"]['tmcDetails'][
                     'tmcRefreshToken']
         elif env == Env.VMC:
-            TMC_TOKEN = request.get_json(force=True)["saasEndpoints"]['tmcDetails']['tmcRefreshToken']
+            TMC_TOKEN = RequestSpec.json()["saasEndpoints"]['tmcDetails']['tmcRefreshToken']
 
         if not TMC_TOKEN:
             current_app.logger.error("TMC refresh token is found null, please enter a valid TMC token")
@@ -974,7 +827,7 @@ def validateSDDCRefreshToken():
     env = env[0]
     try:
         if env == Env.VMC:
-            SDDC_TOKEN = request.get_json(force=True)['envSpec']['sddcRefreshToken']
+            SDDC_TOKEN = RequestSpec.json()['envSpec']['sddcRefreshToken']
             if not SDDC_TOKEN:
                 current_app.logger.error("SDDC refresh token is found null, please enter a valid SDDC token")
                 d = {
@@ -1021,9 +874,9 @@ def validateMarketplaceRefreshToken():
     env = env[0]
     try:
         if env == Env.VMC:
-            REFRESH_TOKEN = request.get_json(force=True)['marketplaceSpec']['refreshToken']
+            REFRESH_TOKEN = RequestSpec.json()['marketplaceSpec']['refreshToken']
         elif env == Env.VSPHERE or env == Env.VCF:
-            REFRESH_TOKEN = request.get_json(force=True)['envSpec']['marketplaceSpec']['refreshToken']
+            REFRESH_TOKEN = RequestSpec.json()['envSpec']['marketplaceSpec']['refreshToken']
             if not REFRESH_TOKEN:
                 current_app.logger.error(
                     "Marketplace refresh token is found null, please enter a valid marketplace token")
@@ -1116,10 +969,10 @@ def aviNameResolution():
         return jsonify(d), 500
     env = env[0]
     if not (isEnvTkgs_ns(env) or env == Env.VMC):
-        current_app.config['VC_IP'] = request.get_json(force=True)['envSpec']['vcenterDetails']["vcenterAddress"]
-        current_app.config['VC_USER'] = request.get_json(force=True)['envSpec']['vcenterDetails']["vcenterSsoUser"]
+        current_app.config['VC_IP'] = RequestSpec.json()['envSpec']['vcenterDetails']["vcenterAddress"]
+        current_app.config['VC_USER'] = RequestSpec.json()['envSpec']['vcenterDetails']["vcenterSsoUser"]
         current_app.config['VC_PASSWORD'] = decode_from_b64(
-            request.get_json(force=True)['envSpec']['vcenterDetails']["vcenterSsoPasswordBase64"])
+            RequestSpec.json()['envSpec']['vcenterDetails']["vcenterSsoPasswordBase64"])
         # vCenter = current_app.config['VC_IP']
         # vc_user = current_app.config['VC_USER']
         # vc_password = current_app.config['VC_PASSWORD']
@@ -1356,12 +1209,9 @@ def checkClusterNamespace(vCenter, vCenter_user, VC_PASSWORD, cluster):
 
 
 def isWcpEnabled(cluster_id):
-    vcenter_ip = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterAddress']
-    vcenter_username = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterSsoUser']
-    str_enc = str(request.get_json(force=True)['envSpec']['vcenterDetails']["vcenterSsoPasswordBase64"])
-    base64_bytes = str_enc.encode('ascii')
-    enc_bytes = base64.b64decode(base64_bytes)
-    password = enc_bytes.decode('ascii').rstrip("\n")
+    vcenter_ip = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterAddress']
+    vcenter_username = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterSsoUser']
+    password = RequestSpec.secret("envSpec", "vcenterDetails", "vcenterSsoPasswordBase64")
     if not (vcenter_ip or vcenter_username or password):
         return None, "Failed to fetch VC details"
 
@@ -1424,7 +1274,7 @@ def getClusterVersionsFullList(vCenter, vcenter_username, password, cluster):
             return jsonify(d), 500
 
         current_app.logger.info("logging into cluster - " + endpoint_ip)
-        os.putenv("KUBECTL_VSPHERE_PASSWORD", password)
+        os.environ["KUBECTL_VSPHERE_PASSWORD"] = password
         connect_command = ["kubectl", "vsphere", "login", "--server=" + endpoint_ip,
                            "--vsphere-username=" + vcenter_username,
                            "--insecure-skip-tls-verify"]
@@ -1504,11 +1354,11 @@ def GetPbmConnection(vpxdStub):
 def validatePolicies(si, env):
     policies = []
     if isEnvTkgs_wcp(env):
-        policies.append(str(request.get_json(force=True)["tkgsComponentSpec"]["tkgsStoragePolicySpec"]["imageStoragePolicy"]))
-        policies.append(str(request.get_json(force=True)["tkgsComponentSpec"]["tkgsStoragePolicySpec"]["ephemeralStoragePolicy"]))
-        policies.append(str(request.get_json(force=True)["tkgsComponentSpec"]["tkgsStoragePolicySpec"]["masterStoragePolicy"]))
+        policies.append(str(RequestSpec.json()["tkgsComponentSpec"]["tkgsStoragePolicySpec"]["imageStoragePolicy"]))
+        policies.append(str(RequestSpec.json()["tkgsComponentSpec"]["tkgsStoragePolicySpec"]["ephemeralStoragePolicy"]))
+        policies.append(str(RequestSpec.json()["tkgsComponentSpec"]["tkgsStoragePolicySpec"]["masterStoragePolicy"]))
     elif isEnvTkgs_ns(env):
-        namespace_specs = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+        namespace_specs = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
             'tkgsVsphereNamespaceStorageSpec']
 
         for storage_policy in namespace_specs:
@@ -1562,7 +1412,7 @@ def is_encrypted_policy(capabilities, policy):
 
 def checkWorkloadStoragePolicies(env):
     try:
-        namespace_specs = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+        namespace_specs = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
             'tkgsVsphereNamespaceStorageSpec']
 
         namespace_policies = []
@@ -1578,13 +1428,13 @@ def checkWorkloadStoragePolicies(env):
             for storage_policy in namespace_specs:
                 namespace_policies.append(storage_policy['storagePolicy'])
 
-        allowed_clases = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+        allowed_clases = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
             'tkgsVsphereWorkloadClusterSpec']['allowedStorageClasses']
 
-        default_storage_class = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+        default_storage_class = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
             'tkgsVsphereWorkloadClusterSpec']['defaultStorageClass']
 
-        node_storage_class = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+        node_storage_class = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
             'tkgsVsphereWorkloadClusterSpec']['nodeStorageClass']
 
         for policy in allowed_clases:
@@ -1614,69 +1464,69 @@ def checkAVIFqdnDNSResolution():
         env = envCheck()
         env = env[0]
         avi_controller_fqdn_ip_dict = dict()
-        dns_server = request.get_json(force=True)['envSpec']['infraComponents']['dnsServersIp']
+        dns_server = RequestSpec.json()['envSpec']['infraComponents']['dnsServersIp']
         if isAviHaEnabled(env):
             if isEnvTkgs_wcp(env):
-                fqdn = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviController01Fqdn']
-                ip = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviController01Ip']
+                fqdn = RequestSpec.json()['tkgsComponentSpec']['aviComponents']['aviController01Fqdn']
+                ip = RequestSpec.json()['tkgsComponentSpec']['aviComponents']['aviController01Ip']
                 if fqdn and ip:
                     avi_controller_fqdn_ip_dict[fqdn] = ip
                 else:
                     return False, "Provide NSX ALB Controller node-01 Fqdn and IP"
-                fqdn = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviController02Fqdn']
-                ip = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviController02Ip']
+                fqdn = RequestSpec.json()['tkgsComponentSpec']['aviComponents']['aviController02Fqdn']
+                ip = RequestSpec.json()['tkgsComponentSpec']['aviComponents']['aviController02Ip']
                 if fqdn and ip:
                     avi_controller_fqdn_ip_dict[fqdn] = ip
                 else:
                     return False, "Provide NSX ALB Controller node-02 Fqdn and IP"
-                fqdn = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviController03Fqdn']
-                ip = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviController03Ip']
+                fqdn = RequestSpec.json()['tkgsComponentSpec']['aviComponents']['aviController03Fqdn']
+                ip = RequestSpec.json()['tkgsComponentSpec']['aviComponents']['aviController03Ip']
                 if fqdn and ip:
                     avi_controller_fqdn_ip_dict[fqdn] = ip
                 else:
                     return False, "Provide NSX ALB Controller node-03 Fqdn and IP"
-                fqdn = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviClusterFqdn']
-                ip = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviClusterIp']
+                fqdn = RequestSpec.json()['tkgsComponentSpec']['aviComponents']['aviClusterFqdn']
+                ip = RequestSpec.json()['tkgsComponentSpec']['aviComponents']['aviClusterIp']
                 if fqdn and ip:
                     avi_controller_fqdn_ip_dict[fqdn] = ip
                 else:
                     return False, "Provide NSX ALB Controller Cluster Fqdn and IP"
             elif env == Env.VSPHERE or env == Env.VCF:
-                fqdn = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController01Fqdn']
-                ip = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController01Ip']
+                fqdn = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviController01Fqdn']
+                ip = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviController01Ip']
                 if fqdn and ip:
                     avi_controller_fqdn_ip_dict[fqdn] = ip
                 else:
                     return False, "Provide NSX ALB Controller node-01 Fqdn and IP"
-                fqdn = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController02Fqdn']
-                ip = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController02Ip']
+                fqdn = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviController02Fqdn']
+                ip = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviController02Ip']
                 if fqdn and ip:
                     avi_controller_fqdn_ip_dict[fqdn] = ip
                 else:
                     return False, "Provide NSX ALB Controller node-02 Fqdn and IP"
-                fqdn = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController03Fqdn']
-                ip = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController03Ip']
+                fqdn = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviController03Fqdn']
+                ip = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviController03Ip']
                 if fqdn and ip:
                     avi_controller_fqdn_ip_dict[fqdn] = ip
                 else:
                     return False, "Provide NSX ALB Controller node-03 Fqdn and IP"
-                fqdn = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviClusterFqdn']
-                ip = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviClusterIp']
+                fqdn = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviClusterFqdn']
+                ip = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviClusterIp']
                 if fqdn and ip:
                     avi_controller_fqdn_ip_dict[fqdn] = ip
                 else:
                     return False, "Provide NSX ALB Controller Cluster Fqdn and IP"
         else:
             if isEnvTkgs_wcp(env):
-                fqdn = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviController01Fqdn']
-                ip = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviController01Ip']
+                fqdn = RequestSpec.json()['tkgsComponentSpec']['aviComponents']['aviController01Fqdn']
+                ip = RequestSpec.json()['tkgsComponentSpec']['aviComponents']['aviController01Ip']
                 if fqdn and ip:
                     avi_controller_fqdn_ip_dict[fqdn] = ip
                 else:
                     return False, "Provide NSX ALB Controller node-01 Fqdn and IP"
             elif env == Env.VSPHERE or env == Env.VCF:
-                fqdn = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController01Fqdn']
-                ip = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController01Ip']
+                fqdn = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviController01Fqdn']
+                ip = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviController01Ip']
                 if fqdn and ip:
                     avi_controller_fqdn_ip_dict[fqdn] = ip
                 else:
@@ -1735,10 +1585,10 @@ def validityOfNtpServer(ntp_server):
 
 def pingCheckTkgsMgmtStartIp():
     try:
-        vCenter = request.get_json(force=True)['envSpec']['vcenterDetails']["vcenterAddress"]
-        vc_user = request.get_json(force=True)['envSpec']['vcenterDetails']["vcenterSsoUser"]
+        vCenter = RequestSpec.json()['envSpec']['vcenterDetails']["vcenterAddress"]
+        vc_user = RequestSpec.json()['envSpec']['vcenterDetails']["vcenterSsoUser"]
         vc_password = decode_from_b64(
-            request.get_json(force=True)['envSpec']['vcenterDetails']["vcenterSsoPasswordBase64"])
+            RequestSpec.json()['envSpec']['vcenterDetails']["vcenterSsoPasswordBase64"])
         # vCenter = current_app.config['VC_IP']
         # vc_user = current_app.config['VC_USER']
         # vc_password = current_app.config['VC_PASSWORD']
@@ -1753,7 +1603,7 @@ def pingCheckTkgsMgmtStartIp():
             "Content-Type": "application/json",
             "vmware-api-session-id": vc_session
         }
-        cluster_name = request.get_json(force=True)["envSpec"]["vcenterDetails"]["vcenterCluster"]
+        cluster_name = RequestSpec.json()["envSpec"]["vcenterDetails"]["vcenterCluster"]
         id = getClusterID(vCenter, vc_user, vc_password, cluster_name)
 
         if id[1] != 200:
@@ -1787,24 +1637,16 @@ def pingCheckTkgsMgmtStartIp():
         if isRunning:
             current_app.logger.info("Wcp is already enabled")
             return True, "WCP is already enabled, skipping ping test for  Supervisor control plane VM IPs"
-        start_ip = request.get_json(force=True)['tkgsComponentSpec']['tkgsMgmtNetworkSpec']['tkgsMgmtNetworkStartingIp']
-        counter = 0
-        start = int(ipaddress.IPv4Address(start_ip))
-        for i in range(start, int(2 ** 32) + 1):
-            ip = str(ipaddress.IPv4Address(i))
-            if counter < 5:
-                current_app.logger.info("Ping check on: " + ip)
-                if ping_test("ping -c 1 " + ip) != 0:
-                    counter = counter + 1
-                else:
-                    return False, "IP address " + ip + " is responding to ping. Please ensure that the IP is unused"
-            else:
-                current_app.logger.info("All 5 consecutive Supervisor control plane VMs' management network "
-                                        "interfaces Ips did not respond to ping.")
-                return True, "All 5 consecutive Supervisor control plane VMs' management network interfaces Ips did " \
-                             "not respond to ping. "
-        return True, "All 5 consecutive Supervisor control plane VMs' management network interfaces Ips did not " \
-                     "respond to ping. "
+        start_ip = RequestSpec.json()['tkgsComponentSpec']['tkgsMgmtNetworkSpec']['tkgsMgmtNetworkStartingIp']
+        end_ip = str(ipaddress.IPv4Address(start_ip) + 4)
+        current_app.logger.info("Ping check on: " + start_ip + " - " + end_ip)
+        responding = PingSweep.responding(PingSweep.expand(start_ip, end_ip))
+        if responding:
+            return False, "IP address " + responding[0] + " is responding to ping. Please ensure that the IP is unused"
+        current_app.logger.info("All 5 consecutive Supervisor control plane VMs' management network "
+                                "interfaces Ips did not respond to ping.")
+        return True, "All 5 consecutive Supervisor control plane VMs' management network interfaces Ips did " \
+                     "not respond to ping. "
     except Exception as e:
         current_app.logger.error(str(e))
         return False, "Exception occurred while pinging Supervisor control plane VMs' management network interfaces Ips"
@@ -1815,77 +1657,70 @@ def pingCheckAviControllerIp():
         env = envCheck()
         env = env[0]
         govc_client = GovcClient(current_app.config, LocalCmdHelper())
-        if isAviHaEnabled(env):
-            if isEnvTkgs_wcp(env):
-                fqdn = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviController01Fqdn']
-                ip = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviController01Ip']
-                if fqdn and ip:
-                    if not govc_client.find_vms_by_name(vm_name=fqdn):
-                        current_app.logger.info("NSX ALB Controller Node01 vm not found, verifying with ping test")
-                        if ping_test("ping -c 1 " + ip) == 0:
-                            return False, "NSX ALB Controller node01 IP: " + ip + " is responding to ping."
-                fqdn = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviController02Fqdn']
-                ip = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviController02Ip']
-                if fqdn and ip:
-                    if not govc_client.find_vms_by_name(vm_name=fqdn):
-                        if ping_test("ping -c 1 " + ip) == 0:
-                            current_app.logger.info("NSX ALB Controller Node02 vm not found, verifying with ping test")
-                            return False, "NSX ALB Controller node02 IP: " + ip + " is responding to ping."
-                fqdn = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviController03Fqdn']
-                ip = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviController03Ip']
-                if fqdn and ip:
-                    if not govc_client.find_vms_by_name(vm_name=fqdn):
-                        current_app.logger.info("NSX ALB Controller Node03 vm not found, verifying with ping test")
-                        if ping_test("ping -c 1 " + ip) == 0:
-                            return False, "NSX ALB Controller node03 IP: " + ip + " is responding to ping."
-            elif env == Env.VSPHERE or env == Env.VCF:
-                fqdn = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController01Fqdn']
-                ip = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController01Ip']
-                if fqdn and ip:
-                    if not govc_client.find_vms_by_name(vm_name=fqdn):
-                        current_app.logger.info("NSX ALB Controller Node01 vm not found, verifying with ping test")
-                        if ping_test("ping -c 1 " + ip) == 0:
-                            return False, "NSX ALB Controller node01 IP: " + ip + " is responding to ping."
-
-                fqdn = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController02Fqdn']
-                ip = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController02Ip']
-                if fqdn and ip:
-                    if not govc_client.find_vms_by_name(vm_name=fqdn):
-                        current_app.logger.info("NSX ALB Controller Node02 vm not found, verifying with ping test")
-                        if ping_test("ping -c 1 " + ip) == 0:
-                            return False, "NSX ALB Controller node02 IP: " + ip + " is responding to ping."
-
-                fqdn = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController03Fqdn']
-                ip = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController03Ip']
-                if fqdn and ip:
-                    if not govc_client.find_vms_by_name(vm_name=fqdn):
-                        current_app.logger.info("NSX ALB Controller Node03 vm not found, verifying with ping test")
-                        if ping_test("ping -c 1 " + ip) == 0:
-                            return False, "NSX ALB Controller node03 IP: " + ip + " is responding to ping."
+        if isEnvTkgs_wcp(env):
+            avi_components = RequestSpec.json()['tkgsComponentSpec']['aviComponents']
+        elif env == Env.VSPHERE or env == Env.VCF:
+            avi_components = RequestSpec.json()['tkgComponentSpec']['aviComponents']
         else:
-            if isEnvTkgs_wcp(env):
-                fqdn = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviController01Fqdn']
-                ip = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviController01Ip']
-                if fqdn and ip:
-                    if not govc_client.find_vms_by_name(vm_name=fqdn):
-                        current_app.logger.info("NSX ALB Controller Node01 vm not found, verifying with ping test")
-                        if ping_test("ping -c 1 " + ip) == 0:
-                            return False, "NSX ALB Controller node01 IP: " + ip + " is responding to ping."
-
-            elif env == Env.VSPHERE or env == Env.VCF:
-                fqdn = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController01Fqdn']
-                ip = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController01Ip']
-                if fqdn and ip:
-                    if not govc_client.find_vms_by_name(vm_name=fqdn):
-                        current_app.logger.info("NSX ALB Controller Node01 vm not found, verifying with ping test")
-                        if ping_test("ping -c 1 " + ip) == 0:
-                            return False, "NSX ALB Controller node01 IP: " + ip + " is responding to ping."
+            return True, "Ping test successful on AVI Controller IPs"
+        nodes = ["01", "02", "03"] if isAviHaEnabled(env) else ["01"]
+        # Only controllers not deployed yet must have unused IPs.
+        candidates = {}
+        for node in nodes:
+            fqdn = avi_components['aviController' + node + 'Fqdn']
+            ip = avi_components['aviController' + node + 'Ip']
+            if fqdn and ip and not govc_client.find_vms_by_name(vm_name=fqdn):
+                current_app.logger.info("NSX ALB Controller Node" + node + " vm not found, verifying with ping test")
+                candidates[node] = ip
+        responding = PingSweep.responding(candidates.values())
+        for node, ip in candidates.items():
+            if ip in responding:
+                return False, "NSX ALB Controller node" + node + " IP: " + ip + " is responding to ping."
         return True, "Ping test successful on AVI Controller IPs"
     except Exception as e:
         current_app.logger.error(str(e))
         return False, "Exception occurred while pinging AVI Controller IPs"
 
 
+def checkAviStaticIpPools(env):
+    """
+    Sweeps the NSX ALB static IP pools of the spec for addresses already in use. Only
+    warns: on a re-run the pools are rightfully used by the deployed service engines.
+    """
+    try:
+        pools = []
+        if isEnvTkgs_wcp(env):
+            spec = RequestSpec.json()['tkgsComponentSpec']
+            pools.append(("NSX ALB management", spec['aviMgmtNetwork'], 'aviMgmtServiceIp'))
+            pools.append(("TKGs VIP", spec['tkgsVipNetwork'], 'tkgsVipIp'))
+        elif env == Env.VSPHERE or env == Env.VCF:
+            spec = RequestSpec.json()
+            pools.append(("NSX ALB management", spec['tkgComponentSpec']['aviMgmtNetwork'], 'aviMgmtServiceIp'))
+            pools.append(("Cluster VIP", spec['tkgComponentSpec']['tkgClusterVipNetwork'], 'tkgClusterVipIp'))
+            if env == Env.VSPHERE:
+                pools.append(("Management data", spec['tkgMgmtDataNetwork'], 'tkgMgmtAviServiceIp'))
+                pools.append(("Workload data", spec['tkgWorkloadDataNetwork'], 'tkgWorkloadAviServiceIp'))
+        pool_addresses = {}
+        for name, network, prefix in pools:
+            start = network[prefix + 'StartRange']
+            end = network[prefix + 'EndRange']
+            if start and end:
+                pool_addresses[name] = PingSweep.expand(start, end)
+        responding = set(PingSweep.responding(ip for addresses in pool_addresses.values() for ip in addresses))
+        in_use = []
+        for name, addresses in pool_addresses.items():
+            used = [ip for ip in addresses if ip in responding]
+            if used:
+                current_app.logger.warn(name + " static IP pool addresses responding to ping: " + ", ".join(used))
+                in_use.append(name + ": " + ", ".join(used))
+        if in_use:
+            return True, "Static IP pool addresses already in use - " + "; ".join(in_use)
+        return True, "No address of the NSX ALB static IP pools responded to ping"
+    except Exception as e:
+        current_app.logger.warn("Exception occurred while pinging NSX ALB static IP pools: " + str(e))
+        return True, "Could not ping NSX ALB static IP pools: " + str(e)
+
+
 def veleroPrechecks(env, isShared, isWorkload):
     try:
         current_app.logger.info("checking pre-requisites for data protection")
@@ -1965,12 +1800,9 @@ def licensePrechecks(env):
         current_app.logger.info("Checking License Expiration status")
         current_app.logger.info("Logging into vCenter API with supplied credentials ")
         if env == Env.VSPHERE or env == Env.VCF:
-            vCenter = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterAddress']
-            vCenter_user = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterSsoUser']
-            str_enc = str(request.get_json(force=True)['envSpec']['vcenterDetails']["vcenterSsoPasswordBase64"])
-            base64_bytes = str_enc.encode('ascii')
-            enc_bytes = base64.b64decode(base64_bytes)
-            VC_PASSWORD = enc_bytes.decode('ascii').rstrip("\n")
+            vCenter = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterAddress']
+            vCenter_user = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterSsoUser']
+            VC_PASSWORD = RequestSpec.secret("envSpec", "vcenterDetails", "vcenterSsoPasswordBase64")
         elif env == Env.VMC:
             vCenter = current_app.config['VC_IP']
             vCenter_user = current_app.config['VC_USER']
@@ -1995,7 +1827,6 @@ def licensePrechecks(env):
             }
             return jsonify(d), 500
         vc_service_instance = vc_service_instance[0]
-        atexit.register(Disconnect, vc_service_instance)
         content = vc_service_instance.RetrieveContent()
         licenseAssignmentManager = content.licenseManager.licenseAssignmentManager
         assignedLicenses = licenseAssignmentManager.QueryAssignedLicenses()
@@ -2059,9 +1890,7 @@ def get_si(host, user, password):
     try:
         service_instance = None
         # TODO UPDATE PORT Number here, used 443 hardcoded
-        context = ssl.SSLContext(ssl.PROTOCOL_TLSv1_2)
-        context.verify_mode = ssl.CERT_NONE
-        service_instance = SmartConnect(host=host, user=user, pwd=password, port=int('443'), sslContext=context)
+        service_instance = VcenterSessionPool.get(host=host, user=user, pwd=password, port=int('443'))
 
         if not service_instance:
             current_app.logger.error("ERROR: Could not connect to the specified vCenter host using specified username "
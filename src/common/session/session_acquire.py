@@ -12,7 +12,7 @@ from common.util.ssl_helper import get_colon_formatted_thumbprint, get_thumbprin
 
 from common.operation.constants import Env, ControllerLocation
 from common.common_utilities import checkAirGappedIsEnabled, isEnvTkgs_wcp, isEnvTkgs_ns
-from common.util.ssl_helper import decode_from_b64
+from common.util.request_spec import RequestSpec
 session_acquire = Blueprint("session_acquire", __name__, static_folder="session")
 
 
@@ -62,7 +62,7 @@ def login():
         current_app.logger.error(response_body['msg'])
         return jsonify(response_body), 400
 
-    spec = request.get_json(force=True)
+    spec = RequestSpec.json()
     current_app.config['DEPLOYMENT_PLATFORM'] = env
     try:
         if env == Env.VMC:
@@ -82,8 +82,8 @@ def login():
         elif env == Env.VSPHERE or env == Env.VCF:
             current_app.config['VC_IP'] = spec['envSpec']['vcenterDetails']["vcenterAddress"]
             current_app.config['VC_USER'] = spec['envSpec']['vcenterDetails']["vcenterSsoUser"]
-            current_app.config['VC_PASSWORD'] = decode_from_b64(
-                spec['envSpec']['vcenterDetails']["vcenterSsoPasswordBase64"])
+            current_app.config['VC_PASSWORD'] = RequestSpec.secret("envSpec", "vcenterDetails",
+                                                                   "vcenterSsoPasswordBase64")
             current_app.config['VC_DATACENTER'] = spec['envSpec']['vcenterDetails']["vcenterDatacenter"]
             current_app.config['VC_CLUSTER'] = spec['envSpec']['vcenterDetails']["vcenterCluster"]
             if not isEnvTkgs_ns(env):
@@ -94,11 +94,11 @@ def login():
                     "contentLibraryName"]
                 VC_AVI_OVA_NAME = spec['envSpec']['vcenterDetails']["aviOvaName"]
             else:
-                jwt = request.get_json(force=True)['envSpec']['marketplaceSpec']['refreshToken']
+                jwt = RequestSpec.json()['envSpec']['marketplaceSpec']['refreshToken']
                 if not jwt:
-                    VC_Content_Library_name = request.get_json(force=True)['envSpec']['vcenterDetails'][
+                    VC_Content_Library_name = RequestSpec.json()['envSpec']['vcenterDetails'][
                         "contentLibraryName"]
-                    VC_AVI_OVA_NAME = request.get_json(force=True)['envSpec']['vcenterDetails']["aviOvaName"]
+                    VC_AVI_OVA_NAME = RequestSpec.json()['envSpec']['vcenterDetails']["aviOvaName"]
                 else:
                     VC_Content_Library_name = ControllerLocation.CONTROLLER_CONTENT_LIBRARY
                     VC_AVI_OVA_NAME = ControllerLocation.CONTROLLER_NAME
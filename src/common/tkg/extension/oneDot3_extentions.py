@@ -3,13 +3,14 @@
 
 from .extentions import extentions_types, deploy_extentions
 from common.operation.constants import Tkg_Extention_names, Repo, RegexPattern, Extentions, Env, AppName
+from common.util.request_spec import RequestSpec
 from common.common_utilities import switchToContext, loadBomFile, checkAirGappedIsEnabled, preChecks, envCheck, \
     waitForProcess, installCertManagerAndContour, deployExtention, getManagementCluster, verifyCluster, \
     switchToManagementContext
 from common.operation.ShellHelper import runShellCommandAndReturnOutput, grabKubectlCommand, grabIpAddress, \
     verifyPodsAreRunning, grabPipeOutput, runShellCommandAndReturnOutputAsList, \
     runShellCommandAndReturnOutputAsListWithChangedDir, grabPipeOutputChagedDir
-from flask import current_app, jsonify, request
+from flask import current_app, jsonify
 from tqdm import tqdm
 import time
 import ruamel
@@ -259,7 +260,7 @@ def createFluentBitSplunkFile(repoAddress, name_from_bom, tag_from_bom, manageme
 def getRepo(env):
     try:
         if checkAirGappedIsEnabled(env):
-            repo_address = str(request.get_json(force=True)['envSpec']['customRepositorySpec'][
+            repo_address = str(RequestSpec.json()['envSpec']['customRepositorySpec'][
                                    'tkgCustomImageRepository'])
         else:
             repo_address = Repo.PUBLIC_REPO
@@ -292,7 +293,7 @@ def deployFluentBit(fluentBitType):
         return jsonify(d), 500
     env = env[0]
     cluster = str(
-        request.get_json(force=True)['tanzuExtensions']['tkgClustersName'])
+        RequestSpec.json()['tanzuExtensions']['tkgClustersName'])
     listOfClusters = cluster.split(",")
     for listOfCluster in listOfClusters:
         if not verifyCluster(listOfCluster):
@@ -437,13 +438,13 @@ def fluentBitTypeSelector(fluentBitType, repoAddress, bom, managementCluster, cl
             file_location = Extentions.FLUENT_BIT_LOCATION + "/http/fluent-bit-data-values.yaml"
             nameFromBom = fluent_bit_name
             tagFromBom = fluent_bit_tag
-            httpEndPoint = str(request.get_json(force=True)['tanzuExtensions']['logging']['httpEndpoint'][
+            httpEndPoint = str(RequestSpec.json()['tanzuExtensions']['logging']['httpEndpoint'][
                                    'httpEndpointAddress'])
             httpPort = str(
-                request.get_json(force=True)['tanzuExtensions']['logging']['httpEndpoint']['httpEndpointPort'])
+                RequestSpec.json()['tanzuExtensions']['logging']['httpEndpoint']['httpEndpointPort'])
             uri = str(
-                request.get_json(force=True)['tanzuExtensions']['logging']['httpEndpoint']['httpEndpointUri'])
-            header = str(request.get_json(force=True)['tanzuExtensions']['logging']['httpEndpoint'][
+                RequestSpec.json()['tanzuExtensions']['logging']['httpEndpoint']['httpEndpointUri'])
+            header = str(RequestSpec.json()['tanzuExtensions']['logging']['httpEndpoint'][
                              'httpEndpointHeaderKeyValue'])
             createFluentBitHttpFile(repoAddress, nameFromBom, tagFromBom, managementCluster, clusterName, httpEndPoint,
                                     httpPort, uri, header, file_location)
@@ -451,19 +452,19 @@ def fluentBitTypeSelector(fluentBitType, repoAddress, bom, managementCluster, cl
             file_location = Extentions.FLUENT_BIT_LOCATION + "/kafka/fluent-bit-data-values.yaml"
             nameFromBom = fluent_bit_name
             tagFromBom = fluent_bit_tag
-            brokerServiceName = str(request.get_json(force=True)['tanzuExtensions']['logging']['kafkaEndpoint'][
+            brokerServiceName = str(RequestSpec.json()['tanzuExtensions']['logging']['kafkaEndpoint'][
                                         'kafkaBrokerServiceName'])
             topicName = str(
-                request.get_json(force=True)['tanzuExtensions']['logging']['kafkaEndpoint']['kafkaTopicName'])
+                RequestSpec.json()['tanzuExtensions']['logging']['kafkaEndpoint']['kafkaTopicName'])
             createFluentBitKafkaFile(repoAddress, nameFromBom, tagFromBom, managementCluster, clusterName,
                                      brokerServiceName, topicName, file_location)
         elif fluentBitType == Tkg_Extention_names.FLUENT_BIT_ELASTIC:
             file_location = Extentions.FLUENT_BIT_LOCATION + "/elasticsearch/fluent-bit-data-values.yaml"
             nameFromBom = fluent_bit_name
             tagFromBom = fluent_bit_tag
-            host = str(request.get_json(force=True)['tanzuExtensions']['logging']['elasticSearchEndpoint'][
+            host = str(RequestSpec.json()['tanzuExtensions']['logging']['elasticSearchEndpoint'][
                            'elasticSearchEndpointAddress'])
-            port = str(request.get_json(force=True)['tanzuExtensions']['logging']['elasticSearchEndpoint'][
+            port = str(RequestSpec.json()['tanzuExtensions']['logging']['elasticSearchEndpoint'][
                            'elasticSearchEndpointPort'])
             createFluentBitElasticFile(repoAddress, nameFromBom, tagFromBom, managementCluster, clusterName, host, port,
                                        file_location)
@@ -471,13 +472,13 @@ def fluentBitTypeSelector(fluentBitType, repoAddress, bom, managementCluster, cl
             file_location = Extentions.FLUENT_BIT_LOCATION + "/syslog/fluent-bit-data-values.yaml"
             nameFromBom = fluent_bit_name
             tagFromBom = fluent_bit_tag
-            host = str(request.get_json(force=True)['tanzuExtensions']['logging']['syslogEndpoint'][
+            host = str(RequestSpec.json()['tanzuExtensions']['logging']['syslogEndpoint'][
                            'syslogEndpointAddress'])
-            port = str(request.get_json(force=True)['tanzuExtensions']['logging']['syslogEndpoint'][
+            port = str(RequestSpec.json()['tanzuExtensions']['logging']['syslogEndpoint'][
                            'syslogEndpointPort'])
-            mode = str(request.get_json(force=True)['tanzuExtensions']['logging']['syslogEndpoint'][
+            mode = str(RequestSpec.json()['tanzuExtensions']['logging']['syslogEndpoint'][
                            'syslogEndpoint_mode'])
-            format_ = str(request.get_json(force=True)['tanzuExtensions']['logging']['syslogEndpoint'][
+            format_ = str(RequestSpec.json()['tanzuExtensions']['logging']['syslogEndpoint'][
                               'syslogEndpointFormat'])
             createFluentBitSyslogFile(repoAddress, nameFromBom, tagFromBom, managementCluster, clusterName, host, port,
                                       mode, format_, file_location)
@@ -485,11 +486,11 @@ def fluentBitTypeSelector(fluentBitType, repoAddress, bom, managementCluster, cl
             file_location = Extentions.FLUENT_BIT_LOCATION + "/splunk/fluent-bit-data-values.yaml"
             nameFromBom = fluent_bit_name
             tagFromBom = fluent_bit_tag
-            host = str(request.get_json(force=True)['tanzuExtensions']['logging']['splunkEndpoint'][
+            host = str(RequestSpec.json()['tanzuExtensions']['logging']['splunkEndpoint'][
                            'splunkEndpointAddress'])
-            port = str(request.get_json(force=True)['tanzuExtensions']['logging']['splunkEndpoint'][
+            port = str(RequestSpec.json()['tanzuExtensions']['logging']['splunkEndpoint'][
                            'splunkEndpointPort'])
-            token = str(request.get_json(force=True)['tanzuExtensions']['logging']['splunkEndpoint'][
+            token = str(RequestSpec.json()['tanzuExtensions']['logging']['splunkEndpoint'][
                             'splunkEndpointToken'])
             createFluentBitSplunkFile(repoAddress, nameFromBom, tagFromBom, managementCluster, clusterName, host, port,
                                       token, file_location)
@@ -592,7 +593,7 @@ def getImageName(server_image):
 
 def monitoringDeployment(monitoringType):
     try:
-        enable = request.get_json(force=True)['tanzuExtensions']['monitoring']['enableLoggingExtension']
+        enable = RequestSpec.json()['tanzuExtensions']['monitoring']['enableLoggingExtension']
         if enable == "true":
             pre = preChecks()
             if pre[1] != 200:
@@ -615,12 +616,12 @@ def monitoringDeployment(monitoringType):
             env = env[0]
             if checkAirGappedIsEnabled(env):
                 repo_address = str(
-                    request.get_json(force=True)['envSpec']['customRepositorySpec'][
+                    RequestSpec.json()['envSpec']['customRepositorySpec'][
                         'tkgCustomImageRepository'])
             else:
                 repo_address = Repo.PUBLIC_REPO
             cluster = str(
-                request.get_json(force=True)['tanzuExtensions']['tkgClustersName'])
+                RequestSpec.json()['tanzuExtensions']['tkgClustersName'])
             listOfClusters = cluster.split(",")
             for listOfCluster in listOfClusters:
                 if not verifyCluster(listOfCluster):
@@ -692,14 +693,14 @@ def monitoringDeployment(monitoringType):
                             "STATUS_CODE": 500
                         }
                         return jsonify(d), 500
-                    cert_Path = request.get_json(force=True)['tanzuExtensions']['monitoring'][
+                    cert_Path = RequestSpec.json()['tanzuExtensions']['monitoring'][
                         'prometheusCertPath']
-                    fqdn = request.get_json(force=True)['tanzuExtensions']['monitoring'][
+                    fqdn = RequestSpec.json()['tanzuExtensions']['monitoring'][
                         'prometheusFqdn']
-                    certKey_Path = request.get_json(force=True)['tanzuExtensions']['monitoring'][
+                    certKey_Path = RequestSpec.json()['tanzuExtensions']['monitoring'][
                         'prometheusCertKeyPath']
                 elif monitoringType == Tkg_Extention_names.GRAFANA:
-                    password = request.get_json(force=True)['tanzuExtensions']['monitoring']['grafanaPasswordBase64']
+                    password = RequestSpec.json()['tanzuExtensions']['monitoring']['grafanaPasswordBase64']
                     extention = Tkg_Extention_names.GRAFANA
                     secret_name = "grafana-data-values"
                     extention_yaml = "grafana-extension.yaml"
@@ -709,9 +710,9 @@ def monitoringDeployment(monitoringType):
                     command = ["./common/injectValue.sh",Extentions.GRAFANA_LOCATION + "/grafana-extension.yaml","fluent_bit",repository + "/" + Extentions.APP_EXTENTION]
                     runShellCommandAndReturnOutputAsList(command)
                     bom_map = getBomMap(load_bom, Tkg_Extention_names.GRAFANA)
-                    cert_Path = request.get_json(force=True)['tanzuExtensions']['monitoring']['grafanaCertPath']
-                    fqdn = request.get_json(force=True)['tanzuExtensions']['monitoring']['grafanaFqdn']
-                    certKey_Path = request.get_json(force=True)['tanzuExtensions']['monitoring'][
+                    cert_Path = RequestSpec.json()['tanzuExtensions']['monitoring']['grafanaCertPath']
+                    fqdn = RequestSpec.json()['tanzuExtensions']['monitoring']['grafanaFqdn']
+                    certKey_Path = RequestSpec.json()['tanzuExtensions']['monitoring'][
                         'grafanaCertKeyPath']
                 fluent_bit_validate_command = ["kubectl", "get", "app", appName, "-n",
                                                "tanzu-system-monitoring"]
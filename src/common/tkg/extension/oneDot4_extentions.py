@@ -3,7 +3,9 @@
 
 from .extentions import extentions_types, deploy_extentions
 from common.operation.constants import Tkg_Extention_names, Repo, RegexPattern, Extentions, Env, AppName, Paths
-from flask import current_app, jsonify, request
+from common.util.request_spec import RequestSpec
+from common.util.package_catalog import PackageCatalog
+from flask import current_app, jsonify
 from common.common_utilities import getVersionOfPackage, switchToContext, loadBomFile, checkAirGappedIsEnabled, \
     preChecks, envCheck, \
     waitForProcess, installCertManagerAndContour, deployExtention, getManagementCluster, verifyCluster, \
@@ -194,7 +196,7 @@ def generateYamlFile(extention, version, certKey_Path, cert_Path, fqdn, secret,
 
 def monitoringDeployment(monitoringType):
     try:
-        enable = request.get_json(force=True)['tanzuExtensions']['monitoring']['enableLoggingExtension']
+        enable = RequestSpec.json()['tanzuExtensions']['monitoring']['enableLoggingExtension']
         if enable == "true":
             pre = preChecks()
             if pre[1] != 200:
@@ -225,12 +227,12 @@ def monitoringDeployment(monitoringType):
                 return jsonify(d), 200
             if checkAirGappedIsEnabled(env):
                 repo_address = str(
-                    request.get_json(force=True)['envSpec']['customRepositorySpec'][
+                    RequestSpec.json()['envSpec']['customRepositorySpec'][
                         'tkgCustomImageRepository'])
             else:
                 repo_address = Repo.PUBLIC_REPO
             cluster = str(
-                request.get_json(force=True)['tanzuExtensions']['tkgClustersName'])
+                RequestSpec.json()['tanzuExtensions']['tkgClustersName'])
             listOfClusters = cluster.split(",")
             for listOfCluster in listOfClusters:
                 if not verifyCluster(listOfCluster):
@@ -298,14 +300,14 @@ def monitoringDeployment(monitoringType):
                         "STATUS_CODE": 500
                     }
                     return jsonify(d), 500
-                cert_Path = request.get_json(force=True)['tanzuExtensions']['monitoring'][
+                cert_Path = RequestSpec.json()['tanzuExtensions']['monitoring'][
                     'prometheusCertPath']
-                fqdn = request.get_json(force=True)['tanzuExtensions']['monitoring'][
+                fqdn = RequestSpec.json()['tanzuExtensions']['monitoring'][
                     'prometheusFqdn']
-                certKey_Path = request.get_json(force=True)['tanzuExtensions']['monitoring'][
+                certKey_Path = RequestSpec.json()['tanzuExtensions']['monitoring'][
                     'prometheusCertKeyPath']
             elif monitoringType == Tkg_Extention_names.GRAFANA:
-                password = request.get_json(force=True)['tanzuExtensions']['monitoring']['grafanaPasswordBase64']
+                password = RequestSpec.json()['tanzuExtensions']['monitoring']['grafanaPasswordBase64']
                 extention = Tkg_Extention_names.GRAFANA
                 secret_name = "grafana-data-values"
                 extention_yaml = "grafana-extension.yaml"
@@ -316,9 +318,9 @@ def monitoringDeployment(monitoringType):
                            "fluent_bit", repository + "/" + Extentions.APP_EXTENTION]
                 runShellCommandAndReturnOutputAsList(command)
                 #bom_map = getBomMap(load_bom, Tkg_Extention_names.GRAFANA)
-                cert_Path = request.get_json(force=True)['tanzuExtensions']['monitoring']['grafanaCertPath']
-                fqdn = request.get_json(force=True)['tanzuExtensions']['monitoring']['grafanaFqdn']
-                certKey_Path = request.get_json(force=True)['tanzuExtensions']['monitoring'][
+                cert_Path = RequestSpec.json()['tanzuExtensions']['monitoring']['grafanaCertPath']
+                fqdn = RequestSpec.json()['tanzuExtensions']['monitoring']['grafanaFqdn']
+                certKey_Path = RequestSpec.json()['tanzuExtensions']['monitoring'][
                     'grafanaCertKeyPath']
 
             extention_validate_command = ["kubectl", "get", "app", appName, "-n", namespace]
@@ -350,6 +352,7 @@ def monitoringDeployment(monitoringType):
                                            extention.lower() + ".tanzu.vmware.com", "--version", version,
                                            "--values-file", yamlFile, "--namespace", namespace, "--create-namespace"]
                 state_extention_apply = runShellCommandAndReturnOutputAsList(deply_extension_command)
+                PackageCatalog.current().invalidate()
                 if state_extention_apply[1] != 0:
                     current_app.logger.error(
                         extention + " install command failed. Checking for reconciliation status...")
@@ -426,7 +429,7 @@ def deploy_extension_fluent(fluent_bit_endpoint):
                 }
                 return jsonify(d), 500
             env = env[0]
-            cluster = str(request.get_json(force=True)['tanzuExtensions']['tkgClustersName'])
+            cluster = str(RequestSpec.json()['tanzuExtensions']['tkgClustersName'])
             listOfClusters = cluster.split(",")
             for listOfCluster in listOfClusters:
                 if not verifyCluster(listOfCluster):
@@ -1,15 +1,17 @@
 # Copyright 2021 VMware, Inc.
 # SPDX-License-Identifier: BSD-2-Clause
 
-import base64
 import os
 import time
 import ruamel
 from common.operation.ShellHelper import runShellCommandAndReturnOutputAsList, \
     runShellCommandAndReturnOutputAsListWithChangedDir, verifyPodsAreRunning, runShellCommandAndReturnOutput, \
     grabPipeOutput
-from flask import current_app, jsonify, request
-from common.operation.constants import Tkgs_Extension_Details, RegexPattern, Tkg_Extention_names, Repo, Extentions, \
+from common.util.request_spec import RequestSpec
+from common.util.package_catalog import PackageCatalog
+from common.util.task_graph import api_step
+from flask import current_app, jsonify
+from common.operation.constants import Tkgs_Extension_Details, RegexPattern, Tkg_Extention_names, Extentions, \
     AppName, Paths
 from common.common_utilities import getVersionOfPackage, loadBomFile, checkAirGappedIsEnabled, preChecks, envCheck, \
     waitForProcess, installCertManagerAndContour, deployExtention, getManagementCluster, verifyCluster, \
@@ -17,6 +19,7 @@ from common.common_utilities import getVersionOfPackage, loadBomFile, checkAirGa
     checkTmcEnabled, waitForGrepProcessWithoutChangeDir, getClusterID, connect_to_workload, isWcpEnabled, isClusterRunning, \
     checkTanzuExtentionEnabled, fluent_bit_enabled, deploy_fluent_bit, checkFluentBitInstalled, check_tkgs_proxy_enabled
 from .oneDot4_extentions import generateYamlFile
+from .extension_scheduler import ExtensionScheduler
 from .oneDot3_extentions import getBomMap, getRepo
 from vmc.sharedConfig.shared_config import certChanging
 
@@ -34,13 +37,10 @@ def deploy_tkgs_extensions():
                 }
                 return jsonify(d), 500
             env = env[0]
-            vcenter_ip = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterAddress']
-            vcenter_username = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterSsoUser']
-            str_enc = str(request.get_json(force=True)['envSpec']['vcenterDetails']["vcenterSsoPasswordBase64"])
-            base64_bytes = str_enc.encode('ascii')
-            enc_bytes = base64.b64decode(base64_bytes)
-            password = enc_bytes.decode('ascii').rstrip("\n")
-            cluster = request.get_json(force=True)["envSpec"]["vcenterDetails"]["vcenterCluster"]
+            vcenter_ip = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterAddress']
+            vcenter_username = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterSsoUser']
+            password = RequestSpec.secret("envSpec", "vcenterDetails", "vcenterSsoPasswordBase64")
+            cluster = RequestSpec.json()["envSpec"]["vcenterDetails"]["vcenterCluster"]
 
             status = tkgsExtensionsPrecheck(vcenter_ip, vcenter_username, password, cluster, env)
             if status[0] is None:
@@ -52,7 +52,7 @@ def deploy_tkgs_extensions():
                 return jsonify(d), 500
 
             current_app.logger.info("Pre-checks required before TKGs extensions deployment PASSED")
-            workload_cluster = request.get_json(force=True)['tanzuExtensions']['tkgClustersName']
+            workload_cluster = RequestSpec.json()['tanzuExtensions']['tkgClustersName']
             deploy_ext = deploy_extensions(env, workload_cluster)
             if deploy_ext[1] != 200:
                 d = {
@@ -90,7 +90,7 @@ def deploy_tkgs_extensions():
 
 def tkgsExtensionsPrecheck(vcenter_ip, vcenter_username, password, cluster, env):
 
-    workload_cluster = request.get_json(force=True)['tanzuExtensions']['tkgClustersName']
+    workload_cluster = RequestSpec.json()['tanzuExtensions']['tkgClustersName']
 
     workload_status = isClusterRunning(vcenter_ip, vcenter_username, password, cluster, workload_cluster)
     if workload_status[1] != 200:
@@ -229,12 +229,12 @@ def kappConfiguration():
 
 def kapp_tkgs_proxy_details():
     if check_tkgs_proxy_enabled():
-        httpProxy = request.get_json(force=True)['tkgsComponentSpec']['tkgServiceConfig']['proxySpec'][
+        httpProxy = RequestSpec.json()['tkgsComponentSpec']['tkgServiceConfig']['proxySpec'][
             'httpProxy']
-        httpsProxy = request.get_json(force=True)['tkgsComponentSpec']['tkgServiceConfig']['proxySpec'][
+        httpsProxy = RequestSpec.json()['tkgsComponentSpec']['tkgServiceConfig']['proxySpec'][
             'httpsProxy']
-        noProxy = request.get_json(force=True)['tkgsComponentSpec']['tkgServiceConfig']['proxySpec']['noProxy']
-        service_cidr = request.get_json(force=True)['tkgsComponentSpec']['tkgsVsphereNamespaceSpec'][
+        noProxy = RequestSpec.json()['tkgsComponentSpec']['tkgServiceConfig']['proxySpec']['noProxy']
+        service_cidr = RequestSpec.json()['tkgsComponentSpec']['tkgsVsphereNamespaceSpec'][
             'tkgsVsphereWorkloadClusterSpec']['serviceCidrBlocks']
         noProxy = "localhost,127.0.0.1," + noProxy + "," + service_cidr
         inject_values = ["sh", "./common/injectValue.sh", "kapp-controller.yaml", "kapp_tkgs", httpProxy,
@@ -348,34 +348,19 @@ def configurePackagesRepository(env):
 
 def deploy_extensions(env, cluster_name):
     try:
-        listOfExtention = []
-        service = "all"
-        repo_address = Repo.PUBLIC_REPO
-        checkHarborEnabled = request.get_json(force=True)['tanzuExtensions']['harborSpec']['enableHarborExtension']
-
-        if checkPromethusEnabled():
-            listOfExtention.append(Tkg_Extention_names.PROMETHEUS)
-            listOfExtention.append(Tkg_Extention_names.GRAFANA)
-
-        status = tkgsCertManagerandContour(env, cluster_name, service)
-        if status[1] != 200:
-            current_app.logger.info("Failed to deploy extension "+str(status[0].json['msg']))
-            d = {
-                "responseType": "ERROR",
-                "msg": "Failed to deploy extension" + str(status[0].json['msg']),
-                "STATUS_CODE": 500
-            }
-            return jsonify(d), 500
+        checkHarborEnabled = RequestSpec.json()['tanzuExtensions']['harborSpec']['enableHarborExtension']
+
+        scheduler = ExtensionScheduler(log=current_app.logger)
+        scheduler.add(ExtensionScheduler.REPOSITORY, api_step(lambda: checkRepositoryAdded(env)))
+        scheduler.add(ExtensionScheduler.CERT_MANAGER,
+                      api_step(lambda: installExtentionFor14("certmanager", cluster_name, env)))
+        scheduler.add(ExtensionScheduler.CONTOUR, api_step(lambda: installExtentionFor14("ingress", cluster_name, env)))
         if str(checkHarborEnabled).lower() == "true":
-            current_app.logger.info("Installing harbor...")
-            str_enc = str(request.get_json(force=True)['tanzuExtensions']['harborSpec']['harborPasswordBase64'])
-            base64_bytes = str_enc.encode('ascii')
-            enc_bytes = base64.b64decode(base64_bytes)
-            password = enc_bytes.decode('ascii').rstrip("\n")
+            password = RequestSpec.secret("tanzuExtensions", "harborSpec", "harborPasswordBase64")
             harborPassword = password
-            host = request.get_json(force=True)['tanzuExtensions']['harborSpec']['harborFqdn']
-            harborCertPath = request.get_json(force=True)['tanzuExtensions']['harborSpec']['harborCertPath']
-            harborCertKeyPath = request.get_json(force=True)['tanzuExtensions']['harborSpec']['harborCertKeyPath']
+            host = RequestSpec.json()['tanzuExtensions']['harborSpec']['harborFqdn']
+            harborCertPath = RequestSpec.json()['tanzuExtensions']['harborSpec']['harborCertPath']
+            harborCertKeyPath = RequestSpec.json()['tanzuExtensions']['harborSpec']['harborCertKeyPath']
             if not host or not harborPassword:
                 current_app.logger.error("Harbor FQDN and password are mandatory for harbor deployment."
                                          " Please provide both the details")
@@ -386,112 +371,57 @@ def deploy_extensions(env, cluster_name):
                     "STATUS_CODE": 500
                 }
                 return jsonify(d), 500
-            state = installHarborTkgs(harborCertPath, harborCertKeyPath, harborPassword, host, cluster_name, env)
-            if state[1] != 200:
-                current_app.logger.error(state[0].json['msg'])
-                d = {
-                    "responseType": "ERROR",
-                    "msg": state[0].json['msg'],
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-            else:
-                current_app.logger.info(state[0].json['msg'])
+            scheduler.add(ExtensionScheduler.HARBOR, api_step(
+                lambda: installHarborTkgs(harborCertPath, harborCertKeyPath, harborPassword, host, cluster_name, env)))
 
         if checkToEnabled(env):
             current_app.logger.info("Tanzu observability is enabled, skipping prometheus and grafana deployment")
-            '''d = {
-                "responseType": "ERROR",
-                "msg": "Tanzu observability is enabled, skipping prometheus and grafana deployment",
-                "STATUS_CODE": 200
-            }
-            return jsonify(d), 200'''
+        elif not checkPromethusEnabled():
+            current_app.logger.info("Prometheus and Grafana are deactivated")
         else:
-            if len(listOfExtention) == 0:
-                current_app.logger.info("Prometheus and Grafana are deactivated")
-                '''d = {
-                    "responseType": "SUCCESS",
-                    "msg": "Prometheus and Grafana are deactivated",
-                    "STATUS_CODE": 200
-                }
-                return jsonify(d), 200'''
-            else:
-                for extension_name in listOfExtention:
-                    monitor_status = deploy_monitoring_extentions(env, extension_name, cluster_name)
-                    if monitor_status[1] != 200:
-                        current_app.logger.error(monitor_status[0].json['msg'])
-                        d = {
-                            "responseType": "ERROR",
-                            "msg": monitor_status[0].json['msg'],
-                            "STATUS_CODE": 500
-                        }
-                        return jsonify(d), 500
-                    current_app.logger.info("Extension - " + extension_name + " deployed successfully")
+            scheduler.add(ExtensionScheduler.PROMETHEUS, api_step(
+                lambda: deploy_monitoring_extentions(env, Tkg_Extention_names.PROMETHEUS, cluster_name)))
+            scheduler.add(ExtensionScheduler.GRAFANA, api_step(
+                lambda: deploy_monitoring_extentions(env, Tkg_Extention_names.GRAFANA, cluster_name)))
 
         is_enabled = fluent_bit_enabled(env)
         if is_enabled[0]:
             is_deployed = checkFluentBitInstalled()
             if not is_deployed[0]:
                 end_point = is_enabled[1]
-                workload_cluster = request.get_json(force=True)['tanzuExtensions']['tkgClustersName']
-                response = deploy_fluent_bit(end_point, workload_cluster)
-                if response[1] != 200:
-                    current_app.logger.error(response[0].json['msg'])
-                    d = {
-                        "responseType": "ERROR",
-                        "msg": response[0].json['msg'],
-                        "STATUS_CODE": 500
-                    }
-                    return jsonify(d), 500
-                current_app.logger.info("Fluent-bit deployed successfully")
+                workload_cluster = RequestSpec.json()['tanzuExtensions']['tkgClustersName']
+                scheduler.add(ExtensionScheduler.FLUENT_BIT, api_step(lambda: deploy_fluent_bit(end_point, workload_cluster)))
             else:
                 current_app.logger.info("Fluent-bit is already deployed and its status is - " + is_deployed[1])
         else:
             current_app.logger.info("Fluent-bit deployment is not enabled. Hence, skipping it.")
 
-        d = {
-            "responseType": "SUCCESS",
-            "msg": "Extensions deployed successfully",
-            "STATUS_CODE": 200
-        }
-        return jsonify(d), 200
-
-    except Exception as e:
-        current_app.logger.error(str(e))
-        d = {
-            "responseType": "ERROR",
-            "msg": "Exception occurred while deploying extensions",
-            "STATUS_CODE": 500
-        }
-        return jsonify(d), 500
-
-
-def tkgsCertManagerandContour(env, cluster_name, service_name):
-    try:
-        status_ = checkRepositoryAdded(env)
-        if status_[1] != 200:
-            current_app.logger.error(str(status_[0].json['msg']))
+        scheduler.run()
+        extensions = scheduler.report()
+        if not scheduler.ok:
+            failure = scheduler.failures[0]
+            current_app.logger.error("Failed to deploy extension " + failure.name + ": " + str(failure.message))
             d = {
                 "responseType": "ERROR",
-                "msg": str(status_[0].json['msg']),
-                "STATUS_CODE": 500
+                "msg": "Failed to deploy extension " + failure.name + ": " + str(failure.message),
+                "STATUS_CODE": 500,
+                "extensions": extensions
             }
             return jsonify(d), 500
-        install = installExtentionFor14(service_name, cluster_name, env)
-        if install[1] != 200:
-            return install[0], install[1]
-        current_app.logger.info("Configured cert-manager and contour successfully")
+
         d = {
             "responseType": "SUCCESS",
-            "msg": "Configured cert-manager and contour extensions successfully",
-            "STATUS_CODE": 200
+            "msg": "Extensions deployed successfully",
+            "STATUS_CODE": 200,
+            "extensions": extensions
         }
         return jsonify(d), 200
+
     except Exception as e:
         current_app.logger.error(str(e))
         d = {
             "responseType": "ERROR",
-            "msg": "Exception occurred while installing Cert-manager and Contour",
+            "msg": "Exception occurred while deploying extensions",
             "STATUS_CODE": 500
         }
         return jsonify(d), 500
@@ -511,7 +441,7 @@ def deploy_monitoring_extentions(env, monitoringType, clusterName):
         repo = getRepo(env)
         repository = repo[1]
         os.system("chmod +x ./common/injectValue.sh")
-        enable = request.get_json(force=True)['tanzuExtensions']['monitoring']['enableLoggingExtension']
+        enable = RequestSpec.json()['tanzuExtensions']['monitoring']['enableLoggingExtension']
         if enable.lower() == "true":
             if monitoringType == Tkg_Extention_names.PROMETHEUS:
                 password = None
@@ -521,14 +451,14 @@ def deploy_monitoring_extentions(env, monitoringType, clusterName):
                 namespace = "package-tanzu-system-monitoring"
                 yamlFile = "./prometheus-data-values.yaml"
                 service = "all"
-                cert_Path = request.get_json(force=True)['tanzuExtensions']['monitoring'][
+                cert_Path = RequestSpec.json()['tanzuExtensions']['monitoring'][
                     'prometheusCertPath']
-                fqdn = request.get_json(force=True)['tanzuExtensions']['monitoring'][
+                fqdn = RequestSpec.json()['tanzuExtensions']['monitoring'][
                     'prometheusFqdn']
-                certKey_Path = request.get_json(force=True)['tanzuExtensions']['monitoring'][
+                certKey_Path = RequestSpec.json()['tanzuExtensions']['monitoring'][
                     'prometheusCertKeyPath']
             elif monitoringType == Tkg_Extention_names.GRAFANA:
-                password = request.get_json(force=True)['tanzuExtensions']['monitoring']['grafanaPasswordBase64']
+                password = RequestSpec.json()['tanzuExtensions']['monitoring']['grafanaPasswordBase64']
                 if not password:
                     current_app.logger.error("Password for grafana is mandatory, please add and re-run deployment")
                     d = {
@@ -545,9 +475,9 @@ def deploy_monitoring_extentions(env, monitoringType, clusterName):
                            repository + "/" + Extentions.APP_EXTENTION]
                 runShellCommandAndReturnOutputAsList(command)
                 #bom_map = getBomMap(load_bom, Tkg_Extention_names.GRAFANA)
-                cert_Path = request.get_json(force=True)['tanzuExtensions']['monitoring']['grafanaCertPath']
-                fqdn = request.get_json(force=True)['tanzuExtensions']['monitoring']['grafanaFqdn']
-                certKey_Path = request.get_json(force=True)['tanzuExtensions']['monitoring'][
+                cert_Path = RequestSpec.json()['tanzuExtensions']['monitoring']['grafanaCertPath']
+                fqdn = RequestSpec.json()['tanzuExtensions']['monitoring']['grafanaFqdn']
+                certKey_Path = RequestSpec.json()['tanzuExtensions']['monitoring'][
                     'grafanaCertKeyPath']
 
             if not fqdn:
@@ -598,6 +528,7 @@ def deploy_monitoring_extentions(env, monitoringType, clusterName):
                                            extention.lower() + ".tanzu.vmware.com", "--version", version,
                                            "--values-file", yamlFile, "--namespace", namespace, "--create-namespace"]
                 state_extention_apply = runShellCommandAndReturnOutputAsList(deply_extension_command)
+                PackageCatalog.current().invalidate()
                 if state_extention_apply[1] != 0:
                     current_app.logger.error(extention + "install command failed. Checking for reconciliation "
                                                          "status...")
@@ -733,20 +664,18 @@ def updateStorageClass(yamlFile, extension):
 def installHarborTkgs(harborCertPath, harborCertKeyPath, harborPassword, host, clusterName, env):
     main_command = ["tanzu", "package", "installed", "list", "-A"]
     sub_command = ["grep", AppName.HARBOR]
-    out = grabPipeOutput(main_command, sub_command)
-    if not (verifyPodsAreRunning(AppName.HARBOR, out[0], RegexPattern.RECONCILE_SUCCEEDED)
-            or verifyPodsAreRunning(AppName.HARBOR, out[0], RegexPattern.RECONCILE_FAILED)):
+    catalog = PackageCatalog.current()
+    if not (catalog.is_reconciled(AppName.HARBOR, RegexPattern.RECONCILE_SUCCEEDED)
+            or catalog.is_reconciled(AppName.HARBOR, RegexPattern.RECONCILE_FAILED)):
         timer = 0
         current_app.logger.info("Validating contour and cert-manager is running")
-        command = ["tanzu", "package", "installed", "list", "-A"]
-        status = runShellCommandAndReturnOutputAsList(command)
         verify_contour = False
         verify_cert_manager = False
         while timer < 600:
-            if verify_contour or verifyPodsAreRunning(AppName.CONTOUR, status[0], RegexPattern.RECONCILE_SUCCEEDED):
+            if verify_contour or catalog.is_reconciled(AppName.CONTOUR, RegexPattern.RECONCILE_SUCCEEDED):
                 current_app.logger.info("Contour is running")
                 verify_contour = True
-            if verify_cert_manager or verifyPodsAreRunning(AppName.CERT_MANAGER, status[0], RegexPattern.RECONCILE_SUCCEEDED):
+            if verify_cert_manager or catalog.is_reconciled(AppName.CERT_MANAGER, RegexPattern.RECONCILE_SUCCEEDED):
                 verify_cert_manager = True
                 current_app.logger.info("Cert Manager is running")
 
@@ -755,7 +684,7 @@ def installHarborTkgs(harborCertPath, harborCertKeyPath, harborPassword, host, c
             else:
                 timer = timer + 30
                 time.sleep(30)
-                status = runShellCommandAndReturnOutputAsList(command)
+                catalog.invalidate()
                 current_app.logger.info("Waited for " + str(timer) + "s, retrying for contour and cert manager to be "
                                                                      "running")
         if not verify_contour:
@@ -852,6 +781,7 @@ def installHarborTkgs(harborCertPath, harborCertKeyPath, harborPassword, host, c
                    state, "--values-file", Paths.CLUSTER_PATH + clusterName + "/harbor-data-values.yaml", "--namespace", "package-tanzu-system-registry",
                    "--create-namespace"]
         runShellCommandAndReturnOutputAsList(command)
+        catalog.invalidate()
 
         current_app.logger.info("Waiting for harbor installation to complete...")
         running = False
@@ -913,12 +843,10 @@ def installHarborTkgs(harborCertPath, harborCertKeyPath, harborPassword, host, c
         }
         return jsonify(d), 200
     else:
-        current_app.logger.info("Harbor is already deployed and it's status is - " + out[0].split()[3] + " " +
-                                out[0].split()[4])
+        current_app.logger.info("Harbor is already deployed and it's status is - " + catalog.status(AppName.HARBOR))
         d = {
             "responseType": "SUCCESS",
-            "msg": "Harbor is already deployed and it's status is - " + out[0].split()[3] + " " +
-                   out[0].split()[4],
+            "msg": "Harbor is already deployed and it's status is - " + catalog.status(AppName.HARBOR),
             "STATUS_CODE": 200
         }
         return jsonify(d), 200
@@ -0,0 +1,215 @@
+# Copyright 2021 VMware, Inc.
+# SPDX-License-Identifier: BSD-2-Clause
+
+import logging
+import json
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.exceptions import InsecureRequestWarning
+
+requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
+
+logger = logging.getLogger(__name__)
+
+
+class _NoCookiePolicy(DefaultCookiePolicy):
+    """
+    The CSRF cookie is carried explicitly by AviClient, so the session jar must
+    neither store nor replay cookies returned by /login.
+    """
+
+    def set_ok(self, cookie, request):
+        return False
+
+    def return_ok(self, cookie, request):
+        return False
+
+
+class AviToken:
+    """
+    csrftoken/sessionid pair obtained from one /login, valid until expires_at.
+    """
+
+    def __init__(self, username, csrf_token, cookie, version, ttl):
+        self.username = username
+        self.csrf_token = csrf_token
+        self.cookie = cookie
+        self.version = version
+        self.expires_at = time.monotonic() + ttl
+
+    def expired(self):
+        return time.monotonic() >= self.expires_at
+
+    @property
+    def csrf2(self):
+        return self.csrf_token, self.cookie
+
+
+class AviClient:
+    """
+    Keep-alive HTTP client for one AVI controller.
+
+    One instance is kept per controller IP and shared by every helper talking to
+    that controller, so TLS handshakes are paid once per pooled connection instead
+    of once per REST call. The client holds no session of its own: each request
+    carries the csrftoken and cookie of the AviToken its caller logged in with, and
+    a 401 is replayed with a fresh token for that same user.
+    """
+    POOL_SIZE = 10
+    # Controllers expire idle sessions after 15 minutes; refresh well before that.
+    SESSION_TTL = 600
+    _clients = {}
+    _lock = threading.Lock()
+
+    def __init__(self, ip, pool_size=POOL_SIZE):
+        self.ip = str(ip)
+        self.session = requests.Session()
+        self.session.verify = False
+        self.session.cookies.set_policy(_NoCookiePolicy())
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.calls = 0
+        self.elapsed = 0.0
+        self._stats_lock = threading.Lock()
+        self._tokens = {}
+        self._issued = {}
+        self._passwords = {}
+        self._login_lock = threading.Lock()
+
+    @classmethod
+    def for_controller(cls, ip):
+        ip = str(ip)
+        with cls._lock:
+            client = cls._clients.get(ip)
+            if client is None:
+                client = cls(ip)
+                cls._clients[ip] = client
+            return client
+
+    @classmethod
+    def close_all(cls):
+        with cls._lock:
+            for client in cls._clients.values():
+                client.session.close()
+            cls._clients.clear()
+
+    def login(self, username, password, ttl=SESSION_TTL, stale=None):
+        """
+        Return a cached AviToken for username, logging in only when there is none,
+        it has expired, or it is the stale token a caller just got a 401 with.
+        Concurrent callers wait on one login instead of each posting /login.
+        """
+        key = (self.ip, username)
+        token = self._tokens.get(key)
+        if token is not None and not token.expired() and token is not stale \
+                and self._passwords.get(username) == password:
+            return token
+        with self._login_lock:
+            token = self._tokens.get(key)
+            if token is not None and not token.expired() and token is not stale \
+                    and self._passwords.get(username) == password:
+                return token
+            payload = {
+                "username": username,
+                "password": password
+            }
+            response = self.request("POST", "/login", data=json.dumps(payload, indent=4), with_session=False)
+            if response.status_code != 200:
+                logger.error("Login to AVI controller " + self.ip + " failed " + str(response.status_code))
+                self._tokens.pop(key, None)
+                return None
+            cookies = requests.utils.dict_from_cookiejar(response.cookies)
+            cookie_string = ""
+            for name, value in cookies.items():
+                cookie_string += name + "=" + value + "; "
+            try:
+                version = response.json()["version"]["Version"]
+            except Exception:
+                version = None
+            token = AviToken(username, cookies['csrftoken'], cookie_string, version, ttl)
+            self._tokens[key] = token
+            self._passwords[username] = password
+            self._remember(token)
+            return token
+
+    def invalidate(self, username=None):
+        with self._login_lock:
+            if username is None:
+                self._tokens.clear()
+            else:
+                self._tokens.pop((self.ip, username), None)
+
+    def _remember(self, token):
+        # Callers keep the csrf2 pair of the token they logged in with, so a request is
+        # matched back to its token (and user) by cookie. Tokens expired for a whole TTL
+        # have long been replaced and are forgotten.
+        self._issued[token.cookie] = token
+        now = time.monotonic()
+        for cookie, issued in list(self._issued.items()):
+            if now - issued.expires_at > self.SESSION_TTL:
+                del self._issued[cookie]
+
+    def token_for(self, cookie):
+        """
+        The AviToken a Cookie header was issued with, None if it wasn't issued here.
+        """
+        return self._issued.get(cookie) if cookie else None
+
+    def default_headers(self, with_session=True, token=None):
+        headers = {
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+            "referer": "https://" + self.ip + "/login"
+        }
+        if with_session and token is not None:
+            headers["Cookie"] = token.cookie
+            headers["x-csrftoken"] = token.csrf_token
+        return headers
+
+    def request(self, method, url, headers=None, with_session=True, token=None, **kwargs):
+        """
+        Drop-in replacement for requests.request() against this controller; relative
+        urls are resolved against the controller and the session headers of token, if
+        given, are filled in. Login calls pass with_session=False so a stale CSRF token
+        is never replayed.
+        """
+        if not url.startswith("http"):
+            url = "https://" + self.ip + url
+        merged = self.default_headers(with_session, token)
+        if headers:
+            merged.update(headers)
+        kwargs.setdefault("verify", False)
+        response = self._send(method, url, merged, **kwargs)
+        sent = self.token_for(merged.get("Cookie")) if with_session else None
+        if response.status_code == 401 and sent is not None:
+            # Session expired on the controller: log the same user in again and replay the
+            # call once. When another caller already refreshed that user's token, the cached
+            # one is reused instead of logging in again.
+            fresh = self.login(sent.username, self._passwords[sent.username], stale=sent)
+            if fresh is not None:
+                merged["Cookie"] = fresh.cookie
+                merged["x-csrftoken"] = fresh.csrf_token
+                response = self._send(method, url, merged, **kwargs)
+        return response
+
+    def _send(self, method, url, headers, **kwargs):
+        start = time.monotonic()
+        try:
+            return self.session.request(method, url, headers=headers, **kwargs)
+        finally:
+            elapsed = time.monotonic() - start
+            with self._stats_lock:
+                self.calls += 1
+                self.elapsed += elapsed
+            logger.debug("AVI %s %s took %.3fs", method, url, elapsed)
+
+    def stats(self):
+        with self._stats_lock:
+            average = self.elapsed / self.calls if self.calls else 0.0
+            return dict(controller=self.ip, calls=self.calls, total_seconds=round(self.elapsed, 3),
+                        average_seconds=round(average, 3))
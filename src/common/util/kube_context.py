@@ -0,0 +1,119 @@
+# Copyright 2021 VMware, Inc.
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+import yaml
+
+
+class KubeContext:
+    """
+    Per-thread kubeconfig, so cluster configurations running side by side can each
+    switch contexts (kubectl config use-context, tanzu cluster kubeconfig get --admin)
+    without changing the current context under the other. Commands started through
+    ShellHelper from a thread inside isolated() run with KUBECONFIG pointing at that
+    thread's private copy of the kubeconfig. Clusters, contexts and users the thread
+    added or changed in its copy are merged back into the shared kubeconfig on exit,
+    over whatever the shared kubeconfig holds under the same names, keeping its
+    current context.
+    """
+    _local = threading.local()
+    _merge_lock = threading.Lock()
+
+    @staticmethod
+    def default_path():
+        return os.environ.get("KUBECONFIG", str(Path.home() / ".kube" / "config")).split(os.pathsep)[0]
+
+    @staticmethod
+    def path():
+        return getattr(KubeContext._local, "path", None) or KubeContext.default_path()
+
+    @staticmethod
+    def env():
+        """
+        Environment for a subprocess of this thread, or None to inherit the server's.
+        """
+        path = getattr(KubeContext._local, "path", None)
+        if path is None:
+            return None
+        env = dict(os.environ)
+        env["KUBECONFIG"] = path
+        return env
+
+    @staticmethod
+    @contextmanager
+    def isolated(name):
+        source = KubeContext.path()
+        fd, path = tempfile.mkstemp(prefix="kubeconfig-" + name + "-")
+        os.close(fd)
+        if os.path.isfile(source):
+            shutil.copyfile(source, path)
+        base = KubeContext._load(path)
+        previous = getattr(KubeContext._local, "path", None)
+        KubeContext._local.path = path
+        try:
+            yield path
+        finally:
+            KubeContext._local.path = previous
+            KubeContext._merge(source, path, base)
+            os.remove(path)
+
+    @staticmethod
+    def inherit(call):
+        """
+        Wrap call so that it runs, from whichever thread, with the kubeconfig of the
+        thread wrapping it, e.g. for steps handed to a thread pool from inside isolated().
+        """
+        path = getattr(KubeContext._local, "path", None)
+
+        def run(*args, **kwargs):
+            previous = getattr(KubeContext._local, "path", None)
+            KubeContext._local.path = path
+            try:
+                return call(*args, **kwargs)
+            finally:
+                KubeContext._local.path = previous
+        return run
+
+    @staticmethod
+    def _load(path):
+        try:
+            with open(path) as f:
+                config = yaml.safe_load(f)
+        except (OSError, yaml.YAMLError):
+            return {}
+        return config if isinstance(config, dict) else {}
+
+    @staticmethod
+    def _merge(target, path, base):
+        changed = KubeContext._load(path)
+        with KubeContext._merge_lock:
+            merged = KubeContext._load(target)
+            dirty = False
+            for section in ("clusters", "contexts", "users"):
+                before = {entry.get("name"): entry for entry in base.get(section) or []}
+                updates = {entry.get("name"): entry for entry in changed.get(section) or []
+                           if before.get(entry.get("name")) != entry}
+                if not updates:
+                    continue
+                entries = [updates.pop(entry.get("name"), entry) for entry in merged.get(section) or []]
+                merged[section] = entries + list(updates.values())
+                dirty = True
+            if not merged.get("current-context") and changed.get("current-context"):
+                merged["current-context"] = changed["current-context"]
+                dirty = True
+            if not dirty:
+                return
+            merged.setdefault("apiVersion", "v1")
+            merged.setdefault("kind", "Config")
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            tmp = target + ".tmp"
+            with open(tmp, "w") as f:
+                yaml.safe_dump(merged, f, default_flow_style=False)
+            os.chmod(tmp, 0o600)
+            os.replace(tmp, target)
@@ -0,0 +1,390 @@
+# Copyright 2021 VMware, Inc.
+# SPDX-License-Identifier: BSD-2-Clause
+
+import atexit
+import base64
+import hashlib
+import json
+import logging
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+
+import requests
+import yaml
+from requests.packages.urllib3.exceptions import InsecureRequestWarning
+from yaml import SafeLoader
+
+from common.util.kube_context import KubeContext
+
+requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
+
+logger = logging.getLogger(__name__)
+
+
+class KubeApiConfig:
+    """
+    Connection details of one kubeconfig context, enough to talk to the API server
+    with requests. Tests can build one directly against a local fake API server.
+
+    Certificates and keys embedded in the kubeconfig are written to files only this
+    process's user can read, in a directory created for the process.
+    """
+    _data_dir = None
+    _data_files = {}
+    _data_lock = threading.Lock()
+
+    def __init__(self, server, verify=False, cert=None, token=None, name=None):
+        self.server = server.rstrip("/")
+        self.verify = verify
+        self.cert = cert
+        self.token = token
+        self.name = name or self.server
+
+    @staticmethod
+    def kubeconfig_path():
+        return KubeContext.path()
+
+    @staticmethod
+    def from_kubeconfig(path=None, context=None):
+        path = path or KubeApiConfig.kubeconfig_path()
+        with open(path) as f:
+            kubeconfig = yaml.load(f, Loader=SafeLoader)
+        context = context or kubeconfig["current-context"]
+        ctx = next(c["context"] for c in kubeconfig["contexts"] if c["name"] == context)
+        cluster = next(c["cluster"] for c in kubeconfig["clusters"] if c["name"] == ctx["cluster"])
+        user = next(u["user"] for u in kubeconfig["users"] if u["name"] == ctx["user"])
+        verify = False
+        if not cluster.get("insecure-skip-tls-verify"):
+            if "certificate-authority-data" in cluster:
+                verify = KubeApiConfig._data_file(cluster["certificate-authority-data"])
+            elif "certificate-authority" in cluster:
+                verify = cluster["certificate-authority"]
+        cert = None
+        if "client-certificate-data" in user:
+            cert = (KubeApiConfig._data_file(user["client-certificate-data"]),
+                    KubeApiConfig._data_file(user["client-key-data"]))
+        elif "client-certificate" in user:
+            cert = (user["client-certificate"], user["client-key"])
+        token = user.get("token")
+        if cert is None and token is None:
+            raise ValueError("Context " + context + " uses an authentication method not supported for watches")
+        return KubeApiConfig(cluster["server"], verify=verify, cert=cert, token=token, name=path + ":" + context)
+
+    @staticmethod
+    def _data_file(data):
+        content = base64.b64decode(data)
+        digest = hashlib.sha256(content).hexdigest()
+        with KubeApiConfig._data_lock:
+            path = KubeApiConfig._data_files.get(digest)
+            if path is not None and _is_private(path):
+                return path
+            if KubeApiConfig._data_dir is None or not _is_private(KubeApiConfig._data_dir):
+                # mkdtemp creates the directory with mode 0700 under a name nobody can guess.
+                KubeApiConfig._data_dir = tempfile.mkdtemp(prefix="kube-watch-")
+                atexit.register(shutil.rmtree, KubeApiConfig._data_dir, True)
+            fd, path = tempfile.mkstemp(dir=KubeApiConfig._data_dir)
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            KubeApiConfig._data_files[digest] = path
+            return path
+
+
+def _is_private(path):
+    """
+    True if path is owned by the current user and nobody else can read or write it.
+    """
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return st.st_uid == os.getuid() and not st.st_mode & 0o077
+
+
+def watch_scope(command):
+    """
+    What a `kubectl get app(s)` or `tanzu package installed list` command lists, as
+    dict(kubeconfig, context, namespace, name), so a watch can answer in its place.
+    Returns None for any other command, or one whose flags the watch can't honour,
+    e.g. no namespace given (the context's own namespace would apply).
+    """
+    if command[:3] == ["kubectl", "get", "app"] or command[:3] == ["kubectl", "get", "apps"]:
+        args = command[3:]
+    elif command[:4] == ["tanzu", "package", "installed", "list"]:
+        args = command[4:]
+    else:
+        return None
+    scope = dict(kubeconfig=None, context=None, namespace=None, name=None)
+    all_namespaces = False
+    flags = {"-n": "namespace", "--namespace": "namespace", "--kubeconfig": "kubeconfig", "--context": "context"}
+    args = list(args)
+    while args:
+        arg = args.pop(0)
+        flag, _, value = arg.partition("=")
+        if arg in ("-A", "--all-namespaces"):
+            all_namespaces = True
+        elif flag in flags:
+            if not value:
+                if not args:
+                    return None
+                value = args.pop(0)
+            scope[flags[flag]] = value
+        elif arg.startswith("-") or scope["name"] is not None or command[0] != "kubectl":
+            return None
+        else:
+            scope["name"] = arg
+    if not all_namespaces and scope["namespace"] is None:
+        return None
+    if all_namespaces:
+        scope["namespace"] = None
+    return scope
+
+
+class ReconcileWatcher:
+    """
+    Tracks kapp-controller App reconcile status for one cluster context through a single
+    list+watch stream, resuming from the last seen resourceVersion. Every PackageInstall
+    is backed by an App of the same name, so one stream covers both `kubectl get apps`
+    and `tanzu package installed list` style waits. Waiters are woken as soon as a
+    status changes instead of re-running the CLI.
+    """
+    APPS_PATH = "/apis/kappctrl.k14s.io/v1alpha1/apps"
+    WATCH_TIMEOUT = 300
+    # Watchers nobody waited on for this long are closed when the next one is requested.
+    IDLE_TIMEOUT = 600
+    SUCCEEDED = "ReconcileSucceeded"
+    _watchers = {}
+    _lock = threading.Lock()
+
+    def __init__(self, api: KubeApiConfig):
+        self.api = api
+        self.session = requests.Session()
+        self.session.verify = api.verify
+        self.session.cert = api.cert
+        if api.token:
+            self.session.headers["Authorization"] = "Bearer " + api.token
+        self.statuses = {}
+        self.resource_version = None
+        self.synced = False
+        self.error = None
+        self._condition = threading.Condition()
+        self._stop = threading.Event()
+        self._thread = None
+        self._response = None
+        self.waiters = 0
+        self.used_at = time.monotonic()
+
+    @classmethod
+    def for_context(cls, kubeconfig=None, context=None):
+        """
+        Shared watcher for the given (or current) kubeconfig context; returns None when the
+        context cannot be watched, so callers can fall back to polling the CLI.
+        """
+        try:
+            api = KubeApiConfig.from_kubeconfig(kubeconfig, context)
+        except Exception as e:
+            logger.debug("Kubernetes watch not available: " + str(e))
+            return None
+        return cls.for_api(api)
+
+    @classmethod
+    def for_api(cls, api: KubeApiConfig):
+        with cls._lock:
+            cls._close_idle()
+            watcher = cls._watchers.get(api.name)
+            if watcher is None or watcher.error is not None:
+                if watcher is not None:
+                    watcher.stop()
+                watcher = cls(api)
+                watcher.start()
+                cls._watchers[api.name] = watcher
+            watcher.used_at = time.monotonic()
+            return watcher
+
+    @classmethod
+    def stop_all(cls):
+        with cls._lock:
+            watchers = list(cls._watchers.values())
+            cls._watchers.clear()
+        for watcher in watchers:
+            watcher.close()
+
+    @classmethod
+    def _close_idle(cls):
+        # Steps working on their own kubeconfig copy leave a watcher behind for a path
+        # nobody uses again.
+        now = time.monotonic()
+        for name, watcher in list(cls._watchers.items()):
+            with watcher._condition:
+                idle = watcher.waiters == 0 and now - watcher.used_at > cls.IDLE_TIMEOUT
+            if idle:
+                del cls._watchers[name]
+                watcher.stop()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="reconcile-watch", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Ends the watch: the open stream is closed so the thread returns right away, and
+        waiters are told to fall back to polling.
+        """
+        self._stop.set()
+        response = self._response
+        if response is not None:
+            _interrupt(response)
+        self.session.close()
+        with self._condition:
+            if self.error is None:
+                self.error = Exception("Watch on " + self.api.name + " stopped")
+            self._condition.notify_all()
+
+    def close(self, timeout=10):
+        """
+        stop() and wait for the watch thread to end.
+        """
+        self.stop()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def wait_reconciled(self, name, timeout=1800, namespace=None, app=None):
+        """
+        Block until an App whose name contains `name` reports ReconcileSucceeded, only
+        looking at the given namespace and App name when set. kapp-controller keeps
+        retrying failed reconciles, so ReconcileFailed does not end the wait early.
+        Returns True on success, False on timeout, and None when the watch itself broke
+        down and the caller should fall back to polling.
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            self.waiters += 1
+            try:
+                while True:
+                    if self.error is not None:
+                        return None
+                    if self.synced and self._state_of(name, namespace, app) == self.SUCCEEDED:
+                        return True
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        logger.error(name + " not reconciled: " + str(self._description_of(name, namespace, app)))
+                        return False
+                    self._condition.wait(remaining)
+            finally:
+                self.waiters -= 1
+                self.used_at = time.monotonic()
+
+    def _matching(self, name, namespace, app):
+        return [s for key, s in self.statuses.items()
+                if name in key[1] and namespace in (None, key[0]) and app in (None, key[1])]
+
+    def _state_of(self, name, namespace=None, app=None):
+        states = [s["state"] for s in self._matching(name, namespace, app)]
+        if not states:
+            return None
+        # Same semantics as verifyPodsAreRunning: any matching App that succeeded will do.
+        if any(s == self.SUCCEEDED for s in states):
+            return self.SUCCEEDED
+        return "Reconciling"
+
+    def _description_of(self, name, namespace=None, app=None):
+        return [s["description"] for s in self._matching(name, namespace, app)]
+
+    def _run(self):
+        backoff = 1
+        while not self._stop.is_set():
+            try:
+                if self.resource_version is None:
+                    self._list()
+                self._watch()
+                backoff = 1
+            except _ResourceVersionExpired:
+                self.resource_version = None
+            except Exception as e:
+                if self._stop.is_set():
+                    return
+                if not self.synced:
+                    with self._condition:
+                        self.error = e
+                        self._condition.notify_all()
+                    logger.debug("Kubernetes watch on " + self.api.name + " failed: " + str(e))
+                    return
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+
+    def _list(self):
+        response = self.session.get(self.api.server + self.APPS_PATH, timeout=60)
+        response.raise_for_status()
+        body = response.json()
+        with self._condition:
+            self.statuses = {}
+            for item in body.get("items", []):
+                self._record(item)
+            self.resource_version = body["metadata"]["resourceVersion"]
+            self.synced = True
+            self._condition.notify_all()
+
+    def _watch(self):
+        params = {
+            "watch": "true",
+            "resourceVersion": self.resource_version,
+            "allowWatchBookmarks": "true",
+            "timeoutSeconds": self.WATCH_TIMEOUT
+        }
+        with self.session.get(self.api.server + self.APPS_PATH, params=params, stream=True,
+                              timeout=(60, self.WATCH_TIMEOUT + 30)) as response:
+            self._response = response
+            if self._stop.is_set():
+                return
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if self._stop.is_set():
+                    return
+                if not line:
+                    continue
+                event = json.loads(line)
+                obj = event["object"]
+                if event["type"] == "ERROR":
+                    if obj.get("code") == 410:
+                        raise _ResourceVersionExpired()
+                    raise Exception(obj.get("message"))
+                with self._condition:
+                    if event["type"] == "DELETED":
+                        self.statuses.pop(self._key(obj), None)
+                    elif event["type"] != "BOOKMARK":
+                        self._record(obj)
+                    self.resource_version = obj["metadata"]["resourceVersion"]
+                    self._condition.notify_all()
+
+    def _record(self, obj):
+        status = obj.get("status", {})
+        state = None
+        for condition in status.get("conditions", []):
+            if condition.get("status") == "True":
+                state = condition.get("type")
+        # A status written for an older generation says nothing about the current spec.
+        if status.get("observedGeneration", 0) < obj["metadata"].get("generation", 0):
+            state = None
+        self.statuses[self._key(obj)] = dict(state=state, description=status.get("friendlyDescription"))
+
+    @staticmethod
+    def _key(obj):
+        return obj["metadata"].get("namespace"), obj["metadata"]["name"]
+
+
+def _interrupt(response):
+    # Shutting the socket down wakes up the thread reading the stream; closing the
+    # response instead would wait for that read to finish.
+    sock = getattr(getattr(response.raw, "connection", None), "sock", None)
+    if sock is not None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+class _ResourceVersionExpired(Exception):
+    pass
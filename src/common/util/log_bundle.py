@@ -0,0 +1,121 @@
+# Copyright 2021 VMware, Inc.
+# SPDX-License-Identifier: BSD-2-Clause
+
+import logging
+import os
+import re
+import zipfile
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Rotated copies of a log carry a numeric suffix: arcas.log.1, arcas.log.2, ...
+_ROTATED = re.compile(r"^(?P<base>.+?)\.(?P<index>\d+)$")
+
+
+class LogBundle:
+    """
+    Zip archive of a log directory produced as a stream of chunks: every file is read
+    and compressed CHUNK_SIZE bytes at a time and the compressed bytes are handed out
+    as soon as they exist, so nothing is staged on disk and memory stays bounded by a
+    chunk, however large the rotated logs are.
+    """
+    CHUNK_SIZE = 1024 * 1024
+
+    @staticmethod
+    def select(path, since=None, until=None, last=None) -> list:
+        """
+        Files under path to include, oldest first within each log.
+
+        A log and its rotated copies are treated as one timeline: each file covers the
+        time from the last write of the next older copy to its own last write. Files
+        whose span does not overlap [since, until] (epoch seconds) are left out, and
+        with last=N only the live file and its N most recent rotated copies are kept.
+        """
+        groups = {}
+        for folder, _, filenames in os.walk(path):
+            for filename in filenames:
+                file_path = os.path.join(folder, filename)
+                try:
+                    mtime = os.stat(file_path).st_mtime
+                except OSError:
+                    continue
+                match = _ROTATED.match(filename)
+                base = os.path.join(folder, match.group("base") if match else filename)
+                groups.setdefault(base, []).append((mtime, file_path, match is not None))
+        selected = []
+        for base in sorted(groups):
+            files = sorted(groups[base])
+            if last is not None:
+                live = [f for f in files if not f[2]]
+                rotated = [f for f in files if f[2]]
+                files = sorted(live + (rotated[-last:] if last > 0 else []))
+            start = None
+            for mtime, file_path, _ in files:
+                if (since is None or mtime >= since) and (until is None or start is None or start <= until):
+                    selected.append(file_path)
+                start = mtime
+        return selected
+
+    @staticmethod
+    def stream(path, files, compresslevel=6):
+        """
+        Generator of the bytes of a zip of the given files, stored relative to path.
+        compresslevel 0 stores the files uncompressed.
+        """
+        out = _ChunkWriter()
+        compression = zipfile.ZIP_DEFLATED if compresslevel else zipfile.ZIP_STORED
+        with zipfile.ZipFile(out, "w", compression=compression,
+                             compresslevel=compresslevel or None) as bundle:
+            for file_path in files:
+                arcname = os.path.relpath(file_path, path)
+                try:
+                    source = open(file_path, "rb")
+                except OSError as e:
+                    logger.warning("Skipping " + file_path + " in log bundle: " + str(e))
+                    continue
+                with source:
+                    info = zipfile.ZipInfo.from_file(file_path, arcname)
+                    info.compress_type = compression
+                    with bundle.open(info, "w", force_zip64=True) as entry:
+                        while True:
+                            data = source.read(LogBundle.CHUNK_SIZE)
+                            if not data:
+                                break
+                            entry.write(data)
+                            yield from out.drain()
+                yield from out.drain()
+        yield from out.drain()
+
+    @staticmethod
+    def parse_time(value):
+        """
+        Epoch seconds from a query parameter given as epoch seconds or an ISO 8601 date.
+        """
+        if value is None or value == "":
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            return datetime.fromisoformat(value).timestamp()
+
+
+class _ChunkWriter:
+    """
+    Write-only, unseekable file for ZipFile that keeps what was written until drained.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        chunks, self._chunks = self._chunks, []
+        if chunks:
+            yield b"".join(chunks)
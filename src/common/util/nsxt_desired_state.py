@@ -0,0 +1,235 @@
+# Copyright 2021 VMware, Inc.
+# SPDX-License-Identifier: BSD-2-Clause
+
+import json
+import logging
+
+import requests
+
+from common.util.nsxt_pager import NsxtPager
+
+logger = logging.getLogger(__name__)
+
+
+class NsxtDesiredState:
+    """
+    NSX-T Policy segments, groups, services and gateway firewall rules a deployment needs,
+    compared with what exists and applied with one hierarchical PATCH /policy/api/v1/infra
+    instead of listing segments, groups, domains and rules again and doing a PUT for every
+    object.
+
+    read() fetches the existing objects with one hierarchical GET. Objects added afterwards
+    that already exist are left as they are, except that IP and path groups get the members
+    they miss, so apply() only sends what is missing. The path of every object is known as
+    soon as it is added and can be used in the rules added after it.
+    """
+    INFRA = "/policy/api/v1/infra"
+    TYPES = ("Domain", "Group", "GatewayPolicy", "Rule", "Segment", "Service", "Tier1")
+
+    def __init__(self, address, headers, domain="default"):
+        self.address = address
+        self.headers = dict(headers)
+        self.headers.update({"Content-Type": "application/json", "Accept": "application/json"})
+        self.domain = domain
+        self._existing = {}
+        self._rules = {}
+        self._segments = {}
+        self._services = {}
+        self._groups = {}
+        self._policies = {}
+        self._policy_rules = {}
+
+    def read(self):
+        """
+        Read the existing objects, returns ("SUCCESS", None) or (None, error).
+        """
+        url = "https://" + self.address + self.INFRA + "?filter=Type-" + "|".join(self.TYPES)
+        response = requests.request("GET", url, headers=self.headers, verify=False)
+        if response.status_code != 200:
+            return None, response.text
+        self._existing = {}
+        self._rules = {}
+        self._index(response.json().get("children", []), None)
+        return "SUCCESS", None
+
+    def existing(self, resource_type, name):
+        """
+        The existing object of a type, e.g. "Segment", with the given display name, or None.
+        """
+        return self._existing.get(resource_type, {}).get(name)
+
+    def path(self, resource_type, name):
+        item = self.existing(resource_type, name)
+        return item["path"] if item is not None else None
+
+    def existing_rule(self, policy_id, name):
+        return self._rules.get(policy_id, {}).get(name)
+
+    def tier1_path(self, name):
+        for tier1_name, tier1 in self._existing.get("Tier1", {}).items():
+            if str(tier1_name).lower() == str(name).lower():
+                return tier1["path"]
+        return None
+
+    def segment(self, segment_id, body) -> str:
+        segment = self.existing("Segment", segment_id)
+        if segment is not None:
+            logger.info(segment_id + " is already created")
+            return segment["path"]
+        self._segments[segment_id] = self._object("Segment", segment_id, body)
+        return "/infra/segments/" + segment_id
+
+    def service(self, service_id, body) -> str:
+        service = self.existing("Service", service_id)
+        if service is not None:
+            logger.info("Service is already created " + service_id)
+            return service["path"]
+        self._services[service_id] = self._object("Service", service_id, body)
+        return "/infra/services/" + service_id
+
+    def group(self, group_id, expression) -> str:
+        """
+        Group with the given expression list. An existing group with a single IP address
+        or path expression of the same kind gets the missing addresses or paths added.
+        """
+        group = self.existing("Group", group_id)
+        if group is None:
+            self._groups[group_id] = self._object("Group", group_id, {"expression": expression})
+            return "/infra/domains/" + self.domain + "/groups/" + group_id
+        merged = _merge_expression(group.get("expression") or [], expression)
+        if merged is None:
+            logger.info(group_id + " group is already created.")
+        else:
+            logger.info("Adding members to group " + group_id)
+            self._groups[group_id] = self._object("Group", group.get("id", group_id), {"expression": merged})
+        return group["path"]
+
+    def gateway_policy(self, policy_id, body) -> str:
+        policy = self.existing("GatewayPolicy", policy_id)
+        if policy is not None:
+            logger.info(policy_id + " policy is already created")
+            return policy["path"]
+        body = dict(body)
+        rules = body.pop("rules", [])
+        self._policies[policy_id] = self._object("GatewayPolicy", policy_id, body)
+        for rule in rules:
+            self.rule(policy_id, rule["id"], rule)
+        return "/infra/domains/" + self.domain + "/gateway-policies/" + policy_id
+
+    def rule(self, policy_id, rule_id, body, update=False) -> str:
+        """
+        Rule of a gateway policy. An existing rule is left as it is, unless update is set
+        and some of the given fields differ, e.g. to change the action of the default rule.
+        """
+        rule = self.existing_rule(policy_id, rule_id)
+        pending = self._policy_rules.setdefault(policy_id, {})
+        path = "/infra/domains/" + self.domain + "/gateway-policies/" + policy_id + "/rules/" + rule_id
+        if rule_id in pending:
+            pending[rule_id].update(body)
+        elif rule is None:
+            pending[rule_id] = self._object("Rule", rule_id, body)
+        elif update and any(rule.get(key) != value for key, value in body.items()):
+            pending[rule_id] = self._object("Rule", rule.get("id", rule_id),
+                                            dict(body, display_name=rule.get("display_name")))
+            return rule["path"]
+        else:
+            logger.info(rule_id + " rule is already created")
+            return rule["path"]
+        return path
+
+    def changes(self) -> int:
+        return len(self._segments) + len(self._services) + len(self._groups) + len(self._policies) + \
+               sum(len(rules) for rules in self._policy_rules.values())
+
+    def created_segments(self) -> list:
+        return list(self._segments)
+
+    def payload(self) -> dict:
+        # Services and segments come before the groups and rules referring to them.
+        children = [_child("Service", service) for service in self._services.values()]
+        children += [_child("Segment", segment) for segment in self._segments.values()]
+        domain_children = [_child("Group", group) for group in self._groups.values()]
+        for policy_id in dict.fromkeys(list(self._policies) + list(self._policy_rules)):
+            rules = self._policy_rules.get(policy_id, {})
+            if not rules and policy_id not in self._policies:
+                continue
+            rule_children = [_child("Rule", rule) for rule in rules.values()]
+            if policy_id in self._policies:
+                policy = dict(self._policies[policy_id], children=rule_children)
+                domain_children.append(_child("GatewayPolicy", policy))
+            else:
+                domain_children.append(_reference("GatewayPolicy", policy_id, rule_children))
+        if domain_children:
+            children.append(_reference("Domain", self.domain, domain_children))
+        return {"resource_type": "Infra", "children": children}
+
+    def apply(self):
+        """
+        Send everything missing in one PATCH, returns (message, 200) or (error, status code).
+        """
+        count = self.changes()
+        if count == 0:
+            return "NSX-T objects are already configured", 200
+        logger.info("Applying " + str(count) + " NSX-T objects")
+        url = "https://" + self.address + self.INFRA
+        response = requests.request("PATCH", url, headers=self.headers, data=json.dumps(self.payload(), indent=4),
+                                    verify=False)
+        if response.status_code != 200:
+            logger.error(response.text)
+            return response.text, response.status_code
+        NsxtPager.invalidate("https://" + self.address)
+        self._segments = {}
+        self._services = {}
+        self._groups = {}
+        self._policies = {}
+        self._policy_rules = {}
+        return "Configured " + str(count) + " NSX-T objects", 200
+
+    def _object(self, resource_type, object_id, body):
+        body = dict(body)
+        body.setdefault("display_name", object_id)
+        body["id"] = object_id
+        body["resource_type"] = resource_type
+        body.pop("_revision", None)
+        return body
+
+    def _index(self, children, policy_id):
+        for child in children:
+            resource_type = str(child.get("resource_type", ""))[len("Child"):]
+            item = child.get(resource_type)
+            if not isinstance(item, dict):
+                continue
+            if resource_type == "Rule":
+                self._rules.setdefault(policy_id, {})[item.get("display_name")] = item
+            else:
+                self._existing.setdefault(resource_type, {})[item.get("display_name")] = item
+            if resource_type == "Domain" and item.get("id") != self.domain:
+                continue
+            self._index(item.get("children", []),
+                        item.get("id") if resource_type == "GatewayPolicy" else policy_id)
+
+
+def _child(resource_type, body):
+    return {"resource_type": "Child" + resource_type, "marked_for_delete": False, resource_type: body}
+
+
+def _reference(target_type, object_id, children):
+    return {"resource_type": "ChildResourceReference", "id": object_id, "target_type": target_type,
+            "children": children}
+
+
+def _merge_expression(existing, expression):
+    # Only groups made of one IP address or path expression are extended.
+    if len(existing) != 1 or len(expression) != 1:
+        return None
+    current, wanted = existing[0], expression[0]
+    if current.get("resource_type") != wanted.get("resource_type"):
+        return None
+    key = {"IPAddressExpression": "ip_addresses", "PathExpression": "paths"}.get(wanted.get("resource_type"))
+    if key is None:
+        return None
+    members = list(current.get(key) or [])
+    missing = [member for member in wanted.get(key) or [] if member not in members]
+    if not missing:
+        return None
+    return [{"resource_type": wanted["resource_type"], key: members + missing}]
@@ -0,0 +1,115 @@
+# Copyright 2021 VMware, Inc.
+# SPDX-License-Identifier: BSD-2-Clause
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from flask import copy_current_request_context, has_request_context, request
+
+logger = logging.getLogger(__name__)
+
+
+class NsxtListError(Exception):
+    def __init__(self, text, status_code):
+        super().__init__(text)
+        self.text = text
+        self.status_code = status_code
+
+
+class NsxtPager:
+    """
+    Complete NSX-T collections: list calls return at most one page of results plus a
+    cursor to the next one, so reading only `results` misses objects on managers with
+    many groups, segments or rules. Pages are requested PAGE_SIZE results at a time
+    until no cursor is returned.
+
+    Within a request, complete lists are remembered by URL, so a collection read by
+    several checks is fetched once. Callers that change a collection invalidate() it.
+    """
+    PAGE_SIZE = 1000
+    MAX_WORKERS = 8
+    _ENVIRON_KEY = "arcas.nsxt_lists"
+    _lock = threading.Lock()
+
+    @staticmethod
+    def iterate(url, headers, page_size=PAGE_SIZE):
+        """
+        Generator of the results of every page of a collection, raises NsxtListError
+        if a page can't be read.
+        """
+        cursor = None
+        while True:
+            params = {"page_size": page_size}
+            if cursor:
+                params["cursor"] = cursor
+            response = requests.request("GET", _with_query(url, params), headers=headers, verify=False)
+            if response.status_code != 200:
+                raise NsxtListError(response.text, response.status_code)
+            page = response.json()
+            results = page.get("results") or []
+            yield from results
+            cursor = page.get("cursor")
+            if not cursor or not results:
+                return
+
+    @staticmethod
+    def list(url, headers, page_size=PAGE_SIZE):
+        """
+        All results of a collection, returns (results, 200) or (error, status code).
+        Callers get their own copy of the list, so changing it leaves the cache as it is.
+        """
+        cache = NsxtPager._cache()
+        with NsxtPager._lock:
+            if url in cache:
+                return list(cache[url]), 200
+        try:
+            results = list(NsxtPager.iterate(url, headers, page_size))
+        except NsxtListError as e:
+            return e.text, e.status_code
+        with NsxtPager._lock:
+            cache[url] = results
+        return list(results), 200
+
+    @staticmethod
+    def list_all(urls, headers, page_size=PAGE_SIZE) -> dict:
+        """
+        Fetch independent collections side by side, returns name -> (results or error,
+        status code) for a dict of name -> URL.
+        """
+        if not urls:
+            return {}
+
+        def fetch(url):
+            # Each worker gets its own copy of the request context, to share the cache.
+            call = lambda: NsxtPager.list(url, headers, page_size)
+            return copy_current_request_context(call) if has_request_context() else call
+        with ThreadPoolExecutor(max_workers=min(NsxtPager.MAX_WORKERS, len(urls)),
+                                thread_name_prefix="nsxt-list") as executor:
+            futures = {name: executor.submit(fetch(url)) for name, url in urls.items()}
+            return {name: future.result() for name, future in futures.items()}
+
+    @staticmethod
+    def invalidate(prefix=""):
+        """
+        Forget the lists whose URL starts with prefix, all of them by default.
+        """
+        cache = NsxtPager._cache()
+        with NsxtPager._lock:
+            for url in [url for url in cache if url.startswith(prefix)]:
+                del cache[url]
+
+    @staticmethod
+    def _cache():
+        if not has_request_context():
+            return {}
+        with NsxtPager._lock:
+            return request.environ.setdefault(NsxtPager._ENVIRON_KEY, {})
+
+
+def _with_query(url, params):
+    parts = urlsplit(url)
+    query = [(key, value) for key, value in parse_qsl(parts.query) if key not in params]
+    return urlunsplit(parts._replace(query=urlencode(query + list(params.items()))))
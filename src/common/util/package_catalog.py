@@ -0,0 +1,201 @@
+# Copyright 2021 VMware, Inc.
+# SPDX-License-Identifier: BSD-2-Clause
+
+import json
+import logging
+import os
+import subprocess
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import yaml
+
+from common.util.kube_context import KubeContext
+
+logger = logging.getLogger(__name__)
+
+
+class InstalledPackage:
+    def __init__(self, name, namespace, package, version, status):
+        self.name = name
+        self.namespace = namespace
+        self.package = package
+        self.version = version
+        self.status = status
+
+
+class PackageCatalog:
+    """
+    Available and installed Tanzu packages of one cluster, read from the Package and
+    PackageInstall resources with one kubectl call each instead of a `tanzu package
+    available list <package>` or `tanzu package installed list -A | grep` per package.
+
+    Catalogs are kept per cluster (the kubeconfig files kubectl reads and their current
+    context) and re-read after invalidate(), which callers run once they installed or
+    updated a package, or after TTL seconds in case packages were changed from outside.
+    Catalogs whose kubeconfig files are all gone are dropped, and at most MAX_CATALOGS
+    of the most recently used are kept.
+    """
+    TTL = 300
+    MAX_CATALOGS = 16
+    PACKAGES = "packages.data.packaging.carvel.dev"
+    PACKAGE_INSTALLS = "packageinstalls.packaging.carvel.dev"
+    _catalogs = OrderedDict()
+    _lock = threading.Lock()
+
+    def __init__(self, ttl=TTL):
+        self.ttl = ttl
+        self._available = None
+        self._available_at = 0
+        self._installed = None
+        self._installed_at = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def current(cls) -> "PackageCatalog":
+        """
+        Catalog of the cluster kubectl currently talks to from this thread.
+        """
+        key = _cluster_key()
+        with cls._lock:
+            catalog = cls._catalogs.get(key)
+            if catalog is None:
+                # Drop catalogs of kubeconfigs that were removed since, e.g. private per-step copies.
+                for stale in [k for k in cls._catalogs if not any(os.path.exists(path) for path in k[0])]:
+                    del cls._catalogs[stale]
+                catalog = cls._catalogs[key] = cls()
+                while len(cls._catalogs) > cls.MAX_CATALOGS:
+                    cls._catalogs.popitem(last=False)
+            cls._catalogs.move_to_end(key)
+            return catalog
+
+    @classmethod
+    def invalidate_all(cls):
+        with cls._lock:
+            cls._catalogs.clear()
+
+    def invalidate(self):
+        with self._lock:
+            self._available = None
+            self._installed = None
+
+    def versions(self, package) -> list:
+        """
+        (version, releasedAt) of every available version of a package, e.g.
+        contour.tanzu.vmware.com, latest release first. None if the packages can't be read.
+        """
+        available = self._available_packages()
+        if available is None:
+            return None
+        return sorted(available.get(package, []), key=lambda v: v[1], reverse=True)
+
+    def latest_version(self, package):
+        versions = self.versions(package)
+        return versions[0][0] if versions else None
+
+    def installed(self, name):
+        """
+        The installed package named name (the name given to `tanzu package install`),
+        or, as with grep, the first one whose name contains it. None if not installed.
+        """
+        installed = self._installed_packages()
+        if not installed:
+            return None
+        if name in installed:
+            return installed[name]
+        return next((package for key, package in installed.items() if name in key), None)
+
+    def status(self, name):
+        package = self.installed(name)
+        return package.status if package is not None else None
+
+    def is_reconciled(self, name, state):
+        """
+        True if the package is installed and its status contains state, e.g.
+        RegexPattern.RECONCILE_SUCCEEDED.
+        """
+        current = self.status(name)
+        return current is not None and state in current
+
+    def _available_packages(self):
+        with self._lock:
+            if self._available is None or time.monotonic() - self._available_at > self.ttl:
+                items = _list(self.PACKAGES)
+                if items is None:
+                    return None
+                available = {}
+                for item in items:
+                    spec = item.get("spec") or {}
+                    available.setdefault(spec.get("refName"), []).append(
+                        (spec.get("version"), str(spec.get("releasedAt") or "")))
+                self._available = available
+                self._available_at = time.monotonic()
+            return self._available
+
+    def _installed_packages(self):
+        with self._lock:
+            if self._installed is None or time.monotonic() - self._installed_at > self.ttl:
+                items = _list(self.PACKAGE_INSTALLS)
+                if items is None:
+                    return None
+                installed = {}
+                for item in items:
+                    metadata = item.get("metadata") or {}
+                    spec = item.get("spec") or {}
+                    status = item.get("status") or {}
+                    ref = spec.get("packageRef") or {}
+                    version = status.get("version") or (ref.get("versionSelection") or {}).get("constraints")
+                    installed[metadata.get("name")] = InstalledPackage(
+                        metadata.get("name"), metadata.get("namespace"), ref.get("refName"), version,
+                        status.get("friendlyDescription") or _condition(status))
+                self._installed = installed
+                self._installed_at = time.monotonic()
+            return self._installed
+
+
+def _list(resource):
+    command = ["kubectl", "get", resource, "-A", "-o", "json"]
+    try:
+        output = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=KubeContext.env())
+    except OSError as e:
+        logger.error("Failed to list " + resource + ": " + str(e))
+        return None
+    if output.returncode != 0:
+        logger.error("Failed to list " + resource + ": " + output.stderr.decode("utf-8", "replace").strip())
+        return None
+    return json.loads(output.stdout).get("items") or []
+
+
+def _condition(status):
+    # Same wording as the STATUS column of `tanzu package installed list`.
+    for condition in status.get("conditions") or []:
+        if str(condition.get("status")).lower() == "true":
+            words = {"ReconcileSucceeded": "Reconcile succeeded", "ReconcileFailed": "Reconcile failed",
+                     "Reconciling": "Reconciling", "DeleteFailed": "Delete failed", "Deleting": "Deleting"}
+            return words.get(condition.get("type"), condition.get("type"))
+    return ""
+
+
+def _kubeconfig_paths():
+    # The files kubectl reads: every entry of KUBECONFIG, or ~/.kube/config if it's unset or empty.
+    env = KubeContext.env() or os.environ
+    paths = [path for path in env.get("KUBECONFIG", "").split(os.pathsep) if path]
+    return [os.path.abspath(path) for path in paths or [str(Path.home() / ".kube" / "config")]]
+
+
+def _cluster_key():
+    paths = _kubeconfig_paths()
+    context = None
+    for path in paths:
+        # As with kubectl, the first file setting current-context wins.
+        try:
+            with open(path) as f:
+                config = yaml.safe_load(f) or {}
+        except (OSError, yaml.YAMLError):
+            continue
+        context = config.get("current-context") if isinstance(config, dict) else None
+        if context:
+            break
+    return tuple(paths), context
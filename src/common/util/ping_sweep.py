@@ -0,0 +1,94 @@
+# Copyright 2021 VMware, Inc.
+# SPDX-License-Identifier: BSD-2-Clause
+
+import ipaddress
+import logging
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import has_request_context, request
+
+logger = logging.getLogger(__name__)
+
+
+class PingSweep:
+    """
+    ICMP reachability of many addresses at once: up to MAX_PROBES ping processes run
+    side by side, each sending one echo request and waiting at most `timeout` seconds
+    for the reply, so a whole /24 pool is swept in a few seconds instead of minutes.
+
+    Within a request the results are remembered, so gateways and pools shared by
+    several checks are probed only once per request.
+    """
+    MAX_PROBES = 64
+    TIMEOUT = 2
+    # Largest pool expand() accepts, to catch swapped start and end addresses.
+    MAX_ADDRESSES = 4096
+    _ENVIRON_KEY = "arcas.ping_results"
+    _lock = threading.Lock()
+
+    @staticmethod
+    def probe(addresses, timeout=TIMEOUT, max_probes=MAX_PROBES) -> dict:
+        """
+        Address -> True if it answered, for every address given, in the given order.
+        """
+        addresses = list(dict.fromkeys(str(address).split("/")[0] for address in addresses))
+        cache = PingSweep._cache()
+        with PingSweep._lock:
+            results = {address: cache[address] for address in addresses if address in cache}
+        missing = [address for address in addresses if address not in results]
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(max_probes, len(missing)),
+                                    thread_name_prefix="ping") as executor:
+                probed = dict(zip(missing, executor.map(lambda address: _ping(address, timeout), missing)))
+            with PingSweep._lock:
+                cache.update(probed)
+            results.update(probed)
+            logger.debug("Pinged %d addresses, %d answered" % (len(probed), sum(probed.values())))
+        return {address: results[address] for address in addresses}
+
+    @staticmethod
+    def reachable(address, timeout=TIMEOUT) -> bool:
+        return PingSweep.probe([address], timeout)[str(address).split("/")[0]]
+
+    @staticmethod
+    def responding(addresses, timeout=TIMEOUT) -> list:
+        """
+        The given addresses that answered, in the given order.
+        """
+        results = PingSweep.probe(addresses, timeout)
+        return [address for address, answered in results.items() if answered]
+
+    @staticmethod
+    def expand(start, end=None) -> list:
+        """
+        Addresses of a pool given as start and end address, "start-end" or a CIDR.
+        """
+        if end is None and "-" in start:
+            start, end = start.split("-", 1)
+        if end is None:
+            network = ipaddress.ip_network(start.strip(), strict=False)
+            hosts = list(network.hosts()) or [network.network_address]
+            return [str(host) for host in hosts]
+        first = int(ipaddress.ip_address(start.strip()))
+        last = int(ipaddress.ip_address(end.strip()))
+        if last < first or last - first >= PingSweep.MAX_ADDRESSES:
+            raise ValueError("Invalid address range %s-%s" % (start, end))
+        return [str(ipaddress.ip_address(i)) for i in range(first, last + 1)]
+
+    @staticmethod
+    def _cache():
+        if not has_request_context():
+            return {}
+        with PingSweep._lock:
+            return request.environ.setdefault(PingSweep._ENVIRON_KEY, {})
+
+
+def _ping(address, timeout):
+    command = ["ping", "-c", "1", "-n", "-W", str(max(1, int(timeout))), address]
+    try:
+        return subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                              timeout=timeout + 5).returncode == 0
+    except (OSError, subprocess.TimeoutExpired):
+        return False
@@ -0,0 +1,96 @@
+# Copyright 2021 VMware, Inc.
+# SPDX-License-Identifier: BSD-2-Clause
+
+import threading
+from contextlib import contextmanager
+
+from flask import has_request_context, request
+
+from common.util.ssl_helper import decode_from_b64
+
+
+class _BoundSpec:
+    def __init__(self, spec_json):
+        self.json = spec_json
+        self.models = {}
+        self.secrets = {}
+
+
+class RequestSpec:
+    """
+    Deployment spec of the current API call, read from the request body once and shared
+    by the handler and every helper it calls, together with the typed models
+    (VsphereMasterSpec, VmcMasterSpec, ...) and decoded base64 secrets derived from it,
+    which are built on first use and then reused for the rest of the request.
+
+    Outside a Flask request (scripts, tests, worker threads without a copied request
+    context) bind a spec explicitly:
+
+        with RequestSpec.bound(spec_json):
+            deploy(...)
+    """
+    _ENVIRON_KEY = "arcas.request_spec"
+    _local = threading.local()
+
+    @staticmethod
+    def json() -> dict:
+        return RequestSpec._current().json
+
+    @staticmethod
+    def model(spec_class):
+        """
+        The spec parsed and validated as spec_class, once per request. The model is
+        shared, so callers must not modify it.
+        """
+        bound = RequestSpec._current()
+        spec = bound.models.get(spec_class)
+        if spec is None:
+            spec = spec_class.parse_obj(bound.json)
+            bound.models[spec_class] = spec
+        return spec
+
+    @staticmethod
+    def secret(*path) -> str:
+        """
+        Base64 encoded spec field at the given key path, decoded once per request.
+        Raises ValueError naming the field when it isn't base64 encoded ASCII text.
+        """
+        bound = RequestSpec._current()
+        if path not in bound.secrets:
+            value = bound.json
+            for key in path:
+                value = value[key]
+            try:
+                bound.secrets[path] = decode_from_b64(str(value))
+            except (ValueError, UnicodeError) as e:
+                raise ValueError(".".join(path) + " is not a valid base64 encoded value: " + str(e)) from e
+        return bound.secrets[path]
+
+    @staticmethod
+    @contextmanager
+    def bound(spec_json):
+        stack = RequestSpec._stack()
+        stack.append(_BoundSpec(spec_json))
+        try:
+            yield
+        finally:
+            stack.pop()
+
+    @staticmethod
+    def _stack():
+        if not hasattr(RequestSpec._local, "stack"):
+            RequestSpec._local.stack = []
+        return RequestSpec._local.stack
+
+    @staticmethod
+    def _current() -> _BoundSpec:
+        stack = RequestSpec._stack()
+        if stack:
+            return stack[-1]
+        if not has_request_context():
+            raise RuntimeError("No deployment spec: not in a request and none bound with RequestSpec.bound()")
+        bound = request.environ.get(RequestSpec._ENVIRON_KEY)
+        if bound is None:
+            bound = _BoundSpec(request.get_json(force=True))
+            request.environ[RequestSpec._ENVIRON_KEY] = bound
+        return bound
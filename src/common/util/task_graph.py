@@ -0,0 +1,171 @@
+# Copyright 2021 VMware, Inc.
+# SPDX-License-Identifier: BSD-2-Clause
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from flask import copy_current_request_context, has_request_context, has_app_context, current_app
+
+logger = logging.getLogger(__name__)
+
+
+class TaskResult:
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+    SKIPPED = "SKIPPED"
+
+    def __init__(self, name, status, elapsed=0.0, message=None):
+        self.name = name
+        self.status = status
+        self.elapsed = elapsed
+        self.message = message
+
+    def __bool__(self):
+        return self.status == TaskResult.SUCCEEDED
+
+
+class TaskGraph:
+    """
+    Runs named steps with dependencies between them, each step as soon as everything it
+    depends on has succeeded, up to max_workers at a time. Steps depending on a step that
+    failed are skipped. A step is a callable returning True/False or a (status, message)
+    tuple, as the cleanup and deployment helpers do; raising counts as failure.
+
+    When run inside a Flask request, steps run with a copy of that request context, so
+    they can keep using current_app and request like the code they replace.
+
+    A step given a timeout fails once it has been running that long. Its thread cannot
+    be stopped, so it is left to finish in the background and its outcome is ignored.
+    """
+    MAX_WORKERS = 4
+    # How often running steps are checked against their timeout.
+    TIMEOUT_POLL = 1.0
+
+    def __init__(self, max_workers=MAX_WORKERS, log=None, timeout=None):
+        self.max_workers = max_workers
+        self.log = log
+        self.timeout = timeout
+        self.tasks = {}
+        self.dependencies = {}
+        self.timeouts = {}
+        self.results = {}
+        self._started = {}
+
+    def add(self, name, action, depends_on=(), timeout=None):
+        if name in self.tasks:
+            raise ValueError("Duplicate step " + name)
+        for dependency in depends_on:
+            if dependency not in self.tasks:
+                raise ValueError("Step " + name + " depends on unknown step " + dependency)
+        self.tasks[name] = action
+        self.dependencies[name] = list(depends_on)
+        self.timeouts[name] = timeout if timeout is not None else self.timeout
+        return name
+
+    @property
+    def ok(self):
+        return all(self.results.get(name) for name in self.tasks)
+
+    @property
+    def failures(self):
+        """
+        Failed steps in the order they were added.
+        """
+        return [self.results[name] for name in self.tasks
+                if name in self.results and self.results[name].status == TaskResult.FAILED]
+
+    def report(self):
+        """
+        Name, status, duration and message of every step, in the order they were added.
+        """
+        return [dict(name=r.name, status=r.status, elapsed=round(r.elapsed, 1), msg=r.message)
+                for r in (self.results[name] for name in self.tasks if name in self.results)]
+
+    def run(self):
+        log = self.log or (current_app.logger if has_app_context() else logger)
+        self.results = {}
+        self._started = {}
+        pending = dict(self.dependencies)
+        running = {}
+        abandoned = False
+        start = time.monotonic()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="task-graph")
+        try:
+            while pending or running:
+                for name in list(pending):
+                    dependencies = [self.results.get(dependency) for dependency in pending[name]]
+                    if any(result is not None and not result for result in dependencies):
+                        failed = [d for d in pending[name] if d in self.results and not self.results[d]]
+                        log.warning("Skipping " + name + " because " + ", ".join(failed) + " did not succeed")
+                        self.results[name] = TaskResult(name, TaskResult.SKIPPED,
+                                                        message="Skipped, depends on " + ", ".join(failed))
+                        del pending[name]
+                    elif all(dependencies):
+                        running[executor.submit(self._call(name), log)] = name
+                        del pending[name]
+                if not running:
+                    continue
+                poll = self.TIMEOUT_POLL if any(self.timeouts[name] for name in running.values()) else None
+                done, _ = wait(running, timeout=poll, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    self.results[name] = future.result()
+                for future, name in list(running.items()):
+                    if self._timed_out(name):
+                        del running[future]
+                        abandoned = True
+                        message = "%s timed out after %ds" % (name, self.timeouts[name])
+                        log.error(message)
+                        self.results[name] = TaskResult(name, TaskResult.FAILED, self.timeouts[name], message)
+        finally:
+            executor.shutdown(wait=not abandoned)
+        summary = ", ".join("%s %s in %.1fs" % (r.name, r.status.lower(), r.elapsed) for r in self.results.values())
+        log.info("Finished %d steps in %.1fs: %s" % (len(self.results), time.monotonic() - start, summary))
+        return self.results
+
+    def _timed_out(self, name):
+        started = self._started.get(name)
+        timeout = self.timeouts[name]
+        return bool(timeout) and started is not None and time.monotonic() - started >= timeout
+
+    def _call(self, name):
+        action = self.tasks[name]
+
+        def call(log):
+            log.info("Starting " + name)
+            start = time.monotonic()
+            self._started[name] = start
+            try:
+                outcome = action()
+                if isinstance(outcome, tuple):
+                    succeeded, message = bool(outcome[0]), outcome[1] if len(outcome) > 1 else None
+                else:
+                    succeeded, message = bool(outcome), None
+            except Exception as e:
+                succeeded, message = False, str(e)
+            elapsed = time.monotonic() - start
+            if succeeded:
+                log.info("%s succeeded in %.1fs" % (name, elapsed))
+                return TaskResult(name, TaskResult.SUCCEEDED, elapsed, message)
+            log.error("%s failed after %.1fs: %s" % (name, elapsed, message))
+            return TaskResult(name, TaskResult.FAILED, elapsed, message or name + " failed")
+
+        if has_request_context():
+            return copy_current_request_context(call)
+        return call
+
+
+def api_step(call):
+    """
+    Step for an API handler (or a helper answering like one) returning a
+    (response, status code) pair: it succeeds on status 200 and reports the response msg,
+    or the response itself when it isn't a JSON response.
+    """
+    def step():
+        response, status_code = call()
+        if not hasattr(response, "get_json"):
+            return status_code == 200, str(response)
+        body = response.get_json(silent=True) or {}
+        return status_code == 200, body.get("msg")
+    return step
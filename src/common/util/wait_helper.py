@@ -0,0 +1,73 @@
+# Copyright 2021 VMware, Inc.
+# SPDX-License-Identifier: BSD-2-Clause
+
+import logging
+import random
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class WaitResult:
+    def __init__(self, ready, value, elapsed, attempts, error=None):
+        self.ready = ready
+        self.value = value
+        self.elapsed = elapsed
+        self.attempts = attempts
+        self.error = error
+
+    def __bool__(self):
+        return self.ready
+
+
+class WaitHelper:
+    """
+    Polls a probe until a condition holds, checking immediately and then backing off
+    with jitter from sub-second delays up to max_delay, bounded by an overall timeout.
+    """
+    INITIAL_DELAY = 0.5
+    MAX_DELAY = 30
+    BACKOFF = 2
+    JITTER = 0.2
+
+    @staticmethod
+    def wait_for(probe, condition=bool, timeout=1800, initial_delay=INITIAL_DELAY, max_delay=MAX_DELAY,
+                 backoff=BACKOFF, jitter=JITTER, ignore_errors=False, description=None, log=None) -> WaitResult:
+        """
+        :param probe: callable returning the current state, called with no arguments
+        :param condition: callable deciding from the probe result whether the wait is over
+        :param timeout: overall deadline in seconds
+        :param ignore_errors: treat exceptions raised by probe as "not ready yet" instead of failing
+        :param description: what is being waited for, used in log messages
+        :param log: logger to report progress on, defaults to this module's logger
+        """
+        log = log or logger
+        start = time.monotonic()
+        deadline = start + timeout
+        delay = initial_delay
+        attempts = 0
+        value = None
+        while True:
+            attempts += 1
+            try:
+                value = probe()
+                if condition(value):
+                    elapsed = time.monotonic() - start
+                    if description:
+                        log.info(f"{description} ready after {elapsed:.1f}s")
+                    return WaitResult(True, value, elapsed, attempts)
+            except Exception as e:
+                if not ignore_errors:
+                    return WaitResult(False, value, time.monotonic() - start, attempts, e)
+            now = time.monotonic()
+            if now >= deadline:
+                elapsed = now - start
+                if description:
+                    log.error(f"{description} not ready after {elapsed:.1f}s")
+                return WaitResult(False, value, elapsed, attempts)
+            pause = min(delay, max_delay) * random.uniform(1 - jitter, 1 + jitter)
+            pause = min(pause, deadline - now)
+            if description:
+                log.info(f"Waited for {now - start:.1f}s for {description}, retrying in {pause:.1f}s.")
+            time.sleep(pause)
+            delay = delay * backoff
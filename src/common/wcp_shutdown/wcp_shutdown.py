@@ -5,9 +5,6 @@ import os
 
 import subprocess
 import ssl
-import atexit
-import time
-import base64
 
 from kubernetes import client
 from kubernetes import config
@@ -17,6 +14,10 @@ from pyVim.connect import Disconnect, SmartConnect
 from pyVmomi import vim, vmodl
 
 from common.operation.constants import Env
+from common.operation.vcenter_session import VcenterSessionPool
+from common.operation.vm_power import VmPowerOrchestrator
+from common.util.wait_helper import WaitHelper
+from common.util.request_spec import RequestSpec
 from common.session.session_acquire import login
 from common.common_utilities import envCheck, isEnvTkgs_ns, isEnvTkgs_wcp
 
@@ -51,13 +52,10 @@ def wcp_bringup():
             }
             return jsonify(d), 500
 
-        vCenter = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterAddress']
-        vCenter_user = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterSsoUser']
-        str_enc = str(request.get_json(force=True)['envSpec']['vcenterDetails']["vcenterSsoPasswordBase64"])
-        base64_bytes = str_enc.encode('ascii')
-        enc_bytes = base64.b64decode(base64_bytes)
-        VC_PASSWORD = enc_bytes.decode('ascii').rstrip("\n")
-        vCenter_cluster = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterCluster']
+        vCenter = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterAddress']
+        vCenter_user = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterSsoUser']
+        VC_PASSWORD = RequestSpec.secret("envSpec", "vcenterDetails", "vcenterSsoPasswordBase64")
+        vCenter_cluster = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterCluster']
 
         try:
             current_app.logger.info("\n")
@@ -73,7 +71,6 @@ def wcp_bringup():
                 }
                 return jsonify(d), 500
             vc_service_instance = vc_service_instance[0]
-            atexit.register(Disconnect, vc_service_instance)
             content = vc_service_instance.RetrieveContent()
 
         except vmodl.MethodFault as error:
@@ -133,18 +130,11 @@ def wcp_bringup():
                         "STATUS_CODE": 500
                     }
                     return jsonify(d), 500
-        timer = 0
-        wcp_status = False
-        while timer < 300:
-            wcp_endpoint = check_wcp_cluster_status(s, vCenter, cluster_id)
-            if wcp_endpoint[1]:
-                wcp_status = True
-                break
-            elif timer < 600:
-                wcp_status = False
-                current_app.logger.info("WCP services are not up, waiting for 30 seconds...")
-                time.sleep(30)
-                timer = timer + 30
+        wcp_wait = WaitHelper.wait_for(lambda: check_wcp_cluster_status(s, vCenter, cluster_id),
+                                       condition=lambda status: bool(status and status[1]), timeout=300, max_delay=30,
+                                       description="WCP endpoint", log=current_app.logger)
+        wcp_status = wcp_wait.ready
+        wcp_endpoint = wcp_wait.value
 
         if not wcp_status:
             current_app.logger.error("ERROR: Waited for 5 minutes to fetch WCP endpoint")
@@ -209,14 +199,13 @@ def wcp_shutdown():
         esxi_password = request.headers['Password']
         current_app.logger.info("ESXI User: " + esxi_user)
         current_app.logger.info("ESXI Password: " + esxi_password)
+        # Number of VMs asked to shut down at once; each wave waits until its VMs are powered off.
+        concurrency = int(request.headers.get('Concurrency', VmPowerOrchestrator.CONCURRENCY))
 
-        vCenter = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterAddress']
-        vCenter_user = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterSsoUser']
-        str_enc = str(request.get_json(force=True)['envSpec']['vcenterDetails']["vcenterSsoPasswordBase64"])
-        base64_bytes = str_enc.encode('ascii')
-        enc_bytes = base64.b64decode(base64_bytes)
-        VC_PASSWORD = enc_bytes.decode('ascii').rstrip("\n")
-        vCenter_cluster = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterCluster']
+        vCenter = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterAddress']
+        vCenter_user = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterSsoUser']
+        VC_PASSWORD = RequestSpec.secret("envSpec", "vcenterDetails", "vcenterSsoPasswordBase64")
+        vCenter_cluster = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterCluster']
         try:
             current_app.logger.info("\n")
             current_app.logger.info("STEP 0 - Logging into vCenter API with supplied credentials ")
@@ -231,7 +220,6 @@ def wcp_shutdown():
                 }
                 return jsonify(d), 500
             vc_service_instance = vc_service_instance[0]
-            atexit.register(Disconnect, vc_service_instance)
             content = vc_service_instance.RetrieveContent()
             search_index = vc_service_instance.content.searchIndex
 
@@ -305,7 +293,7 @@ def wcp_shutdown():
 
         ## Log into the Supervisor Cluster to create kubeconfig contexts
         try:
-            os.putenv("KUBECTL_VSPHERE_PASSWORD", VC_PASSWORD)
+            os.environ["KUBECTL_VSPHERE_PASSWORD"] = VC_PASSWORD
             subprocess.check_call(
                 ['kubectl', 'vsphere', 'login', '--insecure-skip-tls-verify', '--server', wcp_endpoint, '-u',
                  vCenter_user])
@@ -369,78 +357,34 @@ def wcp_shutdown():
         ## Find 3 SC CP VMs and shutdown from the ESXi hosts they are running on.
         current_app.logger.info("\n")
         current_app.logger.info("STEP 3 - Shutting Down all Supervisor Control Plane VMs ")
-        for vmobject in vmList:
-            if "SupervisorControlPlaneVM" in vmobject.summary.config.name:
-                current_app.logger.info("Found Supervisor Control Plane VM %s. " % vmobject.summary.config.name)
-                current_app.logger.info("-VM", vmobject.summary.config.name, " is running on ESX host", vmobject.runtime.host.name)
-                vnicManager = vmobject.runtime.host.configManager.virtualNicManager
-                netConfig = vnicManager.QueryNetConfig("management")
-                for vNic in netConfig.candidateVnic:
-                    if (netConfig.selectedVnic.index(vNic.key) != -1):
-                        # Below will return the Management IP (SC Address) for the ESxi host where SC VP VM is running.
-                        current_app.logger.info("ESX host", vmobject.runtime.host.name, " has Management IP", vNic.spec.ip.ipAddress)
-                        # Due to permissions limitations we need to log into each ESXi host where the SC CP VM is running
-                        # To perform the shutdown operation.
-                        shutdown_status = shutdown_sc_vm(25, vmobject.summary.config.name, vmobject.summary.config.uuid,
-                                                            vNic.spec.ip.ipAddress, esxi_user, esxi_password)
-                        if not shutdown_status[1]:
-                            current_app.logger.error("ERROR: Failed to shutdown the SC VMs")
-                            current_app.logger.error(shutdown_status[0])
-                            d = {
-                                "responseType": "ERROR",
-                                "msg": "ERROR: Failed to shutdown the SC VMs",
-                                "STATUS_CODE": 500
-                            }
-                            return jsonify(d), 500
-                        break
-                    else:
-                        current_app.logger.info("\tvNic[ " + vNic.key + " ] is not selected; skipping it")
+        sc_vms = [vmobject for vmobject in vmList if "SupervisorControlPlaneVM" in vmobject.summary.config.name]
+        shutdown_status = shutdown_esx_vms(sc_vms, esxi_user, esxi_password, concurrency)
+        if not shutdown_status[1]:
+            current_app.logger.error("ERROR: Failed to shutdown the SC VMs")
+            current_app.logger.error(shutdown_status[0])
+            d = {
+                "responseType": "ERROR",
+                "msg": "ERROR: Failed to shutdown the SC VMs",
+                "STATUS_CODE": 500
+            }
+            return jsonify(d), 500
 
         # Shutdown Guest Cluster Machines Virtual Machines
-        current_app.logger.info("Waiting for 3 mins for SC VMs to shutdown")
-        time.sleep(180)
-
         current_app.logger.info("\n")
         current_app.logger.info("STEP 4 - Shutting down all Guest Cluster VMs")
         current_app.logger.info("The following Workload Cluster VMs will be shutdown")
         for wvm in wkld_cluster_vms:
             current_app.logger.info("--" + wvm.summary.config.name)
-
-        for vmobject in wkld_cluster_vms:
-            current_app.logger.info("Found Workload Cluster VM: %s. " % vmobject.summary.config.name)
-            current_app.logger.info("--VM", vmobject.summary.config.name, " is running on ESX host", vmobject.runtime.host.name)
-            vnicManager = vmobject.runtime.host.configManager.virtualNicManager
-            netConfig = vnicManager.QueryNetConfig("management")
-            for vNic in netConfig.candidateVnic:
-                if (netConfig.selectedVnic.index(vNic.key) != -1):
-                    # Below will return the Management IP (SC Address) for the ESxi host where SC VP VM is running.
-                    current_app.logger.info("ESX host", vmobject.runtime.host.name, " has Management IP", vNic.spec.ip.ipAddress)
-                    # Due to permissions limitations we need to log into each ESXi host where the SC CP VM is running
-                    # To perform the shutdown operation.
-                    shutdown_status = shutdown_sc_vm(25, vmobject.summary.config.name, vmobject.summary.config.uuid,
-                                                        vNic.spec.ip.ipAddress, esxi_user, esxi_password)
-                    if not shutdown_status[1]:
-                        current_app.logger.error("ERROR: Failed to shutdown the SC VMs")
-                        current_app.logger.error(shutdown_status[0])
-                        d = {
-                            "responseType": "ERROR",
-                            "msg": "ERROR: Failed to shutdown the SC VMs",
-                            "STATUS_CODE": 500
-                        }
-                        return jsonify(d), 500
-                    break
-                else:
-                    current_app.logger.info("\tvNic[ " + vNic.key + " ] is not selected; skipping it")
-        # shutdown_status_wkld = shutdown_Vm(20, wkld_cluster_vms)
-        # if not shutdown_status_wkld[1]:
-        #     current_app.logger.error("ERROR: Caught error trying to shutdown VM")
-        #     current_app.logger.debug(shutdown_status_wkld[0])
-        #     d = {
-        #         "responseType": "ERROR",
-        #         "msg": "ERROR: Caught error trying to shutdown VM",
-        #         "STATUS_CODE": 500
-        #     }
-        #     return jsonify(d), 500
+        shutdown_status = shutdown_esx_vms(wkld_cluster_vms, esxi_user, esxi_password, concurrency)
+        if not shutdown_status[1]:
+            current_app.logger.error("ERROR: Failed to shutdown the Workload Cluster VMs")
+            current_app.logger.error(shutdown_status[0])
+            d = {
+                "responseType": "ERROR",
+                "msg": "ERROR: Failed to shutdown the Workload Cluster VMs",
+                "STATUS_CODE": 500
+            }
+            return jsonify(d), 500
 
         # Clean up and exit...
         session_delete = s.delete('https://' + vCenter + '/rest/com/vmware/cis/session',
@@ -467,9 +411,7 @@ def get_si(host, user, password):
     try:
         service_instance = None
         # TODO UPDATE PORT Number here, used 443 hardcoded
-        context = ssl.SSLContext(ssl.PROTOCOL_TLSv1_2)
-        context.verify_mode = ssl.CERT_NONE
-        service_instance = SmartConnect(host=host, user=user, pwd=password, port=int('443'), sslContext=context)
+        service_instance = VcenterSessionPool.get(host=host, user=user, pwd=password, port=int('443'))
 
         if not service_instance:
             current_app.logger.error("ERROR: Could not connect to the specified vCenter host using specified username and password")
@@ -530,22 +472,53 @@ def restart_vc_svcname(s, vcip, svc_name):
         return None, False
 
 
-def shutdown_sc_vm(delay, vm_name, vm_uuid, vm_host_ip, esx_user, esx_password):
+def esx_management_ip(vmobject):
+    """
+    Management IP of the ESXi host the VM is running on.
+    """
+    current_app.logger.info("-VM " + vmobject.summary.config.name + " is running on ESX host " +
+                            vmobject.runtime.host.name)
+    vnicManager = vmobject.runtime.host.configManager.virtualNicManager
+    netConfig = vnicManager.QueryNetConfig("management")
+    for vNic in netConfig.candidateVnic:
+        if vNic.key in netConfig.selectedVnic:
+            current_app.logger.info("ESX host " + vmobject.runtime.host.name + " has Management IP " +
+                                    vNic.spec.ip.ipAddress)
+            return vNic.spec.ip.ipAddress
+        current_app.logger.info("\tvNic[ " + vNic.key + " ] is not selected; skipping it")
+    return None
+
+
+def connect_esx(host, user, password):
+    """
+    Session on one ESXi host, kept out of the shared vCenter session pool: a shutdown may
+    touch more hosts than the pool holds, and its sessions must live until the VMs are off.
+    The caller disconnects it.
+    """
     try:
-        current_app.logger.info("Shutting down VM " + vm_name + " on host " + vm_host_ip)
-        esx_service_instance = get_si(vm_host_ip, esx_user, esx_password)
-        if not esx_service_instance[1]:
-            current_app.logger.error("Failed to retrieve ESX Service Instance")
+        # TODO UPDATE PORT Number here, used 443 hardcoded
+        context = ssl.SSLContext(ssl.PROTOCOL_TLSv1_2)
+        context.verify_mode = ssl.CERT_NONE
+        service_instance = SmartConnect(host=host, user=user, pwd=password, port=int('443'), sslContext=context)
+        if not service_instance:
+            current_app.logger.error("ERROR: Could not connect to ESX host " + host + " using specified username and password")
             return None, False
-        esx_service_instance = esx_service_instance[0]
-        # content = esx_service_instance.RetrieveContent()
-        atexit.register(Disconnect, esx_service_instance)
+        return service_instance, True
+    except Exception as e:
+        current_app.logger.error("ERROR: Got an exception while connecting to ESX host " + host)
+        current_app.logger.debug(str(e))
+        return str(e), False
+
+
+def find_esx_vm(vm_name, vm_uuid, vm_host_ip, esx_service_instance):
+    try:
+        current_app.logger.info("Looking up VM " + vm_name + " on host " + vm_host_ip)
         search_index = esx_service_instance.content.searchIndex
         scvm = search_index.FindByUuid(None, vm_uuid, True)
 
         if scvm is None:
             current_app.logger.info("Could not find virtual machine")
-            return "SUCCESS", True
+            return None, True
 
         current_app.logger.info("Found Virtual Machine on ESX")
         details = {'--name': scvm.summary.config.name,
@@ -558,27 +531,53 @@ def shutdown_sc_vm(delay, vm_name, vm_uuid, vm_host_ip, esx_user, esx_password):
 
         for name, value in details.items():
             current_app.logger.info("{0:{width}{base}}: {1}".format(name, value, width=25, base='s'))
-
-        current_app.logger.info("Shutting down VM %s" % scvm.summary.config.name)
-        scvm.ShutdownGuest()
-        current_app.logger.info("Pausing for %s seconds..." % delay)
-        time.sleep(delay)
-        return "SUCCESS", True
+        return scvm, True
     except vmodl.MethodFault as error:
-        current_app.logger.error("ERROR: Caught error trying to shutdown VM  ")
+        current_app.logger.error("ERROR: Caught error trying to find VM  ")
         current_app.logger.error("ERROR: Caught vmodl fault : " + error.msg)
         return str(error), False
 
 
-def shutdown_Vm(delay, list_of_vms):
-    for vm in list_of_vms:
-        try:
-            current_app.logger.info("Shutting down VM %s." % vm.summary.config.name)
-            vm.ShutdownGuest()
-            current_app.logger.info("Pausing for %s seconds..." % delay)
-            time.sleep(delay)
-            return "SUCCESS", True
-        except vmodl.MethodFault as error:
-            current_app.logger.error("ERROR: Caught error trying to shutdown VM  ")
-            current_app.logger.error("ERROR: Caught vmodl fault : " + error.msg)
-            return str(error), False
\ No newline at end of file
+def shutdown_esx_vms(list_of_vms, esx_user, esx_password, concurrency=VmPowerOrchestrator.CONCURRENCY):
+    """
+    Shut down vCenter VMs through the ESXi hosts they are running on, as permissions on
+    SC CP VMs do not allow it through vCenter.
+    """
+    esx_vms = []
+    esx_sessions = {}
+    try:
+        for vmobject in list_of_vms:
+            host_ip = esx_management_ip(vmobject)
+            if host_ip is None:
+                return "No management IP found for host of VM " + vmobject.summary.config.name, False
+            if host_ip not in esx_sessions:
+                esx_service_instance = connect_esx(host_ip, esx_user, esx_password)
+                if not esx_service_instance[1]:
+                    current_app.logger.error("Failed to retrieve ESX Service Instance")
+                    return esx_service_instance[0], False
+                esx_sessions[host_ip] = esx_service_instance[0]
+            esx_vm = find_esx_vm(vmobject.summary.config.name, vmobject.summary.config.uuid, host_ip,
+                                 esx_sessions[host_ip])
+            if not esx_vm[1]:
+                return esx_vm[0], False
+            if esx_vm[0] is not None:
+                esx_vms.append(esx_vm[0])
+        return shutdown_Vm(esx_vms, concurrency)
+    finally:
+        for host_ip, esx_service_instance in esx_sessions.items():
+            try:
+                Disconnect(esx_service_instance)
+            except Exception as e:
+                current_app.logger.debug("Failed to log out of ESX host " + host_ip + ": " + str(e))
+
+
+def shutdown_Vm(list_of_vms, concurrency=VmPowerOrchestrator.CONCURRENCY):
+    if not list_of_vms:
+        return "SUCCESS", True
+    orchestrator = VmPowerOrchestrator(concurrency=concurrency, log=current_app.logger)
+    results = orchestrator.shutdown(list_of_vms)
+    failed = [result for result in results if not result]
+    if failed:
+        current_app.logger.error("ERROR: Caught error trying to shutdown VM  ")
+        return ", ".join(result.name + ": " + result.error for result in failed), False
+    return "SUCCESS", True
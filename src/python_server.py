@@ -1,35 +1,38 @@
 # Copyright 2021 VMware, Inc.
 # SPDX-License-Identifier: BSD-2-Clause
 
-from flask import Flask, jsonify, send_file
+from flask import Flask, Response, jsonify, stream_with_context
 from flask_restful import Api, request
 from flask_swagger_ui import get_swaggerui_blueprint
 from flask_cors import CORS
-from zipfile import ZipFile
 from vsphere.sharedConfig.vsphere_shared_config import vsphere_shared_config
-from vmc.sharedConfig.shared_config import shared_config, configSharedCluster
+from vmc.sharedConfig.shared_config import shared_config, deploy as deploySharedCluster, deployExtentions
 from vmc.vmcConfig.vmc_config import vmc_config, config_vmc_env
 from vmc.aviConfig.avi_config import avi_config, configure_alb
 from vsphere.aviConfig.vsphere_avi_config import vcenter_avi_config
 from common.prechecks.precheck import vcenter_precheck
+from common.util.request_spec import RequestSpec
 from common.cleanup.cleanup import cleanup_env
 from common.harbor.push_tkg_image_to_harbor import harbor
 from common.wcp_shutdown.wcp_shutdown import shutdown_env
 from common.prechecks.list_reources import vcenter_resources
 from common.common_utilities import envCheck
-from common.operation.ShellHelper import runShellCommandAndReturnOutputAsList
 from common.deployApp.deployApp import deploy_app
 from common.tkg.extension.deploy_ext import tkg_extentions
 from vmc.managementConfig.management_config import management_config, configManagementCluster
 from vsphere.managementConfig.vsphere_management_config import vsphere_management_config
-from vmc.workloadConfig.workload_config import workload_config, workloadConfig
+from vmc.workloadConfig.workload_config import workload_config, networkConfig, deploy as deployWorkloadCluster
 from vsphere.workloadConfig.vsphere_workload_config import vsphere_workload_config
 from common.session.session_acquire import session_acquire
+from common.jobs.jobs import jobs
+from common.jobs.job_manager import JobManager
+from common.util.task_graph import TaskGraph, api_step
+from common.util.kube_context import KubeContext
+from common.util.template_registry import TemplateRegistry
+from common.util.log_bundle import LogBundle
 import logging
 import json
-import os
 import sys
-from os.path import basename
 from pathlib import Path
 from logging.config import fileConfig
 from logging.handlers import TimedRotatingFileHandler, RotatingFileHandler
@@ -100,64 +103,56 @@ app.register_blueprint(tkg_extentions, url_prefix="")
 app.register_blueprint(cleanup_env, url_prefix="")
 app.register_blueprint(harbor, url_prefix="")
 app.register_blueprint(shutdown_env, url_prefix="")
+app.register_blueprint(jobs, url_prefix="")
+JobManager.init_app(app)
+TemplateRegistry.precompile()
 
 
 @app.route('/api/tanzu/vmc/tkgm', methods=['POST'])
 def configTkgm():
-    vmc = config_vmc_env()
-    if vmc[1] != 200:
-        app.logger.error(vmc[0].json['msg'])
+    # Shared services and workload clusters only need the management cluster, so they are
+    # created side by side, each with its own kubeconfig. Workload network configuration
+    # goes first as it updates the same ALB cloud the shared cluster uses.
+    graph = TaskGraph(log=app.logger)
+    vmc = graph.add("VMC configuration", api_step(config_vmc_env))
+    avi = graph.add("ALB configuration", api_step(configure_alb), depends_on=[vmc])
+    mgmt = graph.add("Management cluster", api_step(configManagementCluster), depends_on=[avi])
+    network = graph.add("Workload network", api_step(networkConfig), depends_on=[mgmt])
+    shared = graph.add("Shared services cluster", isolated_kubeconfig("shared", api_step(deploySharedCluster)),
+                       depends_on=[network])
+    graph.add("Shared services extensions", isolated_kubeconfig("shared", api_step(deployExtentions)),
+              depends_on=[shared])
+    graph.add("Workload cluster", isolated_kubeconfig("workload", api_step(deployWorkloadCluster)),
+              depends_on=[network])
+    results = graph.run()
+    steps = graph.report()
+    if not graph.ok:
+        failure = graph.failures[0] if graph.failures else next(r for r in results.values() if not r)
+        app.logger.error(str(failure.message))
         d = {
             "responseType": "ERROR",
-            "msg": vmc[0].json['msg'],
-            "STATUS_CODE": 500
-        }
-        return jsonify(d), 500
-    avi = configure_alb()
-    if vmc[1] != 200:
-        app.logger.error(str(avi[0].json['msg']))
-        d = {
-            "responseType": "ERROR",
-            "msg": str(avi[0].json['msg']),
-            "STATUS_CODE": 500
-        }
-        return jsonify(d), 500
-    mgmt = configManagementCluster()
-    if mgmt[1] != 200:
-        app.logger.error(str(mgmt[0].json['msg']))
-        d = {
-            "responseType": "ERROR",
-            "msg": str(mgmt[0].json['msg']),
-            "STATUS_CODE": 500
-        }
-        return jsonify(d), 500
-    shared = configSharedCluster()
-    if shared[1] != 200:
-        app.logger.error(str(shared[0].json['msg']))
-        d = {
-            "responseType": "ERROR",
-            "msg": str(shared[0].json['msg']),
-            "STATUS_CODE": 500
-        }
-        return jsonify(d), 500
-    workLoad = workloadConfig()
-    if workLoad[1] != 200:
-        app.logger.error(str(workLoad[0].json['msg']))
-        d = {
-            "responseType": "ERROR",
-            "msg": str(workLoad[0].json['msg']),
-            "STATUS_CODE": 500
+            "msg": failure.name + " failed: " + str(failure.message),
+            "STATUS_CODE": 500,
+            "steps": steps
         }
         return jsonify(d), 500
     d = {
         "responseType": "SUCCESS",
         "msg": "Tkgm configured Successfully ",
-        "STATUS_CODE": 200
+        "STATUS_CODE": 200,
+        "steps": steps
     }
     app.logger.info("Tkgm configured Successfully ")
     return jsonify(d), 200
 
 
+def isolated_kubeconfig(name, step):
+    def run():
+        with KubeContext.isolated(name):
+            return step()
+    return run
+
+
 @app.route('/api/tanzu/createinputfile', methods=['POST'])
 def createInputFile():
     try:
@@ -168,7 +163,7 @@ def createInputFile():
     if env is None:
         return "No filename passed", 400
     try:
-        jsonInput = request.get_json(force=True)
+        jsonInput = RequestSpec.json()
         json_object_m = json.dumps(jsonInput, indent=4)
         with open("./" + env, "w") as outfile:
             outfile.write(json_object_m)
@@ -191,20 +186,35 @@ def createInputFile():
 
 @app.route('/api/tanzu/logbundle', methods=['GET'])
 def download_log_bundle():
+    """
+    Query parameters: level (zip compression 0-9, 0 stores), since and until (epoch
+    seconds or ISO 8601, logs written in that window) and last (number of rotated
+    copies of each log to include besides the live one).
+    """
     path = "/var/log/server"
-    app.logger.info(f"*************Downloading log files {path}************")
-    if not os.path.isdir("/tmp/logbundle"):
-        command = ["mkdir", "/tmp/logbundle"]
-        runShellCommandAndReturnOutputAsList(command)
-    zip_path = "/tmp/logbundle/service_installer_log_bundle.zip"
-    with ZipFile(zip_path, "w") as newzip:
-        for folderName, subfolders, filenames in os.walk(path):
-            for filename in filenames:
-                #create complete filepath of file in directory
-                filePath = os.path.join(folderName, filename)
-                # Add file to zip
-                newzip.write(filePath, basename(filePath))
-    return send_file(zip_path, as_attachment=True)
+    try:
+        level = int(request.args.get("level", 6))
+        if not 0 <= level <= 9:
+            raise ValueError("level must be between 0 and 9")
+        last = request.args.get("last")
+        last = int(last) if last not in (None, "") else None
+        if last is not None and last < 0:
+            raise ValueError("last must not be negative")
+        since = LogBundle.parse_time(request.args.get("since"))
+        until = LogBundle.parse_time(request.args.get("until"))
+    except ValueError as e:
+        app.logger.error("Invalid log bundle parameters: " + str(e))
+        d = {
+            "responseType": "ERROR",
+            "msg": "Invalid log bundle parameters: " + str(e),
+            "STATUS_CODE": 400
+        }
+        return jsonify(d), 400
+    files = LogBundle.select(path, since=since, until=until, last=last)
+    app.logger.info(f"*************Downloading {len(files)} log files from {path}************")
+    return Response(stream_with_context(LogBundle.stream(path, files, compresslevel=level)),
+                    mimetype="application/zip",
+                    headers={"Content-Disposition": "attachment; filename=service_installer_log_bundle.zip"})
 
 
 if __name__ == '__main__':
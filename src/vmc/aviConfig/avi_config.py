@@ -3,8 +3,7 @@
 
 import logging
 import sys
-from flask import Blueprint, jsonify, request
-from jinja2 import Template
+from flask import Blueprint, jsonify
 
 logger = logging.getLogger(__name__)
 avi_config = Blueprint("avi_config", __name__, static_folder="aviConfig")
@@ -26,6 +25,8 @@ from common.operation.constants import SegmentsName
 from common.operation.constants import ControllerLocation
 from common.util.local_cmd_helper import LocalCmdHelper
 from common.util.file_helper import FileHelper
+from common.util.template_registry import TemplateRegistry
+from common.util.request_spec import RequestSpec
 
 
 @avi_config.route("/api/tanzu/vmc/alb", methods=['POST'])
@@ -97,7 +98,7 @@ def deploy_alb():
     else:
         current_app.logger.info("Ping check passed for gateways")
 
-    refreshToken = request.get_json(force=True)['marketplaceSpec']['refreshToken']
+    refreshToken = RequestSpec.json()['marketplaceSpec']['refreshToken']
     if refreshToken:
         download_status = downloadAviController(env)
         if download_status[1] != 200:
@@ -138,7 +139,7 @@ def deploy_alb():
             "STATUS_CODE": 500
         }
         return jsonify(d), 500
-    control_plan = request.get_json(force=True)['componentSpec']['tkgMgmtSpec']['tkgMgmtDeploymentType']
+    control_plan = RequestSpec.json()['componentSpec']['tkgMgmtSpec']['tkgMgmtDeploymentType']
     if str(control_plan) == "prod":
         control_plan = "dev"
     if str(control_plan).lower() == "dev":
@@ -291,7 +292,7 @@ def manage_alb_certs():
 
 
 def template_alb_deployment_spec():
-    deploy_options = Template(FileHelper.read_resource(Paths.VMC_ALB_DEPLOY_J2))
+    deploy_options = TemplateRegistry.get(Paths.VMC_ALB_DEPLOY_J2)
     FileHelper.write_to_file(
         deploy_options.render(network=SegmentsName.DISPLAY_NAME_AVI_MANAGEMENT,
                               vm_name=ControllerLocation.CONTROLLER_NAME),
@@ -13,8 +13,8 @@ import requests
 from common.model.vmcSpec import VmcMasterSpec
 from common.operation.constants import Paths
 from common.util.file_helper import FileHelper
-from flask import Blueprint, current_app, jsonify, request
-from jinja2 import Template
+from common.util.template_registry import TemplateRegistry
+from flask import Blueprint, current_app, jsonify
 from ruamel import yaml
 from tqdm import tqdm
 
@@ -44,6 +44,8 @@ from common.operation.ShellHelper import runShellCommandWithPolling, grabKubectl
 from common.operation.constants import SegmentsName, RegexPattern, Tkg_version, VrfType
 from common.operation.constants import ControllerLocation
 from requests.packages.urllib3.exceptions import InsecureRequestWarning
+from common.util.avi_client import AviClient
+from common.util.request_spec import RequestSpec
 
 requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
 
@@ -104,9 +106,9 @@ def configCloud():
         }
         return jsonify(d), 500
     env = env[0]
-    refreshToken = request.get_json(force=True)['marketplaceSpec']['refreshToken']
+    refreshToken = RequestSpec.json()['marketplaceSpec']['refreshToken']
     if refreshToken:
-        kubernetes_ova_os = request.get_json(force=True)['componentSpec']['tkgMgmtSpec']['tkgMgmtBaseOs']
+        kubernetes_ova_os = RequestSpec.json()['componentSpec']['tkgMgmtSpec']['tkgMgmtBaseOs']
         kubernetes_ova_version = KubernetesOva.KUBERNETES_OVA_LATEST_VERSION
         current_app.logger.info("Kubernetes OVA configs for management cluster")
         down_status = downloadAndPushKubernetesOvaMarketPlace(env, kubernetes_ova_version, kubernetes_ova_os)
@@ -136,7 +138,7 @@ def configCloud():
         }
         return jsonify(d), 500
     if isAviHaEnabled(env):
-        ip = request.get_json(force=True)['componentSpec']['aviComponentSpec']['aviClusterIp']
+        ip = RequestSpec.json()['componentSpec']['aviComponentSpec']['aviClusterIp']
     else:
         ip = checkforIpAddress(getSi(vcenter_ip, vcenter_username, password), ControllerLocation.CONTROLLER_NAME)
     if ip is None:
@@ -643,13 +645,13 @@ def controllerDeployment(ip, csrf2, data_center, data_store, cluster_name, vcent
         return None, "NOT_FOUND"
     if type == Type.WORKLOAD:
         ipNetMask = seperateNetmaskAndIp(
-            request.get_json(force=True)['componentSpec']['tkgWorkloadDataNetworkSpec'][
+            RequestSpec.json()['componentSpec']['tkgWorkloadDataNetworkSpec'][
                 'tkgWorkloadDataGatewayCidr'])
     else:
         ipNetMask = seperateNetmaskAndIp(
-            request.get_json(force=True)['componentSpec']['tkgMgmtDataNetworkSpec']['tkgMgmtDataGatewayCidr'])
+            RequestSpec.json()['componentSpec']['tkgMgmtDataNetworkSpec']['tkgMgmtDataGatewayCidr'])
         ipNetMask_ = seperateNetmaskAndIp(
-            request.get_json(force=True)['componentSpec']['tkgClusterVipNetwork'][
+            RequestSpec.json()['componentSpec']['tkgClusterVipNetwork'][
                 'tkgClusterVipNetworkGatewayCidr'])
         vrf = getVrfAndNextRoutId(ip, csrf2, uuid, VrfType.GLOBAL, ipNetMask_[0], aviVersion)
         if vrf[0] is None or vrf[1] == "NOT_FOUND":
@@ -721,8 +723,7 @@ def configTkgMgmt():
             "STATUS_CODE": 500
         }
         return jsonify(d), 500
-    json_dict = request.get_json(force=True)
-    vmcSpec = VmcMasterSpec.parse_obj(json_dict)
+    vmcSpec = RequestSpec.model(VmcMasterSpec)
     env = env[0]
     aviVersion = get_avi_version(env)
     password = current_app.config['VC_PASSWORD']
@@ -744,7 +745,7 @@ def configTkgMgmt():
         }
         return jsonify(d), 500
     if isAviHaEnabled(env):
-        ip = request.get_json(force=True)['componentSpec']['aviComponentSpec']['aviClusterIp']
+        ip = RequestSpec.json()['componentSpec']['aviComponentSpec']['aviClusterIp']
     else:
         ip = checkforIpAddress(getSi(vcenter_ip, vcenter_username, password), ControllerLocation.CONTROLLER_NAME)
     if ip is None:
@@ -787,7 +788,7 @@ def configTkgMgmt():
         clusterWip = get_cluster_wip[0]
     else:
         clusterWip = ""
-    management_cluster = request.get_json(force=True)['componentSpec']['tkgMgmtSpec']['tkgMgmtClusterName']
+    management_cluster = RequestSpec.json()['componentSpec']['tkgMgmtSpec']['tkgMgmtClusterName']
     current_app.logger.info("Deploying Management Cluster " + management_cluster)
     deploy_status = deployManagementCluster(management_cluster, aviVersion, ip, data_center, data_store, cluster_name,
                                             get_wip[0],
@@ -846,7 +847,7 @@ def configTkgMgmt():
                 return jsonify(d), 500
             current_app.logger.info("Successfully validated Pinniped service status")
             identity_mgmt_type = str(
-                request.get_json(force=True)["componentSpec"]["identityManagementSpec"]["identityManagementType"])
+                RequestSpec.json()["componentSpec"]["identityManagementSpec"]["identityManagementType"])
             if identity_mgmt_type.lower() == "ldap":
                 check_pinniped_dexsvc = checkPinnipedDexServiceStatus()
                 if check_pinniped_dexsvc[1] != 200:
@@ -860,12 +861,12 @@ def configTkgMgmt():
                 current_app.logger.info("External IP for Pinniped is set as: " + check_pinniped_svc[0])
 
             cluster_admin_users = \
-            request.get_json(force=True)['componentSpec']['tkgMgmtSpec']['tkgMgmtRbacUserRoleSpec']['clusterAdminUsers']
-            admin_users = request.get_json(force=True)['componentSpec']['tkgMgmtSpec']['tkgMgmtRbacUserRoleSpec'][
+            RequestSpec.json()['componentSpec']['tkgMgmtSpec']['tkgMgmtRbacUserRoleSpec']['clusterAdminUsers']
+            admin_users = RequestSpec.json()['componentSpec']['tkgMgmtSpec']['tkgMgmtRbacUserRoleSpec'][
                 'adminUsers']
-            edit_users = request.get_json(force=True)['componentSpec']['tkgMgmtSpec']['tkgMgmtRbacUserRoleSpec'][
+            edit_users = RequestSpec.json()['componentSpec']['tkgMgmtSpec']['tkgMgmtRbacUserRoleSpec'][
                 'editUsers']
-            view_users = request.get_json(force=True)['componentSpec']['tkgMgmtSpec']['tkgMgmtRbacUserRoleSpec'][
+            view_users = RequestSpec.json()['componentSpec']['tkgMgmtSpec']['tkgMgmtRbacUserRoleSpec'][
                 'viewUsers']
             rbac_user_status = createRbacUsers(management_cluster, isMgmt=True, env=env, edit_users=edit_users,
                                                cluster_admin_users=cluster_admin_users, admin_users=admin_users,
@@ -885,7 +886,7 @@ def configTkgMgmt():
     if Tkg_version.TKG_VERSION == "1.6":
         current_app.logger.info("TMC registration on management cluster is supported on tanzu 1.5.1")
         if checkTmcEnabled(env):
-            clusterGroup = request.get_json(force=True)['componentSpec']['tkgMgmtSpec']['tkgMgmtClusterGroupName']
+            clusterGroup = RequestSpec.json()['componentSpec']['tkgMgmtSpec']['tkgMgmtClusterGroupName']
 
             if not clusterGroup:
                 clusterGroup = "default"
@@ -923,7 +924,7 @@ def getConnectedStatus(ip, csrf2, se_engine_url, aviVersion):
     payload = {}
     count = 0
     while count < 30:
-        response_csrf = requests.request("GET", url, headers=headers, data=payload, verify=False, timeout=120)
+        response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload, verify=False, timeout=120)
         if response_csrf.status_code != 200:
             return None, response_csrf.text
         else:
@@ -946,7 +947,7 @@ def getDefaultCloudUrl(ip, csrf2, aviVersion):
     }
     url = "https://" + ip + "/api/cloud/"
     payload = {}
-    response_csrf = requests.request("GET", url, headers=headers, data=payload, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -954,9 +955,9 @@ def getDefaultCloudUrl(ip, csrf2, aviVersion):
 
 
 def referenceTkgMNetwork(ip, csrf2, url, aviVersion):
-    reference_TKG_Mgmt_Network_ip = request.get_json(force=True)['componentSpec']['tkgMgmtSpec'][
+    reference_TKG_Mgmt_Network_ip = RequestSpec.json()['componentSpec']['tkgMgmtSpec'][
         'Reference_TKG_Mgmt_Network_IP']
-    reference_TKG_Mgmt_Network_netmask = request.get_json(force=True)['componentSpec']['tkgMgmtSpec'][
+    reference_TKG_Mgmt_Network_netmask = RequestSpec.json()['componentSpec']['tkgMgmtSpec'][
         'Reference_TKG_Mgmt_Network_Netmask']
     headers = {
         "Accept": "application/json",
@@ -985,7 +986,7 @@ def referenceTkgMNetwork(ip, csrf2, url, aviVersion):
             }
     json_object = json.dumps(body, indent=4)
     url = "https://" + ip + "/api/network"
-    response_csrf = requests.request("POST", url, headers=headers, data=json_object, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("POST", url, headers=headers, data=json_object, verify=False)
     if response_csrf.status_code != 201:
         return None, response_csrf.text
     else:
@@ -1017,7 +1018,7 @@ def createNewCloud(ip, csrf2, aviVersion):
             }
     json_object = json.dumps(body, indent=4)
     url = "https://" + ip + "/api/cloud"
-    response_csrf = requests.request("POST", url, headers=headers, data=json_object, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("POST", url, headers=headers, data=json_object, verify=False)
     if response_csrf.status_code != 201:
         return None, response_csrf.text
     else:
@@ -1405,7 +1406,7 @@ def createSECloud(ip, csrf2, newCloudUrl, seGroupName, aviVersion):
     }
     json_object = getNewBody(newCloudUrl, seGroupName)
     url = "https://" + ip + "/api/serviceenginegroup"
-    response_csrf = requests.request("POST", url, headers=headers, data=json_object, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("POST", url, headers=headers, data=json_object, verify=False)
     if response_csrf.status_code != 201:
         return None, response_csrf.text
     else:
@@ -1424,7 +1425,7 @@ def getVipNetwork(ip, csrf2, name, aviVersion):
     body = {}
     url = "https://" + ip + "/api/network"
     try:
-        response_csrf = requests.request("GET", url, headers=headers, data=body, verify=False)
+        response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=body, verify=False)
         if response_csrf.status_code != 200:
             return None, response_csrf.text
         else:
@@ -1434,7 +1435,7 @@ def getVipNetwork(ip, csrf2, name, aviVersion):
             else:
                 next_url = None if not response_csrf.json()["next"] else response_csrf.json()["next"]
                 while len(next_url) > 0:
-                    response_csrf = requests.request("GET", next_url, headers=headers, data=body, verify=False)
+                    response_csrf = AviClient.for_controller(ip).request("GET", next_url, headers=headers, data=body, verify=False)
                     for re in response_csrf.json()["results"]:
                         if re['name'] == name:
                             return re["url"], "SUCCESS"
@@ -1446,11 +1447,11 @@ def getVipNetwork(ip, csrf2, name, aviVersion):
 
 def createClusterVipNetwork(ip, csrf2, newCloudUrl, name, aviVersion):
     ipNetMask = seperateNetmaskAndIp(
-        request.get_json(force=True)['componentSpec']['tkgClusterVipNetwork'][
+        RequestSpec.json()['componentSpec']['tkgClusterVipNetwork'][
             'tkgClusterVipNetworkGatewayCidr'])
-    start_ip = request.get_json(force=True)['componentSpec']['tkgClusterVipNetwork'][
+    start_ip = RequestSpec.json()['componentSpec']['tkgClusterVipNetwork'][
         'tkgClusterVipIpStartRange']
-    end_ip = request.get_json(force=True)['componentSpec']['tkgClusterVipNetwork'][
+    end_ip = RequestSpec.json()['componentSpec']['tkgClusterVipNetwork'][
         'tkgClusterVipIpEndRange']
     headers = {
         "Accept": "application/json",
@@ -1495,7 +1496,7 @@ def createClusterVipNetwork(ip, csrf2, newCloudUrl, name, aviVersion):
             }
     json_object = json.dumps(body, indent=4)
     url = "https://" + ip + "/api/network"
-    response_csrf = requests.request("POST", url, headers=headers, data=json_object, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("POST", url, headers=headers, data=json_object, verify=False)
     if response_csrf.status_code != 201:
         return None, response_csrf.text
     else:
@@ -1505,18 +1506,18 @@ def createClusterVipNetwork(ip, csrf2, newCloudUrl, name, aviVersion):
 def createVipNetwork(ip, csrf2, newCloudUrl, name, type, aviVersion):
     if type == Type.WORKLOAD:
         ipNetMask = seperateNetmaskAndIp(
-            request.get_json(force=True)['componentSpec']['tkgWorkloadDataNetworkSpec'][
+            RequestSpec.json()['componentSpec']['tkgWorkloadDataNetworkSpec'][
                 'tkgWorkloadDataGatewayCidr'])
-        start_ip = request.get_json(force=True)['componentSpec']['tkgWorkloadDataNetworkSpec'][
+        start_ip = RequestSpec.json()['componentSpec']['tkgWorkloadDataNetworkSpec'][
             "tkgWorkloadDataServiceStartRange"]
-        end_ip = request.get_json(force=True)['componentSpec']['tkgWorkloadDataNetworkSpec'][
+        end_ip = RequestSpec.json()['componentSpec']['tkgWorkloadDataNetworkSpec'][
             "tkgWorkloadDataServiceEndRange"]
     else:
         ipNetMask = seperateNetmaskAndIp(
-            request.get_json(force=True)['componentSpec']['tkgMgmtDataNetworkSpec']['tkgMgmtDataGatewayCidr'])
-        start_ip = request.get_json(force=True)['componentSpec']['tkgMgmtDataNetworkSpec'][
+            RequestSpec.json()['componentSpec']['tkgMgmtDataNetworkSpec']['tkgMgmtDataGatewayCidr'])
+        start_ip = RequestSpec.json()['componentSpec']['tkgMgmtDataNetworkSpec'][
             'tkgMgmtDataServiceStartRange']
-        end_ip = request.get_json(force=True)['componentSpec']['tkgMgmtDataNetworkSpec'][
+        end_ip = RequestSpec.json()['componentSpec']['tkgMgmtDataNetworkSpec'][
             'tkgMgmtDataServiceEndRange']
     headers = {
         "Accept": "application/json",
@@ -1561,7 +1562,7 @@ def createVipNetwork(ip, csrf2, newCloudUrl, name, type, aviVersion):
             }
     json_object = json.dumps(body, indent=4)
     url = "https://" + ip + "/api/network"
-    response_csrf = requests.request("POST", url, headers=headers, data=json_object, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("POST", url, headers=headers, data=json_object, verify=False)
     if response_csrf.status_code != 201:
         return None, response_csrf.text
     else:
@@ -1579,7 +1580,7 @@ def getIpam(ip, csrf2, name, aviVersion):
     }
     body = {}
     url = "https://" + ip + "/api/ipamdnsproviderprofile"
-    response_csrf = requests.request("GET", url, headers=headers, data=body, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=body, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -1647,7 +1648,7 @@ def createIpam(ip, csrf2, vipNetworkUrl, clusterVip, name, aviVersion):
         }
     json_object = json.dumps(body, indent=4)
     url = "https://" + ip + "/api/ipamdnsproviderprofile"
-    response_csrf = requests.request("POST", url, headers=headers, data=json_object, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("POST", url, headers=headers, data=json_object, verify=False)
     if response_csrf.status_code != 201:
         return None, response_csrf.text
     else:
@@ -1665,7 +1666,7 @@ def getDetailsOfNewCloud(ip, csrf2, newCloudUrl, newIpamUrl, seGroupUrl, aviVers
     }
     payload = {}
     url = newCloudUrl
-    response_csrf = requests.request("GET", url, headers=headers, data=payload, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -1692,7 +1693,7 @@ def updateNewCloudSeGroup(ip, csrf2, newCloudUrl, aviVersion):
         "x-avi-version": aviVersion,
         "x-csrftoken": csrf2[0]
     }
-    response_csrf = requests.request("PUT", newCloudUrl, headers=headers, data=json_object, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("PUT", newCloudUrl, headers=headers, data=json_object, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -1728,7 +1729,7 @@ def generateSeOva(ip, csrf2, aviVersion, cloud_name):
     modified = json.dumps(body, indent=4)
     url = "https://" + ip + "/api/fileservice/seova"
     start = time.time()
-    response_csrf = requests.request("POST", url, headers=headers, data=modified, verify=False, timeout=1800)
+    response_csrf = AviClient.for_controller(ip).request("POST", url, headers=headers, data=modified, verify=False, timeout=1800)
     if response_csrf.status_code != 201:
         return None, response_csrf.text
     else:
@@ -1767,7 +1768,7 @@ def downloadSeOva(ip, csrf2, avi_uuid, aviVersion, cloud_name):
         return "SUCCESS", 200
     url = "https://" + ip + "/api/fileservice/seova?file_format=ova&cloud_uuid=" + uuid
     payload = {}
-    response_csrf = requests.request("GET", url, headers=headers, data=payload, verify=False, timeout=1800)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload, verify=False, timeout=1800)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -1790,7 +1791,7 @@ def getClusterUUid(ip, csrf2, aviVersion):
         "x-csrftoken": csrf2[0]
     }
     payload = {}
-    response_csrf = requests.request("GET", url, headers=headers, data=payload, verify=False, timeout=600)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload, verify=False, timeout=600)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -1819,7 +1820,7 @@ def generateToken(ip, csrf2, aviVersion, cloud_name):
         "x-csrftoken": csrf2[0]
     }
     payload = {}
-    response_csrf = requests.request("GET", url, headers=headers, data=payload, verify=False, timeout=600)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload, verify=False, timeout=600)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -1827,7 +1828,7 @@ def generateToken(ip, csrf2, aviVersion, cloud_name):
 
 
 def replaceNetworkValues(ip, aviAuthToken, clusterUUid, file_name):
-    tkg_management = request.get_json(force=True)['componentSpec']['tkgMgmtSpec']['tkgMgmtNetworkName']
+    tkg_management = RequestSpec.json()['componentSpec']['tkgMgmtSpec']['tkgMgmtNetworkName']
     property_mapping = {
         "AVICNTRL": ip,
         "AVICNTRL_AUTHTOKEN": aviAuthToken,
@@ -1894,10 +1895,10 @@ def replaceNetworkValuesWorkload(ip, aviAuthToken, clusterUUid, file_name):
 
 def pushSeOvaToVcenter(vcenter_ip, vcenter_username, password, data_center, data_store,
                        cluster_name, avi_uuid):
-    os.putenv("GOVC_URL", "https://" + vcenter_ip + "/sdk")
-    os.putenv("GOVC_USERNAME", vcenter_username)
-    os.putenv("GOVC_PASSWORD", password)
-    os.putenv("GOVC_INSECURE", "true")
+    os.environ["GOVC_URL"] = "https://" + vcenter_ip + "/sdk"
+    os.environ["GOVC_USERNAME"] = vcenter_username
+    os.environ["GOVC_PASSWORD"] = password
+    os.environ["GOVC_INSECURE"] = "true"
     parent_resourcepool = current_app.config['RESOURCE_POOL']
     if parent_resourcepool is not None:
         rp_pool = data_center + "/host/" + cluster_name + "/Resources/" + parent_resourcepool + "/" + ResourcePoolAndFolderName.AVI_RP
@@ -1920,10 +1921,10 @@ def pushSeOvaToVcenter(vcenter_ip, vcenter_username, password, data_center, data
 
 def deploySeEngines(vcenter_ip, vcenter_username, password, ip, aviAuthToken, clusterUUid, data_center, data_store,
                     cluster_name, file_name, engine_name, type):
-    os.putenv("GOVC_URL", "https://" + vcenter_ip + "/sdk")
-    os.putenv("GOVC_USERNAME", vcenter_username)
-    os.putenv("GOVC_PASSWORD", password)
-    os.putenv("GOVC_INSECURE", "true")
+    os.environ["GOVC_URL"] = "https://" + vcenter_ip + "/sdk"
+    os.environ["GOVC_USERNAME"] = vcenter_username
+    os.environ["GOVC_PASSWORD"] = password
+    os.environ["GOVC_INSECURE"] = "true"
     replaceValueSysConfig(file_name, "Name", "name", engine_name)
     if type == Type.WORKLOAD:
         replaceNetworkValuesWorkload(ip, aviAuthToken, clusterUUid, file_name)
@@ -2002,7 +2003,7 @@ def listAllServiceEngine(ip, csrf2, countSe, name, aviVersion):
         try:
             isThere = False
             current_app.logger.info("Waited for " + str(count * 10) + "s retrying")
-            response_csrf = requests.request("GET", url, headers=headers, data=payload, verify=False)
+            response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload, verify=False)
             if response_csrf.status_code == 200:
                 if response_csrf.json()["count"] > countSe:
                     for se in response_csrf.json()["results"]:
@@ -2044,7 +2045,7 @@ def getDetailsOfServiceEngine(ip, csrf2, urlFromServiceEngine, file_name, aviVer
     count = 0
     response_csrf = None
     while count < 30:
-        response_csrf = requests.request("GET", url, headers=headers, data=payload, verify=False, timeout=600)
+        response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload, verify=False, timeout=600)
         if response_csrf.status_code == 200:
             try:
                 if len(response_csrf.json()["data_vnics"]) > 1:
@@ -2121,9 +2122,7 @@ def generateConfigYaml(ip, datacenter, avi_version, datastoreName, cluster_name,
 def managementClusterYaml14(ip, datacenter, datastoreName, cluster_name, wipIpNetmask, clusterWip, _vcenter_ip,
                             _vcenter_username,
                             _password):
-    getBase64CertWriteToFile(ip, "443")
-    with open('cert.txt', 'r') as file2:
-        cert = file2.readline()
+    cert = getBase64CertWriteToFile(ip, "443")
     yaml_str = """\
     AVI_CA_DATA_B64: %s
     AVI_CLOUD_NAME: %s
@@ -2167,7 +2166,7 @@ def managementClusterYaml14(ip, datacenter, datastoreName, cluster_name, wipIpNe
     AVI_MANAGEMENT_CLUSTER_VIP_NETWORK_CIDR: %s
     """
     try:
-        osName = str(request.get_json(force=True)['componentSpec']['tkgMgmtSpec']['tkgMgmtBaseOs'])
+        osName = str(RequestSpec.json()['componentSpec']['tkgMgmtSpec']['tkgMgmtBaseOs'])
         if osName == "photon":
             osVersion = "3"
         elif osName == "ubuntu":
@@ -2176,17 +2175,14 @@ def managementClusterYaml14(ip, datacenter, datastoreName, cluster_name, wipIpNe
             raise Exception("Wrong os name provided")
     except Exception as e:
         raise Exception("Keyword " + str(e) + "  not found in input file")
-    str_enc_avi = str(request.get_json(force=True)['componentSpec']['aviComponentSpec']['aviPasswordBase64'])
-    base64_bytes = str_enc_avi.encode('ascii')
-    enc_bytes = base64.b64decode(base64_bytes)
-    password_avi = enc_bytes.decode('ascii').rstrip("\n")
+    password_avi = RequestSpec.secret("componentSpec", "aviComponentSpec", "aviPasswordBase64")
     _base64_bytes = password_avi.encode('ascii')
     _enc_bytes = base64.b64encode(_base64_bytes)
     str_enc_avi = _enc_bytes.decode('ascii')
-    management_cluster = request.get_json(force=True)['componentSpec']['tkgMgmtSpec']['tkgMgmtClusterName']
+    management_cluster = RequestSpec.json()['componentSpec']['tkgMgmtSpec']['tkgMgmtClusterName']
     datastore_path = "/" + datacenter + "/datastore/" + datastoreName
     vsphere_folder_path = "/" + datacenter + "/vm/" + ResourcePoolAndFolderName.TKG_Mgmt_Components_Folder
-    mgmt_network = request.get_json(force=True)['componentSpec']['tkgMgmtSpec']['tkgMgmtNetworkName']
+    mgmt_network = RequestSpec.json()['componentSpec']['tkgMgmtSpec']['tkgMgmtNetworkName']
     parent_resourcePool = current_app.config['RESOURCE_POOL']
     if parent_resourcePool:
         vsphere_rp = "/" + datacenter + "/host/" + cluster_name + "/Resources/" + parent_resourcePool + "/" + ResourcePoolAndFolderName.TKG_Mgmt_RP
@@ -2198,11 +2194,11 @@ def managementClusterYaml14(ip, datacenter, datastoreName, cluster_name, wipIpNe
     vcenter_passwd = str_enc
     vcenter_ip = _vcenter_ip
     vcenter_username = _vcenter_username
-    control_plan = request.get_json(force=True)['componentSpec']['tkgMgmtSpec']['tkgMgmtDeploymentType']
+    control_plan = RequestSpec.json()['componentSpec']['tkgMgmtSpec']['tkgMgmtDeploymentType']
     ssh_key = runSsh(vcenter_username)
-    size = str(request.get_json(force=True)['componentSpec']['tkgMgmtSpec']['tkgMgmtSize'])
-    clustercidr = request.get_json(force=True)['componentSpec']['tkgMgmtSpec']['tkgMgmtClusterCidr']
-    servicecidr = request.get_json(force=True)['componentSpec']['tkgMgmtSpec']['tkgMgmtServiceCidr']
+    size = str(RequestSpec.json()['componentSpec']['tkgMgmtSpec']['tkgMgmtSize'])
+    clustercidr = RequestSpec.json()['componentSpec']['tkgMgmtSpec']['tkgMgmtClusterCidr']
+    servicecidr = RequestSpec.json()['componentSpec']['tkgMgmtSpec']['tkgMgmtServiceCidr']
     if size.lower() == "small":
         current_app.logger.debug("Recommended size for Management cluster nodes is: medium/large/extra-large/custom")
         pass
@@ -2240,15 +2236,9 @@ def template14MgmtDeployYaml(ip, datacenter, avi_version, datastoreName, cluster
                              vcenter_ip,
                              vcenter_username,
                              _password, vmcSpec):
-    deploy_yaml = FileHelper.read_resource(Paths.TKG_MGMT_VMC_14_SPEC_J2)
-    t = Template(deploy_yaml)
-    getBase64CertWriteToFile(ip, "443")
-    with open('cert.txt', 'r') as file2:
-        cert = file2.readline()
-    str_enc_avi = str(request.get_json(force=True)['componentSpec']['aviComponentSpec']['aviPasswordBase64'])
-    base64_bytes = str_enc_avi.encode('ascii')
-    enc_bytes = base64.b64decode(base64_bytes)
-    password_avi = enc_bytes.decode('ascii').rstrip("\n")
+    t = TemplateRegistry.get(Paths.TKG_MGMT_VMC_14_SPEC_J2)
+    cert = getBase64CertWriteToFile(ip, "443")
+    password_avi = RequestSpec.secret("componentSpec", "aviComponentSpec", "aviPasswordBase64")
     _base64_bytes = password_avi.encode('ascii')
     _enc_bytes = base64.b64encode(_base64_bytes)
     str_enc_avi = _enc_bytes.decode('ascii')
@@ -2280,11 +2270,11 @@ def template14MgmtDeployYaml(ip, datacenter, avi_version, datastoreName, cluster
     elif size.lower() == "extra-large":
         pass
     elif size.lower() == "custom":
-        control_plane_vcpu = request.get_json(force=True)['componentSpec']['tkgMgmtSpec'][
+        control_plane_vcpu = RequestSpec.json()['componentSpec']['tkgMgmtSpec'][
             'tkgMgmtCpuSize']
-        control_plane_disk_gb = request.get_json(force=True)['componentSpec']['tkgMgmtSpec'][
+        control_plane_disk_gb = RequestSpec.json()['componentSpec']['tkgMgmtSpec'][
             'tkgMgmtStorageSize']
-        control_plane_mem_gb = request.get_json(force=True)['componentSpec']['tkgMgmtSpec'][
+        control_plane_mem_gb = RequestSpec.json()['componentSpec']['tkgMgmtSpec'][
             'tkgMgmtMemorySize']
         control_plane_mem_mb = str(int(control_plane_mem_gb) * 1024)
     else:
@@ -2298,7 +2288,7 @@ def template14MgmtDeployYaml(ip, datacenter, avi_version, datastoreName, cluster
         }
         return jsonify(d), 500
     try:
-        osName = str(request.get_json(force=True)['componentSpec']['tkgMgmtSpec']['tkgMgmtBaseOs'])
+        osName = str(RequestSpec.json()['componentSpec']['tkgMgmtSpec']['tkgMgmtBaseOs'])
         if osName == "photon":
             osVersion = "3"
         elif osName == "ubuntu":
@@ -2309,29 +2299,29 @@ def template14MgmtDeployYaml(ip, datacenter, avi_version, datastoreName, cluster
         raise Exception("Keyword " + str(e) + "  not found in input file")
     env = envCheck()
     env = env[0]
-    ciep = str(request.get_json(force=True)["ceipParticipation"])
+    ciep = str(RequestSpec.json()["ceipParticipation"])
     if checkEnableIdentityManagement(env):
         try:
             identity_mgmt_type = str(
-                request.get_json(force=True)["componentSpec"]["identityManagementSpec"]["identityManagementType"])
+                RequestSpec.json()["componentSpec"]["identityManagementSpec"]["identityManagementType"])
             if identity_mgmt_type.lower() == "oidc":
                 oidc_provider_client_id = str(
-                    request.get_json(force=True)["componentSpec"]["identityManagementSpec"]["oidcSpec"]["oidcClientId"])
+                    RequestSpec.json()["componentSpec"]["identityManagementSpec"]["oidcSpec"]["oidcClientId"])
                 oidc_provider_client_secret = str(
-                    request.get_json(force=True)["componentSpec"]["identityManagementSpec"]["oidcSpec"][
+                    RequestSpec.json()["componentSpec"]["identityManagementSpec"]["oidcSpec"][
                         "oidcClientSecret"])
                 oidc_provider_groups_claim = str(
-                    request.get_json(force=True)["componentSpec"]["identityManagementSpec"]["oidcSpec"][
+                    RequestSpec.json()["componentSpec"]["identityManagementSpec"]["oidcSpec"][
                         "oidcGroupsClaim"])
                 oidc_provider_issuer_url = str(
-                    request.get_json(force=True)["componentSpec"]["identityManagementSpec"]["oidcSpec"][
+                    RequestSpec.json()["componentSpec"]["identityManagementSpec"]["oidcSpec"][
                         "oidcIssuerUrl"])
                 ## TODO: check if provider name is required -- NOT REQUIRED
-                # oidc_provider_name = str(request.get_json(force=True))
+                # oidc_provider_name = str(RequestSpec.json())
                 oidc_provider_scopes = str(
-                    request.get_json(force=True)["componentSpec"]["identityManagementSpec"]["oidcSpec"]["oidcScopes"])
+                    RequestSpec.json()["componentSpec"]["identityManagementSpec"]["oidcSpec"]["oidcScopes"])
                 oidc_provider_username_claim = str(
-                    request.get_json(force=True)["componentSpec"]["identityManagementSpec"]["oidcSpec"][
+                    RequestSpec.json()["componentSpec"]["identityManagementSpec"]["oidcSpec"][
                         "oidcUsernameClaim"])
                 FileHelper.write_to_file(
                     t.render(config=vmcSpec, cert=cert, ip=ip, wipIpNetmask=wipIpNetmask, avi_label_key=AkoType.KEY,
@@ -2354,35 +2344,32 @@ def template14MgmtDeployYaml(ip, datacenter, avi_version, datastoreName, cluster
                              oidc_provider_username_claim=oidc_provider_username_claim),
                     "management_cluster_vmc.yaml")
             elif identity_mgmt_type.lower() == "ldap":
-                ldap_endpoint_ip = str(request.get_json(force=True)["componentSpec"]["identityManagementSpec"]
+                ldap_endpoint_ip = str(RequestSpec.json()["componentSpec"]["identityManagementSpec"]
                                        ["ldapSpec"]["ldapEndpointIp"])
-                ldap_endpoint_port = str(request.get_json(force=True)["componentSpec"]["identityManagementSpec"]
+                ldap_endpoint_port = str(RequestSpec.json()["componentSpec"]["identityManagementSpec"]
                                          ["ldapSpec"]["ldapEndpointPort"])
-                str_enc = str(request.get_json(force=True)["componentSpec"]["identityManagementSpec"]["ldapSpec"][
-                                  "ldapBindPWBase64"])
-                base64_bytes = str_enc.encode('ascii')
-                enc_bytes = base64.b64decode(base64_bytes)
-                ldap_endpoint_bind_pw = enc_bytes.decode('ascii').rstrip("\n")
+                ldap_endpoint_bind_pw = RequestSpec.secret("componentSpec", "identityManagementSpec", "ldapSpec",
+                                                           "ldapBindPWBase64")
                 ldap_bind_dn = str(
-                    request.get_json(force=True)["componentSpec"]["identityManagementSpec"]["ldapSpec"]["ldapBindDN"])
+                    RequestSpec.json()["componentSpec"]["identityManagementSpec"]["ldapSpec"]["ldapBindDN"])
                 ldap_user_search_base_dn = str(
-                    request.get_json(force=True)["componentSpec"]["identityManagementSpec"]
+                    RequestSpec.json()["componentSpec"]["identityManagementSpec"]
                     ["ldapSpec"]["ldapUserSearchBaseDN"])
-                ldap_user_search_filter = str(request.get_json(force=True)["componentSpec"]
+                ldap_user_search_filter = str(RequestSpec.json()["componentSpec"]
                                               ["identityManagementSpec"]["ldapSpec"]["ldapUserSearchFilter"])
-                ldap_user_search_uname = str(request.get_json(force=True)["componentSpec"]
+                ldap_user_search_uname = str(RequestSpec.json()["componentSpec"]
                                              ["identityManagementSpec"]["ldapSpec"]["ldapUserSearchUsername"])
-                ldap_grp_search_base_dn = str(request.get_json(force=True)["componentSpec"]
+                ldap_grp_search_base_dn = str(RequestSpec.json()["componentSpec"]
                                               ["identityManagementSpec"]["ldapSpec"]["ldapGroupSearchBaseDN"])
-                ldap_grp_search_filter = str(request.get_json(force=True)["componentSpec"]
+                ldap_grp_search_filter = str(RequestSpec.json()["componentSpec"]
                                              ["identityManagementSpec"]["ldapSpec"]["ldapGroupSearchFilter"])
-                ldap_grp_search_user_attr = str(request.get_json(force=True)["componentSpec"]
+                ldap_grp_search_user_attr = str(RequestSpec.json()["componentSpec"]
                                                 ["identityManagementSpec"]["ldapSpec"]["ldapGroupSearchUserAttr"])
-                ldap_grp_search_grp_attr = str(request.get_json(force=True)["componentSpec"]
+                ldap_grp_search_grp_attr = str(RequestSpec.json()["componentSpec"]
                                                ["identityManagementSpec"]["ldapSpec"]["ldapGroupSearchGroupAttr"])
-                ldap_grp_search_name_attr = str(request.get_json(force=True)["componentSpec"]
+                ldap_grp_search_name_attr = str(RequestSpec.json()["componentSpec"]
                                                 ["identityManagementSpec"]["ldapSpec"]["ldapGroupSearchNameAttr"])
-                ldap_root_ca_data = str(request.get_json(force=True)["componentSpec"]
+                ldap_root_ca_data = str(RequestSpec.json()["componentSpec"]
                                         ["identityManagementSpec"]["ldapSpec"]["ldapRootCAData"])
                 if not ldap_user_search_base_dn:
                     current_app.logger.error("Please provide ldapUserSearchBaseDN for installing pinniped")
@@ -2448,9 +2435,7 @@ def template14MgmtDeployYaml(ip, datacenter, avi_version, datastoreName, cluster
 
 def managementClusterYaml13(ip, datacenter, datastoreName, cluster_name, wipIpNetmask, _vcenter_ip, _vcenter_username,
                             _password):
-    getBase64CertWriteToFile(ip, "443")
-    with open('cert.txt', 'r') as file2:
-        cert = file2.readline()
+    cert = getBase64CertWriteToFile(ip, "443")
     yaml_str = """\
     AVI_CA_DATA_B64: %s
     AVI_CLOUD_NAME: %s
@@ -2490,19 +2475,16 @@ def managementClusterYaml13(ip, datacenter, datastoreName, cluster_name, wipIpNe
     VSPHERE_WORKER_MEM_MIB: "16384"
     VSPHERE_WORKER_NUM_CPUS: "4"
     """
-    str_enc_avi = str(request.get_json(force=True)['componentSpec']['aviComponentSpec']['aviPasswordBase64'])
-    base64_bytes = str_enc_avi.encode('ascii')
-    enc_bytes = base64.b64decode(base64_bytes)
-    password_avi = enc_bytes.decode('ascii').rstrip("\n")
+    password_avi = RequestSpec.secret("componentSpec", "aviComponentSpec", "aviPasswordBase64")
     _base64_bytes = password_avi.encode('ascii')
     _enc_bytes = base64.b64encode(_base64_bytes)
     str_enc_avi = _enc_bytes.decode('ascii')
-    management_cluster = request.get_json(force=True)['componentSpec']['tkgMgmtSpec']['tkgMgmtClusterName']
-    vsphere_cntrol_plane_ip = request.get_json(force=True)['componentSpec']['tkgMgmtSpec'][
+    management_cluster = RequestSpec.json()['componentSpec']['tkgMgmtSpec']['tkgMgmtClusterName']
+    vsphere_cntrol_plane_ip = RequestSpec.json()['componentSpec']['tkgMgmtSpec'][
         'TKG_Mgmt_ControlPlane_IP']
     datastore_path = "/" + datacenter + "/datastore/" + datastoreName
     vsphere_folder_path = "/" + datacenter + "/vm/" + ResourcePoolAndFolderName.TKG_Mgmt_Components_Folder
-    mgmt_network = request.get_json(force=True)['componentSpec']['tkgMgmtSpec']['tkgMgmtNetworkName']
+    mgmt_network = RequestSpec.json()['componentSpec']['tkgMgmtSpec']['tkgMgmtNetworkName']
     vsphere_rp = "/" + datacenter + "/host/" + cluster_name + "/Resources/" + ResourcePoolAndFolderName.TKG_Mgmt_RP
     _base64_bytes = _password.encode('ascii')
     _enc_bytes = base64.b64encode(_base64_bytes)
@@ -2510,7 +2492,7 @@ def managementClusterYaml13(ip, datacenter, datastoreName, cluster_name, wipIpNe
     vcenter_passwd = str_enc
     vcenter_ip = _vcenter_ip
     vcenter_username = _vcenter_username
-    control_plan = request.get_json(force=True)['componentSpec']['tkgMgmtSpec']['tkgMgmtDeploymentType']
+    control_plan = RequestSpec.json()['componentSpec']['tkgMgmtSpec']['tkgMgmtDeploymentType']
     ssh_key = runSsh(vcenter_username)
     file_name = "management_cluster_vmc.yaml"
     with open(file_name, 'w') as outfile:
@@ -2527,15 +2509,9 @@ def managementClusterYaml13(ip, datacenter, datastoreName, cluster_name, wipIpNe
 def template13MgmtDeployYaml(ip, datacenter, datastoreName, cluster_name, wipIpNetmask, vcenter_ip,
                              vcenter_username,
                              _password, vmcSpec):
-    deploy_yaml = FileHelper.read_resource(Paths.TKG_MGMT_VMC_13_SPEC_J2)
-    t = Template(deploy_yaml)
-    getBase64CertWriteToFile(ip, "443")
-    with open('cert.txt', 'r') as file2:
-        cert = file2.readline()
-    str_enc_avi = str(request.get_json(force=True)['componentSpec']['aviComponentSpec']['aviPasswordBase64'])
-    base64_bytes = str_enc_avi.encode('ascii')
-    enc_bytes = base64.b64decode(base64_bytes)
-    password_avi = enc_bytes.decode('ascii').rstrip("\n")
+    t = TemplateRegistry.get(Paths.TKG_MGMT_VMC_13_SPEC_J2)
+    cert = getBase64CertWriteToFile(ip, "443")
+    password_avi = RequestSpec.secret("componentSpec", "aviComponentSpec", "aviPasswordBase64")
     _base64_bytes = password_avi.encode('ascii')
     _enc_bytes = base64.b64encode(_base64_bytes)
     str_enc_avi = _enc_bytes.decode('ascii')
@@ -2543,7 +2519,7 @@ def template13MgmtDeployYaml(ip, datacenter, datastoreName, cluster_name, wipIpN
     _enc_bytes = base64.b64encode(_base64_bytes)
     str_enc = _enc_bytes.decode('ascii')
     vcenter_passwd = str_enc
-    vsphere_cntrol_plane_ip = request.get_json(force=True)['componentSpec']['tkgMgmtSpec'][
+    vsphere_cntrol_plane_ip = RequestSpec.json()['componentSpec']['tkgMgmtSpec'][
         'TKG_Mgmt_ControlPlane_IP']
     datastore_path = "/" + datacenter + "/datastore/" + datastoreName
     vsphere_folder_path = "/" + datacenter + "/vm/" + ResourcePoolAndFolderName.TKG_Mgmt_Components_Folder
@@ -2573,7 +2549,7 @@ def deployManagementCluster(management_cluster, avi_version, ip, data_center, da
                                vcenter_username,
                                password, vmcSpec)
             current_app.logger.info("Deploying management cluster on vmc")
-            os.putenv("DEPLOY_TKG_ON_VSPHERE7", "true")
+            os.environ["DEPLOY_TKG_ON_VSPHERE7"] = "true"
             listOfCmd = ["tanzu", "management-cluster", "create", "-y", "--file", "management_cluster_vmc.yaml", "-v",
                          "6"]
             runProcess(listOfCmd)
@@ -2641,7 +2617,7 @@ def changeSeGroupAndSetInterfaces(ip, csrf2, urlFromServiceEngine, se_cloud_url,
     with open(file_name, 'r') as openfile:
         json_object = json.load(openfile)
     json_object_m = json.dumps(json_object, indent=4)
-    response_csrf = requests.request("PUT", url, headers=headers, data=json_object_m, verify=False, timeout=600)
+    response_csrf = AviClient.for_controller(ip).request("PUT", url, headers=headers, data=json_object_m, verify=False, timeout=600)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -23,6 +23,9 @@ from common.operation.ShellHelper import runShellCommandAndReturnOutput, grabKub
 from common.operation.constants import SegmentsName, RegexPattern, Versions, AkoType, AppName, Extentions, Tkg_version, \
     Type, PLAN, Paths
 from requests.packages.urllib3.exceptions import InsecureRequestWarning
+from common.util.avi_client import AviClient
+from common.util.request_spec import RequestSpec
+from common.util.package_catalog import PackageCatalog
 from common.common_utilities import preChecks, installCertManagerAndContour, envCheck, get_avi_version, \
     checkAirGappedIsEnabled, deployExtention, getVersionOfPackage, createOverlayYaml, \
     waitForGrepProcessWithoutChangeDir, deployCluster, checkTmcEnabled, registerWithTmcOnSharedAndWorkload, \
@@ -48,7 +51,7 @@ def akoDeploymentConfigSharedCluster(shared_cluster_name):
         }
         return jsonify(d), 500
     env = env[0]
-    management_cluster = request.get_json(force=True)['componentSpec']['tkgMgmtSpec']['tkgMgmtClusterName']
+    management_cluster = RequestSpec.json()['componentSpec']['tkgMgmtSpec']['tkgMgmtClusterName']
     commands = ["tanzu", "management-cluster", "kubeconfig", "get", management_cluster, "--admin"]
 
     kubeContextCommand = grabKubectlCommand(commands, RegexPattern.SWITCH_CONTEXT_KUBECTL)
@@ -231,7 +234,7 @@ def getVipNetworkIpNetMask(ip, csrf2, aviVersion, networkName):
     body = {}
     url = "https://" + ip + "/api/network"
     try:
-        response_csrf = requests.request("GET", url, headers=headers, data=body, verify=False)
+        response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=body, verify=False)
         if response_csrf.status_code != 200:
             return None, response_csrf.text
         else:
@@ -242,7 +245,7 @@ def getVipNetworkIpNetMask(ip, csrf2, aviVersion, networkName):
             else:
                 next_url = None if not response_csrf.json()["next"] else response_csrf.json()["next"]
                 while len(next_url) > 0:
-                    response_csrf = requests.request("GET", next_url, headers=headers, data=body, verify=False)
+                    response_csrf = AviClient.for_controller(ip).request("GET", next_url, headers=headers, data=body, verify=False)
                     for re in response_csrf.json()["results"]:
                         if re['name'] == networkName:
                             for sub in re["configured_subnets"]:
@@ -308,8 +311,7 @@ def deploy():
             "STATUS_CODE": 500
         }
         return jsonify(d), 500
-    json_dict = request.get_json(force=True)
-    vmcSpec: VmcMasterSpec = VmcMasterSpec.parse_obj(json_dict)
+    vmcSpec: VmcMasterSpec = RequestSpec.model(VmcMasterSpec)
     env = env[0]
     aviVersion = get_avi_version(env)
     password = current_app.config['VC_PASSWORD']
@@ -324,10 +326,10 @@ def deploy():
     vsphere_password = _enc_bytes.decode('ascii')
     isTkg13 = False
     parent_resourcepool = current_app.config['RESOURCE_POOL']
-    refreshToken = request.get_json(force=True)['marketplaceSpec']['refreshToken']
+    refreshToken = RequestSpec.json()['marketplaceSpec']['refreshToken']
 
-    kubernetes_ova_os = request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec']['tkgSharedserviceBaseOs']
-    kubernetes_ova_version = request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec']['tkgSharedserviceKubeVersion']
+    kubernetes_ova_os = RequestSpec.json()['componentSpec']['tkgSharedServiceSpec']['tkgSharedserviceBaseOs']
+    kubernetes_ova_version = RequestSpec.json()['componentSpec']['tkgSharedServiceSpec']['tkgSharedserviceKubeVersion']
 
     if refreshToken:
         current_app.logger.info("Kubernetes OVA configs for shared service cluster")
@@ -434,9 +436,9 @@ def deploy():
         memory = Sizing.extraLarge['MEMORY']
         disk = Sizing.extraLarge['DISK']
     elif size.lower() == "custom":
-        cpu = request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec']['tkgSharedserviceCpuSize']
-        memory = request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec']['tkgSharedserviceMemorySize']
-        disk = request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec']['tkgSharedserviceStorageSize']
+        cpu = RequestSpec.json()['componentSpec']['tkgSharedServiceSpec']['tkgSharedserviceCpuSize']
+        memory = RequestSpec.json()['componentSpec']['tkgSharedServiceSpec']['tkgSharedserviceMemorySize']
+        disk = RequestSpec.json()['componentSpec']['tkgSharedServiceSpec']['tkgSharedserviceStorageSize']
         memory = str(int(memory)*1024)
     else:
         current_app.logger.error("Provided cluster size: " + size + "is not supported, please provide one of: small/medium/large/extra-large/custom")
@@ -446,8 +448,8 @@ def deploy():
             "STATUS_CODE": 500
         }
         return jsonify(d), 500
-    pod_cidr = request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec']['tkgSharedserviceClusterCidr']
-    service_cidr = request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec']['tkgSharedserviceServiceCidr']
+    pod_cidr = RequestSpec.json()['componentSpec']['tkgSharedServiceSpec']['tkgSharedserviceClusterCidr']
+    service_cidr = RequestSpec.json()['componentSpec']['tkgSharedServiceSpec']['tkgSharedserviceServiceCidr']
     machineCount = vmcSpec.componentSpec.tkgSharedServiceSpec.tkgSharedserviceWorkerMachineCount
     cluster_plan = vmcSpec.componentSpec.tkgSharedServiceSpec.tkgSharedserviceDeploymentType
     datastore_path = f"{datacenter_path}/datastore/{data_store}"
@@ -466,7 +468,7 @@ def deploy():
         return jsonify(d), 500
     current_app.logger.info("The config files for shared services cluster will be located at: " + Paths.CLUSTER_PATH + shared_cluster_name)
     if Tkg_version.TKG_VERSION == "1.3":
-        control_plane_end_point = request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec'][
+        control_plane_end_point = RequestSpec.json()['componentSpec']['tkgSharedServiceSpec'][
             'TKG_Shared_ControlPlane_IP']
         createSharedCluster = ["tmc", "cluster", "create", "-t", "tkg-vsphere", "-n", shared_cluster_name, "-m",
                                management_cluster, "-p", "default", "--cluster-group", "default",
@@ -513,7 +515,7 @@ def deploy():
             version = version_status[0]
 
         if checkTmcEnabled(env):
-            clusterGroup = request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec']['tkgSharedserviceClusterGroupName']
+            clusterGroup = RequestSpec.json()['componentSpec']['tkgSharedServiceSpec']['tkgSharedserviceClusterGroupName']
         else:
             clusterGroup = "default"
 
@@ -757,16 +759,16 @@ def deploy():
                     }
                     return jsonify(d), 500
                 cluster_admin_users = \
-                request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec']['tkgSharedserviceRbacUserRoleSpec'][
+                RequestSpec.json()['componentSpec']['tkgSharedServiceSpec']['tkgSharedserviceRbacUserRoleSpec'][
                     'clusterAdminUsers']
                 admin_users = \
-                request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec']['tkgSharedserviceRbacUserRoleSpec'][
+                RequestSpec.json()['componentSpec']['tkgSharedServiceSpec']['tkgSharedserviceRbacUserRoleSpec'][
                     'adminUsers']
                 edit_users = \
-                request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec']['tkgSharedserviceRbacUserRoleSpec'][
+                RequestSpec.json()['componentSpec']['tkgSharedServiceSpec']['tkgSharedserviceRbacUserRoleSpec'][
                     'editUsers']
                 view_users = \
-                request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec']['tkgSharedserviceRbacUserRoleSpec'][
+                RequestSpec.json()['componentSpec']['tkgSharedServiceSpec']['tkgSharedserviceRbacUserRoleSpec'][
                     'viewUsers']
                 rbac_user_status = createRbacUsers(shared_cluster_name, isMgmt=False, env=env, edit_users=edit_users,
                                                    cluster_admin_users=cluster_admin_users, admin_users=admin_users,
@@ -940,40 +942,34 @@ def deployExtentions():
     aviVersion = get_avi_version(env)
     service = request.args.get('service', default='all', type=str)
     if env == Env.VMC:
-        shared_cluster_name = request.get_json(force=True)['componentSpec']['tkgSharedServiceSpec'][
+        shared_cluster_name = RequestSpec.json()['componentSpec']['tkgSharedServiceSpec'][
             'tkgSharedClusterName']
-        str_enc = str(request.get_json(force=True)['componentSpec']['harborSpec']['harborPasswordBase64'])
-        base64_bytes = str_enc.encode('ascii')
-        enc_bytes = base64.b64decode(base64_bytes)
-        password = enc_bytes.decode('ascii').rstrip("\n")
+        password = RequestSpec.secret("componentSpec", "harborSpec", "harborPasswordBase64")
         harborPassword = password
-        host = request.get_json(force=True)['componentSpec']['harborSpec']['harborFqdn']
-        harborCertPath = request.get_json(force=True)['componentSpec']['harborSpec']['harborCertPath']
-        harborCertKeyPath = request.get_json(force=True)['componentSpec']['harborSpec']['harborCertKeyPath']
+        host = RequestSpec.json()['componentSpec']['harborSpec']['harborFqdn']
+        harborCertPath = RequestSpec.json()['componentSpec']['harborSpec']['harborCertPath']
+        harborCertKeyPath = RequestSpec.json()['componentSpec']['harborSpec']['harborCertKeyPath']
         isHarborEnabled = True
     else:
         if env == Env.VCF:
-            shared_cluster_name = request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
+            shared_cluster_name = RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
                 'tkgSharedserviceClusterName']
         else:
-            shared_cluster_name = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+            shared_cluster_name = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
                 'tkgSharedserviceClusterName']
-        str_enc = str(request.get_json(force=True)['harborSpec']['harborPasswordBase64'])
-        base64_bytes = str_enc.encode('ascii')
-        enc_bytes = base64.b64decode(base64_bytes)
-        password = enc_bytes.decode('ascii').rstrip("\n")
+        password = RequestSpec.secret("harborSpec", "harborPasswordBase64")
         harborPassword = password
-        host = request.get_json(force=True)['harborSpec']['harborFqdn']
-        harborCertPath = request.get_json(force=True)['harborSpec']['harborCertPath']
-        harborCertKeyPath = request.get_json(force=True)['harborSpec']['harborCertKeyPath']
-        checkHarborEnabled = request.get_json(force=True)['harborSpec']['enableHarborExtension']
+        host = RequestSpec.json()['harborSpec']['harborFqdn']
+        harborCertPath = RequestSpec.json()['harborSpec']['harborCertPath']
+        harborCertKeyPath = RequestSpec.json()['harborSpec']['harborCertKeyPath']
+        checkHarborEnabled = RequestSpec.json()['harborSpec']['enableHarborExtension']
         if str(checkHarborEnabled).lower() == "true":
             isHarborEnabled = True
         else:
             isHarborEnabled = False
     if checkAirGappedIsEnabled(env):
         repo_address = str(
-            request.get_json(force=True)['envSpec']['customRepositorySpec']['tkgCustomImageRepository'])
+            RequestSpec.json()['envSpec']['customRepositorySpec']['tkgCustomImageRepository'])
     else:
         repo_address = Repo.PUBLIC_REPO
     if not repo_address.endswith("/"):
@@ -1172,19 +1168,17 @@ def installHarbor13(service, repo_address, harborCertPath, harborCertKeyPath, ha
 def installHarbor14(service, repo_address, harborCertPath, harborCertKeyPath, harborPassword, host, clusterName):
     main_command = ["tanzu", "package", "installed", "list", "-A"]
     sub_command = ["grep", AppName.HARBOR]
-    out = grabPipeOutput(main_command, sub_command)
-    if not verifyPodsAreRunning(AppName.HARBOR, out[0], RegexPattern.RECONCILE_SUCCEEDED):
+    catalog = PackageCatalog.current()
+    if not catalog.is_reconciled(AppName.HARBOR, RegexPattern.RECONCILE_SUCCEEDED):
         timer = 0
         current_app.logger.info("Validating contour and certmanager is running")
-        command = ["tanzu", "package", "installed", "list", "-A"]
-        status = runShellCommandAndReturnOutputAsList(command)
         verify_contour = False
         verify_cert_manager = False
         while timer < 600:
-            if verify_contour or verifyPodsAreRunning(AppName.CONTOUR, status[0], RegexPattern.RECONCILE_SUCCEEDED):
+            if verify_contour or catalog.is_reconciled(AppName.CONTOUR, RegexPattern.RECONCILE_SUCCEEDED):
                 current_app.logger.info("Contour is running")
                 verify_contour = True
-            if verify_cert_manager or verifyPodsAreRunning(AppName.CERT_MANAGER, status[0], RegexPattern.RECONCILE_SUCCEEDED):
+            if verify_cert_manager or catalog.is_reconciled(AppName.CERT_MANAGER, RegexPattern.RECONCILE_SUCCEEDED):
                 verify_cert_manager = True
                 current_app.logger.info("Cert Manager is running")
 
@@ -1193,7 +1187,7 @@ def installHarbor14(service, repo_address, harborCertPath, harborCertKeyPath, ha
             else:
                 timer = timer + 30
                 time.sleep(30)
-                status = runShellCommandAndReturnOutputAsList(command)
+                catalog.invalidate()
                 current_app.logger.info("Waited for " + str(timer) + "s, retrying for contour and cert manager to be running")
         if not verify_contour:
             current_app.logger.error("Contour is not running")
@@ -1274,6 +1268,7 @@ def installHarbor14(service, repo_address, harborCertPath, harborCertKeyPath, ha
                    state, "--values-file", Paths.CLUSTER_PATH + clusterName + "/harbor-data-values.yaml", "--namespace", "package-tanzu-system-registry",
                    "--create-namespace"]
         runShellCommandAndReturnOutputAsList(command)
+        catalog.invalidate()
         createOverlayYaml(repo_address, clusterName)
         os.system("cp ./common/harbor-overlay.yaml "+Paths.CLUSTER_PATH)
         os.system("chmod +x ./common/create_secrets.sh")
@@ -4,11 +4,12 @@
 import sys
 
 import requests
-from flask import current_app, Blueprint, jsonify, request
+from flask import current_app, Blueprint, jsonify
 
 sys.path.append(".../")
 from vmc.vmcConfig.nsxt_workflow import NsxtWorkflow
 from common.model.vmcSpec import VmcMasterSpec
+from common.util.request_spec import RequestSpec
 from requests.packages.urllib3.exceptions import InsecureRequestWarning
 
 requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
@@ -19,8 +20,7 @@ vmc_config = Blueprint("vmc_config", __name__, static_folder="vmcConfig")
 @vmc_config.route('/api/tanzu/vmc/envconfig', methods=['POST'])
 def config_vmc_env():
     try:
-        spec_json = request.get_json(force=True)
-        spec: VmcMasterSpec = VmcMasterSpec.parse_obj(spec_json)
+        spec: VmcMasterSpec = RequestSpec.model(VmcMasterSpec)
         NsxtWorkflow(spec, current_app.config, current_app.logger).execute_workflow()
     except ValueError as ex:
         response_body = {
@@ -11,7 +11,7 @@ from src.common.lib.govc_client import GovcClient
 from src.common.util.local_cmd_helper import LocalCmdHelper
 
 logger = logging.getLogger(__name__)
-from flask import jsonify, request
+from flask import jsonify
 import requests
 from tqdm import tqdm
 import base64
@@ -35,18 +35,19 @@ from common.common_utilities import preChecks, envCheck, getClusterStatusOnTanzu
     enable_data_protection, createClusterFolder, enable_data_protection_velero, checkDataProtectionEnabledVelero
 from common.operation.ShellHelper import runShellCommandAndReturnOutput, grabKubectlCommand, grabIpAddress, \
     verifyPodsAreRunning, grabPipeOutput, runShellCommandAndReturnOutputAsList, \
-    runShellCommandAndReturnOutputAsListWithChangedDir, grabPipeOutputChagedDir, runShellCommandWithPolling
+    runShellCommandAndReturnOutputAsListWithChangedDir, runShellCommandWithPolling
 from common.common_utilities import convertStringToCommaSeperated, obtain_second_csrf, preChecks, get_avi_version, \
     envCheck, getCloudStatus, checkEnableIdentityManagement, checkPinnipedInstalled, createRbacUsers, \
     createResourceFolderAndWait, validateNetworkAvailable, checkTmcEnabled, \
     deployCluster, registerWithTmcOnSharedAndWorkload, registerTanzuObservability, registerTSM
 from common.operation.ShellHelper import grabKubectlCommand, verifyPodsAreRunning, grabPipeOutput, \
-    runShellCommandAndReturnOutputAsList, \
-    grabPipeOutputChagedDir, runShellCommandWithPolling
+    runShellCommandAndReturnOutputAsList, runShellCommandWithPolling
 from common.operation.constants import SegmentsName, RegexPattern, Versions, AkoType, AppName, FirewallRuleCgw, \
     ServiceName, PLAN, \
     Cloud, Type, Env, Sizing, Tkg_version
 from requests.packages.urllib3.exceptions import InsecureRequestWarning
+from common.util.avi_client import AviClient
+from common.util.request_spec import RequestSpec
 from vmc.managementConfig.management_config import controllerDeployment, getSECloudStatus, createSECloud, \
     getVipNetwork, createVipNetwork, getIpam, changeSeGroupAndSetInterfaces, listAllServiceEngine, \
     getDetailsOfServiceEngine
@@ -113,9 +114,9 @@ def networkConfig():
     cluster_name = current_app.config['VC_CLUSTER']
     data_center = current_app.config['VC_DATACENTER']
     data_store = current_app.config['VC_DATASTORE']
-    refreshToken = request.get_json(force=True)['marketplaceSpec']['refreshToken']
-    kubernetes_ova_os = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec']['tkgWorkloadBaseOs']
-    kubernetes_ova_version = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec']['tkgWorkloadKubeVersion']
+    refreshToken = RequestSpec.json()['marketplaceSpec']['refreshToken']
+    kubernetes_ova_os = RequestSpec.json()['componentSpec']['tkgWorkloadSpec']['tkgWorkloadBaseOs']
+    kubernetes_ova_version = RequestSpec.json()['componentSpec']['tkgWorkloadSpec']['tkgWorkloadKubeVersion']
     if refreshToken:
         current_app.logger.info("Kubernetes OVA configs for workload cluster")
         down_status = downloadAndPushKubernetesOvaMarketPlace(env, kubernetes_ova_version, kubernetes_ova_os)
@@ -135,18 +136,18 @@ def networkConfig():
         try:
             NsxtClient(current_app.config).create_segment(gateway_id='cgw',
                                                           segment_id=SegmentsName.DISPLAY_NAME_TKG_WORKLOAD_DATA_SEGMENT,
-                                                          gateway_cidr=request.get_json(force=True)['componentSpec'][
+                                                          gateway_cidr=RequestSpec.json()['componentSpec'][
                                                               'tkgWorkloadDataNetworkSpec'][
                                                               'tkgWorkloadDataGatewayCidr'],
-                                                          dhcp_start=request.get_json(force=True)['componentSpec'][
+                                                          dhcp_start=RequestSpec.json()['componentSpec'][
                                                               'tkgWorkloadDataNetworkSpec'][
                                                               'tkgWorkloadDataDhcpStartRange'],
-                                                          dhcp_end=request.get_json(force=True)['componentSpec'][
+                                                          dhcp_end=RequestSpec.json()['componentSpec'][
                                                               'tkgWorkloadDataNetworkSpec'][
                                                               'tkgWorkloadDataDhcpEndRange'],
                                                           dns_servers=
                                                           convertStringToCommaSeperated(
-                                                              request.get_json(force=True)['envVariablesSpec'][
+                                                              RequestSpec.json()['envVariablesSpec'][
                                                                   'dnsServersIp']))
         except Exception as e:
             d = {
@@ -336,7 +337,7 @@ def getIPamDetails(ip, csrf2, url_ipam, dataNetwork, aviVersion):
     }
     body = {}
     url = url_ipam
-    response_csrf = requests.request("GET", url, headers=headers, data=body, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=body, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -367,7 +368,7 @@ def updateIpamWithDataNetwork(ip, csrf2, ipamUrl, aviVersion):
         "x-avi-version": aviVersion,
         "x-csrftoken": csrf2[0]
     }
-    response_csrf = requests.request("PUT", ipamUrl, headers=headers, data=json_object, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("PUT", ipamUrl, headers=headers, data=json_object, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -394,8 +395,7 @@ def deploy():
             "STATUS_CODE": 500
         }
         return jsonify(d), 500
-    json_dict = request.get_json(force=True)
-    vmcSpec: VmcMasterSpec = VmcMasterSpec.parse_obj(json_dict)
+    vmcSpec: VmcMasterSpec = RequestSpec.model(VmcMasterSpec)
     env = env[0]
     isTkg13 = False
     if Tkg_version.TKG_VERSION == "1.3":
@@ -420,18 +420,18 @@ def deploy():
         try:
             NsxtClient(current_app.config).create_segment(gateway_id='cgw',
                                                           segment_id=SegmentsName.DISPLAY_NAME_TKG_WORKLOAD,
-                                                          gateway_cidr=request.get_json(force=True)['componentSpec'][
+                                                          gateway_cidr=RequestSpec.json()['componentSpec'][
                                                               'tkgWorkloadSpec'][
                                                               'tkgWorkloadGatewayCidr'],
-                                                          dhcp_start=request.get_json(force=True)['componentSpec'][
+                                                          dhcp_start=RequestSpec.json()['componentSpec'][
                                                               'tkgWorkloadSpec'][
                                                               'tkgWorkloadDhcpStartRange'],
-                                                          dhcp_end=request.get_json(force=True)['componentSpec'][
+                                                          dhcp_end=RequestSpec.json()['componentSpec'][
                                                               'tkgWorkloadSpec'][
                                                               'tkgWorkloadDhcpEndRange'],
                                                           dns_servers=
                                                           convertStringToCommaSeperated(
-                                                              request.get_json(force=True)['envVariablesSpec'][
+                                                              RequestSpec.json()['envVariablesSpec'][
                                                                   'dnsServersIp']))
         except Exception as e:
             d = {
@@ -497,7 +497,7 @@ def deploy():
         current_app.logger.info("Created group " + GroupNameCgw.DISPLAY_NAME_TKG_Workload_Networks_Group_CGW)
 
     ####################################################
-    tkg_management = request.get_json(force=True)['componentSpec']['tkgMgmtSpec']['tkgMgmtNetworkName']
+    tkg_management = RequestSpec.json()['componentSpec']['tkgMgmtSpec']['tkgMgmtNetworkName']
     if not NsxtClient.find_object(listOfGroups, GroupNameMgw.DISPLAY_NAME_TKG_Workload_Networks_Group_Mgw):
         if not NsxtClient.get_segment_path(listOfSegment, tkg_management):
             d = {
@@ -1132,11 +1132,11 @@ def deploy():
         }
         return jsonify(d), 500
     deployWorkload = False
-    workload_cluster_name = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec'][
+    workload_cluster_name = RequestSpec.json()['componentSpec']['tkgWorkloadSpec'][
         'tkgWorkloadClusterName']
-    management_cluster = request.get_json(force=True)['componentSpec']['tkgMgmtSpec']['tkgMgmtClusterName']
-    kubernetes_ova_version = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec']['tkgWorkloadKubeVersion']
-    size = str(request.get_json(force=True)['componentSpec']['tkgWorkloadSpec']['tkgWorkloadSize'])
+    management_cluster = RequestSpec.json()['componentSpec']['tkgMgmtSpec']['tkgMgmtClusterName']
+    kubernetes_ova_version = RequestSpec.json()['componentSpec']['tkgWorkloadSpec']['tkgWorkloadKubeVersion']
+    size = str(RequestSpec.json()['componentSpec']['tkgWorkloadSpec']['tkgWorkloadSize'])
     if size.lower() == "small":
         cpu = Sizing.small['CPU']
         memory = Sizing.small['MEMORY']
@@ -1154,9 +1154,9 @@ def deploy():
         memory = Sizing.extraLarge['MEMORY']
         disk = Sizing.extraLarge['DISK']
     elif size.lower() == "custom":
-        cpu = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec']['tkgWorkloadCpuSize']
-        memory = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec']['tkgWorkloadMemorySize']
-        disk = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec']['tkgWorkloadStorageSize']
+        cpu = RequestSpec.json()['componentSpec']['tkgWorkloadSpec']['tkgWorkloadCpuSize']
+        memory = RequestSpec.json()['componentSpec']['tkgWorkloadSpec']['tkgWorkloadMemorySize']
+        disk = RequestSpec.json()['componentSpec']['tkgWorkloadSpec']['tkgWorkloadStorageSize']
         memory = str(int(memory) * 1024)
     else:
         current_app.logger.error("Provided cluster size: " + size + "is not supported, please provide one of: small/medium/large/extra-large/custom")
@@ -1166,12 +1166,12 @@ def deploy():
             "STATUS_CODE": 500
         }
         return jsonify(d), 500
-    pod_cidr = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec']['tkgWorkloadClusterCidr']
-    service_cidr = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec']['tkgWorkloadServiceCidr']
-    machineCount = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec'][
+    pod_cidr = RequestSpec.json()['componentSpec']['tkgWorkloadSpec']['tkgWorkloadClusterCidr']
+    service_cidr = RequestSpec.json()['componentSpec']['tkgWorkloadSpec']['tkgWorkloadServiceCidr']
+    machineCount = RequestSpec.json()['componentSpec']['tkgWorkloadSpec'][
         'tkgWorkloadWorkerMachineCount']
     cluster_plan = str(
-        request.get_json(force=True)['componentSpec']['tkgWorkloadSpec']['tkgWorkloadDeploymentType'])
+        RequestSpec.json()['componentSpec']['tkgWorkloadSpec']['tkgWorkloadDeploymentType'])
     datacenter_path = "/" + data_center
     datastore_path = datacenter_path + "/datastore/" + data_store
     workload_folder_path = datacenter_path + "/vm/" + ResourcePoolAndFolderName.WORKLOAD_FOLDER
@@ -1191,7 +1191,7 @@ def deploy():
     current_app.logger.info(
         "The config files for shared services cluster will be located at: " + Paths.CLUSTER_PATH + workload_cluster_name)
     if Tkg_version.TKG_VERSION == "1.3":
-        control_plane_end_point = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec'][
+        control_plane_end_point = RequestSpec.json()['componentSpec']['tkgWorkloadSpec'][
             'TKG_Workload_ControlPlane_IP']
         createWorkloadCluster = ["tmc", "cluster", "create", "-t", "tkg-vsphere", "-n", workload_cluster_name, "-m",
                                  management_cluster, "-p", "default", "--cluster-group", "default",
@@ -1239,7 +1239,7 @@ def deploy():
             version = version_status[0]
 
         if checkTmcEnabled(env):
-            clusterGroup = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec']['tkgWorkloadClusterGroupName']
+            clusterGroup = RequestSpec.json()['componentSpec']['tkgWorkloadSpec']['tkgWorkloadClusterGroupName']
         else:
             clusterGroup = "default"
 
@@ -1554,16 +1554,16 @@ def deploy():
             }
             return jsonify(d), 500
         cluster_admin_users = \
-            request.get_json(force=True)['componentSpec']['tkgWorkloadSpec']['tkgWorkloadRbacUserRoleSpec'][
+            RequestSpec.json()['componentSpec']['tkgWorkloadSpec']['tkgWorkloadRbacUserRoleSpec'][
                 'clusterAdminUsers']
         admin_users = \
-            request.get_json(force=True)['componentSpec']['tkgWorkloadSpec']['tkgWorkloadRbacUserRoleSpec'][
+            RequestSpec.json()['componentSpec']['tkgWorkloadSpec']['tkgWorkloadRbacUserRoleSpec'][
                 'adminUsers']
         edit_users = \
-            request.get_json(force=True)['componentSpec']['tkgWorkloadSpec']['tkgWorkloadRbacUserRoleSpec'][
+            RequestSpec.json()['componentSpec']['tkgWorkloadSpec']['tkgWorkloadRbacUserRoleSpec'][
                 'editUsers']
         view_users = \
-            request.get_json(force=True)['componentSpec']['tkgWorkloadSpec']['tkgWorkloadRbacUserRoleSpec'][
+            RequestSpec.json()['componentSpec']['tkgWorkloadSpec']['tkgWorkloadRbacUserRoleSpec'][
                 'viewUsers']
         rbac_user_status = createRbacUsers(workload_cluster_name, isMgmt=False, env=env, edit_users=edit_users,
                                            cluster_admin_users=cluster_admin_users, admin_users=admin_users,
@@ -1660,39 +1660,6 @@ def deploy():
     return jsonify(d), 200
 
 
-def waitForGrepProcess(list1, list2, podName, dir):
-    cert_state = grabPipeOutputChagedDir(list1, list2, dir)
-    if cert_state[1] != 0:
-        current_app.logger.error("Failed to apply " + podName + " " + cert_state[0])
-        d = {
-            "responseType": "ERROR",
-            "msg": "Failed to apply " + podName + " " + cert_state[0],
-            "STATUS_CODE": 500
-        }
-        return jsonify(d), 500, 0
-    count_cert = 0
-    while verifyPodsAreRunning(podName, cert_state[0], RegexPattern.RUNNING) and count_cert < 10:
-        cert_state = grabPipeOutputChagedDir(list1, list2, dir)
-        time.sleep(30)
-        count_cert = count_cert + 1
-        current_app.logger.info("Waited for  " + str(count_cert * 30) + "s, retrying.")
-    if not verifyPodsAreRunning(podName, cert_state[0], RegexPattern.RUNNING):
-        current_app.logger.error(podName + " is not running on waiting " + str(count_cert * 30) + "s")
-        d = {
-            "responseType": "ERROR",
-            "msg": podName + " is not running on waiting " + str(count_cert * 30) + "s",
-            "STATUS_CODE": 500
-        }
-        return jsonify(d), 500, count_cert
-    d = {
-        "responseType": "ERROR",
-        "msg": "Failed to apply " + podName + " " + cert_state[0],
-        "STATUS_CODE": 500
-    }
-
-    return jsonify(d), 200, count_cert
-
-
 def getVipNetworkIpNetMask(ip, csrf2, aviVersion, networkName):
     headers = {
         "Accept": "application/json",
@@ -1705,7 +1672,7 @@ def getVipNetworkIpNetMask(ip, csrf2, aviVersion, networkName):
     body = {}
     url = "https://" + ip + "/api/network"
     try:
-        response_csrf = requests.request("GET", url, headers=headers, data=body, verify=False)
+        response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=body, verify=False)
         if response_csrf.status_code != 200:
             return None, response_csrf.text
         else:
@@ -1716,7 +1683,7 @@ def getVipNetworkIpNetMask(ip, csrf2, aviVersion, networkName):
             else:
                 next_url = None if not response_csrf.json()["next"] else response_csrf.json()["next"]
                 while len(next_url) > 0:
-                    response_csrf = requests.request("GET", next_url, headers=headers, data=body, verify=False)
+                    response_csrf = AviClient.for_controller(ip).request("GET", next_url, headers=headers, data=body, verify=False)
                     for re in response_csrf.json()["results"]:
                         if re['name'] == networkName:
                             for sub in re["configured_subnets"]:
@@ -1772,10 +1739,10 @@ def createAkoFile(ip, wipCidr, clusterName, tkgClusterVipCidr, tkgClusterVipPg):
 
 def connectToWorkLoadCluster(env):
     if env == Env.VMC:
-        workload_cluster_name = request.get_json(force=True)['componentSpec']['tkgWorkloadSpec'][
+        workload_cluster_name = RequestSpec.json()['componentSpec']['tkgWorkloadSpec'][
             'tkgWorkloadClusterName']
     else:
-        workload_cluster_name = request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadClusterName']
+        workload_cluster_name = RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadClusterName']
     current_app.logger.info("Connect to workload cluster")
     commands_shared = ["tanzu", "cluster", "kubeconfig", "get", workload_cluster_name, "--admin"]
     kubeContextCommand_shared = grabKubectlCommand(commands_shared, RegexPattern.SWITCH_CONTEXT_KUBECTL)
@@ -1806,10 +1773,10 @@ def connectToWorkLoadCluster(env):
 
 
 def changeNetworks(vcenter_ip, vcenter_username, password, engine_name):
-    os.putenv("GOVC_URL", "https://" + vcenter_ip + "/sdk")
-    os.putenv("GOVC_USERNAME", vcenter_username)
-    os.putenv("GOVC_PASSWORD", password)
-    os.putenv("GOVC_INSECURE", "true")
+    os.environ["GOVC_URL"] = "https://" + vcenter_ip + "/sdk"
+    os.environ["GOVC_USERNAME"] = vcenter_username
+    os.environ["GOVC_PASSWORD"] = password
+    os.environ["GOVC_INSECURE"] = "true"
     change_VM_Net = ["govc", "vm.network.change", "-vm=" + engine_name, "-net", SegmentsName.DISPLAY_NAME_TKG_WORKLOAD,
                      "ethernet-2"]
     connect_VM_Net = ["govc", "device.connect", "-vm=" + engine_name, "ethernet-2"]
@@ -1819,35 +1786,3 @@ def changeNetworks(vcenter_ip, vcenter_username, password, engine_name):
     except Exception as e:
         return str(e), 500
     return "SUCCEES", 200
-
-
-def waitForProcess(list1, podName):
-    cert_state = runShellCommandAndReturnOutputAsList(list1)
-    if cert_state[1] != 0:
-        current_app.logger.error("Failed to apply " + podName + " " + cert_state[0])
-        d = {
-            "responseType": "ERROR",
-            "msg": "Failed to apply " + podName + " " + cert_state[0],
-            "STATUS_CODE": 500
-        }
-        return jsonify(d), 500, 0
-    count_cert = 0
-    while verifyPodsAreRunning(podName, cert_state[0], RegexPattern.RUNNING) and count_cert < 50:
-        cert_state = runShellCommandAndReturnOutputAsList(list1)
-        time.sleep(30)
-        count_cert = count_cert + 1
-        current_app.logger.info("Waited for  " + str(count_cert * 30) + "s, retrying.")
-    if not verifyPodsAreRunning(podName, cert_state[0], RegexPattern.RECONCILE_SUCCEEDED):
-        current_app.logger.error(podName + " is not running on waiting " + str(count_cert * 30) + "s")
-        d = {
-            "responseType": "ERROR",
-            "msg": podName + " is not running on waiting " + str(count_cert * 30) + "s",
-            "STATUS_CODE": 500
-        }
-        return jsonify(d), 500, count_cert
-    d = {
-        "responseType": "ERROR",
-        "msg": "Failed to apply " + podName + " " + cert_state[0],
-        "STATUS_CODE": 500
-    }
-    return jsonify(d), 200, count_cert
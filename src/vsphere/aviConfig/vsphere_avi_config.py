@@ -3,10 +3,10 @@
 
 import sys
 import socket
+import time
 import requests
 import logging
-from flask import Blueprint, current_app, jsonify, request
-from jinja2 import Template
+from flask import Blueprint, current_app, jsonify
 
 sys.path.append(".../")
 from common.operation.constants import Paths
@@ -15,18 +15,20 @@ from common.operation.vcenter_operations import createResourcePool, create_folde
 from common.operation.constants import ResourcePoolAndFolderName, Cloud, Versions, AkoType, CIDR, PLAN, TmcUser, \
     CertName, \
     Vcenter, Env, Avi_Version, SegmentsName, GroupNameCgw, FirewallRuleCgw, Policy_Name, ServiceName, VCF
-from common.common_utilities import form_avi_ha_cluster, isAviHaEnabled, isEnvTkgs_wcp, createVipService, preChecks, \
-    grabNsxtHeaders, \
+from common.common_utilities import form_avi_ha_cluster, isAviHaEnabled, isEnvTkgs_wcp, nsxtServicePayload, preChecks, \
+    readNsxtDesiredState, getTransportZone, \
     createResourceFolderAndWait, \
     deployAndConfigureAvi, \
     get_avi_version, \
-    envCheck, manage_avi_certificates, createNsxtSegment, seperateNetmaskAndIp, createGroup, createFirewallRule, \
-    getTier1Details, createVcfDhcpServer, getNetworkIp, get_ip_address, is_ipv4, getESXIips, updateDefaultRule, \
-    getIpFromHost, downloadAviController, obtain_avi_version, ping_check_gateways
+    envCheck, manage_avi_certificates, nsxtSegmentPayload, seperateNetmaskAndIp, nsxtGroupExpression, \
+    nsxtGatewayPolicyPayload, createVcfDhcpServer, getNetworkIp, get_ip_address, is_ipv4, getESXIips, \
+    updateDefaultRule, getIpFromHost, downloadAviController, obtain_avi_version, ping_check_gateways
 from common.operation.constants import ControllerLocation
 from common.util.file_helper import FileHelper
+from common.util.template_registry import TemplateRegistry
 from common.lib.govc_client import GovcClient
 from common.util.local_cmd_helper import LocalCmdHelper
+from common.util.request_spec import RequestSpec
 from requests.packages.urllib3.exceptions import InsecureRequestWarning
 
 logger = logging.getLogger(__name__)
@@ -87,82 +89,68 @@ def avi_vcf_pre_config():
     env = env[0]
     if env == Env.VCF:
         try:
-            gatewayAddress = request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
-                'tkgSharedserviceGatewayCidr']
-            dhcpStart = request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
-                'tkgSharedserviceDhcpStartRange']
-            dhcpEnd = request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
-                'tkgSharedserviceDhcpEndRange']
-            dnsServers = request.get_json(force=True)['envSpec']['infraComponents']['dnsServersIp']
-            network = getNetworkIp(gatewayAddress)
-            shared_network_name = request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
-                'tkgSharedserviceNetworkName']
-            shared_segment = createNsxtSegment(shared_network_name, gatewayAddress,
-                                               dhcpStart,
-                                               dhcpEnd, dnsServers, network, True)
-            if shared_segment[1] != 200:
-                current_app.logger.error("Failed to create shared segments" + str(shared_segment[0].json["msg"]))
+            nsxt = readNsxtDesiredState()
+            if nsxt[0] is None:
+                current_app.logger.error(nsxt[1])
                 d = {
                     "responseType": "ERROR",
-                    "msg": "Failed to create shared segments" + str(shared_segment[0].json["msg"]),
+                    "msg": nsxt[1],
                     "STATUS_CODE": 500
                 }
                 return jsonify(d), 500
-            dhcp = createVcfDhcpServer()
-            if dhcp[1] != 200:
-                current_app.logger.error("Failed to create dhcp server " + str(dhcp[0].json["msg"]))
+            nsxt = nsxt[0]
+            teir1 = nsxt.tier1_path(RequestSpec.json()['envSpec']['vcenterDetails']["nsxtTier1RouterDisplayName"])
+            if teir1 is None:
                 d = {
                     "responseType": "ERROR",
-                    "msg": "Failed to create dhcp server " + str(dhcp[0].json["msg"]),
+                    "msg": "Failed to get Tier1 details NOT_FOUND",
                     "STATUS_CODE": 500
                 }
                 return jsonify(d), 500
-            cluster_wip = request.get_json(force=True)['tkgComponentSpec']['tkgClusterVipNetwork'][
-                'tkgClusterVipNetworkName']
-            gatewayAddress = request.get_json(force=True)['tkgComponentSpec']['tkgClusterVipNetwork'][
-                'tkgClusterVipNetworkGatewayCidr']
-            network = getNetworkIp(gatewayAddress)
-            segment = createNsxtSegment(cluster_wip,
-                                        gatewayAddress,
-                                        dhcpStart,
-                                        dhcpEnd, dnsServers, network, False)
-            if segment[1] != 200:
-                current_app.logger.error(
-                    "Failed to create  segments " + cluster_wip + " " + str(segment[0].json["msg"]))
+            overlay = str(RequestSpec.json()['envSpec']['vcenterDetails']["nsxtOverlay"])
+            trz = getTransportZone(nsxt.address, overlay, nsxt.headers)
+            if trz[0] is None:
                 d = {
                     "responseType": "ERROR",
-                    "msg": "Failed to create shared segment " + cluster_wip + " " + str(segment[0].json["msg"]),
+                    "msg": "Failed to get transport zone ID " + str(trz[1]),
                     "STATUS_CODE": 500
                 }
                 return jsonify(d), 500
-            # mgmt_data = request.get_json(force=True)['tkgMgmtDataNetwork']['tkgMgmtDataNetworkName']
-            # gatewayAddress = request.get_json(force=True)['tkgMgmtDataNetwork']['tkgMgmtDataNetworkGatewayCidr']
-            # network = getNetworkIp(gatewayAddress)
-            # segment = createNsxtSegment(mgmt_data,
-            #                             gatewayAddress,
-            #                             dhcpStart,
-            #                             dhcpEnd, dnsServers, network, False)
-            # if segment[1] != 200:
-            #     current_app.logger.error("Failed to create  segments " + mgmt_data + " " + str(segment[0].json["msg"]))
-            #     d = {
-            #         "responseType": "ERROR",
-            #         "msg": "Failed to create shared segment " + mgmt_data + " " + str(segment[0].json["msg"]),
-            #         "STATUS_CODE": 500
-            #     }
-            #     return jsonify(d), 500
-            avi_mgmt = request.get_json(force=True)['tkgComponentSpec']['aviMgmtNetwork'][
+            gatewayAddress = RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
+                'tkgSharedserviceGatewayCidr']
+            dhcpStart = RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
+                'tkgSharedserviceDhcpStartRange']
+            dhcpEnd = RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
+                'tkgSharedserviceDhcpEndRange']
+            dnsServers = RequestSpec.json()['envSpec']['infraComponents']['dnsServersIp']
+            network = getNetworkIp(gatewayAddress)
+            shared_network_name = RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
+                'tkgSharedserviceNetworkName']
+            shared_segment = nsxt.segment(shared_network_name,
+                                          nsxtSegmentPayload(shared_network_name, gatewayAddress, dhcpStart, dhcpEnd,
+                                                             dnsServers, network, True, teir1, trz[0]))
+            cluster_wip = RequestSpec.json()['tkgComponentSpec']['tkgClusterVipNetwork'][
+                'tkgClusterVipNetworkName']
+            gatewayAddress = RequestSpec.json()['tkgComponentSpec']['tkgClusterVipNetwork'][
+                'tkgClusterVipNetworkGatewayCidr']
+            network = getNetworkIp(gatewayAddress)
+            cluster_vip_segment = nsxt.segment(cluster_wip,
+                                               nsxtSegmentPayload(cluster_wip, gatewayAddress, dhcpStart, dhcpEnd,
+                                                                  dnsServers, network, False, teir1, trz[0]))
+            avi_mgmt = RequestSpec.json()['tkgComponentSpec']['aviMgmtNetwork'][
                 'aviMgmtNetworkName']
-            avi_gatewayAddress = request.get_json(force=True)['tkgComponentSpec']['aviMgmtNetwork'][
+            avi_gatewayAddress = RequestSpec.json()['tkgComponentSpec']['aviMgmtNetwork'][
                 'aviMgmtNetworkGatewayCidr']
-            segment = createNsxtSegment(avi_mgmt,
-                                        avi_gatewayAddress,
-                                        dhcpStart,
-                                        dhcpEnd, dnsServers, network, False)
-            if segment[1] != 200:
-                current_app.logger.error("Failed to create  segments " + avi_mgmt + " " + str(segment[0].json["msg"]))
+            avi_mgmt_segment = nsxt.segment(avi_mgmt,
+                                            nsxtSegmentPayload(avi_mgmt, avi_gatewayAddress, dhcpStart, dhcpEnd,
+                                                               dnsServers, network, False, teir1, trz[0]))
+            mgmt = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents']['tkgMgmtNetworkName']
+            mgmt_segment = nsxt.path("Segment", mgmt)
+            if mgmt_segment is None:
+                current_app.logger.error("Failed to find the segment " + mgmt)
                 d = {
                     "responseType": "ERROR",
-                    "msg": "Failed to create shared segment " + avi_mgmt + " " + str(segment[0].json["msg"]),
+                    "msg": "Failed to find the segment " + mgmt,
                     "STATUS_CODE": 500
                 }
                 return jsonify(d), 500
@@ -175,124 +163,7 @@ def avi_vcf_pre_config():
                     "STATUS_CODE": 500
                 }
                 return jsonify(d), 500
-            arcas_group = createGroup(VCF.ARCAS_GROUP, None,
-                                      "true", ip)
-            if arcas_group[1] != 200:
-                current_app.logger.error(
-                    "Failed to create  group " + VCF.ARCAS_GROUP + " " + str(
-                        arcas_group[0].json["msg"]))
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Failed to create group " + VCF.ARCAS_GROUP + " " + str(
-                        arcas_group[0].json["msg"]),
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-            arcas_svc = createVipService(ServiceName.ARCAS_SVC, "8888")
-            if arcas_svc[1] != 200:
-                current_app.logger.error(
-                    "Failed to create service " + ServiceName.ARCAS_SVC + " " + str(
-                        arcas_svc[0].json["msg"]))
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Failed to create service " + ServiceName.ARCAS_SVC + " " + str(
-                        arcas_svc[0].json["msg"]),
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-            arcas_svc = createVipService(ServiceName.ARCAS_BACKEND_SVC, "5000")
-            if arcas_svc[1] != 200:
-                current_app.logger.error(
-                    "Failed to create service " + ServiceName.ARCAS_BACKEND_SVC + " " + str(
-                        arcas_svc[0].json["msg"]))
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Failed to create service " + ServiceName.ARCAS_BACKEND_SVC + " " + str(
-                        arcas_svc[0].json["msg"]),
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-            avi_mgmt_group = createGroup(GroupNameCgw.DISPLAY_NAME_VCF_AVI_Management_Network_Group_CGW, avi_mgmt,
-                                         False, None)
-            if avi_mgmt_group[1] != 200:
-                current_app.logger.error(
-                    "Failed to create  group " + GroupNameCgw.DISPLAY_NAME_VCF_AVI_Management_Network_Group_CGW + " " + str(
-                        avi_mgmt_group[0].json["msg"]))
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Failed to create group " + GroupNameCgw.DISPLAY_NAME_VCF_AVI_Management_Network_Group_CGW + " " + str(
-                        avi_mgmt_group[0].json["msg"]),
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-            cluster_vip_group = createGroup(GroupNameCgw.DISPLAY_NAME_VCF_CLUSTER_VIP_NETWORK_Group_CGW, cluster_wip,
-                                            False, None)
-            if cluster_vip_group[1] != 200:
-                current_app.logger.error(
-                    "Failed to create  group " + GroupNameCgw.DISPLAY_NAME_VCF_CLUSTER_VIP_NETWORK_Group_CGW + " " + str(
-                        cluster_vip_group[0].json["msg"]))
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Failed to create  group " + GroupNameCgw.DISPLAY_NAME_VCF_CLUSTER_VIP_NETWORK_Group_CGW + " " + str(
-                        cluster_vip_group[0].json["msg"]),
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-            shared_service_group = createGroup(GroupNameCgw.DISPLAY_NAME_VCF_TKG_SharedService_Group_CGW,
-                                               shared_network_name, False, None)
-            if shared_service_group[1] != 200:
-                current_app.logger.error(
-                    "Failed to create group " + GroupNameCgw.DISPLAY_NAME_VCF_TKG_SharedService_Group_CGW + " " + str(
-                        shared_service_group[0].json["msg"]))
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Failed to create  group " + GroupNameCgw.DISPLAY_NAME_VCF_TKG_SharedService_Group_CGW + " " + str(
-                        shared_service_group[0].json["msg"]),
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-            mgmt = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents']['tkgMgmtNetworkName']
-            mgmt_group = createGroup(GroupNameCgw.DISPLAY_NAME_VCF_TKG_Management_Network_Group_CGW, mgmt, False, None)
-            if mgmt_group[1] != 200:
-                current_app.logger.error(
-                    "Failed to create group " + GroupNameCgw.DISPLAY_NAME_VCF_TKG_Management_Network_Group_CGW + " " + str(
-                        mgmt_group[0].json["msg"]))
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Failed to create group " + GroupNameCgw.DISPLAY_NAME_VCF_TKG_Management_Network_Group_CGW + " " + str(
-                        mgmt_group[0].json["msg"]),
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-            dns = request.get_json(force=True)['envSpec']['infraComponents']['dnsServersIp']
-            dns_group = createGroup(GroupNameCgw.DISPLAY_NAME_VCF_DNS_IPs_Group,
-                                    None, "true", dns)
-            if dns_group[1] != 200:
-                current_app.logger.error(
-                    "Failed to create group " + GroupNameCgw.DISPLAY_NAME_VCF_DNS_IPs_Group + " " + str(
-                        dns_group[0].json["msg"]))
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Failed to create group " + GroupNameCgw.DISPLAY_NAME_VCF_DNS_IPs_Group + " " + str(
-                        dns_group[0].json["msg"]),
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-            ntp = request.get_json(force=True)['envSpec']['infraComponents']['ntpServers']
-            ntp_group = createGroup(GroupNameCgw.DISPLAY_NAME_VCF_NTP_IPs_Group,
-                                    None, "true", ntp)
-            if ntp_group[1] != 200:
-                current_app.logger.error(
-                    "Failed to create group " + GroupNameCgw.DISPLAY_NAME_VCF_NTP_IPs_Group + " " + str(
-                        ntp_group[0].json["msg"]))
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Failed to create group " + GroupNameCgw.DISPLAY_NAME_VCF_NTP_IPs_Group + " " + str(
-                        ntp_group[0].json["msg"]),
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-            vCenter = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterAddress']
+            vCenter = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterAddress']
             if not is_ipv4(vCenter):
                 vCenter = getIpFromHost(vCenter)
                 if vCenter is None:
@@ -303,19 +174,6 @@ def avi_vcf_pre_config():
                         "STATUS_CODE": 500
                     }
                     return jsonify(d), 500
-            vc_group = createGroup(GroupNameCgw.DISPLAY_NAME_VCF_vCenter_IP_Group,
-                                   None, "true", vCenter)
-            if vc_group[1] != 200:
-                current_app.logger.error(
-                    "Failed to create group " + GroupNameCgw.DISPLAY_NAME_VCF_vCenter_IP_Group + " " + str(
-                        vc_group[0].json["msg"]))
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Failed to create group " + GroupNameCgw.DISPLAY_NAME_VCF_vCenter_IP_Group + " " + str(
-                        vc_group[0].json["msg"]),
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
             ips = getESXIips()
             if ips[0] is None:
                 current_app.logger.error(
@@ -326,344 +184,136 @@ def avi_vcf_pre_config():
                     "STATUS_CODE": 500
                 }
                 return jsonify(d), 500
-            esx_group = createGroup(VCF.ESXI_GROUP,
-                                    None, "true", ips[0])
-            if esx_group[1] != 200:
-                current_app.logger.error(
-                    "Failed to create group " + VCF.ESXI_GROUP + " " + str(
-                        esx_group[0].json["msg"]))
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Failed to create group " + VCF.ESXI_GROUP + " " + str(
-                        esx_group[0].json["msg"]),
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-            headers_ = grabNsxtHeaders()
-            if headers_[0] is None:
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Failed to nsxt info " + str(headers_[1]),
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-            teir1 = getTier1Details(headers_)
-            if teir1[0] is None:
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Failed to tier1 details" + str(headers_[1]),
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-            payload = {"action": "ALLOW",
-                       "display_name": FirewallRuleCgw.DISPLAY_NAME_VCF_ARCAS_UI,
-                       "logged": False,
-                       "source_groups": ["ANY"],
-                       "destination_groups": [
-                           arcas_group[0].json["path"]],
-                       "services": ["/infra/services/SSH", "/infra/services/" + ServiceName.ARCAS_SVC],
-                       "scope": [teir1[0]]
-                       }
-            arcas_fw = createFirewallRule(Policy_Name.POLICY_NAME, FirewallRuleCgw.DISPLAY_NAME_VCF_ARCAS_UI, payload)
-            if arcas_fw[1] != 200:
-                current_app.logger.error(
-                    "Failed to create firewall " + FirewallRuleCgw.DISPLAY_NAME_VCF_ARCAS_UI + " " + str(
-                        arcas_fw[0].json["msg"]))
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Failed to create firewall " + FirewallRuleCgw.DISPLAY_NAME_VCF_ARCAS_UI + " " + str(
-                        arcas_fw[0].json["msg"]),
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-            payload = {"action": "ALLOW",
-                       "display_name": FirewallRuleCgw.DISPLAY_NAME_VCF_ARCAS_BACKEND,
-                       "logged": False,
-                       "source_groups": ["ANY"],
-                       "destination_groups": [
-                           arcas_group[0].json["path"]],
-                       "services": ["/infra/services/" + ServiceName.ARCAS_BACKEND_SVC],
-                       "scope": [teir1[0]]
-                       }
-            arcas_fw = createFirewallRule(Policy_Name.POLICY_NAME, FirewallRuleCgw.DISPLAY_NAME_VCF_ARCAS_BACKEND,
-                                          payload)
-            if arcas_fw[1] != 200:
-                current_app.logger.error(
-                    "Failed to create firewall " + FirewallRuleCgw.DISPLAY_NAME_VCF_ARCAS_BACKEND + " " + str(
-                        arcas_fw[0].json["msg"]))
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Failed to create firewall " + GroupNameCgw.DISPLAY_NAME_VCF_ARCAS_BACKEND + " " + str(
-                        arcas_fw[0].json["msg"]),
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-            payload = {"action": "ALLOW",
-                       "display_name": FirewallRuleCgw.DISPLAY_NAME_VCF_TKG_and_AVI_DNS,
-                       "logged": False,
-                       "source_groups": [avi_mgmt_group[0].json["path"],
-                                         mgmt_group[0].json["path"],
-                                         shared_service_group[0].json["path"]],
-                       "destination_groups": [
-                           dns_group[0].json["path"]],
-                       "services": ["/infra/services/DNS", "/infra/services/DNS-UDP"],
-                       "scope": [teir1[0]]
-                       }
-            fw = createFirewallRule(Policy_Name.POLICY_NAME, FirewallRuleCgw.DISPLAY_NAME_VCF_TKG_and_AVI_DNS, payload)
-            if fw[1] != 200:
-                current_app.logger.error(
-                    "Failed to create firewall " + FirewallRuleCgw.DISPLAY_NAME_VCF_TKG_and_AVI_DNS + " " + str(
-                        fw[0].json["msg"]))
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Failed to create firewall " + GroupNameCgw.DISPLAY_NAME_VCF_TKG_and_AVI_DNS + " " + str(
-                        fw[0].json["msg"]),
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-            payload = {"action": "ALLOW",
-                       "display_name": FirewallRuleCgw.DISPLAY_NAME_VCF_TKG_and_AVI_NTP,
-                       "logged": False,
-                       "source_groups": [avi_mgmt_group[0].json["path"],
-                                         mgmt_group[0].json["path"],
-                                         shared_service_group[0].json["path"]],
-                       "destination_groups": [
-                           ntp_group[0].json["path"]],
-                       "services": ["/infra/services/NTP"],
-                       "scope": [teir1[0]]
-                       }
-            fw_vip = createFirewallRule(Policy_Name.POLICY_NAME, FirewallRuleCgw.DISPLAY_NAME_VCF_TKG_and_AVI_NTP,
-                                        payload)
-            if fw_vip[1] != 200:
-                current_app.logger.error(
-                    "Failed to create firewall " + FirewallRuleCgw.DISPLAY_NAME_VCF_TKG_and_AVI_NTP + " " + str(
-                        fw_vip[0].json["msg"]))
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Failed to create firewall " + FirewallRuleCgw.DISPLAY_NAME_VCF_TKG_and_AVI_NTP + " " + str(
-                        fw_vip[0].json["msg"]),
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-            payload = {"action": "ALLOW",
-                       "display_name": FirewallRuleCgw.DISPLAY_NAME_VCF_TKG_and_AVI_to_vCenter,
-                       "logged": False,
-                       "source_groups": [avi_mgmt_group[0].json["path"],
-                                         mgmt_group[0].json["path"],
-                                         shared_service_group[0].json["path"]],
-                       "destination_groups": [
-                           vc_group[0].json["path"]],
-                       "services": ["/infra/services/HTTPS"],
-                       "scope": [teir1[0]]
-                       }
-            fw_vip = createFirewallRule(Policy_Name.POLICY_NAME,
-                                        FirewallRuleCgw.DISPLAY_NAME_VCF_TKG_and_AVI_to_vCenter, payload)
-            if fw_vip[1] != 200:
-                current_app.logger.error(
-                    "Failed to create firewall " + FirewallRuleCgw.DISPLAY_NAME_VCF_TKG_and_AVI_to_vCenter + " " + str(
-                        fw_vip[0].json["msg"]))
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Failed to create firewall " + FirewallRuleCgw.DISPLAY_NAME_VCF_TKG_and_AVI_to_vCenter + " " + str(
-                        fw_vip[0].json["msg"]),
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-            payload = {"action": "ALLOW",
-                       "display_name": VCF.ESXI_FW,
-                       "logged": False,
-                       "source_groups": [mgmt_group[0].json["path"],
-                                         avi_mgmt_group[0].json["path"]],
-                       "destination_groups": [
-                           esx_group[0].json["path"]],
-                       "services": ["/infra/services/HTTPS"],
-                       "scope": [teir1[0]]
-                       }
-            fw_esx = createFirewallRule(Policy_Name.POLICY_NAME,
-                                        VCF.ESXI_FW, payload)
-            if fw_esx[1] != 200:
-                current_app.logger.error(
-                    "Failed to create firewall " + VCF.ESXI_FW + " " + str(
-                        fw_esx[0].json["msg"]))
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Failed to create firewall " + VCF.ESXI_FW + " " + str(
-                        fw_esx[0].json["msg"]),
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-            payload = {"action": "ALLOW",
-                       "display_name": FirewallRuleCgw.DISPLAY_NAME_VCF_TKG_and_AVI_to_Internet,
-                       "logged": False,
-                       "source_groups": [mgmt_group[0].json["path"],
-                                         shared_service_group[0].json["path"]],
-                       "destination_groups": ["ANY"],
-                       "services": ["ANY"],
-                       "scope": [teir1[0]]
-                       }
-            fw_vip = createFirewallRule(Policy_Name.POLICY_NAME,
-                                        FirewallRuleCgw.DISPLAY_NAME_VCF_TKG_and_AVI_to_Internet, payload)
-            if fw_vip[1] != 200:
-                current_app.logger.error(
-                    "Failed to create firewall " + FirewallRuleCgw.DISPLAY_NAME_VCF_TKG_and_AVI_to_Internet + " " + str(
-                        fw_vip[0].json["msg"]))
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Failed to create firewall " + FirewallRuleCgw.DISPLAY_NAME_VCF_TKG_and_AVI_to_Internet + " " + str(
-                        fw_vip[0].json["msg"]),
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-            payload = {"action": "ALLOW",
-                       "display_name": FirewallRuleCgw.DISPLAY_NAME_VCF_TKG_and_TKGtoAVIMgmt,
-                       "logged": False,
-                       "source_groups": [
-                           mgmt_group[0].json["path"],
-                           shared_service_group[0].json["path"]],
-                       "destination_groups": [
-                           avi_mgmt_group[0].json["path"]],
-                       "services": ["/infra/services/HTTPS", "/infra/services/ICMP-ALL"],
-                       "scope": [teir1[0]]
-                       }
-            fw_vip = createFirewallRule(Policy_Name.POLICY_NAME, FirewallRuleCgw.DISPLAY_NAME_VCF_TKG_and_TKGtoAVIMgmt,
-                                        payload)
-            if fw_vip[1] != 200:
-                current_app.logger.error(
-                    "Failed to create firewall " + FirewallRuleCgw.DISPLAY_NAME_VCF_TKG_and_TKGtoAVIMgmt + " " + str(
-                        fw_vip[0].json["msg"]))
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Failed to create firewall " + FirewallRuleCgw.DISPLAY_NAME_VCF_TKG_and_TKGtoAVIMgmt + " " + str(
-                        fw_vip[0].json["msg"]),
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-            payload = {"action": "ALLOW",
-                       "display_name": "Alb",
-                       "logged": False,
-                       "source_groups": ["ANY"],
-                       "destination_groups": [
-                           avi_mgmt_group[0].json["path"]],
-                       "services": ["/infra/services/HTTPS"],
-                       "scope": [teir1[0]]
-                       }
-            fw_vip = createFirewallRule(Policy_Name.POLICY_NAME, "Alb",
-                                        payload)
-            if fw_vip[1] != 200:
-                current_app.logger.error(
-                    "Failed to create firewall " + "Alb" + " " + str(
-                        fw_vip[0].json["msg"]))
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Failed to create firewall " + "Alb" + " " + str(
-                        fw_vip[0].json["msg"]),
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-            nsx_fqdn = str(request.get_json(force=True)['envSpec']['vcenterDetails']["nsxtAddress"])
+            nsx_fqdn = str(RequestSpec.json()['envSpec']['vcenterDetails']["nsxtAddress"])
             nsx_ip = socket.gethostbyname(nsx_fqdn)
-            nsxt_group = createGroup(VCF.NSXT_GROUP, None, "true", nsx_ip)
-            if nsxt_group[1] != 200:
-                current_app.logger.error(
-                    "Failed to create  group " + VCF.NSXT_GROUP + " " + str(
-                        nsxt_group[0].json["msg"]))
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Failed to create group " + VCF.NSXT_GROUP + " " + str(
-                        nsxt_group[0].json["msg"]),
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-            payload = {"action": "ALLOW",
-                       "display_name": "alb-to-nsx",
-                       "logged": False,
-                       "source_groups": [avi_mgmt_group[0].json["path"]],
-                       "destination_groups": [
-                            nsxt_group[0].json["path"]],
-                       "services": ["/infra/services/HTTPS"],
-                       "scope": [teir1[0]]
-                       }
-            fw_alb_to_nsx = createFirewallRule(Policy_Name.POLICY_NAME, "alb-to-nsx",
-                                        payload)
-            if fw_alb_to_nsx[1] != 200:
-                current_app.logger.error(
-                    "Failed to create firewall " + "alb-to-nsx" + " " + str(
-                        fw_alb_to_nsx[0].json["msg"]))
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Failed to create firewall " + "alb-to-nsx" + " " + str(
-                        fw_alb_to_nsx[0].json["msg"]),
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
+            dns = RequestSpec.json()['envSpec']['infraComponents']['dnsServersIp']
+            ntp = RequestSpec.json()['envSpec']['infraComponents']['ntpServers']
 
-            payload = {"action": "ALLOW",
-                       "display_name": FirewallRuleCgw.DISPLAY_NAME_VCF_TKG_and_AVIMgmt,
-                       "logged": False,
-                       "source_groups": [
-                           avi_mgmt_group[0].json["path"]],
-                       "destination_groups": [
-                            ntp_group[0].json["path"],
-                            dns_group[0].json["path"]],
-                       "services": ["/infra/services/DNS", "/infra/services/NTP"],
-                       "scope": [teir1[0]]
-                       }
-            fw_vip = createFirewallRule(Policy_Name.POLICY_NAME, FirewallRuleCgw.DISPLAY_NAME_VCF_TKG_and_AVIMgmt,
-                                        payload)
-            if fw_vip[1] != 200:
-                current_app.logger.error(
-                    "Failed to create firewall " + FirewallRuleCgw.DISPLAY_NAME_VCF_TKG_and_AVIMgmt + " " + str(
-                        fw_vip[0].json["msg"]))
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Failed to create firewall " + FirewallRuleCgw.DISPLAY_NAME_VCF_TKG_and_AVIMgmt + " " + str(
-                        fw_vip[0].json["msg"]),
-                    "STATUS_CODE": 500
+            arcas_group = nsxt.group(VCF.ARCAS_GROUP, nsxtGroupExpression(None, "true", ip))
+            avi_mgmt_group = nsxt.group(GroupNameCgw.DISPLAY_NAME_VCF_AVI_Management_Network_Group_CGW,
+                                        nsxtGroupExpression(avi_mgmt_segment, False, None))
+            cluster_vip_group = nsxt.group(GroupNameCgw.DISPLAY_NAME_VCF_CLUSTER_VIP_NETWORK_Group_CGW,
+                                           nsxtGroupExpression(cluster_vip_segment, False, None))
+            shared_service_group = nsxt.group(GroupNameCgw.DISPLAY_NAME_VCF_TKG_SharedService_Group_CGW,
+                                              nsxtGroupExpression(shared_segment, False, None))
+            mgmt_group = nsxt.group(GroupNameCgw.DISPLAY_NAME_VCF_TKG_Management_Network_Group_CGW,
+                                    nsxtGroupExpression(mgmt_segment, False, None))
+            dns_group = nsxt.group(GroupNameCgw.DISPLAY_NAME_VCF_DNS_IPs_Group,
+                                   nsxtGroupExpression(None, "true", dns))
+            ntp_group = nsxt.group(GroupNameCgw.DISPLAY_NAME_VCF_NTP_IPs_Group,
+                                   nsxtGroupExpression(None, "true", ntp))
+            vc_group = nsxt.group(GroupNameCgw.DISPLAY_NAME_VCF_vCenter_IP_Group,
+                                  nsxtGroupExpression(None, "true", vCenter))
+            esx_group = nsxt.group(VCF.ESXI_GROUP, nsxtGroupExpression(None, "true", ips[0]))
+            nsxt_group = nsxt.group(VCF.NSXT_GROUP, nsxtGroupExpression(None, "true", nsx_ip))
+
+            arcas_svc = nsxt.service(ServiceName.ARCAS_SVC, nsxtServicePayload(ServiceName.ARCAS_SVC, "8888"))
+            arcas_backend_svc = nsxt.service(ServiceName.ARCAS_BACKEND_SVC,
+                                             nsxtServicePayload(ServiceName.ARCAS_BACKEND_SVC, "5000"))
+            kube_vip_svc = nsxt.service(ServiceName.KUBE_VIP_VCF_SERVICE,
+                                        nsxtServicePayload(ServiceName.KUBE_VIP_VCF_SERVICE, "6443"))
+
+            nsxt.gateway_policy(Policy_Name.POLICY_NAME, nsxtGatewayPolicyPayload(Policy_Name.POLICY_NAME, teir1))
+            rules = {
+                FirewallRuleCgw.DISPLAY_NAME_VCF_ARCAS_UI: {
+                    "source_groups": ["ANY"],
+                    "destination_groups": [arcas_group],
+                    "services": ["/infra/services/SSH", arcas_svc]
+                },
+                FirewallRuleCgw.DISPLAY_NAME_VCF_ARCAS_BACKEND: {
+                    "source_groups": ["ANY"],
+                    "destination_groups": [arcas_group],
+                    "services": [arcas_backend_svc]
+                },
+                FirewallRuleCgw.DISPLAY_NAME_VCF_TKG_and_AVI_DNS: {
+                    "source_groups": [avi_mgmt_group, mgmt_group, shared_service_group],
+                    "destination_groups": [dns_group],
+                    "services": ["/infra/services/DNS", "/infra/services/DNS-UDP"]
+                },
+                FirewallRuleCgw.DISPLAY_NAME_VCF_TKG_and_AVI_NTP: {
+                    "source_groups": [avi_mgmt_group, mgmt_group, shared_service_group],
+                    "destination_groups": [ntp_group],
+                    "services": ["/infra/services/NTP"]
+                },
+                FirewallRuleCgw.DISPLAY_NAME_VCF_TKG_and_AVI_to_vCenter: {
+                    "source_groups": [avi_mgmt_group, mgmt_group, shared_service_group],
+                    "destination_groups": [vc_group],
+                    "services": ["/infra/services/HTTPS"]
+                },
+                VCF.ESXI_FW: {
+                    "source_groups": [mgmt_group, avi_mgmt_group],
+                    "destination_groups": [esx_group],
+                    "services": ["/infra/services/HTTPS"]
+                },
+                FirewallRuleCgw.DISPLAY_NAME_VCF_TKG_and_AVI_to_Internet: {
+                    "source_groups": [mgmt_group, shared_service_group],
+                    "destination_groups": ["ANY"],
+                    "services": ["ANY"]
+                },
+                FirewallRuleCgw.DISPLAY_NAME_VCF_TKG_and_TKGtoAVIMgmt: {
+                    "source_groups": [mgmt_group, shared_service_group],
+                    "destination_groups": [avi_mgmt_group],
+                    "services": ["/infra/services/HTTPS", "/infra/services/ICMP-ALL"]
+                },
+                "Alb": {
+                    "source_groups": ["ANY"],
+                    "destination_groups": [avi_mgmt_group],
+                    "services": ["/infra/services/HTTPS"]
+                },
+                "alb-to-nsx": {
+                    "source_groups": [avi_mgmt_group],
+                    "destination_groups": [nsxt_group],
+                    "services": ["/infra/services/HTTPS"]
+                },
+                FirewallRuleCgw.DISPLAY_NAME_VCF_TKG_and_AVIMgmt: {
+                    "source_groups": [avi_mgmt_group],
+                    "destination_groups": [ntp_group, dns_group],
+                    "services": ["/infra/services/DNS", "/infra/services/NTP"]
+                },
+                FirewallRuleCgw.DISPLAY_NAME_VCF_TKG_CLUSTER_VIP_CGW: {
+                    "source_groups": [mgmt_group, shared_service_group],
+                    "destination_groups": [cluster_vip_group],
+                    "services": [kube_vip_svc]
                 }
-                return jsonify(d), 500
-            vip = createVipService(ServiceName.KUBE_VIP_VCF_SERVICE, "6443")
-            if vip[1] != 200:
-                current_app.logger.error(
-                    "Failed to create service " + ServiceName.KUBE_VIP_VCF_SERVICE + " " + str(
-                        vip[0].json["msg"]))
+            }
+            for rule_name, rule in rules.items():
+                payload = {"action": "ALLOW",
+                           "display_name": rule_name,
+                           "logged": False,
+                           "scope": [teir1]
+                           }
+                payload.update(rule)
+                nsxt.rule(Policy_Name.POLICY_NAME, rule_name, payload)
+            update = updateDefaultRule(nsxt, Policy_Name.POLICY_NAME, teir1)
+            if update[0] is None:
+                current_app.logger.error("Failed to default rule " + str(update[1]))
                 d = {
                     "responseType": "ERROR",
-                    "msg": "Failed to create service " + ServiceName.KUBE_VIP_VCF_SERVICE + " " + str(
-                        vip[0].json["msg"]),
+                    "msg": "Failed to default rule " + str(update[1]),
                     "STATUS_CODE": 500
                 }
                 return jsonify(d), 500
-            payload = {"action": "ALLOW",
-                       "display_name": FirewallRuleCgw.DISPLAY_NAME_VCF_TKG_CLUSTER_VIP_CGW,
-                       "logged": False,
-                       "source_groups": [
-                           mgmt_group[0].json["path"],
-                           shared_service_group[0].json["path"]],
-                       "destination_groups": [
-                           cluster_vip_group[0].json["path"]],
-                       "services": ["/infra/services/" + ServiceName.KUBE_VIP_VCF_SERVICE],
-                       "scope": [teir1[0]]
-                       }
-            fw_vip = createFirewallRule(Policy_Name.POLICY_NAME, FirewallRuleCgw.DISPLAY_NAME_VCF_TKG_CLUSTER_VIP_CGW,
-                                        payload)
-            if fw_vip[1] != 200:
-                current_app.logger.error(
-                    "Failed to create firewall " + FirewallRuleCgw.DISPLAY_NAME_VCF_TKG_CLUSTER_VIP_CGW + " " + str(
-                        fw_vip[0].json["msg"]))
+            created_segments = nsxt.created_segments()
+            apply = nsxt.apply()
+            if apply[1] != 200:
+                current_app.logger.error("Failed to configure NSX-T objects " + str(apply[0]))
                 d = {
                     "responseType": "ERROR",
-                    "msg": "Failed to create firewall " + FirewallRuleCgw.DISPLAY_NAME_VCF_TKG_CLUSTER_VIP_CGW + " " + str(
-                        fw_vip[0].json["msg"]),
+                    "msg": "Failed to configure NSX-T objects " + str(apply[0]),
                     "STATUS_CODE": 500
                 }
                 return jsonify(d), 500
-            update = updateDefaultRule(Policy_Name.POLICY_NAME)
-            if update[1] != 200:
-                current_app.logger.error(
-                    "Failed to default rule " + str(update[0].json["msg"]))
+            current_app.logger.info(apply[0])
+            if created_segments:
+                current_app.logger.info("Created " + ", ".join(created_segments))
+                current_app.logger.info("Waiting for 1 min for status == ready")
+                time.sleep(60)
+            dhcp = createVcfDhcpServer()
+            if dhcp[1] != 200:
+                current_app.logger.error("Failed to create dhcp server " + str(dhcp[0].json["msg"]))
                 d = {
                     "responseType": "ERROR",
-                    "msg": "Failed to default rule " + str(update[0].json["msg"]),
+                    "msg": "Failed to create dhcp server " + str(dhcp[0].json["msg"]),
                     "STATUS_CODE": 500
                 }
                 return jsonify(d), 500
@@ -715,7 +365,7 @@ def aviDeployment_vsphere():
         return jsonify(d), 500
     else:
         current_app.logger.info("Ping check passed for gateways")
-    refreshToken = request.get_json(force=True)['envSpec']['marketplaceSpec']['refreshToken']
+    refreshToken = RequestSpec.json()['envSpec']['marketplaceSpec']['refreshToken']
     if refreshToken:
         download_status = downloadAviController(env)
         if download_status[1] != 200:
@@ -753,29 +403,29 @@ def aviDeployment_vsphere():
     try:
         if isEnvTkgs_wcp(env):
             control_plan = "dev"
-            avi_fqdn = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviController01Fqdn']
-            avi_ip = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviController01Ip']
+            avi_fqdn = RequestSpec.json()['tkgsComponentSpec']['aviComponents']['aviController01Fqdn']
+            avi_ip = RequestSpec.json()['tkgsComponentSpec']['aviComponents']['aviController01Ip']
             if isAviHaEnabled(env):
-                avi_fqdn2 = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviController02Fqdn']
-                avi_ip2 = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviController02Ip']
-                avi_fqdn3 = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviController03Fqdn']
-                avi_ip3 = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviController03Ip']
-            mgmgt_name = request.get_json(force=True)['tkgsComponentSpec']['aviMgmtNetwork'][
+                avi_fqdn2 = RequestSpec.json()['tkgsComponentSpec']['aviComponents']['aviController02Fqdn']
+                avi_ip2 = RequestSpec.json()['tkgsComponentSpec']['aviComponents']['aviController02Ip']
+                avi_fqdn3 = RequestSpec.json()['tkgsComponentSpec']['aviComponents']['aviController03Fqdn']
+                avi_ip3 = RequestSpec.json()['tkgsComponentSpec']['aviComponents']['aviController03Ip']
+            mgmgt_name = RequestSpec.json()['tkgsComponentSpec']['aviMgmtNetwork'][
                 'aviMgmtNetworkName']
-            mgmt_cidr = request.get_json(force=True)['tkgsComponentSpec']['aviMgmtNetwork'][
+            mgmt_cidr = RequestSpec.json()['tkgsComponentSpec']['aviMgmtNetwork'][
                 'aviMgmtNetworkGatewayCidr']
         else:
-            control_plan = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+            control_plan = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
                 'tkgMgmtDeploymentType']
-            avi_fqdn = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController01Fqdn']
-            avi_ip = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController01Ip']
+            avi_fqdn = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviController01Fqdn']
+            avi_ip = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviController01Ip']
             if isAviHaEnabled(env):
-                avi_fqdn2 = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController02Fqdn']
-                avi_ip2 = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController02Ip']
-                avi_fqdn3 = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController03Fqdn']
-                avi_ip3 = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController03Ip']
-            mgmgt_name = request.get_json(force=True)['tkgComponentSpec']['aviMgmtNetwork']['aviMgmtNetworkName']
-            mgmt_cidr = request.get_json(force=True)['tkgComponentSpec']['aviMgmtNetwork'][
+                avi_fqdn2 = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviController02Fqdn']
+                avi_ip2 = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviController02Ip']
+                avi_fqdn3 = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviController03Fqdn']
+                avi_ip3 = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviController03Ip']
+            mgmgt_name = RequestSpec.json()['tkgComponentSpec']['aviMgmtNetwork']['aviMgmtNetworkName']
+            mgmt_cidr = RequestSpec.json()['tkgComponentSpec']['aviMgmtNetwork'][
                 'aviMgmtNetworkGatewayCidr']
     except Exception as e:
         current_app.logger.error("Failed to get input " + str(e))
@@ -834,7 +484,7 @@ def aviDeployment_vsphere():
         if isAviHaEnabled(env):
             fqdn2 = avi_fqdn2
             fqdn3 = avi_fqdn3
-        deploy_options = Template(FileHelper.read_resource(Paths.VSPHERE_ALB_DEPLOY_J2))
+        deploy_options = TemplateRegistry.get(Paths.VSPHERE_ALB_DEPLOY_J2)
         FileHelper.write_to_file(
             deploy_options.render(ip=ip, netmask=netmask, gateway=gateway, fqdn=fqdn,
                                   network=mgmgt_name, vm_name=controller_name),
@@ -969,9 +619,9 @@ def aviCertManagement_vsphere():
         return jsonify(d), 500
     env = env[0]
     if isEnvTkgs_wcp(env):
-        avi_fqdn = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviController01Fqdn']
+        avi_fqdn = RequestSpec.json()['tkgsComponentSpec']['aviComponents']['aviController01Fqdn']
     else:
-        avi_fqdn = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController01Fqdn']
+        avi_fqdn = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviController01Fqdn']
     if not avi_fqdn:
         current_app.logger.error("Avi fqdn not provided")
         d = {
@@ -3,7 +3,7 @@
 
 from flask import Blueprint
 import logging
-from flask import jsonify, request
+from flask import jsonify
 from flask import current_app
 import sys
 import time
@@ -13,10 +13,10 @@ import json
 from tqdm import tqdm
 from ruamel import yaml
 from common.util.file_helper import FileHelper
+from common.util.template_registry import TemplateRegistry
 from common.operation.constants import Paths
 from common.model.vsphereSpec import VsphereMasterSpec
 from common.util.ssl_helper import get_base64_cert
-from jinja2 import Template
 
 logger = logging.getLogger(__name__)
 vsphere_management_config = Blueprint("vsphere_management_config", __name__, static_folder="managementConfig")
@@ -54,6 +54,8 @@ from common.replace_value import replaceValueSysConfig, replaceSe, replaceSeGrou
 from vmc.managementConfig.management_config import downloadSeOva, generateToken, getVipNetwork, updateNewCloudSeGroup, \
     generateSeOva, getClusterUUid, getDetailsOfServiceEngine, getConnectedStatus
 from requests.packages.urllib3.exceptions import InsecureRequestWarning
+from common.util.avi_client import AviClient
+from common.util.request_spec import RequestSpec
 
 requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
 
@@ -116,10 +118,10 @@ def configCloud():
     data_center = current_app.config['VC_DATACENTER']
     data_store = current_app.config['VC_DATASTORE']
     req = True
-    refToken = request.get_json(force=True)['envSpec']['marketplaceSpec']['refreshToken']
+    refToken = RequestSpec.json()['envSpec']['marketplaceSpec']['refreshToken']
     if refToken and (env == Env.VSPHERE or env == Env.VCF):
         if not (isEnvTkgs_wcp(env) or isEnvTkgs_ns(env)):
-            kubernetes_ova_os = request.get_json(force=True)["tkgComponentSpec"]["tkgMgmtComponents"]["tkgMgmtBaseOs"]
+            kubernetes_ova_os = RequestSpec.json()["tkgComponentSpec"]["tkgMgmtComponents"]["tkgMgmtBaseOs"]
             kubernetes_ova_version = KubernetesOva.KUBERNETES_OVA_LATEST_VERSION
             current_app.logger.info("Kubernetes OVA configs for management cluster")
             down_status = downloadAndPushKubernetesOvaMarketPlace(env, kubernetes_ova_version, kubernetes_ova_os)
@@ -134,14 +136,14 @@ def configCloud():
     else:
         current_app.logger.info("MarketPlace refresh token is not provided, skipping the download of kubernetes ova")
     if isEnvTkgs_wcp(env):
-        avi_fqdn = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviController01Fqdn']
-        ip_ = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviClusterIp']
+        avi_fqdn = RequestSpec.json()['tkgsComponentSpec']['aviComponents']['aviController01Fqdn']
+        ip_ = RequestSpec.json()['tkgsComponentSpec']['aviComponents']['aviClusterIp']
         if isAviHaEnabled(env):
-            aviClusterFqdn = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviClusterFqdn']
+            aviClusterFqdn = RequestSpec.json()['tkgsComponentSpec']['aviComponents']['aviClusterFqdn']
 
     else:
-        avi_fqdn = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController01Fqdn']
-        aviClusterFqdn = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviClusterFqdn']
+        avi_fqdn = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviController01Fqdn']
+        aviClusterFqdn = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviClusterFqdn']
     if not avi_fqdn:
         controller_name = ControllerLocation.CONTROLLER_NAME_VSPHERE
     else:
@@ -160,7 +162,7 @@ def configCloud():
         return jsonify(d), 500
     isNonOrchestrated = False
     try:
-        mode = request.get_json(force=True)["tkgComponentSpec"]["aviComponents"]["modeOfDeployment"]
+        mode = RequestSpec.json()["tkgComponentSpec"]["aviComponents"]["modeOfDeployment"]
         if mode == "non-orchestrated":
             isNonOrchestrated = True
     except:
@@ -263,7 +265,7 @@ def configCloud():
             if isGen:
                 for i in tqdm(range(60), desc="Waiting…", ascii=False, ncols=75):
                     time.sleep(1)
-            mgmt_pg = request.get_json(force=True)['tkgComponentSpec']['aviMgmtNetwork']['aviMgmtNetworkName']
+            mgmt_pg = RequestSpec.json()['tkgComponentSpec']['aviMgmtNetwork']['aviMgmtNetworkName']
             get_management = getNetworkUrl(ip, csrf2, mgmt_pg, aviVersion)
             if get_management[0] is None:
                 current_app.logger.error("Failed to get management network " + str(get_management[1]))
@@ -273,11 +275,11 @@ def configCloud():
                     "STATUS_CODE": 500
                 }
                 return jsonify(d), 500
-            startIp = request.get_json(force=True)["tkgComponentSpec"]["aviMgmtNetwork"][
+            startIp = RequestSpec.json()["tkgComponentSpec"]["aviMgmtNetwork"][
                 "aviMgmtServiceIpStartRange"]
-            endIp = request.get_json(force=True)["tkgComponentSpec"]["aviMgmtNetwork"]["aviMgmtServiceIpEndRange"]
+            endIp = RequestSpec.json()["tkgComponentSpec"]["aviMgmtNetwork"]["aviMgmtServiceIpEndRange"]
             prefixIpNetmask = seperateNetmaskAndIp(
-                request.get_json(force=True)["tkgComponentSpec"]["aviMgmtNetwork"]["aviMgmtNetworkGatewayCidr"])
+                RequestSpec.json()["tkgComponentSpec"]["aviMgmtNetwork"]["aviMgmtNetworkGatewayCidr"])
             if env ==  Env.VSPHERE:
                 getManagementDetails = getNetworkDetails(ip, csrf2, get_management[0], startIp, endIp, prefixIpNetmask[0],
                                                      prefixIpNetmask[1], aviVersion)
@@ -329,7 +331,7 @@ def configCloud():
                         "STATUS_CODE": 500
                     }
                     return jsonify(d), 500
-                mgmt_data_pg = request.get_json(force=True)['tkgMgmtDataNetwork']['tkgMgmtDataNetworkName']
+                mgmt_data_pg = RequestSpec.json()['tkgMgmtDataNetwork']['tkgMgmtDataNetworkName']
                 get_management_data_pg = getNetworkUrl(ip, csrf2, mgmt_data_pg, aviVersion)
                 if get_management_data_pg[0] is None:
                     current_app.logger.error(
@@ -340,10 +342,10 @@ def configCloud():
                         "STATUS_CODE": 500
                     }
                     return jsonify(d), 500
-                startIp = request.get_json(force=True)["tkgMgmtDataNetwork"]["tkgMgmtAviServiceIpStartRange"]
-                endIp = request.get_json(force=True)["tkgMgmtDataNetwork"]["tkgMgmtAviServiceIpEndRange"]
+                startIp = RequestSpec.json()["tkgMgmtDataNetwork"]["tkgMgmtAviServiceIpStartRange"]
+                endIp = RequestSpec.json()["tkgMgmtDataNetwork"]["tkgMgmtAviServiceIpEndRange"]
                 prefixIpNetmask = seperateNetmaskAndIp(
-                    request.get_json(force=True)["tkgMgmtDataNetwork"]["tkgMgmtDataNetworkGatewayCidr"])
+                    RequestSpec.json()["tkgMgmtDataNetwork"]["tkgMgmtDataNetworkGatewayCidr"])
                 getManagementDetails_data_pg = getNetworkDetails(ip, csrf2, get_management_data_pg[0], startIp, endIp,
                                                                  prefixIpNetmask[0], prefixIpNetmask[1], aviVersion)
                 if getManagementDetails_data_pg[0] is None:
@@ -369,7 +371,7 @@ def configCloud():
                             "STATUS_CODE": 500
                         }
                         return jsonify(d), 500
-            mgmt_pg = request.get_json(force=True)['tkgComponentSpec']['tkgClusterVipNetwork'][
+            mgmt_pg = RequestSpec.json()['tkgComponentSpec']['tkgClusterVipNetwork'][
                 'tkgClusterVipNetworkName']
             get_vip = getNetworkUrl(ip, csrf2, mgmt_pg, aviVersion)
             if get_vip[0] is None:
@@ -436,7 +438,7 @@ def configCloud():
                         "STATUS_CODE": 500
                     }
                     return jsonify(d), 500
-                cluster_name = request.get_json(force=True)["envSpec"]["vcenterDetails"]["vcenterCluster"]
+                cluster_name = RequestSpec.json()["envSpec"]["vcenterDetails"]["vcenterCluster"]
                 cluster_status = getClusterUrl(ip, csrf2, cluster_name, aviVersion)
                 if cluster_status[0] is None:
                     current_app.logger.error("Failed to get cluster details" + str(cluster_status[1]))
@@ -527,7 +529,7 @@ def configCloud():
             else:
                 se_cloud_url_workload = get_se_cloud_workload[0]
             if env == Env.VSPHERE:
-                mgmt_name = request.get_json(force=True)["tkgComponentSpec"]["tkgMgmtComponents"]["tkgMgmtNetworkName"]
+                mgmt_name = RequestSpec.json()["tkgComponentSpec"]["tkgMgmtComponents"]["tkgMgmtNetworkName"]
                 dhcp = enableDhcpForManagementNetwork(ip, csrf2, mgmt_name, aviVersion)
                 if dhcp[0] is None:
                     current_app.logger.error("Failed to enable dhcp " + str(dhcp[1]))
@@ -538,7 +540,7 @@ def configCloud():
                     }
                     return jsonify(d), 500
         # if env == Env.VCF:
-        # shared_service_name = request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
+        # shared_service_name = RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
         # 'tkgSharedserviceNetworkName']
         # dhcp = enableDhcpForSharedNetwork(ip, csrf2, shared_service_name, aviVersion)
         # if dhcp[0] is None:
@@ -564,13 +566,13 @@ def configCloud():
             if uuid is None:
                 return None, "NOT_FOUND"
             prefixIpNetmask_vip = seperateNetmaskAndIp(
-                request.get_json(force=True)['tkgComponentSpec']["tkgClusterVipNetwork"][
+                RequestSpec.json()['tkgComponentSpec']["tkgClusterVipNetwork"][
                     "tkgClusterVipNetworkGatewayCidr"])
             tier1 = ""
             vrf_url = ""
             if env == Env.VSPHERE:
                 ipNetMask = seperateNetmaskAndIp(
-                    request.get_json(force=True)["tkgComponentSpec"]["aviMgmtNetwork"]["aviMgmtNetworkGatewayCidr"])
+                    RequestSpec.json()["tkgComponentSpec"]["aviMgmtNetwork"]["aviMgmtNetworkGatewayCidr"])
                 vrf = getVrfAndNextRoutId(ip, csrf2, uuid, VrfType.MANAGEMENT, ipNetMask[0], aviVersion)
                 if vrf[0] is None or vrf[1] == "NOT_FOUND":
                     current_app.logger.error("Vrf not found " + str(vrf[1]))
@@ -591,7 +593,7 @@ def configCloud():
                         }
                         return jsonify(d), 500
                 prefixIpNetmask_vip = seperateNetmaskAndIp(
-                    request.get_json(force=True)['tkgComponentSpec']["tkgClusterVipNetwork"][
+                    RequestSpec.json()['tkgComponentSpec']["tkgClusterVipNetwork"][
                         "tkgClusterVipNetworkGatewayCidr"])
                 list_ = [prefixIpNetmask[0], prefixIpNetmask_vip[0]]
                 for l in list_:
@@ -654,7 +656,7 @@ def configCloud():
                             "STATUS_CODE": 500
                         }
                         return jsonify(d), 500
-                teir1name = str(request.get_json(force=True)['envSpec']['vcenterDetails']["nsxtTier1RouterDisplayName"])
+                teir1name = str(RequestSpec.json()['envSpec']['vcenterDetails']["nsxtTier1RouterDisplayName"])
                 vrf_vip = getVrfAndNextRoutId(ip, csrf2, uuid, teir1name, prefixIpNetmask_vip[0], aviVersion)
                 if vrf_vip[0] is None or vrf_vip[1] == "NOT_FOUND":
                     current_app.logger.error("Cluster vip Vrf not found " + str(vrf_vip[1]))
@@ -732,7 +734,7 @@ def configCloud():
                 else:
                     ipam_url = get_ipam[0]
                 dns_profile_name = "tkg-nsxt-dns"
-                search_domain = request.get_json(force=True)['envSpec']['infraComponents']['searchDomains']
+                search_domain = RequestSpec.json()['envSpec']['infraComponents']['searchDomains']
                 get_dns = getIpam(ip, csrf2, dns_profile_name, aviVersion)
                 if get_dns[0] is None:
                     current_app.logger.error("Failed to get se Ipam " + str(get_dns[1]))
@@ -818,7 +820,7 @@ def enable_wcp():
     vcenter_username = current_app.config['VC_USER']
     vcenter_ip = current_app.config['VC_IP']
 
-    subs_lib_name = request.get_json(force=True)['tkgsComponentSpec']['tkgsMgmtNetworkSpec']['subscribedContentLibraryName']
+    subs_lib_name = RequestSpec.json()['tkgsComponentSpec']['tkgsMgmtNetworkSpec']['subscribedContentLibraryName']
     if not subs_lib_name:
         cLib = createSubscribedLibrary(vcenter_ip, vcenter_username, password, env)
         if cLib[0] is None:
@@ -829,13 +831,13 @@ def enable_wcp():
                 "STATUS_CODE": 500
             }
             return jsonify(d), 500
-    avi_fqdn = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviController01Fqdn']
+    avi_fqdn = RequestSpec.json()['tkgsComponentSpec']['aviComponents']['aviController01Fqdn']
     if not avi_fqdn:
         controller_name = ControllerLocation.CONTROLLER_NAME_VSPHERE
     else:
         controller_name = avi_fqdn
     if isAviHaEnabled(env):
-        ip = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviClusterFqdn']
+        ip = RequestSpec.json()['tkgsComponentSpec']['aviComponents']['aviClusterFqdn']
     else:
         ip = avi_fqdn
     if ip is None:
@@ -912,7 +914,7 @@ def enable_wcp():
         "Content-Type": "application/json",
         "vmware-api-session-id": session_id
     }
-    cluster_name = request.get_json(force=True)["envSpec"]["vcenterDetails"]["vcenterCluster"]
+    cluster_name = RequestSpec.json()["envSpec"]["vcenterDetails"]["vcenterCluster"]
     id = getClusterID(vcenter_ip, vcenter_username, password, cluster_name)
     if id[1] != 200:
         return None, id[0]
@@ -993,7 +995,7 @@ def updateIpam(ip, csrf2, newCloudUrl, aviVersion):
         "x-avi-version": aviVersion,
         "x-csrftoken": csrf2[0]
     }
-    response_csrf = requests.request("PUT", newCloudUrl, headers=headers, data=json_object, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("PUT", newCloudUrl, headers=headers, data=json_object, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -1030,7 +1032,7 @@ def enableDhcpForManagementNetwork(ip, csrf2, name, aviVersion):
         "x-avi-version": aviVersion,
         "x-csrftoken": csrf2[0]
     }
-    response_csrf = requests.request("PUT", getNetwork[0], headers=headers, data=json_object_m, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("PUT", getNetwork[0], headers=headers, data=json_object_m, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     return "SUCCESS", 200
@@ -1066,7 +1068,7 @@ def enableDhcpForSharedNetwork(ip, csrf2, name, aviVersion):
         "x-avi-version": aviVersion,
         "x-csrftoken": csrf2[0]
     }
-    response_csrf = requests.request("PUT", getNetwork[0], headers=headers, data=json_object_m, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("PUT", getNetwork[0], headers=headers, data=json_object_m, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     return "SUCCESS", 200
@@ -1083,7 +1085,7 @@ def getClusterUrl(ip, csrf2, cluster_name, aviVersion):
     }
     url = "https://" + ip + "/api/vimgrclusterruntime"
     payload = {}
-    response_csrf = requests.request("GET", url, headers=headers, data=payload, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -1116,8 +1118,7 @@ def configTkgMgmt():
             "STATUS_CODE": 500
         }
         return jsonify(d), 500
-    json_dict = request.get_json(force=True)
-    vsSpec = VsphereMasterSpec.parse_obj(json_dict)
+    vsSpec = RequestSpec.model(VsphereMasterSpec)
     env = env[0]
     aviVersion = get_avi_version(env)
     password = current_app.config['VC_PASSWORD']
@@ -1156,9 +1157,9 @@ def configTkgMgmt():
             "STATUS_CODE": 500
         }
         return jsonify(d), 500
-    avi_fqdn = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController01Fqdn']
+    avi_fqdn = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviController01Fqdn']
     if isAviHaEnabled(env):
-        ip = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviClusterFqdn']
+        ip = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviClusterFqdn']
     else:
         ip = avi_fqdn
     if ip is None:
@@ -1179,9 +1180,9 @@ def configTkgMgmt():
         }
         return jsonify(d), 500
     if env == Env.VSPHERE:
-        data_network = request.get_json(force=True)["tkgMgmtDataNetwork"]["tkgMgmtDataNetworkName"]
+        data_network = RequestSpec.json()["tkgMgmtDataNetwork"]["tkgMgmtDataNetworkName"]
     else:
-        data_network =  request.get_json(force=True)['tkgComponentSpec']['tkgClusterVipNetwork'][
+        data_network =  RequestSpec.json()['tkgComponentSpec']['tkgClusterVipNetwork'][
             'tkgClusterVipNetworkName']
     get_wip = getVipNetworkIpNetMask(ip, csrf2, data_network, aviVersion)
     if get_wip[0] is None or get_wip[0] == "NOT_FOUND":
@@ -1192,10 +1193,10 @@ def configTkgMgmt():
             "STATUS_CODE": 500
         }
         return jsonify(d), 500
-    management_cluster = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+    management_cluster = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
         'tkgMgmtClusterName']
-    avi_ip = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController01Ip']
-    avi_fqdn = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController01Fqdn']
+    avi_ip = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviController01Ip']
+    avi_fqdn = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviController01Fqdn']
     if not avi_ip:
         controller_fqdn = ip
     elif not avi_fqdn:
@@ -1269,7 +1270,7 @@ def configTkgMgmt():
                 return jsonify(d), 500
             current_app.logger.info("Successfully validated Pinniped service status")
             identity_mgmt_type = str(
-                request.get_json(force=True)["tkgComponentSpec"]["identityManagementSpec"]["identityManagementType"])
+                RequestSpec.json()["tkgComponentSpec"]["identityManagementSpec"]["identityManagementType"])
             if identity_mgmt_type.lower() == "ldap":
                 check_pinniped_dexsvc = checkPinnipedDexServiceStatus()
                 if check_pinniped_dexsvc[1] != 200:
@@ -1283,16 +1284,16 @@ def configTkgMgmt():
                 current_app.logger.info("External IP for Pinniped is set as: " + check_pinniped_svc[0])
 
             cluster_admin_users = \
-                request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents']['tkgMgmtRbacUserRoleSpec'][
+                RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents']['tkgMgmtRbacUserRoleSpec'][
                     'clusterAdminUsers']
             admin_users = \
-                request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents']['tkgMgmtRbacUserRoleSpec'][
+                RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents']['tkgMgmtRbacUserRoleSpec'][
                     'adminUsers']
             edit_users = \
-                request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents']['tkgMgmtRbacUserRoleSpec'][
+                RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents']['tkgMgmtRbacUserRoleSpec'][
                     'editUsers']
             view_users = \
-                request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents']['tkgMgmtRbacUserRoleSpec'][
+                RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents']['tkgMgmtRbacUserRoleSpec'][
                     'viewUsers']
             rbac_user_status = createRbacUsers(management_cluster, isMgmt=True, env=env, edit_users=edit_users,
                                                cluster_admin_users=cluster_admin_users, admin_users=admin_users,
@@ -1310,7 +1311,7 @@ def configTkgMgmt():
         else:
             current_app.logger.info("Identity Management is not enabled")
 
-    tmc_required = str(request.get_json(force=True)['envSpec']["saasEndpoints"]['tmcDetails']['tmcAvailability'])
+    tmc_required = str(RequestSpec.json()['envSpec']["saasEndpoints"]['tmcDetails']['tmcAvailability'])
     if tmc_required.lower() == "true":
         current_app.logger.info("TMC registration is enabled")
     elif tmc_required.lower() == "false":
@@ -1327,7 +1328,7 @@ def configTkgMgmt():
         if checkTmcEnabled(env):
             if Tkg_version.TKG_VERSION == "1.6":
                 current_app.logger.info("TMC registration on management cluster is supported on tanzu 1.5")
-                clusterGroup = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+                clusterGroup = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
                     'tkgMgmtClusterGroupName']
                 if not clusterGroup:
                     clusterGroup = "default"
@@ -1365,7 +1366,7 @@ def configTkgMgmt():
             }
             return jsonify(d), 500
         air_gapped_repo = str(
-            request.get_json(force=True)['envSpec']['customRepositorySpec']['tkgCustomImageRepository'])
+            RequestSpec.json()['envSpec']['customRepositorySpec']['tkgCustomImageRepository'])
         air_gapped_repo = air_gapped_repo.replace("https://", "").replace("http://", "")
         bom = loadBomFile()
         if bom is None:
@@ -1409,7 +1410,7 @@ def configTkgMgmt():
 
 def referenceTkgMNetwork(ip, csrf2, url, aviVersion):
     reference_TKG_Mgmt_Network_ipNetmask = seperateNetmaskAndIp(
-        request.get_json(force=True)['tkgComponentSpec']['aviMgmtNetwork'][
+        RequestSpec.json()['tkgComponentSpec']['aviMgmtNetwork'][
             'aviMgmtNetworkGatewayCidr'])
     headers = {
         "Accept": "application/json",
@@ -1438,7 +1439,7 @@ def referenceTkgMNetwork(ip, csrf2, url, aviVersion):
             }
     json_object = json.dumps(body, indent=4)
     url = "https://" + ip + "/api/network"
-    response_csrf = requests.request("POST", url, headers=headers, data=json_object, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("POST", url, headers=headers, data=json_object, verify=False)
     if response_csrf.status_code != 201:
         return None, response_csrf.text
     else:
@@ -1456,7 +1457,7 @@ def waitForCloudPlacementReady(ip, csrf2, name, aviVersion):
     }
     url = "https://" + ip + "/api/cloud"
     body = {}
-    response_csrf = requests.request("GET", url, headers=headers, data=body, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=body, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     uuid = None
@@ -1470,7 +1471,7 @@ def waitForCloudPlacementReady(ip, csrf2, name, aviVersion):
     count = 0
     response_csrf = None
     while count < 60:
-        response_csrf = requests.request("GET", status_url, headers=headers, data=body, verify=False)
+        response_csrf = AviClient.for_controller(ip).request("GET", status_url, headers=headers, data=body, verify=False)
         if response_csrf.status_code != 200:
             return None, "Failed", "Error"
         try:
@@ -1528,7 +1529,7 @@ def createNewCloud(ip, csrf2, aviVersion):
     }
     json_object = json.dumps(body, indent=4)
     url = "https://" + ip + "/api/cloud"
-    response_csrf = requests.request("POST", url, headers=headers, data=json_object, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("POST", url, headers=headers, data=json_object, verify=False)
     if response_csrf.status_code != 201:
         return None, response_csrf.text
     else:
@@ -1569,7 +1570,7 @@ def getNetworkUrl(ip, csrf2, name, aviVersion):
     response_csrf = None
     try:
         while count < 60:
-            response_csrf = requests.request("GET", url, headers=headers, data=payload, verify=False)
+            response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload, verify=False)
             if response_csrf.status_code == 200:
                 if response_csrf.json()["count"] > 1:
                     break
@@ -1590,7 +1591,7 @@ def getNetworkUrl(ip, csrf2, name, aviVersion):
             else:
                 next_url = None if not response_csrf.json()["next"] else response_csrf.json()["next"]
                 while len(next_url) > 0:
-                    response_csrf = requests.request("GET", next_url, headers=headers, data=payload, verify=False)
+                    response_csrf = AviClient.for_controller(ip).request("GET", next_url, headers=headers, data=payload, verify=False)
                     for se in response_csrf.json()["results"]:
                         if se["config"]["name"] == name:
                             return se["config"]["url"], se["config"]["uuid"], "FOUND", "SUCCESS"
@@ -1611,7 +1612,7 @@ def getNetworkDetailsDhcp(ip, csrf2, managementNetworkUrl, aviVersion):
         "x-csrftoken": csrf2[0]
     }
     payload = {}
-    response_csrf = requests.request("GET", url, headers=headers, data=payload, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload, verify=False)
     if response_csrf.status_code != 200:
         return None, "Failed"
     os.system("rm -rf managementNetworkDetailsDhcp.json")
@@ -1632,7 +1633,7 @@ def getNetworkDetailsSharedDhcp(ip, csrf2, managementNetworkUrl, aviVersion):
         "x-csrftoken": csrf2[0]
     }
     payload = {}
-    response_csrf = requests.request("GET", url, headers=headers, data=payload, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload, verify=False)
     if response_csrf.status_code != 200:
         return None, "Failed"
     os.system("rm -rf sharedNetworkDetailsDhcp.json")
@@ -1653,7 +1654,7 @@ def getNetworkDetails(ip, csrf2, managementNetworkUrl, startIp, endIp, prefixIp,
         "x-csrftoken": csrf2[0]
     }
     payload = {}
-    response_csrf = requests.request("GET", url, headers=headers, data=payload, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload, verify=False)
     details = {}
     if response_csrf.status_code != 200:
         details["error"] = response_csrf.text
@@ -1687,7 +1688,7 @@ def getNsxTNetworkDetails(ip, csrf2, managementNetworkUrl, startIp, endIp, prefi
         "x-csrftoken": csrf2[0]
     }
     payload = {}
-    response_csrf = requests.request("GET", url, headers=headers, data=payload, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload, verify=False)
     details = {}
     if response_csrf.status_code != 200:
         details["error"] = response_csrf.text
@@ -1725,7 +1726,7 @@ def getNetworkDetailsVip(ip, csrf2, vipNetworkUrl, startIp, endIp, prefixIp, net
         "x-csrftoken": csrf2[0]
     }
     payload = {}
-    response_csrf = requests.request("GET", url, headers=headers, data=payload, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload, verify=False)
     details = {}
     if response_csrf.status_code != 200:
         details["error"] = response_csrf.text
@@ -1758,7 +1759,7 @@ def getNSXTNetworkDetailsVip(ip, csrf2, vipNetworkUrl, startIp, endIp, prefixIp,
         "x-csrftoken": csrf2[0]
     }
     payload = {}
-    response_csrf = requests.request("GET", url, headers=headers, data=payload, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload, verify=False)
     details = {}
     if response_csrf.status_code != 200:
         details["error"] = response_csrf.text
@@ -1802,14 +1803,14 @@ def updateNetworkWithIpPools(ip, csrf2, managementNetworkUrl, fileName, aviVersi
         "x-csrftoken": csrf2[0]
     }
     details = {}
-    response_csrf = requests.request("PUT", url, headers=headers, data=json_object_m, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("PUT", url, headers=headers, data=json_object_m, verify=False)
     if response_csrf.status_code != 200:
         count = 0
         if response_csrf.text.__contains__(
                 "Cannot edit network properties till network sync from Service Engines is complete"):
             while count < 10:
                 time.sleep(60)
-                response_csrf = requests.request("PUT", url, headers=headers, data=json_object_m, verify=False)
+                response_csrf = AviClient.for_controller(ip).request("PUT", url, headers=headers, data=json_object_m, verify=False)
                 if response_csrf.status_code == 200:
                     break
                 current_app.logger.info("waited for " + str(count * 60) + "s sync to complete")
@@ -2216,7 +2217,7 @@ def createSECloud(ip, csrf2, newCloudUrl, seGroupName, clusterUrl, dataStore, av
     }
     json_object = getSeNewBody(newCloudUrl, seGroupName, clusterUrl, dataStore)
     url = "https://" + ip + "/api/serviceenginegroup"
-    response_csrf = requests.request("POST", url, headers=headers, data=json_object, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("POST", url, headers=headers, data=json_object, verify=False)
     if response_csrf.status_code != 201:
         return None, response_csrf.text
     else:
@@ -2295,7 +2296,7 @@ def createNsxtSECloud(ip, csrf2, newCloudUrl, seGroupName, nsx_cloud_info, aviVe
     }
     url = "https://" + ip + "/api/serviceenginegroup"
     json_object = json.dumps(body, indent=4)
-    response_csrf = requests.request("POST", url, headers=headers, data=json_object, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("POST", url, headers=headers, data=json_object, verify=False)
     if response_csrf.status_code != 201:
         return None, response_csrf.text
     else:
@@ -2313,7 +2314,7 @@ def getIpam(ip, csrf2, name, aviVersion):
     }
     body = {}
     url = "https://" + ip + "/api/ipamdnsproviderprofile"
-    response_csrf = requests.request("GET", url, headers=headers, data=body, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=body, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -2364,7 +2365,7 @@ def createIpam(ip, csrf2, managementNetworkUrl, managementDataNetwork, vip_netwo
     }
     json_object = json.dumps(body, indent=4)
     url = "https://" + ip + "/api/ipamdnsproviderprofile"
-    response_csrf = requests.request("POST", url, headers=headers, data=json_object, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("POST", url, headers=headers, data=json_object, verify=False)
     if response_csrf.status_code != 201:
         return None, response_csrf.text
     else:
@@ -2387,7 +2388,7 @@ def updateIpam_profile(ip, csrf2, network_name, aviVersion):
             ipam_obj = ipam
             break
     ipam_url = ipam_obj["url"]
-    response_csrf = requests.request("GET", ipam_url, headers=headers, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", ipam_url, headers=headers, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     update = response_csrf.json()
@@ -2413,7 +2414,7 @@ def updateIpam_profile(ip, csrf2, network_name, aviVersion):
     with open("./ipam_details_get.json", 'r') as file2:
         updated_body = json.load(file2)
     json_object = json.dumps(updated_body, indent=4)
-    response_csrf = requests.request("PUT", ipam_url, headers=headers, data=json_object, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("PUT", ipam_url, headers=headers, data=json_object, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -2431,7 +2432,7 @@ def getDetailsOfNewCloud(ip, csrf2, newCloudUrl, vim_ref, captured_ip, captured_
     }
     payload = {}
     url = newCloudUrl
-    response_csrf = requests.request("GET", url, headers=headers, data=payload, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -2456,7 +2457,7 @@ def getDetailsOfNewCloudAddIpam(ip, csrf2, newCloudUrl, ipamUrl, aviVersion):
     }
     payload = {}
     url = newCloudUrl
-    response_csrf = requests.request("GET", url, headers=headers, data=payload, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -2484,7 +2485,7 @@ def updateNewCloud(ip, csrf2, newCloudUrl, aviVersion):
         "x-avi-version": aviVersion,
         "x-csrftoken": csrf2[0]
     }
-    response_csrf = requests.request("PUT", newCloudUrl, headers=headers, data=json_object, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("PUT", newCloudUrl, headers=headers, data=json_object, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -2494,9 +2495,7 @@ def updateNewCloud(ip, csrf2, newCloudUrl, aviVersion):
 def generateConfigYaml(ip, datacenter, datastoreName, cluster_name, wpName, wipIpNetmask, _vcenter_ip,
                        _vcenter_username,
                        _password, env):
-    getBase64CertWriteToFile(ip, "443")
-    with open('cert.txt', 'r') as file2:
-        cert = file2.readline()
+    cert = getBase64CertWriteToFile(ip, "443")
     yaml_str = """\
     AVI_CA_DATA_B64: %s
     AVI_CLOUD_NAME: %s
@@ -2539,19 +2538,16 @@ def generateConfigYaml(ip, datacenter, datastoreName, cluster_name, wpName, wipI
     AVI_MANAGEMENT_CLUSTER_VIP_NETWORK_NAME: %s
     AVI_MANAGEMENT_CLUSTER_VIP_NETWORK_CIDR: %s
     """
-    str_enc_avi = str(request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviPasswordBase64'])
-    base64_bytes = str_enc_avi.encode('ascii')
-    enc_bytes = base64.b64decode(base64_bytes)
-    password_avi = enc_bytes.decode('ascii').rstrip("\n")
+    password_avi = RequestSpec.secret("tkgComponentSpec", "aviComponents", "aviPasswordBase64")
     _base64_bytes = password_avi.encode('ascii')
     _enc_bytes = base64.b64encode(_base64_bytes)
     str_enc_avi = _enc_bytes.decode('ascii')
-    management_cluster = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+    management_cluster = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
         'tkgMgmtClusterName']
     datastore_path = "/" + datacenter + "/datastore/" + datastoreName
     vsphere_folder_path = "/" + datacenter + "/vm/" + ResourcePoolAndFolderName.TKG_Mgmt_Components_Folder_VSPHERE
-    mgmt_network = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents']['tkgMgmtNetworkName']
-    parent_resourcePool = request.get_json(force=True)['envSpec']['vcenterDetails']["resourcePoolName"]
+    mgmt_network = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents']['tkgMgmtNetworkName']
+    parent_resourcePool = RequestSpec.json()['envSpec']['vcenterDetails']["resourcePoolName"]
     if parent_resourcePool:
         vsphere_rp = "/" + datacenter + "/host/" + cluster_name + "/Resources/" + parent_resourcePool + "/" + ResourcePoolAndFolderName.TKG_Mgmt_RP_VSPHERE
     else:
@@ -2564,17 +2560,17 @@ def generateConfigYaml(ip, datacenter, datastoreName, cluster_name, wpName, wipI
     vcenter_ip = _vcenter_ip
     vcenter_username = _vcenter_username
     avi_cluster_vip_name = str(
-        request.get_json(force=True)['tkgComponentSpec']['tkgClusterVipNetwork']['tkgClusterVipNetworkName'])
+        RequestSpec.json()['tkgComponentSpec']['tkgClusterVipNetwork']['tkgClusterVipNetworkName'])
     with open("vip_ip.txt", "r") as e:
         vip_ip = e.read()
     avi_cluster_vip_network_gateway_cidr = vip_ip
-    control_plan = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+    control_plan = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
         'tkgMgmtDeploymentType']
-    size = str(request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents']['tkgMgmtSize'])
-    clustercidr = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents']['tkgMgmtClusterCidr']
-    servicecidr = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents']['tkgMgmtServiceCidr']
+    size = str(RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents']['tkgMgmtSize'])
+    clustercidr = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents']['tkgMgmtClusterCidr']
+    servicecidr = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents']['tkgMgmtServiceCidr']
     try:
-        osName = str(request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents']['tkgMgmtBaseOs'])
+        osName = str(RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents']['tkgMgmtBaseOs'])
         if osName == "photon":
             osVersion = "3"
         elif osName == "ubuntu":
@@ -2611,9 +2607,9 @@ def generateConfigYaml(ip, datacenter, datastoreName, cluster_name, wpName, wipI
     TKG_NO_PROXY: %s
             """
             proxy_str = yaml_str + yaml_str_proxy
-            httpProxy = str(request.get_json(force=True)['envSpec']['proxySpec']['tkgMgmt']['httpProxy'])
-            httpsProxy = str(request.get_json(force=True)['envSpec']['proxySpec']['tkgMgmt']['httpsProxy'])
-            noProxy = str(request.get_json(force=True)['envSpec']['proxySpec']['tkgMgmt']['noProxy'])
+            httpProxy = str(RequestSpec.json()['envSpec']['proxySpec']['tkgMgmt']['httpProxy'])
+            httpsProxy = str(RequestSpec.json()['envSpec']['proxySpec']['tkgMgmt']['httpsProxy'])
+            noProxy = str(RequestSpec.json()['envSpec']['proxySpec']['tkgMgmt']['noProxy'])
             noProxy = noProxy.strip("\n").strip(" ").strip("\r")
             formatted = proxy_str % (
                 cert, Cloud.CLOUD_NAME_VSPHERE, ip, wpName, wipIpNetmask, AkoType.KEY, AkoType.VALUE,
@@ -2631,25 +2627,23 @@ def generateConfigYaml(ip, datacenter, datastoreName, cluster_name, wpName, wipI
             """
             airgapped_str = yaml_str + yaml_str_airgapped
             air_gapped_repo = str(
-                request.get_json(force=True)['envSpec']['customRepositorySpec']['tkgCustomImageRepository'])
+                RequestSpec.json()['envSpec']['customRepositorySpec']['tkgCustomImageRepository'])
             air_gapped_repo = air_gapped_repo.replace("https://", "").replace("http://", "")
-            os.putenv("TKG_BOM_IMAGE_TAG", Tkg_version.TAG)
-            os.putenv("TKG_CUSTOM_IMAGE_REPOSITORY", air_gapped_repo)
-            isSelfsinged = str(request.get_json(force=True)['envSpec']['customRepositorySpec'][
+            os.environ["TKG_BOM_IMAGE_TAG"] = Tkg_version.TAG
+            os.environ["TKG_CUSTOM_IMAGE_REPOSITORY"] = air_gapped_repo
+            isSelfsinged = str(RequestSpec.json()['envSpec']['customRepositorySpec'][
                                    'tkgCustomImageRepositoryPublicCaCert'])
             if isSelfsinged.lower() == "false":
                 s = """
     TKG_CUSTOM_IMAGE_REPOSITORY_SKIP_TLS_VERIFY: "False"
     TKG_CUSTOM_IMAGE_REPOSITORY_CA_CERTIFICATE: %s
                 """
-                os.putenv("TKG_CUSTOM_IMAGE_REPOSITORY_SKIP_TLS_VERIFY", "False")
+                os.environ["TKG_CUSTOM_IMAGE_REPOSITORY_SKIP_TLS_VERIFY"] = "False"
                 airgapped_str = airgapped_str + s
                 url = air_gapped_repo[:air_gapped_repo.find("/")]
-                getBase64CertWriteToFile(grabHostFromUrl(air_gapped_repo), grabPortFromUrl(air_gapped_repo))
-                with open('cert.txt', 'r') as file2:
-                    repo_cert = file2.readline()
+                repo_cert = getBase64CertWriteToFile(grabHostFromUrl(air_gapped_repo), grabPortFromUrl(air_gapped_repo))
                 repo_certificate = repo_cert
-                os.putenv("TKG_CUSTOM_IMAGE_REPOSITORY_CA_CERTIFICATE", repo_certificate)
+                os.environ["TKG_CUSTOM_IMAGE_REPOSITORY_CA_CERTIFICATE"] = repo_certificate
                 formatted = airgapped_str % (
                     cert, Cloud.CLOUD_NAME_VSPHERE, ip, wpName, wipIpNetmask, AkoType.KEY, AkoType.VALUE,
                     str_enc_avi,
@@ -2665,7 +2659,7 @@ def generateConfigYaml(ip, datacenter, datastoreName, cluster_name, wpName, wipI
                 s = """
     TKG_CUSTOM_IMAGE_REPOSITORY_SKIP_TLS_VERIFY: "False"
                 """
-                os.putenv("TKG_CUSTOM_IMAGE_REPOSITORY_SKIP_TLS_VERIFY", "False")
+                os.environ["TKG_CUSTOM_IMAGE_REPOSITORY_SKIP_TLS_VERIFY"] = "False"
                 airgapped_str = airgapped_str + s
                 formatted = airgapped_str % (
                     cert, Cloud.CLOUD_NAME_VSPHERE, ip, wpName, wipIpNetmask, AkoType.KEY, AkoType.VALUE,
@@ -2697,9 +2691,9 @@ def generateConfigYaml(ip, datacenter, datastoreName, cluster_name, wpName, wipI
 def templateMgmtDeployYaml(ip, datacenter, avi_version, data_store, cluster_name, wpName, wipIpNetmask, vcenter_ip,
                            vcenter_username,
                            password, env, vsSpec):
-    cluster_vip_name = request.get_json(force=True)['tkgComponentSpec']['tkgClusterVipNetwork'][
+    cluster_vip_name = RequestSpec.json()['tkgComponentSpec']['tkgClusterVipNetwork'][
             'tkgClusterVipNetworkName']
-    cluster_vip_cidr = request.get_json(force=True)['tkgComponentSpec']['tkgClusterVipNetwork'][
+    cluster_vip_cidr = RequestSpec.json()['tkgComponentSpec']['tkgClusterVipNetwork'][
         'tkgClusterVipNetworkGatewayCidr']
     mgmt_group_name = Cloud.SE_GROUP_NAME_VSPHERE
     workload_group_name = Cloud.SE_WORKLOAD_GROUP_NAME_VSPHERE
@@ -2736,8 +2730,7 @@ def templateMgmtDeployYaml(ip, datacenter, avi_version, data_store, cluster_name
             }
             return jsonify(d), 500
         tier1_path = status_tier1
-    deploy_yaml = FileHelper.read_resource(Paths.TKG_MGMT_SPEC_J2)
-    t = Template(deploy_yaml)
+    t = TemplateRegistry.get(Paths.TKG_MGMT_SPEC_J2)
     datastore_path = "/" + datacenter + "/datastore/" + data_store
     vsphere_folder_path = "/" + datacenter + "/vm/" + ResourcePoolAndFolderName.TKG_Mgmt_Components_Folder_VSPHERE
     str_enc = str(password)
@@ -2759,14 +2752,14 @@ def templateMgmtDeployYaml(ip, datacenter, avi_version, data_store, cluster_name
     control_plane_mem_mb = ""
     proxyCert = ""
     try:
-        proxyCert_raw = request.get_json(force=True)['envSpec']['proxySpec']['tkgMgmt']['proxyCert']
+        proxyCert_raw = RequestSpec.json()['envSpec']['proxySpec']['tkgMgmt']['proxyCert']
         base64_bytes = base64.b64encode(proxyCert_raw.encode("utf-8"))
         proxyCert = str(base64_bytes, "utf-8")
         isProxy = "true"
     except:
         isProxy = "false"
         current_app.logger.info("Proxy certificate for  Management is not provided")
-    ciep = str(request.get_json(force=True)['envSpec']["ceipParticipation"])
+    ciep = str(RequestSpec.json()['envSpec']["ceipParticipation"])
     if size.lower() == "small":
         current_app.logger.debug("Recommended size for Management cluster nodes is: medium/large/extra-large/custom")
         pass
@@ -2777,11 +2770,11 @@ def templateMgmtDeployYaml(ip, datacenter, avi_version, data_store, cluster_name
     elif size.lower() == "extra-large":
         pass
     elif size.lower() == "custom":
-        control_plane_vcpu = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+        control_plane_vcpu = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
             'tkgMgmtCpuSize']
-        control_plane_disk_gb = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+        control_plane_disk_gb = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
             'tkgMgmtStorageSize']
-        control_plane_mem_gb = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+        control_plane_mem_gb = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
             'tkgMgmtMemorySize']
         control_plane_mem_mb = str(int(control_plane_mem_gb) * 1024)
     else:
@@ -2794,7 +2787,7 @@ def templateMgmtDeployYaml(ip, datacenter, avi_version, data_store, cluster_name
         }
         return jsonify(d), 500
     try:
-        osName = str(request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents']['tkgMgmtBaseOs'])
+        osName = str(RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents']['tkgMgmtBaseOs'])
         if osName == "photon":
             osVersion = "3"
         elif osName == "ubuntu":
@@ -2811,38 +2804,36 @@ def templateMgmtDeployYaml(ip, datacenter, avi_version, data_store, cluster_name
     if checkAirGappedIsEnabled(env):
         air_gapped_repo = vsSpec.envSpec.customRepositorySpec.tkgCustomImageRepository
         air_gapped_repo = air_gapped_repo.replace("https://", "").replace("http://", "")
-        os.putenv("TKG_BOM_IMAGE_TAG", Tkg_version.TAG)
-        os.putenv("TKG_CUSTOM_IMAGE_REPOSITORY", air_gapped_repo)
-        os.putenv("TKG_CUSTOM_IMAGE_REPOSITORY_SKIP_TLS_VERIFY", "False")
-        getBase64CertWriteToFile(grabHostFromUrl(air_gapped_repo), grabPortFromUrl(air_gapped_repo))
-        with open('cert.txt', 'r') as file2:
-            repo_cert = file2.readline()
+        os.environ["TKG_BOM_IMAGE_TAG"] = Tkg_version.TAG
+        os.environ["TKG_CUSTOM_IMAGE_REPOSITORY"] = air_gapped_repo
+        os.environ["TKG_CUSTOM_IMAGE_REPOSITORY_SKIP_TLS_VERIFY"] = "False"
+        repo_cert = getBase64CertWriteToFile(grabHostFromUrl(air_gapped_repo), grabPortFromUrl(air_gapped_repo))
         repo_certificate = repo_cert
-        os.putenv("TKG_CUSTOM_IMAGE_REPOSITORY_CA_CERTIFICATE", repo_certificate)
+        os.environ["TKG_CUSTOM_IMAGE_REPOSITORY_CA_CERTIFICATE"] = repo_certificate
     if checkEnableIdentityManagement(env):
         try:
             identity_mgmt_type = str(
-                request.get_json(force=True)["tkgComponentSpec"]["identityManagementSpec"]["identityManagementType"])
+                RequestSpec.json()["tkgComponentSpec"]["identityManagementSpec"]["identityManagementType"])
             if identity_mgmt_type.lower() == "oidc":
                 oidc_provider_client_id = str(
-                    request.get_json(force=True)["tkgComponentSpec"]["identityManagementSpec"]["oidcSpec"][
+                    RequestSpec.json()["tkgComponentSpec"]["identityManagementSpec"]["oidcSpec"][
                         "oidcClientId"])
                 oidc_provider_client_secret = str(
-                    request.get_json(force=True)["tkgComponentSpec"]["identityManagementSpec"]["oidcSpec"][
+                    RequestSpec.json()["tkgComponentSpec"]["identityManagementSpec"]["oidcSpec"][
                         "oidcClientSecret"])
                 oidc_provider_groups_claim = str(
-                    request.get_json(force=True)["tkgComponentSpec"]["identityManagementSpec"]["oidcSpec"][
+                    RequestSpec.json()["tkgComponentSpec"]["identityManagementSpec"]["oidcSpec"][
                         "oidcGroupsClaim"])
                 oidc_provider_issuer_url = str(
-                    request.get_json(force=True)["tkgComponentSpec"]["identityManagementSpec"]["oidcSpec"][
+                    RequestSpec.json()["tkgComponentSpec"]["identityManagementSpec"]["oidcSpec"][
                         "oidcIssuerUrl"])
                 ## TODO: check if provider name is required -- NOT REQUIRED
-                # oidc_provider_name = str(request.get_json(force=True))
+                # oidc_provider_name = str(RequestSpec.json())
                 oidc_provider_scopes = str(
-                    request.get_json(force=True)["tkgComponentSpec"]["identityManagementSpec"]["oidcSpec"][
+                    RequestSpec.json()["tkgComponentSpec"]["identityManagementSpec"]["oidcSpec"][
                         "oidcScopes"])
                 oidc_provider_username_claim = str(
-                    request.get_json(force=True)["tkgComponentSpec"]["identityManagementSpec"]["oidcSpec"][
+                    RequestSpec.json()["tkgComponentSpec"]["identityManagementSpec"]["oidcSpec"][
                         "oidcUsernameClaim"])
                 FileHelper.write_to_file(
                     t.render(config=vsSpec, avi_cert=get_base64_cert(ip), ip=ip, wpName=wpName,
@@ -2869,36 +2860,33 @@ def templateMgmtDeployYaml(ip, datacenter, avi_version, data_store, cluster_name
                     Paths.CLUSTER_PATH + management_cluster + "/management_cluster_vsphere.yaml")
             ## TODO: add ldap code here
             elif identity_mgmt_type.lower() == "ldap":
-                ldap_endpoint_ip = str(request.get_json(force=True)["tkgComponentSpec"]["identityManagementSpec"]
+                ldap_endpoint_ip = str(RequestSpec.json()["tkgComponentSpec"]["identityManagementSpec"]
                                        ["ldapSpec"]["ldapEndpointIp"])
-                ldap_endpoint_port = str(request.get_json(force=True)["tkgComponentSpec"]["identityManagementSpec"]
+                ldap_endpoint_port = str(RequestSpec.json()["tkgComponentSpec"]["identityManagementSpec"]
                                          ["ldapSpec"]["ldapEndpointPort"])
-                str_enc = str(request.get_json(force=True)["tkgComponentSpec"]["identityManagementSpec"]["ldapSpec"][
-                                  "ldapBindPWBase64"])
-                base64_bytes = str_enc.encode('ascii')
-                enc_bytes = base64.b64decode(base64_bytes)
-                ldap_endpoint_bind_pw = enc_bytes.decode('ascii').rstrip("\n")
+                ldap_endpoint_bind_pw = RequestSpec.secret("tkgComponentSpec", "identityManagementSpec", "ldapSpec",
+                                                           "ldapBindPWBase64")
                 ldap_bind_dn = str(
-                    request.get_json(force=True)["tkgComponentSpec"]["identityManagementSpec"]["ldapSpec"][
+                    RequestSpec.json()["tkgComponentSpec"]["identityManagementSpec"]["ldapSpec"][
                         "ldapBindDN"])
                 ldap_user_search_base_dn = str(
-                    request.get_json(force=True)["tkgComponentSpec"]["identityManagementSpec"]
+                    RequestSpec.json()["tkgComponentSpec"]["identityManagementSpec"]
                     ["ldapSpec"]["ldapUserSearchBaseDN"])
-                ldap_user_search_filter = str(request.get_json(force=True)["tkgComponentSpec"]
+                ldap_user_search_filter = str(RequestSpec.json()["tkgComponentSpec"]
                                               ["identityManagementSpec"]["ldapSpec"]["ldapUserSearchFilter"])
-                ldap_user_search_uname = str(request.get_json(force=True)["tkgComponentSpec"]
+                ldap_user_search_uname = str(RequestSpec.json()["tkgComponentSpec"]
                                              ["identityManagementSpec"]["ldapSpec"]["ldapUserSearchUsername"])
-                ldap_grp_search_base_dn = str(request.get_json(force=True)["tkgComponentSpec"]
+                ldap_grp_search_base_dn = str(RequestSpec.json()["tkgComponentSpec"]
                                               ["identityManagementSpec"]["ldapSpec"]["ldapGroupSearchBaseDN"])
-                ldap_grp_search_filter = str(request.get_json(force=True)["tkgComponentSpec"]
+                ldap_grp_search_filter = str(RequestSpec.json()["tkgComponentSpec"]
                                              ["identityManagementSpec"]["ldapSpec"]["ldapGroupSearchFilter"])
-                ldap_grp_search_user_attr = str(request.get_json(force=True)["tkgComponentSpec"]
+                ldap_grp_search_user_attr = str(RequestSpec.json()["tkgComponentSpec"]
                                                 ["identityManagementSpec"]["ldapSpec"]["ldapGroupSearchUserAttr"])
-                ldap_grp_search_grp_attr = str(request.get_json(force=True)["tkgComponentSpec"]
+                ldap_grp_search_grp_attr = str(RequestSpec.json()["tkgComponentSpec"]
                                                ["identityManagementSpec"]["ldapSpec"]["ldapGroupSearchGroupAttr"])
-                ldap_grp_search_name_attr = str(request.get_json(force=True)["tkgComponentSpec"]
+                ldap_grp_search_name_attr = str(RequestSpec.json()["tkgComponentSpec"]
                                                 ["identityManagementSpec"]["ldapSpec"]["ldapGroupSearchNameAttr"])
-                ldap_root_ca_data = str(request.get_json(force=True)["tkgComponentSpec"]
+                ldap_root_ca_data = str(RequestSpec.json()["tkgComponentSpec"]
                                         ["identityManagementSpec"]["ldapSpec"]["ldapRootCAData"])
                 if not ldap_user_search_base_dn:
                     current_app.logger.error("Please provide ldapUserSearchBaseDN for installing pinniped")
@@ -2983,7 +2971,7 @@ def deployManagementCluster(management_cluster, ip, data_center, data_store, clu
             #                    vcenter_username,
             #                    password, env)
             current_app.logger.info("Deploying management cluster")
-            os.putenv("DEPLOY_TKG_ON_VSPHERE7", "true")
+            os.environ["DEPLOY_TKG_ON_VSPHERE7"] = "true"
             listOfCmd = ["tanzu", "management-cluster", "create", "-y", "--file",
                          Paths.CLUSTER_PATH + management_cluster + "/management_cluster_vsphere.yaml",
                          "-v",
@@ -3008,12 +2996,12 @@ def seperateNetmaskAndIp(cidr):
 
 def updateVipNetworkIpPools(ip, csrf2, get_vip, aviVersion):
     try:
-        startIp = request.get_json(force=True)["tkgComponentSpec"]['tkgClusterVipNetwork'][
+        startIp = RequestSpec.json()["tkgComponentSpec"]['tkgClusterVipNetwork'][
             "tkgClusterVipIpStartRange"]
-        endIp = request.get_json(force=True)["tkgComponentSpec"]['tkgClusterVipNetwork'][
+        endIp = RequestSpec.json()["tkgComponentSpec"]['tkgClusterVipNetwork'][
             "tkgClusterVipIpEndRange"]
         prefixIpNetmask = seperateNetmaskAndIp(
-            request.get_json(force=True)["tkgComponentSpec"]['tkgClusterVipNetwork'][
+            RequestSpec.json()["tkgComponentSpec"]['tkgClusterVipNetwork'][
                 "tkgClusterVipNetworkGatewayCidr"])
         env = envCheck()
         env = env[0]
@@ -3102,17 +3090,11 @@ def getCloudConnectUser(ip, headers):
 def createCloudConnectUser(ip, headers):
     url = "https://" + ip + "/api/cloudconnectoruser"
     try:
-        vcenter_username = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterSsoUser']
-        str_enc = str(request.get_json(force=True)['envSpec']['vcenterDetails']["vcenterSsoPasswordBase64"])
-        base64_bytes = str_enc.encode('ascii')
-        enc_bytes = base64.b64decode(base64_bytes)
-        password = enc_bytes.decode('ascii').rstrip("\n")
-
-        str_enc_nsx = str(request.get_json(force=True)['envSpec']['vcenterDetails']["nsxtUserPasswordBase64"])
-        base64_bytes_nsx = str_enc_nsx.encode('ascii')
-        enc_bytes_nsx = base64.b64decode(base64_bytes_nsx)
-        password_nsx = enc_bytes_nsx.decode('ascii').rstrip("\n")
-        nsx_user = request.get_json(force=True)['envSpec']['vcenterDetails']["nsxtUser"]
+        vcenter_username = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterSsoUser']
+        password = RequestSpec.secret("envSpec", "vcenterDetails", "vcenterSsoPasswordBase64")
+
+        password_nsx = RequestSpec.secret("envSpec", "vcenterDetails", "nsxtUserPasswordBase64")
+        nsx_user = RequestSpec.json()['envSpec']['vcenterDetails']["nsxtUser"]
         list_body = []
         body_nsx = {
             "name": NSXtCloud.NSXT_CREDENTIALS,
@@ -3174,10 +3156,10 @@ def createCloudConnectUser(ip, headers):
 
 def fetchContentLibrary(ip, headers, vcenter_credential):
     try:
-        vc_Content_Library_name = request.get_json(force=True)['envSpec']['vcenterDetails']["contentLibraryName"]
+        vc_Content_Library_name = RequestSpec.json()['envSpec']['vcenterDetails']["contentLibraryName"]
         if not vc_Content_Library_name:
             vc_Content_Library_name = ControllerLocation.CONTROLLER_CONTENT_LIBRARY
-        vCenter = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterAddress']
+        vCenter = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterAddress']
         url = "https://" + ip + "/api/vcenter/contentlibraries"
         body = {
             "host": vCenter,
@@ -3198,8 +3180,8 @@ def fetchContentLibrary(ip, headers, vcenter_credential):
 def fetchTier1GatewayId(ip, headers, nsxt_credential):
     try:
         url = "https://" + ip + "/api/nsxt/tier1s"
-        teir1name = str(request.get_json(force=True)['envSpec']['vcenterDetails']["nsxtTier1RouterDisplayName"])
-        address = str(request.get_json(force=True)['envSpec']['vcenterDetails']["nsxtAddress"])
+        teir1name = str(RequestSpec.json()['envSpec']['vcenterDetails']["nsxtTier1RouterDisplayName"])
+        address = str(RequestSpec.json()['envSpec']['vcenterDetails']["nsxtAddress"])
         body = {
             "host": address,
             "credentials_uuid": nsxt_credential
@@ -3219,8 +3201,8 @@ def fetchTier1GatewayId(ip, headers, nsxt_credential):
 def fetchTransportZoneId(ip, headers, nsxt_credential):
     try:
         url = "https://" + ip + "/api/nsxt/transportzones"
-        overlay = str(request.get_json(force=True)['envSpec']['vcenterDetails']["nsxtOverlay"])
-        address = str(request.get_json(force=True)['envSpec']['vcenterDetails']["nsxtAddress"])
+        overlay = str(RequestSpec.json()['envSpec']['vcenterDetails']["nsxtOverlay"])
+        address = str(RequestSpec.json()['envSpec']['vcenterDetails']["nsxtAddress"])
         body = {
             "host": address,
             "credentials_uuid": nsxt_credential
@@ -3240,7 +3222,7 @@ def fetchTransportZoneId(ip, headers, nsxt_credential):
 def fetchVcenterId(ip, headers, nsxt_credential, tz_id):
     try:
         url = "https://" + ip + "/api/nsxt/vcenters"
-        address = str(request.get_json(force=True)['envSpec']['vcenterDetails']["nsxtAddress"])
+        address = str(RequestSpec.json()['envSpec']['vcenterDetails']["nsxtAddress"])
         body = {
             "host": address,
             "credentials_uuid": nsxt_credential,
@@ -3260,7 +3242,7 @@ def fetchVcenterId(ip, headers, nsxt_credential, tz_id):
 def fetchSegmentsId(ip, headers, nsxt_credential, tz_id, tier1_id):
     try:
         url = "https://" + ip + "/api/nsxt/segments"
-        address = str(request.get_json(force=True)['envSpec']['vcenterDetails']["nsxtAddress"])
+        address = str(RequestSpec.json()['envSpec']['vcenterDetails']["nsxtAddress"])
         body = {
             "host": address,
             "credentials_uuid": nsxt_credential,
@@ -3272,8 +3254,8 @@ def fetchSegmentsId(ip, headers, nsxt_credential, tz_id, tier1_id):
         if response_csrf.status_code != 200:
             return None, response_csrf.text
         segId = {}
-        avi_mgmt = request.get_json(force=True)['tkgComponentSpec']['aviMgmtNetwork']['aviMgmtNetworkName']
-        tkg_cluster_vip_name = request.get_json(force=True)['tkgComponentSpec']['tkgClusterVipNetwork'][
+        avi_mgmt = RequestSpec.json()['tkgComponentSpec']['aviMgmtNetwork']['aviMgmtNetworkName']
+        tkg_cluster_vip_name = RequestSpec.json()['tkgComponentSpec']['tkgClusterVipNetwork'][
             'tkgClusterVipNetworkName']
         for library in response_csrf.json()["resource"]["nsxt_segments"]:
             if library["name"] == avi_mgmt:
@@ -3316,7 +3298,7 @@ def createNsxtCloud(ip, csrf2, aviVersion):
         if seg_id is None:
             return None, status_seg
         status, value = getCloudConnectUser(ip, headers)
-        address = str(request.get_json(force=True)['envSpec']['vcenterDetails']["nsxtAddress"])
+        address = str(RequestSpec.json()['envSpec']['vcenterDetails']["nsxtAddress"])
         if isinstance(value, tuple):
             nsx_url = value[2]
         else:
@@ -3369,7 +3351,7 @@ def createNsxtCloud(ip, csrf2, aviVersion):
         }
         json_object = json.dumps(body, indent=4)
         url = "https://" + ip + "/api/cloud"
-        response_csrf = requests.request("POST", url, headers=headers, data=json_object, verify=False)
+        response_csrf = AviClient.for_controller(ip).request("POST", url, headers=headers, data=json_object, verify=False)
         if response_csrf.status_code != 201:
             return None, response_csrf.text
         else:
@@ -3408,7 +3390,7 @@ def configureVcenterInNSXTCloud(ip, csrf2, cloud_url, aviVersion):
             "x-csrftoken": csrf2[0]
         }
         payload = {}
-        response_csrf = requests.request("GET", get_url, headers=headers, data=payload, verify=False)
+        response_csrf = AviClient.for_controller(ip).request("GET", get_url, headers=headers, data=payload, verify=False)
         if response_csrf.status_code != 200:
             return None, response_csrf.text
         vc_info = {}
@@ -3429,10 +3411,10 @@ def configureVcenterInNSXTCloud(ip, csrf2, cloud_url, aviVersion):
                 "vcenter_uuid": vc_info["vc_uuid"]
             }
             payload = json.dumps(payload, indent=4)
-            response_csrf = requests.request("POST", cluster_url, headers=headers, data=payload, verify=False)
+            response_csrf = AviClient.for_controller(ip).request("POST", cluster_url, headers=headers, data=payload, verify=False)
             if response_csrf.status_code != 200:
                 return None, response_csrf.text
-            cluster_name = request.get_json(force=True)["envSpec"]["vcenterDetails"]["vcenterCluster"]
+            cluster_name = RequestSpec.json()["envSpec"]["vcenterDetails"]["vcenterCluster"]
             for cluster in response_csrf.json()["resource"]["nsxt_clusters"]:
                 if cluster["name"] == cluster_name:
                     vc_info["cluster"] = cluster["vc_mobj_id"]
@@ -3444,7 +3426,7 @@ def configureVcenterInNSXTCloud(ip, csrf2, cloud_url, aviVersion):
                 return None, cred
             vcenter_credential = cred["vcenterUUId"]
             nsxt_credential = cred["nsxUUid"]
-            vc_Content_Library_name = request.get_json(force=True)['envSpec']['vcenterDetails']["contentLibraryName"]
+            vc_Content_Library_name = RequestSpec.json()['envSpec']['vcenterDetails']["contentLibraryName"]
             if not vc_Content_Library_name:
                 vc_Content_Library_name = ControllerLocation.CONTROLLER_CONTENT_LIBRARY
             library, status_lib = fetchContentLibrary(ip, headers, vcenter_credential)
@@ -3468,7 +3450,7 @@ def configureVcenterInNSXTCloud(ip, csrf2, cloud_url, aviVersion):
                 "vcenter_url": status_vc
             }
             payload = json.dumps(payload, indent=4)
-            response_csrf = requests.request("POST", url, headers=headers, data=payload, verify=False)
+            response_csrf = AviClient.for_controller(ip).request("POST", url, headers=headers, data=payload, verify=False)
             if response_csrf.status_code != 201:
                 return None, response_csrf.text
             vc_info["vcenter_url"] = response_csrf.json()["url"]
@@ -3479,10 +3461,10 @@ def configureVcenterInNSXTCloud(ip, csrf2, cloud_url, aviVersion):
                 "vcenter_uuid": vc_info["vc_uuid"]
             }
             payload = json.dumps(payload, indent=4)
-            response_csrf = requests.request("POST", cluster_url, headers=headers, data=payload, verify=False)
+            response_csrf = AviClient.for_controller(ip).request("POST", cluster_url, headers=headers, data=payload, verify=False)
             if response_csrf.status_code != 200:
                 return None, response_csrf.text
-            cluster_name = request.get_json(force=True)["envSpec"]["vcenterDetails"]["vcenterCluster"]
+            cluster_name = RequestSpec.json()["envSpec"]["vcenterDetails"]["vcenterCluster"]
             for cluster in response_csrf.json()["resource"]["nsxt_clusters"]:
                 if cluster["name"] == cluster_name:
                     vc_info["cluster"] = cluster["vc_mobj_id"]
@@ -3519,7 +3501,7 @@ def createIpam_nsxtCloud(ip, csrf2, managementNetworkUrl, vipNetwork, ipam_name,
         }
         json_object = json.dumps(body, indent=4)
         url = "https://" + ip + "/api/ipamdnsproviderprofile"
-        response_csrf = requests.request("POST", url, headers=headers, data=json_object, verify=False)
+        response_csrf = AviClient.for_controller(ip).request("POST", url, headers=headers, data=json_object, verify=False)
         if response_csrf.status_code != 201:
             return None, response_csrf.text
         else:
@@ -3554,7 +3536,7 @@ def createDns_nsxtCloud(ip, csrf2, dns_domain, dns_profile_name, aviVersion):
         }
         json_object = json.dumps(body, indent=4)
         url = "https://" + ip + "/api/ipamdnsproviderprofile"
-        response_csrf = requests.request("POST", url, headers=headers, data=json_object, verify=False)
+        response_csrf = AviClient.for_controller(ip).request("POST", url, headers=headers, data=json_object, verify=False)
         if response_csrf.status_code != 201:
             return None, response_csrf.text
         else:
@@ -3577,7 +3559,7 @@ def associate_ipam_nsxtCloud(ip, csrf2, aviVersion, nsxtCloud_uuid, ipamUrl, dns
         payload = {}
 
         url = "https://" + ip + "/api/cloud/" + nsxtCloud_uuid
-        cloud_details_response = requests.request("GET", url, headers=headers, data=payload, verify=False)
+        cloud_details_response = AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload, verify=False)
         if cloud_details_response.status_code != 200:
             return None, "Failed to fetch IPAM details for NSXT Cloud"
 
@@ -3587,7 +3569,7 @@ def associate_ipam_nsxtCloud(ip, csrf2, aviVersion, nsxtCloud_uuid, ipamUrl, dns
         json_response.update(ipam_details)
         json_object = json.dumps(json_response, indent=4)
 
-        response = requests.request("PUT", url, headers=headers, data=json_object, verify=False)
+        response = AviClient.for_controller(ip).request("PUT", url, headers=headers, data=json_object, verify=False)
         if response.status_code != 200:
             return None, response.text
 
@@ -3615,9 +3597,9 @@ def config_orchestrated(env, vcenter_ip, vcenter_username, password, data_center
             "STATUS_CODE": 500
         }
         return jsonify(d), 500
-    avi_fqdn = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController01Fqdn']
+    avi_fqdn = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviController01Fqdn']
     if isAviHaEnabled(env):
-        ip = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviClusterIp']
+        ip = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviClusterIp']
     else:
         ip = avi_fqdn
     if ip is None:
@@ -3713,7 +3695,7 @@ def config_orchestrated(env, vcenter_ip, vcenter_username, password, data_center
     else:
         se_cloud_url = get_se_cloud[0]
 
-    data_network = request.get_json(force=True)["tkgMgmtDataNetwork"]["tkgMgmtDataNetworkName"]
+    data_network = RequestSpec.json()["tkgMgmtDataNetwork"]["tkgMgmtDataNetworkName"]
     get_wip = getVipNetwork(ip, csrf2, data_network, aviVersion)
     if get_wip[0] is None:
         current_app.logger.error("Failed to get se vip network " + str(get_wip[1]))
@@ -3746,7 +3728,7 @@ def config_orchestrated(env, vcenter_ip, vcenter_username, password, data_center
         wip_cluster_url = ""
 
     if Tkg_version.TKG_VERSION == "1.6":
-        cluster_vip = request.get_json(force=True)['tkgComponentSpec']["tkgClusterVipNetwork"][
+        cluster_vip = RequestSpec.json()['tkgComponentSpec']["tkgClusterVipNetwork"][
             "tkgClusterVipNetworkName"]
         get__cluster_wip = getVipNetwork(ip, csrf2, cluster_vip,
                                          aviVersion)
@@ -3779,12 +3761,12 @@ def config_orchestrated(env, vcenter_ip, vcenter_username, password, data_center
                 "Created New cluster VIP network " + cluster_vip)
         else:
             wip_cluster_url = get__cluster_wip[0]
-    startIp = request.get_json(force=True)["tkgComponentSpec"]['tkgClusterVipNetwork'][
+    startIp = RequestSpec.json()["tkgComponentSpec"]['tkgClusterVipNetwork'][
         "tkgClusterVipIpStartRange"]
-    endIp = request.get_json(force=True)["tkgComponentSpec"]['tkgClusterVipNetwork'][
+    endIp = RequestSpec.json()["tkgComponentSpec"]['tkgClusterVipNetwork'][
         "tkgClusterVipIpEndRange"]
     prefixIpNetmask = seperateNetmaskAndIp(
-        request.get_json(force=True)["tkgComponentSpec"]['tkgClusterVipNetwork'][
+        RequestSpec.json()["tkgComponentSpec"]['tkgClusterVipNetwork'][
             "tkgClusterVipNetworkGatewayCidr"])
     getVIPNetworkDetails = getNetworkDetailsVip(ip, csrf2, wip_cluster_url, startIp, endIp, prefixIpNetmask[0],
                                                 prefixIpNetmask[1], aviVersion)
@@ -4190,12 +4172,12 @@ def controllerDeployment(ip, csrf2, data_center, data_store, cluster_name, vcent
         return None, "NOT_FOUND"
     if type == Type.WORKLOAD:
         ipNetMask = seperateNetmaskAndIp(
-            request.get_json(force=True)["tkgWorkloadDataNetwork"]["tkgWorkloadDataNetworkGatewayCidr"])
+            RequestSpec.json()["tkgWorkloadDataNetwork"]["tkgWorkloadDataNetworkGatewayCidr"])
     else:
         ipNetMask = seperateNetmaskAndIp(
-            request.get_json(force=True)['tkgMgmtDataNetwork']['tkgMgmtDataNetworkGatewayCidr'])
+            RequestSpec.json()['tkgMgmtDataNetwork']['tkgMgmtDataNetworkGatewayCidr'])
         ipNetMask_ = seperateNetmaskAndIp(
-            request.get_json(force=True)['tkgComponentSpec']["tkgClusterVipNetwork"][
+            RequestSpec.json()['tkgComponentSpec']["tkgClusterVipNetwork"][
                 "tkgClusterVipNetworkGatewayCidr"])
         vrf = getVrfAndNextRoutId(ip, csrf2, uuid, VrfType.GLOBAL, ipNetMask_[0], aviVersion)
         if vrf[0] is None or vrf[1] == "NOT_FOUND":
@@ -4249,10 +4231,10 @@ def controllerDeployment(ip, csrf2, data_center, data_store, cluster_name, vcent
 
 def pushSeOvaToVcenter(vcenter_ip, vcenter_username, password, data_center, data_store,
                        cluster_name, avi_uuid):
-    os.putenv("GOVC_URL", "https://" + vcenter_ip + "/sdk")
-    os.putenv("GOVC_USERNAME", vcenter_username)
-    os.putenv("GOVC_PASSWORD", password)
-    os.putenv("GOVC_INSECURE", "true")
+    os.environ["GOVC_URL"] = "https://" + vcenter_ip + "/sdk"
+    os.environ["GOVC_USERNAME"] = vcenter_username
+    os.environ["GOVC_PASSWORD"] = password
+    os.environ["GOVC_INSECURE"] = "true"
     parent_resourcepool = current_app.config['RESOURCE_POOL']
     if parent_resourcepool is not None:
         rp_pool = data_center + "/host/" + cluster_name + "/Resources/" + parent_resourcepool + "/" + ResourcePoolAndFolderName.AVI_RP.replace(
@@ -4277,10 +4259,10 @@ def pushSeOvaToVcenter(vcenter_ip, vcenter_username, password, data_center, data
 
 
 def replaceNetworkValues(ip, aviAuthToken, clusterUUid, file_name):
-    tkg_management = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents']['tkgMgmtNetworkName']
-    avi_management = request.get_json(force=True)['tkgComponentSpec']['aviMgmtNetwork']['aviMgmtNetworkName']
-    avi_data_pg = request.get_json(force=True)['tkgMgmtDataNetwork']['tkgMgmtDataNetworkName']
-    tkg_cluster_vip_name = request.get_json(force=True)['tkgComponentSpec']['tkgClusterVipNetwork'][
+    tkg_management = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents']['tkgMgmtNetworkName']
+    avi_management = RequestSpec.json()['tkgComponentSpec']['aviMgmtNetwork']['aviMgmtNetworkName']
+    avi_data_pg = RequestSpec.json()['tkgMgmtDataNetwork']['tkgMgmtDataNetworkName']
+    tkg_cluster_vip_name = RequestSpec.json()['tkgComponentSpec']['tkgClusterVipNetwork'][
         'tkgClusterVipNetworkName']
     property_mapping = {
         "AVICNTRL": ip,
@@ -4332,7 +4314,7 @@ def createSECloud_Arch(ip, csrf2, newCloudUrl, seGroupName, aviVersion):
     }
     json_object = getNewBody(newCloudUrl, seGroupName)
     url = "https://" + ip + "/api/serviceenginegroup"
-    response_csrf = requests.request("POST", url, headers=headers, data=json_object, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("POST", url, headers=headers, data=json_object, verify=False)
     if response_csrf.status_code != 201:
         return None, response_csrf.text
     else:
@@ -4532,14 +4514,14 @@ def getNewBody(newCloudUrl, seGroupName):
 def createVipNetwork(ip, csrf2, newCloudUrl, name, type, aviVersion):
     if type == Type.WORKLOAD:
         ipNetMask = seperateNetmaskAndIp(
-            request.get_json(force=True)["tkgWorkloadDataNetwork"]["tkgWorkloadDataNetworkGatewayCidr"])
-        start_ip = request.get_json(force=True)["tkgWorkloadDataNetwork"]["tkgWorkloadAviServiceIpStartRange"]
-        end_ip = request.get_json(force=True)["tkgWorkloadDataNetwork"]["tkgWorkloadAviServiceIpEndRange"]
+            RequestSpec.json()["tkgWorkloadDataNetwork"]["tkgWorkloadDataNetworkGatewayCidr"])
+        start_ip = RequestSpec.json()["tkgWorkloadDataNetwork"]["tkgWorkloadAviServiceIpStartRange"]
+        end_ip = RequestSpec.json()["tkgWorkloadDataNetwork"]["tkgWorkloadAviServiceIpEndRange"]
     else:
         ipNetMask = seperateNetmaskAndIp(
-            request.get_json(force=True)['tkgMgmtDataNetwork']['tkgMgmtDataNetworkGatewayCidr'])
-        start_ip = request.get_json(force=True)['tkgMgmtDataNetwork']['tkgMgmtAviServiceIpStartRange']
-        end_ip = request.get_json(force=True)['tkgMgmtDataNetwork']['tkgMgmtAviServiceIpEndRange']
+            RequestSpec.json()['tkgMgmtDataNetwork']['tkgMgmtDataNetworkGatewayCidr'])
+        start_ip = RequestSpec.json()['tkgMgmtDataNetwork']['tkgMgmtAviServiceIpStartRange']
+        end_ip = RequestSpec.json()['tkgMgmtDataNetwork']['tkgMgmtAviServiceIpEndRange']
     headers = {
         "Accept": "application/json",
         "Content-Type": "application/json",
@@ -4583,7 +4565,7 @@ def createVipNetwork(ip, csrf2, newCloudUrl, name, type, aviVersion):
             }
     json_object = json.dumps(body, indent=4)
     url = "https://" + ip + "/api/network"
-    response_csrf = requests.request("POST", url, headers=headers, data=json_object, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("POST", url, headers=headers, data=json_object, verify=False)
     if response_csrf.status_code != 201:
         return None, response_csrf.text
     else:
@@ -4592,11 +4574,11 @@ def createVipNetwork(ip, csrf2, newCloudUrl, name, type, aviVersion):
 
 def createClusterVipNetwork(ip, csrf2, newCloudUrl, name, aviVersion):
     ipNetMask = seperateNetmaskAndIp(
-        request.get_json(force=True)['tkgComponentSpec']['tkgClusterVipNetwork'][
+        RequestSpec.json()['tkgComponentSpec']['tkgClusterVipNetwork'][
             'tkgClusterVipNetworkGatewayCidr'])
-    start_ip = request.get_json(force=True)['tkgComponentSpec']['tkgClusterVipNetwork'][
+    start_ip = RequestSpec.json()['tkgComponentSpec']['tkgClusterVipNetwork'][
         'tkgClusterVipIpStartRange']
-    end_ip = request.get_json(force=True)['tkgComponentSpec']['tkgClusterVipNetwork'][
+    end_ip = RequestSpec.json()['tkgComponentSpec']['tkgClusterVipNetwork'][
         'tkgClusterVipIpEndRange']
     headers = {
         "Accept": "application/json",
@@ -4641,7 +4623,7 @@ def createClusterVipNetwork(ip, csrf2, newCloudUrl, name, aviVersion):
             }
     json_object = json.dumps(body, indent=4)
     url = "https://" + ip + "/api/network"
-    response_csrf = requests.request("POST", url, headers=headers, data=json_object, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("POST", url, headers=headers, data=json_object, verify=False)
     if response_csrf.status_code != 201:
         return None, response_csrf.text
     else:
@@ -4706,7 +4688,7 @@ def createIpam_Arch(ip, csrf2, vipNetworkUrl, clusterVip, name, aviVersion):
         }
     json_object = json.dumps(body, indent=4)
     url = "https://" + ip + "/api/ipamdnsproviderprofile"
-    response_csrf = requests.request("POST", url, headers=headers, data=json_object, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("POST", url, headers=headers, data=json_object, verify=False)
     if response_csrf.status_code != 201:
         return None, response_csrf.text
     else:
@@ -4724,7 +4706,7 @@ def getDetailsOfNewCloud_Arch(ip, csrf2, newCloudUrl, newIpamUrl, seGroupUrl, av
     }
     payload = {}
     url = newCloudUrl
-    response_csrf = requests.request("GET", url, headers=headers, data=payload, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -4740,12 +4722,12 @@ def getDetailsOfNewCloud_Arch(ip, csrf2, newCloudUrl, newIpamUrl, seGroupUrl, av
 
 
 def replaceNetworkValuesWorkload(ip, aviAuthToken, clusterUUid, file_name):
-    tkg_management = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents']['tkgMgmtNetworkName']
-    avi_management = request.get_json(force=True)['tkgComponentSpec']['aviMgmtNetwork']['aviMgmtNetworkName']
-    avi_data_pg = request.get_json(force=True)['tkgMgmtDataNetwork']['tkgMgmtDataNetworkName']
-    tkg_cluster_vip_name = request.get_json(force=True)['tkgComponentSpec']['tkgClusterVipNetwork'][
+    tkg_management = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents']['tkgMgmtNetworkName']
+    avi_management = RequestSpec.json()['tkgComponentSpec']['aviMgmtNetwork']['aviMgmtNetworkName']
+    avi_data_pg = RequestSpec.json()['tkgMgmtDataNetwork']['tkgMgmtDataNetworkName']
+    tkg_cluster_vip_name = RequestSpec.json()['tkgComponentSpec']['tkgClusterVipNetwork'][
         'tkgClusterVipNetworkName']
-    workload_vip = request.get_json(force=True)['tkgWorkloadDataNetwork']['tkgWorkloadDataNetworkName']
+    workload_vip = RequestSpec.json()['tkgWorkloadDataNetwork']['tkgWorkloadDataNetworkName']
     property_mapping = {
         "AVICNTRL": ip,
         "AVICNTRL_AUTHTOKEN": aviAuthToken,
@@ -4772,10 +4754,10 @@ def replaceNetworkValuesWorkload(ip, aviAuthToken, clusterUUid, file_name):
 
 def deploySeEngines(vcenter_ip, vcenter_username, password, ip, aviAuthToken, clusterUUid, data_center, data_store,
                     cluster_name, file_name, engine_name, type):
-    os.putenv("GOVC_URL", "https://" + vcenter_ip + "/sdk")
-    os.putenv("GOVC_USERNAME", vcenter_username)
-    os.putenv("GOVC_PASSWORD", password)
-    os.putenv("GOVC_INSECURE", "true")
+    os.environ["GOVC_URL"] = "https://" + vcenter_ip + "/sdk"
+    os.environ["GOVC_USERNAME"] = vcenter_username
+    os.environ["GOVC_PASSWORD"] = password
+    os.environ["GOVC_INSECURE"] = "true"
     replaceValueSysConfig(file_name, "Name", "name", engine_name)
     if type == Type.WORKLOAD:
         replaceNetworkValuesWorkload(ip, aviAuthToken, clusterUUid, file_name)
@@ -4861,7 +4843,7 @@ def listAllServiceEngine(ip, csrf2, countSe, name, controllerName, vcenter_ip, v
             except:
                 pass
             current_app.logger.info("Waited for " + str(count * 10) + "s retrying")
-            response_csrf = requests.request("GET", url, headers=headers, data=payload, verify=False)
+            response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload, verify=False)
             if response_csrf.status_code == 200:
                 if response_csrf.json()["count"] > countSe:
                     for se in response_csrf.json()["results"]:
@@ -4914,7 +4896,7 @@ def createNewCloud_Arch(ip, csrf2, aviVersion):
             }
     json_object = json.dumps(body, indent=4)
     url = "https://" + ip + "/api/cloud"
-    response_csrf = requests.request("POST", url, headers=headers, data=json_object, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("POST", url, headers=headers, data=json_object, verify=False)
     if response_csrf.status_code != 201:
         return None, response_csrf.text
     else:
@@ -4944,7 +4926,7 @@ def changeSeGroupAndSetInterfaces(ip, csrf2, urlFromServiceEngine, se_cloud_url,
     with open(file_name, 'r') as openfile:
         json_object = json.load(openfile)
     json_object_m = json.dumps(json_object, indent=4)
-    response_csrf = requests.request("PUT", url, headers=headers, data=json_object_m, verify=False, timeout=600)
+    response_csrf = AviClient.for_controller(ip).request("PUT", url, headers=headers, data=json_object_m, verify=False, timeout=600)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: BSD-2-Clause
 
 import logging
-from flask import jsonify, request
+from flask import jsonify
 from flask import current_app
 import sys
 import time
@@ -33,6 +33,8 @@ from common.common_utilities import getClusterID, getAviCertificate, getLibraryI
     updateNewCloud, configureKubectl
 from common.operation.vcenter_operations import getDvPortGroupId
 from requests.packages.urllib3.exceptions import InsecureRequestWarning
+from common.util.avi_client import AviClient
+from common.util.request_spec import RequestSpec
 from common.operation.ShellHelper import runShellCommandAndReturnOutputAsList
 
 requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
@@ -81,22 +83,22 @@ def configTkgsCloud(ip, csrf2, aviVersion):
             url = cloud_url
             current_app.logger.info("Waiting for 1 min status == ready")
             time.sleep(60)
-            response_csrf = requests.request("PUT", url, headers=headers, data=json_object, verify=False)
+            response_csrf = AviClient.for_controller(ip).request("PUT", url, headers=headers, data=json_object, verify=False)
             if response_csrf.status_code != 200:
                 return None, response_csrf.text
             else:
                 os.system("rm -rf newCloudInfo.json")
                 with open("./newCloudInfo.json", "w") as outfile:
                     json.dump(response_csrf.json(), outfile)
-        mgmt_pg = request.get_json(force=True)['tkgsComponentSpec']['aviMgmtNetwork']['aviMgmtNetworkName']
+        mgmt_pg = RequestSpec.json()['tkgsComponentSpec']['aviMgmtNetwork']['aviMgmtNetworkName']
         get_management = getNetworkUrl(ip, csrf2, mgmt_pg, Cloud.DEFAULT_CLOUD_NAME_VSPHERE, aviVersion)
         if get_management[0] is None:
             return None, "Failed to get avi management network " + str(get_management[1])
-        startIp = request.get_json(force=True)["tkgsComponentSpec"]["aviMgmtNetwork"][
+        startIp = RequestSpec.json()["tkgsComponentSpec"]["aviMgmtNetwork"][
             "aviMgmtServiceIpStartRange"]
-        endIp = request.get_json(force=True)["tkgsComponentSpec"]["aviMgmtNetwork"]["aviMgmtServiceIpEndRange"]
+        endIp = RequestSpec.json()["tkgsComponentSpec"]["aviMgmtNetwork"]["aviMgmtServiceIpEndRange"]
         prefixIpNetmask = seperateNetmaskAndIp(
-            request.get_json(force=True)["tkgsComponentSpec"]["aviMgmtNetwork"]["aviMgmtNetworkGatewayCidr"])
+            RequestSpec.json()["tkgsComponentSpec"]["aviMgmtNetwork"]["aviMgmtNetworkGatewayCidr"])
         getManagementDetails = getNetworkDetails(ip, csrf2, get_management[0], startIp, endIp, prefixIpNetmask[0],
                                                  prefixIpNetmask[1], True, aviVersion)
         if getManagementDetails[0] is None:
@@ -135,7 +137,7 @@ def configTkgsCloud(ip, csrf2, aviVersion):
             current_app.logger.error(Cloud.DEFAULT_CLOUD_NAME_VSPHERE + " cloud not found")
             return None, "NOT_FOUND"
         ipNetMask = seperateNetmaskAndIp(
-            request.get_json(force=True)["tkgsComponentSpec"]["aviMgmtNetwork"]["aviMgmtNetworkGatewayCidr"])
+            RequestSpec.json()["tkgsComponentSpec"]["aviMgmtNetwork"]["aviMgmtNetworkGatewayCidr"])
         vrf = getVrfAndNextRoutId(ip, csrf2, uuid, VrfType.MANAGEMENT, ipNetMask[0], aviVersion)
         if vrf[0] is None or vrf[1] == "NOT_FOUND":
             current_app.logger.error("Vrf not found " + str(vrf[1]))
@@ -146,14 +148,14 @@ def configTkgsCloud(ip, csrf2, aviVersion):
                 current_app.logger.error("Failed to add static route " + str(ad[1]))
                 return None, str(ad[1])
         ##########################################################
-        vip_pg = request.get_json(force=True)['tkgsComponentSpec']['tkgsVipNetwork']['tkgsVipNetworkName']
+        vip_pg = RequestSpec.json()['tkgsComponentSpec']['tkgsVipNetwork']['tkgsVipNetworkName']
         get_vip = getNetworkUrl(ip, csrf2, vip_pg, Cloud.DEFAULT_CLOUD_NAME_VSPHERE, aviVersion)
         if get_vip[0] is None:
             return None, "Failed to get tkgs vip network " + str(get_vip[1])
-        startIp_vip = request.get_json(force=True)["tkgsComponentSpec"]["tkgsVipNetwork"]["tkgsVipIpStartRange"]
-        endIp_vip = request.get_json(force=True)["tkgsComponentSpec"]["tkgsVipNetwork"]["tkgsVipIpEndRange"]
+        startIp_vip = RequestSpec.json()["tkgsComponentSpec"]["tkgsVipNetwork"]["tkgsVipIpStartRange"]
+        endIp_vip = RequestSpec.json()["tkgsComponentSpec"]["tkgsVipNetwork"]["tkgsVipIpEndRange"]
         prefixIpNetmask_vip = seperateNetmaskAndIp(
-            request.get_json(force=True)["tkgsComponentSpec"]["tkgsVipNetwork"]["tkgsVipNetworkGatewayCidr"])
+            RequestSpec.json()["tkgsComponentSpec"]["tkgsVipNetwork"]["tkgsVipNetworkGatewayCidr"])
         getManagementDetails_vip = getNetworkDetails(ip, csrf2, get_vip[0], startIp_vip, endIp_vip,
                                                      prefixIpNetmask_vip[0],
                                                      prefixIpNetmask_vip[1], False, aviVersion)
@@ -194,7 +196,7 @@ def configTkgsCloud(ip, csrf2, aviVersion):
         if updateIpam_re[0] is None:
             current_app.logger.error("Failed to update ipam to cloud " + str(updateIpam_re[1]))
             return None, str(updateIpam_re[1])
-        cluster_name = request.get_json(force=True)["envSpec"]["vcenterDetails"]["vcenterCluster"]
+        cluster_name = RequestSpec.json()["envSpec"]["vcenterDetails"]["vcenterCluster"]
         if str(cluster_name).__contains__("/"):
             cluster_name = cluster_name[cluster_name.rindex("/") + 1:]
         cluster_status = getClusterUrl(ip, csrf2, cluster_name, aviVersion)
@@ -262,7 +264,7 @@ def createIpam(ip, csrf2, managementNetworkUrl, vip_network, name, aviVersion):
     }
     json_object = json.dumps(body, indent=4)
     url = "https://" + ip + "/api/ipamdnsproviderprofile"
-    response_csrf = requests.request("POST", url, headers=headers, data=json_object, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("POST", url, headers=headers, data=json_object, verify=False)
     if response_csrf.status_code != 201:
         return None, response_csrf.text
     else:
@@ -290,7 +292,7 @@ def updateSeEngineDetails(ip, csrf2, seUrl, clusterUrl, aviVersion):
         }
     }
     json_object = json.dumps(body, indent=4)
-    response_csrf = requests.request("PUT", seUrl, headers=headers, data=json_object, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("PUT", seUrl, headers=headers, data=json_object, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -320,7 +322,7 @@ def enableWCP(ip, csrf2, aviVersion):
             "Content-Type": "application/json",
             "vmware-api-session-id": vc_session
         }
-        cluster_name = request.get_json(force=True)["envSpec"]["vcenterDetails"]["vcenterCluster"]
+        cluster_name = RequestSpec.json()["envSpec"]["vcenterDetails"]["vcenterCluster"]
         id = getClusterID(vCenter, vc_user, vc_password, cluster_name)
         if id[1] != 200:
             return None, id[0]
@@ -354,72 +356,68 @@ def enableWCP(ip, csrf2, aviVersion):
             current_app.logger.info("Wcp is already enabled")
         else:
             current_app.logger.info("Enabling Wcp..")
-            control_plane_size = request.get_json(force=True)["tkgsComponentSpec"]["controlPlaneSize"]
+            control_plane_size = RequestSpec.json()["tkgsComponentSpec"]["controlPlaneSize"]
             allowed_tkgs_size = ["TINY", "SMALL", "MEDIUM", "LARGE"]
             if not control_plane_size.upper() in allowed_tkgs_size:
                 return None, \
                        "Allowed Control plane sizes [tkgsComponentSpec][controlPlaneSize] are TINY, SMALL, MEDIUM, LARGE"
-            image_storage_policy_name = request.get_json(force=True)["tkgsComponentSpec"]["tkgsStoragePolicySpec"][
+            image_storage_policy_name = RequestSpec.json()["tkgsComponentSpec"]["tkgsStoragePolicySpec"][
                 "imageStoragePolicy"]
             image_storage_policyId = getPolicyID(image_storage_policy_name, vCenter, vc_user, vc_password)
             if image_storage_policyId[0] is None:
                 return None, image_storage_policyId[1]
             ephemeral_storage_policy_name = \
-                request.get_json(force=True)["tkgsComponentSpec"]["tkgsStoragePolicySpec"][
+                RequestSpec.json()["tkgsComponentSpec"]["tkgsStoragePolicySpec"][
                     "ephemeralStoragePolicy"]
             ephemeral_storage_policyId = getPolicyID(ephemeral_storage_policy_name, vCenter, vc_user, vc_password)
             if ephemeral_storage_policyId[0] is None:
                 return None, ephemeral_storage_policyId[1]
             master_storage_policy_name = \
-                request.get_json(force=True)["tkgsComponentSpec"]["tkgsStoragePolicySpec"][
+                RequestSpec.json()["tkgsComponentSpec"]["tkgsStoragePolicySpec"][
                     "masterStoragePolicy"]
             master_storage_policyId = getPolicyID(master_storage_policy_name, vCenter, vc_user, vc_password)
             if master_storage_policyId[0] is None:
                 return None, master_storage_policyId[1]
-            str_enc_avi = str(
-                request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviPasswordBase64'])
-            base64_bytes_avi = str_enc_avi.encode('ascii')
-            enc_bytes_avi = base64.b64decode(base64_bytes_avi)
-            password_avi = enc_bytes_avi.decode('ascii').rstrip("\n")
-            avi_fqdn = request.get_json(force=True)['tkgsComponentSpec']['aviComponents']['aviController01Fqdn']
-            master_dnsServers = request.get_json(force=True)['tkgsComponentSpec']['tkgsMgmtNetworkSpec'][
+            password_avi = RequestSpec.secret('tkgsComponentSpec', 'aviComponents', 'aviPasswordBase64')
+            avi_fqdn = RequestSpec.json()['tkgsComponentSpec']['aviComponents']['aviController01Fqdn']
+            master_dnsServers = RequestSpec.json()['tkgsComponentSpec']['tkgsMgmtNetworkSpec'][
                 'tkgsMgmtNetworkDnsServers']
-            master_search_domains = request.get_json(force=True)['tkgsComponentSpec']['tkgsMgmtNetworkSpec'][
+            master_search_domains = RequestSpec.json()['tkgsComponentSpec']['tkgsMgmtNetworkSpec'][
                 'tkgsMgmtNetworkSearchDomains']
-            master_ntp_servers = request.get_json(force=True)['tkgsComponentSpec']['tkgsMgmtNetworkSpec'][
+            master_ntp_servers = RequestSpec.json()['tkgsComponentSpec']['tkgsMgmtNetworkSpec'][
                 'tkgsMgmtNetworkNtpServers']
-            worker_dns = request.get_json(force=True)['tkgsComponentSpec']['tkgsPrimaryWorkloadNetwork'][
+            worker_dns = RequestSpec.json()['tkgsComponentSpec']['tkgsPrimaryWorkloadNetwork'][
                 'tkgsWorkloadDnsServers']
-            worker_ntps = request.get_json(force=True)['tkgsComponentSpec']['tkgsPrimaryWorkloadNetwork'][
+            worker_ntps = RequestSpec.json()['tkgsComponentSpec']['tkgsPrimaryWorkloadNetwork'][
                 'tkgsWorkloadNtpServers']
-            worker_cidr = request.get_json(force=True)['tkgsComponentSpec']['tkgsPrimaryWorkloadNetwork'][
+            worker_cidr = RequestSpec.json()['tkgsComponentSpec']['tkgsPrimaryWorkloadNetwork'][
                 'tkgsPrimaryWorkloadNetworkGatewayCidr']
-            start = request.get_json(force=True)['tkgsComponentSpec']['tkgsPrimaryWorkloadNetwork'][
+            start = RequestSpec.json()['tkgsComponentSpec']['tkgsPrimaryWorkloadNetwork'][
                 'tkgsPrimaryWorkloadNetworkStartRange']
-            end = request.get_json(force=True)['tkgsComponentSpec']['tkgsPrimaryWorkloadNetwork'][
+            end = RequestSpec.json()['tkgsComponentSpec']['tkgsPrimaryWorkloadNetwork'][
                 'tkgsPrimaryWorkloadNetworkEndRange']
             ip_cidr = seperateNetmaskAndIp(worker_cidr)
             count_of_ip = getCountOfIpAdress(worker_cidr, start, end)
-            service_cidr = request.get_json(force=True)['tkgsComponentSpec']['tkgsPrimaryWorkloadNetwork'][
+            service_cidr = RequestSpec.json()['tkgsComponentSpec']['tkgsPrimaryWorkloadNetwork'][
                 'tkgsWorkloadServiceCidr']
             service_cidr_split = seperateNetmaskAndIp(service_cidr)
-            worker_network_name = request.get_json(force=True)['tkgsComponentSpec']['tkgsPrimaryWorkloadNetwork'][
+            worker_network_name = RequestSpec.json()['tkgsComponentSpec']['tkgsPrimaryWorkloadNetwork'][
                 'tkgsPrimaryWorkloadPortgroupName']
-            workload_network_name = request.get_json(force=True)['tkgsComponentSpec']['tkgsPrimaryWorkloadNetwork'][
+            workload_network_name = RequestSpec.json()['tkgsComponentSpec']['tkgsPrimaryWorkloadNetwork'][
                 'tkgsPrimaryWorkloadNetworkName']
             worker_network_id = getDvPortGroupId(vCenter, vc_user, vc_password, worker_network_name, vc_data_center)
             if worker_network_id is None:
                 return None, "Failed to get worker dv port id"
             ###################################################
-            master_management = request.get_json(force=True)['tkgsComponentSpec']['tkgsMgmtNetworkSpec'][
+            master_management = RequestSpec.json()['tkgsComponentSpec']['tkgsMgmtNetworkSpec'][
                 'tkgsMgmtNetworkGatewayCidr']
-            master_management_start = request.get_json(force=True)['tkgsComponentSpec']['tkgsMgmtNetworkSpec'][
+            master_management_start = RequestSpec.json()['tkgsComponentSpec']['tkgsMgmtNetworkSpec'][
                 'tkgsMgmtNetworkStartingIp']
             master_management_ip_netmask = seperateNetmaskAndIp(master_management)
-            mgmt_network_name = request.get_json(force=True)['tkgsComponentSpec']['tkgsMgmtNetworkSpec'][
+            mgmt_network_name = RequestSpec.json()['tkgsComponentSpec']['tkgsMgmtNetworkSpec'][
                 'tkgsMgmtNetworkName']
             try:
-                isProxyEnabled = request.get_json(force=True)['tkgsComponentSpec']['tkgServiceConfig']['proxySpec'][
+                isProxyEnabled = RequestSpec.json()['tkgsComponentSpec']['tkgServiceConfig']['proxySpec'][
                     'enableProxy']
                 if str(isProxyEnabled).lower() == "true":
                     proxyEnabled = True
@@ -430,7 +428,7 @@ def enableWCP(ip, csrf2, aviVersion):
             mgmt_network_id = getDvPortGroupId(vCenter, vc_user, vc_password, mgmt_network_name, vc_data_center)
             if mgmt_network_id is None:
                 return None, "Failed to get management dv port id"
-            subs_lib_name = request.get_json(force=True)['tkgsComponentSpec']['tkgsMgmtNetworkSpec'][
+            subs_lib_name = RequestSpec.json()['tkgsComponentSpec']['tkgsMgmtNetworkSpec'][
                 'subscribedContentLibraryName']
             if not subs_lib_name:
                 lib = getLibraryId(vCenter, vc_user, vc_password, ControllerLocation.SUBSCRIBED_CONTENT_LIBRARY)
@@ -500,11 +498,11 @@ def enableWCP(ip, csrf2, aviVersion):
                 }
             }
             if proxyEnabled:
-                httpProxy = request.get_json(force=True)['tkgsComponentSpec']['tkgServiceConfig']['proxySpec'][
+                httpProxy = RequestSpec.json()['tkgsComponentSpec']['tkgServiceConfig']['proxySpec'][
                     'httpProxy']
-                httpsProxy = request.get_json(force=True)['tkgsComponentSpec']['tkgServiceConfig']['proxySpec'][
+                httpsProxy = RequestSpec.json()['tkgsComponentSpec']['tkgServiceConfig']['proxySpec'][
                     'httpsProxy']
-                noProxy = request.get_json(force=True)['tkgsComponentSpec']['tkgServiceConfig']['proxySpec']['noProxy']
+                noProxy = RequestSpec.json()['tkgsComponentSpec']['tkgServiceConfig']['proxySpec']['noProxy']
                 list_ = convertStringToCommaSeperated(noProxy)
                 body_u = {
                     "cluster_proxy_config": {
@@ -555,7 +553,7 @@ def enableWCP(ip, csrf2, aviVersion):
 def configureTkgConfiguration(vCenter_user, vc_password, cluster_endpoint):
     current_app.logger.info("Getting current Tkgs current configuration")
     current_app.logger.info("Logging in to cluster " + cluster_endpoint)
-    os.putenv("KUBECTL_VSPHERE_PASSWORD", vc_password)
+    os.environ["KUBECTL_VSPHERE_PASSWORD"] = vc_password
     connect_command = ["kubectl", "vsphere", "login", "--server=" + cluster_endpoint,
                        "--vsphere-username=" + vCenter_user,
                        "--insecure-skip-tls-verify"]
@@ -574,7 +572,7 @@ def configureTkgConfiguration(vCenter_user, vc_password, cluster_endpoint):
         file_.write(proc.stdout.decode('utf-8'))
 
     try:
-        cni = request.get_json(force=True)['tkgsComponentSpec']['tkgServiceConfig']['defaultCNI']
+        cni = RequestSpec.json()['tkgsComponentSpec']['tkgServiceConfig']['defaultCNI']
         if cni:
             defaultCNI = cni
         else:
@@ -585,7 +583,7 @@ def configureTkgConfiguration(vCenter_user, vc_password, cluster_endpoint):
     command_ = ["sh", "./common/injectValue.sh", fileName, "change_cni", defaultCNI]
     runShellCommandAndReturnOutputAsList(command_)
     try:
-        isProxyEnabled = request.get_json(force=True)['tkgsComponentSpec']['tkgServiceConfig']['proxySpec'][
+        isProxyEnabled = RequestSpec.json()['tkgsComponentSpec']['tkgServiceConfig']['proxySpec'][
             'enableProxy']
         if str(isProxyEnabled).lower() == "true":
             proxyEnabled = True
@@ -595,10 +593,10 @@ def configureTkgConfiguration(vCenter_user, vc_password, cluster_endpoint):
         proxyEnabled = False
     if proxyEnabled:
         try:
-            httpProxy = request.get_json(force=True)['tkgsComponentSpec']['tkgServiceConfig']['proxySpec']['httpProxy']
-            httpsProxy = request.get_json(force=True)['tkgsComponentSpec']['tkgServiceConfig']['proxySpec'][
+            httpProxy = RequestSpec.json()['tkgsComponentSpec']['tkgServiceConfig']['proxySpec']['httpProxy']
+            httpsProxy = RequestSpec.json()['tkgsComponentSpec']['tkgServiceConfig']['proxySpec'][
                 'httpsProxy']
-            noProxy = request.get_json(force=True)['tkgsComponentSpec']['tkgServiceConfig']['proxySpec']['noProxy']
+            noProxy = RequestSpec.json()['tkgsComponentSpec']['tkgServiceConfig']['proxySpec']['noProxy']
             list_ = convertStringToCommaSeperated(noProxy)
             ytr = dict(proxy=dict(httpProxy=httpProxy, httpsProxy=httpsProxy, noProxy=list_))
             yaml = ruamel.yaml.YAML()
@@ -610,17 +608,17 @@ def configureTkgConfiguration(vCenter_user, vc_password, cluster_endpoint):
                 with open(fileName, 'w') as yamlfile:
                     yaml.indent(mapping=2, sequence=4, offset=2)
                     yaml.dump(cur_yaml, yamlfile)
-            isProxy = request.get_json(force=True)['tkgsComponentSpec']['tkgServiceConfig']['proxySpec']['proxyCert']
+            isProxy = RequestSpec.json()['tkgsComponentSpec']['tkgServiceConfig']['proxySpec']['proxyCert']
             if isProxy:
                 cert = Path(isProxy).read_text()
                 string_bytes = cert.encode("ascii")
                 base64_bytes = base64.b64encode(string_bytes)
                 cert_base64 = base64_bytes.decode("ascii")
                 cert_list.append(dict(name="certProxy", data=cert_base64))
-            proxyPath = request.get_json(force=True)['tkgsComponentSpec']['tkgServiceConfig']['additionalTrustedCAs'][
+            proxyPath = RequestSpec.json()['tkgsComponentSpec']['tkgServiceConfig']['additionalTrustedCAs'][
                 'paths']
             proxyEndpoints = \
-            request.get_json(force=True)['tkgsComponentSpec']['tkgServiceConfig']['additionalTrustedCAs'][
+            RequestSpec.json()['tkgsComponentSpec']['tkgServiceConfig']['additionalTrustedCAs'][
                 'endpointUrls']
             if proxyPath:
                 proxyCert = proxyPath
@@ -643,9 +641,7 @@ def configureTkgConfiguration(vCenter_user, vc_password, cluster_endpoint):
                         base64_bytes = base64.b64encode(string_bytes)
                         cert_base64 = base64_bytes.decode("ascii")
                     else:
-                        getBase64CertWriteToFile(certs, "443")
-                        with open('cert.txt', 'r') as file2:
-                            cert_base64 = file2.readline()
+                        cert_base64 = getBase64CertWriteToFile(certs, "443")
                     cert_list.append(dict(name="cert" + str(count), data=cert_base64))
             ytr = dict(trust=dict(additionalTrustedCAs=cert_list))
             with open(fileName, 'r') as outfile:
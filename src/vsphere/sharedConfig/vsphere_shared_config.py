@@ -6,7 +6,7 @@ import logging
 import sys
 
 logger = logging.getLogger(__name__)
-from flask import jsonify, request
+from flask import jsonify
 from flask import current_app
 import requests
 import os
@@ -16,6 +16,7 @@ import base64
 import json
 import ruamel
 from common.model.vsphereSpec import VsphereMasterSpec
+from common.util.request_spec import RequestSpec
 
 sys.path.append(".../")
 from vsphere.workloadConfig.vsphere_workload_config import getVipNetworkIpNetMask
@@ -60,7 +61,7 @@ def akoDeploymentConfigSharedCluster(shared_cluster_name):
         }
         return jsonify(d), 500
     env = env[0]
-    management_cluster = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+    management_cluster = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
         'tkgMgmtClusterName']
     commands = ["tanzu", "management-cluster", "kubeconfig", "get", management_cluster, "--admin"]
     kubeContextCommand = grabKubectlCommand(commands, RegexPattern.SWITCH_CONTEXT_KUBECTL)
@@ -126,9 +127,9 @@ def akoDeploymentConfigSharedCluster(shared_cluster_name):
             return jsonify(d), 500
 
     if isAviHaEnabled(env):
-        avi_fqdn = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviClusterFqdn']
+        avi_fqdn = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviClusterFqdn']
     else:
-        avi_fqdn = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController01Fqdn']
+        avi_fqdn = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviController01Fqdn']
     if avi_fqdn is None:
         current_app.logger.error("Failed to get ip of avi controller")
         d = {
@@ -139,8 +140,8 @@ def akoDeploymentConfigSharedCluster(shared_cluster_name):
         return jsonify(d), 500
     try:
         if env == Env.VSPHERE:
-            tkg_mgmt_data_pg = request.get_json(force=True)['tkgMgmtDataNetwork']['tkgMgmtDataNetworkName']
-        tkg_cluster_vip_name = request.get_json(force=True)['tkgComponentSpec']['tkgClusterVipNetwork'][
+            tkg_mgmt_data_pg = RequestSpec.json()['tkgMgmtDataNetwork']['tkgMgmtDataNetworkName']
+        tkg_cluster_vip_name = RequestSpec.json()['tkgComponentSpec']['tkgClusterVipNetwork'][
             'tkgClusterVipNetworkName']
     except Exception as e:
         current_app.logger.error("One of the following values is not present in input file: "
@@ -183,7 +184,7 @@ def akoDeploymentConfigSharedCluster(shared_cluster_name):
         }
         return jsonify(d), 500
     if env == Env.VCF:
-        shared_service_network = request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
+        shared_service_network = RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
             'tkgSharedserviceNetworkName']
         headers = {
             "Accept": "application/json",
@@ -207,7 +208,7 @@ def akoDeploymentConfigSharedCluster(shared_cluster_name):
         tier1 = status_tier1
     else:
         tier1 = ""
-        shared_service_network = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+        shared_service_network = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
             'tkgMgmtNetworkName']
     cluster_vip_cidr = getVipNetworkIpNetMask(avi_fqdn, csrf2, tkg_cluster_vip_name, aviVersion)
     if cluster_vip_cidr[0] is None or cluster_vip_cidr[0] == "NOT_FOUND":
@@ -254,7 +255,7 @@ def createAkoFile(ip, shared_cluster_name, tkgMgmtDataVipCidr, tkgMgmtDataPg, cl
                   cluster_vip_cidr, tier1_path, env):
     if checkAirGappedIsEnabled(env):
         air_gapped_repo = str(
-            request.get_json(force=True)['envSpec']['customRepositorySpec']['tkgCustomImageRepository'])
+            RequestSpec.json()['envSpec']['customRepositorySpec']['tkgCustomImageRepository'])
         air_gapped_repo = air_gapped_repo.replace("https://", "").replace("http://", "")
         repository = air_gapped_repo + '/ako'
     else:
@@ -361,8 +362,7 @@ def deploy():
             "STATUS_CODE": 500
         }
         return jsonify(d), 500
-    json_dict = request.get_json(force=True)
-    vsSpec = VsphereMasterSpec.parse_obj(json_dict)
+    vsSpec = RequestSpec.model(VsphereMasterSpec)
     env = env[0]
     aviVersion = get_avi_version(env)
     password = current_app.config['VC_PASSWORD']
@@ -372,25 +372,25 @@ def deploy():
     data_center = current_app.config['VC_DATACENTER']
     data_store = current_app.config['VC_DATASTORE']
     parent_resourcePool = current_app.config['RESOURCE_POOL']
-    refToken = request.get_json(force=True)['envSpec']['marketplaceSpec']['refreshToken']
+    refToken = RequestSpec.json()['envSpec']['marketplaceSpec']['refreshToken']
     if not (isEnvTkgs_wcp(env) or isEnvTkgs_ns(env)):
         if env == Env.VSPHERE:
-            kubernetes_ova_os = request.get_json(force=True)["tkgComponentSpec"]["tkgMgmtComponents"][
+            kubernetes_ova_os = RequestSpec.json()["tkgComponentSpec"]["tkgMgmtComponents"][
                 "tkgSharedserviceBaseOs"]
-            kubernetes_ova_version = request.get_json(force=True)["tkgComponentSpec"]["tkgMgmtComponents"][
+            kubernetes_ova_version = RequestSpec.json()["tkgComponentSpec"]["tkgMgmtComponents"][
                 "tkgSharedserviceKubeVersion"]
-            pod_cidr = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+            pod_cidr = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
                 'tkgSharedserviceClusterCidr']
-            service_cidr = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+            service_cidr = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
                 'tkgSharedserviceServiceCidr']
         elif env == Env.VCF:
-            kubernetes_ova_os = request.get_json(force=True)["tkgComponentSpec"]["tkgSharedserviceSpec"][
+            kubernetes_ova_os = RequestSpec.json()["tkgComponentSpec"]["tkgSharedserviceSpec"][
                 "tkgSharedserviceBaseOs"]
-            kubernetes_ova_version = request.get_json(force=True)["tkgComponentSpec"]["tkgSharedserviceSpec"][
+            kubernetes_ova_version = RequestSpec.json()["tkgComponentSpec"]["tkgSharedserviceSpec"][
                 "tkgSharedserviceKubeVersion"]
-            pod_cidr = request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
+            pod_cidr = RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
                 'tkgSharedserviceClusterCidr']
-            service_cidr = request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
+            service_cidr = RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
                 'tkgSharedserviceServiceCidr']
         if refToken:
             current_app.logger.info("Kubernetes OVA configs for shared services cluster")
@@ -446,7 +446,7 @@ def deploy():
             "STATUS_CODE": 500
         }
         return jsonify(d), 500, str(e)
-    management_cluster = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+    management_cluster = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
         'tkgMgmtClusterName']
     try:
         with open('/root/.ssh/id_rsa.pub', 'r') as f:
@@ -469,7 +469,7 @@ def deploy():
             "STATUS_CODE": 500
         }
         return jsonify(d), 500
-    tmc_required = str(request.get_json(force=True)['envSpec']["saasEndpoints"]['tmcDetails']['tmcAvailability'])
+    tmc_required = str(RequestSpec.json()['envSpec']["saasEndpoints"]['tmcDetails']['tmcAvailability'])
     tmc_flag = False
     if tmc_required.lower() == "true":
         tmc_flag = True
@@ -485,30 +485,30 @@ def deploy():
         }
         return jsonify(d), 500
     if env == Env.VCF:
-        shared_cluster_name = request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
+        shared_cluster_name = RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
             'tkgSharedserviceClusterName']
-        cluster_plan = request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
+        cluster_plan = RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
             'tkgSharedserviceDeploymentType']
     else:
-        shared_cluster_name = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+        shared_cluster_name = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
             'tkgSharedserviceClusterName']
-        cluster_plan = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+        cluster_plan = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
             'tkgSharedserviceDeploymentType']
     if cluster_plan == PLAN.DEV_PLAN:
         additional_command = ""
         if env == Env.VCF:
-            machineCount = request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
+            machineCount = RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
                 'tkgSharedserviceWorkerMachineCount']
         else:
-            machineCount = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+            machineCount = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
                 'tkgSharedserviceWorkerMachineCount']
     elif cluster_plan == PLAN.PROD_PLAN:
         additional_command = "--high-availability"
         if env == Env.VCF:
-            machineCount = request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
+            machineCount = RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
                 'tkgSharedserviceWorkerMachineCount']
         else:
-            machineCount = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+            machineCount = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
                 'tkgSharedserviceWorkerMachineCount']
     else:
         current_app.logger.error("Unsupported control plan provided please specify PROD or DEV " + cluster_plan)
@@ -519,9 +519,9 @@ def deploy():
         }
         return jsonify(d), 500
     if env == Env.VSPHERE:
-        size = str(request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents']['tkgSharedserviceSize'])
+        size = str(RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents']['tkgSharedserviceSize'])
     else:
-        size = str(request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec']['tkgSharedserviceSize'])
+        size = str(RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec']['tkgSharedserviceSize'])
     if size.lower() == "small":
         current_app.logger.debug("Recommended size for shared services cluster is: medium/large/extra-large/custom")
         pass
@@ -561,19 +561,19 @@ def deploy():
         disk = Sizing.extraLarge['DISK']
     elif size.lower() == "custom":
         if env == Env.VCF:
-            cpu = request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
+            cpu = RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
                 'tkgSharedserviceCpuSize']
-            disk = request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
+            disk = RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
                 'tkgSharedserviceStorageSize']
-            control_plane_mem_gb = request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
+            control_plane_mem_gb = RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
                 'tkgSharedserviceMemorySize']
             memory = str(int(control_plane_mem_gb) * 1024)
         else:
-            cpu = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+            cpu = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
                 'tkgSharedserviceCpuSize']
-            disk = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+            disk = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
                 'tkgSharedserviceStorageSize']
-            control_plane_mem_gb = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+            control_plane_mem_gb = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
                 'tkgSharedserviceMemorySize']
             memory = str(int(control_plane_mem_gb) * 1024)
     else:
@@ -587,10 +587,10 @@ def deploy():
         }
         return jsonify(d), 500
     if env == Env.VCF:
-        shared_service_network = request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
+        shared_service_network = RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
             'tkgSharedserviceNetworkName']
     else:
-        shared_service_network = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+        shared_service_network = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
             'tkgMgmtNetworkName']
 
     vsphere_password = password
@@ -625,10 +625,10 @@ def deploy():
         "The config files for shared services cluster will be located at: " + Paths.CLUSTER_PATH + shared_cluster_name)
     if Tkg_version.TKG_VERSION == "1.6" and checkTmcEnabled(env):
         if env == Env.VCF:
-            clusterGroup = request.get_json(force=True)['tkgComponentSpec']["tkgSharedserviceSpec"][
+            clusterGroup = RequestSpec.json()['tkgComponentSpec']["tkgSharedserviceSpec"][
                 'tkgSharedserviceClusterGroupName']
         else:
-            clusterGroup = request.get_json(force=True)['tkgComponentSpec']["tkgMgmtComponents"][
+            clusterGroup = RequestSpec.json()['tkgComponentSpec']["tkgMgmtComponents"][
                 'tkgSharedserviceClusterGroupName']
 
         if not clusterGroup:
@@ -926,36 +926,36 @@ def deploy():
                     return jsonify(d), 500
                 if env == Env.VSPHERE:
                     cluster_admin_users = \
-                        request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+                        RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
                             'tkgSharedserviceRbacUserRoleSpec'][
                             'clusterAdminUsers']
                     admin_users = \
-                        request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+                        RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
                             'tkgSharedserviceRbacUserRoleSpec'][
                             'adminUsers']
                     edit_users = \
-                        request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+                        RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
                             'tkgSharedserviceRbacUserRoleSpec'][
                             'editUsers']
                     view_users = \
-                        request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+                        RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
                             'tkgSharedserviceRbacUserRoleSpec'][
                             'viewUsers']
                 elif env == Env.VCF:
                     cluster_admin_users = \
-                        request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
+                        RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
                             'tkgSharedserviceRbacUserRoleSpec'][
                             'clusterAdminUsers']
                     admin_users = \
-                        request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
+                        RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
                             'tkgSharedserviceRbacUserRoleSpec'][
                             'adminUsers']
                     edit_users = \
-                        request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
+                        RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
                             'tkgSharedserviceRbacUserRoleSpec'][
                             'editUsers']
                     view_users = \
-                        request.get_json(force=True)['tkgComponentSpec']['tkgSharedserviceSpec'][
+                        RequestSpec.json()['tkgComponentSpec']['tkgSharedserviceSpec'][
                             'tkgSharedserviceRbacUserRoleSpec'][
                             'viewUsers']
                 rbac_user_status = createRbacUsers(shared_cluster_name, isMgmt=False, env=env, edit_users=edit_users,
@@ -1083,43 +1083,6 @@ def deploy():
     return jsonify(d), 200
 
 
-def waitForGrepProcess(list1, list2, podName, dir):
-    time.sleep(30)
-    count_cert = 0
-    running = False
-    try:
-        while count_cert < 60:
-            cert_state = grabPipeOutputChagedDir(list1, list2, dir)
-            if verifyPodsAreRunning(podName, cert_state[0], RegexPattern.RUNNING):
-                running = True
-                break
-            time.sleep(30)
-            count_cert = count_cert + 1
-            current_app.logger.info("Waited for  " + str(count_cert * 30) + "s, retrying.")
-    except Exception as e:
-        current_app.logger.error(" Failed to verify pod running ")
-        d = {
-            "responseType": "ERROR",
-            "msg": "Failed to verify pod running",
-            "STATUS_CODE": 500
-        }
-        return jsonify(d), 500, count_cert
-    if not running:
-        current_app.logger.error(podName + " is not running on waiting " + str(count_cert * 30) + "s")
-        d = {
-            "responseType": "ERROR",
-            "msg": podName + " is not running on waiting " + str(count_cert * 30) + "s",
-            "STATUS_CODE": 500
-        }
-        return jsonify(d), 500, count_cert
-    d = {
-        "responseType": "ERROR",
-        "msg": "Successfully running " + podName + " ",
-        "STATUS_CODE": 200
-    }
-    return jsonify(d), 200, count_cert
-
-
 def checkCertManagerRunning():
     list1 = ["kubectl", "get", "pods", "-A"]
     list2 = ["grep", "cert-manager"]
@@ -1136,32 +1099,3 @@ def checkCertManagerRunning():
     except Exception as e:
         return False
     return False
-
-
-def waitForProcess(list1, podName):
-    time.sleep(30)
-    count_cert = 0
-    running = False
-    while count_cert < 60:
-        cert_state = runShellCommandAndReturnOutputAsList(list1)
-        time.sleep(30)
-        if verifyPodsAreRunning(podName, cert_state[0], RegexPattern.RECONCILE_SUCCEEDED):
-            running = True
-            break
-        count_cert = count_cert + 1
-        current_app.logger.info("Waited for  " + str(count_cert * 30) + "s, retrying.")
-    if not running:
-        current_app.logger.error(podName + " is not running on waiting " + str(count_cert * 30) + "s")
-        d = {
-            "responseType": "ERROR",
-            "msg": podName + " is not running on waiting " + str(count_cert * 30) + "s",
-            "STATUS_CODE": 500
-        }
-        return jsonify(d), 500, count_cert
-    current_app.logger.info("Successfully running " + podName)
-    d = {
-        "responseType": "SUCCESS",
-        "msg": "Successfully running" + podName,
-        "STATUS_CODE": 500
-    }
-    return jsonify(d), 200, count_cert
@@ -6,7 +6,8 @@ from common.common_utilities import checkTmcEnabled, get_alias_name, getPolicyID
     getClusterID, checkTmcEnabled, getPolicyID, getLibraryId, \
     convertStringToCommaSeperated, supervisorTMC, configureKubectl, getBodyResourceSpec, cidr_to_netmask, \
     seperateNetmaskAndIp, getCountOfIpAdress, createClusterFolder, check_tkgs_proxy_enabled
-from flask import current_app, jsonify, request
+from common.util.request_spec import RequestSpec
+from flask import current_app, jsonify
 import time
 import yaml
 import json
@@ -43,7 +44,7 @@ def createTkgWorkloadCluster(env, vc_ip, vc_user, vc_password):
             "Content-Type": "application/json",
             "vmware-api-session-id": session_id
         }
-        cluster_name = request.get_json(force=True)["envSpec"]["vcenterDetails"]["vcenterCluster"]
+        cluster_name = RequestSpec.json()["envSpec"]["vcenterDetails"]["vcenterCluster"]
         if str(cluster_name).__contains__("/"):
             cluster_name = cluster_name[cluster_name.rindex("/") + 1:]
         id = getClusterID(vc_ip, vc_user, vc_password, cluster_name)
@@ -67,10 +68,10 @@ def createTkgWorkloadCluster(env, vc_ip, vc_user, vc_password):
         supervisorTMC(vc_user, vc_password, cluster_endpoint)
         current_app.logger.info("Switch context to name space")
         name_space = \
-            request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+            RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
                 'tkgsVsphereWorkloadClusterSpec']['tkgsVsphereNamespaceName']
 
-        workload_name = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+        workload_name = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
             'tkgsVsphereWorkloadClusterSpec']['tkgsVsphereWorkloadClusterName']
         if not createClusterFolder(workload_name):
             d = {
@@ -98,13 +99,13 @@ def createTkgWorkloadCluster(env, vc_ip, vc_user, vc_password):
             current_app.logger.info("Cluster with same name already exist - " + workload_name)
             return "Cluster with same name already exist ", 200
         if checkTmcEnabled(env):
-            supervisor_cluster = request.get_json(force=True)['envSpec']["saasEndpoints"]['tmcDetails'][
+            supervisor_cluster = RequestSpec.json()['envSpec']["saasEndpoints"]['tmcDetails'][
                 'tmcSupervisorClusterName']
             current_app.logger.info("Creating workload cluster...")
-            name_space = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+            name_space = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
                 'tkgsVsphereWorkloadClusterSpec'][
                 'tkgsVsphereNamespaceName']
-            version = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+            version = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
                 'tkgsVsphereWorkloadClusterSpec']['tkgsVsphereWorkloadClusterVersion']
 
             # if user using json and v not appended to version
@@ -115,13 +116,13 @@ def createTkgWorkloadCluster(env, vc_ip, vc_user, vc_password):
                 current_app.logger.info("Provided cluster version is valid !")
             else:
                 return None, is_compatible[1]
-            pod_cidr = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+            pod_cidr = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
                 'tkgsVsphereWorkloadClusterSpec'][
                 'podCidrBlocks']
-            service_cidr = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+            service_cidr = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
                 'tkgsVsphereWorkloadClusterSpec']['serviceCidrBlocks']
             node_storage_class_input = \
-                request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+                RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
                     'tkgsVsphereWorkloadClusterSpec']['nodeStorageClass']
             policy_id = getPolicyID(node_storage_class_input, vc_ip, vc_user, vc_password)
             if policy_id[0] is None:
@@ -132,7 +133,7 @@ def createTkgWorkloadCluster(env, vc_ip, vc_user, vc_password):
                 return None, "Failed to get Alias name"
             node_storage_class = allowed_[0]
             allowed_storage = \
-                request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+                RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
                     'tkgsVsphereWorkloadClusterSpec']['allowedStorageClasses']
             allowed = ""
             classes = allowed_storage
@@ -149,7 +150,7 @@ def createTkgWorkloadCluster(env, vc_ip, vc_user, vc_password):
                 current_app.logger.error("Failed to get allowed classes")
                 return None, "Failed to get allowed classes"
             allowed = allowed.strip(",")
-            default_storage_class = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+            default_storage_class = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
                 'tkgsVsphereWorkloadClusterSpec']['defaultStorageClass']
             policy_id = getPolicyID(default_storage_class, vc_ip, vc_user, vc_password)
             if policy_id[0] is None:
@@ -159,15 +160,15 @@ def createTkgWorkloadCluster(env, vc_ip, vc_user, vc_password):
                 current_app.logger.error(default[1])
                 return None, "Failed to get Alias name"
             default_class = default[0]
-            worker_node_count = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+            worker_node_count = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
                 'tkgsVsphereWorkloadClusterSpec']['workerNodeCount']
-            enable_ha = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+            enable_ha = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
                 'tkgsVsphereWorkloadClusterSpec']['enableControlPlaneHa']
-            clusterGroup = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+            clusterGroup = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
                 'tkgsVsphereWorkloadClusterSpec']["tkgsWorkloadClusterGroupName"]
-            worker_vm_class = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+            worker_vm_class = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
                 'tkgsVsphereWorkloadClusterSpec']['workerVmClass']
-            control_plane_vm_class = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+            control_plane_vm_class = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
                 'tkgsVsphereWorkloadClusterSpec']['controlPlaneVmClass']
             if not clusterGroup:
                 clusterGroup = "default"
@@ -200,7 +201,7 @@ def createTkgWorkloadCluster(env, vc_ip, vc_user, vc_password):
                 workload_cluster_create_command.append("--proxy-name")
                 workload_cluster_create_command.append(Tkgs_Extension_Details.TKGS_PROXY_CREDENTIAL_NAME)
             try:
-                control_plane_volumes = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+                control_plane_volumes = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
                     'tkgsVsphereWorkloadClusterSpec']['controlPlaneVolumes']
                 control_plane_volumes_list = []
                 for control_plane_volume in control_plane_volumes:
@@ -215,7 +216,7 @@ def createTkgWorkloadCluster(env, vc_ip, vc_user, vc_password):
             except Exception as e:
                 control_plane_vol = False
             try:
-                worker_volumes = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+                worker_volumes = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
                     'tkgsVsphereWorkloadClusterSpec']['workerVolumes']
                 worker_vol = True
                 worker_volumes_list = []
@@ -262,8 +263,8 @@ def createTkgWorkloadCluster(env, vc_ip, vc_user, vc_password):
                 workload_cluster_create_command.append("\"" + worker_command.strip(",") + "\"")
             current_app.logger.info(workload_cluster_create_command)
 
-            os.putenv("TMC_API_TOKEN",
-                      request.get_json(force=True)["envSpec"]["saasEndpoints"]['tmcDetails']['tmcRefreshToken'])
+            os.environ["TMC_API_TOKEN"] = RequestSpec.json()["envSpec"]["saasEndpoints"]['tmcDetails'][
+                'tmcRefreshToken']
             listOfCmdTmcLogin = ["tmc", "login", "--no-configure", "-name", TmcUser.USER_VSPHERE]
             runProcess(listOfCmdTmcLogin)
             worload = runShellCommandAndReturnOutputAsList(workload_cluster_create_command)
@@ -313,9 +314,9 @@ def createTkgWorkloadCluster(env, vc_ip, vc_user, vc_password):
             if worload[1] != 0:
                 return None, "Failed to create workload " + str(worload[0])
             current_app.logger.info(worload[0])
-            name_space = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+            name_space = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
                 'tkgsVsphereWorkloadClusterSpec']['tkgsVsphereNamespaceName']
-            workload_name = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+            workload_name = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
                 'tkgsVsphereWorkloadClusterSpec']['tkgsVsphereWorkloadClusterName']
             current_app.logger.info("Waiting for cluster creation to be initiated...")
             time.sleep(60)
@@ -408,23 +409,23 @@ def checkClusterStatus(vc_ip, header, name_space, cluster_id):
 
 
 def generateYamlFile(vc_ip, vc_user, vc_password, workload_name):
-    workload_name = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+    workload_name = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
         'tkgsVsphereWorkloadClusterSpec']['tkgsVsphereWorkloadClusterName']
     file = Paths.CLUSTER_PATH + workload_name + "/tkgs_workload.yaml"
     command = ["rm", "-rf", file]
     runShellCommandAndReturnOutputAsList(command)
     name_space = \
-        request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+        RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
             'tkgsVsphereWorkloadClusterSpec']['tkgsVsphereNamespaceName']
-    enable_ha = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+    enable_ha = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
         'tkgsVsphereWorkloadClusterSpec']['enableControlPlaneHa']
     if str(enable_ha).lower() == "true":
         count = "3"
     else:
         count = "1"
-    control_plane_vm_class = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+    control_plane_vm_class = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
         'tkgsVsphereWorkloadClusterSpec']['controlPlaneVmClass']
-    node_storage_class = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+    node_storage_class = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
         'tkgsVsphereWorkloadClusterSpec']['nodeStorageClass']
     policy_id = getPolicyID(node_storage_class, vc_ip, vc_user, vc_password)
     if policy_id[0] is None:
@@ -435,14 +436,14 @@ def generateYamlFile(vc_ip, vc_user, vc_password, workload_name):
         current_app.logger.error(allowed_[1])
         return None
     node_storage_class = str(allowed_[0])
-    worker_node_count = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+    worker_node_count = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
         'tkgsVsphereWorkloadClusterSpec']['workerNodeCount']
-    worker_vm_class = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+    worker_vm_class = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
         'tkgsVsphereWorkloadClusterSpec']['workerVmClass']
-    cluster_name = request.get_json(force=True)["envSpec"]["vcenterDetails"]["vcenterCluster"]
+    cluster_name = RequestSpec.json()["envSpec"]["vcenterDetails"]["vcenterCluster"]
     if str(cluster_name).__contains__("/"):
         cluster_name = cluster_name[cluster_name.rindex("/") + 1:]
-    kube_version = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+    kube_version = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
         'tkgsVsphereWorkloadClusterSpec']['tkgsVsphereWorkloadClusterVersion']
     if not kube_version.startswith('v'):
         kube_version = 'v' + kube_version
@@ -451,11 +452,11 @@ def generateYamlFile(vc_ip, vc_user, vc_password, workload_name):
         current_app.logger.info("Provided cluster version is valid !")
     else:
         return None
-    service_cidr = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+    service_cidr = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
         'tkgsVsphereWorkloadClusterSpec']['serviceCidrBlocks']
-    pod_cidr = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+    pod_cidr = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
         'tkgsVsphereWorkloadClusterSpec']['podCidrBlocks']
-    allowed_clases = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+    allowed_clases = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
         'tkgsVsphereWorkloadClusterSpec']['allowedStorageClasses']
     allowed = ""
     classes = allowed_clases
@@ -474,7 +475,7 @@ def generateYamlFile(vc_ip, vc_user, vc_password, workload_name):
         return None
     allowed = allowed.strip(",")
     li = convertStringToCommaSeperated(allowed)
-    default_clases = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+    default_clases = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
         'tkgsVsphereWorkloadClusterSpec']['defaultStorageClass']
     policy_id = getPolicyID(default_clases, vc_ip, vc_user, vc_password)
     if policy_id[0] is None:
@@ -486,7 +487,7 @@ def generateYamlFile(vc_ip, vc_user, vc_password, workload_name):
         return None
     default_clases = str(allowed_[0])
     try:
-        control_plane_volumes = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+        control_plane_volumes = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
             'tkgsVsphereWorkloadClusterSpec']['controlPlaneVolumes']
         control_plane_volumes_list = []
         for control_plane_volume in control_plane_volumes:
@@ -497,7 +498,7 @@ def generateYamlFile(vc_ip, vc_user, vc_password, workload_name):
     except Exception as e:
         control_plane_vol = False
     try:
-        worker_volumes = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+        worker_volumes = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
             'tkgsVsphereWorkloadClusterSpec']['workerVolumes']
         worker_vol = True
         worker_volumes_list = []
@@ -568,7 +569,7 @@ def generateYamlFile(vc_ip, vc_user, vc_password, workload_name):
         "namespace": name_space
     }
     try:
-        cni = request.get_json(force=True)['tkgsComponentSpec']['tkgServiceConfig']['defaultCNI']
+        cni = RequestSpec.json()['tkgsComponentSpec']['tkgServiceConfig']['defaultCNI']
         if cni:
             defaultCNI = cni
             isCni = True
@@ -602,7 +603,7 @@ def generateYamlFile(vc_ip, vc_user, vc_password, workload_name):
         default = dict(cni=dict(name=defaultCNI))
         spec_dict["settings"]["network"].update(default)
     try:
-        isProxyEnabled = request.get_json(force=True)['tkgsComponentSpec']['tkgServiceConfig']['proxySpec'][
+        isProxyEnabled = RequestSpec.json()['tkgsComponentSpec']['tkgServiceConfig']['proxySpec'][
             'enableProxy']
         if str(isProxyEnabled).lower() == "true":
             proxyEnabled = True
@@ -612,26 +613,26 @@ def generateYamlFile(vc_ip, vc_user, vc_password, workload_name):
         proxyEnabled = False
     if proxyEnabled:
         try:
-            httpProxy = request.get_json(force=True)['tkgsComponentSpec']['tkgServiceConfig']['proxySpec']['httpProxy']
-            httpsProxy = request.get_json(force=True)['tkgsComponentSpec']['tkgServiceConfig']['proxySpec'][
+            httpProxy = RequestSpec.json()['tkgsComponentSpec']['tkgServiceConfig']['proxySpec']['httpProxy']
+            httpsProxy = RequestSpec.json()['tkgsComponentSpec']['tkgServiceConfig']['proxySpec'][
                 'httpsProxy']
-            noProxy = request.get_json(force=True)['tkgsComponentSpec']['tkgServiceConfig']['proxySpec']['noProxy']
+            noProxy = RequestSpec.json()['tkgsComponentSpec']['tkgServiceConfig']['proxySpec']['noProxy']
             list_ = convertStringToCommaSeperated(noProxy)
         except Exception as e:
             return None, str(e)
         proxy = dict(proxy=dict(httpProxy=httpProxy, httpsProxy=httpsProxy, noProxy=list_))
         spec_dict["settings"]["network"].update(proxy)
         cert_list = []
-        isProxy = request.get_json(force=True)['tkgsComponentSpec']['tkgServiceConfig']['proxySpec']['proxyCert']
+        isProxy = RequestSpec.json()['tkgsComponentSpec']['tkgServiceConfig']['proxySpec']['proxyCert']
         if isProxy:
             cert = Path(isProxy).read_text()
             string_bytes = cert.encode("ascii")
             base64_bytes = base64.b64encode(string_bytes)
             cert_base64 = base64_bytes.decode("ascii")
             cert_list.append(dict(name="certProxy", data=cert_base64))
-        proxyPath = request.get_json(force=True)['tkgsComponentSpec']['tkgServiceConfig']['additionalTrustedCAs'][
+        proxyPath = RequestSpec.json()['tkgsComponentSpec']['tkgServiceConfig']['additionalTrustedCAs'][
             'paths']
-        proxyEndpoints = request.get_json(force=True)['tkgsComponentSpec']['tkgServiceConfig']['additionalTrustedCAs'][
+        proxyEndpoints = RequestSpec.json()['tkgsComponentSpec']['tkgServiceConfig']['additionalTrustedCAs'][
             'endpointUrls']
         if proxyPath:
             proxyCert = proxyPath
@@ -654,9 +655,7 @@ def generateYamlFile(vc_ip, vc_user, vc_password, workload_name):
                     base64_bytes = base64.b64encode(string_bytes)
                     cert_base64 = base64_bytes.decode("ascii")
                 else:
-                    getBase64CertWriteToFile(certs, "443")
-                    with open('cert.txt', 'r') as file2:
-                        cert_base64 = file2.readline()
+                    cert_base64 = getBase64CertWriteToFile(certs, "443")
                 cert_list.append(dict(name="cert" + str(count), data=cert_base64))
         trust = dict(trust=dict(additionalTrustedCAs=cert_list))
         spec_dict["settings"]["network"].update(trust)
@@ -691,10 +690,10 @@ def createNameSpace(vcenter_ip, vcenter_username, password):
             "Content-Type": "application/json",
             "vmware-api-session-id": vc_session
         }
-        name_space = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+        name_space = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
             'tkgsVsphereNamespaceName']
         url = "https://" + str(vcenter_ip) + "/api/vcenter/namespaces/instances"
-        cluster_name = request.get_json(force=True)["envSpec"]["vcenterDetails"]["vcenterCluster"]
+        cluster_name = RequestSpec.json()["envSpec"]["vcenterDetails"]["vcenterCluster"]
         if str(cluster_name).__contains__("/"):
             cluster_name = cluster_name[cluster_name.rindex("/") + 1:]
         id = getClusterID(vcenter_ip, vcenter_username, password, cluster_name)
@@ -711,25 +710,25 @@ def createNameSpace(vcenter_ip, vcenter_username, password):
         if status[0] == "SUCCESS":
             return "SUCCESS", name_space + " already created"
         try:
-            cpu_limit = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+            cpu_limit = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
                 'tkgsVsphereNamespaceResourceSpec']['cpuLimit']
         except Exception as e:
             cpu_limit = ""
             current_app.logger.info("CPU Limit is not provided, will continue without setting Custom CPU Limit")
         try:
-            memory_limit = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+            memory_limit = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
                 'tkgsVsphereNamespaceResourceSpec']['memoryLimit']
         except Exception as e:
             memory_limit = ""
             current_app.logger.info("Memory Limit is not provided, will continue without setting Custom Memory Limit")
         try:
-            storage_limit = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+            storage_limit = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
                 'tkgsVsphereNamespaceResourceSpec']['storageRequestLimit']
         except Exception as e:
             storage_limit = ""
             current_app.logger.info("Storage Request Limit is not provided, will continue without setting Custom "
                                     "Storage Request Limit")
-        content_library = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+        content_library = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
             'tkgsVsphereNamespaceContentLibrary']
         resource_spec = getBodyResourceSpec(cpu_limit, memory_limit, storage_limit)
         if not content_library:
@@ -737,9 +736,9 @@ def createNameSpace(vcenter_ip, vcenter_username, password):
         lib = getLibraryId(vcenter_ip, vcenter_username, password, content_library)
         if lib is None:
             return None, "Failed to get content library id " + content_library
-        name_space_vm_classes = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+        name_space_vm_classes = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
             'tkgsVsphereNamespaceVmClasses']
-        storage_specs = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+        storage_specs = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
             'tkgsVsphereNamespaceStorageSpec']
         list_storage = []
         for storage_spec in storage_specs:
@@ -755,7 +754,7 @@ def createNameSpace(vcenter_ip, vcenter_username, password):
                     list_storage.append(dict(limit=storage_spec["storageLimit"], policy=policy_id[0]))
             else:
                 list_storage.append(dict(policy=policy_id[0]))
-        workload_network = request.get_json(force=True)['tkgsComponentSpec']['tkgsWorkloadNetwork'][
+        workload_network = RequestSpec.json()['tkgsComponentSpec']['tkgsWorkloadNetwork'][
             'tkgsWorkloadNetworkName']
         network_status = checkWorkloadNetwork(vcenter_ip, vcenter_username, password, id[0], workload_network)
         if network_status[1] and network_status[0] == "SUCCESS":
@@ -802,13 +801,13 @@ def createNameSpace(vcenter_ip, vcenter_username, password):
 
 
 def create_workload_network(vCenter, vc_user, password, cluster_id, network_name):
-    worker_cidr = request.get_json(force=True)['tkgsComponentSpec']['tkgsWorkloadNetwork'][
+    worker_cidr = RequestSpec.json()['tkgsComponentSpec']['tkgsWorkloadNetwork'][
         'tkgsWorkloadNetworkGatewayCidr']
-    start = request.get_json(force=True)['tkgsComponentSpec']['tkgsWorkloadNetwork']['tkgsWorkloadNetworkStartRange']
-    end = request.get_json(force=True)['tkgsComponentSpec']['tkgsWorkloadNetwork']['tkgsWorkloadNetworkEndRange']
-    port_group_name = request.get_json(force=True)['tkgsComponentSpec']['tkgsWorkloadNetwork'][
+    start = RequestSpec.json()['tkgsComponentSpec']['tkgsWorkloadNetwork']['tkgsWorkloadNetworkStartRange']
+    end = RequestSpec.json()['tkgsComponentSpec']['tkgsWorkloadNetwork']['tkgsWorkloadNetworkEndRange']
+    port_group_name = RequestSpec.json()['tkgsComponentSpec']['tkgsWorkloadNetwork'][
         'tkgsWorkloadPortgroupName']
-    datacenter = request.get_json(force=True)['envSpec']['vcenterDetails']['vcenterDatacenter']
+    datacenter = RequestSpec.json()['envSpec']['vcenterDetails']['vcenterDatacenter']
     if str(datacenter).__contains__("/"):
         datacenter = datacenter[datacenter.rindex("/") + 1:]
     if not (worker_cidr or start or end or port_group_name):
@@ -918,7 +917,7 @@ def checkNameSpaceRunningStatus(url, header, name_space, cluster_id):
 def attach_proxy_tkgs_workload_to_tmc():
     proxyEnabled = False
     try:
-        isProxyEnabled = request.get_json(force=True)['tkgsComponentSpec']['tkgServiceConfig']['proxySpec'][
+        isProxyEnabled = RequestSpec.json()['tkgsComponentSpec']['tkgServiceConfig']['proxySpec'][
             'enableProxy']
         if str(isProxyEnabled).lower() == "true":
             proxyEnabled = True
@@ -930,16 +929,16 @@ def attach_proxy_tkgs_workload_to_tmc():
         proxy_name = Tkgs_Extension_Details.TKGS_PROXY_CREDENTIAL_NAME
         try:
             name_space = \
-                request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+                RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
                     'tkgsVsphereWorkloadClusterSpec']['tkgsVsphereNamespaceName']
 
-            workload_name = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+            workload_name = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
                 'tkgsVsphereWorkloadClusterSpec']['tkgsVsphereWorkloadClusterName']
-            tmc_url = request.get_json(force=True)['envSpec']['saasEndpoints']['tmcDetails']['tmcInstanceURL']
+            tmc_url = RequestSpec.json()['envSpec']['saasEndpoints']['tmcDetails']['tmcInstanceURL']
             current_app.logger.info("Getting health information of cluster " + workload_name)
-            mgmt = request.get_json(force=True)['envSpec']["saasEndpoints"]['tmcDetails']['tmcSupervisorClusterName']
+            mgmt = RequestSpec.json()['envSpec']["saasEndpoints"]['tmcDetails']['tmcSupervisorClusterName']
             url = tmc_url + "/v1alpha1/managementclusters/" + mgmt + "/provisioners/" + name_space + "/tanzukubernetesclusters"
-            refreshToken = request.get_json(force=True)['envSpec']['saasEndpoints']['tmcDetails']['tmcRefreshToken']
+            refreshToken = RequestSpec.json()['envSpec']['saasEndpoints']['tmcDetails']['tmcRefreshToken']
 
             url = "https://console.cloud.vmware.com/csp/gateway/am/api/auth/api-tokens/authorize?refresh_token=" + refreshToken
             headers = {}
@@ -980,7 +979,7 @@ def attach_proxy_tkgs_workload_to_tmc():
                         return None, workload_name + " is  not in  ready state phase " + phase + " status " + status
             if isClusterReady:
                 current_app.logger.info("Configuring proxy in workload cluster " + workload_name)
-                clusterGroup = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+                clusterGroup = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
                     'tkgsVsphereWorkloadClusterSpec']["tkgsWorkloadClusterGroupName"]
                 if not clusterGroup:
                     clusterGroup = "default"
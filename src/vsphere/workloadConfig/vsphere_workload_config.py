@@ -6,7 +6,7 @@ import logging
 import sys
 
 logger = logging.getLogger(__name__)
-from flask import jsonify, request, make_response
+from flask import jsonify, make_response
 import requests
 from tqdm import tqdm
 import time
@@ -35,13 +35,13 @@ from vsphere.managementConfig.vsphere_management_config import controllerDeploym
     changeSeGroupAndSetInterfaces
 from common.operation.constants import ResourcePoolAndFolderName, Vcenter, GroupNameCgw, GroupNameMgw, FirewallRuleMgw, \
     ControllerLocation, Env, Policy_Name, Paths, TmcUser
-from common.common_utilities import isAviHaEnabled, getDomainName, getTier1Details, grabNsxtHeaders, getList, \
+from common.common_utilities import isAviHaEnabled, readNsxtDesiredState, getTransportZone, \
     obtain_second_csrf, \
     preChecks, get_avi_version, envCheck, getClusterStatusOnTanzu, \
     getCloudStatus, getSECloudStatus, createResourceFolderAndWait, getVrfAndNextRoutId, addStaticRoute, VrfType, \
     checkAirGappedIsEnabled, registerWithTmcOnSharedAndWorkload, deployCluster, registerTanzuObservability, \
-    checkWorkloadProxyEnabled, registerTSM, getNetworkFolder, getNetworkIp, createNsxtSegment, createGroup, \
-    createFirewallRule, checkObjectIsPresentAndReturnPath, downloadAndPushKubernetesOvaMarketPlace, isEnvTkgs_wcp, \
+    checkWorkloadProxyEnabled, registerTSM, getNetworkFolder, getNetworkIp, nsxtSegmentPayload, nsxtGroupExpression, \
+    nsxtGatewayPolicyPayload, downloadAndPushKubernetesOvaMarketPlace, isEnvTkgs_wcp, \
     checkTmcEnabled, isEnvTkgs_ns, checTSMEnabled, checkToEnabled, getKubeVersionFullName, getNetworkPathTMC, \
     createProxyCredentialsTMC, checkTmcRegister, checkDataProtectionEnabled, enable_data_protection, \
     checkEnableIdentityManagement, checkPinnipedInstalled, checkPinnipedServiceStatus, \
@@ -49,7 +49,7 @@ from common.common_utilities import isAviHaEnabled, getDomainName, getTier1Detai
     checkDataProtectionEnabledVelero, getClusterID
 from common.operation.ShellHelper import runShellCommandAndReturnOutput, grabKubectlCommand, grabIpAddress, \
     verifyPodsAreRunning, grabPipeOutput, runShellCommandAndReturnOutputAsList, runProcess, \
-    runShellCommandAndReturnOutputAsListWithChangedDir, grabPipeOutputChagedDir, runShellCommandWithPolling
+    runShellCommandAndReturnOutputAsListWithChangedDir, runShellCommandWithPolling
 from common.operation.constants import SegmentsName, RegexPattern, Versions, AkoType, AppName, FirewallRuleCgw, \
     ServiceName, \
     Cloud, Type, PLAN, Sizing, Tkg_version
@@ -58,6 +58,8 @@ from vsphere.managementConfig.vsphere_management_config import updateIpam_profil
     updateNetworkWithIpPools, getNetworkDetails, createSECloud_Arch, getClusterUrl, createSECloud_Arch, getNetworkUrl, \
     seperateNetmaskAndIp, createSECloud, getCloudConnectUser, fetchTier1GatewayId
 from requests.packages.urllib3.exceptions import InsecureRequestWarning
+from common.util.avi_client import AviClient
+from common.util.request_spec import RequestSpec
 from vmc.workloadConfig.workload_config import connectToWorkLoadCluster
 from vsphere.workloadConfig.vsphere_tkgs_workload import createTkgWorkloadCluster, createNameSpace
 
@@ -121,11 +123,11 @@ def networkConfig():
     cluster_name = current_app.config['VC_CLUSTER']
     data_center = current_app.config['VC_DATACENTER']
     data_store = current_app.config['VC_DATASTORE']
-    refToken = request.get_json(force=True)['envSpec']['marketplaceSpec']['refreshToken']
+    refToken = RequestSpec.json()['envSpec']['marketplaceSpec']['refreshToken']
     if env == Env.VSPHERE or env == Env.VCF:
         if not (isEnvTkgs_ns(env) or isEnvTkgs_wcp(env)):
-            kubernetes_ova_os = request.get_json(force=True)["tkgWorkloadComponents"]["tkgWorkloadBaseOs"]
-            kubernetes_ova_version = request.get_json(force=True)["tkgWorkloadComponents"]["tkgWorkloadKubeVersion"]
+            kubernetes_ova_os = RequestSpec.json()["tkgWorkloadComponents"]["tkgWorkloadBaseOs"]
+            kubernetes_ova_version = RequestSpec.json()["tkgWorkloadComponents"]["tkgWorkloadKubeVersion"]
             if refToken:
                 current_app.logger.info("Kubernetes OVA configs for workload cluster")
                 down_status = downloadAndPushKubernetesOvaMarketPlace(env, kubernetes_ova_version, kubernetes_ova_os)
@@ -141,16 +143,16 @@ def networkConfig():
                 current_app.logger.info(
                     "MarketPlace refresh token is not provided, skipping the download of kubernetes ova")
     if env == Env.VSPHERE:
-        workload_network_name = request.get_json(force=True)['tkgWorkloadDataNetwork'][
+        workload_network_name = RequestSpec.json()['tkgWorkloadDataNetwork'][
             'tkgWorkloadDataNetworkName']
     if env == Env.VCF:
-        workload_network_name = request.get_json(force=True)['tkgComponentSpec']['tkgClusterVipNetwork'][
+        workload_network_name = RequestSpec.json()['tkgComponentSpec']['tkgClusterVipNetwork'][
             'tkgClusterVipNetworkName']
         pass
         #try:
-            #gatewayAddress = request.get_json(force=True)['tkgWorkloadDataNetwork'][
+            #gatewayAddress = RequestSpec.json()['tkgWorkloadDataNetwork'][
                 #'tkgWorkloadDataNetworkGatewayCidr']
-            #dnsServers = request.get_json(force=True)['envSpec']['infraComponents']['dnsServersIp']
+            #dnsServers = RequestSpec.json()['envSpec']['infraComponents']['dnsServersIp']
             #network = getNetworkIp(gatewayAddress)
             #shared_segment = createNsxtSegment(workload_network_name, gatewayAddress,
                                                #None,
@@ -171,10 +173,10 @@ def networkConfig():
                 #"STATUS_CODE": 500
             #}
             #return jsonify(d), 500
-    avi_fqdn = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController01Fqdn']
+    avi_fqdn = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviController01Fqdn']
     ##########################################################
     if isAviHaEnabled(env):
-        ip = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviClusterFqdn']
+        ip = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviClusterFqdn']
     else:
         ip = avi_fqdn
     if ip is None:
@@ -187,13 +189,13 @@ def networkConfig():
         return jsonify(d), 500
     isNonOrchestrated = False
     try:
-        mode = request.get_json(force=True)["tkgComponentSpec"]["aviComponents"]["modeOfDeployment"]
+        mode = RequestSpec.json()["tkgComponentSpec"]["aviComponents"]["modeOfDeployment"]
         if mode == "non-orchestrated":
             isNonOrchestrated = True
     except:
         isNonOrchestrated = False
     if isNonOrchestrated:
-        workload_vip = request.get_json(force=True)['tkgWorkloadDataNetwork']['tkgWorkloadDataNetworkName']
+        workload_vip = RequestSpec.json()['tkgWorkloadDataNetwork']['tkgWorkloadDataNetworkName']
         status = create_archostrated(ip, vcenter_ip, vcenter_username, password, data_center, data_store, cluster_name,
                                      workload_vip, aviVersion, env)
         if status[1] != 200:
@@ -238,7 +240,7 @@ def networkConfig():
             return jsonify(d), 500
         else:
             cloud_url = get_cloud[0]
-        cluster_name = request.get_json(force=True)["envSpec"]["vcenterDetails"]["vcenterCluster"]
+        cluster_name = RequestSpec.json()["envSpec"]["vcenterDetails"]["vcenterCluster"]
         if env == Env.VSPHERE:
             cluster_status = getClusterUrl(ip, csrf2, cluster_name, aviVersion)
             if cluster_status[0] is None:
@@ -307,12 +309,12 @@ def networkConfig():
             se_cloud_url = cloud_se[0]
         else:
             se_cloud_url = get_se_cloud[0]
-        management_cluster = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+        management_cluster = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
             'tkgMgmtClusterName']
         if env == Env.VSPHERE:
-            data_network_workload = request.get_json(force=True)["tkgWorkloadDataNetwork"]["tkgWorkloadDataNetworkName"]
+            data_network_workload = RequestSpec.json()["tkgWorkloadDataNetwork"]["tkgWorkloadDataNetworkName"]
         else:
-            data_network_workload = request.get_json(force=True)['tkgComponentSpec']['tkgClusterVipNetwork'][
+            data_network_workload = RequestSpec.json()['tkgComponentSpec']['tkgClusterVipNetwork'][
                 'tkgClusterVipNetworkName']
         get_management_data_pg = getNetworkUrl(ip, csrf2, data_network_workload, aviVersion)
         if get_management_data_pg[0] is None:
@@ -324,15 +326,15 @@ def networkConfig():
             }
             return jsonify(d), 500
         if env == Env.VSPHERE:
-            startIp = request.get_json(force=True)["tkgWorkloadDataNetwork"]["tkgWorkloadAviServiceIpStartRange"]
-            endIp = request.get_json(force=True)["tkgWorkloadDataNetwork"]["tkgWorkloadAviServiceIpEndRange"]
+            startIp = RequestSpec.json()["tkgWorkloadDataNetwork"]["tkgWorkloadAviServiceIpStartRange"]
+            endIp = RequestSpec.json()["tkgWorkloadDataNetwork"]["tkgWorkloadAviServiceIpEndRange"]
             prefixIpNetmask = seperateNetmaskAndIp(
-                request.get_json(force=True)["tkgWorkloadDataNetwork"]["tkgWorkloadDataNetworkGatewayCidr"])
+                RequestSpec.json()["tkgWorkloadDataNetwork"]["tkgWorkloadDataNetworkGatewayCidr"])
         else:
-            startIp = request.get_json(force=True)['tkgComponentSpec']['tkgClusterVipNetwork']['tkgClusterVipIpStartRange']
-            endIp = request.get_json(force=True)['tkgComponentSpec']['tkgClusterVipNetwork']['tkgClusterVipIpEndRange']
+            startIp = RequestSpec.json()['tkgComponentSpec']['tkgClusterVipNetwork']['tkgClusterVipIpStartRange']
+            endIp = RequestSpec.json()['tkgComponentSpec']['tkgClusterVipNetwork']['tkgClusterVipIpEndRange']
             prefixIpNetmask = seperateNetmaskAndIp(
-                request.get_json(force=True)['tkgComponentSpec']['tkgClusterVipNetwork']['tkgClusterVipNetworkGatewayCidr'])
+                RequestSpec.json()['tkgComponentSpec']['tkgClusterVipNetwork']['tkgClusterVipNetworkGatewayCidr'])
         getManagementDetails_data_pg = getNetworkDetails(ip, csrf2, get_management_data_pg[0], startIp, endIp,
                                                          prefixIpNetmask[0], prefixIpNetmask[1], aviVersion)
         if getManagementDetails_data_pg[0] is None:
@@ -447,7 +449,7 @@ def networkConfig():
                 "STATUS_CODE": 500
             }
             return jsonify(d), 500
-        workload_cluster_name = request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadClusterName']
+        workload_cluster_name = RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadClusterName']
         if not createClusterFolder(workload_cluster_name):
             d = {
                 "responseType": "ERROR",
@@ -457,9 +459,9 @@ def networkConfig():
             return jsonify(d), 500
         current_app.logger.info(
             "The config files for shared services cluster will be located at: " + Paths.CLUSTER_PATH + workload_cluster_name)
-        cluster_vip_name = request.get_json(force=True)['tkgComponentSpec']['tkgClusterVipNetwork'][
+        cluster_vip_name = RequestSpec.json()['tkgComponentSpec']['tkgClusterVipNetwork'][
             'tkgClusterVipNetworkName']
-        cluster_vip_cidr = request.get_json(force=True)["tkgComponentSpec"]['tkgClusterVipNetwork'][
+        cluster_vip_cidr = RequestSpec.json()["tkgComponentSpec"]['tkgClusterVipNetwork'][
             "tkgClusterVipNetworkGatewayCidr"]
         if env == Env.VCF:
             headers = {
@@ -484,7 +486,7 @@ def networkConfig():
             tier1 = status_tier1
         else:
             tier1 = ""
-        workload_network_name = request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadNetworkName']
+        workload_network_name = RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadNetworkName']
         createAkoFile(ip, workload_cluster_name, wip[0], data_network_workload, cluster_vip_name, workload_network_name,
                       cluster_vip_cidr, tier1, env)
         lisOfCommand = ["kubectl", "apply", "-f",
@@ -502,7 +504,7 @@ def networkConfig():
                 return jsonify(d), 500
         current_app.logger.info("Applied ako successfully")
         if env == Env.VCF:
-            teir1name = str(request.get_json(force=True)['envSpec']['vcenterDetails']["nsxtTier1RouterDisplayName"])
+            teir1name = str(RequestSpec.json()['envSpec']['vcenterDetails']["nsxtTier1RouterDisplayName"])
             vrf_vip = getVrfAndNextRoutId(ip, csrf2, uuid, teir1name, prefixIpNetmask[0], aviVersion)
             if vrf_vip[0] is None or vrf_vip[1] == "NOT_FOUND":
                 current_app.logger.error("Cluster vip Vrf not found " + str(vrf_vip[1]))
@@ -600,9 +602,9 @@ def create_workload():
     current_app.logger.info("Successfully created workload cluster")
     if checkTmcEnabled(env):
         current_app.logger.info("Initiating TKGs SAAS integration")
-        size = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+        size = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
             'tkgsVsphereWorkloadClusterSpec']['workerNodeCount']
-        workload_cluster_name = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+        workload_cluster_name = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
             'tkgsVsphereWorkloadClusterSpec']['tkgsVsphereWorkloadClusterName']
         if checkToEnabled(env):
             to = registerTanzuObservability(workload_cluster_name, env, size)
@@ -617,7 +619,7 @@ def create_workload():
         else:
             current_app.logger.info("Tanzu Observability not enabled")
         if checTSMEnabled(env):
-            cluster_version = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+            cluster_version = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
                 'tkgsVsphereWorkloadClusterSpec']['tkgsVsphereWorkloadClusterVersion']
             if not cluster_version.startswith('v'):
                 cluster_version = 'v' + cluster_version
@@ -639,7 +641,7 @@ def create_workload():
             current_app.logger.info("TSM not enabled")
 
         if checkDataProtectionEnabled(Env.VSPHERE, "workload"):
-            supervisor_cluster = request.get_json(force=True)['envSpec']["saasEndpoints"]['tmcDetails'][
+            supervisor_cluster = RequestSpec.json()['envSpec']["saasEndpoints"]['tmcDetails'][
                 'tmcSupervisorClusterName']
             is_enabled = enable_data_protection(env, workload_cluster_name, supervisor_cluster)
             if not is_enabled[0]:
@@ -673,7 +675,7 @@ def create_workload():
                 "Content-Type": "application/json",
                 "vmware-api-session-id": session_id
             }
-            cluster_name = request.get_json(force=True)["envSpec"]["vcenterDetails"]["vcenterCluster"]
+            cluster_name = RequestSpec.json()["envSpec"]["vcenterDetails"]["vcenterCluster"]
             if str(cluster_name).__contains__("/"):
                 cluster_name = cluster_name[cluster_name.rindex("/") + 1:]
             id = getClusterID(vcenter_ip, vcenter_username, password, cluster_name)
@@ -690,10 +692,10 @@ def create_workload():
                 }
                 return jsonify(d), 500
             cluster_endpoint = clusterip_resp.json()["api_server_cluster_endpoint"]
-            workload_cluster_name = request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+            workload_cluster_name = RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
                 'tkgsVsphereWorkloadClusterSpec']['tkgsVsphereWorkloadClusterName']
             name_space = \
-                request.get_json(force=True)['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
+                RequestSpec.json()['tkgsComponentSpec']["tkgsVsphereNamespaceSpec"][
                     'tkgsVsphereWorkloadClusterSpec']['tkgsVsphereNamespaceName']
             switch_context_workload = ["kubectl", "vsphere", "login",  "--server", cluster_endpoint, "--vsphere-username",
                                        vcenter_username, "--tanzu-kubernetes-cluster-name", workload_cluster_name,
@@ -751,8 +753,7 @@ def deploy():
             "STATUS_CODE": 500
         }
         return jsonify(d), 500
-    json_dict = request.get_json(force=True)
-    vsSpec = VsphereMasterSpec.parse_obj(json_dict)
+    vsSpec = RequestSpec.model(VsphereMasterSpec)
     env = env[0]
     aviVersion = get_avi_version(env)
     password = current_app.config['VC_PASSWORD']
@@ -764,169 +765,96 @@ def deploy():
     parent_resourcePool = current_app.config['RESOURCE_POOL']
     if env == Env.VCF:
         try:
-            gatewayAddress = request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadGatewayCidr']
-            dhcp_start = request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadDhcpStartRange']
-            dhcp_end = request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadDhcpEndRange']
-            dnsServers = request.get_json(force=True)['envSpec']['infraComponents']['dnsServersIp']
-            network = getNetworkIp(gatewayAddress)
-            workload_network_name = request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadNetworkName']
-            workload_segment = createNsxtSegment(workload_network_name, gatewayAddress,
-                                                 dhcp_start,
-                                                 dhcp_end, dnsServers, network, True)
-            if workload_segment[1] != 200:
-                current_app.logger.error("Failed to create workload segments" + str(workload_segment[0].json["msg"]))
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Failed to create workload segments" + str(workload_segment[0].json["msg"]),
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-            worklod_group = createGroup(GroupNameCgw.DISPLAY_NAME_VCF_TKG_Workload_Networks_Group_CGW,
-                                        workload_network_name,
-                                        False, None)
-            if worklod_group[1] != 200:
-                current_app.logger.error(
-                    "Failed to create  group " + GroupNameCgw.DISPLAY_NAME_VCF_TKG_Workload_Networks_Group_CGW + " " + str(
-                        worklod_group[0].json["msg"]))
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Failed to create group " + GroupNameCgw.DISPLAY_NAME_VCF_TKG_Workload_Networks_Group_CGW + " " + str(
-                        worklod_group[0].json["msg"]),
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-            headers_ = grabNsxtHeaders()
-            if headers_[0] is None:
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Failed to nsxt info " + str(headers_[1]),
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-            domainName = getDomainName(headers_, "default")
-            if domainName[0] is None:
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Failed to get domain name " + str(domainName[1]),
-                    "STATUS_CODE": 500
-                }
-                return jsonify(d), 500
-            uri = "https://" + headers_[2] + "/policy/api/v1/infra/domains/" + domainName[0] + "/groups"
-            output = getList(headers_[1], uri)
-            if output[1] != 200:
-                current_app.logger.error("Failed to get list of groups " + str(output[0]))
+            nsxt = readNsxtDesiredState()
+            if nsxt[0] is None:
+                current_app.logger.error(nsxt[1])
                 d = {
                     "responseType": "ERROR",
-                    "msg": "Failed to get list of groups " + str(output[0]),
+                    "msg": nsxt[1],
                     "STATUS_CODE": 500
                 }
                 return jsonify(d), 500
-            teir1 = getTier1Details(headers_)
-            if teir1[0] is None:
+            nsxt = nsxt[0]
+            teir1 = nsxt.tier1_path(RequestSpec.json()['envSpec']['vcenterDetails']["nsxtTier1RouterDisplayName"])
+            if teir1 is None:
                 d = {
                     "responseType": "ERROR",
-                    "msg": "Failed to tier1 details" + str(headers_[1]),
+                    "msg": "Failed to get Tier1 details NOT_FOUND",
                     "STATUS_CODE": 500
                 }
                 return jsonify(d), 500
-            payload = {"action": "ALLOW",
-                       "display_name": FirewallRuleCgw.DISPLAY_NAME_VCF_WORKLOAD_TKG_and_AVI_DNS,
-                       "logged": False,
-                       "source_groups": [
-                           checkObjectIsPresentAndReturnPath(output[0],
-                                                             GroupNameCgw.DISPLAY_NAME_VCF_TKG_Workload_Networks_Group_CGW)[
-                               1],
-                           checkObjectIsPresentAndReturnPath(output[0],
-                                                             GroupNameCgw.DISPLAY_NAME_VCF_TKG_Management_Network_Group_CGW)[
-                               1]
-                       ],
-                       "destination_groups": [
-                           checkObjectIsPresentAndReturnPath(output[0],
-                                                             GroupNameCgw.DISPLAY_NAME_VCF_DNS_IPs_Group)[
-                               1],
-                           checkObjectIsPresentAndReturnPath(output[0],
-                                                             GroupNameCgw.DISPLAY_NAME_VCF_NTP_IPs_Group)[
-                               1],
-                           checkObjectIsPresentAndReturnPath(output[0],
-                                                             GroupNameCgw.DISPLAY_NAME_VCF_TKG_Workload_Networks_Group_CGW)[
-                               1],
-                           checkObjectIsPresentAndReturnPath(output[0],
-                                                             GroupNameCgw.DISPLAY_NAME_VCF_CLUSTER_VIP_NETWORK_Group_CGW)[
-                               1]
-                       ],
-                       "services": ["/infra/services/DNS",
-                                    "/infra/services/DNS-UDP",
-                                    "/infra/services/NTP",
-                                    "/infra/services/" + ServiceName.KUBE_VIP_VCF_SERVICE],
-                       "scope": [teir1[0]]
-                       }
-            fw = createFirewallRule(Policy_Name.POLICY_NAME, FirewallRuleCgw.DISPLAY_NAME_VCF_WORKLOAD_TKG_and_AVI_DNS,
-                                    payload)
-            if fw[1] != 200:
-                current_app.logger.error(
-                    "Failed to create firewall " + FirewallRuleCgw.DISPLAY_NAME_VCF_WORKLOAD_TKG_and_AVI_DNS + " " + str(
-                        fw[0].json["msg"]))
+            overlay = str(RequestSpec.json()['envSpec']['vcenterDetails']["nsxtOverlay"])
+            trz = getTransportZone(nsxt.address, overlay, nsxt.headers)
+            if trz[0] is None:
                 d = {
                     "responseType": "ERROR",
-                    "msg": "Failed to create firewall " + GroupNameCgw.DISPLAY_NAME_VCF_WORKLOAD_TKG_and_AVI_DNS + " " + str(
-                        fw[0].json["msg"]),
+                    "msg": "Failed to get transport zone ID " + str(trz[1]),
                     "STATUS_CODE": 500
                 }
                 return jsonify(d), 500
-            payload = {"action": "ALLOW",
-                       "display_name": FirewallRuleCgw.DISPLAY_NAME_VCF_TKG_WORKLOAD_to_vCenter,
-                       "logged": False,
-                       "source_groups": [
-                           checkObjectIsPresentAndReturnPath(output[0],
-                                                             GroupNameCgw.DISPLAY_NAME_VCF_TKG_Workload_Networks_Group_CGW)[
-                               1]
-                       ],
-                       "destination_groups": [
-                           checkObjectIsPresentAndReturnPath(output[0],
-                                                             GroupNameCgw.DISPLAY_NAME_VCF_vCenter_IP_Group)[
-                               1]
-                       ],
-                       "services": ["/infra/services/HTTPS"],
-                       "scope": [teir1[0]]
-                       }
-            fw = createFirewallRule(Policy_Name.POLICY_NAME, FirewallRuleCgw.DISPLAY_NAME_VCF_TKG_WORKLOAD_to_vCenter,
-                                    payload)
-            if fw[1] != 200:
-                current_app.logger.error(
-                    "Failed to create firewall " + FirewallRuleCgw.DISPLAY_NAME_VCF_TKG_WORKLOAD_to_vCenter + " " + str(
-                        fw[0].json["msg"]))
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Failed to create firewall " + GroupNameCgw.DISPLAY_NAME_VCF_TKG_WORKLOAD_to_vCenter + " " + str(
-                        fw[0].json["msg"]),
-                    "STATUS_CODE": 500
+            gatewayAddress = RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadGatewayCidr']
+            dhcp_start = RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadDhcpStartRange']
+            dhcp_end = RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadDhcpEndRange']
+            dnsServers = RequestSpec.json()['envSpec']['infraComponents']['dnsServersIp']
+            network = getNetworkIp(gatewayAddress)
+            workload_network_name = RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadNetworkName']
+            workload_segment = nsxt.segment(workload_network_name,
+                                            nsxtSegmentPayload(workload_network_name, gatewayAddress, dhcp_start,
+                                                               dhcp_end, dnsServers, network, True, teir1, trz[0]))
+            worklod_group = nsxt.group(GroupNameCgw.DISPLAY_NAME_VCF_TKG_Workload_Networks_Group_CGW,
+                                       nsxtGroupExpression(workload_segment, False, None))
+            nsxt.gateway_policy(Policy_Name.POLICY_NAME, nsxtGatewayPolicyPayload(Policy_Name.POLICY_NAME, teir1))
+            rules = {
+                FirewallRuleCgw.DISPLAY_NAME_VCF_WORKLOAD_TKG_and_AVI_DNS: {
+                    "source_groups": [
+                        worklod_group,
+                        nsxt.path("Group", GroupNameCgw.DISPLAY_NAME_VCF_TKG_Management_Network_Group_CGW)
+                    ],
+                    "destination_groups": [
+                        nsxt.path("Group", GroupNameCgw.DISPLAY_NAME_VCF_DNS_IPs_Group),
+                        nsxt.path("Group", GroupNameCgw.DISPLAY_NAME_VCF_NTP_IPs_Group),
+                        worklod_group,
+                        nsxt.path("Group", GroupNameCgw.DISPLAY_NAME_VCF_CLUSTER_VIP_NETWORK_Group_CGW)
+                    ],
+                    "services": ["/infra/services/DNS",
+                                 "/infra/services/DNS-UDP",
+                                 "/infra/services/NTP",
+                                 "/infra/services/" + ServiceName.KUBE_VIP_VCF_SERVICE]
+                },
+                FirewallRuleCgw.DISPLAY_NAME_VCF_TKG_WORKLOAD_to_vCenter: {
+                    "source_groups": [worklod_group],
+                    "destination_groups": [nsxt.path("Group", GroupNameCgw.DISPLAY_NAME_VCF_vCenter_IP_Group)],
+                    "services": ["/infra/services/HTTPS"]
+                },
+                FirewallRuleCgw.DISPLAY_NAME_VCF_WORKLOAD_TKG_and_AVI_to_Internet: {
+                    "source_groups": [worklod_group],
+                    "destination_groups": ["ANY"],
+                    "services": ["ANY"]
                 }
-                return jsonify(d), 500
-            payload = {"action": "ALLOW",
-                       "display_name": FirewallRuleCgw.DISPLAY_NAME_VCF_WORKLOAD_TKG_and_AVI_to_Internet,
-                       "logged": False,
-                       "source_groups": [checkObjectIsPresentAndReturnPath(output[0],
-                                                                           GroupNameCgw.DISPLAY_NAME_VCF_TKG_Workload_Networks_Group_CGW)[
-                                             1]
-                                         ],
-                       "destination_groups": ["ANY"],
-                       "services": ["ANY"],
-                       "scope": [teir1[0]]
-                       }
-            fw = createFirewallRule(Policy_Name.POLICY_NAME,
-                                    FirewallRuleCgw.DISPLAY_NAME_VCF_WORKLOAD_TKG_and_AVI_to_Internet,
-                                    payload)
-            if fw[1] != 200:
-                current_app.logger.error(
-                    "Failed to create firewall " + FirewallRuleCgw.DISPLAY_NAME_VCF_WORKLOAD_TKG_and_AVI_to_Internet + " " + str(
-                        fw[0].json["msg"]))
+            }
+            for rule_name, rule in rules.items():
+                payload = {"action": "ALLOW",
+                           "display_name": rule_name,
+                           "logged": False,
+                           "scope": [teir1]
+                           }
+                payload.update(rule)
+                nsxt.rule(Policy_Name.POLICY_NAME, rule_name, payload)
+            created_segments = nsxt.created_segments()
+            apply = nsxt.apply()
+            if apply[1] != 200:
+                current_app.logger.error("Failed to configure NSX-T objects " + str(apply[0]))
                 d = {
                     "responseType": "ERROR",
-                    "msg": "Failed to create firewall " + GroupNameCgw.DISPLAY_NAME_VCF_WORKLOAD_TKG_and_AVI_to_Internet + " " + str(
-                        fw[0].json["msg"]),
+                    "msg": "Failed to configure NSX-T objects " + str(apply[0]),
                     "STATUS_CODE": 500
                 }
                 return jsonify(d), 500
+            current_app.logger.info(apply[0])
+            if created_segments:
+                current_app.logger.info("Created " + ", ".join(created_segments))
+                current_app.logger.info("Waiting for 1 min for status == ready")
+                time.sleep(60)
         except Exception as e:
             current_app.logger.error("Failed to configure vcf workload " + str(e))
             d = {
@@ -935,12 +863,12 @@ def deploy():
                 "STATUS_CODE": 500
             }
             return jsonify(d), 500
-    kubernetes_ova_version = request.get_json(force=True)["tkgWorkloadComponents"]["tkgWorkloadKubeVersion"]
-    pod_cidr = request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadClusterCidr']
-    service_cidr = request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadServiceCidr']
-    avi_fqdn = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviController01Fqdn']
+    kubernetes_ova_version = RequestSpec.json()["tkgWorkloadComponents"]["tkgWorkloadKubeVersion"]
+    pod_cidr = RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadClusterCidr']
+    service_cidr = RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadServiceCidr']
+    avi_fqdn = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviController01Fqdn']
     if isAviHaEnabled(env):
-        ip = request.get_json(force=True)['tkgComponentSpec']['aviComponents']['aviClusterFqdn']
+        ip = RequestSpec.json()['tkgComponentSpec']['aviComponents']['aviClusterFqdn']
     else:
         ip = avi_fqdn
     if ip is None:
@@ -962,7 +890,7 @@ def deploy():
         return jsonify(d), 500
     isNonOrchestrated = False
     try:
-        mode = request.get_json(force=True)["tkgComponentSpec"]["aviComponents"]["modeOfDeployment"]
+        mode = RequestSpec.json()["tkgComponentSpec"]["aviComponents"]["modeOfDeployment"]
         if mode == "non-orchestrated":
             isNonOrchestrated = True
     except:
@@ -1010,7 +938,7 @@ def deploy():
             "STATUS_CODE": 500
         }
         return jsonify(d), 500
-    tmc_required = str(request.get_json(force=True)['envSpec']["saasEndpoints"]['tmcDetails']['tmcAvailability'])
+    tmc_required = str(RequestSpec.json()['envSpec']["saasEndpoints"]['tmcDetails']['tmcAvailability'])
     tmc_flag = False
     if tmc_required.lower() == "true":
         tmc_flag = True
@@ -1025,14 +953,14 @@ def deploy():
             "STATUS_CODE": 500
         }
         return jsonify(d), 500
-    cluster_plan = request.get_json(force=True)['tkgWorkloadComponents'][
+    cluster_plan = RequestSpec.json()['tkgWorkloadComponents'][
         'tkgWorkloadDeploymentType']
     if cluster_plan == PLAN.DEV_PLAN:
         additional_command = ""
-        machineCount = request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadWorkerMachineCount']
+        machineCount = RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadWorkerMachineCount']
     elif cluster_plan == PLAN.PROD_PLAN:
         additional_command = "--high-availability"
-        machineCount = request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadWorkerMachineCount']
+        machineCount = RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadWorkerMachineCount']
     else:
         current_app.logger.error("Un supported control plan provided please specify prod or dev " + cluster_plan)
         d = {
@@ -1041,7 +969,7 @@ def deploy():
             "STATUS_CODE": 500
         }
         return jsonify(d), 500
-    size = str(request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadSize'])
+    size = str(RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadSize'])
     if size.lower() == "small":
         cpu = Sizing.small['CPU']
         memory = Sizing.small['MEMORY']
@@ -1059,11 +987,11 @@ def deploy():
         memory = Sizing.extraLarge['MEMORY']
         disk = Sizing.extraLarge['DISK']
     elif size.lower() == "custom":
-        cpu = request.get_json(force=True)['tkgWorkloadComponents'][
+        cpu = RequestSpec.json()['tkgWorkloadComponents'][
             'tkgWorkloadCpuSize']
-        disk = request.get_json(force=True)['tkgWorkloadComponents'][
+        disk = RequestSpec.json()['tkgWorkloadComponents'][
             'tkgWorkloadStorageSize']
-        control_plane_mem_gb = request.get_json(force=True)['tkgWorkloadComponents'][
+        control_plane_mem_gb = RequestSpec.json()['tkgWorkloadComponents'][
             'tkgWorkloadMemorySize']
         memory = str(int(control_plane_mem_gb) * 1024)
     else:
@@ -1077,10 +1005,10 @@ def deploy():
         }
         return jsonify(d), 500
     deployWorkload = False
-    workload_cluster_name = request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadClusterName']
-    management_cluster = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+    workload_cluster_name = RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadClusterName']
+    management_cluster = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
         'tkgMgmtClusterName']
-    workload_network = request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadNetworkName']
+    workload_network = RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadNetworkName']
     vsphere_password = password
     _base64_bytes = vsphere_password.encode('ascii')
     _enc_bytes = base64.b64encode(_base64_bytes)
@@ -1144,7 +1072,7 @@ def deploy():
         else:
             version = version_status[0]
 
-        clusterGroup = request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadClusterGroupName']
+        clusterGroup = RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadClusterGroupName']
 
         if not clusterGroup:
             clusterGroup = "default"
@@ -1227,8 +1155,8 @@ def deploy():
             for i in tqdm(range(150), desc="Waiting for folder to be available in tmc…", ascii=False, ncols=75):
                 time.sleep(1)
             current_app.logger.info("Deploying workload cluster")
-            os.putenv("TMC_API_TOKEN",
-                      request.get_json(force=True)["envSpec"]["saasEndpoints"]['tmcDetails']['tmcRefreshToken'])
+            os.environ["TMC_API_TOKEN"] = RequestSpec.json()["envSpec"]["saasEndpoints"]['tmcDetails'][
+                'tmcRefreshToken']
             listOfCmdTmcLogin = ["tmc", "login", "--no-configure", "-name", TmcUser.USER_VSPHERE]
             runProcess(listOfCmdTmcLogin)
             command_status = runShellCommandAndReturnOutputAsList(createWorkloadCluster)
@@ -1264,8 +1192,8 @@ def deploy():
             else:
                 if checkTmcEnabled(env):
                     current_app.logger.info("Deploying workload cluster, after verification, using tmc")
-                    os.putenv("TMC_API_TOKEN",
-                              request.get_json(force=True)["envSpec"]["saasEndpoints"]['tmcDetails']['tmcRefreshToken'])
+                    os.environ["TMC_API_TOKEN"] = RequestSpec.json()["envSpec"]["saasEndpoints"]['tmcDetails'][
+                        'tmcRefreshToken']
                     listOfCmdTmcLogin = ["tmc", "login", "--no-configure", "-name", TmcUser.USER_VSPHERE]
                     runProcess(listOfCmdTmcLogin)
                     command_status_v = runShellCommandAndReturnOutputAsList(createWorkloadCluster)
@@ -1404,29 +1332,29 @@ def deploy():
             return jsonify(d), 500
         if env == Env.VSPHERE:
             cluster_admin_users = \
-                request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadRbacUserRoleSpec'][
+                RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadRbacUserRoleSpec'][
                     'clusterAdminUsers']
             admin_users = \
-                request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadRbacUserRoleSpec'][
+                RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadRbacUserRoleSpec'][
                     'adminUsers']
             edit_users = \
-                request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadRbacUserRoleSpec'][
+                RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadRbacUserRoleSpec'][
                     'editUsers']
             view_users = \
-                request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadRbacUserRoleSpec'][
+                RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadRbacUserRoleSpec'][
                     'viewUsers']
         elif env == Env.VCF:
             cluster_admin_users = \
-                request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadRbacUserRoleSpec'][
+                RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadRbacUserRoleSpec'][
                     'clusterAdminUsers']
             admin_users = \
-                request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadRbacUserRoleSpec'][
+                RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadRbacUserRoleSpec'][
                     'adminUsers']
             edit_users = \
-                request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadRbacUserRoleSpec'][
+                RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadRbacUserRoleSpec'][
                     'editUsers']
             view_users = \
-                request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadRbacUserRoleSpec'][
+                RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadRbacUserRoleSpec'][
                     'viewUsers']
         rbac_user_status = createRbacUsers(workload_cluster_name, isMgmt=False, env=env, edit_users=edit_users,
                                            cluster_admin_users=cluster_admin_users, admin_users=admin_users,
@@ -1474,7 +1402,7 @@ def deploy():
         current_app.logger.info("TMC is deactivated")
         current_app.logger.info("Check whether data protection is to be enabled via Velero on Workload Cluster")
         if checkDataProtectionEnabledVelero(env, "workload"):
-            workload_cluster_name = request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadClusterName']
+            workload_cluster_name = RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadClusterName']
             commands_workload = ["tanzu", "cluster", "kubeconfig", "get", workload_cluster_name, "--admin"]
             kubeContextCommand_workload = grabKubectlCommand(commands_workload, RegexPattern.SWITCH_CONTEXT_KUBECTL)
             if kubeContextCommand_workload is None:
@@ -1524,39 +1452,6 @@ def deploy():
     return jsonify(d), 200
 
 
-def waitForGrepProcess(list1, list2, podName, dir):
-    cert_state = grabPipeOutputChagedDir(list1, list2, dir)
-    if cert_state[1] != 0:
-        current_app.logger.error("Failed to apply " + podName + " " + cert_state[0])
-        d = {
-            "responseType": "ERROR",
-            "msg": "Failed to apply " + podName + " " + cert_state[0],
-            "STATUS_CODE": 500
-        }
-        return jsonify(d), 500, 0
-    count_cert = 0
-    while verifyPodsAreRunning(podName, cert_state[0], RegexPattern.RUNNING) and count_cert < 10:
-        cert_state = grabPipeOutputChagedDir(list1, list2, dir)
-        time.sleep(30)
-        count_cert = count_cert + 1
-        current_app.logger.info("Waited for  " + str(count_cert * 30) + "s, retrying.")
-    if not verifyPodsAreRunning(podName, cert_state[0], RegexPattern.RUNNING):
-        current_app.logger.error(podName + " is not running on waiting " + str(count_cert * 30) + "s")
-        d = {
-            "responseType": "ERROR",
-            "msg": podName + " is not running on waiting " + str(count_cert * 30) + "s",
-            "STATUS_CODE": 500
-        }
-        return jsonify(d), 500, count_cert
-    d = {
-        "responseType": "ERROR",
-        "msg": "Failed to apply " + podName + " " + cert_state[0],
-        "STATUS_CODE": 500
-    }
-
-    return jsonify(d), 200, count_cert
-
-
 def getVipNetworkIpNetMask(ip, csrf2, name, aviVersion):
     headers = {
         "Accept": "application/json",
@@ -1569,7 +1464,7 @@ def getVipNetworkIpNetMask(ip, csrf2, name, aviVersion):
     body = {}
     url = "https://" + ip + "/api/network"
     try:
-        response_csrf = requests.request("GET", url, headers=headers, data=body, verify=False)
+        response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=body, verify=False)
         if response_csrf.status_code != 200:
             return None, response_csrf.text
         else:
@@ -1580,7 +1475,7 @@ def getVipNetworkIpNetMask(ip, csrf2, name, aviVersion):
             else:
                 next_url = None if not response_csrf.json()["next"] else response_csrf.json()["next"]
                 while len(next_url) > 0:
-                    response_csrf = requests.request("GET", next_url, headers=headers, data=body, verify=False)
+                    response_csrf = AviClient.for_controller(ip).request("GET", next_url, headers=headers, data=body, verify=False)
                     for re in response_csrf.json()["results"]:
                         if re['name'] == name:
                             for sub in re["configured_subnets"]:
@@ -1597,7 +1492,7 @@ def createAkoFile(ip, cluster_name, wipCidr, tkgMgmtDataPg, cluster_vip_name, wo
                   cluster_vip_cidr, tier1_path, env):
     if checkAirGappedIsEnabled(env):
         air_gapped_repo = str(
-            request.get_json(force=True)['envSpec']['customRepositorySpec']['tkgCustomImageRepository'])
+            RequestSpec.json()['envSpec']['customRepositorySpec']['tkgCustomImageRepository'])
         air_gapped_repo = air_gapped_repo.replace("https://", "").replace("http://", "")
         repository = air_gapped_repo + '/ako'
     else:
@@ -1655,11 +1550,11 @@ def createAkoFile(ip, cluster_name, wipCidr, tkgMgmtDataPg, cluster_vip_name, wo
 
 
 def changeNetworks(vcenter_ip, vcenter_username, password, engine_name):
-    os.putenv("GOVC_URL", "https://" + vcenter_ip + "/sdk")
-    os.putenv("GOVC_USERNAME", vcenter_username)
-    os.putenv("GOVC_PASSWORD", password)
-    os.putenv("GOVC_INSECURE", "true")
-    workload_network_name = request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadNetworkName']
+    os.environ["GOVC_URL"] = "https://" + vcenter_ip + "/sdk"
+    os.environ["GOVC_USERNAME"] = vcenter_username
+    os.environ["GOVC_PASSWORD"] = password
+    os.environ["GOVC_INSECURE"] = "true"
+    workload_network_name = RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadNetworkName']
     change_VM_Net = ["govc", "vm.network.change", "-vm=" + engine_name, "-net", workload_network_name,
                      "ethernet-2"]
     connect_VM_Net = ["govc", "device.connect", "-vm=" + engine_name, "ethernet-2"]
@@ -1671,38 +1566,6 @@ def changeNetworks(vcenter_ip, vcenter_username, password, engine_name):
     return "SUCCEES", 200
 
 
-def waitForProcess(list1, podName):
-    cert_state = runShellCommandAndReturnOutputAsList(list1)
-    if cert_state[1] != 0:
-        current_app.logger.error("Failed to apply " + podName + " " + cert_state[0])
-        d = {
-            "responseType": "ERROR",
-            "msg": "Failed to apply " + podName + " " + cert_state[0],
-            "STATUS_CODE": 500
-        }
-        return jsonify(d), 500, 0
-    count_cert = 0
-    while verifyPodsAreRunning(podName, cert_state[0], RegexPattern.RUNNING) and count_cert < 50:
-        cert_state = runShellCommandAndReturnOutputAsList(list1)
-        time.sleep(30)
-        count_cert = count_cert + 1
-        current_app.logger.info("Waited for  " + str(count_cert * 30) + "s, retrying.")
-    if not verifyPodsAreRunning(podName, cert_state[0], RegexPattern.RECONCILE_SUCCEEDED):
-        current_app.logger.error(podName + " is not running on waiting " + str(count_cert * 30) + "s")
-        d = {
-            "responseType": "ERROR",
-            "msg": podName + " is not running on waiting " + str(count_cert * 30) + "s",
-            "STATUS_CODE": 500
-        }
-        return jsonify(d), 500, count_cert
-    d = {
-        "responseType": "ERROR",
-        "msg": "Failed to apply " + podName + " " + cert_state[0],
-        "STATUS_CODE": 500
-    }
-    return jsonify(d), 200, count_cert
-
-
 def create_archostrated(ip_, vcenter_ip, vcenter_username, password, data_center, data_store, cluster_name,
                         workload_vip,
                         aviVersion, env):
@@ -1718,7 +1581,7 @@ def create_archostrated(ip_, vcenter_ip, vcenter_username, password, data_center
         }
         return jsonify(d), 500
     ip = ip[0]
-    workload_cluster_name = request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadClusterName']
+    workload_cluster_name = RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadClusterName']
     if not createClusterFolder(workload_cluster_name):
         d = {
             "responseType": "ERROR",
@@ -1874,7 +1737,7 @@ def create_archostrated(ip_, vcenter_ip, vcenter_username, password, data_center
             "STATUS_CODE": 500
         }
         return jsonify(d), 500
-    management_cluster = request.get_json(force=True)['tkgComponentSpec']['tkgMgmtComponents'][
+    management_cluster = RequestSpec.json()['tkgComponentSpec']['tkgMgmtComponents'][
         'tkgMgmtClusterName']
     commands = ["tanzu", "management-cluster", "kubeconfig", "get", management_cluster, "--admin"]
     kubeContextCommand = grabKubectlCommand(commands, RegexPattern.SWITCH_CONTEXT_KUBECTL)
@@ -1918,7 +1781,7 @@ def create_archostrated(ip_, vcenter_ip, vcenter_username, password, data_center
             "STATUS_CODE": 500
         }
         return jsonify(d), 500
-    data_network_workload = request.get_json(force=True)["tkgWorkloadDataNetwork"]["tkgWorkloadDataNetworkName"]
+    data_network_workload = RequestSpec.json()["tkgWorkloadDataNetwork"]["tkgWorkloadDataNetworkName"]
     csrf2 = obtain_second_csrf(ip, env)
     if csrf2 is None:
         current_app.logger.error("Failed to get csrf from new set password")
@@ -1938,9 +1801,9 @@ def create_archostrated(ip_, vcenter_ip, vcenter_username, password, data_center
         }
         return jsonify(d), 500
 
-    cluster_vip_name = request.get_json(force=True)['tkgComponentSpec']['tkgClusterVipNetwork'][
+    cluster_vip_name = RequestSpec.json()['tkgComponentSpec']['tkgClusterVipNetwork'][
         'tkgClusterVipNetworkName']
-    cluster_vip_cidr = request.get_json(force=True)["tkgComponentSpec"]['tkgClusterVipNetwork'][
+    cluster_vip_cidr = RequestSpec.json()["tkgComponentSpec"]['tkgClusterVipNetwork'][
         "tkgClusterVipNetworkGatewayCidr"]
     if env == Env.VCF:
         headers = {
@@ -1965,7 +1828,7 @@ def create_archostrated(ip_, vcenter_ip, vcenter_username, password, data_center
         tier1 = status_tier1
     else:
         tier1 = ""
-    workload_network_name = request.get_json(force=True)['tkgWorkloadComponents']['tkgWorkloadNetworkName']
+    workload_network_name = RequestSpec.json()['tkgWorkloadComponents']['tkgWorkloadNetworkName']
     createAkoFile(ip, workload_cluster_name, wip[0], data_network_workload, cluster_vip_name, workload_network_name,
                   cluster_vip_cidr, tier1, env)
     lisOfCommand = ["kubectl", "apply", "-f",
@@ -202,10 +202,12 @@ class GovcCommands(str, Enum):
     FIND_FOLDERS_BY_NAME = "govc find . -type f -name {folder_name} {options}"
     FIND_RESOURCE_POOLS_BY_NAME = "govc find . -type p -name {rp_name} {options}"
     FIND_NETWORKS_BY_NAME = "govc find . -type n -name {network_name} {options}"
+    FIND_ALL_BY_TYPE = "govc find . -type {type} {options}"
     CREATE_RESOURCE_POOL = "govc pool.create {options} {pool}"
     CREATE_FOLDER = "govc folder.create {options} {folder}"
     DEPLOY_LIBRARY_OVA = "govc library.deploy {options} {location} {name}"
     GET_VM_IP = "govc vm.ip -dc={datacenter} {options} {name}"
+    GET_VM_POWER_STATE = "govc object.collect -s {path} runtime.powerState"
 
 class VrfType:
     GLOBAL = "global"
@@ -0,0 +1,47 @@
+#  Copyright 2021 VMware, Inc
+#  SPDX-License-Identifier: BSD-2-Clause
+
+from util.task_graph import TaskGraph
+
+
+class ExtensionScheduler(TaskGraph):
+    """
+    TaskGraph installing the Tanzu packages of one cluster. The dependencies between
+    extensions are declared once in DEPENDENCIES: callers add only the extensions they
+    deploy, in dependency order, and each one starts as soon as the extensions it needs
+    and that are part of the run have reconciled, so Harbor, Prometheus, Grafana and
+    Fluent Bit install side by side once cert-manager and Contour are up.
+
+    All steps use the current kubectl context, so callers must not switch contexts while
+    the scheduler runs. report() gives the time each extension took.
+    """
+    REPOSITORY = "package repository"
+    CERT_MANAGER = "cert-manager"
+    CONTOUR = "contour"
+    HARBOR = "harbor"
+    PROMETHEUS = "prometheus"
+    GRAFANA = "grafana"
+    FLUENT_BIT = "fluent-bit"
+    DEPENDENCIES = {
+        CERT_MANAGER: [REPOSITORY],
+        CONTOUR: [CERT_MANAGER],
+        HARBOR: [CONTOUR],
+        PROMETHEUS: [CONTOUR],
+        GRAFANA: [CONTOUR],
+        FLUENT_BIT: [CERT_MANAGER],
+    }
+
+    def add(self, name, action, depends_on=None, timeout=None):
+        if depends_on is None:
+            depends_on = self._scheduled(self.DEPENDENCIES.get(name, []))
+        return super().add(name, action, depends_on, timeout)
+
+    def _scheduled(self, dependencies):
+        # A dependency left out of the run is replaced by what it depends on in turn.
+        scheduled = []
+        for dependency in dependencies:
+            if dependency in self.tasks:
+                scheduled.append(dependency)
+            else:
+                scheduled.extend(self._scheduled(self.DEPENDENCIES.get(dependency, [])))
+        return list(dict.fromkeys(scheduled))
@@ -19,6 +19,7 @@ from ruamel import yaml
 #from model.extensions import extensions_types, deploy_extensions
 from constants.constants import Tkg_Extention_names, Repo, RegexPattern, Extentions, AppName, Paths, Upgrade_Extensions
 import json, requests
+from util.package_catalog import PackageCatalog
 from util.common_utils import getVersionOfPackage, switchToContext, loadBomFile, \
      checkAirGappedIsEnabled, installCertManagerAndContour, getManagementCluster, verifyCluster, \
      checkToEnabled, checkFluentBitInstalled, deploy_fluent_bit, checkExtentionDeployed
@@ -444,6 +445,7 @@ def monitoringDeployment(monitoringType, jsonspec):
                                            extention.lower() + ".tanzu.vmware.com", "--version", version,
                                            "--values-file", yamlFile, "--namespace", namespace]
                     state_extention_apply = runShellCommandAndReturnOutputAsList(upgrade_extension_cmd)
+                    PackageCatalog.current().invalidate()
                     if state_extention_apply[1] != 0:
                         logger.error(
                             extention + " update command failed. Checking for reconciliation status...")
@@ -452,6 +454,7 @@ def monitoringDeployment(monitoringType, jsonspec):
                                            extention.lower() + ".tanzu.vmware.com", "--version", version,
                                            "--values-file", yamlFile, "--namespace", namespace, "--create-namespace"]
                     state_extention_apply = runShellCommandAndReturnOutputAsList(deply_extension_command)
+                    PackageCatalog.current().invalidate()
                     if state_extention_apply[1] != 0:
                         logger.error(
                             extention + " install command failed. Checking for reconciliation status...")
@@ -6,11 +6,13 @@ import json
 import requests
 from pathlib import Path
 from util.logger_helper import LoggerHelper, log
+from util.package_catalog import PackageCatalog
+from util.task_graph import api_step
 from util.ShellHelper import runShellCommandAndReturnOutputAsList, \
     runShellCommandAndReturnOutputAsListWithChangedDir, verifyPodsAreRunning, runShellCommandAndReturnOutput, \
     grabPipeOutput
 
-from constants.constants import Tkgs_Extension_Details, RegexPattern, Tkg_Extention_names, Repo, Extentions, \
+from constants.constants import Tkgs_Extension_Details, RegexPattern, Tkg_Extention_names, Extentions, \
     AppName, Paths
 from util.common_utils import getVersionOfPackage,\
      checkToEnabled, installExtentionFor14, checkRepositoryAdded, \
@@ -20,6 +22,7 @@ from util.common_utils import getVersionOfPackage,\
 
 from util.extensions_helper import checkTanzuExtensionEnabled, checkPromethusEnabled
 from .tkg_extensions import generateYamlFile, getRepo
+from .extension_scheduler import ExtensionScheduler
 
 from util.shared_config import certChanging
 
@@ -382,26 +385,15 @@ def configurePackagesRepository(jsonspec):
 
 def deploy_extensions(cluster_name, jsonspec):
     try:
-        listOfExtention = []
-        service = "all"
-        repo_address = Repo.PUBLIC_REPO
         checkHarborEnabled = jsonspec['tanzuExtensions']['harborSpec']['enableHarborExtension']
 
-        if checkPromethusEnabled(jsonspec):
-            listOfExtention.append(Tkg_Extention_names.PROMETHEUS)
-            listOfExtention.append(Tkg_Extention_names.GRAFANA)
-
-        status = tkgsCertManagerandContour(cluster_name, service, jsonspec)
-        #status = json.loads(status[0]), status[1]
-        if status[1] != 200:
-            d = {
-                "responseType": "ERROR",
-                "msg": "Failed to deploy extension" + str(status[0]),
-                "ERROR_CODE": 500
-            }
-            return json.dumps(d), 500
+        scheduler = ExtensionScheduler()
+        scheduler.add(ExtensionScheduler.REPOSITORY, api_step(lambda: checkRepositoryAdded(jsonspec)))
+        scheduler.add(ExtensionScheduler.CERT_MANAGER,
+                      api_step(lambda: installExtentionFor14("certmanager", cluster_name, jsonspec)))
+        scheduler.add(ExtensionScheduler.CONTOUR,
+                      api_step(lambda: installExtentionFor14("ingress", cluster_name, jsonspec)))
         if str(checkHarborEnabled).lower() == "true":
-            logger.info("Installing harbor...")
             str_enc = str(jsonspec['tanzuExtensions']['harborSpec']['harborPasswordBase64'])
             base64_bytes = str_enc.encode('ascii')
             enc_bytes = base64.b64decode(base64_bytes)
@@ -420,49 +412,18 @@ def deploy_extensions(cluster_name, jsonspec):
                     "ERROR_CODE": 500
                 }
                 return json.dumps(d), 500
-            state = installHarborTkgs(harborCertPath, harborCertKeyPath, harborPassword, host, cluster_name)
-            #state = json.loads(state[0]), state[1]
-            if state[1] != 200:
-                d = {
-                    "responseType": "ERROR",
-                    "msg": state[0],
-                    "ERROR_CODE": 500
-                }
-                return json.dumps(d), 500
-            else:
-                logger.info(state[0])
+            scheduler.add(ExtensionScheduler.HARBOR, api_step(
+                lambda: installHarborTkgs(harborCertPath, harborCertKeyPath, harborPassword, host, cluster_name)))
 
-        #to_enable = jsonspec["envSpec"]["saasEndpoints"]["tanzuObservabilityDetails"]["tanzuObservabilityAvailability"]
         if checkToEnabled(jsonspec):
             logger.info("Tanzu observability is enabled, skipping prometheus and grafana deployment")
-            '''d = {
-                "responseType": "ERROR",
-                "msg": "Tanzu observability is enabled, skipping prometheus and grafana deployment",
-                "ERROR_CODE": 200
-            }
-            return json.dumps(d), 200'''
+        elif not checkPromethusEnabled(jsonspec):
+            logger.info("Prometheus and Grafana are deactivated")
         else:
-            if len(listOfExtention) == 0:
-                logger.info("Prometheus and Grafana are deactivated")
-                '''d = {
-                    "responseType": "SUCCESS",
-                    "msg": "Prometheus and Grafana are deactivated",
-                    "ERROR_CODE": 200
-                }
-                return json.dumps(d), 200'''
-            else:
-                for extension_name in listOfExtention:
-                    monitor_status = deploy_monitoring_extentions(extension_name, cluster_name, jsonspec)
-                    monitor_status = json.loads(monitor_status[0]), monitor_status[1]
-                    if monitor_status[1] != 200:
-                        logger.error(monitor_status[0])
-                        d = {
-                            "responseType": "ERROR",
-                            "msg": monitor_status[0],
-                            "ERROR_CODE": 500
-                        }
-                        return json.dumps(d), 500
-                    logger.info("Extension - " + extension_name + " deployed successfully")
+            scheduler.add(ExtensionScheduler.PROMETHEUS, api_step(
+                lambda: deploy_monitoring_extentions(Tkg_Extention_names.PROMETHEUS, cluster_name, jsonspec)))
+            scheduler.add(ExtensionScheduler.GRAFANA, api_step(
+                lambda: deploy_monitoring_extentions(Tkg_Extention_names.GRAFANA, cluster_name, jsonspec)))
 
         is_enabled = fluent_bit_enabled(jsonspec)
         if is_enabled[0]:
@@ -470,65 +431,41 @@ def deploy_extensions(cluster_name, jsonspec):
             if not is_deployed[0]:
                 end_point = is_enabled[1]
                 workload_cluster = jsonspec['tanzuExtensions']['tkgClustersName']
-                response = deploy_fluent_bit(end_point, workload_cluster, jsonspec)
-                response = json.loads(response[0]), response[1]
-                if response[1] != 200:
-                    logger.error(response[0])
-                    d = {
-                        "responseType": "ERROR",
-                        "msg": response[0],
-                        "ERROR_CODE": 500
-                    }
-                    return json.dumps(d), 500
-                logger.info("Fluent-bit deployed successfully")
+                scheduler.add(ExtensionScheduler.FLUENT_BIT, api_step(
+                    lambda: deploy_fluent_bit(end_point, workload_cluster, jsonspec)))
             else:
                 logger.info("Fluent-bit is already deployed and its status is - " + is_deployed[1])
         else:
             logger.info("Fluent-bit deployment is not enabled. Hence, skipping it.")
 
-        d = {
-            "responseType": "SUCCESS",
-            "msg": "Extensions deployed successfully",
-            "ERROR_CODE": 200
-        }
-        return json.dumps(d), 200
-
-    except Exception as e:
-        logger.error(str(e))
-        d = {
-            "responseType": "ERROR",
-            "msg": "Exception occurred while deploying extensions",
-            "ERROR_CODE": 500
-        }
-        return json.dumps(d), 500
-
-
-def tkgsCertManagerandContour(cluster_name, service_name, jsonspec):
-    try:
-        status_ = checkRepositoryAdded(jsonspec)
-        #status_ = json.loads(status_[0]), status_[1]
-        if status_[1] != 200:
+        scheduler.run()
+        extensions = scheduler.report()
+        for extension in extensions:
+            logger.info(f"{extension['name']}: {extension['status']} in {extension['elapsed']}s")
+        if not scheduler.ok:
+            failure = scheduler.failures[0]
+            logger.error(f"Failed to deploy extension {failure.name}: {failure.message}")
             d = {
                 "responseType": "ERROR",
-                "msg": str(status_[0]),
-                "ERROR_CODE": 500
+                "msg": f"Failed to deploy extension {failure.name}: {failure.message}",
+                "ERROR_CODE": 500,
+                "extensions": extensions
             }
             return json.dumps(d), 500
-        install = installExtentionFor14(service_name, cluster_name, jsonspec)
-        if install[1] != 200:
-            return install[0], install[1]
-        logger.info("Configured cert-manager and contour successfully")
+
         d = {
             "responseType": "SUCCESS",
-            "msg": "Configured cert-manager and contour extensions successfully",
-            "ERROR_CODE": 200
+            "msg": "Extensions deployed successfully",
+            "ERROR_CODE": 200,
+            "extensions": extensions
         }
         return json.dumps(d), 200
+
     except Exception as e:
         logger.error(str(e))
         d = {
             "responseType": "ERROR",
-            "msg": "Exception occurred while installing Cert-manager and Contour",
+            "msg": "Exception occurred while deploying extensions",
             "ERROR_CODE": 500
         }
         return json.dumps(d), 500
@@ -632,6 +569,7 @@ def deploy_monitoring_extentions(monitoringType, clusterName, jsonspec):
                                            extention.lower() + ".tanzu.vmware.com", "--version", version,
                                            "--values-file", yamlFile, "--namespace", namespace, "--create-namespace"]
                 state_extention_apply = runShellCommandAndReturnOutputAsList(deply_extension_command)
+                PackageCatalog.current().invalidate()
                 if state_extention_apply[1] != 0:
                     logger.error(extention + "install command failed. Checking for reconciliation "
                                                          "status...")
@@ -767,20 +705,18 @@ def updateStorageClass(yamlFile, extension):
 def installHarborTkgs(harborCertPath, harborCertKeyPath, harborPassword, host, clusterName):
     main_command = ["tanzu", "package", "installed", "list", "-A"]
     sub_command = ["grep", AppName.HARBOR]
-    out = grabPipeOutput(main_command, sub_command)
-    if not (verifyPodsAreRunning(AppName.HARBOR, out[0], RegexPattern.RECONCILE_SUCCEEDED)
-            or verifyPodsAreRunning(AppName.HARBOR, out[0], RegexPattern.RECONCILE_FAILED)):
+    catalog = PackageCatalog.current()
+    if not (catalog.is_reconciled(AppName.HARBOR, RegexPattern.RECONCILE_SUCCEEDED)
+            or catalog.is_reconciled(AppName.HARBOR, RegexPattern.RECONCILE_FAILED)):
         timer = 0
         logger.info("Validating contour and cert-manager is running")
-        command = ["tanzu", "package", "installed", "list", "-A"]
-        status = runShellCommandAndReturnOutputAsList(command)
         verify_contour = False
         verify_cert_manager = False
         while timer < 600:
-            if verify_contour or verifyPodsAreRunning(AppName.CONTOUR, status[0], RegexPattern.RECONCILE_SUCCEEDED):
+            if verify_contour or catalog.is_reconciled(AppName.CONTOUR, RegexPattern.RECONCILE_SUCCEEDED):
                 logger.info("Contour is running")
                 verify_contour = True
-            if verify_cert_manager or verifyPodsAreRunning(AppName.CERT_MANAGER, status[0], RegexPattern.RECONCILE_SUCCEEDED):
+            if verify_cert_manager or catalog.is_reconciled(AppName.CERT_MANAGER, RegexPattern.RECONCILE_SUCCEEDED):
                 verify_cert_manager = True
                 logger.info("Cert Manager is running")
 
@@ -789,7 +725,7 @@ def installHarborTkgs(harborCertPath, harborCertKeyPath, harborPassword, host, c
             else:
                 timer = timer + 30
                 time.sleep(30)
-                status = runShellCommandAndReturnOutputAsList(command)
+                catalog.invalidate()
                 logger.info("Waited for " + str(timer) + "s, retrying for contour and cert manager to be "
                                                                      "running")
         if not verify_contour:
@@ -888,6 +824,7 @@ def installHarborTkgs(harborCertPath, harborCertKeyPath, harborPassword, host, c
                    state, "--values-file", Paths.CLUSTER_PATH + clusterName + "/harbor-data-values.yaml", "--namespace", "package-tanzu-system-registry",
                    "--create-namespace"]
         runShellCommandAndReturnOutputAsList(command)
+        catalog.invalidate()
 
         logger.info("Waiting for harbor installation to complete...")
         running = False
@@ -950,12 +887,10 @@ def installHarborTkgs(harborCertPath, harborCertKeyPath, harborPassword, host, c
         }
         return json.dumps(d), 200
     else:
-        logger.info("Harbor is already deployed and it's status is - " + out[0].split()[3] + " " +
-                                out[0].split()[4])
+        logger.info("Harbor is already deployed and it's status is - " + catalog.status(AppName.HARBOR))
         d = {
             "responseType": "SUCCESS",
-            "msg": "Harbor is already deployed and it's status is - " + out[0].split()[3] + " " +
-                   out[0].split()[4],
+            "msg": "Harbor is already deployed and it's status is - " + catalog.status(AppName.HARBOR),
             "ERROR_CODE": 200
         }
         return json.dumps(d), 200
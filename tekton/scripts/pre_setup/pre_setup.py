@@ -4,10 +4,10 @@
 #  SPDX-License-Identifier: BSD-2-Clause
 import json
 import os
-import ruamel.yaml # pip install ruamel.yaml
 from constants.constants import Paths, Avi_Version, Avi_Tkgs_Version, Env
 from util.avi_api_helper import obtain_avi_version, check_controller_is_up
 from util.logger_helper import LoggerHelper, log
+from util.state_store import StateStore
 from util.cmd_helper import CmdHelper
 from model.run_config import RunConfig
 from util.tkg_util import TkgUtil
@@ -317,16 +317,7 @@ class PreSetup:
         return state_dict, msg
 
     def update_state_yml(self, state_dict: dict):
-        config, ind, bsi = ruamel.yaml.util.load_yaml_guess_indent(open(self.state_file_path))
-        for key, val in state_dict.items():
-            instances = config[key]
-            for item_key, item_val in val.items():
-                if key == "workload_clusters":
-                    instances[0][item_key] = item_val
-                else:
-                    instances[item_key] = item_val
-
-        yaml = ruamel.yaml.YAML()
-        yaml.indent(mapping=ind, sequence=ind, offset=bsi)
-        with open(self.state_file_path, 'w') as fp:
-            yaml.dump(config, fp)
+        changes = dict(state_dict)
+        if "workload_clusters" in changes:
+            changes["workload_clusters"] = {0: changes["workload_clusters"]}
+        StateStore.of(self.state_file_path).patch(changes)
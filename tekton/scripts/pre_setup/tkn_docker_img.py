@@ -22,6 +22,7 @@ from util.local_cmd_helper import LocalCmdHelper
 from util import cmd_runner
 from util.common_utils import envCheck
 from util.avi_api_helper import getProductSlugId
+from util.download_helper import DownloadHelper
 logger = LoggerHelper.get_logger(name='Docker Image Creation')
 
 
@@ -222,13 +223,7 @@ class GenerateTektonDockerImage:
         :param: URL to be downloaded
         :param: dwl_file: Output file name
         """
-        with requests.get(url, stream=True) as r:
-            r.raise_for_status()
-            with open(dwl_file, 'wb') as f:
-                for chunk in r.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-        return dwl_file
+        return DownloadHelper(verify=True).download(url, dwl_file, key=url)
 
     def clean_downloads(self):
         """
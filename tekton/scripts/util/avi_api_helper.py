@@ -15,6 +15,9 @@ from constants.constants import ControllerLocation, MarketPlaceUrl, AviSize, Cer
 from constants.alb_api_constants import AlbPayload, AlbEndpoint
 from util.cmd_helper import CmdHelper
 from util.logger_helper import LoggerHelper
+from util.avi_client import AviClient
+from util.wait_helper import WaitHelper
+from util.download_helper import DownloadHelper, marketplace_file_info
 from util.govc_client import GovcClient
 from util.replace_value import replaceValueSysConfig, replaceCertConfig
 from util.vcenter_operations import verifyVcenterVersion
@@ -134,6 +137,7 @@ def pushAviToContenLibraryMarketPlace(jsonspec):
                 if metalist["appversion"] == avi_version:
                     objectid = metalist['fileid']
                     filename = metalist['name']
+                    file_info = marketplace_file_info(metalist)
                     ls.append(filename)
                     logger.info('filename: {}'.format(filename))
                     logger.info("obj id: {objectid} filename: {filename} avi_version: {avi_version}".format(objectid=objectid,
@@ -167,9 +171,10 @@ def pushAviToContenLibraryMarketPlace(jsonspec):
         if 'HTTP/1.1 200 OK' in data_read:
             logger.info('Proceed to Download')
             ova_path = "/tmp/" + ControllerLocation.CONTENT_LIBRARY_OVA_NAME + ".ova"
-            curl_download_cmd = 'curl -X GET {d_url} --output {tmp_path}'.format(d_url=download_url,
-                                                                                 tmp_path=ova_path)
-            rcmd.run_cmd_only(curl_download_cmd)
+            try:
+                DownloadHelper().download(download_url, ova_path, key=objectid, **file_info)
+            except Exception as e:
+                return None, str(e)
         else:
             logger.info('Error in presigned url/key: {} '.format(data_read.split('\n')[0]))
             return None, "Invalid key/url"
@@ -284,32 +289,19 @@ def check_controller_is_up(ip):
         "Content-Type": "application/json"
     }
     payload = {}
-    response_login = None
-    count = 0
-    status = None
-    try:
-        response_login = requests.request("GET", url, headers=headers, data=payload, verify=False)
-        status = response_login.status_code
-    except:
-        pass
-    while (status != 200 or status is None) and count < 150:
-        count = count + 1
-        try:
-            response_login = requests.request("GET", url, headers=headers, data=payload, verify=False)
-            if response_login.status_code == 200:
-                break
-        except:
-            pass
-        logger.info("Waited for  " + str(count * 10) + "s, retrying.")
-        time.sleep(10)
-    if response_login is not None:
-        if response_login.status_code != 200:
+    wait = WaitHelper.wait_for(
+        lambda: AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload, verify=False,
+                                                     with_session=False),
+        lambda response: response.status_code == 200, timeout=1500, ignore_errors=True,
+        description="AVI controller " + str(ip))
+    if wait.value is not None:
+        if wait.value.status_code != 200:
             return None
         else:
-            logger.info("Controller is up and running in   " + str(count * 10) + "s.")
+            logger.info("Controller is up and running in   " + str(int(wait.elapsed)) + "s.")
             return "UP"
     else:
-        logger.error("Controller is not reachable even after " + str(count * 10) + "s wait")
+        logger.error("Controller is not reachable even after " + str(int(wait.elapsed)) + "s wait")
         return None
 
 def obtain_first_csrf(ip):
@@ -323,7 +315,7 @@ def obtain_first_csrf(ip):
         "password": "58NFaGDJm(PJH0G"
     }
     modified_payload = json.dumps(payload, indent=4)
-    response_csrf = requests.request("POST", url, headers=headers, data=modified_payload, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("POST", url, headers=headers, data=modified_payload, verify=False, with_session=False)
     if response_csrf.status_code != 200:
         if str(response_csrf.text).__contains__("Invalid credentials"):
             return "SUCCESS"
@@ -336,29 +328,14 @@ def obtain_first_csrf(ip):
     return cookiesString['csrftoken'], cookies_string
 
 def obtain_second_csrf(ip, avienc_pass):
-    url = "https://" + str(ip) + "/login"
-    headers = {
-        "Accept": "application/json",
-        "Content-Type": "application/json"
-    }
     str_enc_avi = str(avienc_pass)
     base64_bytes_avi = str_enc_avi.encode('ascii')
     enc_bytes_avi = base64.b64decode(base64_bytes_avi)
     password_avi = enc_bytes_avi.decode('ascii').rstrip("\n")
-    payload = {
-        "username": "admin",
-        "password": password_avi
-    }
-    modified_payload = json.dumps(payload, indent=4)
-    response_csrf = requests.request("POST", url, headers=headers, data=modified_payload, verify=False)
-    if response_csrf.status_code != 200:
+    token = AviClient.for_controller(ip).login("admin", password_avi)
+    if token is None:
         return None
-    cookies_string = ""
-    cookiesString = requests.utils.dict_from_cookiejar(response_csrf.cookies)
-    for key, value in cookiesString.items():
-        cookies_string += key + "=" + value + "; "
-    # current_app.config['csrftoken'] = cookiesString['csrftoken']
-    return cookiesString['csrftoken'], cookies_string
+    return token.csrf2
 
 def set_avi_admin_password(ip, first_csrf, avi_version, aviencpass):
     headers = {
@@ -379,7 +356,7 @@ def set_avi_admin_password(ip, first_csrf, avi_version, aviencpass):
                }
     modified_payload = json.dumps(payload, indent=4)
     url = "https://" + ip + "/api/useraccount"
-    response_csrf = requests.request("PUT", url, headers=headers, data=modified_payload, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("PUT", url, headers=headers, data=modified_payload, verify=False)
     if response_csrf.status_code != 200:
         return None
     else:
@@ -398,7 +375,7 @@ def set_dns_ntp_smtp_settings(ip, second_csrf, avi_version):
         "x-csrftoken": second_csrf[0]
     }
     json_object_m = json.dumps(json_object, indent=4)
-    response_csrf = requests.request("PUT", url, headers=headers, data=json_object_m, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("PUT", url, headers=headers, data=json_object_m, verify=False)
     if response_csrf.status_code != 200:
         return None
     else:
@@ -415,7 +392,7 @@ def get_system_configuration_and_set_values(ip, second_csrf, avi_version, jsonsp
         "x-csrftoken": second_csrf[0]
     }
     payload = {}
-    response_csrf = requests.request("GET", url, headers=headers, data=payload, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload, verify=False)
     logger.info('aviversion: {}'.format(avi_version))
     logger.info('response: {}'.format(response_csrf.text))
     logger.info('response code: {}'.format(response_csrf.status_code))
@@ -461,7 +438,7 @@ def disable_welcome_screen(ip, second_csrf, avi_version):
                 },
             }
         }
-    response_csrf = requests.request("PATCH", url, headers=headers, data=json.dumps(body), verify=False)
+    response_csrf = AviClient.for_controller(ip).request("PATCH", url, headers=headers, data=json.dumps(body), verify=False)
     if response_csrf.status_code != 200:
         return None
     else:
@@ -480,19 +457,22 @@ def obtain_avi_version(ip, jsonspec):
     base64_bytes_avi = str_enc_avi.encode('ascii')
     enc_bytes_avi = base64.b64decode(base64_bytes_avi)
     password_avi = enc_bytes_avi.decode('ascii').rstrip("\n")
+    token = AviClient.for_controller(ip).login("admin", password_avi)
+    if token is not None and token.version is not None:
+        return token.version, 200
     payload = {
         "username": "admin",
         "password": password_avi
     }
     modified_payload = json.dumps(payload, indent=4)
-    response_avi = requests.request("POST", url, headers=headers, data=modified_payload, verify=False)
+    response_avi = AviClient.for_controller(ip).request("POST", url, headers=headers, data=modified_payload, verify=False, with_session=False)
     if response_avi.status_code != 200:
         default = {
             "username": "admin",
             "password": "58NFaGDJm(PJH0G"
         }
         modified_payload = json.dumps(default, indent=4)
-        response_avi = requests.request("POST", url, headers=headers, data=modified_payload, verify=False)
+        response_avi = AviClient.for_controller(ip).request("POST", url, headers=headers, data=modified_payload, verify=False, with_session=False)
         if response_avi.status_code != 200:
             return None, response_avi.text
     return response_avi.json()["version"]["Version"], 200
@@ -509,7 +489,7 @@ def get_backup_configuration(ip, second_csrf, avi_version):
     }
     body = {}
     json_object = json.dumps(body, indent=4)
-    response_csrf = requests.request("GET", url, headers=headers, data=json_object, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=json_object, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -533,7 +513,7 @@ def setBackupPhrase(ip, seconcsrf, url_backup, aviVersion, avi_backup_phrase):
         "add": {"backup_passphrase": password_avi_backup}
     }
     json_object = json.dumps(body, indent=4)
-    response_csrf = requests.request("PATCH", url, headers=headers, data=json_object, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("PATCH", url, headers=headers, data=json_object, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -550,7 +530,7 @@ def get_avi_cluster_info(ip, csrf2, aviVersion):
     }
     url = AlbEndpoint.AVI_HA.format(ip=ip)
     try:
-        response_csrf = requests.request("GET", url, headers=headers, verify=False)
+        response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, verify=False)
         if response_csrf.status_code != 200:
             return None, response_csrf.text
         return response_csrf.json(), "SUCCESS"
@@ -615,14 +595,14 @@ def form_avi_ha_cluster(ip, jsonspec, aviVersion):
                                                    cluster_ip3=avi_ip3, tennat_uuid_get=info["tenant_uuid"],
                                                    virtual_ip_get=clusterIp)
         url = AlbEndpoint.AVI_HA.format(ip=ip)
-        response_csrf = requests.request("PUT", url, headers=headers, data=payload, verify=False)
+        response_csrf = AviClient.for_controller(ip).request("PUT", url, headers=headers, data=payload, verify=False)
         if response_csrf.status_code != 200:
             logger.error('Error on HA formation: {}'.format(str(response_csrf.text)))
             return None
         count = 0
         list_of_nodes = []
         while count < 180:
-            response_csrf = requests.request("GET", url, headers=headers, verify=False)
+            response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, verify=False)
             try:
                 if len(response_csrf.json()["nodes"]) == 3:
                     for node in response_csrf.json()["nodes"]:
@@ -643,7 +623,7 @@ def form_avi_ha_cluster(ip, jsonspec, aviVersion):
         all_up = False
         while runtime < 180:
             try:
-                response_csrf = requests.request("GET", run_time_url, headers=headers, verify=False)
+                response_csrf = AviClient.for_controller(ip).request("GET", run_time_url, headers=headers, verify=False)
                 if response_csrf.status_code != 200:
                     return None, "Failed to get cluster runtime status " + (str(response_csrf.text))
                 node_statuses = response_csrf.json()["node_states"]
@@ -683,7 +663,7 @@ def import_ssl_certificate(ip, csrf2, certificate, certificate_key, avi_version)
     }
     certName = CertName.VSPHERE_CERT_NAME
     url = AlbEndpoint.IMPORT_SSL_CERTIFICATE.format(ip=ip)
-    response_csrf = requests.request("POST", url, headers=headers, data=body, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("POST", url, headers=headers, data=body, verify=False)
     if response_csrf.status_code != 201:
         return None, response_csrf.text
     else:
@@ -714,7 +694,7 @@ def get_ssl_certificate_status(ip, csrf2, name, aviVersion):
     }
     url = "https://" + ip + "/api/sslkeyandcertificate"
     json_object = json.dumps(body, indent=4)
-    response_csrf = requests.request("GET", url, headers=headers, data=json_object, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=json_object, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -740,7 +720,7 @@ def create_imported_ssl_certificate(ip, csrf2, dic, cer, key, avi_version):
         "x-csrftoken": csrf2[0]
     }
     url = AlbEndpoint.CRUD_SSL_CERT.format(ip=ip)
-    response_csrf = requests.request("POST", url, headers=headers, data=body, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("POST", url, headers=headers, data=body, verify=False)
     if response_csrf.status_code != 201:
         return None, response_csrf.text
     else:
@@ -787,7 +767,7 @@ def generate_ssl_certificate_vsphere(ip, csrf2, avi_fqdn, avi_version, jsonspec)
         "x-csrftoken": csrf2[0]
     }
     url = AlbEndpoint.CRUD_SSL_CERT.format(ip=ip)
-    response_csrf = requests.request("POST", url, headers=headers, data=body, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("POST", url, headers=headers, data=body, verify=False)
     if response_csrf.status_code != 201:
         return None, response_csrf.text
     else:
@@ -804,7 +784,7 @@ def get_current_cert_config(ip, csrf2, generated_ssl_url, avi_version):
     }
     body = {}
     url = AlbEndpoint.CRUD_SYSTEM_CONFIG.format(ip=ip)
-    response_csrf = requests.request("GET", url, headers=headers, data=body, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=body, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -831,7 +811,7 @@ def replaceWithNewCert(ip, csrf2, aviVersion):
         "x-csrftoken": csrf2[0]
     }
     url = "https://" + ip + "/api/systemconfiguration/?include_name="
-    response_csrf = requests.request("PUT", url, headers=headers, data=json_object_mo, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("PUT", url, headers=headers, data=json_object_mo, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -848,17 +828,17 @@ def configure_alb_licence(ip, csrf2, license_key, avi_version):
     }
     body = AlbPayload.LICENSE.format(serial_number=license_key)
     url = AlbEndpoint.LICENSE_URL.format(ip=ip)
-    response_csrf = requests.request("GET", url, headers=headers, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     licenses = response_csrf.json()["licenses"]
     for license in licenses:
         if license["license_string"] == license_key:
             return "SUCESS", "Already license is applied"
-    response_csrf = requests.request("PUT", url, headers=headers, data=body, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("PUT", url, headers=headers, data=body, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
-    response_csrf = requests.request("GET", url, headers=headers, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     licenses = response_csrf.json()["licenses"]
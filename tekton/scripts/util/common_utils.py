@@ -19,19 +19,23 @@ from util.extensions_helper import check_fluent_bit_http_endpoint_enabled, \
     check_fluent_bit_syslog_endpoint_enabled, check_fluent_bit_elastic_search_endpoint_enabled, \
     check_fluent_bit_kafka_endpoint_endpoint_enabled
 from util.logger_helper import LoggerHelper
+from util.avi_client import AviClient
+from util.wait_helper import WaitHelper
+from util.kube_watch import ReconcileWatcher, watch_scope
+from util.download_helper import DownloadHelper, marketplace_file_info
 import requests
 from util.avi_api_helper import getProductSlugId, obtain_second_csrf
 from util.replace_value import replaceValueSysConfig, replaceValue
 from util.file_helper import FileHelper
+from util.template_registry import TemplateRegistry
+from util.package_catalog import PackageCatalog
 from util.ShellHelper import runShellCommandAndReturnOutput, runShellCommandAndReturnOutputAsList, \
     runProcess, grabKubectlCommand, verifyPodsAreRunning, grabPipeOutput, \
     runShellCommandAndReturnOutputAsListWithChangedDir, grabPipeOutputChagedDir
 from util.cmd_helper import CmdHelper
 from util.cmd_runner import RunCmd
 import time
-from jinja2 import Template
 import yaml
-from yaml import SafeLoader
 from ruamel import yaml as ryaml
 from datetime import datetime
 from util.vcenter_operations import createResourcePool, create_folder
@@ -44,6 +48,8 @@ from util.tkg_util import TkgUtil
 
 logger = LoggerHelper.get_logger('common_utils')
 logging.getLogger("paramiko").setLevel(logging.WARNING)
+# Longest wait for a cluster registered or attached to TMC to report a ready, healthy agent.
+TMC_REGISTRATION_TIMEOUT = 1200
 
 
 def checkenv(jsonspec):
@@ -269,6 +275,7 @@ def getOvaMarketPlace(filename, refreshToken, version, baseOS, upgrade):
                             "\t") == ova_groupname:
                         objectid = metalist["metafileobjectsList"][0]['fileid']
                         ovaName = metalist["metafileobjectsList"][0]['filename']
+                        file_info = marketplace_file_info(metalist["metafileobjectsList"][0])
                         app_version = metalist['appversion']
                         metafileid = metalist['metafileid']
                         break
@@ -281,6 +288,7 @@ def getOvaMarketPlace(filename, refreshToken, version, baseOS, upgrade):
                             == ova_groupname:
                         objectid = metalist["metafileobjectsList"][0]['fileid']
                         ovaName = metalist["metafileobjectsList"][0]['filename']
+                        file_info = marketplace_file_info(metalist["metafileobjectsList"][0])
                         app_version = metalist['appversion']
                         metafileid = metalist['metafileid']
                         break
@@ -320,9 +328,10 @@ def getOvaMarketPlace(filename, refreshToken, version, baseOS, upgrade):
     if 'HTTP/1.1 200 OK' in data_read:
         logger.info('Proceed to Download')
         ova_path = "/tmp/" + ovaName
-        curl_download_cmd = 'curl -X GET {d_url} --output {tmp_path}'.format(d_url=download_url,
-                                                                             tmp_path=ova_path)
-        rcmd.run_cmd_only(curl_download_cmd)
+        try:
+            DownloadHelper().download(download_url, ova_path, key=objectid, **file_info)
+        except Exception as e:
+            return None, str(e)
     else:
         logger.info('Error in presigned url/key: {} '.format(data_read.split('\n')[0]))
         return None, "Invalid key/url"
@@ -529,7 +538,7 @@ def getCloudStatus(ip, csrf2, aviVersion, cloudName):
     }
     body = {}
     url = "https://" + ip + "/api/cloud"
-    response_csrf = requests.request("GET", url, headers=headers, data=body, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=body, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -558,7 +567,7 @@ def getSECloudStatus(ip, csrf2, aviVersion, seGroupName):
     body = {}
     json_object = json.dumps(body, indent=4)
     url = "https://" + ip + "/api/serviceenginegroup"
-    response_csrf = requests.request("GET", url, headers=headers, data=json_object, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=json_object, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -580,7 +589,7 @@ def getVrfAndNextRoutId(ip, csrf2, cloudUuid, typen, routIp, aviVersion):
     body = {}
     routId = 0
     url = "https://" + ip + "/api/vrfcontext/?name.in=" + typen + "&cloud_ref.uuid=" + cloudUuid
-    response_csrf = requests.request("GET", url, headers=headers, data=body, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=body, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -639,7 +648,7 @@ def addStaticRoute(ip, csrf2, vrfUrl, routeIp, routId, aviVersion):
     }
     url = vrfUrl
     json_object = json.dumps(body, indent=4)
-    response_csrf = requests.request("PATCH", url, headers=headers, data=json_object, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("PATCH", url, headers=headers, data=json_object, verify=False)
     if response_csrf.status_code != 200:
         return None, response_csrf.text
     else:
@@ -906,8 +915,7 @@ def template14deployYaml(cluster_name, clusterPlan, datacenter, dataStorePath,
                          folderPath, mgmt_network, vspherePassword, sharedClusterResourcePool,
                          vsphereServer, sshKey, vsphereUseName, machineCount, size, type, vsSpec,
                          jsonspec, env):
-    deploy_yaml = FileHelper.read_resource(Paths.TKG_CLUSTER_14_SPEC_J2)
-    t = Template(deploy_yaml)
+    t = TemplateRegistry.get(Paths.TKG_CLUSTER_14_SPEC_J2)
     datacenter = "/" + datacenter
     control_plane_vcpu = ""
     control_plane_disk_gb = ""
@@ -1099,45 +1107,59 @@ def generateTmcProxyYaml(name_of_proxy, httpProxy_, httpsProxy_, noProxyList_, h
         yaml1.dump(data, outfile)
 
 
+def getClusterStatusOnTmc(cluster, ifManagement):
+    """
+    Agent READY condition and health of a cluster on TMC, parsed from one `tmc ... get`.
+    Returns (ready, health, message) and raises if the cluster cannot be read.
+    """
+    if ifManagement:
+        clist = ["tmc", "managementcluster", "get", cluster]
+    else:
+        li_ = returnListOfTmcCluster(cluster)
+        clist = ["tmc", "cluster", "get", li_[0], "-m", li_[1], "-p", li_[2]]
+    o = runShellCommandAndReturnOutput(clist)
+    if o[1] != 0:
+        raise Exception(o[0])
+    status = yaml.safe_load(o[0])["status"]
+    conditions = status.get("conditions") or {}
+    condition = conditions.get("Agent-READY") or conditions.get("READY") or {}
+    ready = str(condition.get("status")).upper() == "TRUE" and str(condition.get("type")) == "READY"
+    return ready, str(status.get("health")), str(condition.get("message", ""))
+
+
 def checkClusterStateOnTmc(cluster, ifManagement):
     try:
-        if ifManagement:
-            clist = ["tmc", "managementcluster", "get", cluster]
-        else:
-            li_ = returnListOfTmcCluster(cluster)
-            clist = ["tmc", "cluster", "get", li_[0], "-m", li_[1], "-p", li_[2]]
-        o = runShellCommandAndReturnOutput(clist)
-        if o[1] == 0:
-            l = yaml.safe_load(o[0])
-            try:
-                status = str(l["status"]["conditions"]["Agent-READY"]["status"])
-            except:
-                status = str(l["status"]["conditions"]["READY"]["status"])
-            try:
-                typen = str(l["status"]["conditions"]["Agent-READY"]["type"])
-            except:
-                typen = str(l["status"]["conditions"]["READY"]["type"])
-            health = str(l["status"]["health"])
-            if status == "TRUE":
-                logger.info("Management cluster status " + status)
-            else:
-                logger.error("Management cluster status " + status)
-                return "Failed", 500
-            if typen == "READY":
-                logger.info("Management cluster type " + typen)
-            else:
-                logger.error("Management cluster type " + typen)
-                return "Failed", 500
-            if health == "HEALTHY":
-                logger.info("Management cluster health " + health)
-            else:
-                logger.error("Management cluster health " + health)
-                return "Failed", 500
-            return "SUCCESS", 200
-        else:
-            return None, o[0]
+        ready, health, message = getClusterStatusOnTmc(cluster, ifManagement)
     except Exception as e:
         return None, str(e)
+    if not ready:
+        logger.error("Management cluster is not ready " + message)
+        return "Failed", 500
+    logger.info("Management cluster status TRUE, type READY")
+    if health == "HEALTHY":
+        logger.info("Management cluster health " + health)
+    else:
+        logger.error("Management cluster health " + health)
+        return "Failed", 500
+    return "SUCCESS", 200
+
+
+def waitForClusterOnTmc(cluster, ifManagement, timeout=TMC_REGISTRATION_TIMEOUT):
+    """
+    Wait for the TMC agent of a just registered or attached cluster to report READY and
+    HEALTHY: checked right away, then at growing intervals of up to 30s until timeout.
+    Failures to read the cluster count as not ready yet, as TMC may not list it at first.
+    """
+    wait = WaitHelper.wait_for(lambda: getClusterStatusOnTmc(cluster, ifManagement),
+                               lambda state: state[0] and state[1] == "HEALTHY", timeout=timeout,
+                               initial_delay=5, ignore_errors=True, description=f"TMC agent of {cluster}")
+    if wait.ready:
+        return "SUCCESS", 200
+    if wait.value is None:
+        return None, f"Failed to obtain TMC status of {cluster} in {int(wait.elapsed)}s"
+    ready, health, message = wait.value
+    return None, f"{cluster} is not ready on TMC after {int(wait.elapsed)}s, health {health}" + \
+        (f", {message}" if message else "")
 
 
 def checkTmcRegister(cluster, ifManagement):
@@ -1369,6 +1391,15 @@ def registerWithTmcOnSharedAndWorkload(jsonspec, clusterName, cls_type):
                     "ERROR_CODE": 500
                 }
                 return json.dumps(d), 500
+            state = waitForClusterOnTmc(clusterName, False)
+            if state[0] != "SUCCESS":
+                logger.error(state[1])
+                d = {
+                    "responseType": "ERROR",
+                    "msg": "Attached " + clusterName + " to tmc but " + state[1],
+                    "ERROR_CODE": 500
+                }
+                return json.dumps(d), 500
             d = {
                 "responseType": "SUCCESS",
                 "msg": clusterName + " cluster attached to tmc successfully",
@@ -1445,41 +1476,71 @@ def switchToManagementContext(clusterName):
     return json.dumps(d), 200
 
 
+def _waitForReconcileWatch(list1, podName):
+    """
+    Wait for the App/PackageInstall through a watch instead of re-running list1, a
+    `kubectl get app` or `tanzu package installed list` command: the watch covers the
+    same kubeconfig, context, namespace and App. Returns None when list1 lists anything
+    else or the context cannot be watched, so the caller polls list1 instead.
+    """
+    scope = watch_scope(list1)
+    if scope is None:
+        return None
+    watcher = ReconcileWatcher.for_context(scope["kubeconfig"], scope["context"])
+    if watcher is None:
+        return None
+    start = time.monotonic()
+    reconciled = watcher.wait_reconciled(podName, namespace=scope["namespace"], app=scope["name"])
+    if reconciled is None:
+        return None
+    elapsed = str(int(time.monotonic() - start))
+    if not reconciled:
+        logger.error(podName + " is not running on waiting " + elapsed + "s")
+        d = {
+            "responseType": "ERROR",
+            "msg": podName + " is not running on waiting " + elapsed + "s",
+            "ERROR_CODE": 500
+        }
+        return json.dumps(d), 500, 1
+    logger.info("Successfully running " + podName + " after " + elapsed + "s")
+    d = {
+        "responseType": "SUCCESS",
+        "msg": "Successfully running " + podName,
+        "ERROR_CODE": 200
+    }
+    return json.dumps(d), 200, 1
+
+
 def waitForGrepProcessWithoutChangeDir(list1, list2, podName, status):
-    time.sleep(30)
-    count_cert = 0
-    running = False
-    try:
-        while count_cert < 60:
-            cert_state = grabPipeOutput(list1, list2)
-            if verifyPodsAreRunning(podName, cert_state[0], status):
-                running = True
-                break
-            time.sleep(30)
-            count_cert = count_cert + 1
-            logger.info("Waited for  " + str(count_cert * 30) + "s, retrying.")
-    except Exception as e:
+    if status == RegexPattern.RECONCILE_SUCCEEDED:
+        watched = _waitForReconcileWatch(list1, podName)
+        if watched is not None:
+            return watched
+    wait = WaitHelper.wait_for(lambda: grabPipeOutput(list1, list2),
+                               lambda cert_state: verifyPodsAreRunning(podName, cert_state[0], status),
+                               description=podName)
+    if wait.error is not None:
         logger.error(" Failed to verify pod running ")
         d = {
             "responseType": "ERROR",
             "msg": "Failed to verify pod running",
             "ERROR_CODE": 500
         }
-        return json.dumps(d), 500, count_cert
-    if not running:
-        logger.error(podName + " is not running on waiting " + str(count_cert * 30) + "s")
+        return json.dumps(d), 500, wait.attempts
+    if not wait.ready:
+        logger.error(podName + " is not running on waiting " + str(int(wait.elapsed)) + "s")
         d = {
             "responseType": "ERROR",
-            "msg": podName + " is not running on waiting " + str(count_cert * 30) + "s",
+            "msg": podName + " is not running on waiting " + str(int(wait.elapsed)) + "s",
             "ERROR_CODE": 500
         }
-        return json.dumps(d), 500, count_cert
+        return json.dumps(d), 500, wait.attempts
     d = {
         "responseType": "ERROR",
         "msg": "Successfully running " + podName + " ",
         "ERROR_CODE": 200
     }
-    return json.dumps(d), 200, count_cert
+    return json.dumps(d), 200, wait.attempts
 
 
 def createContourDataValues(clusterName):
@@ -1517,12 +1578,12 @@ def createContourDataValues(clusterName):
 
 def installExtentionFor14(service_name, cluster, jsonspec):
     main_command = ["tanzu", "package", "installed", "list", "-A"]
+    catalog = PackageCatalog.current()
     service = service_name
     if service == "certmanager" or service == "all":
         sub_command = ["grep", AppName.CERT_MANAGER]
-        command_cert = grabPipeOutput(main_command, sub_command)
-        if not verifyPodsAreRunning(AppName.CERT_MANAGER, command_cert[0],
-                                    RegexPattern.RECONCILE_SUCCEEDED) or Upgrade_Extensions.UPGRADE_EXTN:
+        if not catalog.is_reconciled(AppName.CERT_MANAGER,
+                                     RegexPattern.RECONCILE_SUCCEEDED) or Upgrade_Extensions.UPGRADE_EXTN:
             state = getVersionOfPackage("cert-manager.tanzu.vmware.com")
             if state is None:
                 d = {
@@ -1549,6 +1610,7 @@ def installExtentionFor14(service_name, cluster, jsonspec):
                                   "cert-manager.tanzu.vmware.com", "--namespace", "package-" + AppName.CERT_MANAGER,
                                   "--version", state]
                 states = runShellCommandAndReturnOutputAsList(update_command)
+                catalog.invalidate()
                 if states[1] != 0:
                     logger.error(
                         AppName.CERT_MANAGER + " update command failed. Checking for reconciliation status..")
@@ -1560,6 +1622,7 @@ def installExtentionFor14(service_name, cluster, jsonspec):
                                    "--version", state,
                                    "--create-namespace"]
                 states = runShellCommandAndReturnOutputAsList(install_command)
+                catalog.invalidate()
                 if states[1] != 0:
                     logger.error(
                         AppName.CERT_MANAGER + " installation command failed. Checking for reconciliation status..")
@@ -1602,9 +1665,8 @@ def installExtentionFor14(service_name, cluster, jsonspec):
                 }
                 return json.dumps(d), 500"""
         sub_command = ["grep", AppName.CONTOUR]
-        command_cert = grabPipeOutput(main_command, sub_command)
-        if not verifyPodsAreRunning(AppName.CONTOUR, command_cert[0],
-                                    RegexPattern.RECONCILE_SUCCEEDED) or Upgrade_Extensions.UPGRADE_EXTN:
+        if not catalog.is_reconciled(AppName.CONTOUR,
+                                     RegexPattern.RECONCILE_SUCCEEDED) or Upgrade_Extensions.UPGRADE_EXTN:
             createContourDataValues(cluster)
             state = getVersionOfPackage("contour.tanzu.vmware.com")
             if state is None:
@@ -1632,6 +1694,7 @@ def installExtentionFor14(service_name, cluster, jsonspec):
                               Paths.LOCAL_VSPHERE_ALB_CONTOUR_CONFIG, "--namespace",
                               "package-tanzu-system-contour"]
             states = runShellCommandAndReturnOutputAsList(update_command)
+            catalog.invalidate()
             if states[1] != 0:
                 for r in states[0]:
                     logger.error(r)
@@ -1645,6 +1708,7 @@ def installExtentionFor14(service_name, cluster, jsonspec):
                                "package-tanzu-system-contour",
                                "--create-namespace"]
             states = runShellCommandAndReturnOutputAsList(install_command)
+            catalog.invalidate()
             if states[1] != 0:
                 for r in states[0]:
                     logger.error(r)
@@ -1845,7 +1909,7 @@ def getAviCertificate(ip, csrf2, certName, aviVersion):
     }
     body = {}
     url = "https://" + ip + "/api/sslkeyandcertificate"
-    response_csrf = requests.request("GET", url, headers=headers, data=body, verify=False)
+    response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=body, verify=False)
     if response_csrf.status_code != 200:
         logger.error("Failed to get certificate " + response_csrf.text)
         return None, response_csrf.text
@@ -2195,8 +2259,7 @@ def checkEnableIdentityManagement(env, jsonspec):
 def checkPinnipedInstalled():
     main_command = ["tanzu", "package", "installed", "list", "-A"]
     sub_command = ["grep", AppName.PINNIPED]
-    command_pinniped = grabPipeOutput(main_command, sub_command)
-    if not verifyPodsAreRunning(AppName.PINNIPED, command_pinniped[0], RegexPattern.RECONCILE_SUCCEEDED):
+    if not PackageCatalog.current().is_reconciled(AppName.PINNIPED, RegexPattern.RECONCILE_SUCCEEDED):
         count_pinniped = 0
         found = False
         command_status_pinniped = grabPipeOutput(main_command, sub_command)
@@ -2281,31 +2344,28 @@ def generateTSMJsonFile(management_cluster, provisioner_name, cluster_name, exac
 
 
 def waitForProcessWithStatus(list1, podName, status):
-    count_cert = 0
-    running = False
-    while count_cert < 60:
-        cert_state = runShellCommandAndReturnOutputAsList(list1)
-        time.sleep(30)
-        if verifyPodsAreRunning(podName, cert_state[0], status):
-            running = True
-            break
-        count_cert = count_cert + 1
-        logger.info("Waited for  " + str(count_cert * 30) + "s, retrying.")
-    if not running:
-        logger.error(podName + " is not running on waiting " + str(count_cert * 30) + "s")
+    if status == RegexPattern.RECONCILE_SUCCEEDED:
+        watched = _waitForReconcileWatch(list1, podName)
+        if watched is not None:
+            return watched
+    wait = WaitHelper.wait_for(lambda: runShellCommandAndReturnOutputAsList(list1),
+                               lambda cert_state: verifyPodsAreRunning(podName, cert_state[0], status),
+                               description=podName)
+    if not wait.ready:
+        logger.error(podName + " is not running on waiting " + str(int(wait.elapsed)) + "s")
         d = {
             "responseType": "ERROR",
-            "msg": podName + " is not running on waiting " + str(count_cert * 30) + "s",
+            "msg": podName + " is not running on waiting " + str(int(wait.elapsed)) + "s",
             "ERROR_CODE": 500
         }
-        return json.dumps(d), 500, count_cert
+        return json.dumps(d), 500, wait.attempts
     logger.info("Successfully running " + podName)
     d = {
         "responseType": "SUCCESS",
         "msg": "Successfully running" + podName,
         "ERROR_CODE": 200
     }
-    return json.dumps(d), 200, count_cert
+    return json.dumps(d), 200, wait.attempts
 
 
 def integrateSas(cluster_name, jsonspec, sasType):
@@ -2463,7 +2523,7 @@ def getVipNetworkIpNetMask(ip, csrf2, name, aviVersion):
     body = {}
     url = "https://" + ip + "/api/network"
     try:
-        response_csrf = requests.request("GET", url, headers=headers, data=body, verify=False)
+        response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=body, verify=False)
         if response_csrf.status_code != 200:
             return None, response_csrf.text
         else:
@@ -2474,7 +2534,7 @@ def getVipNetworkIpNetMask(ip, csrf2, name, aviVersion):
             else:
                 next_url = None if not response_csrf.json()["next"] else response_csrf.json()["next"]
                 while len(next_url) > 0:
-                    response_csrf = requests.request("GET", next_url, headers=headers, data=body, verify=False)
+                    response_csrf = AviClient.for_controller(ip).request("GET", next_url, headers=headers, data=body, verify=False)
                     for re in response_csrf.json()["results"]:
                         if re['name'] == name:
                             for sub in re["configured_subnets"]:
@@ -2499,6 +2559,9 @@ def checkAirGappedIsEnabled(jsonspec):
 
 
 def getVersionOfPackage(packageName):
+    version = PackageCatalog.current().latest_version(packageName)
+    if version:
+        return version
     list_h = []
     cert_package_cmd = ["tanzu", "package", "available", "list", packageName, "-A"]
     ss = runShellCommandAndReturnOutputAsList(cert_package_cmd)
@@ -2745,6 +2808,7 @@ def checkRepositoryAdded(jsonspec):
                 list_command = ["tanzu", "package", "repository", "add", Repo.NAME, "--url", REPOSITORY_URL, "-n",
                                 "tkg-custom-image-repository", "--create-namespace"]
                 status = runShellCommandAndReturnOutputAsList(list_command)
+                PackageCatalog.current().invalidate()
                 if status[1] != 0:
                     logger.error("Failed to run command to add repository " + str(status[0]))
                     d = {
@@ -2795,6 +2859,7 @@ def checkRepositoryAdded(jsonspec):
                                 TKG_Package_Details.REPOSITORY_URL, "-n",
                                 TKG_Package_Details.NAMESPACE]
                 status = runShellCommandAndReturnOutputAsList(list_command)
+                PackageCatalog.current().invalidate()
                 if status[1] != 0:
                     logger.error("Failed to run command to add repository " + str(status[0]))
                     d = {
@@ -3114,6 +3179,7 @@ def deploy_fluent_bit(end_point, cluster, jsonspec):
                                           Tkg_Extention_names.FLUENT_BIT.lower() + ".tanzu.vmware.com",
                                           "--version", version, "--values-file", yamlFile, "--namespace", namespace]
             state_extention_apply = runShellCommandAndReturnOutputAsList(upgrade_fluent_bit_command)
+            PackageCatalog.current().invalidate()
             if state_extention_apply[1] != 0:
                 logger.error(Tkg_Extention_names.FLUENT_BIT.lower() + " update command failed. "
                                                                       "Checking for reconciliation status...")
@@ -3123,6 +3189,7 @@ def deploy_fluent_bit(end_point, cluster, jsonspec):
                                          "--version", version, "--values-file", yamlFile, "--namespace", namespace,
                                          "--create-namespace"]
             state_extention_apply = runShellCommandAndReturnOutputAsList(deploy_fluent_bit_command)
+            PackageCatalog.current().invalidate()
             if state_extention_apply[1] != 0:
                 logger.error(Tkg_Extention_names.FLUENT_BIT.lower() + " install command failed. "
                                                                       "Checking for reconciliation status...")
@@ -3191,22 +3258,23 @@ def fluent_bit_enabled(jsonspec):
 
 
 def checkExtentionDeployed(extension_name):
-    main_command = ["tanzu", "package", "installed", "list", "-A"]
-    sub_command = ["grep", extension_name]
-    output = grabPipeOutput(main_command, sub_command)
-    return output
+    """
+    Same shape as `tanzu package installed list -A | grep <extension_name>`: the
+    matching installed package line and 0, or an empty string and 1.
+    """
+    package = PackageCatalog.current().installed(extension_name)
+    if package is None:
+        return "", 1
+    return " ".join(str(v) for v in (package.name, package.package, package.version, package.status,
+                                     package.namespace)), 0
 
 
 def checkFluentBitInstalled():
     extension = Tkg_Extention_names.FLUENT_BIT.lower()
-    main_command = ["tanzu", "package", "installed", "list", "-A"]
-    sub_command = ["grep", extension]
-    output = grabPipeOutput(main_command, sub_command)
+    status = PackageCatalog.current().status(extension)
 
-    if verifyPodsAreRunning(extension, output[0], RegexPattern.RECONCILE_SUCCEEDED):
-        return True, output[0].split()[3] + " " + output[0].split()[4]
-    elif verifyPodsAreRunning(extension, output[0], RegexPattern.RECONCILE_FAILED):
-        return True, output[0].split()[3] + " " + output[0].split()[4]
+    if status is not None and (RegexPattern.RECONCILE_SUCCEEDED in status or RegexPattern.RECONCILE_FAILED in status):
+        return True, status
     else:
         return False, None
 
@@ -3456,39 +3524,29 @@ def checkAndWaitForAllTheServiceEngineIsUp(ip, clodName, jsonspec, aviVersion):
         "x-csrftoken": csrf2[0]
     }
     payload = {}
-    count = 0
-    seCount = 0
-    response_csrf = None
     logger.info("Checking all service are up or not.")
-    while count < 60:
-        try:
-            logger.info("Waited for " + str(count * 10) + "s retrying")
-            response_csrf = requests.request("GET", url, headers=headers, data=payload, verify=False)
-            length = len(response_csrf.json()["results"])
-            if response_csrf.status_code == 200:
-                for se in response_csrf.json()["results"]:
-                    if str(se["runtime"]["se_connected"]).strip().lower() == "true":
-                        seCount = seCount + 1
-                        if seCount == length:
-                            break
-            if seCount == length:
-                break
-        except:
-            pass
-        count = count + 1
-        time.sleep(10)
+    wait = WaitHelper.wait_for(
+        lambda: AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload, verify=False),
+        _allServiceEnginesConnected, timeout=600, ignore_errors=True, description="service engines")
+    response_csrf = wait.value
     if response_csrf is None:
-        logger.info("Waited for " + str(count * 10) + "s but service engine is not up")
+        logger.info("Waited for " + str(int(wait.elapsed)) + "s but service engine is not up")
         return None, "Failed", "ERROR"
     if response_csrf.status_code != 200:
         return None, response_csrf.text
-    elif count >= 59:
+    elif not wait.ready:
         return None, "NOT_FOUND", "TIME_OUT"
     else:
         logger.info("All service are up and running")
         return "SUCCESS", "CHECKED", "UP"
 
 
+def _allServiceEnginesConnected(response):
+    if response.status_code != 200:
+        return False
+    return all(str(se["runtime"]["se_connected"]).strip().lower() == "true" for se in response.json()["results"])
+
+
 def registerTMCTKGs(vCenter, vCenter_user, VC_PASSWORD, jsonspec):
     url = "https://" + vCenter + "/"
     try:
@@ -3564,7 +3622,6 @@ def registerTMCTKGs(vCenter, vCenter_user, VC_PASSWORD, jsonspec):
                 return "Failed to apply k8s-register-manifest.yaml file", 500
 
             logger.info("Waiting for TMC registration to complete... ")
-            time.sleep(300)
             wait_status = waitForTMCRegistration(supervisor_cluster)
             if wait_status[1] != 200:
                 logger.error(wait_status[0])
@@ -3582,41 +3639,14 @@ def registerTMCTKGs(vCenter, vCenter_user, VC_PASSWORD, jsonspec):
 
 
 def waitForTMCRegistration(super_cls):
-    registered = False
-    count = 0
-    register_status_command = ["tmc", "managementcluster", "get", super_cls]
-    register_status = runShellCommandAndReturnOutput(register_status_command)
-    if register_status[1] != 0:
-        return "Failed to obtain register status for TMC", 500
-    else:
-        yaml_ouptput = yaml.load(register_status[0], Loader=SafeLoader)
-        if yaml_ouptput["status"]["health"] == "HEALTHY" and \
-                yaml_ouptput["status"]["conditions"]["READY"]["status"].lower() == "true":
-            registered = True
-
-    while not registered and count < 30:
-        register_status_command = ["tmc", "managementcluster", "get", super_cls]
-        register_status = runShellCommandAndReturnOutput(register_status_command)
-        if register_status[1] != 0:
-            return "Failed to obtain register status for TMC", 500
-        else:
-            yaml_ouptput = yaml.load(register_status[0], Loader=SafeLoader)
-            if yaml_ouptput["status"]["health"] == "HEALTHY" and \
-                    yaml_ouptput["status"]["conditions"]["READY"]["status"].lower() == "true":
-                registered = True
-                break
-            else:
-                logger.info("Waited for  " + str(count * 30) + "s, retrying.")
-                count = count + 1
-                time.sleep(30)
-    if not registered:
-        logger.error("TMC registration still did not complete " + str(count * 30))
+    state = waitForClusterOnTmc(super_cls, True)
+    if state[0] != "SUCCESS":
+        logger.error("TMC registration still did not complete: " + state[1])
         d = {
             "responseType": "ERROR",
-            "msg": "TMC registration still did not complete " + str(count * 30),
+            "msg": "TMC registration still did not complete: " + state[1],
             "ERROR_CODE": 500
         }
         return json.dumps(d), 500
     else:
         return "TMC Registration successful", 200
-
@@ -0,0 +1,389 @@
+#  Copyright 2021 VMware, Inc
+#  SPDX-License-Identifier: BSD-2-Clause
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+from requests.packages.urllib3.exceptions import InsecureRequestWarning
+
+from util.logger_helper import LoggerHelper
+
+requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
+
+logger = LoggerHelper.get_logger(Path(__file__).stem)
+
+
+class DownloadError(Exception):
+    pass
+
+
+def marketplace_file_info(file_meta):
+    """
+    Expected size and checksum of a Marketplace file entry (an item of metafileobjectsList
+    or productdeploymentfilesList), for whatever of them the entry provides.
+    """
+    size = file_meta.get("size")
+    digest = file_meta.get("hashdigest")
+    algorithm = str(file_meta.get("hashalgo") or "sha256").lower().replace("-", "")
+    if digest and algorithm not in hashlib.algorithms_available:
+        digest = None
+    return dict(size=int(size) if size else None, digest=digest or None, algorithm=algorithm)
+
+
+class DownloadHelper:
+    """
+    Downloads large files (OVAs, tarballs) straight to disk in CHUNK_SIZE pieces, never
+    holding more than a chunk per stream in memory.
+
+    - Servers that honour Range requests are fetched in up to SEGMENTS parallel ranged
+      streams, and an interrupted transfer resumes where each stream stopped, also across
+      process restarts (progress is kept next to the partial file).
+    - The result is checked against the expected size and checksum when given, e.g. from
+      Marketplace metadata.
+    - Finished files are kept in a content-addressed cache (CACHE_DIR/<algorithm>/<digest>),
+      and hard-linked to the requested destination, so the same file is never fetched
+      twice. `key` (e.g. the Marketplace file id) finds the cached copy when no checksum is
+      known up front; such a copy is only used while the server still reports the same
+      size and ETag for it. Files not used for CACHE_MAX_AGE seconds are dropped, and then
+      the least recently used ones until the cache holds at most CACHE_MAX_BYTES.
+    - The cache is private to the user (mode 0700, under ~/.cache), as its files are
+      linked into install paths.
+    """
+    CHUNK_SIZE = 8 * 1024 * 1024
+    SEGMENTS = 4
+    MIN_SEGMENT_SIZE = 64 * 1024 * 1024
+    RETRIES = 5
+    TIMEOUT = 60
+    PROGRESS_INTERVAL = 30
+    CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+                             "sivt-download-cache")
+    CACHE_MAX_BYTES = 40 * 1024 * 1024 * 1024
+    CACHE_MAX_AGE = 14 * 24 * 3600
+    _locks = {}
+    _locks_lock = threading.Lock()
+
+    def __init__(self, cache_dir=CACHE_DIR, segments=SEGMENTS, headers=None, verify=False, log=None):
+        self.cache_dir = cache_dir
+        self.segments = max(1, segments)
+        self.headers = dict(headers or {})
+        self.verify = verify
+        self.log = log or logger
+
+    def download(self, url, dest, size=None, digest=None, algorithm="sha256", key=None):
+        """
+        Download url to dest unless the cache already has it; returns dest.
+        Raises DownloadError when the transfer keeps failing or the checksum does not match.
+        """
+        algorithm = algorithm.lower()
+        name = hashlib.sha1((key or digest or url).encode()).hexdigest()
+        # A second download of the same file waits for the first and then finds it cached.
+        with DownloadHelper._lock_for(name):
+            return self._download(url, dest, size, digest, algorithm, key, name)
+
+    @classmethod
+    def _lock_for(cls, name):
+        with cls._locks_lock:
+            return cls._locks.setdefault(name, threading.Lock())
+
+    def _download(self, url, dest, size, digest, algorithm, key, name):
+        self._check_private()
+        cached = self._cached(size, digest, algorithm, key)
+        if cached is not None and not digest and not self._unchanged(url, cached, key):
+            # Without a checksum, a copy found by key is only trusted while it still matches the server.
+            self.log.info("Cached copy of " + os.path.basename(dest) + " is out of date")
+            cached = None
+        if cached is not None:
+            self.log.info("Using cached copy of " + os.path.basename(dest))
+            # The modification time records the last use, for pruning.
+            os.utime(cached)
+            if key and os.path.isfile(self._key_file(key)):
+                os.utime(self._key_file(key))
+            self._place(cached, dest)
+            return dest
+        os.makedirs(os.path.join(self.cache_dir, "partial"), exist_ok=True)
+        part = os.path.join(self.cache_dir, "partial", name)
+        start = time.monotonic()
+        state = self._fetch(url, part, size)
+        actual = self._digest(part, algorithm)
+        if digest and actual != digest.lower():
+            os.remove(part)
+            raise DownloadError("Checksum mismatch for %s: expected %s %s, got %s" % (os.path.basename(dest), algorithm,
+                                                                                   digest, actual))
+        blob = self._blob(algorithm, actual)
+        os.makedirs(os.path.dirname(blob), exist_ok=True)
+        os.replace(part, blob)
+        if key:
+            self._write_json(self._key_file(key), dict(algorithm=algorithm, digest=actual,
+                                                       size=os.path.getsize(blob), etag=state.get("etag")))
+        self._place(blob, dest)
+        self.log.info("Downloaded %s (%d bytes) in %.1fs" % (os.path.basename(dest), os.path.getsize(dest),
+                                                             time.monotonic() - start))
+        self._prune(keep=blob)
+        return dest
+
+    def _check_private(self):
+        """
+        Create the cache directory private to the user, and refuse one that another user
+        owns or could write to.
+        """
+        os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+        stat = os.lstat(self.cache_dir)
+        if os.path.islink(self.cache_dir) or stat.st_uid != os.getuid():
+            raise DownloadError("Download cache %s is not owned by the current user" % self.cache_dir)
+        if stat.st_mode & 0o077:
+            os.chmod(self.cache_dir, 0o700)
+
+    def _unchanged(self, url, blob, key):
+        """
+        True if the server reports the size and ETag recorded when blob was downloaded
+        for key; False when they differ or there's nothing to compare.
+        """
+        try:
+            with open(self._key_file(key)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return False
+        session = self._session()
+        try:
+            size, _, etag = self._probe(session, url)
+        except (requests.RequestException, DownloadError) as e:
+            self.log.warning("Failed to check the cached copy against %s: %s" % (url, e))
+            return False
+        finally:
+            session.close()
+        if size is None and not (etag and entry.get("etag")):
+            return False
+        if size is not None and size != os.path.getsize(blob):
+            return False
+        return not (etag and entry.get("etag") and etag != entry["etag"])
+
+    def _prune(self, keep=None):
+        """
+        Drop cached files older than CACHE_MAX_AGE, then the least recently used ones over
+        CACHE_MAX_BYTES, except keep. Partial downloads and keys are only dropped by age.
+        """
+        now = time.time()
+        blobs = []
+        for directory in os.listdir(self.cache_dir):
+            if not os.path.isdir(os.path.join(self.cache_dir, directory)):
+                continue
+            for entry in os.scandir(os.path.join(self.cache_dir, directory)):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                if not entry.is_file() or entry.path == keep:
+                    continue
+                if now - stat.st_mtime > self.CACHE_MAX_AGE:
+                    self._remove(entry.path)
+                elif directory not in ("partial", "keys"):
+                    blobs.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in blobs) + (os.path.getsize(keep) if keep else 0)
+        for _, size, path in sorted(blobs):
+            if total <= self.CACHE_MAX_BYTES:
+                break
+            self._remove(path)
+            total -= size
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+            self.log.info("Removed %s from the download cache" % os.path.basename(path))
+        except OSError as e:
+            self.log.warning("Failed to remove %s from the download cache: %s" % (path, e))
+
+    def _cached(self, size, digest, algorithm, key):
+        blob = None
+        if digest:
+            blob = self._blob(algorithm, digest.lower())
+        elif key and os.path.isfile(self._key_file(key)):
+            try:
+                with open(self._key_file(key)) as f:
+                    entry = json.load(f)
+                blob = self._blob(entry["algorithm"], entry["digest"])
+            except (ValueError, KeyError):
+                return None
+        if blob is None or not os.path.isfile(blob):
+            return None
+        if size is not None and os.path.getsize(blob) != size:
+            return None
+        return blob
+
+    def _blob(self, algorithm, digest):
+        return os.path.join(self.cache_dir, algorithm, digest)
+
+    def _key_file(self, key):
+        return os.path.join(self.cache_dir, "keys", hashlib.sha1(key.encode()).hexdigest() + ".json")
+
+    @staticmethod
+    def _place(blob, dest):
+        if os.path.lexists(dest):
+            os.remove(dest)
+        try:
+            os.link(blob, dest)
+        except OSError:
+            shutil.copyfile(blob, dest)
+
+    def _session(self):
+        session = requests.Session()
+        session.verify = self.verify
+        session.headers.update(self.headers)
+        return session
+
+    def _fetch(self, url, part, expected_size):
+        """
+        Fetch url into part; returns the download state, with the size and ETag reported
+        by the server.
+        """
+        session = self._session()
+        state_file = part + ".json"
+        state = self._read_state(state_file)
+        if state is None or not os.path.isfile(part) or (expected_size and state.get("size") != expected_size):
+            size, ranged, etag = self._probe(session, url)
+            if expected_size and size and size != expected_size:
+                raise DownloadError("Server reports %d bytes, expected %d" % (size, expected_size))
+            size = size or expected_size
+            state = dict(size=size, ranged=ranged, etag=etag, segments=self._split(size, ranged))
+            with open(part, "wb"):
+                pass
+            if size:
+                os.truncate(part, size)
+            self._write_json(state_file, state)
+        else:
+            done = sum(segment[2] for segment in state["segments"])
+            self.log.info("Resuming download at %d of %s bytes" % (done, state["size"] or "unknown"))
+        progress = _Progress(state, state_file, self.log)
+        fd = os.open(part, os.O_RDWR)
+        try:
+            pending = [segment for segment in state["segments"] if segment[1] is None or
+                       segment[0] + segment[2] <= segment[1]]
+            if len(pending) > 1:
+                with ThreadPoolExecutor(max_workers=len(pending), thread_name_prefix="download") as executor:
+                    for future in [executor.submit(self._fetch_segment, session, url, fd, s, progress)
+                                   for s in pending]:
+                        future.result()
+            elif pending:
+                self._fetch_segment(session, url, fd, pending[0], progress)
+        finally:
+            os.close(fd)
+            session.close()
+        if state["size"] and os.path.getsize(part) != state["size"]:
+            raise DownloadError("Downloaded %d bytes, expected %d" % (os.path.getsize(part), state["size"]))
+        os.remove(state_file)
+        return state
+
+    def _probe(self, session, url):
+        """
+        Total size, Range support and ETag, asked with a one-byte GET since presigned URLs
+        are often signed for GET only.
+        """
+        with session.get(url, headers={"Range": "bytes=0-0"}, stream=True, timeout=self.TIMEOUT) as response:
+            etag = response.headers.get("ETag")
+            if response.status_code == 206:
+                match = re.search(r"/(\d+)$", response.headers.get("Content-Range", ""))
+                return (int(match.group(1)), True, etag) if match else (None, False, etag)
+            if response.status_code == 200:
+                length = response.headers.get("Content-Length")
+                return (int(length) if length else None), False, etag
+            raise DownloadError("Download failed with status %d: %s" % (response.status_code, response.text[:500]))
+
+    def _split(self, size, ranged):
+        """
+        Segments as [first byte, last byte, bytes done]; last byte is None for a single
+        stream of unknown size.
+        """
+        if not size:
+            return [[0, None, 0]]
+        count = min(self.segments, size // self.MIN_SEGMENT_SIZE) if ranged else 1
+        count = max(1, count)
+        bounds = [size * i // count for i in range(count + 1)]
+        return [[bounds[i], bounds[i + 1] - 1, 0] for i in range(count)]
+
+    def _fetch_segment(self, session, url, fd, segment, progress):
+        attempt = 0
+        while True:
+            first, last, done = segment
+            headers = {}
+            if progress.state["ranged"] and (done or len(progress.state["segments"]) > 1):
+                headers["Range"] = "bytes=%d-%d" % (first + done, last)
+            elif done:
+                # Without Range support an interrupted stream starts over.
+                segment[2] = 0
+                if last is None:
+                    os.ftruncate(fd, 0)
+            try:
+                with session.get(url, headers=headers, stream=True, timeout=self.TIMEOUT) as response:
+                    if response.status_code not in (200, 206) or (headers and response.status_code != 206):
+                        raise DownloadError("Download failed with status %d" % response.status_code)
+                    for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
+                        if not chunk:
+                            continue
+                        if last is not None:
+                            chunk = chunk[:last - first - segment[2] + 1]
+                        os.pwrite(fd, chunk, first + segment[2])
+                        progress.add(segment, len(chunk))
+                        if last is not None and first + segment[2] > last:
+                            break
+                if last is not None and first + segment[2] <= last:
+                    raise DownloadError("Connection closed at byte %d of segment %d-%d" % (first + segment[2],
+                                                                                           first, last))
+                return
+            except (requests.RequestException, DownloadError, OSError) as e:
+                attempt += 1
+                if attempt > self.RETRIES:
+                    raise DownloadError("Download failed after %d attempts: %s" % (attempt, e))
+                self.log.warning("Download interrupted (%s), retrying in %ds" % (e, 2 ** attempt))
+                time.sleep(2 ** attempt)
+
+    def _digest(self, path, algorithm):
+        hasher = hashlib.new(algorithm)
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(self.CHUNK_SIZE), b""):
+                hasher.update(chunk)
+        return hasher.hexdigest()
+
+    @staticmethod
+    def _read_state(state_file):
+        try:
+            with open(state_file) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write_json(path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+
+
+class _Progress:
+    def __init__(self, state, state_file, log):
+        self.state = state
+        self.state_file = state_file
+        self.log = log
+        self.lock = threading.Lock()
+        self.logged_at = time.monotonic()
+
+    def add(self, segment, count):
+        with self.lock:
+            segment[2] += count
+            DownloadHelper._write_json(self.state_file, self.state)
+            if time.monotonic() - self.logged_at >= DownloadHelper.PROGRESS_INTERVAL:
+                self.logged_at = time.monotonic()
+                done = sum(s[2] for s in self.state["segments"])
+                if self.state["size"]:
+                    self.log.info("Downloaded %d%% (%d of %d bytes)" % (done * 100 // self.state["size"], done,
+                                                                       self.state["size"]))
+                else:
+                    self.log.info("Downloaded %d bytes" % done)
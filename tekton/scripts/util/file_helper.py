@@ -20,6 +20,7 @@ from pydantic.main import BaseModel
 from yaml.loader import SafeLoader
 
 from util.logger_helper import LoggerHelper, log
+from util.state_store import StateStore
 
 logger = LoggerHelper.get_logger(Path(__file__).stem)
 
@@ -27,10 +28,7 @@ logger = LoggerHelper.get_logger(Path(__file__).stem)
 class FileHelper:
     @staticmethod
     def load_state(spec_path: str) -> State:
-        # Open the file and load the file
-        with open(spec_path) as f:
-            data = yaml.load(f, Loader=SafeLoader)
-        return State.parse_obj(data)
+        return StateStore.of(spec_path).load()
 
     @staticmethod
     def load_scale(spec_path: str) -> ScaleDetail:
@@ -86,9 +84,7 @@ class FileHelper:
 
     @staticmethod
     def dump_state(state: State, file_path: str):
-        # Open the file and load the file
-        with open(file_path, "w") as f:
-            yaml.dump(yaml.load(state.json(), Loader=SafeLoader), f)
+        StateStore.of(file_path).save(state)
 
     @staticmethod
     def read_file(file_path):
@@ -1,13 +1,18 @@
 #  Copyright 2021 VMware, Inc
 #  SPDX-License-Identifier: BSD-2-Clause
 
+import fnmatch
 import os
 import json
+import time
 from constants.constants import GovcCommands, VmPowerState
 from util import cmd_runner
 from util.cmd_helper import CmdHelper
 
 class GovcClient:
+    # Listings older than this are read again, so objects deleted meanwhile are dropped.
+    CACHE_TTL = 300
+
     def __init__(self, jsonspec, cmd_helper: cmd_runner):
 
         self.cmd_runner = cmd_helper
@@ -17,6 +22,7 @@ class GovcClient:
         password = CmdHelper.decode_base64(vcpass_base64)
         self.vcenter_password = password
         self.skip_verification = True
+        self.find_cache = {}
         self.set_env_vars()
 
     def set_env_vars(self):
@@ -25,37 +31,70 @@ class GovcClient:
         os.environ["GOVC_USERNAME"] = self.vcenter_username
         os.environ["GOVC_PASSWORD"] = self.vcenter_password
         os.environ["GOVC_INSECURE"] = json.dumps(self.skip_verification)
+        # Let every govc invocation reuse one vCenter login (~/.govmomi/sessions) instead of logging in again
+        os.environ["GOVC_PERSIST_SESSION"] = "true"
         # current_app.logger.info(f"ENV variables: {os.environ}")
 
     def find_datacenter_by_name(self, datacenter_name, options=''):
-        cmd = GovcCommands.FIND_DATACENTER_BY_NAME.format(dc_name=datacenter_name, options=options)
-        exit_code, output = self.cmd_runner.run_cmd_output(cmd)
-        return output.strip() if output and output.strip() != '' else None
+        matches = self._find_by_name('d', datacenter_name, options)
+        return matches[0] if matches else None
 
     def find_clusters_by_name(self, cluster_name, options=''):
-        cmd = GovcCommands.FIND_CLUSTERS_BY_NAME.format(clu_name=cluster_name, options=options)
-        exit_code, output = self.cmd_runner.run_cmd_output(cmd)
-        return output if output is None or output.strip() == '' else output.strip().split('\n')
+        return self._find_by_name('c', cluster_name, options)
 
     def find_resource_pools_by_name(self, pool_name, options=''):
-        cmd = GovcCommands.FIND_RESOURCE_POOLS_BY_NAME.format(clu_name=pool_name, options=options)
-        exit_code, output = self.cmd_runner.run_cmd_output(cmd)
-        return output if output is None or output.strip() == '' else output.strip().split('\n')
+        return self._find_by_name('p', pool_name, options)
 
     def find_folders_by_name(self, folder_name, options=''):
-        cmd = GovcCommands.FIND_FOLDERS_BY_NAME.format(folder_name=folder_name, options=options)
-        exit_code, output = self.cmd_runner.run_cmd_output(cmd)
-        return output if output is None or output.strip() == '' else output.strip().split('\n')
+        return self._find_by_name('f', folder_name, options)
 
     def find_vms_by_name(self, vm_name, options=''):
-        cmd = GovcCommands.FIND_VMS_BY_NAME.format(vm_name=vm_name, options=options)
-        exit_code, output = self.cmd_runner.run_cmd_output(cmd)
-        return output if output is None or output.strip() == '' else output.strip().split('\n')
+        return self._find_by_name('m', vm_name, options)
+
+    def find_vms_by_names(self, vm_names, options=''):
+        """
+        Resolve several VM names with a single govc find, returning {name: [paths]}
+        """
+        return {vm_name: self._find_by_name('m', vm_name, options) for vm_name in vm_names}
 
     def find_networks_by_name(self, network_name, options=''):
-        cmd = GovcCommands.FIND_NETWORKS_BY_NAME.format(network_name=network_name, options=options)
-        exit_code, output = self.cmd_runner.run_cmd_output(cmd)
-        return output if output is None or output.strip() == '' else output.strip().split('\n')
+        return self._find_by_name('n', network_name, options)
+
+    def invalidate(self, object_type=None):
+        """
+        Forget cached find results for one govc object type ('m', 'p', 'f', ...) or all of them
+        """
+        if object_type is None:
+            self.find_cache.clear()
+        else:
+            for key in [key for key in self.find_cache if key[0] == object_type]:
+                del self.find_cache[key]
+
+    def _find_by_name(self, object_type, name, options=''):
+        """
+        Paths of objects of object_type whose name matches the govc -name pattern.
+
+        All objects of a type are listed with one govc find per (type, options) and cached
+        for CACHE_TTL seconds, so repeated and batched lookups do not spawn govc again. A
+        name that is not in the cached listing triggers one fresh listing, so objects
+        created outside this client are still found.
+        """
+        for refresh in (False, True):
+            matches = [path for path in self._find_all(object_type, options, refresh)
+                       if fnmatch.fnmatchcase(path.split('/')[-1], name)]
+            if matches:
+                return matches
+        return None
+
+    def _find_all(self, object_type, options='', refresh=False):
+        key = (object_type, options.strip())
+        cached = self.find_cache.get(key)
+        if refresh or cached is None or time.monotonic() - cached[0] > self.CACHE_TTL:
+            cmd = GovcCommands.FIND_ALL_BY_TYPE.format(type=object_type, options=options)
+            exit_code, output = self.cmd_runner.run_cmd_output(cmd)
+            paths = [] if output is None or output.strip() == '' else output.strip().split('\n')
+            cached = self.find_cache[key] = (time.monotonic(), paths)
+        return cached[1]
 
     def create_resource_pool(self, pool, options=''):
         """
@@ -65,6 +104,7 @@ class GovcClient:
         if not existing_pools or pool not in existing_pools:
             cmd = GovcCommands.CREATE_RESOURCE_POOL.format(pool=pool, options=options)
             self.cmd_runner.run_cmd(cmd)
+            self.invalidate('p')
         return pool
 
     def create_folder(self, folder, options=''):
@@ -75,6 +115,7 @@ class GovcClient:
         if not existing_folders or folder not in existing_folders:
             cmd = GovcCommands.CREATE_FOLDER.format(folder=folder, options=options)
             self.cmd_runner.run_cmd(cmd)
+            self.invalidate('f')
         return folder
 
     def check_network_exists(self, network_name, options=''):
@@ -84,6 +125,7 @@ class GovcClient:
     def deploy_library_ova(self, location, name, options=''):
         cmd = GovcCommands.DEPLOY_LIBRARY_OVA.format(location=location, name=name, options=options)
         self.cmd_runner.run_cmd(cmd)
+        self.invalidate('m')
 
     def get_vm_ip(self, vm_name, datacenter_name, wait_time='5m'):
         if not self.find_vms_by_name(vm_name):
@@ -96,8 +138,28 @@ class GovcClient:
         return output if output is None or output.strip() == '' else output.strip().split('\n')
 
     def get_vm_power_state(self, vm_name):
-        power_state_filter = "-runtime.powerState {state}"
-        for v in VmPowerState.__members__.values():
-            if self.find_vms_by_name(vm_name, options=power_state_filter.format(state=v.value)):
-                return v
+        """
+        Power state of the VM named vm_name. The VM path comes from the cached listing and
+        only that VM is queried; if it can't be read, e.g. it was deleted and recreated, the
+        listing is read again once.
+        """
+        for refresh in (False, True):
+            if refresh:
+                self.invalidate('m')
+            for path in self.find_vms_by_name(vm_name) or []:
+                state = self._vm_power_state(path)
+                if state is not None:
+                    return state
         raise ValueError(f"VM not found by name {vm_name}")
+
+    def _vm_power_state(self, path):
+        cmd = GovcCommands.GET_VM_POWER_STATE.format(path=path)
+        try:
+            exit_code, output = self.cmd_runner.run_cmd_output(cmd)
+        except Exception:
+            return None
+        if exit_code != 0 or not output:
+            return None
+        # runtime.powerState is poweredOn, poweredOff or suspended.
+        state = output.strip().lower()
+        return next((v for v in VmPowerState.__members__.values() if state.endswith(v.value)), None)
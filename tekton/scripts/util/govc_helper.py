@@ -5,13 +5,13 @@ import json
 import os
 from pathlib import Path
 
-from jinja2 import Template
 
 from constants.constants import Paths, VmPowerState, ControllerLocation
 from model.run_config import RunConfig, DeploymentPlatform
 from model.spec import MasterSpec
 from util.cmd_helper import CmdHelper as Cli
 from util.file_helper import FileHelper
+from util.template_registry import TemplateRegistry
 from util.logger_helper import LoggerHelper
 
 logger = LoggerHelper.get_logger(Path(__file__).stem)
@@ -21,15 +21,13 @@ logger = LoggerHelper.get_logger(Path(__file__).stem)
 
 
 def template_avi_govc_config(spec: MasterSpec):
-    config_json_j2 = FileHelper.read_resource(Paths.GOVC_AVI_DEPLOY_CONFIG_J2)
-    t = Template(config_json_j2)
+    t = TemplateRegistry.get(Paths.GOVC_AVI_DEPLOY_CONFIG_J2)
     config_json_str = t.render(spec=spec)
     FileHelper.write_dict_to_file(Paths.GOVC_AVI_DEPLOY_CONFIG, json.loads(config_json_str))
 
 
 def template_avi_se_govc_config(spec):
-    config_json_j2 = FileHelper.read_resource(Paths.GOVC_AVI_SE_DEPLOY_CONFIG_J2)
-    t = Template(config_json_j2)
+    t = TemplateRegistry.get(Paths.GOVC_AVI_SE_DEPLOY_CONFIG_J2)
     config_json_str = t.render(spec=spec)
     FileHelper.write_dict_to_file(Paths.GOVC_AVI_SE_DEPLOY_CONFIG, json.loads(config_json_str))
     return Paths.GOVC_AVI_SE_DEPLOY_CONFIG
@@ -91,8 +89,7 @@ def load_node_template(run_config: RunConfig):
     vm_name = Path(run_config.spec.tkg.common.nodeOva).stem
     find_vm_cmd = f'govc find . -type m -name "{vm_name}"'
     # fill config
-    config_json_j2 = FileHelper.read_resource(Paths.GOVC_OVA_DEPLOY_CONFIG_J2)
-    t = Template(config_json_j2)
+    t = TemplateRegistry.get(Paths.GOVC_OVA_DEPLOY_CONFIG_J2)
     config_json = t.render(vm_name=vm_name)
     FileHelper.write_dict_to_file(Paths.GOVC_OVA_DEPLOY_CONFIG, json.loads(config_json))
     deploy_ova_cmd = f"""govc import.ova \\
@@ -0,0 +1,220 @@
+#  Copyright 2021 VMware, Inc
+#  SPDX-License-Identifier: BSD-2-Clause
+
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from enum import Enum
+from pathlib import Path
+
+import yaml
+from model.status import State
+from pydantic import BaseModel
+from yaml.loader import SafeLoader
+
+from util.logger_helper import LoggerHelper
+
+logger = LoggerHelper.get_logger(Path(__file__).stem)
+
+
+class StateStore:
+    """
+    In-memory copy of a deployment state file (state.yml). The file is parsed once and
+    re-read only when it changed on disk (git pull, another step of the pipeline), field
+    level changes are applied to the parsed State, and the file is rewritten atomically:
+    written to a temporary file in the same directory, fsynced and renamed over the old
+    one, so an evicted pod leaves either the old or the new state behind, never half of it.
+
+    Writes are skipped when the content did not change, and patches made inside batch()
+    are written once at the end of the batch. Set STATE_JOURNAL=true to also append every
+    change to <state file>.journal (one JSON line per write, field path -> new value).
+    """
+    JOURNAL_ENV = "STATE_JOURNAL"
+    _stores = {}
+    _lock = threading.Lock()
+
+    def __init__(self, path, journal=None):
+        self.path = os.path.abspath(path)
+        if journal is None:
+            journal = os.environ.get(self.JOURNAL_ENV, "").lower() in ("1", "true", "yes")
+        self.journal_path = self.path + ".journal" if journal else None
+        self._state = None
+        self._written = None
+        self._signature = None
+        self._dirty = False
+        self._batch_depth = 0
+        self._lock = threading.RLock()
+
+    @classmethod
+    def of(cls, path) -> "StateStore":
+        with cls._lock:
+            store = cls._stores.get(os.path.abspath(path))
+            if store is None:
+                store = cls(path)
+                cls._stores[store.path] = store
+            return store
+
+    def load(self) -> State:
+        """
+        Copy of the current state; callers may change it and hand it back to save().
+        """
+        with self._lock:
+            return self._current().copy(deep=True)
+
+    def save(self, state: State):
+        with self._lock:
+            self._state = state.copy(deep=True)
+            self._changed()
+
+    def patch(self, changes: dict):
+        """
+        Apply nested field changes, e.g. {"avi": {"deployed": True, "health": "UP"}}.
+        A dict given for a list field patches the items at the given indexes.
+        """
+        with self._lock:
+            state = self._current()
+            for key, value in changes.items():
+                _patch(state, key, value)
+            self._changed()
+
+    @contextmanager
+    def batch(self):
+        with self._lock:
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self.flush()
+
+    def flush(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            data = _plain(self._state)
+            if data != self._written:
+                self._write(data)
+                self._journal(self._written, data)
+                self._written = data
+            self._dirty = False
+
+    def _current(self) -> State:
+        signature = self._stat()
+        if self._state is None or (signature != self._signature and not self._dirty):
+            with open(self.path) as f:
+                data = yaml.load(f, Loader=SafeLoader)
+            self._state = State.parse_obj(data)
+            self._written = _plain(self._state)
+            self._signature = signature
+        return self._state
+
+    def _changed(self):
+        self._dirty = True
+        if self._batch_depth == 0:
+            self.flush()
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    def _write(self, data):
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        try:
+            mode = os.stat(self.path).st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o644
+        fd, tmp = tempfile.mkstemp(prefix=".state-", dir=directory)
+        try:
+            os.fchmod(fd, mode)
+            with os.fdopen(fd, "w") as f:
+                yaml.safe_dump(data, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        _fsync_dir(directory)
+        self._signature = self._stat()
+        logger.debug(f"Wrote state file {self.path}")
+
+    def _journal(self, old, new):
+        if self.journal_path is None:
+            return
+        entry = dict(time=time.time(), changes=dict(_diff(old, new)))
+        with open(self.journal_path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _patch(target, key, value):
+    if isinstance(target, list):
+        current = target[int(key)]
+    else:
+        current = getattr(target, key)
+    if isinstance(value, dict) and current is not None and not isinstance(current, dict):
+        for sub_key, sub_value in value.items():
+            _patch(current, sub_key, sub_value)
+    elif isinstance(target, list):
+        target[int(key)] = value
+    else:
+        setattr(target, key, value)
+
+
+def _plain(value):
+    if isinstance(value, BaseModel):
+        return {k: _plain(v) for k, v in value.__dict__.items()}
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _diff(old, new, prefix=""):
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in new:
+            yield from _diff(old.get(key), new[key], prefix + str(key) + ".")
+        for key in old:
+            if key not in new:
+                yield prefix + str(key), None
+    elif isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        for i, (o, n) in enumerate(zip(old, new)):
+            yield from _diff(o, n, prefix + str(i) + ".")
+    elif old != new:
+        yield prefix.rstrip("."), new
+
+
+def _fsync_dir(directory):
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@atexit.register
+def _flush_all():
+    for store in list(StateStore._stores.values()):
+        try:
+            store.flush()
+        except Exception as e:
+            logger.error(f"Failed to write state file {store.path}: {e}")
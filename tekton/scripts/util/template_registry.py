@@ -0,0 +1,69 @@
+#  Copyright 2021 VMware, Inc
+#  SPDX-License-Identifier: BSD-2-Clause
+
+import threading
+from enum import Enum
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Undefined, make_logging_undefined
+
+from util.logger_helper import LoggerHelper
+
+logger = LoggerHelper.get_logger(Path(__file__).stem)
+
+
+class TemplateRegistry:
+    """
+    Shared Jinja2 environment for the templates under template/ (the names used
+    in Paths, e.g. Paths.TKG_MGMT_SPEC_J2). Each template is read and compiled
+    once per process, and the compiled code is kept in a bytecode cache on disk so the
+    next process skips the compilation as well. Undefined template variables still
+    render as empty strings, as with jinja2.Template, but are logged.
+    """
+    ROOT_DIR = str(Path(__file__).resolve().parent.parent)
+    _env = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def environment() -> Environment:
+        with TemplateRegistry._lock:
+            if TemplateRegistry._env is None:
+                TemplateRegistry._env = Environment(
+                    loader=FileSystemLoader(TemplateRegistry.ROOT_DIR),
+                    # Jinja keeps the default cache in a directory private to the user (mode 0700).
+                    bytecode_cache=FileSystemBytecodeCache(),
+                    undefined=make_logging_undefined(logger, Undefined),
+                    auto_reload=False)
+            return TemplateRegistry._env
+
+    @staticmethod
+    def get(name):
+        return TemplateRegistry.environment().get_template(_template_name(name))
+
+    @staticmethod
+    def render(name, **context) -> str:
+        return TemplateRegistry.get(name).render(**context)
+
+    @staticmethod
+    def render_many(name, contexts) -> list:
+        """
+        Render one template for each context dict, e.g. the deploy yaml of every
+        cluster of a rollout, compiling the template only once.
+        """
+        template = TemplateRegistry.get(name)
+        return [template.render(**context) for context in contexts]
+
+    @staticmethod
+    def precompile() -> int:
+        env = TemplateRegistry.environment()
+        names = env.list_templates(extensions=["j2"])
+        for name in names:
+            try:
+                env.get_template(name)
+            except Exception as e:
+                logger.error(f"Failed to compile template {name}: {e}")
+        return len(names)
+
+
+def _template_name(name):
+    return name.value if isinstance(name, Enum) else name
@@ -10,18 +10,19 @@ import sys
 import tarfile
 import time
 import argparse
-from threading import Timer
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from http.client import HTTPSConnection
+from threading import Lock, Timer
+from urllib.parse import urlparse
 from six.moves.urllib.request import Request, urlopen
 from pyVmomi import vim, vmodl
-from pyVim import connect
-from pyVim.connect import Disconnect
-import atexit
 from util.logger_helper import LoggerHelper, log
 from util.cmd_helper import CmdHelper
 from pathlib import Path
 import urllib3
 from constants.constants import SegmentsName
-from pyVim import connect
+from util.inventory_cache import InventoryCache
+from util.vcenter_session import VcenterSessionPool
 
 from util.cmd_helper import CmdHelper
 logger = LoggerHelper.get_logger(Path(__file__).stem)
@@ -34,23 +35,10 @@ def get_obj(content, vimtype, name):
     Return an object by name, if name is None the
     first found object is returned
     """
-    obj = None
-    container = content.viewManager.CreateContainerView(
-        content.rootFolder, vimtype, True)
-    for c in container.view:
-        try:
-            c.name
-        except:
-            pass
-        if name:
-            if c.name.strip() == name.strip():
-                obj = c
-                break
-        else:
-            obj = c
-            break
-
-    return obj
+    cache = InventoryCache.of(content)
+    if name:
+        return cache.find_by_name(vimtype, name.strip())
+    return cache.find(vimtype)
 
 
 def get_obj_particular_folder(content, vimtype, folder, datacenter, si, name):
@@ -87,9 +75,8 @@ def deploySeOva(vcenterhost, username, password, vm_name, folder, datacenter_nam
     si = None
     try:
         print(f"Trying to connect to VCENTER SERVER . . .{vcenterhost}")
-        si = connect.SmartConnectNoSSL(host=vcenterhost, user=username, pwd=password)
+        si = VcenterSessionPool.get(host=vcenterhost, user=username, pwd=password)
     except IOError as e:
-        atexit.register(Disconnect, si)
         raise AssertionError("Failed to connect to vcenter.")
 
     print(f"Connected to VCENTER SERVER ! {vcenterhost}")
@@ -176,9 +163,8 @@ def deploySeOva(vcenterhost, username, password, vm_name, folder, datacenter_nam
 def getSi(vcenterhost, username, password):
     si = None
     try:
-        si = connect.SmartConnectNoSSL(host=vcenterhost, user=username, pwd=password)
+        si = VcenterSessionPool.get(host=vcenterhost, user=username, pwd=password)
     except IOError as e:
-        atexit.register(Disconnect, si)
         raise AssertionError("Failed to connect to vcenter.")
     return si
 
@@ -294,9 +280,9 @@ def get_dc(si, name):
     Get a datacenter by its name.
     """
     if name is not None:
-        for datacenter in si.content.rootFolder.childEntity:
-            if datacenter.name == name:
-                return datacenter
+        datacenter = InventoryCache.of(si).find_by_path("/" + name)
+        if isinstance(datacenter, vim.Datacenter):
+            return datacenter
         raise Exception('Failed to find datacenter named %s' % name)
     else:
         dcs = si.content.rootFolder.childEntity
@@ -310,45 +296,33 @@ def get_rp(si, datacenter, name):
     """
     Get a resource pool in the datacenter by its names.
     """
-    view_manager = si.content.viewManager
-    container_view = view_manager.CreateContainerView(datacenter, [vim.ResourcePool], True)
+    cache = InventoryCache.of(si)
     if name is not None:
-        try:
-            for resource_pool in container_view.view:
-                if resource_pool.name == name:
-                    return resource_pool
-        finally:
-            container_view.Destroy()
+        resource_pool = cache.find_by_name([vim.ResourcePool], name, under=datacenter)
+        if resource_pool is not None:
+            return resource_pool
         raise Exception("Failed to find resource pool %s in datacenter %s" %
                         (name, datacenter.name))
     else:
-        try:
-            rp_name = []
-            resource_pools = container_view.view
-            for resource_pool in container_view.view:
-                if resource_pool.name != "Resources":
-                    rp_name.append(resource_pool.name)
-            if rp_name:
-                return rp_name
-            else:
-                logger.info("No resource pool found in datacenter " + datacenter.name)
-                return None
-        finally:
-            container_view.Destroy()
+        rp_name = []
+        for path, resource_pool in cache.objects([vim.ResourcePool], under=datacenter):
+            rp = path.rsplit("/", 1)[1]
+            if rp != "Resources":
+                rp_name.append(rp)
+        if rp_name:
+            return rp_name
+        else:
+            logger.info("No resource pool found in datacenter " + datacenter.name)
+            return None
 
 
 def get_folder(si, datacenter, name):
     """
     Get a resource pool in the datacenter by its names.
     """
-    view_manager = si.content.viewManager
-    container_view = view_manager.CreateContainerView(datacenter, [vim.Folder], True)
-    try:
-        for resource_pool in container_view.view:
-            if resource_pool.name == name:
-                return resource_pool
-    finally:
-        container_view.Destroy()
+    folder = InventoryCache.of(si).find_by_name([vim.Folder], name, under=datacenter)
+    if folder is not None:
+        return folder
     raise Exception("Failed to find resource pool %s in datacenter %s" %
                     (name, datacenter.name))
 
@@ -377,20 +351,15 @@ def get_ds(datacenter, name):
     """
     Pick a datastore by its name.
     """
+    cache = InventoryCache.of(datacenter)
     if name is not None:
-        for datastore in datacenter.datastore:
-            try:
-                if datastore.name == name:
-                    return datastore
-            except Exception:  # Ignore datastores that have issues
-                pass
+        datastore = cache.find_by_name([vim.Datastore], name, under=datacenter)
+        if datastore is not None:
+            return datastore
         raise Exception("Failed to find %s on datacenter %s" % (name, datacenter.name))
     else:
-        datastore_list = []
         try:
-            for ds in datacenter.datastore:
-                datastore_list.append(ds.name)
-            return datastore_list
+            return [path.rsplit("/", 1)[1] for path, ds in cache.objects([vim.Datastore], under=datacenter)]
         except:
             raise Exception('Encountered errors while fetching datastores %s' % datacenter.name)
 
@@ -433,6 +402,8 @@ class OvfHandler(object):
     It processes the tarfile, matches disk keys to files and
     uploads the disks, while keeping the progress up to date for the lease.
     """
+    UPLOAD_WORKERS = 4
+    CHUNK_SIZE = 1024 * 1024
 
     def __init__(self, ovafile):
         """
@@ -440,6 +411,9 @@ class OvfHandler(object):
         processing the files and reading the embedded ovf file.
         """
         self.handle = self._create_file_handle(ovafile)
+        self.progress_lock = Lock()
+        self.uploaded = 0
+        self.total = 0
         self.tarfile = tarfile.open(fileobj=self.handle)
         ovffilename = list(filter(lambda x: x.endswith(".ovf"),
                                   self.tarfile.getnames()))[0]
@@ -481,14 +455,29 @@ class OvfHandler(object):
 
     def upload_disks(self, lease, host):
         """
-        Uploads all the disks, with a progress keep-alive.
+        Uploads all the disks, up to UPLOAD_WORKERS at a time, with a progress keep-alive.
         """
         self.lease = lease
+        self.uploaded = 0
+        self.total = sum(self.get_disk_size(fileItem) for fileItem in self.spec.fileItem)
         try:
             self.start_timer()
-            for fileItem in self.spec.fileItem:
-                self.upload_disk(fileItem, lease, host)
+            workers = max(1, min(self.UPLOAD_WORKERS, len(self.spec.fileItem)))
+            if not isinstance(self.handle, FileHandle):
+                # A remote OVA can only be read front to back.
+                workers = 1
+            executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ova-upload")
+            uploads = [executor.submit(self.upload_disk, fileItem, lease, host) for fileItem in self.spec.fileItem]
+            try:
+                for upload in as_completed(uploads):
+                    upload.result()
+            finally:
+                # On failure, do not wait for the other disks: aborting the lease below ends their uploads.
+                for upload in uploads:
+                    upload.cancel()
+                executor.shutdown(wait=False)
             lease.Complete()
+            logger.info("Finished uploading %d disks (%d bytes)." % (len(self.spec.fileItem), self.uploaded))
             print("Finished deploy successfully.")
             return 0
         except vmodl.MethodFault as ex:
@@ -502,21 +491,55 @@ class OvfHandler(object):
 
     def upload_disk(self, file_item, lease, host):
         """
-        Upload an individual disk. Passes the file handle of the
-        disk directly to the urlopen request.
+        Upload an individual disk, streaming it in CHUNK_SIZE reads straight
+        from its offset in the OVA to the lease device url.
         """
-        ovffile = self.get_disk(file_item)
+        ovffile = self.get_disk_reader(file_item)
         if ovffile is None:
             return
         device_url = self.get_device_url(file_item, lease)
-        url = device_url.url.replace('*', host)
-        headers = {'Content-length': get_tarfile_size(ovffile)}
+        url = urlparse(device_url.url.replace('*', host))
         if hasattr(ssl, '_create_unverified_context'):
-            ssl_context = ssl.create_unverified_context()
+            ssl_context = ssl._create_unverified_context()
         else:
             ssl_context = None
-        req = Request(url, ovffile, headers)
-        urlopen(req, context=ssl_context)
+        connection = HTTPSConnection(url.netloc, context=ssl_context, blocksize=self.CHUNK_SIZE)
+        try:
+            headers = {'Content-Length': str(ovffile.size), 'Content-Type': 'application/x-vnd.vmware-streamVmdk'}
+            connection.request("POST", url.path + ("?" + url.query if url.query else ""), ovffile, headers)
+            response = connection.getresponse()
+            response.read()
+            if response.status >= 300:
+                raise Exception("Upload of %s failed: %s %s" % (file_item.path, response.status, response.reason))
+        finally:
+            connection.close()
+
+    def get_disk_size(self, file_item):
+        if file_item.path not in self.tarfile.getnames():
+            return 0
+        return self.tarfile.getmember(file_item.path).size
+
+    def get_disk_reader(self, file_item):
+        """
+        Reader for one disk that reports every chunk read to the aggregate progress.
+        Local OVAs are read at the member's offset, so several disks can be read at once.
+        """
+        if file_item.path not in self.tarfile.getnames():
+            return None
+        member = self.tarfile.getmember(file_item.path)
+        if isinstance(self.handle, FileHandle):
+            return TarMemberReader(self.handle.fh.fileno(), member.offset_data, member.size, self.add_progress)
+        return TarMemberReader(None, 0, member.size, self.add_progress, self.tarfile.extractfile(member))
+
+    def add_progress(self, amount):
+        with self.progress_lock:
+            self.uploaded += amount
+
+    def progress(self):
+        with self.progress_lock:
+            if not self.total:
+                return 0
+            return int(100.0 * self.uploaded / self.total)
 
     def start_timer(self):
         """
@@ -529,16 +552,49 @@ class OvfHandler(object):
         Update the progress and reschedule the timer if not complete.
         """
         try:
-            prog = self.handle.progress()
+            prog = self.progress()
             self.lease.Progress(prog)
             if self.lease.state not in [vim.HttpNfcLease.State.done,
                                         vim.HttpNfcLease.State.error]:
                 self.start_timer()
-            sys.stderr.write("Progress: %d%%\r" % prog)
+            logger.info("Upload progress: %d%% (%d of %d bytes)" % (prog, self.uploaded, self.total))
         except Exception:  # Any exception means we should stop updating progress.
             pass
 
 
+class TarMemberReader(object):
+    """
+    Read-only view of one member of the OVA tar. With a file descriptor it reads
+    with os.pread at the member's offset, so readers for different disks never
+    share a file position and can be read from concurrently.
+    """
+
+    def __init__(self, fd, offset, size, on_read, fileobj=None):
+        self.fd = fd
+        self.offset = offset
+        self.size = size
+        self.position = 0
+        self.on_read = on_read
+        self.fileobj = fileobj
+
+    def __len__(self):
+        return self.size
+
+    def read(self, amount=-1):
+        remaining = self.size - self.position
+        if amount is None or amount < 0 or amount > remaining:
+            amount = remaining
+        if amount == 0:
+            return b""
+        if self.fileobj is not None:
+            data = self.fileobj.read(amount)
+        else:
+            data = os.pread(self.fd, amount, self.offset + self.position)
+        self.position += len(data)
+        self.on_read(len(data))
+        return data
+
+
 class FileHandle(object):
     def __init__(self, filename):
         self.filename = filename
@@ -634,7 +690,7 @@ class WebHandle(object):
 def createResourcePool(vcenterHostName, vcenterUser, vcenterPassword, clusterName, name, parentResourcePool):
     si = None
     try:
-        si = connect.SmartConnectNoSSL(host=vcenterHostName, user=vcenterUser, pwd=vcenterPassword)
+        si = VcenterSessionPool.get(host=vcenterHostName, user=vcenterUser, pwd=vcenterPassword)
         content = si.RetrieveContent()
         cluster = get_obj(content, [vim.ClusterComputeResource], clusterName)
 
@@ -664,65 +720,59 @@ def createResourcePool(vcenterHostName, vcenterUser, vcenterPassword, clusterNam
             else:
                 configSpec.entity = cluster
                 cluster.resourcePool.CreateResourcePool(name, configSpec)
+            InventoryCache.of(content).invalidate()
             return "SUCCESS"
         else:
             return None
     except Exception as e:
-        atexit.register(Disconnect, si)
         raise AssertionError("Operation failed " + str(e))
-    finally:
-        atexit.register(Disconnect, si)
 
 
 def create_folder(vcenterHostName, vceneterUser, vcenterPassword, datacenter_name, folder_name):
     si = None
     try:
-        si = connect.SmartConnectNoSSL(host=vcenterHostName, user=vceneterUser, pwd=vcenterPassword)
+        si = VcenterSessionPool.get(host=vcenterHostName, user=vceneterUser, pwd=vcenterPassword)
         content = si.RetrieveContent()
         datacenter = get_dc(si, datacenter_name)
         destfolder = get_obj(content, [vim.Folder], folder_name)
         if destfolder is None:
             datacenter.vmFolder.CreateFolder(folder_name)
+            InventoryCache.of(content).invalidate()
             return "SUCCESS"
         else:
             return None
     except Exception as e:
-        atexit.register(Disconnect, si)
         raise AssertionError("Operation failed " + str(e))
-    finally:
-        atexit.register(Disconnect, si)
 
 
 def getNetwork(datacenter, name):
+    """
+    Networks directly in the datacenter network folder or one folder below it.
+    """
+    cache = InventoryCache.of(datacenter)
+    network_folder = datacenter.networkFolder
     if name is not None:
-        networks = datacenter.networkFolder.childEntity
-        for network in networks:
-            if network.name == name:
-                return network
-            elif hasattr(network, 'childEntity'):
-                ports = network.childEntity
-                for item in ports:
-                    if item.name == name:
-                        return item
+        for revalidate in (False, True):
+            for path, network in _folder_networks(cache, network_folder, revalidate):
+                if path.rsplit("/", 1)[1] == name:
+                    return network
         raise Exception('Failed to find port named %s' % name)
     else:
-        network_list = []
         try:
-            for port in datacenter.networkFolder.childEntity:
-                if hasattr(port, 'childEntity'):
-                    ports = port.childEntity
-                    for item in ports:
-                        network_list.append(item.name)
-                else:
-                    network_list.append(port.name)
-            return network_list
+            return [path.rsplit("/", 1)[1] for path, network in _folder_networks(cache, network_folder)]
         except:
             raise Exception('Encountered errors while fetching networks %s' % datacenter.name)
 
 
+def _folder_networks(cache, network_folder, revalidate=False):
+    networks = cache.objects([vim.Network], under=network_folder, revalidate=revalidate)
+    depth = cache.path_of(network_folder).count("/") + 2
+    return [(path, network) for path, network in networks if path.count("/") <= depth]
+
+
 def getDvPortGroupId(vcenterIp, vcenterUser, vcenterPassword, networkName, vc_data_center):
     try:
-        si = connect.SmartConnectNoSSL(host=vcenterIp, user=vcenterUser, pwd=vcenterPassword)
+        si = VcenterSessionPool.get(host=vcenterIp, user=vcenterUser, pwd=vcenterPassword)
         try:
             datacenter = get_dc(si, vc_data_center)
         except Exception as e:
@@ -743,7 +793,7 @@ def verifyVcenterVersion(version, jsonspec):
     vcenter_password = CmdHelper.decode_base64(vcpass_base64)
     vcenter_username = jsonspec['envSpec']['vcenterDetails']['vcenterSsoUser']
     vcenter_ip = jsonspec['envSpec']['vcenterDetails']['vcenterAddress']
-    si = connect.SmartConnectNoSSL(host=vcenter_ip, user=vcenter_username, pwd=vcenter_password)
+    si = VcenterSessionPool.get(host=vcenter_ip, user=vcenter_username, pwd=vcenter_password)
     content = si.RetrieveContent()
     vcVersion = content.about.version
     if vcVersion.startswith(version):
@@ -17,8 +17,8 @@ from util.avi_api_helper import AviApiSpec, ra_avi_download, isAviHaEnabled, \
     deployAndConfigureAvi, form_avi_ha_cluster, manage_avi_certificates
 from util.cmd_helper import CmdHelper, timer
 from util.file_helper import FileHelper
+from util.template_registry import TemplateRegistry
 from util.logger_helper import LoggerHelper, log
-from jinja2 import Template
 from util.govc_client import GovcClient
 from util.local_cmd_helper import LocalCmdHelper
 from util.vcenter_operations import checkforIpAddress, getSi
@@ -243,7 +243,7 @@ class RALBWorkflow:
             if isAviHaEnabled(ha_field):
                 fqdn2 = avi_fqdn2
                 fqdn3 = avi_fqdn3
-            deploy_options = Template(FileHelper.read_resource(Paths.VSPHERE_ALB_DEPLOY_J2))
+            deploy_options = TemplateRegistry.get(Paths.VSPHERE_ALB_DEPLOY_J2)
             VSPHERE_ALB_DEPLOY_JSON = "/tmp/deploy_vsphere_alb_controller_config.json"
             FileHelper.write_to_file(
                 deploy_options.render(ip=ip, netmask=netmask, gateway=gateway, fqdn=fqdn,
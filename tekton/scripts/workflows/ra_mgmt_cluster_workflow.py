@@ -6,7 +6,6 @@ from pathlib import Path
 from re import sub
 import json
 import time
-from jinja2 import Template
 import requests
 from tqdm import tqdm
 import base64
@@ -21,9 +20,11 @@ from model.vsphereSpec import VsphereMasterSpec
 from model.status import HealthEnum, Info
 from util.cmd_helper import CmdHelper
 from util.file_helper import FileHelper
+from util.template_registry import TemplateRegistry
 from util.git_helper import Git
 from util.govc_helper import get_alb_ip_address
 from util.logger_helper import LoggerHelper, log
+from util.avi_client import AviClient
 from util.avi_api_helper import isAviHaEnabled, obtain_second_csrf, obtain_avi_version
 from util.ssh_helper import SshHelper
 from util.ssl_helper import get_base64_cert
@@ -154,8 +155,7 @@ class RaMgmtClusterWorkflow:
                                vcenter_ip,
                                vcenter_username,
                                password, vsSpec):
-        deploy_yaml = FileHelper.read_resource(Paths.TKG_MGMT_SPEC_J2)
-        t = Template(deploy_yaml)
+        t = TemplateRegistry.get(Paths.TKG_MGMT_SPEC_J2)
         datastore_path = "/" + datacenter + "/datastore/" + data_store
         vsphere_folder_path = "/" + datacenter + "/vm/" + \
                               ResourcePoolAndFolderName.TKG_Mgmt_Components_Folder_VSPHERE
@@ -476,7 +476,7 @@ class RaMgmtClusterWorkflow:
         }
         url = "https://" + ip + "/api/cloud"
         body = {}
-        response_csrf = requests.request("GET", url, headers=headers, data=body, verify=False)
+        response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=body, verify=False)
         if response_csrf.status_code != 200:
             return None, response_csrf.text
         uuid = None
@@ -490,7 +490,7 @@ class RaMgmtClusterWorkflow:
         count = 0
         response_csrf = None
         while count < 60:
-            response_csrf = requests.request("GET", status_url, headers=headers, data=body,
+            response_csrf = AviClient.for_controller(ip).request("GET", status_url, headers=headers, data=body,
                                              verify=False)
             if response_csrf.status_code != 200:
                 return None, "Failed", "Error"
@@ -550,7 +550,7 @@ class RaMgmtClusterWorkflow:
         }
         json_object = json.dumps(body, indent=4)
         url = "https://" + ip + "/api/cloud"
-        response_csrf = requests.request("POST", url, headers=headers, data=json_object,
+        response_csrf = AviClient.for_controller(ip).request("POST", url, headers=headers, data=json_object,
                                          verify=False)
         if response_csrf.status_code != 201:
             return None, response_csrf.text
@@ -588,7 +588,7 @@ class RaMgmtClusterWorkflow:
         response_csrf = None
         try:
             while count < 60:
-                response_csrf = requests.request("GET", url, headers=headers, data=payload,
+                response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload,
                                                  verify=False)
                 if response_csrf.status_code == 200:
                     if response_csrf.json()["count"] > 1:
@@ -612,7 +612,7 @@ class RaMgmtClusterWorkflow:
                     next_url = None if not response_csrf.json()["next"] else response_csrf.json()[
                         "next"]
                     while len(next_url) > 0:
-                        response_csrf = requests.request("GET", next_url, headers=headers,
+                        response_csrf = AviClient.for_controller(ip).request("GET", next_url, headers=headers,
                                                          data=payload, verify=False)
                         for se in response_csrf.json()["results"]:
                             if se["config"]["name"] == name:
@@ -636,7 +636,7 @@ class RaMgmtClusterWorkflow:
             "x-csrftoken": csrf2[0]
         }
         payload = {}
-        response_csrf = requests.request("GET", url, headers=headers, data=payload, verify=False)
+        response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload, verify=False)
         details = {}
         if response_csrf.status_code != 200:
             details["error"] = response_csrf.text
@@ -676,7 +676,7 @@ class RaMgmtClusterWorkflow:
             "x-csrftoken": csrf2[0]
         }
         details = {}
-        response_csrf = requests.request("PUT", url, headers=headers, data=json_object_m,
+        response_csrf = AviClient.for_controller(ip).request("PUT", url, headers=headers, data=json_object_m,
                                          verify=False)
         if response_csrf.status_code != 200:
             count = 0
@@ -684,7 +684,7 @@ class RaMgmtClusterWorkflow:
                     "Cannot edit network properties till network sync from Service Engines is complete"):
                 while count < 10:
                     time.sleep(60)
-                    response_csrf = requests.request("PUT", url, headers=headers,
+                    response_csrf = AviClient.for_controller(ip).request("PUT", url, headers=headers,
                                                      data=json_object_m, verify=False)
                     if response_csrf.status_code == 200:
                         break
@@ -711,7 +711,7 @@ class RaMgmtClusterWorkflow:
         }
         payload = {}
         url = newCloudUrl
-        response_csrf = requests.request("GET", url, headers=headers, data=payload, verify=False)
+        response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload, verify=False)
         if response_csrf.status_code != 200:
             return None, response_csrf.text
         else:
@@ -739,7 +739,7 @@ class RaMgmtClusterWorkflow:
             "x-avi-version": aviVersion,
             "x-csrftoken": csrf2[0]
         }
-        response_csrf = requests.request("PUT", newCloudUrl, headers=headers, data=json_object,
+        response_csrf = AviClient.for_controller(ip).request("PUT", newCloudUrl, headers=headers, data=json_object,
                                          verify=False)
         if response_csrf.status_code != 200:
             return None, response_csrf.text
@@ -759,7 +759,7 @@ class RaMgmtClusterWorkflow:
             "x-csrftoken": csrf2[0]
         }
         payload = {}
-        response_csrf = requests.request("GET", url, headers=headers, data=payload, verify=False)
+        response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload, verify=False)
         details = {}
         if response_csrf.status_code != 200:
             details["error"] = response_csrf.text
@@ -844,7 +844,7 @@ class RaMgmtClusterWorkflow:
         }
         body = {}
         url = "https://" + ip + "/api/ipamdnsproviderprofile"
-        response_csrf = requests.request("GET", url, headers=headers, data=body, verify=False)
+        response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=body, verify=False)
         if response_csrf.status_code != 200:
             return None, response_csrf.text
         else:
@@ -922,7 +922,7 @@ class RaMgmtClusterWorkflow:
             }
         json_object = json.dumps(body, indent=4)
         url = "https://" + ip + "/api/ipamdnsproviderprofile"
-        response_csrf = requests.request("POST", url, headers=headers, data=json_object,
+        response_csrf = AviClient.for_controller(ip).request("POST", url, headers=headers, data=json_object,
                                          verify=False)
         if response_csrf.status_code != 201:
             return None, response_csrf.text
@@ -941,7 +941,7 @@ class RaMgmtClusterWorkflow:
         }
         payload = {}
         url = newCloudUrl
-        response_csrf = requests.request("GET", url, headers=headers, data=payload, verify=False)
+        response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload, verify=False)
         if response_csrf.status_code != 200:
             return None, response_csrf.text
         else:
@@ -969,7 +969,7 @@ class RaMgmtClusterWorkflow:
             "x-avi-version": aviVersion,
             "x-csrftoken": csrf2[0]
         }
-        response_csrf = requests.request("PUT", newCloudUrl, headers=headers, data=json_object,
+        response_csrf = AviClient.for_controller(ip).request("PUT", newCloudUrl, headers=headers, data=json_object,
                                          verify=False)
         if response_csrf.status_code != 200:
             return None, response_csrf.text
@@ -988,7 +988,7 @@ class RaMgmtClusterWorkflow:
         }
         url = "https://" + ip + "/api/vimgrclusterruntime"
         payload = {}
-        response_csrf = requests.request("GET", url, headers=headers, data=payload, verify=False)
+        response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload, verify=False)
         if response_csrf.status_code != 200:
             return None, response_csrf.text
         else:
@@ -1195,7 +1195,7 @@ class RaMgmtClusterWorkflow:
         }
         json_object = getSeNewBody(newCloudUrl, seGroupName, clusterUrl, dataStore)
         url = "https://" + ip + "/api/serviceenginegroup"
-        response_csrf = requests.request("POST", url, headers=headers, data=json_object,
+        response_csrf = AviClient.for_controller(ip).request("POST", url, headers=headers, data=json_object,
                                          verify=False)
         if response_csrf.status_code != 201:
             return None, response_csrf.text
@@ -1214,7 +1214,7 @@ class RaMgmtClusterWorkflow:
             "x-csrftoken": csrf2[0]
         }
         payload = {}
-        response_csrf = requests.request("GET", url, headers=headers, data=payload, verify=False)
+        response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload, verify=False)
         if response_csrf.status_code != 200:
             return None, "Failed"
         os.system("rm -rf managementNetworkDetailsDhcp.json")
@@ -1235,7 +1235,7 @@ class RaMgmtClusterWorkflow:
             "x-csrftoken": csrf2[0]
         }
         payload = {}
-        response_csrf = requests.request("GET", url, headers=headers, data=payload, verify=False)
+        response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=payload, verify=False)
         if response_csrf.status_code != 200:
             return None, "Failed"
         os.system("rm -rf sharedNetworkDetailsDhcp.json")
@@ -1276,7 +1276,7 @@ class RaMgmtClusterWorkflow:
             "x-avi-version": aviVersion,
             "x-csrftoken": csrf2[0]
         }
-        response_csrf = requests.request("PUT", getNetwork[0], headers=headers, data=json_object_m,
+        response_csrf = AviClient.for_controller(ip).request("PUT", getNetwork[0], headers=headers, data=json_object_m,
                                          verify=False)
         if response_csrf.status_code != 200:
             return None, response_csrf.text
@@ -1313,7 +1313,7 @@ class RaMgmtClusterWorkflow:
             "x-avi-version": aviVersion,
             "x-csrftoken": csrf2[0]
         }
-        response_csrf = requests.request("PUT", getNetwork[0], headers=headers, data=json_object_m, verify=False)
+        response_csrf = AviClient.for_controller(ip).request("PUT", getNetwork[0], headers=headers, data=json_object_m, verify=False)
         if response_csrf.status_code != 200:
             return None, response_csrf.text
         return "SUCCESS", 200
@@ -1330,7 +1330,7 @@ class RaMgmtClusterWorkflow:
         }
         body = {}
         url = AlbEndpoint.AVI_SERVICE_ENGINE.format(ip=ip, se_name=se_name, avi_cloud_uuid=avi_cloud_uuid)
-        response_csrf = requests.request("GET", url, headers=headers, data=body, verify=False)
+        response_csrf = AviClient.for_controller(ip).request("GET", url, headers=headers, data=body, verify=False)
         if response_csrf.status_code != 200:
             return None, response_csrf.text
         else:
@@ -1342,7 +1342,7 @@ class RaMgmtClusterWorkflow:
             type = VrfType.GLOBAL
             cloud_ref_ = cloud_ref[cloud_ref.rindex("/") + 1:]
             se_group_url = AlbEndpoint.AVI_SE_GROUP.format(ip=ip, cloud_ref=cloud_ref_, service_engine_uuid=se_uuid)
-            response = requests.request("GET", se_group_url, headers=headers, data=body, verify=False)
+            response = AviClient.for_controller(ip).request("GET", se_group_url, headers=headers, data=body, verify=False)
             if response.status_code != 200:
                 return None, response.text
             createVs = False
@@ -1357,7 +1357,7 @@ class RaMgmtClusterWorkflow:
             if createVs:
                 logger.info("Creating  virtual service")
                 vrf_get_url = "https://" + ip + "/api/vrfcontext/?name.in=" + type + "&cloud_ref.uuid=" + avi_cloud_uuid
-                response_csrf = requests.request("GET", vrf_get_url, headers=headers, data=body, verify=False)
+                response_csrf = AviClient.for_controller(ip).request("GET", vrf_get_url, headers=headers, data=body, verify=False)
                 if response_csrf.status_code != 200:
                     return None, response_csrf.text
                 vrf_url = ""
@@ -1385,7 +1385,7 @@ class RaMgmtClusterWorkflow:
                 else:
                     return None, "Vip Ip pools are not configured."
                 virtual_service_vip_url = AlbEndpoint.AVI_VIRTUAL_SERVICE_VIP.format(ip=ip)
-                response = requests.request("GET", virtual_service_vip_url, headers=headers, data=body, verify=False)
+                response = AviClient.for_controller(ip).request("GET", virtual_service_vip_url, headers=headers, data=body, verify=False)
                 if response.status_code != 200:
                     return None, response.text
                 isVipCreated = False
@@ -1403,14 +1403,14 @@ class RaMgmtClusterWorkflow:
                                                                 virtual_service_name_vip=ServiceName.SIVT_SERVICE_VIP,
                                                                 vrf_context_ref=vrf_url
                                                                 , network_ref=vip_network_url, addr=ip_pre, mask=mask)
-                    response = requests.request("POST", virtual_service_vip_url, headers=headers, data=body, verify=False)
+                    response = AviClient.for_controller(ip).request("POST", virtual_service_vip_url, headers=headers, data=body, verify=False)
                     if response.status_code != 201:
                         return None, response.text
                     vip_url = response.json()["url"]
                 if not vip_url:
                     return None, "virtual service vip url not found"
                 virtual_service_url = AlbEndpoint.AVI_VIRTUAL_SERVICE.format(ip=ip)
-                response = requests.request("GET", virtual_service_url, headers=headers, data=body, verify=False)
+                response = AviClient.for_controller(ip).request("GET", virtual_service_url, headers=headers, data=body, verify=False)
                 if response.status_code != 200:
                     return None, response.text
                 isVsCreated = False
@@ -1425,7 +1425,7 @@ class RaMgmtClusterWorkflow:
                     body = AlbPayload.VIRTUAL_SERVICE.format(cloud_ref=cloud_ref,
                                                             se_group_ref=service_engine_group_url
                                                             , vsvip_ref=vip_url)
-                    response = requests.request("POST", virtual_service_url, headers=headers, data=body, verify=False)
+                    response = AviClient.for_controller(ip).request("POST", virtual_service_url, headers=headers, data=body, verify=False)
                     if response.status_code != 201:
                         return None, response.text
                 body = {}
@@ -1436,7 +1436,7 @@ class RaMgmtClusterWorkflow:
                     if se_count == 2:
                         for i in range(1):
                             while counter_se < 60:
-                                response = requests.request("GET", se_group_url, headers=headers, data=body, verify=False)
+                                response = AviClient.for_controller(ip).request("GET", se_group_url, headers=headers, data=body, verify=False)
                                 if response.status_code != 200:
                                     return None, response.text
                                 config = response.json()["results"][0]
@@ -1453,14 +1453,14 @@ class RaMgmtClusterWorkflow:
                             if not initialized:
                                 return None, "Service engines not initialized  in 30m"
                             logger.info("Checking status of service engine " + str(seurl))
-                            response = requests.request("GET", seurl, headers=headers, data=body, verify=False)
+                            response = AviClient.for_controller(ip).request("GET", seurl, headers=headers, data=body, verify=False)
                             if response.status_code != 200:
                                 return None, response.text
                             isConnected = False
                             try:
                                 status = response.json()["se_connected"]
                                 while not status and counter < 60:
-                                    response = requests.request("GET", seurl, headers=headers, data=body, verify=False)
+                                    response = AviClient.for_controller(ip).request("GET", seurl, headers=headers, data=body, verify=False)
                                     if response.status_code != 200:
                                         return None, response.text
                                     status = response.json()["se_connected"]
@@ -1484,7 +1484,7 @@ class RaMgmtClusterWorkflow:
                         for i in range(2, 3):
                             seurl = config["serviceengines"][i]
                             logger.info("Checking status of service engine " + str(seurl))
-                            response = requests.request("GET", seurl, headers=headers, data=body, verify=False)
+                            response = AviClient.for_controller(ip).request("GET", seurl, headers=headers, data=body, verify=False)
                             if response.status_code != 200:
                                 return None, response.text
                             logger.info(response.json())
@@ -1492,7 +1492,7 @@ class RaMgmtClusterWorkflow:
                             try:
                                 status = response.json()["se_connected"]
                                 while not status and counter < 60:
-                                    response = requests.request("GET", seurl, headers=headers, data=body, verify=False)
+                                    response = AviClient.for_controller(ip).request("GET", seurl, headers=headers, data=body, verify=False)
                                     if response.status_code != 200:
                                         return None, response.text
                                     if status:
@@ -1511,7 +1511,7 @@ class RaMgmtClusterWorkflow:
                     return None, str(e)
                 try:
                     logger.info("Deleting Virtual service")
-                    response = requests.request("GET", virtual_service_vip_url, headers=headers, data=body, verify=False)
+                    response = AviClient.for_controller(ip).request("GET", virtual_service_vip_url, headers=headers, data=body, verify=False)
                     if response.status_code != 200:
                         return None, response.text
                     vip_url = ""
@@ -1524,7 +1524,7 @@ class RaMgmtClusterWorkflow:
                         logger.info("No virtual service vip created")
                     vs_url = ""
                     virtual_service_url = AlbEndpoint.AVI_VIRTUAL_SERVICE.format(ip=ip)
-                    response = requests.request("GET", virtual_service_url, headers=headers, data=body, verify=False)
+                    response = AviClient.for_controller(ip).request("GET", virtual_service_url, headers=headers, data=body, verify=False)
                     try:
                         for r in response.json()["results"]:
                             if r["name"] == ServiceName.SIVT_SERVICE:
@@ -1532,8 +1532,8 @@ class RaMgmtClusterWorkflow:
                                 break
                     except:
                         logger.info("No virtual service created")
-                    requests.request("DELETE", vs_url, headers=headers, data=body, verify=False)
-                    requests.request("DELETE", vip_url, headers=headers, data=body, verify=False)
+                    AviClient.for_controller(ip).request("DELETE", vs_url, headers=headers, data=body, verify=False)
+                    AviClient.for_controller(ip).request("DELETE", vip_url, headers=headers, data=body, verify=False)
                 except Exception as e:
                     pass
                 return "SUCCESS", "Required Service engines sucessfully  created"
@@ -2062,7 +2062,7 @@ class RaMgmtClusterWorkflow:
                 url = cloud_url
                 logger.info("Waiting for 1 min status == ready")
                 time.sleep(60)
-                response_csrf = requests.request("PUT", url, headers=headers, data=json_object, verify=False)
+                response_csrf = AviClient.for_controller(ip).request("PUT", url, headers=headers, data=json_object, verify=False)
                 if response_csrf.status_code != 200:
                     return None, response_csrf.text
                 else:
@@ -2227,7 +2227,7 @@ class RaMgmtClusterWorkflow:
             }
         }
         json_object = json.dumps(body, indent=4)
-        response_csrf = requests.request("PUT", seUrl, headers=headers, data=json_object, verify=False)
+        response_csrf = AviClient.for_controller(ip).request("PUT", seUrl, headers=headers, data=json_object, verify=False)
         if response_csrf.status_code != 200:
             return None, response_csrf.text
         else:
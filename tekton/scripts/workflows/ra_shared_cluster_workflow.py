@@ -13,7 +13,6 @@ from constants.constants import TKG_EXTENSIONS_ROOT, ControllerLocation, Kubectl
     Paths, Task, ResourcePoolAndFolderName, PLAN, Sizing, ClusterType, RegexPattern, AkoType,\
     AppName, Avi_Tkgs_Version, Avi_Version, Cloud, Env, Tkg_version, SegmentsName
 
-from jinja2 import Template
 from lib.kubectl_client import KubectlClient
 from lib.tkg_cli_client import TkgCliClient
 from model.run_config import RunConfig
@@ -22,6 +21,7 @@ from model.status import (ExtensionState, HealthEnum, SharedExtensionState,
 from tqdm import tqdm
 from util.cmd_helper import CmdHelper
 from util.file_helper import FileHelper
+from util.template_registry import TemplateRegistry
 from util.common_utils import envCheck
 from util.git_helper import Git
 from util.logger_helper import LoggerHelper, log, log_debug
@@ -36,7 +36,7 @@ from util.common_utils import downloadAndPushKubernetesOvaMarketPlace, runSsh, g
     checkEnableIdentityManagement, checkPinnipedInstalled, checkDataProtectionEnabled
 from util.vcenter_operations import createResourcePool, create_folder
 from util.ShellHelper import runShellCommandAndReturnOutputAsList, verifyPodsAreRunning,\
-    grabKubectlCommand, grabPipeOutput, grabPipeOutputChagedDir, runShellCommandWithPolling
+    grabKubectlCommand, grabPipeOutput, runShellCommandWithPolling
 from workflows.cluster_common_workflow import ClusterCommonWorkflow
 from util.shared_config import deployExtentions
 from lib.nsxt_client import NsxtClient
@@ -110,8 +110,7 @@ class RaSharedClusterWorkflow:
                 'tkgSharedserviceClusterName']
 
     def _template_deploy_yaml(self):
-        deploy_yaml = FileHelper.read_resource(Paths.VSPHERE_SHARED_SERVICES_SPEC_J2)
-        t = Template(deploy_yaml)
+        t = TemplateRegistry.get(Paths.VSPHERE_SHARED_SERVICES_SPEC_J2)
         return t.render(spec=self.run_config.spec)
 
 
@@ -1045,39 +1044,6 @@ class RaSharedClusterWorkflow:
             self.cleanup_obj.delete_cluster(self.shrd_clstr)
 
 
-    def waitForGrepProcess(self,list1, list2, podName, dir):
-            cert_state = grabPipeOutputChagedDir(list1, list2, dir)
-            if cert_state[1] != 0:
-                logger.error("Failed to apply " + podName + " " + cert_state[0])
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Failed to apply " + podName + " " + cert_state[0],
-                    "ERROR_CODE": 500
-                }
-                return json.dumps(d), 500, 0
-            count_cert = 0
-            while verifyPodsAreRunning(podName, cert_state[0], RegexPattern.RUNNING) and count_cert < 10:
-                cert_state = grabPipeOutputChagedDir(list1, list2, dir)
-                time.sleep(30)
-                count_cert = count_cert + 1
-                logger.info("Waited for  " + str(count_cert * 30) + "s, retrying.")
-            if not verifyPodsAreRunning(podName, cert_state[0], RegexPattern.RUNNING):
-                logger.error(podName + " is not running on waiting " + str(count_cert * 30) + "s")
-                d = {
-                    "responseType": "ERROR",
-                    "msg": podName + " is not running on waiting " + str(count_cert * 30) + "s",
-                    "ERROR_CODE": 500
-                }
-                return json.dumps(d), 500, count_cert
-            d = {
-                "responseType": "ERROR",
-                "msg": "Failed to apply " + podName + " " + cert_state[0],
-                "ERROR_CODE": 500
-            }
-
-            return json.dumps(d), 200, count_cert
-
-
     def changeNetworks(self,vcenter_ip, vcenter_username, password, engine_name):
             os.putenv("GOVC_URL", "https://" + vcenter_ip + "/sdk")
             os.putenv("GOVC_USERNAME", vcenter_username)
@@ -1092,35 +1058,3 @@ class RaSharedClusterWorkflow:
             except Exception as e:
                 return str(e), 500
             return "SUCCEES", 200
-
-
-    def waitForProcess(self,list1, podName):
-            cert_state = runShellCommandAndReturnOutputAsList(list1)
-            if cert_state[1] != 0:
-                logger.error("Failed to apply " + podName + " " + cert_state[0])
-                d = {
-                    "responseType": "ERROR",
-                    "msg": "Failed to apply " + podName + " " + cert_state[0],
-                    "ERROR_CODE": 500
-                }
-                return json.dumps(d), 500, 0
-            count_cert = 0
-            while verifyPodsAreRunning(podName, cert_state[0], RegexPattern.RUNNING) and count_cert < 50:
-                cert_state = runShellCommandAndReturnOutputAsList(list1)
-                time.sleep(30)
-                count_cert = count_cert + 1
-                logger.info("Waited for  " + str(count_cert * 30) + "s, retrying.")
-            if not verifyPodsAreRunning(podName, cert_state[0], RegexPattern.RECONCILE_SUCCEEDED):
-                logger.error(podName + " is not running on waiting " + str(count_cert * 30) + "s")
-                d = {
-                    "responseType": "ERROR",
-                    "msg": podName + " is not running on waiting " + str(count_cert * 30) + "s",
-                    "ERROR_CODE": 500
-                }
-                return json.dumps(d), 500, count_cert
-            d = {
-                "responseType": "ERROR",
-                "msg": "Failed to apply " + podName + " " + cert_state[0],
-                "ERROR_CODE": 500
-            }
-            return json.dumps(d), 200, count_cert
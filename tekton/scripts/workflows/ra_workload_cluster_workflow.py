@@ -19,6 +19,7 @@ from util.cmd_helper import CmdHelper
 from util.file_helper import FileHelper
 from util.git_helper import Git
 from util.logger_helper import LoggerHelper, log, log_debug
+from util.avi_client import AviClient
 from util.cmd_runner import RunCmd
 from lib.nsxt_client import NsxtClient
 from workflows.cluster_common_workflow import ClusterCommonWorkflow
@@ -190,7 +191,7 @@ class RaWorkloadClusterWorkflow:
                 ipam_obj = ipam
                 break
         ipam_url = ipam_obj["url"]
-        response_csrf = requests.request("GET", ipam_url, headers=headers, verify=False)
+        response_csrf = AviClient.for_controller(ip).request("GET", ipam_url, headers=headers, verify=False)
         if response_csrf.status_code != 200:
             return None, response_csrf.text
         update = response_csrf.json()
@@ -217,7 +218,7 @@ class RaWorkloadClusterWorkflow:
         with open("./ipam_details_get.json", 'r') as file2:
             updated_body = json.load(file2)
         json_object = json.dumps(updated_body, indent=4)
-        response_csrf = requests.request("PUT", ipam_url, headers=headers, data=json_object,
+        response_csrf = AviClient.for_controller(ip).request("PUT", ipam_url, headers=headers, data=json_object,
                                          verify=False)
         if response_csrf.status_code != 200:
             return None, response_csrf.text